@@ -20,17 +20,8 @@ from config import config
 # Importar comandos CLI
 # from .commands import register_commands  # Comentado temporalmente
 
-# Importar blueprints
-from .views.main import main_bp
-from .views.auth import auth_bp
-from .views.errors import errors_bp
-from .views.admin import admin_bp
-from .views.entrepreneur import entrepreneur_bp
-from .views.ally import ally_bp
-from .views.client import client_bp
-
-# Importar API blueprints
-from .api.v1 import api_v1_bp
+# Blueprints: se importan al registrarlos (ver register_blueprints)
+from .blueprints import register_blueprints
 
 # Importar manejadores de errores
 from .core.exceptions import register_error_handlers
@@ -117,6 +108,12 @@ def create_app(config_name=None):
     # Crear directorio de uploads si no existe
     setup_upload_directory(app)
     
+    # Configurar claves maestras del cifrado de documentos
+    setup_document_encryption(app)
+    
+    # Anotar los registros que cambian de hora para corregir los agregados
+    setup_metric_rollups(app)
+    
     return app
 
 
@@ -134,29 +131,6 @@ def init_extensions(app):
     migrate = Migrate(app, db)
 
 
-def register_blueprints(app):
-    """
-    Registra todos los blueprints de la aplicación.
-    
-    Args:
-        app (Flask): Instancia de la aplicación Flask.
-    """
-    
-    # Blueprints principales
-    app.register_blueprint(main_bp)
-    app.register_blueprint(auth_bp, url_prefix='/auth')
-    app.register_blueprint(errors_bp)
-    
-    # Blueprints por roles
-    app.register_blueprint(admin_bp, url_prefix='/admin')
-    app.register_blueprint(entrepreneur_bp, url_prefix='/entrepreneur')
-    app.register_blueprint(ally_bp, url_prefix='/ally')
-    app.register_blueprint(client_bp, url_prefix='/client')
-    
-    # API blueprints
-    app.register_blueprint(api_v1_bp, url_prefix='/api/v1')
-
-
 def setup_middleware(app):
     """
     Configura middleware personalizado para la aplicación.
@@ -214,6 +188,30 @@ def setup_logging(app):
         app.logger.info('Ecosistema de Emprendimiento startup')
 
 
+def setup_document_encryption(app):
+    """
+    Configura el anillo de claves del cifrado de documentos.
+    
+    Args:
+        app (Flask): Instancia de la aplicación Flask.
+    """
+    
+    from app.utils.envelope_crypto import init_keyring
+    init_keyring(app)
+
+
+def setup_metric_rollups(app):
+    """
+    Registra el seguimiento de registros de origen que cambian de hora.
+    
+    Args:
+        app (Flask): Instancia de la aplicación Flask.
+    """
+    
+    from app.services.metric_rollups import track_moved_facts
+    track_moved_facts()
+
+
 def setup_upload_directory(app):
     """
     Crea el directorio de uploads si no existe.
@@ -103,7 +103,7 @@ class MiddlewareRegistry:
     """Registro centralizado de middlewares."""
     
     def __init__(self):
-        self.middlewares: dict[str, Dict] = {}
+        self.middlewares: dict[str, dict] = {}
         self.execution_order: list[str] = []
         self.metrics: dict[str, Any] = {}
         
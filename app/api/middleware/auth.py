@@ -165,7 +165,7 @@ class JWTAuthenticator:
         self.config = config
         self.blacklist_manager = TokenBlacklistManager()
     
-    def create_tokens(self, user: User, additional_claims: Dict = None) -> tuple[str, str]:
+    def create_tokens(self, user: User, additional_claims: dict = None) -> tuple[str, str]:
         """Crea access y refresh tokens."""
         claims = {
             'user_id': user.id,
@@ -20,7 +20,7 @@ Funcionalidades:
 from flask import Blueprint, request, jsonify, current_app, g
 from flask_restful import Resource, Api
 from sqlalchemy import or_, and_, func, desc, asc, case
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, selectinload
 from datetime import datetime, timedelta, time
 from typing import Any, Optional
 from decimal import Decimal
@@ -53,6 +53,7 @@ from app.utils.decorators import validate_json, log_activity
 from app.api.middleware.auth import api_auth_required, get_current_user
 from app.api import paginated_response, api_response
 from app.api.v1 import APIv1Validator
+from app.utils.pagination import KeysetPaginator, InvalidCursorError
 
 
 # Crear blueprint para allies
@@ -60,6 +61,22 @@ allies_bp = Blueprint('allies', __name__)
 api = Api(allies_bp)
 
 
+# Paginación keyset del listado: campos de ordenamiento permitidos
+ally_paginator = KeysetPaginator(
+    sort_fields={
+        'created_at': User.created_at,
+        'updated_at': User.updated_at,
+        'years_experience': Ally.years_experience,
+        'average_rating': Ally.average_rating,
+        'total_mentees': Ally.total_mentees,
+        'sessions_completed': Ally.sessions_completed,
+        'last_active': Ally.last_active
+    },
+    tiebreaker=Ally.id,
+    nullable_fields={'updated_at', 'years_experience', 'average_rating', 'total_mentees', 'sessions_completed', 'last_active'}
+)
+
+
 class AllyConfig:
     """Configuración específica para aliados/mentores"""
     
@@ -123,22 +140,21 @@ class AlliesListResource(Resource):
             rating_min: Calificación mínima
             languages: Idiomas hablados
             sort_by: Campo para ordenar
+            sort_order: asc o desc
+            cursor: Cursor next_cursor/prev_cursor de una página anterior
+            total: none (defecto), exact, cached o estimate
         
         Returns:
             Lista paginada de aliados/mentores
         """
         current_user = get_current_user()
         
-        # Parámetros de paginación
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
-        page, per_page = APIv1Validator.validate_pagination_params(page, per_page)
-        
-        # Construir query base con joins optimizados
+        # Construir query base: relaciones escalares con JOIN y
+        # colecciones con SELECT IN para no multiplicar filas por página
         query = db.session.query(Ally).join(User).options(
             joinedload(Ally.user),
             joinedload(Ally.organization),
-            joinedload(Ally.current_programs)
+            selectinload(Ally.current_programs)
         )
         
         # Filtro base: solo aliados activos
@@ -229,34 +245,14 @@ class AlliesListResource(Resource):
             for lang in language_list:
                 query = query.filter(Ally.languages.contains([lang]))
         
-        # Ordenamiento
-        sort_by = request.args.get('sort_by', 'created_at')
-        sort_order = request.args.get('sort_order', 'desc')
-        
-        valid_sort_fields = [
-            'created_at', 'updated_at', 'years_experience', 'average_rating',
-            'total_mentees', 'sessions_completed', 'last_active'
-        ]
-        
-        if sort_by not in valid_sort_fields:
-            sort_by = 'created_at'
-        
-        if sort_by in ['created_at', 'updated_at']:
-            sort_field = getattr(User, sort_by)
-        else:
-            sort_field = getattr(Ally, sort_by)
-        
-        if sort_order.lower() == 'asc':
-            query = query.order_by(asc(sort_field))
-        else:
-            query = query.order_by(desc(sort_field))
-        
-        # Ejecutar paginación
-        paginated = query.paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        # Paginación keyset (ordenamiento validado por el paginador)
+        try:
+            paginated = ally_paginator.paginate_request(query, request.args)
+        except InvalidCursorError as e:
+            raise ValidationError(str(e))
         
-        # Serializar resultados
+        # Serializar resultados (estadísticas cargadas en lote para toda la página)
+        Ally.load_batch_stats(paginated.items)
         allies_data = []
         for ally in paginated.items:
             data = ally.to_dict(include_user=True, include_stats=True)
@@ -267,16 +263,7 @@ class AlliesListResource(Resource):
         
         return {
             'allies': allies_data,
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': paginated.total,
-                'pages': paginated.pages,
-                'has_prev': paginated.has_prev,
-                'has_next': paginated.has_next,
-                'prev_page': paginated.prev_num if paginated.has_prev else None,
-                'next_page': paginated.next_num if paginated.has_next else None
-            },
+            'pagination': paginated.to_dict(),
             'filters_applied': {
                 'search': search,
                 'expertise_area': expertise_area,
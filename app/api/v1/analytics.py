@@ -155,7 +155,7 @@ def calculate_growth_rate(current: float, previous: float) -> float:
         return 100.0 if current > 0 else 0.0
     return round(((current - previous) / previous) * 100, 2)
 
-def generate_time_series(start_date: date, end_date: date, granularity: str) -> list[Dict]:
+def generate_time_series(start_date: date, end_date: date, granularity: str) -> list[dict]:
     """Genera serie temporal para gráficos."""
     series = []
     current = start_date
@@ -140,6 +140,9 @@ class LoginResource(Resource):
         
         # Verificar 2FA si está habilitado
         if user.two_factor_enabled:
+            # La contraseña ya es válida: persistir su rehash antes de salir por 2FA
+            db.session.commit()
+            
             if not totp_code:
                 return {
                     'requires_2fa': True,
@@ -360,7 +363,7 @@ class RegisterResource(Resource):
                 "una minúscula, una mayúscula, un número y un carácter especial"
             )
     
-    def _create_specific_user_profile(self, user: User, user_type: str, organization_name: str, data: Dict) -> Any:
+    def _create_specific_user_profile(self, user: User, user_type: str, organization_name: str, data: dict) -> Any:
         """Crea el perfil específico según el tipo de usuario"""
         if user_type == 'entrepreneur':
             entrepreneur = Entrepreneur(
@@ -1131,7 +1134,7 @@ class OAuthLoginResource(Resource):
             current_app.logger.error(f"OAuth login error: {e}")
             raise BusinessLogicError("Error en autenticación OAuth")
     
-    def _create_oauth_user(self, user_info: Dict, provider: str) -> User:
+    def _create_oauth_user(self, user_info: dict, provider: str) -> User:
         """Crea usuario desde información OAuth"""
         email = user_info['email']
         first_name = user_info.get('given_name', '')
@@ -20,7 +20,7 @@ Funcionalidades:
 from flask import Blueprint, request, jsonify, current_app, g, send_file
 from flask_restful import Resource, Api
 from sqlalchemy import or_, and_, func, desc, asc, case
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, selectinload
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 from decimal import Decimal
@@ -53,6 +53,7 @@ from app.utils.decorators import validate_json, log_activity
 from app.api.middleware.auth import api_auth_required, get_current_user
 from app.api import paginated_response, api_response
 from app.api.v1 import APIv1Validator
+from app.utils.pagination import KeysetPaginator, InvalidCursorError
 
 
 # Crear blueprint para clients
@@ -60,6 +61,22 @@ clients_bp = Blueprint('clients', __name__)
 api = Api(clients_bp)
 
 
+# Paginación keyset del listado: campos de ordenamiento permitidos
+client_paginator = KeysetPaginator(
+    sort_fields={
+        'created_at': User.created_at,
+        'updated_at': User.updated_at,
+        'organization': Client.organization,
+        'investment_range_min': Client.investment_range_min,
+        'investment_range_max': Client.investment_range_max,
+        'active_engagements': Client.active_engagements,
+        'total_investments': Client.total_investments
+    },
+    tiebreaker=Client.id,
+    nullable_fields={'updated_at', 'organization', 'investment_range_min', 'investment_range_max', 'active_engagements', 'total_investments'}
+)
+
+
 class ClientConfig:
     """Configuración específica para clientes/stakeholders"""
     
@@ -127,22 +144,21 @@ class ClientsListResource(Resource):
             investment_range_max: Rango máximo de inversión
             active_engagements: Solo clientes con engagements activos
             sort_by: Campo para ordenar
+            sort_order: asc o desc
+            cursor: Cursor next_cursor/prev_cursor de una página anterior
+            total: none (defecto), exact, cached o estimate
         
         Returns:
             Lista paginada de clientes/stakeholders
         """
         current_user = get_current_user()
         
-        # Parámetros de paginación
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
-        page, per_page = APIv1Validator.validate_pagination_params(page, per_page)
-        
-        # Construir query base con joins optimizados
+        # Construir query base: relaciones escalares con JOIN y
+        # colecciones con SELECT IN para no multiplicar filas por página
         query = db.session.query(Client).join(User).options(
             joinedload(Client.user),
             joinedload(Client.organization),
-            joinedload(Client.current_programs)
+            selectinload(Client.current_programs)
         )
         
         # Filtro base: solo clientes activos
@@ -228,32 +244,11 @@ class ClientsListResource(Resource):
             else:
                 query = query.filter(Client.active_engagements == 0)
         
-        # Ordenamiento
-        sort_by = request.args.get('sort_by', 'created_at')
-        sort_order = request.args.get('sort_order', 'desc')
-        
-        valid_sort_fields = [
-            'created_at', 'updated_at', 'organization', 'investment_range_min',
-            'investment_range_max', 'active_engagements', 'total_investments'
-        ]
-        
-        if sort_by not in valid_sort_fields:
-            sort_by = 'created_at'
-        
-        if sort_by in ['created_at', 'updated_at']:
-            sort_field = getattr(User, sort_by)
-        else:
-            sort_field = getattr(Client, sort_by)
-        
-        if sort_order.lower() == 'asc':
-            query = query.order_by(asc(sort_field))
-        else:
-            query = query.order_by(desc(sort_field))
-        
-        # Ejecutar paginación
-        paginated = query.paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        # Paginación keyset (ordenamiento validado por el paginador)
+        try:
+            paginated = client_paginator.paginate_request(query, request.args)
+        except InvalidCursorError as e:
+            raise ValidationError(str(e))
         
         # Serializar resultados
         clients_data = []
@@ -266,16 +261,7 @@ class ClientsListResource(Resource):
         
         return {
             'clients': clients_data,
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': paginated.total,
-                'pages': paginated.pages,
-                'has_prev': paginated.has_prev,
-                'has_next': paginated.has_next,
-                'prev_page': paginated.prev_num if paginated.has_prev else None,
-                'next_page': paginated.next_num if paginated.has_next else None
-            },
+            'pagination': paginated.to_dict(),
             'filters_applied': {
                 'search': search,
                 'client_type': client_type,
@@ -20,7 +20,7 @@ Funcionalidades:
 from flask import Blueprint, request, jsonify, current_app, g
 from flask_restful import Resource, Api
 from sqlalchemy import or_, and_, func, desc, asc, case
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, selectinload
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 from decimal import Decimal
@@ -51,6 +51,7 @@ from app.utils.decorators import validate_json, log_activity
 from app.api.middleware.auth import api_auth_required, get_current_user
 from app.api import paginated_response, api_response
 from app.api.v1 import APIv1Validator
+from app.utils.pagination import KeysetPaginator, InvalidCursorError
 
 
 # Crear blueprint para entrepreneurs
@@ -58,6 +59,22 @@ entrepreneurs_bp = Blueprint('entrepreneurs', __name__)
 api = Api(entrepreneurs_bp)
 
 
+# Paginación keyset del listado: campos de ordenamiento permitidos
+entrepreneur_paginator = KeysetPaginator(
+    sort_fields={
+        'created_at': User.created_at,
+        'updated_at': User.updated_at,
+        'company_name': Entrepreneur.company_name,
+        'business_stage': Entrepreneur.business_stage,
+        'years_experience': Entrepreneur.years_experience,
+        'funding_raised': Entrepreneur.funding_raised,
+        'team_size': Entrepreneur.team_size
+    },
+    tiebreaker=Entrepreneur.id,
+    nullable_fields={'updated_at', 'company_name', 'business_stage', 'years_experience', 'funding_raised', 'team_size'}
+)
+
+
 class EntrepreneurConfig:
     """Configuración específica para emprendedores"""
     
@@ -110,21 +127,20 @@ class EntrepreneursListResource(Resource):
             organization_id: Filtrar por organización
             program_id: Filtrar por programa
             sort_by: Campo para ordenar
+            sort_order: asc o desc
+            cursor: Cursor next_cursor/prev_cursor de una página anterior
+            total: none (defecto), exact, cached o estimate
         
         Returns:
             Lista paginada de emprendedores
         """
         current_user = get_current_user()
         
-        # Parámetros de paginación
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
-        page, per_page = APIv1Validator.validate_pagination_params(page, per_page)
-        
-        # Construir query base con joins optimizados
+        # Construir query base: relaciones escalares con JOIN y
+        # colecciones con SELECT IN para no multiplicar filas por página
         query = db.session.query(Entrepreneur).join(User).options(
             joinedload(Entrepreneur.user),
-            joinedload(Entrepreneur.projects),
+            selectinload(Entrepreneur.projects),
             joinedload(Entrepreneur.organization)
         )
         
@@ -206,51 +222,20 @@ class EntrepreneursListResource(Resource):
         if program_id:
             query = query.filter(Entrepreneur.current_programs.any(Program.id == program_id))
         
-        # Ordenamiento
-        sort_by = request.args.get('sort_by', 'created_at')
-        sort_order = request.args.get('sort_order', 'desc')
-        
-        valid_sort_fields = [
-            'created_at', 'updated_at', 'company_name', 'business_stage',
-            'years_experience', 'funding_raised', 'team_size'
-        ]
-        
-        if sort_by not in valid_sort_fields:
-            sort_by = 'created_at'
-        
-        if sort_by in ['created_at', 'updated_at']:
-            sort_field = getattr(User, sort_by)
-        else:
-            sort_field = getattr(Entrepreneur, sort_by)
-        
-        if sort_order.lower() == 'asc':
-            query = query.order_by(asc(sort_field))
-        else:
-            query = query.order_by(desc(sort_field))
+        # Paginación keyset (ordenamiento validado por el paginador)
+        try:
+            paginated = entrepreneur_paginator.paginate_request(query, request.args)
+        except InvalidCursorError as e:
+            raise ValidationError(str(e))
         
-        # Ejecutar paginación
-        paginated = query.paginate(
-            page=page, per_page=per_page, error_out=False
+        # Serializar resultados (estadísticas cargadas en lote para toda la página)
+        entrepreneurs_data = Entrepreneur.serialize_batch(
+            paginated.items, include_user=True, include_stats=True
         )
         
-        # Serializar resultados
-        entrepreneurs_data = []
-        for entrepreneur in paginated.items:
-            data = entrepreneur.to_dict(include_user=True, include_stats=True)
-            entrepreneurs_data.append(data)
-        
         return {
             'entrepreneurs': entrepreneurs_data,
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': paginated.total,
-                'pages': paginated.pages,
-                'has_prev': paginated.has_prev,
-                'has_next': paginated.has_next,
-                'prev_page': paginated.prev_num if paginated.has_prev else None,
-                'next_page': paginated.next_num if paginated.has_next else None
-            },
+            'pagination': paginated.to_dict(),
             'filters_applied': {
                 'search': search,
                 'business_stage': business_stage,
@@ -389,10 +374,9 @@ class EntrepreneurDetailResource(Resource):
         
         # Incluir proyectos si se solicita
         if include_projects:
-            entrepreneur_data['projects'] = [
-                project.to_dict(include_stats=True) 
-                for project in entrepreneur.projects
-            ]
+            entrepreneur_data['projects'] = Project.serialize_batch(
+                entrepreneur.projects, include_stats=True
+            )
         
         # Incluir métricas si se solicita
         if include_metrics:
@@ -1262,7 +1246,7 @@ class EntrepreneurProjectsResource(Resource):
         
         return {
             'entrepreneur_id': entrepreneur_id,
-            'projects': [project.to_dict(include_stats=True) for project in projects],
+            'projects': Project.serialize_batch(projects, include_stats=True),
             'total_projects': len(projects),
             'filters_applied': {
                 'status': status,
@@ -1415,8 +1399,9 @@ class EntrepreneurMetricsResource(Resource):
                 name=data.get('description', f"Entrepreneur {data['metric_type']}"),
                 unit=data.get('unit'),
                 user_id=entrepreneur.user_id,
-                metadata=data.get('metadata', {}),
-                organization_id=entrepreneur.user.organization_id
+                analytics_metadata=data.get('metadata', {}),
+                organization_id=entrepreneur.user.organization_id,
+                sync=True
             )
             
             return metric.to_dict(), 201
@@ -33,6 +33,7 @@ from app.core.exceptions import ValidationException, BusinessException, Integrat
 from app.utils.decorators import api_response, rate_limit, log_activity
 from app.utils.validators import validate_uuid, validate_datetime_range, validate_timezone
 from app.utils.date_utils import convert_timezone, get_user_timezone
+from app.utils.pagination import KeysetPaginator, InvalidCursorError, PAGINATION_CONFIG, TOTAL_MODES
 from app.extensions import db, cache
 
 # Blueprint configuration
@@ -135,6 +136,20 @@ class MeetingUpdateSchema(Schema):
                 raise ValidationException("La hora de fin debe ser posterior a la hora de inicio")
         return data
 
+# Paginación keyset del listado: campos de ordenamiento permitidos
+meeting_paginator = KeysetPaginator(
+    sort_fields={
+        'start_time': Meeting.start_time,
+        'created_at': Meeting.created_at,
+        'title': Meeting.title,
+        'meeting_type': Meeting.meeting_type
+    },
+    tiebreaker=Meeting.id,
+    default_sort='start_time',
+    default_order='asc',
+    nullable_fields={'meeting_type'}
+)
+
 class MeetingFilterSchema(Schema):
     """Schema para filtros de búsqueda"""
     page = fields.Int(missing=1, validate=validate.Range(min=1))
@@ -158,6 +173,8 @@ class MeetingFilterSchema(Schema):
         'start_time', 'created_at', 'title', 'meeting_type'
     ]))
     sort_order = fields.Str(missing='asc', validate=validate.OneOf(['asc', 'desc']))
+    cursor = fields.Str()
+    total = fields.Str(missing=PAGINATION_CONFIG['default_total_mode'], validate=validate.OneOf(TOTAL_MODES))
 
 class MeetingResponseSchema(Schema):
     """Schema para respuesta de reunión"""
@@ -292,19 +309,15 @@ def get_meetings():
                 (Meeting.is_public == True)
             )
         
-        # Ordenamiento
-        sort_field = getattr(Meeting, filters['sort_by'])
-        if filters['sort_order'] == 'desc':
-            sort_field = sort_field.desc()
-        meetings_query = meetings_query.order_by(sort_field)
-        
-        # Paginación
-        page = filters['page']
-        per_page = filters['per_page']
-        meetings_paginated = meetings_query.paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
+        # Ordenamiento y paginación keyset
+        meetings_paginated = meeting_paginator.paginate(
+            meetings_query,
+            sort_by=filters['sort_by'],
+            sort_order=filters['sort_order'],
+            cursor=filters.get('cursor'),
+            per_page=filters['per_page'],
+            page=filters['page'],
+            total=filters['total']
         )
         
         # Serializar resultados
@@ -322,20 +335,15 @@ def get_meetings():
         
         return {
             'meetings': meetings_data,
-            'pagination': {
-                'page': meetings_paginated.page,
-                'pages': meetings_paginated.pages,
-                'per_page': meetings_paginated.per_page,
-                'total': meetings_paginated.total,
-                'has_next': meetings_paginated.has_next,
-                'has_prev': meetings_paginated.has_prev
-            },
+            'pagination': meetings_paginated.to_dict(),
             'filters_applied': filter_data,
             'user_timezone': user_timezone
         }, 200
         
     except ValidationError as e:
         raise BadRequest(f"Parámetros de consulta inválidos: {e.messages}")
+    except InvalidCursorError as e:
+        raise BadRequest(str(e))
     except Exception as e:
         current_app.logger.error(f"Error al obtener reuniones: {str(e)}")
         raise
@@ -1363,7 +1371,7 @@ def get_meeting_statistics():
 
 # Funciones auxiliares privadas
 
-def _build_meeting_filters(filter_data: Dict) -> Dict:
+def _build_meeting_filters(filter_data: dict) -> dict:
     """Construir filtros de reunión"""
     return filter_data
 
@@ -1375,39 +1383,30 @@ def _check_organizer_availability(
     exclude_meeting_id: Optional[uuid.UUID] = None
 ) -> bool:
     """Verificar disponibilidad del organizador"""
-    query = Meeting.query.filter(
-        Meeting.organizer_id == organizer_id,
-        Meeting.status.in_(['scheduled', 'in_progress']),
-        Meeting.start_time < end_time,
-        Meeting.end_time > start_time
-    )
-    
-    if exclude_meeting_id:
-        query = query.filter(Meeting.id != exclude_meeting_id)
-    
-    return query.count() == 0
+    return not Meeting.find_conflicts([organizer_id], start_time, end_time, exclude_meeting_id)
 
 
 def _check_attendees_availability(
-    attendees: list[Dict], 
+    attendees: list[dict], 
     start_time: datetime, 
     end_time: datetime
-) -> list[Dict]:
-    """Verificar disponibilidad de asistentes"""
-    unavailable = []
+) -> list[dict]:
+    """Verificar disponibilidad de asistentes (una consulta para todos)"""
+    user_ids = [attendee_data['user_id'] for attendee_data in attendees]
+    conflicts = Meeting.find_conflicts(user_ids, start_time, end_time)
+    if not conflicts:
+        return []
     
-    for attendee_data in attendees:
-        user_id = attendee_data['user_id']
-        if not _check_user_availability(user_id, start_time, end_time):
-            user = User.query.get(user_id)
-            if user:
-                unavailable.append({
-                    'user_id': user_id,
-                    'name': user.full_name,
-                    'conflicts': _get_user_conflicts(user_id, start_time, end_time)
-                })
-    
-    return unavailable
+    users = {user.id: user for user in User.query.filter(User.id.in_(list(conflicts))).all()}
+    return [
+        {
+            'user_id': user_id,
+            'name': users[user_id].full_name,
+            'conflicts': _serialize_conflicts(conflicts[user_id])
+        }
+        for user_id in user_ids
+        if user_id in conflicts and user_id in users
+    ]
 
 
 def _check_user_availability(
@@ -1416,41 +1415,33 @@ def _check_user_availability(
     end_time: datetime
 ) -> bool:
     """Verificar disponibilidad de un usuario"""
-    conflicts = Meeting.query.filter(
-        Meeting.attendees.any(User.id == user_id),
-        Meeting.status.in_(['scheduled', 'in_progress']),
-        Meeting.start_time < end_time,
-        Meeting.end_time > start_time
-    ).count()
-    
-    return conflicts == 0
+    return not Meeting.find_conflicts([user_id], start_time, end_time)
 
 
 def _get_user_conflicts(
     user_id: uuid.UUID, 
     start_time: datetime, 
     end_time: datetime
-) -> list[Dict]:
+) -> list[dict]:
     """Obtener conflictos de horario de un usuario"""
-    conflicts = Meeting.query.filter(
-        Meeting.attendees.any(User.id == user_id),
-        Meeting.status.in_(['scheduled', 'in_progress']),
-        Meeting.start_time < end_time,
-        Meeting.end_time > start_time
-    ).all()
-    
+    conflicts = Meeting.find_conflicts([user_id], start_time, end_time)
+    return _serialize_conflicts(conflicts.get(user_id, []))
+
+
+def _serialize_conflicts(intervals: list) -> list[dict]:
+    """Serializar las reuniones en conflicto devueltas por ``Meeting.find_conflicts``"""
     return [
         {
-            'meeting_id': meeting.id,
-            'title': meeting.title,
-            'start_time': meeting.start_time.isoformat(),
-            'end_time': meeting.end_time.isoformat()
+            'meeting_id': interval.data['meeting_id'],
+            'title': interval.data['title'],
+            'start_time': interval.start.isoformat(),
+            'end_time': interval.end.isoformat()
         }
-        for meeting in conflicts
+        for interval in intervals
     ]
 
 
-def _create_recurring_meetings(meeting: Meeting, recurrence_data: Dict):
+def _create_recurring_meetings(meeting: Meeting, recurrence_data: dict):
     """Crear reuniones recurrentes"""
     # Implementar lógica de recurrencia
     # Esta función creará las instancias futuras basadas en la configuración
@@ -1478,13 +1469,13 @@ def _schedule_meeting_reminders(meeting: Meeting):
         # )
 
 
-def _has_significant_changes(update_data: Dict) -> bool:
+def _has_significant_changes(update_data: dict) -> bool:
     """Verificar si hay cambios significativos"""
     significant_fields = ['start_time', 'end_time', 'location', 'platform', 'title']
     return any(field in update_data for field in significant_fields)
 
 
-def _calculate_time_until_start(start_time: datetime) -> Dict:
+def _calculate_time_until_start(start_time: datetime) -> dict:
     """Calcular tiempo hasta el inicio de la reunión"""
     now = datetime.now(timezone.utc)
     delta = start_time - now
@@ -19,6 +19,8 @@ from sqlalchemy.orm import joinedload
 
 # Imports internos
 from app.models.message import Message, MessageType, MessageStatus, MessageThread, MessageAttachment
+from app.models.message import Conversation
+from app.models.inbox import InboxIndex
 from app.models.user import User
 from app.models.entrepreneur import Entrepreneur
 from app.models.ally import Ally
@@ -32,10 +34,12 @@ from app.services.analytics_service import AnalyticsService
 from app.services.email import EmailService
 from app.core.permissions import require_permission, check_message_access
 from app.core.exceptions import ValidationException, BusinessException, StorageException
+from app.core.exceptions import ValidationError as ModelValidationError
 from app.utils.decorators import api_response, rate_limit, log_activity
 from app.utils.validators import validate_uuid, validate_file_size, validate_file_type
 from app.utils.formatters import format_file_size, sanitize_message_content
 from app.utils.file_utils import get_file_extension, generate_unique_filename
+from app.utils.pagination import InvalidCursorError
 from app.extensions import db, cache, socketio
 
 # Importar eventos de WebSocket
@@ -1399,6 +1403,51 @@ def remove_thread_participant(thread_id: uuid.UUID, user_id: uuid.UUID):
         raise
 
 
+@messages_bp.route('/conversations/<uuid:conversation_id>/history', methods=['GET'])
+@login_required
+@rate_limit(requests=600, window=3600)
+@api_response
+def get_conversation_history(conversation_id: uuid.UUID):
+    """
+    Historial de una conversación paginado por cursor
+    
+    Query params:
+        cursor: Cursor devuelto en 'before' o 'after' de una página anterior
+        direction: 'older' (por defecto) o 'newer'
+        around: ID de un mensaje ancla para cargar el contexto a su alrededor
+        limit: Tamaño de página (máximo 200)
+    
+    Returns:
+        JSON: Mensajes en orden cronológico con cursores de continuación
+    """
+    try:
+        if not Conversation.is_participant(conversation_id, current_user.id):
+            raise Forbidden("No eres participante de esta conversación")
+        
+        limit = request.args.get('limit', type=int)
+        around = request.args.get('around')
+        
+        if around:
+            history = Message.get_history_around(conversation_id, around, limit=limit)
+        else:
+            history = Message.get_history(
+                conversation_id,
+                cursor=request.args.get('cursor'),
+                direction=request.args.get('direction', 'older'),
+                limit=limit
+            )
+        
+        return history, 200
+        
+    except (InvalidCursorError, ModelValidationError) as e:
+        raise BadRequest(str(e))
+    except Forbidden as e:
+        raise e
+    except Exception as e:
+        current_app.logger.error(f"Error al obtener historial de {conversation_id}: {str(e)}")
+        raise
+
+
 @messages_bp.route('/search', methods=['GET'])
 @login_required
 @rate_limit(requests=100, window=3600)
@@ -1505,55 +1554,27 @@ def search_messages():
 @messages_bp.route('/unread', methods=['GET'])
 @login_required
 @rate_limit(requests=200, window=3600)
-@cache.cached(timeout=60)  # Cache for 1 minute
 @api_response
 def get_unread_messages():
     """
-    Obtener mensajes no leídos del usuario
+    Obtener conversaciones con mensajes no leídos del usuario
+    
+    Se resuelve en una sola consulta sobre el índice de bandeja de entrada
+    (contadores e instantánea del último mensaje por conversación); cada
+    hilo incluye su último mensaje como vista previa.
     
     Returns:
-        JSON: Lista de mensajes no leídos
+        JSON: Conversaciones con mensajes no leídos
     """
     try:
-        limit = int(request.args.get('limit', 50))
+        limit = min(int(request.args.get('limit', 50)), 200)
         
-        # Obtener mensajes no leídos
-        unread_query = Message.query.filter(
-            Message.recipients.any(User.id == current_user.id),
-            ~Message.read_by.any(
-                and_(
-                    Message.read_by.c.user_id == current_user.id,
-                    Message.read_by.c.is_read == True
-                )
-            ),
-            Message.is_deleted == False
-        ).options(
-            joinedload(Message.sender),
-            joinedload(Message.thread)
-        ).order_by(Message.created_at.desc()).limit(limit)
-        
-        unread_messages = unread_query.all()
-        
-        # Agrupar por hilo
-        threads_unread = {}
-        for message in unread_messages:
-            thread_id = str(message.thread_id)
-            if thread_id not in threads_unread:
-                threads_unread[thread_id] = {
-                    'thread': thread_response_schema.dump(message.thread),
-                    'messages': [],
-                    'count': 0
-                }
-            
-            message_dict = message_response_schema.dump(message)
-            message_dict['content_preview'] = _get_content_preview(message.content, message.message_type)
-            threads_unread[thread_id]['messages'].append(message_dict)
-            threads_unread[thread_id]['count'] += 1
+        inbox = InboxIndex.get_unread_inbox(current_user.id, limit=limit)
         
         return {
-            'unread_threads': list(threads_unread.values()),
-            'total_unread': len(unread_messages),
-            'threads_with_unread': len(threads_unread)
+            'unread_threads': [_unread_thread_entry(entry) for entry in inbox],
+            'total_unread': inbox[0]['total_unread'] if inbox else 0,
+            'threads_with_unread': inbox[0]['threads_with_unread'] if inbox else 0
         }, 200
         
     except Exception as e:
@@ -1599,6 +1620,13 @@ def mark_all_messages_read():
             message.mark_as_read(current_user.id)
             marked_count += 1
         
+        # Reiniciar contadores del índice de bandeja (indexado por conversación, no por hilo)
+        if thread_id:
+            for conversation_id in _thread_conversation_ids(thread_id):
+                InboxIndex.mark_read(conversation_id, current_user.id)
+        else:
+            InboxIndex.mark_all_read(current_user.id)
+        
         db.session.commit()
         
         # Emitir evento de mensajes leídos
@@ -1842,18 +1870,43 @@ def _mark_messages_as_delivered(messages: list[Message]):
         db.session.commit()
 
 
+def _thread_conversation_ids(thread_id) -> list:
+    """Conversaciones a las que pertenecen los mensajes de un hilo"""
+    rows = db.session.query(Message.conversation_id).filter(
+        Message.thread_id == thread_id,
+        Message.conversation_id.isnot(None)
+    ).distinct()
+    return [row.conversation_id for row in rows]
+
+
+def _unread_thread_entry(entry: dict) -> dict:
+    """Entrada de /unread a partir de una fila del índice de bandeja (hilo, mensajes y contador)"""
+    messages = []
+    if entry['last_message_id']:
+        messages.append({
+            'id': entry['last_message_id'],
+            'sender_id': entry['last_message_sender_id'],
+            'message_type': entry['last_message_type'],
+            'content_preview': entry['last_message_preview'],
+            'created_at': entry['last_message_at']
+        })
+    
+    return {
+        'thread': {
+            'id': entry['conversation_id'],
+            'title': entry['title'],
+            'thread_type': entry['type'],
+            'unread_count': entry['unread_count'],
+            'last_activity_at': entry['last_message_at']
+        },
+        'messages': messages,
+        'count': entry['unread_count']
+    }
+
+
 def _get_user_unread_count() -> int:
     """Obtener cantidad de mensajes no leídos del usuario"""
-    return Message.query.filter(
-        Message.recipients.any(User.id == current_user.id),
-        ~Message.read_by.any(
-            and_(
-                Message.read_by.c.user_id == current_user.id,
-                Message.read_by.c.is_read == True
-            )
-        ),
-        Message.is_deleted == False
-    ).count()
+    return InboxIndex.get_total_unread(current_user.id)
 
 
 def _validate_file(file) -> bool:
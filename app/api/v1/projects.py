@@ -26,6 +26,7 @@ from app.core.permissions import require_permission, check_project_access
 from app.core.exceptions import ValidationException, BusinessException
 from app.utils.decorators import api_response, rate_limit, log_activity
 from app.utils.validators import validate_uuid, validate_date_range
+from app.utils.pagination import KeysetPaginator, InvalidCursorError, PAGINATION_CONFIG, TOTAL_MODES
 from app.extensions import db, cache
 
 # Blueprint configuration
@@ -88,6 +89,19 @@ class ProjectUpdateSchema(Schema):
     allow_collaboration = fields.Bool()
     progress_percentage = fields.Int(validate=validate.Range(min=0, max=100))
     
+# Paginación keyset del listado: campos de ordenamiento permitidos
+project_paginator = KeysetPaginator(
+    sort_fields={
+        'created_at': Project.created_at,
+        'updated_at': Project.updated_at,
+        'name': Project.name,
+        'stage': Project.stage,
+        'progress_percentage': Project.progress_percentage
+    },
+    tiebreaker=Project.id,
+    nullable_fields={'updated_at', 'stage', 'progress_percentage'}
+)
+
 class ProjectFilterSchema(Schema):
     """Schema para filtros de búsqueda"""
     page = fields.Int(missing=1, validate=validate.Range(min=1))
@@ -109,6 +123,8 @@ class ProjectFilterSchema(Schema):
         'created_at', 'updated_at', 'name', 'stage', 'progress_percentage'
     ]))
     sort_order = fields.Str(missing='desc', validate=validate.OneOf(['asc', 'desc']))
+    cursor = fields.Str()
+    total = fields.Str(missing=PAGINATION_CONFIG['default_total_mode'], validate=validate.OneOf(TOTAL_MODES))
 
 class ProjectResponseSchema(Schema):
     """Schema para respuesta de proyecto"""
@@ -175,13 +191,15 @@ def get_projects():
         # Obtener proyectos con paginación
         projects_query = project_service.get_projects_query(filters)
         
-        # Aplicar paginación
-        page = filter_data['page']
-        per_page = filter_data['per_page']
-        projects_paginated = projects_query.paginate(
-            page=page, 
-            per_page=per_page, 
-            error_out=False
+        # Aplicar paginación keyset (con OFFSET solo si se pide una página sin cursor)
+        projects_paginated = project_paginator.paginate(
+            projects_query,
+            sort_by=filter_data['sort_by'],
+            sort_order=filter_data['sort_order'],
+            cursor=filter_data.get('cursor'),
+            per_page=filter_data['per_page'],
+            page=filter_data['page'],
+            total=filter_data['total']
         )
         
         # Serializar resultados
@@ -196,14 +214,7 @@ def get_projects():
         # Construir respuesta
         response_data = {
             'projects': projects_data,
-            'pagination': {
-                'page': projects_paginated.page,
-                'pages': projects_paginated.pages,
-                'per_page': projects_paginated.per_page,
-                'total': projects_paginated.total,
-                'has_next': projects_paginated.has_next,
-                'has_prev': projects_paginated.has_prev
-            },
+            'pagination': projects_paginated.to_dict(),
             'filters_applied': filter_data
         }
         
@@ -211,6 +222,8 @@ def get_projects():
         
     except ValidationError as e:
         raise BadRequest(f"Parámetros de consulta inválidos: {e.messages}")
+    except InvalidCursorError as e:
+        raise BadRequest(str(e))
     except Exception as e:
         current_app.logger.error(f"Error al obtener proyectos: {str(e)}")
         raise
@@ -677,7 +690,7 @@ def get_projects_statistics():
 
 # Funciones auxiliares privadas
 
-def _build_project_filters(filter_data: Dict) -> Dict:
+def _build_project_filters(filter_data: dict) -> dict:
     """Construir filtros basados en permisos del usuario"""
     filters = filter_data.copy()
     
@@ -710,7 +723,7 @@ def _can_create_project_for_entrepreneur(user: User, entrepreneur: Entrepreneur)
     return False
 
 
-def _has_significant_changes(update_data: Dict) -> bool:
+def _has_significant_changes(update_data: dict) -> bool:
     """Verificar si los cambios son significativos para notificación"""
     significant_fields = ['status', 'stage', 'progress_percentage', 'budget_requested']
     return any(field in update_data for field in significant_fields)
@@ -43,7 +43,8 @@ from app.core.exceptions import (
 from app.utils.decorators import api_response, rate_limit
 from app.utils.crypto_utils import verify_signature, generate_signature
 from app.utils.string_utils import sanitize_input, mask_sensitive_data
-from app.tasks.webhook_tasks import process_webhook_async, retry_failed_webhook
+from app.services.webhook_inbox import append_event, request_drain, replay_events
+from app.tasks.webhook_tasks import retry_failed_webhook
 from app.extensions import db, cache
 from app.config import Config
 
@@ -52,22 +53,8 @@ webhooks_bp = Blueprint('webhooks', __name__, url_prefix='/api/v1/webhooks')
 
 # Configuración de webhooks
 WEBHOOK_TIMEOUT = 30  # seconds
-MAX_RETRY_ATTEMPTS = 3
 WEBHOOK_SIGNATURE_TOLERANCE = 300  # 5 minutes
 
-class WebhookProvider(Enum):
-    """Proveedores de webhooks soportados."""
-    STRIPE = "stripe"
-    PAYPAL = "paypal"
-    GOOGLE_CALENDAR = "google_calendar"
-    SLACK = "slack"
-    MICROSOFT_TEAMS = "microsoft_teams"
-    ZOOM = "zoom"
-    GITHUB = "github"
-    MAILGUN = "mailgun"
-    TWILIO = "twilio"
-    CUSTOM = "custom"
-
 class WebhookEventType(Enum):
     """Tipos de eventos de webhook."""
     PAYMENT_SUCCESS = "payment.success"
@@ -332,45 +319,39 @@ def verify_hmac_signature(payload: bytes, signature: str, secret: str, prefix: s
     except Exception:
         return False
 
-def log_webhook_event(
+def accept_webhook(
     provider: WebhookProvider,
     event_type: str,
-    event_id: str,
-    payload: Dict,
-    status: WebhookStatus,
-    error_message: Optional[str] = None
-) -> WebhookEvent:
-    """Registra evento de webhook en la base de datos."""
-    try:
-        webhook_event = WebhookEvent(
-            provider=provider,
-            event_type=event_type,
-            event_id=event_id,
-            payload=payload,
-            status=status,
-            error_message=error_message,
-            processed_at=datetime.now(timezone.utc) if status == WebhookStatus.PROCESSED else None
-        )
-        
-        db.session.add(webhook_event)
-        db.session.commit()
-        
-        return webhook_event
+    event_id: Optional[str],
+    payload: dict,
+    resource_key: Optional[str] = None
+):
+    """
+    Guarda el evento en la bandeja y responde sin procesarlo.
     
-    except Exception as e:
-        current_app.logger.error(f"Error guardando evento webhook: {str(e)}")
-        db.session.rollback()
-        raise
-
-def is_duplicate_webhook(provider: WebhookProvider, event_id: str) -> bool:
-    """Verifica si es un webhook duplicado."""
-    existing = WebhookEvent.query.filter_by(
-        provider=provider,
-        event_id=event_id,
-        status=WebhookStatus.PROCESSED
-    ).first()
+    El procesamiento lo hacen los workers (``drain_webhook_inbox``); un
+    reenvío del mismo evento se reconoce por su clave de idempotencia.
+    """
+    webhook_id = append_event(
+        provider,
+        event_type,
+        event_id,
+        payload,
+        resource_key=resource_key,
+        body=request.get_data()
+    )
+    
+    if webhook_id is None:
+        current_app.logger.info(f"Webhook duplicado ignorado: {provider.value}:{event_id}")
+        return {'status': 'duplicate', 'event_id': event_id}
+    
+    request_drain(provider)
     
-    return existing is not None
+    return {
+        'status': 'accepted',
+        'event_id': event_id,
+        'webhook_id': str(webhook_id)
+    }, 202
 
 def require_webhook_auth(provider: WebhookProvider):
     """Decorador para autenticación de webhooks."""
@@ -413,7 +394,7 @@ class WebhookHandlers:
     """Manejadores de eventos por proveedor."""
     
     @staticmethod
-    def handle_stripe_event(event_type: str, data: Dict) -> bool:
+    def handle_stripe_event(event_type: str, data: dict) -> bool:
         """Maneja eventos de Stripe."""
         try:
             if event_type == 'payment_intent.succeeded':
@@ -435,7 +416,7 @@ class WebhookHandlers:
             return False
     
     @staticmethod
-    def handle_google_calendar_event(event_type: str, data: Dict) -> bool:
+    def handle_google_calendar_event(event_type: str, data: dict) -> bool:
         """Maneja eventos de Google Calendar."""
         try:
             calendar_service = GoogleCalendarService()
@@ -455,7 +436,7 @@ class WebhookHandlers:
             return False
     
     @staticmethod
-    def handle_slack_event(event_type: str, data: Dict) -> bool:
+    def handle_slack_event(event_type: str, data: dict) -> bool:
         """Maneja eventos de Slack."""
         try:
             if event_type == 'message':
@@ -473,7 +454,7 @@ class WebhookHandlers:
             return False
     
     @staticmethod
-    def _handle_payment_success(data: Dict, provider: str) -> bool:
+    def _handle_payment_success(data: dict, provider: str) -> bool:
         """Maneja pagos exitosos."""
         try:
             payment_intent_id = data.get('id') or data.get('payment_id')
@@ -507,7 +488,7 @@ class WebhookHandlers:
             return False
     
     @staticmethod
-    def _handle_payment_failed(data: Dict, provider: str) -> bool:
+    def _handle_payment_failed(data: dict, provider: str) -> bool:
         """Maneja pagos fallidos."""
         try:
             payment_intent_id = data.get('id') or data.get('payment_id')
@@ -539,7 +520,7 @@ class WebhookHandlers:
             return False
     
     @staticmethod
-    def _handle_slack_message(data: Dict) -> bool:
+    def _handle_slack_message(data: dict) -> bool:
         """Maneja mensajes de Slack."""
         try:
             # Procesar mensaje y crear notificación si es relevante
@@ -559,11 +540,59 @@ class WebhookHandlers:
             current_app.logger.error(f"Error procesando mensaje Slack: {str(e)}")
             return False
 
+# Despachador de eventos de la bandeja
+
+def dispatch_webhook_event(provider: str, event_type: str, payload: dict) -> bool:
+    """
+    Ejecuta el manejador de negocio de un evento de la bandeja.
+    
+    Lo invocan los workers de ``drain_webhook_inbox``, nunca los endpoints.
+    
+    Args:
+        provider: Valor de ``WebhookProvider``
+        event_type: Tipo de evento
+        payload: Evento guardado en la bandeja
+        
+    Returns:
+        bool: True si el evento se procesó correctamente
+    """
+    provider = WebhookProvider(provider)
+    
+    if provider == WebhookProvider.STRIPE:
+        return WebhookHandlers.handle_stripe_event(event_type, payload.get('data', {}))
+    
+    if provider == WebhookProvider.GOOGLE_CALENDAR:
+        return WebhookHandlers.handle_google_calendar_event(event_type, payload)
+    
+    if provider == WebhookProvider.SLACK:
+        return WebhookHandlers.handle_slack_event(event_type, payload.get('event', {}))
+    
+    if provider == WebhookProvider.PAYPAL:
+        if event_type == 'PAYMENT.CAPTURE.COMPLETED':
+            return WebhookHandlers._handle_payment_success(payload.get('resource', {}), 'paypal')
+        elif event_type == 'PAYMENT.CAPTURE.DENIED':
+            return WebhookHandlers._handle_payment_failed(payload.get('resource', {}), 'paypal')
+        return True
+    
+    if provider == WebhookProvider.GITHUB:
+        # Eventos push, pull_request e issues: solo se registran
+        return True
+    
+    if provider == WebhookProvider.CUSTOM:
+        integration_hub = IntegrationHubService()
+        return bool(integration_hub.handle_incoming_webhook(
+            payload.get('integration_name') or payload.get('integration_id'),
+            payload.get('body', {})
+        ))
+    
+    current_app.logger.info(f"Proveedor de webhook sin manejador: {provider.value}")
+    return True
+
 # Endpoints de webhooks
 
 @webhooks_bp.route('/stripe', methods=['POST'])
 @require_webhook_auth(WebhookProvider.STRIPE)
-@rate_limit(100, per=60)  # 100 webhooks per minute
+@rate_limit(6000, per=60)
 @api_response
 def stripe_webhook():
     """Webhook para eventos de Stripe."""
@@ -572,56 +601,25 @@ def stripe_webhook():
         schema = StripeWebhookSchema()
         data = schema.load(payload)
         
-        event_id = data['id']
-        event_type = data['type']
-        
-        # Verificar duplicados
-        if is_duplicate_webhook(WebhookProvider.STRIPE, event_id):
-            current_app.logger.info(f"Webhook duplicado ignorado: {event_id}")
-            return {'status': 'duplicate', 'event_id': event_id}
-        
-        # Procesar evento
-        success = WebhookHandlers.handle_stripe_event(event_type, data['data'])
-        
-        # Registrar evento
-        status = WebhookStatus.PROCESSED if success else WebhookStatus.FAILED
-        webhook_event = log_webhook_event(
+        resource = data['data'].get('object') or {}
+        return accept_webhook(
             WebhookProvider.STRIPE,
-            event_type,
-            event_id,
+            data['type'],
+            data['id'],
             payload,
-            status,
-            None if success else "Error procesando evento"
+            resource_key=resource.get('id') if isinstance(resource, dict) else None
         )
-        
-        if success:
-            return {
-                'status': 'success',
-                'event_id': event_id,
-                'webhook_id': webhook_event.id
-            }
-        else:
-            # Programar reintento
-            retry_failed_webhook.apply_async(
-                args=[webhook_event.id],
-                countdown=60  # Reintentar en 1 minuto
-            )
-            return {
-                'status': 'failed',
-                'event_id': event_id,
-                'webhook_id': webhook_event.id
-            }, 500
     
     except ValidationError as e:
         current_app.logger.error(f"Webhook Stripe inválido: {e.messages}")
         return {'error': 'Invalid payload', 'details': e.messages}, 400
     except Exception as e:
-        current_app.logger.error(f"Error procesando webhook Stripe: {str(e)}")
+        current_app.logger.error(f"Error recibiendo webhook Stripe: {str(e)}")
         return {'error': 'Internal server error'}, 500
 
 @webhooks_bp.route('/google/calendar', methods=['POST'])
 @require_webhook_auth(WebhookProvider.GOOGLE_CALENDAR)
-@rate_limit(100, per=60)
+@rate_limit(6000, per=60)
 @api_response
 def google_calendar_webhook():
     """Webhook para eventos de Google Calendar."""
@@ -630,51 +628,38 @@ def google_calendar_webhook():
         resource_id = request.headers.get('X-Goog-Resource-ID')
         resource_uri = request.headers.get('X-Goog-Resource-URI')
         resource_state = request.headers.get('X-Goog-Resource-State')
+        channel_id = request.headers.get('X-Goog-Channel-ID')
+        message_number = request.headers.get('X-Goog-Message-Number')
         
         if not resource_id or not resource_uri:
             raise WebhookException("Cabeceras de Google Calendar faltantes")
         
-        event_id = f"calendar_{resource_id}_{int(datetime.now(timezone.utc).timestamp())}"
-        
-        # Verificar duplicados
-        if is_duplicate_webhook(WebhookProvider.GOOGLE_CALENDAR, event_id):
-            return {'status': 'duplicate', 'event_id': event_id}
+        # El número de mensaje es único por canal: identifica los reenvíos
+        event_id = f"calendar_{channel_id}_{message_number}" if channel_id and message_number else None
         
-        # Procesar según el estado
         data = {
             'resource_id': resource_id,
             'resource_uri': resource_uri,
             'resource_state': resource_state
         }
         
-        success = WebhookHandlers.handle_google_calendar_event(
-            f'calendar.{resource_state}',
-            data
-        )
-        
-        # Registrar evento
-        status = WebhookStatus.PROCESSED if success else WebhookStatus.FAILED
-        webhook_event = log_webhook_event(
+        return accept_webhook(
             WebhookProvider.GOOGLE_CALENDAR,
             f'calendar.{resource_state}',
             event_id,
             data,
-            status
+            resource_key=resource_id
         )
-        
-        return {
-            'status': 'success' if success else 'failed',
-            'event_id': event_id,
-            'webhook_id': webhook_event.id
-        }
     
+    except WebhookException:
+        raise
     except Exception as e:
-        current_app.logger.error(f"Error procesando webhook Google Calendar: {str(e)}")
+        current_app.logger.error(f"Error recibiendo webhook Google Calendar: {str(e)}")
         return {'error': 'Internal server error'}, 500
 
 @webhooks_bp.route('/slack', methods=['POST'])
 @require_webhook_auth(WebhookProvider.SLACK)
-@rate_limit(100, per=60)
+@rate_limit(6000, per=60)
 @api_response
 def slack_webhook():
     """Webhook para eventos de Slack."""
@@ -688,42 +673,24 @@ def slack_webhook():
         schema = SlackWebhookSchema()
         data = schema.load(payload)
         
-        event_id = data['event_id']
-        event_type = data['event']['type']
-        
-        # Verificar duplicados
-        if is_duplicate_webhook(WebhookProvider.SLACK, event_id):
-            return {'status': 'duplicate', 'event_id': event_id}
-        
-        # Procesar evento
-        success = WebhookHandlers.handle_slack_event(event_type, data['event'])
-        
-        # Registrar evento
-        status = WebhookStatus.PROCESSED if success else WebhookStatus.FAILED
-        webhook_event = log_webhook_event(
+        return accept_webhook(
             WebhookProvider.SLACK,
-            event_type,
-            event_id,
+            data['event']['type'],
+            data['event_id'],
             payload,
-            status
+            resource_key=data['event'].get('channel')
         )
-        
-        return {
-            'status': 'success' if success else 'failed',
-            'event_id': event_id,
-            'webhook_id': webhook_event.id
-        }
     
     except ValidationError as e:
         current_app.logger.error(f"Webhook Slack inválido: {e.messages}")
         return {'error': 'Invalid payload', 'details': e.messages}, 400
     except Exception as e:
-        current_app.logger.error(f"Error procesando webhook Slack: {str(e)}")
+        current_app.logger.error(f"Error recibiendo webhook Slack: {str(e)}")
         return {'error': 'Internal server error'}, 500
 
 @webhooks_bp.route('/paypal', methods=['POST'])
 @require_webhook_auth(WebhookProvider.PAYPAL)
-@rate_limit(100, per=60)
+@rate_limit(6000, per=60)
 @api_response
 def paypal_webhook():
     """Webhook para eventos de PayPal."""
@@ -736,40 +703,23 @@ def paypal_webhook():
         if not event_id or not event_type:
             raise WebhookException("Datos de PayPal incompletos")
         
-        # Verificar duplicados
-        if is_duplicate_webhook(WebhookProvider.PAYPAL, event_id):
-            return {'status': 'duplicate', 'event_id': event_id}
-        
-        # Procesar según tipo de evento
-        success = True
-        if event_type == 'PAYMENT.CAPTURE.COMPLETED':
-            success = WebhookHandlers._handle_payment_success(payload.get('resource', {}), 'paypal')
-        elif event_type == 'PAYMENT.CAPTURE.DENIED':
-            success = WebhookHandlers._handle_payment_failed(payload.get('resource', {}), 'paypal')
-        
-        # Registrar evento
-        status = WebhookStatus.PROCESSED if success else WebhookStatus.FAILED
-        webhook_event = log_webhook_event(
+        return accept_webhook(
             WebhookProvider.PAYPAL,
             event_type,
             event_id,
             payload,
-            status
+            resource_key=(payload.get('resource') or {}).get('id')
         )
-        
-        return {
-            'status': 'success' if success else 'failed',
-            'event_id': event_id,
-            'webhook_id': webhook_event.id
-        }
     
+    except WebhookException:
+        raise
     except Exception as e:
-        current_app.logger.error(f"Error procesando webhook PayPal: {str(e)}")
+        current_app.logger.error(f"Error recibiendo webhook PayPal: {str(e)}")
         return {'error': 'Internal server error'}, 500
 
 @webhooks_bp.route('/github', methods=['POST'])
 @require_webhook_auth(WebhookProvider.GITHUB)
-@rate_limit(100, per=60)
+@rate_limit(6000, per=60)
 @api_response
 def github_webhook():
     """Webhook para eventos de GitHub."""
@@ -780,91 +730,68 @@ def github_webhook():
         if not event_type:
             raise WebhookException("Tipo de evento GitHub faltante")
         
-        # Generar ID único para el evento
-        event_id = f"github_{event_type}_{int(datetime.now(timezone.utc).timestamp())}"
-        
-        # Procesar eventos relevantes
-        success = True
-        if event_type == 'push':
-            # Manejar push events
-            success = True
-        elif event_type == 'pull_request':
-            # Manejar pull request events
-            success = True
-        elif event_type == 'issues':
-            # Manejar issue events
-            success = True
-        
-        # Registrar evento
-        status = WebhookStatus.PROCESSED if success else WebhookStatus.FAILED
-        webhook_event = log_webhook_event(
+        # GitHub envía un ID único por entrega
+        event_id = request.headers.get('X-GitHub-Delivery')
+        repository = (payload or {}).get('repository') or {}
+        
+        return accept_webhook(
             WebhookProvider.GITHUB,
             event_type,
             event_id,
             payload,
-            status
+            resource_key=repository.get('full_name')
         )
-        
-        return {
-            'status': 'success' if success else 'failed',
-            'event_id': event_id,
-            'webhook_id': webhook_event.id
-        }
     
+    except WebhookException:
+        raise
     except Exception as e:
-        current_app.logger.error(f"Error procesando webhook GitHub: {str(e)}")
+        current_app.logger.error(f"Error recibiendo webhook GitHub: {str(e)}")
         return {'error': 'Internal server error'}, 500
 
 @webhooks_bp.route('/custom/<integration_id>', methods=['POST'])
 @jwt_required(optional=True)
-@rate_limit(50, per=60)
+@rate_limit(3000, per=60)
 @api_response
 def custom_webhook(integration_id: str):
     """Webhook personalizado para integraciones específicas."""
     try:
-        # Verificar que la integración existe y está activa
-        integration = Integration.query.filter_by(
-            id=integration_id,
-            status=IntegrationStatus.ACTIVE
-        ).first()
-        
-        if not integration:
-            raise WebhookException("Integración no encontrada o inactiva")
+        # Verificar que la integración existe y está activa (cacheado)
+        cache_key = f"webhook_integration_active:{integration_id}"
+        integration_name = cache.get(cache_key)
+        if integration_name is None:
+            integration = Integration.query.filter_by(
+                id=integration_id,
+                status=IntegrationStatus.ACTIVE
+            ).first()
+            
+            if not integration:
+                raise WebhookException("Integración no encontrada o inactiva")
+            
+            integration_name = getattr(integration, 'name', None) or str(integration_id)
+            cache.set(cache_key, integration_name, timeout=60)
         
         payload = request.get_json()
-        event_type = payload.get('event_type', 'custom.event')
-        event_id = payload.get('event_id') or str(uuid.uuid4())
-        
-        # Verificar duplicados
-        if is_duplicate_webhook(WebhookProvider.CUSTOM, event_id):
-            return {'status': 'duplicate', 'event_id': event_id}
         
-        # Procesar de forma asíncrona
-        process_webhook_async.apply_async(args=[
-            WebhookProvider.CUSTOM.value,
-            event_type,
-            event_id,
-            payload,
-            integration_id
-        ])
+        # Orden por recurso solo si la integración lo identifica; una clave por
+        # integración serializaría todos sus eventos
+        resource_id = payload.get('resource_id')
         
-        # Registrar evento como pendiente
-        webhook_event = log_webhook_event(
+        return accept_webhook(
             WebhookProvider.CUSTOM,
-            event_type,
-            event_id,
-            payload,
-            WebhookStatus.PENDING
+            payload.get('event_type', 'custom.event'),
+            payload.get('event_id'),
+            {
+                'integration_id': integration_id,
+                'integration_name': integration_name,
+                'body': payload
+            },
+            resource_key=f"integration:{integration_id}:{resource_id}" if resource_id else None
         )
-        
-        return {
-            'status': 'accepted',
-            'event_id': event_id,
-            'webhook_id': webhook_event.id
-        }, 202
     
+    except WebhookException:
+        raise
     except Exception as e:
-        current_app.logger.error(f"Error procesando webhook personalizado: {str(e)}")
+        current_app.logger.error(f"Error recibiendo webhook personalizado: {str(e)}")
         return {'error': 'Internal server error'}, 500
 
 @webhooks_bp.route('/events', methods=['GET'])
@@ -883,14 +810,14 @@ def list_webhook_events():
         query = WebhookEvent.query
         
         if provider:
-            query = query.filter(WebhookEvent.provider == provider)
+            query = query.filter(WebhookEvent.provider == WebhookProvider(provider))
         if status:
-            query = query.filter(WebhookEvent.status == status)
+            query = query.filter(WebhookEvent.status == WebhookStatus(status))
         if event_type:
             query = query.filter(WebhookEvent.event_type == event_type)
         
         pagination = query.order_by(
-            WebhookEvent.created_at.desc()
+            WebhookEvent.received_at.desc()
         ).paginate(
             page=page,
             per_page=per_page,
@@ -900,12 +827,12 @@ def list_webhook_events():
         events = []
         for event in pagination.items:
             event_data = {
-                'id': event.id,
+                'id': str(event.id),
                 'provider': event.provider.value,
                 'event_type': event.event_type,
                 'event_id': event.event_id,
                 'status': event.status.value,
-                'created_at': event.created_at.isoformat(),
+                'received_at': event.received_at.isoformat(),
                 'processed_at': event.processed_at.isoformat() if event.processed_at else None,
                 'retry_count': event.retry_count
             }
@@ -935,36 +862,56 @@ def list_webhook_events():
         current_app.logger.error(f"Error listando eventos webhook: {str(e)}")
         raise
 
-@webhooks_bp.route('/events/<int:event_id>/retry', methods=['POST'])
+@webhooks_bp.route('/events/<event_id>/retry', methods=['POST'])
 @jwt_required()
 @rate_limit(10, per=60)
 @api_response
-def retry_webhook_event(event_id: int):
-    """Reintenta procesar un evento de webhook fallido."""
+def retry_webhook_event(event_id: str):
+    """Devuelve a la bandeja un evento de webhook fallido o en dead letter."""
     try:
         event = WebhookEvent.query.get(event_id)
         if not event:
             return {'error': 'Evento no encontrado'}, 404
         
-        if event.status != WebhookStatus.FAILED:
+        if event.status not in (WebhookStatus.FAILED, WebhookStatus.DEAD_LETTER):
             return {'error': 'Solo se pueden reintentar eventos fallidos'}, 400
         
-        if event.retry_count >= MAX_RETRY_ATTEMPTS:
-            return {'error': 'Máximo número de reintentos alcanzado'}, 400
-        
         # Programar reintento asíncrono
-        retry_failed_webhook.apply_async(args=[event_id])
+        retry_failed_webhook.apply_async(args=[str(event.id)])
         
         return {
             'status': 'retry_scheduled',
             'event_id': event.event_id,
-            'retry_count': event.retry_count + 1
+            'retry_count': event.retry_count
         }
     
     except Exception as e:
         current_app.logger.error(f"Error reintentando webhook: {str(e)}")
         raise
 
+@webhooks_bp.route('/events/replay', methods=['POST'])
+@jwt_required()
+@rate_limit(5, per=60)
+@api_response
+def replay_dead_letter_events():
+    """Devuelve a la bandeja los eventos en dead letter (opcionalmente de un proveedor)."""
+    try:
+        data = request.get_json(silent=True) or {}
+        provider = data.get('provider')
+        
+        replayed = replay_events(
+            data.get('event_ids') or (),
+            provider=WebhookProvider(provider) if provider else None
+        )
+        
+        return {'status': 'replayed', 'events': replayed}
+    
+    except ValueError:
+        return {'error': 'Proveedor inválido'}, 400
+    except Exception as e:
+        current_app.logger.error(f"Error reprocesando webhooks: {str(e)}")
+        raise
+
 # Manejo de errores
 @webhooks_bp.errorhandler(WebhookException)
 def handle_webhook_error(e):
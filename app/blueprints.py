@@ -0,0 +1,139 @@
+"""
+Registro de blueprints con carga diferida.
+
+Los blueprints se declaran por ruta de importación y se importan al
+registrarlos. Los de ``DEFERRED_BLUEPRINTS`` (áreas poco usadas: admin,
+aliados, clientes) no se importan en ``create_app``: se registran justo antes
+de atender la primera petición HTTP del proceso. Los workers de Celery, los
+comandos CLI y los scripts que crean la aplicación sin servir peticiones no
+pagan su importación (ni la de pandas, plotly, etc. que arrastran).
+
+Flask no admite registrar rutas después de la primera petición, así que la
+carga ocurre antes de que la aplicación la procese; ``url_for`` fuera de una
+petición también fuerza la carga si el endpoint pertenece a un blueprint
+pendiente.
+"""
+
+import importlib
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+from flask import Flask, url_for
+
+logger = logging.getLogger(__name__)
+
+EXTENSION_KEY = 'deferred_blueprints'
+
+
+@dataclass(frozen=True)
+class BlueprintSpec:
+    """Blueprint declarado por ruta de importación."""
+
+    name: str
+    module: str
+    attribute: str
+    url_prefix: Optional[str] = None
+
+
+BLUEPRINTS = [
+    # Blueprints principales
+    BlueprintSpec('main', 'app.views.main', 'main_bp'),
+    BlueprintSpec('auth', 'app.views.auth', 'auth_bp', '/auth'),
+    BlueprintSpec('errors', 'app.views.errors', 'errors_bp'),
+
+    # Blueprints por roles
+    BlueprintSpec('admin', 'app.views.admin', 'admin_bp', '/admin'),
+    BlueprintSpec('entrepreneur', 'app.views.entrepreneur', 'entrepreneur_bp', '/entrepreneur'),
+    BlueprintSpec('ally', 'app.views.ally', 'ally_bp', '/ally'),
+    BlueprintSpec('client', 'app.views.client', 'client_bp', '/client'),
+
+    # API blueprints
+    BlueprintSpec('api_v1', 'app.api.v1', 'api_v1_bp', '/api/v1'),
+]
+
+
+class DeferredBlueprints:
+    """
+    Blueprints pendientes de una aplicación y middleware WSGI que los
+    registra antes de la primera petición.
+    """
+
+    def __init__(self, app: Flask, specs: list[BlueprintSpec]):
+        self.app = app
+        self.pending = list(specs)
+        self._lock = threading.Lock()
+        self._wsgi_app = app.wsgi_app
+
+    def load(self):
+        """Importar y registrar los blueprints pendientes (una sola vez)."""
+        if not self.pending:
+            return
+        with self._lock:
+            for spec in list(self.pending):
+                _register(self.app, spec)
+                self.pending.remove(spec)
+
+    def __call__(self, environ, start_response):
+        if self.pending:
+            self.load()
+        return self._wsgi_app(environ, start_response)
+
+    def handle_build_error(self, error, endpoint, values):
+        """Cargar los pendientes si ``url_for`` pide un endpoint que aún no existe."""
+        if not self.pending:
+            return None
+        if endpoint.split('.', 1)[0] not in {spec.name for spec in self.pending}:
+            return None
+        self.load()
+        return url_for(endpoint, **values)
+
+
+def _register(app: Flask, spec: BlueprintSpec):
+    module = importlib.import_module(spec.module)
+    blueprint = getattr(module, spec.attribute)
+    app.register_blueprint(blueprint, url_prefix=spec.url_prefix)
+
+
+def register_blueprints(app: Flask):
+    """
+    Registra todos los blueprints de la aplicación.
+
+    Los incluidos en ``DEFERRED_BLUEPRINTS`` se registran antes de la primera
+    petición HTTP en lugar de ahora.
+
+    Args:
+        app (Flask): Instancia de la aplicación Flask.
+    """
+    deferred_names = set(app.config.get('DEFERRED_BLUEPRINTS') or [])
+    deferred = []
+
+    for spec in BLUEPRINTS:
+        if spec.name in deferred_names:
+            deferred.append(spec)
+        else:
+            _register(app, spec)
+
+    if deferred:
+        loader = DeferredBlueprints(app, deferred)
+        app.wsgi_app = loader
+        app.url_build_error_handlers.append(loader.handle_build_error)
+        app.extensions[EXTENSION_KEY] = loader
+        logger.debug(f"Blueprints diferidos: {[spec.name for spec in deferred]}")
+
+
+def load_deferred_blueprints(app: Flask):
+    """Registrar ya los blueprints diferidos (por ejemplo para listar rutas)."""
+    loader = app.extensions.get(EXTENSION_KEY)
+    if loader is not None:
+        loader.load()
+
+
+__all__ = [
+    'BlueprintSpec',
+    'BLUEPRINTS',
+    'DeferredBlueprints',
+    'register_blueprints',
+    'load_deferred_blueprints'
+]
@@ -273,6 +273,18 @@ def change_password(email, password):
         click.echo(f'❌ Error al cambiar contraseña: {str(e)}', err=True)
 
 
+@user_cli.command('calibrate-hashing')
+@click.option('--target-ms', default=250, help='Presupuesto por hash en milisegundos')
+@click.option('--algorithm', type=click.Choice(['scrypt', 'pbkdf2']), default='scrypt')
+def calibrate_hashing(target_ms, algorithm):
+    """Medir el coste de hash que cabe en el presupuesto (PASSWORD_HASH_METHOD)."""
+    from app.services.password_hashing import calibrate
+
+    result = calibrate(target_ms / 1000, algorithm)
+    click.echo(f'⏱️  {result["method"]}: {result["seconds"] * 1000:.0f} ms por hash')
+    click.echo(f'   PASSWORD_HASH_METHOD={result["method"]}')
+
+
 # ====================================
 # COMANDOS DE DATOS
 # ====================================
@@ -468,6 +480,22 @@ def cleanup(type):
         click.echo(f'❌ Error durante la limpieza: {str(e)}', err=True)
 
 
+@maintenance_cli.command('rebuild-inbox')
+@with_appcontext
+def rebuild_inbox():
+    """Reconstruir el índice de bandeja de entrada (contadores de no leídos)."""
+    try:
+        from app.models.inbox import InboxIndex
+        
+        updated = InboxIndex.rebuild()
+        db.session.commit()
+        click.echo(f'✅ Índice de bandeja reconstruido: {updated} entradas')
+        
+    except Exception as e:
+        db.session.rollback()
+        click.echo(f'❌ Error reconstruyendo el índice de bandeja: {str(e)}', err=True)
+
+
 @maintenance_cli.command('health-check')
 @with_appcontext
 def health_check():
@@ -519,9 +547,14 @@ def show_routes():
     """Mostrar todas las rutas de la aplicación."""
     from flask import url_for
     
+    from app.blueprints import load_deferred_blueprints
+    
     click.echo('\n🛣️  RUTAS DE LA APLICACIÓN')
     click.echo('=' * 80)
     
+    # Incluir las áreas cuyo registro se difiere hasta la primera petición
+    load_deferred_blueprints(current_app)
+    
     routes = []
     for rule in current_app.url_map.iter_rules():
         routes.append({
@@ -560,6 +593,29 @@ def show_config():
             click.echo(f'{key:<30} = {value}')
 
 
+@dev_cli.command('import-profile')
+@click.option('--target', type=click.Choice(['app', 'celery']), default='app',
+              help='Arranque a perfilar')
+@click.option('--limit', default=20, help='Número de módulos a mostrar')
+@click.option('--max-seconds', type=float, help='Fallar si el arranque supera estos segundos')
+@click.option('--max-rss-mb', type=float, help='Fallar si la memoria máxima supera estos MB')
+def import_profile(target, limit, max_seconds, max_rss_mb):
+    """Perfilar tiempo de importación y memoria del arranque."""
+    from app.utils.startup_profile import profile_startup, format_profile
+    
+    profile = profile_startup(target)
+    click.echo(format_profile(profile, limit))
+    
+    if not profile.ok:
+        sys.exit(1)
+    if max_seconds is not None and profile.seconds > max_seconds:
+        click.echo(f'❌ Arranque de {profile.seconds:.2f}s supera el límite de {max_seconds}s', err=True)
+        sys.exit(1)
+    if max_rss_mb is not None and profile.max_rss_mb > max_rss_mb:
+        click.echo(f'❌ Memoria de {profile.max_rss_mb:.0f} MB supera el límite de {max_rss_mb} MB', err=True)
+        sys.exit(1)
+
+
 # ====================================
 # FUNCIONES AUXILIARES
 # ====================================
@@ -934,6 +934,14 @@ class ExternalAPIError(EcosistemaException):
         super().__init__(message, error_code='EXTERNAL_API_ERROR')
 
 
+class CurrencyServiceError(EcosistemaException):
+    """Exception raised for exchange rate and currency conversion errors."""
+    
+    def __init__(self, message=None):
+        message = message or 'currency service error occurred'
+        super().__init__(message, error_code='CURRENCY_SERVICE_ERROR')
+
+
 class ResourceNotFoundError(EcosistemaException):
     """Exception raised when a requested resource is not found."""
     
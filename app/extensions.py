@@ -455,6 +455,9 @@ def init_all_extensions(app):
     ma.init_app(app)
     migrate.init_app(app, db)
     
+    from app.utils.write_buffer import init_write_buffers
+    init_write_buffers(app)
+    
     # Autenticación
     login_manager.init_app(app)
     configure_login_manager()  # Configurar callbacks después de init
@@ -486,8 +489,17 @@ def init_all_extensions(app):
         'ping_interval': 25,
         'manage_session': False  # Dejar que Flask-Session maneje las sesiones
     }
+    
+    # Modo cluster: los emits de cualquier worker se difunden por la cola de mensajes
+    if app.config.get('SOCKETIO_MESSAGE_QUEUE'):
+        socketio_config['message_queue'] = app.config['SOCKETIO_MESSAGE_QUEUE']
+        socketio_config['channel'] = app.config.get('SOCKETIO_CHANNEL', 'ecosistema-socketio')
+    
     socketio.init_app(app, **socketio_config)
     
+    from app.sockets.state import init_state_store
+    init_state_store(app)
+    
     # HTTP
     cors.init_app(app)
     compress.init_app(app)
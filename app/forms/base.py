@@ -670,7 +670,7 @@ class CacheableMixin:
         super().__init__(*args, **kwargs)
         self.cache = CacheManager()
     
-    def get_cached_choices(self, field_name: str, fetch_function: Callable) -> list[Tuple]:
+    def get_cached_choices(self, field_name: str, fetch_function: Callable) -> list[tuple]:
         """Obtiene opciones de campo desde cache"""
         cache_key = f"form_choices_{self.__class__.__name__}_{field_name}"
         
@@ -117,6 +117,34 @@ except Exception as e:
     models_logger.error(f"❌ Error loading Meeting model: {e}")
     Meeting = None
 
+try:
+    from .calendar_sync import CalendarSync
+    models_logger.info("✅ CalendarSync model loaded")
+except Exception as e:
+    models_logger.error(f"❌ Error loading CalendarSync model: {e}")
+    CalendarSync = None
+
+try:
+    from .metric_rollup import MetricRollup
+    models_logger.info("✅ MetricRollup model loaded")
+except Exception as e:
+    models_logger.error(f"❌ Error loading MetricRollup model: {e}")
+    MetricRollup = None
+
+try:
+    from .analytics import AnalyticsMetric
+    models_logger.info("✅ AnalyticsMetric model loaded")
+except Exception as e:
+    models_logger.error(f"❌ Error loading AnalyticsMetric model: {e}")
+    AnalyticsMetric = None
+
+try:
+    from .webhook_event import WebhookEvent
+    models_logger.info("✅ WebhookEvent model loaded")
+except Exception as e:
+    models_logger.error(f"❌ Error loading WebhookEvent model: {e}")
+    WebhookEvent = None
+
 try:
     from .task import Task
     models_logger.info("✅ Task model loaded")
@@ -195,7 +223,7 @@ except Exception as e:
 
 # Export all models
 __all__.extend(['Admin', 'Organization', 'Program', 'ActivityLog', 'Entrepreneur', 
-               'Ally', 'Client', 'Project', 'Meeting', 'Task', 'Document', 
+               'Ally', 'Client', 'Project', 'Meeting', 'CalendarSync', 'MetricRollup', 'AnalyticsMetric', 'WebhookEvent', 'Task', 'Document', 
                'Notification', 'Message', 'Milestone', 'Application', 'Availability', 
                'Evaluation', 'MentorshipRelationship', 'EmailTemplate', 'EmailCampaign',
                'EmailLog', 'EmailTracking', 'EmailBounce', 'EmailSuppression'])
@@ -14,10 +14,11 @@ Funcionalidades:
 - Integración con sistema de permisos
 """
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 from typing import Any, Optional
 import json
+import uuid
 
 from sqlalchemy import Index, text
 from sqlalchemy.dialects.postgresql import JSONB
@@ -136,6 +137,9 @@ class ActivityLog(BaseModel, TimestampMixin, SoftDeleteMixin):
     
     __tablename__ = 'activity_logs'
     
+    # Severidades que se escriben al momento en lugar de pasar por el buffer
+    DURABLE_SEVERITIES = frozenset({ActivitySeverity.HIGH, ActivitySeverity.CRITICAL})
+    
     # Campos principales
     user_id = db.Column(
         db.Integer, 
@@ -226,6 +230,7 @@ class ActivityLog(BaseModel, TimestampMixin, SoftDeleteMixin):
         Index('ix_activity_severity_created', 'severity', 'created_at'),
         Index('ix_activity_target', 'target_type', 'target_id'),
         Index('ix_activity_org_created', 'organization_id', 'created_at'),
+        Index('ix_activity_created_id', 'created_at', 'id'),
         {'extend_existing': True}
     )
     
@@ -286,11 +291,17 @@ class ActivityLog(BaseModel, TimestampMixin, SoftDeleteMixin):
         target_type: Optional[str] = None,
         target_id: Optional[int] = None,
         session_id: Optional[str] = None,
-        organization_id: Optional[int] = None
+        organization_id: Optional[int] = None,
+        sync: Optional[bool] = None
     ) -> 'ActivityLog':
         """
         Método de clase para registrar una nueva actividad
         
+        Con el buffer de escritura activo, la actividad se encola y se
+        inserta en lote en segundo plano, sin confirmar la transacción del
+        llamador. Las severidades de ``DURABLE_SEVERITIES`` se escriben al
+        momento en una transacción propia.
+        
         Args:
             activity_type: Tipo de actividad
             description: Descripción de la actividad
@@ -303,28 +314,49 @@ class ActivityLog(BaseModel, TimestampMixin, SoftDeleteMixin):
             target_id: ID de entidad afectada
             session_id: ID de sesión
             organization_id: ID de organización
+            sync: Forzar (True) o evitar (False) la escritura inmediata; por
+                defecto depende de la severidad
             
         Returns:
-            Nueva instancia de ActivityLog
+            Nueva instancia de ActivityLog (sin sesión si se escribió por el buffer)
         """
-        activity = cls(
-            activity_type=activity_type,
-            description=description,
-            user_id=user_id,
-            severity=severity,
-            meta_data=metadata or {},
-            ip_address=ip_address,
-            user_agent=user_agent,
-            target_type=target_type,
-            target_id=target_id,
-            session_id=session_id,
-            organization_id=organization_id
-        )
+        now = datetime.now(timezone.utc)
+        row = {
+            'id': uuid.uuid4(),
+            'activity_type': activity_type,
+            'description': description,
+            'user_id': user_id,
+            'severity': severity,
+            'meta_data': metadata or {},
+            'ip_address': ip_address,
+            'user_agent': user_agent,
+            'target_type': target_type,
+            'target_id': target_id,
+            'session_id': session_id,
+            'organization_id': organization_id,
+            'created_at': now,
+            'updated_at': now
+        }
         
-        db.session.add(activity)
-        db.session.commit()
+        from app.utils.write_buffer import activity_log_buffer
         
-        return activity
+        if not activity_log_buffer.enabled:
+            activity = cls(**row)
+            db.session.add(activity)
+            db.session.commit()
+            return activity
+        
+        if sync is None:
+            sync = severity in cls.DURABLE_SEVERITIES
+        
+        if sync:
+            activity_log_buffer.write_now([row])
+        else:
+            from flask import current_app
+            activity_log_buffer.start(current_app._get_current_object())
+            activity_log_buffer.append(row)
+        
+        return cls(**row)
     
     @classmethod
     def get_user_activities(
@@ -424,19 +456,16 @@ class ActivityLog(BaseModel, TimestampMixin, SoftDeleteMixin):
         Args:
             days_to_keep: Días a mantener en el log
         """
+        from app.services.data_archive import DataArchiver, RETENTION_POLICIES
+        
         cutoff_date = datetime.now(timezone.utc) - timedelta(days=days_to_keep)
         
-        # Solo eliminar actividades no críticas
-        old_activities = cls.query.filter(
-            cls.created_at < cutoff_date,
+        # Solo eliminar actividades no críticas, por lotes pequeños
+        return DataArchiver().purge(
+            RETENTION_POLICIES['activity_logs'],
+            cutoff_date,
             cls.severity != ActivitySeverity.CRITICAL
         )
-        
-        count = old_activities.count()
-        old_activities.delete(synchronize_session=False)
-        db.session.commit()
-        
-        return count
     
     @classmethod
     def get_activity_summary(
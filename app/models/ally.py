@@ -4,7 +4,7 @@ Este módulo define la clase Ally que extiende User con funcionalidades específ
 """
 
 import logging
-from datetime import datetime, timedelta, time
+from datetime import datetime, timedelta, time, timezone
 from typing import Any, Optional, Union
 from decimal import Decimal
 from flask import current_app
@@ -21,7 +21,7 @@ from app.core.constants import (
 from app.core.security import log_security_event
 from .base import GUID, JSONType
 from .user import User
-from .mixins import SearchableMixin, CacheableMixin, NotifiableMixin, ValidatableMixin
+from .mixins import SearchableMixin, CacheableMixin, NotifiableMixin, ValidatableMixin, BatchStatsMixin
 
 # Configurar logger
 ally_logger = logging.getLogger('ecosistema.models.ally')
@@ -31,7 +31,7 @@ ally_logger = logging.getLogger('ecosistema.models.ally')
 # MODELO ALIADO/MENTOR
 # ====================================
 
-class Ally(User):
+class Ally(User, BatchStatsMixin):
     """
     Modelo de aliado/mentor que extiende User con funcionalidades específicas de mentoría.
     Los aliados pueden mentorear emprendedores, crear programas y proporcionar expertise.
@@ -269,12 +269,8 @@ class Ally(User):
     # ====================================
     
     # Mentorías que proporciona
-    mentorships_provided = relationship("Mentorship", backref="ally", lazy='dynamic',
-                                       foreign_keys="Mentorship.ally_id")
-    
-    # Programas creados
-    programs_created_rel = relationship("Program", backref="creator", lazy='dynamic',
-                                       foreign_keys="Program.creator_id")
+    mentorships_provided = relationship("MentorshipRelationship", back_populates="mentor", lazy='dynamic',
+                                       foreign_keys="MentorshipRelationship.mentor_id")
     
     # Disponibilidad/horarios
     availability_slots = relationship("Availability", back_populates="ally", lazy='dynamic')
@@ -310,6 +306,51 @@ class Ally(User):
                 self.current_mentees < self.max_mentees and
                 self.is_active)
     
+    @property
+    def active_mentorships_count(self):
+        """Número de mentorías activas."""
+        from .mentorship import MentorshipRelationship, MentorshipStatus
+        return self.batch_stat('active_mentorships_count', lambda: MentorshipRelationship.query.filter(
+            MentorshipRelationship.mentor_id == self.id,
+            MentorshipRelationship.status == MentorshipStatus.ACTIVE
+        ).count())
+    
+    @property
+    def total_mentorships_count(self):
+        """Número total de mentorías."""
+        from .mentorship import MentorshipRelationship
+        return self.batch_stat('total_mentorships_count', lambda: MentorshipRelationship.query.filter(
+            MentorshipRelationship.mentor_id == self.id
+        ).count())
+    
+    @classmethod
+    def batch_stat_queries(cls) -> dict[str, Any]:
+        """Consultas agrupadas para precargar estadísticas de una página."""
+        from sqlalchemy import select, func
+        from .mentorship import MentorshipRelationship, MentorshipStatus
+        
+        def active_mentorships(ids):
+            return (
+                select(MentorshipRelationship.mentor_id, func.count(MentorshipRelationship.id))
+                .where(
+                    MentorshipRelationship.mentor_id.in_(ids),
+                    MentorshipRelationship.status == MentorshipStatus.ACTIVE
+                )
+                .group_by(MentorshipRelationship.mentor_id)
+            )
+        
+        def total_mentorships(ids):
+            return (
+                select(MentorshipRelationship.mentor_id, func.count(MentorshipRelationship.id))
+                .where(MentorshipRelationship.mentor_id.in_(ids))
+                .group_by(MentorshipRelationship.mentor_id)
+            )
+        
+        return {
+            'active_mentorships_count': active_mentorships,
+            'total_mentorships_count': total_mentorships
+        }
+    
     @property
     def mentorship_capacity_percentage(self):
         """Porcentaje de capacidad de mentoría utilizada."""
@@ -797,8 +838,8 @@ class Ally(User):
         try:
             from .program import Program
             
-            # Añadir creator_id automáticamente
-            program_data['creator_id'] = self.id
+            # Registrar al aliado como creador (columna de auditoría)
+            program_data['created_by_id'] = self.id
             
             # Crear programa
             program = Program(**program_data)
@@ -823,7 +864,9 @@ class Ally(User):
     
     def get_created_programs(self):
         """Obtener programas creados por el aliado."""
-        return self.programs_created_rel.all()
+        from .program import Program
+        
+        return Program.query.filter_by(created_by_id=self.id).all()
     
     def schedule_workshop(self, workshop_data: dict[str, Any]) -> bool:
         """
@@ -1332,7 +1375,8 @@ class Ally(User):
     # ====================================
     
     def to_dict(self, include_sensitive: bool = False, include_relationships: bool = False,
-                exclude_fields: list[str] = None, public_view: bool = False) -> dict[str, Any]:
+                exclude_fields: list[str] = None, public_view: bool = False,
+                include_user: bool = False, include_stats: bool = False) -> dict[str, Any]:
         """
         Convertir ally a diccionario.
         
@@ -1341,6 +1385,10 @@ class Ally(User):
             include_relationships: Incluir relaciones
             exclude_fields: Campos a excluir
             public_view: Vista pública (excluye información privada)
+            include_user: Aceptado por compatibilidad; los datos de usuario
+                forman parte del aliado
+            include_stats: Incluir estadísticas de mentoría (usar
+                ``serialize_batch`` para listados)
             
         Returns:
             Diccionario con datos del aliado
@@ -1380,6 +1428,12 @@ class Ally(User):
                 'available_slots': max(0, self.max_mentees - self.current_mentees)
             })
         
+        if include_stats:
+            ally_data['stats'] = {
+                'active_mentorships_count': self.active_mentorships_count,
+                'total_mentorships_count': self.total_mentorships_count
+            }
+        
         data.update(ally_data)
         return data
     
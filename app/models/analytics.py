@@ -15,11 +15,12 @@ Funcionalidades:
 - Dashboards personalizables
 """
 
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 from typing import Any, Optional, Union
 from decimal import Decimal
 import json
+import uuid
 
 from sqlalchemy import Index, func, case, and_, or_
 from sqlalchemy.dialects.postgresql import JSONB
@@ -218,6 +219,7 @@ class AnalyticsMetric(BaseModel, TimestampMixin):
         Index('ix_metric_org_timestamp', 'organization_id', 'timestamp'),
         Index('ix_metric_category_timestamp', 'category', 'timestamp'),
         Index('ix_metric_freq_timestamp', 'frequency', 'timestamp'),
+        Index('ix_metric_timestamp_id', 'timestamp', 'id'),
         {'extend_existing': True}
     )
     
@@ -424,11 +426,15 @@ class AnalyticsService:
         program_id: Optional[int] = None,
         user_id: Optional[int] = None,
         analytics_metadata: Optional[dict[str, Any]] = None,
-        timestamp: Optional[datetime] = None
+        timestamp: Optional[datetime] = None,
+        sync: bool = False
     ) -> AnalyticsMetric:
         """
         Registra una nueva métrica
         
+        Con el buffer de escritura activo la métrica se inserta en lote en
+        segundo plano, salvo que se pida ``sync``.
+        
         Args:
             metric_type: Tipo de métrica
             value: Valor de la métrica
@@ -442,29 +448,49 @@ class AnalyticsService:
             user_id: ID de usuario
             metadata: Metadatos adicionales
             timestamp: Momento específico de la medición
+            sync: Escribir al momento en una transacción propia
             
         Returns:
-            Nueva instancia de AnalyticsMetric
+            Nueva instancia de AnalyticsMetric (sin sesión si se escribió por el buffer)
         """
-        metric = AnalyticsMetric(
-            metric_type=metric_type,
-            category=category,
-            frequency=frequency,
-            name=name,
-            value=value,
-            unit=unit,
-            dimensions=dimensions or {},
-            timestamp=timestamp or datetime.now(timezone.utc),
-            organization_id=organization_id,
-            program_id=program_id,
-            user_id=user_id,
-            analytics_metadata=analytics_metadata or {}
-        )
+        if value is None:
+            raise ValueError("El valor de la métrica no puede ser nulo")
         
-        db.session.add(metric)
-        db.session.commit()
+        now = datetime.now(timezone.utc)
+        row = {
+            'id': uuid.uuid4(),
+            'metric_type': metric_type,
+            'category': category,
+            'frequency': frequency,
+            'name': name,
+            'value': value,
+            'unit': unit,
+            'dimensions': dimensions or {},
+            'timestamp': timestamp or now,
+            'organization_id': organization_id,
+            'program_id': program_id,
+            'user_id': user_id,
+            'analytics_metadata': analytics_metadata or {},
+            'created_at': now,
+            'updated_at': now
+        }
+        
+        from app.utils.write_buffer import metric_buffer
+        
+        if not metric_buffer.enabled:
+            metric = AnalyticsMetric(**row)
+            db.session.add(metric)
+            db.session.commit()
+            return metric
+        
+        if sync:
+            metric_buffer.write_now([row])
+        else:
+            from flask import current_app
+            metric_buffer.start(current_app._get_current_object())
+            metric_buffer.append(row)
         
-        return metric
+        return AnalyticsMetric(**row)
     
     @staticmethod
     def get_metrics_summary(
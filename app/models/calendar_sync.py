@@ -0,0 +1,77 @@
+"""
+Estado de sincronización de calendarios externos
+
+Guarda por usuario y calendario el token de sincronización incremental del
+proveedor, la fecha de la última sincronización y el estado de reintentos,
+de modo que cada pasada nocturna solo descargue los cambios desde la anterior.
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import Column, String, Integer, DateTime, Text, ForeignKey, UniqueConstraint
+
+from ..extensions import db
+from .base import BaseModel, GUID
+from .mixins import TimestampMixin
+
+logger = logging.getLogger('ecosistema.models.calendar_sync')
+
+
+class CalendarSync(BaseModel, TimestampMixin):
+    """
+    Estado de sincronización de un calendario externo de un usuario.
+    """
+
+    __tablename__ = 'calendar_syncs'
+    __table_args__ = (
+        UniqueConstraint('user_id', 'provider', 'calendar_id', name='uq_calendar_syncs_user_provider_calendar'),
+    )
+
+    user_id = Column(GUID(), ForeignKey('users.id'), nullable=False, index=True)
+    provider = Column(String(50), nullable=False, default='google')
+    calendar_id = Column(String(255), nullable=False, default='primary')
+
+    # Sincronización incremental
+    sync_token = Column(Text)
+    last_sync_at = Column(DateTime, index=True)
+    last_full_sync_at = Column(DateTime)
+
+    # Reintentos programados
+    consecutive_failures = Column(Integer, default=0, nullable=False)
+    next_retry_at = Column(DateTime)
+    last_error = Column(Text)
+
+    @classmethod
+    def get_or_create(cls, user_id, provider: str = 'google', calendar_id: str = 'primary') -> 'CalendarSync':
+        """Obtener el estado de sincronización o crearlo (sin confirmar)."""
+        state = cls.query.filter_by(user_id=user_id, provider=provider, calendar_id=calendar_id).first()
+        if state is None:
+            state = cls(user_id=user_id, provider=provider, calendar_id=calendar_id, consecutive_failures=0)
+            db.session.add(state)
+        return state
+
+    def mark_success(self, sync_token: Optional[str], full_sync: bool = False):
+        """Registrar una sincronización correcta."""
+        now = datetime.now(timezone.utc)
+        self.sync_token = sync_token or self.sync_token
+        self.last_sync_at = now
+        if full_sync:
+            self.last_full_sync_at = now
+        self.consecutive_failures = 0
+        self.next_retry_at = None
+        self.last_error = None
+
+    def mark_failure(self, error: str, next_retry_at: Optional[datetime] = None):
+        """Registrar un fallo y el próximo reintento programado."""
+        self.consecutive_failures = (self.consecutive_failures or 0) + 1
+        self.last_error = error[:2000]
+        self.next_retry_at = next_retry_at
+
+    def reset_token(self):
+        """Descartar el token para forzar una sincronización completa."""
+        self.sync_token = None
+
+    def __repr__(self):
+        return f'<CalendarSync {self.user_id} {self.provider}:{self.calendar_id}>'
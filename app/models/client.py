@@ -123,12 +123,9 @@ class Client(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
     contact_person_id = Column(Integer, ForeignKey('users.id'))
     contact_person = relationship("User", foreign_keys=[contact_person_id])
     
-    # Usuarios asociados al cliente
-    users = relationship("User", back_populates="client", 
-                        foreign_keys="User.client_id")
-    
     # Proyectos en los que está interesado
-    interested_projects = relationship("ProjectInterest", back_populates="client")
+    interested_projects = relationship("Project", secondary="project_interests",
+                                       back_populates="interested_clients")
     
     # Reuniones programadas
     meetings = relationship("Meeting", back_populates="client")
@@ -136,15 +133,6 @@ class Client(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
     # Documentos compartidos
     documents = relationship("Document", back_populates="client")
     
-    # Reportes generados
-    reports = relationship("Report", back_populates="client")
-    
-    # Actividades del cliente
-    activities = relationship("ActivityLog", back_populates="client")
-    
-    # Notificaciones
-    notifications = relationship("Notification", back_populates="client")
-    
     def __init__(self, **kwargs):
         """Inicialización del cliente"""
         super().__init__(**kwargs)
@@ -362,10 +350,9 @@ class Client(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
     
     def _get_recent_activities(self, limit: int = 20) -> list[dict[str, Any]]:
         """Obtener actividades recientes"""
-        activities = (self.activities
-                     .order_by(self.activities.property.mapper.class_.created_at.desc())
-                     .limit(limit)
-                     .all())
+        from .activity_log import ActivityLog
+        
+        activities = ActivityLog.get_activities_by_target('client', self.id, limit=limit).all()
         
         return [
             {
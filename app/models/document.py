@@ -17,7 +17,7 @@ import os
 import mimetypes
 from pathlib import Path
 
-from .base import BaseModel
+from .base import BaseModel, GUID
 from ..extensions import db
 from .mixins import TimestampMixin, SoftDeleteMixin, AuditMixin
 from ..core.constants import (
@@ -187,6 +187,8 @@ class Document(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
     
     # Contenido y metadatos
     content_text = Column(Text)          # Texto extraído para búsqueda
+    content = Column(Text)               # Contenido editable en colaboración
+    content_revision = Column(Integer, default=0)  # Revisión de la última instantánea
     content_preview = Column(Text)       # Vista previa del contenido
     page_count = Column(Integer)         # Número de páginas (PDFs, docs)
     word_count = Column(Integer)         # Número de palabras
@@ -228,7 +230,7 @@ class Document(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
     rating_count = Column(Integer, default=0)
     
     # Enlaces a entidades del ecosistema
-    project_id = Column(Integer, ForeignKey('projects.id'))
+    project_id = Column(GUID(), ForeignKey('projects.id'))
     project = relationship("Project", back_populates="documents")
     
     program_id = Column(Integer, ForeignKey('programs.id'))
@@ -266,7 +268,7 @@ class Document(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
     # Colaboradores
     collaborators = relationship("User",
                                secondary=document_collaborators,
-                               back_populates="collaborative_documents")
+                               secondaryjoin="User.id == document_collaborators.c.user_id")
     
     # Tags
     tags = relationship("Tag", secondary=document_tags, back_populates="documents")
@@ -274,9 +276,6 @@ class Document(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
     # Comentarios
     comments = relationship("DocumentComment", back_populates="document")
     
-    # Actividades del documento
-    activities = relationship("ActivityLog", back_populates="document")
-    
     # Shares/Compartidos
     shares = relationship("DocumentShare", back_populates="document")
     
@@ -953,10 +952,9 @@ class Document(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
     
     def get_recent_activity(self, limit: int = 10) -> list[dict[str, Any]]:
         """Obtener actividad reciente del documento"""
-        recent_activities = (self.activities
-                           .order_by(ActivityLog.created_at.desc())
-                           .limit(limit)
-                           .all())
+        from .activity_log import ActivityLog
+        
+        recent_activities = ActivityLog.get_activities_by_target('document', self.id, limit=limit).all()
         
         return [
             {
@@ -1251,7 +1249,7 @@ class DocumentComment(BaseModel, TimestampMixin, AuditMixin):
     
     # Autor del comentario
     author_id = Column(Integer, ForeignKey('users.id'), nullable=False, index=True)
-    author = relationship("User")
+    author = relationship("User", foreign_keys=[author_id])
     
     # Comentario padre (para respuestas)
     parent_comment_id = Column(Integer, ForeignKey('document_comments.id'))
@@ -4,7 +4,7 @@ Este módulo define la clase Entrepreneur que extiende User con funcionalidades
 """
 
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Any, Optional, Union
 from decimal import Decimal
 from flask import current_app
@@ -28,12 +28,17 @@ MAX_PROJECTS_PER_ENTREPRENEUR = 5
 ECONOMIC_SECTORS = ['technology', 'healthcare', 'education', 'finance']
 FUNDING_STAGES = ['pre-seed', 'seed', 'series-a', 'series-b']
 
+def _active_project_statuses() -> list:
+    """Miembros de ProjectStatus activos (la columna SQLEnum guarda nombres, no valores)."""
+    from .project import ProjectStatus
+    return [status for status in ProjectStatus if status.value in ACTIVE_PROJECT_STATUSES]
+
 def log_security_event(event_type, details):
     """Stub para log de seguridad."""
     print(f"Security event: {event_type} - {details}")
 from .base import GUID, JSONType
 from .user import User
-from .mixins import SearchableMixin, CacheableMixin, NotifiableMixin, StateMachineMixin
+from .mixins import SearchableMixin, CacheableMixin, NotifiableMixin, StateMachineMixin, BatchStatsMixin
 
 # Configurar logger
 entrepreneur_logger = logging.getLogger('ecosistema.models.entrepreneur')
@@ -43,7 +48,7 @@ entrepreneur_logger = logging.getLogger('ecosistema.models.entrepreneur')
 # MODELO EMPRENDEDOR
 # ====================================
 
-class Entrepreneur(User):
+class Entrepreneur(User, BatchStatsMixin):
     """
     Modelo de emprendedor que extiende User con funcionalidades específicas de emprendimiento.
     Los emprendedores pueden crear proyectos, recibir mentoría y participar en programas.
@@ -239,16 +244,12 @@ class Entrepreneur(User):
     # ====================================
     
     # Proyectos del emprendedor
-    projects = relationship("Project", backref="entrepreneur", lazy='dynamic',
-                           cascade="all, delete-orphan")
+    projects = relationship("Project", back_populates="entrepreneur", lazy='dynamic',
+                           foreign_keys="Project.entrepreneur_id", cascade="all, delete-orphan")
     
     # Mentorías recibidas
-    mentorships_received = relationship("Mentorship", backref="entrepreneur", lazy='dynamic',
-                                       foreign_keys="Mentorship.entrepreneur_id")
-    
-    # Programas en los que participa
-    program_participations = relationship("ProgramParticipation", backref="entrepreneur",
-                                         cascade="all, delete-orphan")
+    mentorships_received = relationship("MentorshipRelationship", back_populates="mentee", lazy='dynamic',
+                                       foreign_keys="MentorshipRelationship.mentee_id")
     
     # Configurar relación con User
     __mapper_args__ = {
@@ -276,14 +277,60 @@ class Entrepreneur(User):
     @hybrid_property
     def active_projects_count(self):
         """Número de proyectos activos."""
-        return self.projects.filter(
-            db.text("status IN :statuses")
-        ).params(statuses=ACTIVE_PROJECT_STATUSES).count()
+        from .project import Project
+        return self.batch_stat('active_projects_count', lambda: self.projects.filter(
+            Project.status.in_(_active_project_statuses())
+        ).count())
     
     @hybrid_property
     def total_projects_count(self):
         """Número total de proyectos."""
-        return self.projects.count()
+        return self.batch_stat('total_projects_count', lambda: self.projects.count())
+    
+    @property
+    def mentorships_count(self):
+        """Número de mentorías recibidas."""
+        from .mentorship import MentorshipRelationship
+        return self.batch_stat('mentorships_count', lambda: MentorshipRelationship.query.filter(
+            MentorshipRelationship.mentee_id == self.id
+        ).count())
+    
+    @classmethod
+    def batch_stat_queries(cls) -> dict[str, Any]:
+        """Consultas agrupadas para precargar estadísticas de una página."""
+        from sqlalchemy import select, func
+        from .project import Project
+        from .mentorship import MentorshipRelationship
+        
+        def active_projects(ids):
+            return (
+                select(Project.entrepreneur_id, func.count(Project.id))
+                .where(
+                    Project.entrepreneur_id.in_(ids),
+                    Project.status.in_(_active_project_statuses())
+                )
+                .group_by(Project.entrepreneur_id)
+            )
+        
+        def total_projects(ids):
+            return (
+                select(Project.entrepreneur_id, func.count(Project.id))
+                .where(Project.entrepreneur_id.in_(ids))
+                .group_by(Project.entrepreneur_id)
+            )
+        
+        def mentorships(ids):
+            return (
+                select(MentorshipRelationship.mentee_id, func.count(MentorshipRelationship.id))
+                .where(MentorshipRelationship.mentee_id.in_(ids))
+                .group_by(MentorshipRelationship.mentee_id)
+            )
+        
+        return {
+            'active_projects_count': active_projects,
+            'total_projects_count': total_projects,
+            'mentorships_count': mentorships
+        }
     
     @property
     def can_create_new_project(self):
@@ -817,4 +864,46 @@ class Entrepreneur(User):
             }
         except Exception as e:
             entrepreneur_logger.error(f"Error getting growth trajectory: {str(e)}")
-            return {'error': str(e)}
\ No newline at end of file
+            return {'error': str(e)}
+
+    # ====================================
+    # SERIALIZACIÓN
+    # ====================================
+    
+    def to_dict(self, include_sensitive: bool = False, include_relationships: bool = False,
+                exclude_fields: list[str] = None, include_user: bool = False,
+                include_stats: bool = False) -> dict[str, Any]:
+        """
+        Convertir emprendedor a diccionario.
+        
+        Args:
+            include_sensitive: Incluir campos sensibles
+            include_relationships: Incluir relaciones
+            exclude_fields: Campos a excluir
+            include_user: Aceptado por compatibilidad; los datos de usuario
+                forman parte del emprendedor
+            include_stats: Incluir estadísticas calculadas (usar
+                ``serialize_batch`` para listados)
+            
+        Returns:
+            Diccionario con datos del emprendedor
+        """
+        data = super().to_dict(include_sensitive=include_sensitive,
+                               include_relationships=include_relationships,
+                               exclude_fields=exclude_fields)
+        
+        data.update({
+            'entrepreneurship_experience_level': self.entrepreneurship_experience_level,
+            'days_in_ecosystem': self.days_in_ecosystem
+        })
+        
+        if include_stats:
+            data['stats'] = {
+                'active_projects_count': self.active_projects_count,
+                'total_projects_count': self.total_projects_count,
+                'mentorships_count': self.mentorships_count,
+                'can_create_new_project': self.can_create_new_project,
+                'engagement_level': self.engagement_level
+            }
+        
+        return data
@@ -0,0 +1,482 @@
+"""
+Índice de bandeja de entrada de conversaciones
+
+Este módulo mantiene una tabla desnormalizada por (usuario, conversación) con
+el contador de mensajes no leídos y una instantánea del último mensaje. La
+tabla se actualiza al enviar, leer y eliminar mensajes, de modo que la bandeja
+de entrada de un usuario se renderiza con una sola consulta indexada en lugar
+de un COUNT y una carga de mensajes por conversación.
+
+Todas las fechas del índice se guardan en UTC con zona horaria, igual que
+``Message.created_at``, con el que se comparan.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from sqlalchemy import (
+    Column, Integer, String, Boolean, DateTime, ForeignKey, Table, Index,
+    select, update, insert, func, case, or_, exists
+)
+
+from ..extensions import db
+from .base import GUID
+
+logger = logging.getLogger('ecosistema.models.inbox')
+
+# Longitud máxima de la vista previa almacenada
+INBOX_PREVIEW_LENGTH = 50
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Fecha en UTC con zona horaria (las fechas sin zona se asumen UTC)"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+# Tabla del índice: una fila por participante de cada conversación
+conversation_inbox = Table(
+    'conversation_inbox',
+    db.metadata,
+    Column('user_id', GUID(), ForeignKey('users.id'), primary_key=True),
+    Column('conversation_id', GUID(), ForeignKey('conversations.id'), primary_key=True),
+    Column('is_active', Boolean, default=True, nullable=False),
+    Column('unread_count', Integer, default=0, nullable=False),
+    Column('last_read_at', DateTime(timezone=True)),
+    # Instantánea del último mensaje visible
+    Column('last_message_id', GUID()),
+    Column('last_message_sender_id', GUID()),
+    Column('last_message_type', String(30)),
+    Column('last_message_preview', String(INBOX_PREVIEW_LENGTH + 3)),
+    Column('last_message_at', DateTime(timezone=True)),
+    Column('updated_at', DateTime(timezone=True), default=_utcnow, onupdate=_utcnow),
+    Index('ix_conversation_inbox_user_recent', 'user_id', 'is_active', 'last_message_at'),
+    Index('ix_conversation_inbox_conversation', 'conversation_id', 'is_active'),
+)
+
+
+def build_message_preview(message) -> str:
+    """Construir la vista previa corta de un mensaje para la bandeja"""
+    message_type = getattr(message.message_type, 'value', message.message_type) or 'text'
+    if message_type == 'text':
+        content = message.content or ''
+        if len(content) > INBOX_PREVIEW_LENGTH:
+            return content[:INBOX_PREVIEW_LENGTH] + "..."
+        return content
+    return f"[{str(message_type).title()}]"
+
+
+def _snapshot_values(message) -> dict[str, Any]:
+    """Valores de instantánea del último mensaje"""
+    message_type = getattr(message.message_type, 'value', message.message_type)
+    return {
+        'last_message_id': message.id,
+        'last_message_sender_id': message.sender_id,
+        'last_message_type': message_type,
+        'last_message_preview': build_message_preview(message),
+        'last_message_at': _utc(message.created_at) or _utcnow(),
+    }
+
+
+class InboxIndex:
+    """
+    Mantenimiento y lectura del índice de bandeja de entrada.
+
+    Todos los métodos de escritura aceptan una conexión opcional para poder
+    invocarse desde eventos del mapper (``after_insert``/``after_update``),
+    donde no se debe usar la sesión.
+    """
+
+    table = conversation_inbox
+
+    @staticmethod
+    def _executor(connection=None):
+        return connection if connection is not None else db.session
+
+    # ====================================
+    # ESCRITURA
+    # ====================================
+
+    @classmethod
+    def add_participant(cls, conversation_id, user_id, connection=None):
+        """Crear o reactivar la entrada de un participante"""
+        executor = cls._executor(connection)
+        t = cls.table
+
+        result = executor.execute(
+            update(t).where(
+                t.c.conversation_id == conversation_id,
+                t.c.user_id == user_id
+            ).values(is_active=True)
+        )
+        if result.rowcount:
+            return
+
+        # Nuevo participante: hereda la instantánea de la conversación
+        snapshot = executor.execute(
+            select(
+                t.c.last_message_id, t.c.last_message_sender_id, t.c.last_message_type,
+                t.c.last_message_preview, t.c.last_message_at
+            ).where(
+                t.c.conversation_id == conversation_id,
+                t.c.last_message_id.isnot(None)
+            ).order_by(t.c.last_message_at.desc()).limit(1)
+        ).first()
+
+        values = {
+            'conversation_id': conversation_id,
+            'user_id': user_id,
+            'is_active': True,
+            'unread_count': 0,
+            'last_read_at': _utcnow(),
+        }
+        if snapshot:
+            values.update(snapshot._mapping)
+        executor.execute(insert(t).values(values))
+
+    @classmethod
+    def remove_participant(cls, conversation_id, user_id, connection=None):
+        """Desactivar la entrada de un participante que abandona la conversación"""
+        t = cls.table
+        cls._executor(connection).execute(
+            update(t).where(
+                t.c.conversation_id == conversation_id,
+                t.c.user_id == user_id
+            ).values(is_active=False, unread_count=0)
+        )
+
+    @classmethod
+    def record_message(cls, message, connection=None):
+        """
+        Registrar un mensaje enviado: incrementa los no leídos de todos los
+        participantes salvo el remitente y actualiza la instantánea, en un
+        único UPDATE.
+        """
+        t = cls.table
+        values = _snapshot_values(message)
+
+        if message.sender_id is not None:
+            values['unread_count'] = case(
+                (t.c.user_id == message.sender_id, t.c.unread_count),
+                else_=t.c.unread_count + 1
+            )
+
+        cls._executor(connection).execute(
+            update(t).where(
+                t.c.conversation_id == message.conversation_id,
+                t.c.is_active == True
+            ).values(values)
+        )
+
+    @classmethod
+    def record_deletion(cls, message, connection=None):
+        """
+        Registrar la eliminación de un mensaje: descuenta el mensaje de quienes
+        aún no lo habían leído y, si era el último, recalcula la instantánea.
+        """
+        executor = cls._executor(connection)
+        t = cls.table
+
+        unread_filter = [
+            t.c.conversation_id == message.conversation_id,
+            t.c.is_active == True,
+            t.c.unread_count > 0,
+        ]
+        if message.sender_id is not None:
+            unread_filter.append(t.c.user_id != message.sender_id)
+        if message.created_at is not None:
+            unread_filter.append(or_(
+                t.c.last_read_at.is_(None),
+                t.c.last_read_at < _utc(message.created_at)
+            ))
+
+        executor.execute(
+            update(t).where(*unread_filter).values(unread_count=t.c.unread_count - 1)
+        )
+
+        # Solo recalcular la instantánea si apuntaba al mensaje eliminado
+        points_to_message = executor.execute(
+            select(exists().where(
+                t.c.conversation_id == message.conversation_id,
+                t.c.last_message_id == message.id
+            ))
+        ).scalar()
+        if points_to_message:
+            cls._refresh_snapshot(message.conversation_id, executor)
+
+    @classmethod
+    def _refresh_snapshot(cls, conversation_id, executor):
+        """Recalcular la instantánea con el último mensaje no eliminado"""
+        from .message import Message
+
+        messages = Message.__table__
+        t = cls.table
+        latest = executor.execute(
+            select(
+                messages.c.id, messages.c.sender_id, messages.c.message_type,
+                messages.c.content, messages.c.created_at
+            ).where(
+                messages.c.conversation_id == conversation_id,
+                messages.c.is_deleted == False
+            ).order_by(messages.c.created_at.desc()).limit(1)
+        ).first()
+
+        if latest:
+            values = _snapshot_values(latest)
+        else:
+            values = {
+                'last_message_id': None,
+                'last_message_sender_id': None,
+                'last_message_type': None,
+                'last_message_preview': None,
+                'last_message_at': None,
+            }
+
+        executor.execute(
+            update(t).where(t.c.conversation_id == conversation_id).values(values)
+        )
+
+    @classmethod
+    def mark_read(cls, conversation_id, user_id, read_at: datetime = None, connection=None):
+        """Poner a cero los no leídos de un usuario en una conversación"""
+        t = cls.table
+        cls._executor(connection).execute(
+            update(t).where(
+                t.c.conversation_id == conversation_id,
+                t.c.user_id == user_id
+            ).values(unread_count=0, last_read_at=_utc(read_at) or _utcnow())
+        )
+
+    @classmethod
+    def _unread_since(cls, since: datetime, inclusive: bool = False):
+        """Subconsulta correlacionada con los mensajes de otros posteriores a ``since``"""
+        from .message import Message
+
+        messages = Message.__table__
+        t = cls.table
+        return select(func.count(messages.c.id)).where(
+            messages.c.conversation_id == t.c.conversation_id,
+            messages.c.is_deleted == False,
+            messages.c.sender_id != t.c.user_id,
+            messages.c.created_at >= since if inclusive else messages.c.created_at > since
+        ).scalar_subquery()
+
+    @classmethod
+    def mark_message_read(cls, message, user_id, connection=None):
+        """
+        Marcar un mensaje como leído: la última lectura avanza hasta el
+        mensaje (si aún no lo cubría) y el contador queda en los mensajes
+        posteriores.
+        """
+        t = cls.table
+        read_at = _utc(message.created_at)
+        cls._executor(connection).execute(
+            update(t).where(
+                t.c.conversation_id == message.conversation_id,
+                t.c.user_id == user_id,
+                or_(t.c.last_read_at.is_(None), t.c.last_read_at < read_at)
+            ).values(
+                last_read_at=read_at,
+                unread_count=cls._unread_since(read_at)
+            )
+        )
+
+    @classmethod
+    def mark_message_unread(cls, message, user_id, connection=None):
+        """
+        Marcar un mensaje como no leído: la última lectura retrocede justo
+        antes del mensaje y el contador lo vuelve a incluir.
+        """
+        t = cls.table
+        created_at = _utc(message.created_at)
+        cls._executor(connection).execute(
+            update(t).where(
+                t.c.conversation_id == message.conversation_id,
+                t.c.user_id == user_id,
+                t.c.last_read_at >= created_at
+            ).values(
+                last_read_at=created_at - timedelta(microseconds=1),
+                unread_count=cls._unread_since(created_at, inclusive=True)
+            )
+        )
+
+    @classmethod
+    def mark_all_read(cls, user_id, read_at: datetime = None, connection=None) -> int:
+        """Poner a cero los no leídos de un usuario en todas sus conversaciones"""
+        t = cls.table
+        result = cls._executor(connection).execute(
+            update(t).where(
+                t.c.user_id == user_id,
+                t.c.unread_count > 0
+            ).values(unread_count=0, last_read_at=_utc(read_at) or _utcnow())
+        )
+        return result.rowcount
+
+    @classmethod
+    def rebuild(cls, conversation_ids: list = None) -> int:
+        """
+        Reconstruir el índice a partir de participantes y mensajes.
+
+        Se usa para poblar la tabla inicialmente y para corregir desvíos; no
+        forma parte del camino caliente.
+
+        Returns:
+            Número de entradas recalculadas
+        """
+        from .message import Message, conversation_participants as cp
+
+        t = cls.table
+        messages = Message.__table__
+
+        # 1. Crear entradas faltantes para participantes existentes
+        missing = select(
+            cp.c.user_id, cp.c.conversation_id, cp.c.is_active, cp.c.last_read_at
+        ).where(
+            ~exists().where(
+                t.c.user_id == cp.c.user_id,
+                t.c.conversation_id == cp.c.conversation_id
+            )
+        )
+        if conversation_ids:
+            missing = missing.where(cp.c.conversation_id.in_(conversation_ids))
+        db.session.execute(
+            insert(t).from_select(
+                ['user_id', 'conversation_id', 'is_active', 'last_read_at'], missing
+            )
+        )
+
+        # 2. Recalcular contadores con una subconsulta correlacionada
+        unread_subquery = select(func.count(messages.c.id)).where(
+            messages.c.conversation_id == t.c.conversation_id,
+            messages.c.is_deleted == False,
+            messages.c.sender_id != t.c.user_id,
+            or_(t.c.last_read_at.is_(None), messages.c.created_at > t.c.last_read_at)
+        ).scalar_subquery()
+
+        counters = update(t).values(unread_count=unread_subquery)
+        if conversation_ids:
+            counters = counters.where(t.c.conversation_id.in_(conversation_ids))
+        updated = db.session.execute(counters).rowcount
+
+        # 3. Recalcular instantáneas con el último mensaje de cada conversación
+        ranked = select(
+            messages.c.id, messages.c.conversation_id, messages.c.sender_id,
+            messages.c.message_type, messages.c.content, messages.c.created_at,
+            func.row_number().over(
+                partition_by=messages.c.conversation_id,
+                order_by=messages.c.created_at.desc()
+            ).label('position')
+        ).where(messages.c.is_deleted == False)
+        if conversation_ids:
+            ranked = ranked.where(messages.c.conversation_id.in_(conversation_ids))
+        ranked = ranked.subquery()
+
+        for row in db.session.execute(select(ranked).where(ranked.c.position == 1)):
+            db.session.execute(
+                update(t).where(t.c.conversation_id == row.conversation_id)
+                .values(_snapshot_values(row))
+            )
+
+        logger.info(f"Índice de bandeja reconstruido: {updated} entradas")
+        return updated
+
+    # ====================================
+    # LECTURA
+    # ====================================
+
+    @classmethod
+    def get_unread_count(cls, conversation_id, user_id) -> Optional[int]:
+        """Contador de no leídos; ``None`` si el usuario no tiene entrada"""
+        t = cls.table
+        return db.session.execute(
+            select(t.c.unread_count).where(
+                t.c.conversation_id == conversation_id,
+                t.c.user_id == user_id
+            )
+        ).scalar()
+
+    @classmethod
+    def is_message_read(cls, message, user_id) -> bool:
+        """Si la última lectura del usuario cubre el mensaje"""
+        t = cls.table
+        last_read_at = db.session.execute(
+            select(t.c.last_read_at).where(
+                t.c.conversation_id == message.conversation_id,
+                t.c.user_id == user_id
+            )
+        ).scalar()
+        return last_read_at is not None and _utc(last_read_at) >= _utc(message.created_at)
+
+    @classmethod
+    def get_total_unread(cls, user_id) -> int:
+        """Total de mensajes no leídos de un usuario en todas sus conversaciones"""
+        t = cls.table
+        return db.session.execute(
+            select(func.coalesce(func.sum(t.c.unread_count), 0)).where(
+                t.c.user_id == user_id,
+                t.c.is_active == True
+            )
+        ).scalar() or 0
+
+    @classmethod
+    def entry_to_dict(cls, entry) -> dict[str, Any]:
+        """Serializar una fila del índice"""
+        return {
+            'unread_count': entry.unread_count or 0,
+            'last_read_at': _utc(entry.last_read_at).isoformat() if entry.last_read_at else None,
+            'last_message_id': str(entry.last_message_id) if entry.last_message_id else None,
+            'last_message_sender_id': str(entry.last_message_sender_id) if entry.last_message_sender_id else None,
+            'last_message_type': entry.last_message_type,
+            'last_message_preview': entry.last_message_preview or "Sin mensajes",
+            'last_message_at': _utc(entry.last_message_at).isoformat() if entry.last_message_at else None,
+        }
+
+    @classmethod
+    def get_unread_inbox(cls, user_id, limit: int = 50) -> list[dict[str, Any]]:
+        """
+        Conversaciones con mensajes no leídos de un usuario.
+
+        El total se calcula con una función de ventana para resolver la
+        bandeja completa en una sola consulta.
+        """
+        from .message import Conversation
+
+        t = cls.table
+        conversations = Conversation.__table__
+
+        rows = db.session.execute(
+            select(
+                t,
+                conversations.c.title,
+                conversations.c.conversation_type,
+                func.sum(t.c.unread_count).over().label('total_unread'),
+                func.count().over().label('threads_with_unread'),
+            ).join(
+                conversations, conversations.c.id == t.c.conversation_id
+            ).where(
+                t.c.user_id == user_id,
+                t.c.is_active == True,
+                t.c.unread_count > 0,
+                conversations.c.is_deleted == False
+            ).order_by(t.c.last_message_at.desc()).limit(limit)
+        ).all()
+
+        return [
+            {
+                'conversation_id': str(row.conversation_id),
+                'title': row.title,
+                'type': getattr(row.conversation_type, 'value', row.conversation_type),
+                'total_unread': int(row.total_unread or 0),
+                'threads_with_unread': row.threads_with_unread,
+                **cls.entry_to_dict(row),
+            }
+            for row in rows
+        ]
@@ -5,9 +5,9 @@ Este módulo define los modelos para gestión de reuniones, incluyendo programac
 seguimiento, participantes, agenda, actas y seguimiento de compromisos.
 """
 
-from datetime import datetime, date, timedelta
+from datetime import datetime, date, timedelta, timezone
 from typing import Optional, Any, Union
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, JSON, Enum as SQLEnum, Float, Date, Time, Table
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, JSON, Enum as SQLEnum, Float, Date, Time, Table, UniqueConstraint
 from sqlalchemy.orm import relationship, validates, backref
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.ext.associationproxy import association_proxy
@@ -15,7 +15,7 @@ from enum import Enum
 import re
 from decimal import Decimal
 
-from .base import BaseModel
+from .base import BaseModel, GUID
 from .mixins import TimestampMixin, SoftDeleteMixin, AuditMixin
 from ..core.constants import (
     MEETING_TYPES,
@@ -27,6 +27,7 @@ from ..core.constants import (
     ATTENDANCE_STATUS
 )
 from ..core.exceptions import ValidationError
+from ..utils.scheduling import Interval, IntervalIndex
 
 
 class MeetingType(Enum):
@@ -158,6 +159,9 @@ class Meeting(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
     """
     
     __tablename__ = 'meetings'
+    __table_args__ = (
+        UniqueConstraint('organizer_id', 'google_event_id', name='uq_meetings_organizer_google_event'),
+    )
     
     # Información básica
     title = Column(String(300), nullable=False, index=True)
@@ -167,7 +171,7 @@ class Meeting(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
     priority = Column(SQLEnum(MeetingPriority), default=MeetingPriority.MEDIUM)
     
     # Organizador
-    organizer_id = Column(Integer, ForeignKey('users.id'), nullable=False, index=True)
+    organizer_id = Column(GUID(), ForeignKey('users.id'), nullable=False, index=True)
     organizer = relationship("User", foreign_keys=[organizer_id])
     
     # Fechas y horarios
@@ -229,11 +233,11 @@ class Meeting(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
     participant_feedback = Column(JSON)  # Feedback de participantes
     
     # Enlaces a entidades del ecosistema
-    project_id = Column(Integer, ForeignKey('projects.id'))
+    project_id = Column(GUID(), ForeignKey('projects.id'))
     project = relationship("Project", back_populates="meetings")
     
     entrepreneur_id = Column(Integer, ForeignKey('entrepreneurs.id'))
-    entrepreneur = relationship("Entrepreneur", back_populates="meetings")
+    entrepreneur = relationship("Entrepreneur", foreign_keys=[entrepreneur_id])
     
     client_id = Column(Integer, ForeignKey('clients.id'))
     client = relationship("Client", back_populates="meetings")
@@ -247,6 +251,12 @@ class Meeting(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
     mentorship_id = Column(Integer, ForeignKey('mentorship_relationships.id'))
     mentorship = relationship("MentorshipRelationship")
     
+    # Sincronización con calendarios externos (clave: organizador + evento remoto)
+    google_event_id = Column(String(255), index=True)
+    google_calendar_id = Column(String(255))
+    synced_from_google = Column(Boolean, default=False)
+    external_updated_at = Column(DateTime)  # Campo 'updated' del evento remoto
+    
     # Configuración avanzada
     timezone = Column(String(50), default='UTC')
     language = Column(String(10), default='es')
@@ -268,8 +278,7 @@ class Meeting(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
     
     # Participantes
     participants = relationship("User",
-                              secondary=meeting_participants,
-                              back_populates="meetings_participating")
+                              secondary=meeting_participants)
     
     # Documentos asociados
     documents = relationship("Document", back_populates="meeting")
@@ -277,9 +286,6 @@ class Meeting(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
     # Tareas generadas
     tasks = relationship("Task", back_populates="meeting")
     
-    # Actividades relacionadas
-    activities = relationship("ActivityLog", back_populates="meeting")
-    
     # Reuniones relacionadas
     child_meetings = relationship("Meeting",
                                 secondary=meeting_relations,
@@ -1075,6 +1081,64 @@ class Meeting(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
         
         return query.order_by(cls.scheduled_start.asc()).all()
     
+    @classmethod
+    def get_busy_intervals(cls, user_ids: list[Any], start: datetime, end: datetime,
+                           exclude_meeting_id: Any = None) -> dict[Any, IntervalIndex]:
+        """
+        Obtener la agenda ocupada de varios usuarios en ``[start, end)``.
+        
+        Una sola consulta cubre a todos los usuarios, como organizadores o
+        participantes; cada agenda se devuelve como ``IntervalIndex`` cuyos
+        intervalos llevan el id y el título de la reunión.
+        """
+        from sqlalchemy import select, union_all
+        from app.models.user import User
+        
+        user_ids = list(user_ids)
+        if not user_ids:
+            return {}
+        
+        organized = select(cls.id.label('meeting_id'), cls.organizer_id.label('user_id')).where(
+            cls.organizer_id.in_(user_ids)
+        )
+        attended = select(meeting_participants.c.meeting_id, User.id).join(
+            User, User.id == meeting_participants.c.user_id
+        ).where(User.id.in_(user_ids))
+        owners = union_all(organized, attended).subquery()
+        
+        query = select(owners.c.user_id, cls.id, cls.title, cls.scheduled_start, cls.scheduled_end).join(
+            owners, owners.c.meeting_id == cls.id
+        ).where(
+            cls.status.in_([MeetingStatus.SCHEDULED, MeetingStatus.CONFIRMED, MeetingStatus.IN_PROGRESS]),
+            cls.scheduled_start < end,
+            cls.scheduled_end > start,
+            cls.is_deleted == False
+        )
+        if exclude_meeting_id is not None:
+            query = query.where(cls.id != exclude_meeting_id)
+        
+        intervals: dict[Any, list[Interval]] = {}
+        for user_id, meeting_id, title, scheduled_start, scheduled_end in db.session.execute(query):
+            intervals.setdefault(user_id, []).append(
+                Interval(scheduled_start, scheduled_end, {'meeting_id': meeting_id, 'title': title})
+            )
+        return {user_id: IntervalIndex(busy) for user_id, busy in intervals.items()}
+    
+    @classmethod
+    def find_conflicts(cls, user_ids: list[Any], start: datetime, end: datetime,
+                       exclude_meeting_id: Any = None) -> dict[Any, list[Interval]]:
+        """
+        Obtener las reuniones que chocan con ``[start, end)`` para cada usuario.
+        
+        Solo se incluyen los usuarios con algún conflicto.
+        """
+        conflicts = {}
+        for user_id, busy in cls.get_busy_intervals(user_ids, start, end, exclude_meeting_id).items():
+            overlapping = busy.overlapping(start, end)
+            if overlapping:
+                conflicts[user_id] = overlapping
+        return conflicts
+    
     @classmethod
     def get_overdue_meetings(cls):
         """Obtener reuniones vencidas"""
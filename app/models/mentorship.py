@@ -15,7 +15,7 @@ from enum import Enum
 import re
 from decimal import Decimal
 
-from .base import BaseModel
+from .base import BaseModel, GUID
 from .mixins import TimestampMixin, SoftDeleteMixin, AuditMixin
 from ..core.constants import (
     MENTORSHIP_STATUS,
@@ -106,11 +106,11 @@ class MentorshipRelationship(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMi
     __tablename__ = 'mentorship_relationships'
     
     # Participantes
-    mentor_id = Column(Integer, ForeignKey('allies.id'), nullable=False, index=True)
-    mentor = relationship("Ally", back_populates="mentorship_relationships", foreign_keys=[mentor_id])
+    mentor_id = Column(GUID(), ForeignKey('allies.id'), nullable=False, index=True)
+    mentor = relationship("Ally", back_populates="mentorships_provided", foreign_keys=[mentor_id])
     
-    mentee_id = Column(Integer, ForeignKey('entrepreneurs.id'), nullable=False, index=True)
-    mentee = relationship("Entrepreneur", back_populates="mentorship_relationships", foreign_keys=[mentee_id])
+    mentee_id = Column(GUID(), ForeignKey('entrepreneurs.id'), nullable=False, index=True)
+    mentee = relationship("Entrepreneur", back_populates="mentorships_received", foreign_keys=[mentee_id])
     
     # Estado y configuración
     status = Column(SQLEnum(MentorshipStatus), default=MentorshipStatus.REQUESTED, index=True)
@@ -173,7 +173,6 @@ class MentorshipRelationship(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMi
     sessions = relationship("MentorshipSession", back_populates="mentorship")
     goals = relationship("MentorshipGoal", back_populates="mentorship")
     evaluations = relationship("MentorshipEvaluation", back_populates="mentorship")
-    activities = relationship("ActivityLog", back_populates="mentorship")
     
     def __init__(self, **kwargs):
         """Inicialización de la relación de mentoría"""
@@ -7,8 +7,8 @@ incluyendo conversaciones, mensajes, notificaciones y canales de comunicación.
 
 from datetime import datetime, date, timedelta, timezone
 from typing import Optional, Any, Union
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, JSON, Enum as SQLEnum, Float, Date, Table
-from sqlalchemy.orm import relationship, validates, backref
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, JSON, Enum as SQLEnum, Float, Date, Table, event, select, func
+from sqlalchemy.orm import relationship, validates, backref, joinedload
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.ext.associationproxy import association_proxy
 from enum import Enum
@@ -18,6 +18,7 @@ import bleach
 
 from .base import BaseModel
 from .mixins import TimestampMixin, SoftDeleteMixin, AuditMixin
+from .inbox import InboxIndex, conversation_inbox, build_message_preview
 from ..extensions import db
 from ..core.constants import (
     MESSAGE_TYPES,
@@ -191,8 +192,7 @@ class Conversation(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
     
     # Participantes
     participants = relationship("User",
-                              secondary=conversation_participants,
-                              back_populates="conversations")
+                              secondary=conversation_participants)
     
     # Mensajes de la conversación
     messages = relationship("Message", back_populates="conversation")
@@ -274,13 +274,16 @@ class Conversation(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
     @hybrid_property
     def last_message_preview(self):
         """Vista previa del último mensaje"""
-        if self.messages:
-            last_msg = max(self.messages, key=lambda m: m.created_at)
-            if last_msg.message_type == MessageType.TEXT:
-                return last_msg.content[:50] + "..." if len(last_msg.content) > 50 else last_msg.content
-            else:
-                return f"[{last_msg.message_type.value.title()}]"
-        return "Sin mensajes"
+        inbox_state = getattr(self, '_inbox_state', None)
+        if inbox_state is not None:
+            return inbox_state.get('last_message_preview') or "Sin mensajes"
+        
+        last_msg = Message.query.filter(
+            Message.conversation_id == self.id,
+            Message.is_deleted == False
+        ).order_by(Message.created_at.desc()).first()
+        
+        return build_message_preview(last_msg) if last_msg else "Sin mensajes"
     
     # Métodos de negocio
     def add_participant(self, user, role: str = 'member', 
@@ -315,6 +318,7 @@ class Conversation(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
                         left_at=None
                     )
                 )
+                InboxIndex.add_participant(self.id, user.id)
                 return True
         
         # Agregar nuevo participante
@@ -330,6 +334,7 @@ class Conversation(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
         }
         
         db.session.execute(conversation_participants.insert().values(participant_data))
+        InboxIndex.add_participant(self.id, user.id)
         
         # Crear mensaje de sistema
         self._create_system_message(f"{user.full_name} se unió a la conversación")
@@ -362,6 +367,7 @@ class Conversation(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
                 left_at=datetime.now(timezone.utc)
             )
         )
+        InboxIndex.remove_participant(self.id, user.id)
         
         # Crear mensaje de sistema
         if removed_by_user_id and removed_by_user_id != user.id:
@@ -398,11 +404,22 @@ class Conversation(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
                 conversation_participants.c.user_id == user.id
             ).values(last_read_at=read_time)
         )
+        InboxIndex.mark_read(self.id, user.id, read_time)
     
     def get_unread_count(self, user_id: int) -> int:
         """Obtener número de mensajes no leídos para un usuario"""
         from .. import db
         
+        # Contador desnormalizado del índice de bandeja (O(1))
+        inbox_state = getattr(self, '_inbox_state', None)
+        if inbox_state is not None and inbox_state.get('user_id') == user_id:
+            return inbox_state['unread_count']
+        
+        indexed_count = InboxIndex.get_unread_count(self.id, user_id)
+        if indexed_count is not None:
+            return indexed_count
+        
+        # Sin entrada en el índice: calcular desde los mensajes
         # Obtener última fecha de lectura
         participant = db.session.execute(
             conversation_participants.select().where(
@@ -460,7 +477,7 @@ class Conversation(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
             'id': self.id,
             'title': self.title,
             'type': self.conversation_type.value,
-            'participant_count': self.participant_count,
+            'participant_count': getattr(self, '_participant_total', None) or self.participant_count,
             'total_messages': self.total_messages,
             'unread_count': unread_count,
             'last_message_preview': self.last_message_preview,
@@ -479,23 +496,80 @@ class Conversation(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
     
     # Métodos de búsqueda
     @classmethod
-    def get_user_conversations(cls, user_id: int, include_archived: bool = False):
-        """Obtener conversaciones de un usuario"""
+    def get_user_conversations(cls, user_id: int, include_archived: bool = False,
+                               limit: int = None):
+        """
+        Obtener conversaciones de un usuario
+        
+        La conversación, su entrada del índice de bandeja y el número de
+        participantes se resuelven en una sola consulta. El estado queda
+        adjunto a cada conversación para que get_conversation_summary no
+        vuelva a consultar la base de datos.
+        """
         from .. import db
-        
-        query = cls.query.join(
+        from .mentorship import MentorshipRelationship
+        
+        participant_total = select(func.count()).where(
+            conversation_participants.c.conversation_id == cls.id,
+            conversation_participants.c.is_active == True
+        ).correlate(cls).scalar_subquery()
+        
+        query = db.session.query(
+            cls,
+            conversation_inbox.c.unread_count,
+            conversation_inbox.c.last_message_preview,
+            participant_total.label('participant_total')
+        ).join(
             conversation_participants,
             cls.id == conversation_participants.c.conversation_id
+        ).outerjoin(
+            conversation_inbox,
+            (conversation_inbox.c.conversation_id == cls.id) &
+            (conversation_inbox.c.user_id == user_id)
         ).filter(
             conversation_participants.c.user_id == user_id,
             conversation_participants.c.is_active == True,
             cls.is_deleted == False
+        ).options(
+            joinedload(cls.project),
+            joinedload(cls.program),
+            joinedload(cls.organization),
+            joinedload(cls.mentorship).joinedload(MentorshipRelationship.mentor),
+            joinedload(cls.mentorship).joinedload(MentorshipRelationship.mentee)
         )
         
         if not include_archived:
             query = query.filter(cls.is_archived == False)
         
-        return query.order_by(cls.last_activity_at.desc()).all()
+        query = query.order_by(cls.last_activity_at.desc())
+        if limit:
+            query = query.limit(limit)
+        
+        conversations = []
+        for conversation, unread_count, preview, participants in query.all():
+            conversation._participant_total = participants
+            if unread_count is not None:
+                conversation._inbox_state = {
+                    'user_id': user_id,
+                    'unread_count': unread_count,
+                    'last_message_preview': preview
+                }
+            conversations.append(conversation)
+        
+        return conversations
+    
+    @classmethod
+    def is_participant(cls, conversation_id, user_id) -> bool:
+        """Verificar si un usuario es participante activo de una conversación"""
+        from .. import db
+        
+        return bool(db.session.execute(
+            select(conversation_participants.c.user_id).where(
+                conversation_participants.c.conversation_id == conversation_id,
+                conversation_participants.c.user_id == user_id,
+                conversation_participants.c.is_active == True
+            ).limit(1)
+        ).first())
     
     @classmethod
     def find_direct_conversation(cls, user1_id: int, user2_id: int):
@@ -635,8 +709,7 @@ class Message(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
     
     # Destinatarios (para mensajes directos/broadcast)
     recipients = relationship("User",
-                            secondary=message_recipients,
-                            back_populates="received_messages")
+                            secondary=message_recipients)
     
     def __init__(self, **kwargs):
         """Inicialización del mensaje"""
@@ -962,6 +1035,55 @@ class Message(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
         # Actualizar última lectura en conversación
         self.conversation.mark_as_read(User.query.get(user_id), read_time)
     
+    def mark_as_read(self, user_id: int, read_at: datetime = None):
+        """Marcar este mensaje como leído por un usuario y ajustar su contador de bandeja"""
+        from .. import db
+        
+        db.session.execute(
+            message_recipients.update().where(
+                message_recipients.c.message_id == self.id,
+                message_recipients.c.user_id == user_id
+            ).values(
+                status='read',
+                read_at=read_at or datetime.now(timezone.utc)
+            )
+        )
+        InboxIndex.mark_message_read(self, user_id)
+    
+    def mark_as_unread(self, user_id: int):
+        """Marcar este mensaje como no leído por un usuario y volver a contarlo en su bandeja"""
+        from .. import db
+        
+        db.session.execute(
+            message_recipients.update().where(
+                message_recipients.c.message_id == self.id,
+                message_recipients.c.user_id == user_id
+            ).values(status='delivered', read_at=None)
+        )
+        InboxIndex.mark_message_unread(self, user_id)
+    
+    def is_read_by_user(self, user_id: int) -> bool:
+        """Verificar si la última lectura del usuario cubre este mensaje"""
+        if self.sender_id == user_id:
+            return True
+        return InboxIndex.is_message_read(self, user_id)
+    
+    def get_user_read_status(self, user_id: int) -> dict[str, Any]:
+        """Estado de lectura del mensaje para un usuario"""
+        from .. import db
+        
+        recipient = db.session.execute(
+            message_recipients.select().where(
+                message_recipients.c.message_id == self.id,
+                message_recipients.c.user_id == user_id
+            )
+        ).first()
+        
+        return {
+            'is_read': self.is_read_by_user(user_id),
+            'read_at': recipient.read_at.isoformat() if recipient and recipient.read_at else None
+        }
+    
     def get_delivery_status(self) -> dict[str, Any]:
         """Obtener estado de entrega del mensaje"""
         from .. import db
@@ -1075,12 +1197,28 @@ class Message(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
         
         return reply
     
-    def get_thread_messages(self) -> list['Message']:
+    def get_thread_messages(self, limit: int = None) -> list['Message']:
         """Obtener mensajes del hilo (respuestas)"""
-        return Message.query.filter(
+        query = Message.query.filter(
             Message.parent_message_id == self.id,
             Message.is_deleted == False
-        ).order_by(Message.created_at.asc()).all()
+        ).order_by(Message.created_at.asc(), Message.id.asc())
+        
+        if limit:
+            query = query.limit(limit)
+        
+        return query.all()
+    
+    def get_thread_history(self, cursor: str = None, direction: str = 'newer',
+                           limit: int = None) -> dict[str, Any]:
+        """Obtener respuestas del hilo paginadas por cursor"""
+        return Message.get_history(
+            self.conversation_id,
+            cursor=cursor,
+            direction=direction,
+            limit=limit,
+            parent_message_id=self.id
+        )
     
     def increment_view_count(self):
         """Incrementar contador de visualizaciones"""
@@ -1091,8 +1229,14 @@ class Message(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
     def search_messages(cls, conversation_id: int, query: str = None, 
                        message_type: MessageType = None, sender_id: int = None,
                        date_from: datetime = None, date_to: datetime = None,
-                       has_attachments: bool = None, limit: int = 50):
-        """Buscar mensajes en una conversación"""
+                       has_attachments: bool = None, limit: int = 50,
+                       cursor: str = None):
+        """
+        Buscar mensajes en una conversación
+        
+        Los resultados se ordenan por (created_at, id) descendente; ``cursor``
+        es el ``next_cursor`` de una búsqueda anterior (ver history_cursor).
+        """
         search = cls.query.filter(
             cls.conversation_id == conversation_id,
             cls.is_deleted == False
@@ -1120,7 +1264,209 @@ class Message(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
             else:
                 search = search.filter(cls.attachments.is_(None))
         
-        return search.order_by(cls.created_at.desc()).limit(limit).all()
+        if cursor:
+            from ..utils.pagination import keyset_condition
+            
+            position = cls.decode_history_cursor(cursor)
+            search = search.filter(keyset_condition(
+                [cls.created_at, cls.id],
+                [position['created_at'], position['id']],
+                descending=True
+            ))
+        
+        return search.order_by(cls.created_at.desc(), cls.id.desc()).limit(limit).all()
+    
+    # Historial con cursores keyset sobre (created_at, id)
+    HISTORY_PAGE_SIZE = 50
+    MAX_HISTORY_PAGE_SIZE = 200
+    
+    @staticmethod
+    def history_cursor(row) -> str:
+        """Cursor opaco que apunta a un mensaje (o fila de historial)"""
+        from ..utils.pagination import encode_cursor
+        
+        return encode_cursor({'created_at': row.created_at, 'id': row.id})
+    
+    @staticmethod
+    def decode_history_cursor(cursor: str) -> dict[str, Any]:
+        """
+        Posición (created_at, id) de un cursor de historial
+        
+        Raises:
+            InvalidCursorError: Si el cursor no es válido o no apunta a un mensaje
+        """
+        from uuid import UUID
+        from ..utils.pagination import decode_cursor
+        
+        return decode_cursor(cursor, fields={'created_at': datetime, 'id': UUID})
+    
+    @classmethod
+    def _history_query(cls, conversation_id, parent_message_id=None):
+        """
+        Proyección compacta del historial
+        
+        Selecciona solo columnas escalares y el nombre del remitente, sin
+        hidratar objetos ORM ni regenerar el HTML del contenido.
+        """
+        from .user import User
+        
+        query = db.session.query(
+            cls.id, cls.conversation_id, cls.sender_id, cls.parent_message_id,
+            cls.content, cls.message_type, cls.status, cls.attachments,
+            cls.is_pinned, cls.edited_at, cls.created_at,
+            User.first_name.label('sender_first_name'),
+            User.last_name.label('sender_last_name')
+        ).outerjoin(
+            User, User.id == cls.sender_id
+        ).filter(
+            cls.conversation_id == conversation_id,
+            cls.is_deleted == False,
+            cls.is_scheduled == False
+        )
+        
+        if parent_message_id:
+            query = query.filter(cls.parent_message_id == parent_message_id)
+        
+        return query
+    
+    @staticmethod
+    def _history_row_to_dict(row) -> dict[str, Any]:
+        """Serializar una fila de la proyección compacta"""
+        sender_name = f"{row.sender_first_name or ''} {row.sender_last_name or ''}".strip()
+        return {
+            'id': str(row.id),
+            'conversation_id': str(row.conversation_id),
+            'sender_id': str(row.sender_id) if row.sender_id else None,
+            'sender_name': sender_name if row.sender_id else 'Sistema',
+            'parent_message_id': str(row.parent_message_id) if row.parent_message_id else None,
+            'content': row.content,
+            'message_type': row.message_type.value if row.message_type else None,
+            'status': row.status.value if row.status else None,
+            'attachment_count': len(row.attachments) if row.attachments else 0,
+            'is_pinned': bool(row.is_pinned),
+            'is_edited': bool(row.edited_at),
+            'created_at': row.created_at.isoformat() if row.created_at else None,
+            'cursor': Message.history_cursor(row)
+        }
+    
+    @classmethod
+    def _history_page(cls, base_query, position: Optional[dict[str, Any]], older: bool,
+                      limit: int, inclusive: bool = False):
+        """Leer una página en una dirección a partir de una posición"""
+        from ..utils.pagination import keyset_condition
+        
+        query = base_query
+        
+        if position:
+            condition = keyset_condition(
+                [cls.created_at, cls.id],
+                [position['created_at'], position['id']],
+                descending=older
+            )
+            if inclusive:
+                condition = condition | (cls.id == position['id'])
+            query = query.filter(condition)
+        
+        if older:
+            query = query.order_by(cls.created_at.desc(), cls.id.desc())
+        else:
+            query = query.order_by(cls.created_at.asc(), cls.id.asc())
+        
+        # Se pide una fila extra para saber si hay más sin contar
+        rows = query.limit(limit + 1).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        
+        # El historial siempre se devuelve en orden cronológico
+        if older:
+            rows.reverse()
+        
+        return rows, has_more
+    
+    @classmethod
+    def get_history(cls, conversation_id, cursor: str = None, direction: str = 'older',
+                    limit: int = None, parent_message_id=None) -> dict[str, Any]:
+        """
+        Obtener una página del historial de una conversación
+        
+        Args:
+            conversation_id: ID de la conversación
+            cursor: Posición de partida (``None`` para empezar en el extremo)
+            direction: 'older' para retroceder, 'newer' para avanzar
+            limit: Tamaño de página
+            parent_message_id: Limitar a las respuestas de un hilo
+            
+        Returns:
+            Diccionario con mensajes en orden cronológico y cursores
+            ``before``/``after`` para seguir paginando en cada sentido
+            
+        Raises:
+            ValidationError: Si la dirección no es válida
+            InvalidCursorError: Si el cursor no es válido
+        """
+        if direction not in ('older', 'newer'):
+            raise ValidationError("La dirección debe ser 'older' o 'newer'")
+        
+        limit = min(limit or cls.HISTORY_PAGE_SIZE, cls.MAX_HISTORY_PAGE_SIZE)
+        position = cls.decode_history_cursor(cursor) if cursor else None
+        older = direction == 'older'
+        
+        rows, has_more = cls._history_page(
+            cls._history_query(conversation_id, parent_message_id), position, older, limit
+        )
+        
+        return cls._history_response(
+            rows,
+            has_older=has_more if older else position is not None,
+            has_newer=position is not None if older else has_more,
+            fallback_cursor=cursor
+        )
+    
+    @classmethod
+    def get_history_around(cls, conversation_id, anchor_message_id,
+                           limit: int = None) -> dict[str, Any]:
+        """
+        Obtener el historial alrededor de un mensaje ancla
+        
+        Devuelve aproximadamente la mitad de la página antes del ancla
+        (incluyéndolo) y la otra mitad después, para saltar a un mensaje
+        concreto (búsqueda, enlace, mención) sin recorrer el historial.
+        """
+        limit = min(limit or cls.HISTORY_PAGE_SIZE, cls.MAX_HISTORY_PAGE_SIZE)
+        
+        anchor = db.session.query(cls.id, cls.created_at).filter(
+            cls.id == anchor_message_id,
+            cls.conversation_id == conversation_id
+        ).first()
+        if not anchor:
+            raise ValidationError("El mensaje ancla no pertenece a la conversación")
+        
+        position = {'created_at': anchor.created_at, 'id': anchor.id}
+        base_query = cls._history_query(conversation_id)
+        
+        older_rows, has_older = cls._history_page(
+            base_query, position, older=True, limit=limit // 2 + 1, inclusive=True
+        )
+        newer_rows, has_newer = cls._history_page(
+            base_query, position, older=False, limit=max(limit - len(older_rows), 1)
+        )
+        
+        response = cls._history_response(older_rows + newer_rows, has_older, has_newer)
+        response['anchor_id'] = str(anchor.id)
+        return response
+    
+    @classmethod
+    def _history_response(cls, rows, has_older: bool, has_newer: bool,
+                          fallback_cursor: str = None) -> dict[str, Any]:
+        """Construir la respuesta de una página de historial"""
+        return {
+            'messages': [cls._history_row_to_dict(row) for row in rows],
+            'before': cls.history_cursor(rows[0]) if rows and has_older else None,
+            # Sin filas nuevas se conserva el cursor para seguir consultando
+            'after': cls.history_cursor(rows[-1]) if rows else fallback_cursor,
+            'has_older': has_older,
+            'has_newer': has_newer
+        }
     
     @classmethod
     def get_pinned_messages(cls, conversation_id: int):
@@ -1189,7 +1535,7 @@ class Message(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
         if include_thread and self.reply_count > 0:
             data['thread_messages'] = [
                 reply.to_dict(include_thread=False, user_id=user_id) 
-                for reply in self.get_thread_messages()[:5]  # Últimas 5 respuestas
+                for reply in self.get_thread_messages(limit=5)  # Primeras 5 respuestas
             ]
         
         # Información específica del usuario
@@ -1407,4 +1753,28 @@ def process_scheduled_messages():
             # Log error pero continuar con otros mensajes
             print(f"Error enviando mensaje programado {message.id}: {e}")
     
-    return processed_count
\ No newline at end of file
+    return processed_count
+
+
+# Mantenimiento del índice de bandeja de entrada
+@event.listens_for(Message, 'after_insert')
+def update_inbox_after_message_insert(mapper, connection, target):
+    """Actualizar contadores e instantáneas al enviar un mensaje"""
+    if target.is_scheduled or target.status == MessageStatus.DRAFT:
+        return
+    InboxIndex.record_message(target, connection)
+
+
+@event.listens_for(Message, 'after_update')
+def update_inbox_after_message_update(mapper, connection, target):
+    """Actualizar el índice al eliminar o liberar un mensaje programado"""
+    from sqlalchemy import inspect
+    
+    state = inspect(target)
+    deleted_history = state.attrs.is_deleted.history
+    scheduled_history = state.attrs.is_scheduled.history
+    
+    if deleted_history.has_changes() and target.is_deleted:
+        InboxIndex.record_deletion(target, connection)
+    elif scheduled_history.has_changes() and not target.is_scheduled and target.status == MessageStatus.SENT:
+        InboxIndex.record_message(target, connection)
@@ -0,0 +1,72 @@
+"""
+Agregados de métricas por intervalo de tiempo
+
+Hechos pre-agregados por hora, día y mes, y por organización y programa,
+construidos de forma incremental a partir de ``ActivityLog``,
+``MentorshipSession``, ``Project`` y ``AnalyticsMetric``. Los dashboards los
+leen en lugar de recorrer las tablas de origen en cada visita (ver
+``app.services.metric_rollups``).
+
+``organization_id``/``program_id`` valen 0 cuando el hecho no pertenece a
+ninguna organización o programa, de modo que la restricción única funciona
+igual en todos los motores (los NULL no colisionan entre sí). ``is_public``
+separa los hechos de registros públicos (proyectos con ``is_public``) de los
+privados, para que las vistas de clientes puedan excluir estos últimos; los
+orígenes sin visibilidad propia usan ``False``.
+"""
+
+import logging
+
+from sqlalchemy import Column, String, Integer, Float, Boolean, DateTime, Index, UniqueConstraint
+
+from .base import BaseModel
+from .mixins import TimestampMixin
+
+logger = logging.getLogger('ecosistema.models.metric_rollup')
+
+
+class RollupGranularity:
+    """Granularidades de los agregados, de la más fina a la más gruesa."""
+
+    HOUR = 'hour'
+    DAY = 'day'
+    MONTH = 'month'
+
+    ALL = (HOUR, DAY, MONTH)
+
+
+class MetricRollup(BaseModel, TimestampMixin):
+    """
+    Valor agregado de una métrica en un intervalo.
+
+    Attributes:
+        metric: Nombre del hecho (por ejemplo ``mentorship.sessions_completed``)
+        granularity: ``hour``, ``day`` o ``month``
+        bucket_start: Inicio del intervalo (UTC, sin zona horaria)
+        organization_id: Organización (0 si no aplica)
+        program_id: Programa (0 si no aplica)
+        is_public: El hecho procede de registros públicos
+        value: Suma de los valores del intervalo
+        sample_count: Número de registros de origen agregados
+    """
+
+    __tablename__ = 'metric_rollups'
+    __table_args__ = (
+        UniqueConstraint(
+            'metric', 'granularity', 'bucket_start', 'organization_id', 'program_id', 'is_public',
+            name='uq_metric_rollups_bucket'
+        ),
+        Index('ix_metric_rollups_org_bucket', 'organization_id', 'granularity', 'bucket_start'),
+    )
+
+    metric = Column(String(100), nullable=False)
+    granularity = Column(String(10), nullable=False)
+    bucket_start = Column(DateTime, nullable=False)
+    organization_id = Column(Integer, nullable=False, default=0)
+    program_id = Column(Integer, nullable=False, default=0)
+    is_public = Column(Boolean, nullable=False, default=False)
+    value = Column(Float, nullable=False, default=0.0)
+    sample_count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<MetricRollup {self.metric} {self.granularity} {self.bucket_start}: {self.value}>'
@@ -324,6 +324,89 @@ class CacheableMixin:
         cache.set(cache_key, self, timeout=timeout)
 
 
+# ====================================
+# MIXIN DE ESTADÍSTICAS EN LOTE
+# ====================================
+
+class BatchStatsMixin:
+    """
+    Mixin para precargar estadísticas calculadas de una página de resultados.
+    
+    Cada modelo declara en ``batch_stat_queries`` sus estadísticas como
+    funciones que reciben la lista de ids y devuelven un select agrupado
+    ``(id, valor)``. ``load_batch_stats`` ejecuta una sola consulta por
+    estadística para todas las instancias y las propiedades calculadas leen
+    el valor precargado con ``batch_stat`` antes de consultar por fila.
+    """
+    
+    @classmethod
+    def batch_stat_queries(cls) -> dict[str, Callable]:
+        """Estadísticas agregadas del modelo: nombre -> fábrica de select."""
+        return {}
+    
+    def batch_stat(self, name: str, compute: Callable[[], Any]) -> Any:
+        """Obtener estadística precargada o calcularla individualmente."""
+        preloaded = self.__dict__.get('_batch_stats')
+        if preloaded is not None and name in preloaded:
+            return preloaded[name]
+        return compute()
+    
+    @classmethod
+    def load_batch_stats(cls, instances: list, stats: Optional[list[str]] = None) -> list:
+        """
+        Precargar estadísticas para un conjunto de instancias.
+        
+        Args:
+            instances: Instancias del modelo (por ejemplo, una página)
+            stats: Nombres de estadísticas a cargar (todas por defecto)
+            
+        Returns:
+            Las mismas instancias con las estadísticas inyectadas
+        """
+        queries = cls.batch_stat_queries()
+        names = [name for name in (stats or queries) if name in queries]
+        
+        ids = list({instance.id for instance in instances if instance is not None and instance.id is not None})
+        if not ids or not names:
+            return instances
+        
+        values = {}
+        for name in names:
+            rows = db.session.execute(queries[name](ids)).all()
+            values[name] = {row[0]: row[1] for row in rows}
+        
+        for instance in instances:
+            if instance is None:
+                continue
+            preloaded = instance.__dict__.setdefault('_batch_stats', {})
+            for name in names:
+                # Los ids sin filas en el agregado tienen valor 0
+                preloaded[name] = values[name].get(instance.id) or 0
+        
+        return instances
+    
+    def clear_batch_stats(self):
+        """Descartar estadísticas precargadas (por ejemplo, tras modificar relaciones)."""
+        self.__dict__.pop('_batch_stats', None)
+    
+    @classmethod
+    def serialize_batch(cls, instances: list, **to_dict_kwargs) -> list[dict[str, Any]]:
+        """
+        Serializar una página de instancias con las estadísticas cargadas en lote.
+        
+        Args:
+            instances: Instancias a serializar
+            **to_dict_kwargs: Argumentos para ``to_dict`` de cada instancia
+            
+        Returns:
+            Lista de diccionarios serializados
+        """
+        instances = list(instances)
+        if to_dict_kwargs.get('include_stats'):
+            cls.load_batch_stats(instances)
+        return [instance.to_dict(**to_dict_kwargs) for instance in instances]
+
+
 # ====================================
 # MIXIN DE EXPORTACIÓN
 # ====================================
@@ -898,6 +981,7 @@ __all__ = [
     'ContactMixin',
     'SearchableMixin',
     'CacheableMixin', 
+    'BatchStatsMixin',
     'ExportableMixin',
     'NotifiableMixin',
     'ValidatableMixin',
@@ -21,6 +21,10 @@ class Notification(CompleteBaseModel):
     """Model for notifications."""
     
     __tablename__ = 'notifications'
+    __table_args__ = (
+        # Recorrido por lotes de la retención (ver app.services.data_archive)
+        db.Index('ix_notifications_created_id', 'created_at', 'id'),
+    )
     
     title = db.Column(db.String(200), nullable=False)
     message = db.Column(db.Text, nullable=False)
@@ -189,36 +189,21 @@ class Organization(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin, Conta
     director_id = Column(Integer, ForeignKey('users.id'))
     director = relationship("User", foreign_keys=[director_id])
     
-    # Usuarios/empleados de la organización
-    employees = relationship("User", back_populates="organization",
-                           foreign_keys="User.organization_id")
-    
     # Programas ofrecidos por la organización
     programs = relationship("Program", back_populates="organization")
     
     # Proyectos apoyados
     supported_projects = relationship("Project", back_populates="supporting_organization")
     
-    # Emprendedores en programas
-    entrepreneurs = relationship("Entrepreneur", 
-                               secondary="program_enrollments",
-                               back_populates="organizations")
-    
     # Reuniones organizadas
     meetings = relationship("Meeting", back_populates="organizing_organization")
     
     # Documentos y recursos
     documents = relationship("Document", back_populates="organization")
     
-    # Eventos organizados
-    events = relationship("Event", back_populates="organizer")
-    
     # Actividades y logs
     activities = relationship("ActivityLog", back_populates="organization")
     
-    # Métricas y analytics
-    analytics = relationship("Analytics", back_populates="organization")
-    
     # Organizaciones colaboradoras
     partnerships = relationship("Organization",
                               secondary=organization_partnerships,
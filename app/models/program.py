@@ -236,35 +236,18 @@ class Program(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
     
     # Mentores asignados
     mentors = relationship("Ally", 
-                          secondary=program_mentors,
-                          back_populates="programs_mentoring")
+                          secondary=program_mentors)
     
     # Organizaciones partner
     partner_organizations = relationship("Organization",
-                                       secondary=program_partners,
-                                       back_populates="partnered_programs")
+                                       secondary=program_partners)
     
     # Sesiones del programa
     sessions = relationship("ProgramSession", back_populates="program")
     
-    # Tareas y asignaciones
-    assignments = relationship("Assignment", back_populates="program")
-    
-    # Eventos relacionados
-    events = relationship("Event", back_populates="program")
-    
     # Documentos del programa
     documents = relationship("Document", back_populates="program")
     
-    # Evaluaciones
-    evaluations = relationship("Evaluation", back_populates="program")
-    
-    # Actividades y logs
-    activities = relationship("ActivityLog", back_populates="program")
-    
-    # Analytics del programa
-    analytics = relationship("ProgramAnalytics", back_populates="program")
-    
     def __init__(self, **kwargs):
         """Inicialización del programa"""
         super().__init__(**kwargs)
@@ -948,7 +931,7 @@ class ProgramEnrollment(BaseModel, TimestampMixin, AuditMixin):
     program = relationship("Program", back_populates="enrollments")
     
     entrepreneur_id = Column(Integer, ForeignKey('entrepreneurs.id'), nullable=False, index=True)
-    entrepreneur = relationship("Entrepreneur", back_populates="program_enrollments")
+    entrepreneur = relationship("Entrepreneur", foreign_keys=[entrepreneur_id])
     
     # Estado de la inscripción
     status = Column(SQLEnum(EnrollmentStatus), default=EnrollmentStatus.APPLIED, index=True)
@@ -16,8 +16,8 @@ from enum import Enum
 import re
 from decimal import Decimal
 
-from .base import BaseModel
-from .mixins import TimestampMixin, SoftDeleteMixin, AuditMixin
+from .base import BaseModel, GUID
+from .mixins import TimestampMixin, SoftDeleteMixin, AuditMixin, BatchStatsMixin
 from ..core.constants import (
     PROJECT_STATUSES,
     PROJECT_TYPES,
@@ -189,7 +189,7 @@ project_mentors = Table(
 )
 
 
-class Project(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
+class Project(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin, BatchStatsMixin):
     """
     Modelo Proyecto
     
@@ -212,13 +212,12 @@ class Project(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
     industry_sector = Column(String(100), index=True)
     
     # Propietario principal
-    entrepreneur_id = Column(Integer, ForeignKey('entrepreneurs.id'), nullable=False, index=True)
+    entrepreneur_id = Column(GUID(), ForeignKey('entrepreneurs.id'), nullable=False, index=True)
     entrepreneur = relationship("Entrepreneur", back_populates="projects")
     
     # Co-fundadores
     cofounders = relationship("Entrepreneur",
-                            secondary=project_cofounders,
-                            back_populates="cofounder_projects")
+                            secondary=project_cofounders)
     
     # Fechas importantes
     conception_date = Column(Date)  # Fecha de concepción de la idea
@@ -335,8 +334,7 @@ class Project(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
     
     # Mentores asignados
     mentors = relationship("Ally",
-                          secondary=project_mentors,
-                          back_populates="mentored_projects")
+                          secondary=project_mentors)
     
     # Clientes/inversores interesados
     interested_clients = relationship("Client",
@@ -344,7 +342,7 @@ class Project(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
                                     back_populates="interested_projects")
     
     # Hitos del proyecto
-    milestones = relationship("ProjectMilestone", back_populates="project")
+    milestones = relationship("app.models.project.ProjectMilestone", back_populates="project")
     
     # Tareas del proyecto
     tasks = relationship("Task", back_populates="project")
@@ -355,18 +353,6 @@ class Project(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
     # Documentos del proyecto
     documents = relationship("Document", back_populates="project")
     
-    # Evaluaciones
-    evaluations = relationship("ProjectEvaluation", back_populates="project")
-    
-    # Actualizaciones/posts
-    updates = relationship("ProjectUpdate", back_populates="project")
-    
-    # Actividades del proyecto
-    activities = relationship("ActivityLog", back_populates="project")
-    
-    # Analytics del proyecto
-    analytics = relationship("ProjectAnalytics", back_populates="project")
-    
     def __init__(self, **kwargs):
         """Inicialización del proyecto"""
         super().__init__(**kwargs)
@@ -563,6 +549,66 @@ class Project(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
             return (self.active_users / self.total_users) * 100
         return 0
     
+    # Estadísticas calculadas (precargables en lote)
+    @property
+    def tasks_count(self):
+        """Número de tareas del proyecto"""
+        from .task import Task
+        return self.batch_stat('tasks_count', lambda: Task.query.filter(
+            Task.project_id == self.id,
+            Task.is_deleted == False
+        ).count())
+    
+    @property
+    def completed_tasks_count(self):
+        """Número de tareas completadas"""
+        from .task import Task, TaskStatus
+        return self.batch_stat('completed_tasks_count', lambda: Task.query.filter(
+            Task.project_id == self.id,
+            Task.is_deleted == False,
+            Task.status == TaskStatus.COMPLETED
+        ).count())
+    
+    @property
+    def documents_count(self):
+        """Número de documentos del proyecto"""
+        from .document import Document
+        return self.batch_stat('documents_count', lambda: Document.query.filter(
+            Document.project_id == self.id,
+            Document.is_deleted == False
+        ).count())
+    
+    @property
+    def meetings_count(self):
+        """Número de reuniones del proyecto"""
+        from .meeting import Meeting
+        return self.batch_stat('meetings_count', lambda: Meeting.query.filter(
+            Meeting.project_id == self.id,
+            Meeting.is_deleted == False
+        ).count())
+    
+    @classmethod
+    def batch_stat_queries(cls) -> dict[str, Any]:
+        """Consultas agrupadas para precargar estadísticas de una página"""
+        from sqlalchemy import select, func
+        from .task import Task, TaskStatus
+        from .document import Document
+        from .meeting import Meeting
+        
+        def grouped_count(model, ids, *conditions):
+            return (
+                select(model.project_id, func.count(model.id))
+                .where(model.project_id.in_(ids), model.is_deleted == False, *conditions)
+                .group_by(model.project_id)
+            )
+        
+        return {
+            'tasks_count': lambda ids: grouped_count(Task, ids),
+            'completed_tasks_count': lambda ids: grouped_count(Task, ids, Task.status == TaskStatus.COMPLETED),
+            'documents_count': lambda ids: grouped_count(Document, ids),
+            'meetings_count': lambda ids: grouped_count(Meeting, ids)
+        }
+    
     # Métodos de negocio
     def advance_status(self, new_status: ProjectStatus, notes: str = None):
         """Avanzar el estado del proyecto"""
@@ -892,15 +938,14 @@ class Project(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
     
     def get_dashboard_data(self) -> dict[str, Any]:
         """Generar datos para dashboard del proyecto"""
+        from app.models.activity_log import ActivityLog
+        
         recent_milestones = (self.milestones
                            .order_by(ProjectMilestone.created_at.desc())
                            .limit(5)
                            .all())
         
-        recent_activities = (self.activities
-                           .order_by(ActivityLog.created_at.desc())
-                           .limit(10)
-                           .all())
+        recent_activities = ActivityLog.get_activities_by_target('project', self.id, limit=10).all()
         
         return {
             'project_info': {
@@ -1206,8 +1251,8 @@ class Project(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
         
         return search.order_by(cls.created_at.desc()).all()
     
-    def to_dict(self, include_sensitive=False, include_relations=False) -> dict[str, Any]:
-        """Convertir a diccionario"""
+    def to_dict(self, include_sensitive=False, include_relations=False, include_stats=False) -> dict[str, Any]:
+        """Convertir a diccionario (usar serialize_batch para listados con estadísticas)"""
         data = {
             'id': self.id,
             'name': self.name,
@@ -1286,6 +1331,14 @@ class Project(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
                 'health_score': self.calculate_health_score()
             })
         
+        if include_stats:
+            data['stats'] = {
+                'tasks_count': self.tasks_count,
+                'completed_tasks_count': self.completed_tasks_count,
+                'documents_count': self.documents_count,
+                'meetings_count': self.meetings_count
+            }
+        
         return data
 
 
@@ -14,7 +14,7 @@ from sqlalchemy.ext.associationproxy import association_proxy
 from enum import Enum
 import re
 
-from .base import BaseModel
+from .base import BaseModel, GUID
 from .mixins import TimestampMixin, SoftDeleteMixin, AuditMixin
 from ..core.constants import (
     TASK_TYPES,
@@ -121,8 +121,8 @@ class ApprovalRequirement(Enum):
 from app.extensions import db
 task_assignees = Table(
     'task_assignees', db.metadata,
-    Column('task_id', Integer, ForeignKey('tasks.id'), primary_key=True),
-    Column('user_id', Integer, ForeignKey('users.id'), primary_key=True),
+    Column('task_id', GUID(), ForeignKey('tasks.id'), primary_key=True),
+    Column('user_id', GUID(), ForeignKey('users.id'), primary_key=True),
     Column('role', String(50), default='assignee'),  # assignee, reviewer, approver, watcher
     Column('assigned_at', DateTime, default=datetime.utcnow),
     Column('assigned_by_id', Integer, ForeignKey('users.id')),
@@ -134,8 +134,8 @@ task_assignees = Table(
 # Tabla de asociación para dependencias de tareas
 task_dependencies = Table(
     'task_dependencies', db.metadata,
-    Column('dependent_task_id', Integer, ForeignKey('tasks.id'), primary_key=True),
-    Column('prerequisite_task_id', Integer, ForeignKey('tasks.id'), primary_key=True),
+    Column('dependent_task_id', GUID(), ForeignKey('tasks.id'), primary_key=True),
+    Column('prerequisite_task_id', GUID(), ForeignKey('tasks.id'), primary_key=True),
     Column('dependency_type', String(50), default='finish_to_start'),  # finish_to_start, start_to_start, etc.
     Column('lag_days', Integer, default=0),  # Días de retraso permitido
     Column('is_critical', Boolean, default=False),
@@ -151,6 +151,10 @@ task_labels = Table(
 )
 
 
+# Horas de trabajo por día para convertir estimaciones en duraciones del grafo
+WORK_HOURS_PER_DAY = 8
+
+
 class Task(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
     """
     Modelo Tarea
@@ -189,14 +193,14 @@ class Task(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
     acceptance_criteria = Column(JSON)  # Criterios de aceptación
     
     # Jerarquía de tareas
-    parent_task_id = Column(Integer, ForeignKey('tasks.id'))
-    parent_task = relationship("Task", remote_side="Task.id", backref="subtasks")
+    parent_task_id = Column(GUID(), ForeignKey('tasks.id'))
+    parent_task = relationship("Task", foreign_keys=[parent_task_id], remote_side="Task.id", backref="subtasks")
     is_parent = Column(Boolean, default=False, index=True)
     
     # Recurrencia
     recurrence_pattern = Column(SQLEnum(RecurrencePattern), default=RecurrencePattern.NONE)
     recurrence_settings = Column(JSON)  # Configuración detallada de recurrencia
-    parent_recurring_task_id = Column(Integer, ForeignKey('tasks.id'))
+    parent_recurring_task_id = Column(GUID(), ForeignKey('tasks.id'))
     next_occurrence_date = Column(DateTime)
     
     # Aprobación y revisión
@@ -215,7 +219,7 @@ class Task(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
     blocked_by = relationship("User", foreign_keys=[blocked_by_id])
     
     # Enlaces a entidades del ecosistema
-    project_id = Column(Integer, ForeignKey('projects.id'))
+    project_id = Column(GUID(), ForeignKey('projects.id'))
     project = relationship("Project", back_populates="tasks")
     
     program_id = Column(Integer, ForeignKey('programs.id'))
@@ -225,7 +229,7 @@ class Task(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
     organization = relationship("Organization")
     
     milestone_id = Column(Integer, ForeignKey('project_milestones.id'))
-    milestone = relationship("ProjectMilestone")
+    milestone = relationship("app.models.project.ProjectMilestone")
     
     meeting_id = Column(Integer, ForeignKey('meetings.id'))
     meeting = relationship("Meeting", back_populates="tasks")
@@ -268,7 +272,7 @@ class Task(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
     # Usuarios asignados (múltiples)
     assignees = relationship("User",
                            secondary=task_assignees,
-                           back_populates="assigned_tasks")
+                           secondaryjoin="User.id == task_assignees.c.user_id")
     
     # Dependencias
     prerequisites = relationship("Task",
@@ -298,9 +302,6 @@ class Task(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
     # Tiempo registrado
     time_entries = relationship("TimeEntry", back_populates="task")
     
-    # Actividades de la tarea
-    activities = relationship("ActivityLog", back_populates="task")
-    
     def __init__(self, **kwargs):
         """Inicialización de la tarea"""
         super().__init__(**kwargs)
@@ -609,6 +610,10 @@ class Task(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
             self.blocked_at = None
             self.blocked_by_id = None
         
+        # Reabrir una tarea completada vuelve a bloquear a sus dependientes
+        if old_status == TaskStatus.COMPLETED:
+            self._check_and_unblock_dependents()
+        
         # Actualizar progreso si se proporciona
         if completion_percentage is not None:
             self.progress_percentage = completion_percentage
@@ -744,12 +749,18 @@ class Task(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
     
     def _would_create_circular_dependency(self, prerequisite_task) -> bool:
         """Verificar si agregaría dependencia circular"""
-        # Implementación simplificada - en producción sería más robusta
+        graph = self.dependency_graph()
+        if graph is not None and self.id in graph and prerequisite_task.id in graph:
+            return graph.would_create_cycle(prerequisite_task.id, self.id)
+        
         return prerequisite_task.id in self._get_all_dependent_task_ids()
     
     def _get_all_dependent_task_ids(self, visited=None) -> set:
         """Obtener todos los IDs de tareas dependientes recursivamente"""
         if visited is None:
+            graph = self.dependency_graph()
+            if graph is not None and self.id in graph:
+                return {self.id} | graph.descendants(self.id)
             visited = set()
         
         if self.id in visited:
@@ -762,22 +773,29 @@ class Task(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
         
         return visited
     
-    def _check_if_should_be_blocked(self):
-        """Verificar si la tarea debe bloquearse por dependencias"""
-        incomplete_prerequisites = [
-            prereq for prereq in self.prerequisites 
-            if prereq.status != TaskStatus.COMPLETED and not prereq.is_deleted
-        ]
-        
-        if incomplete_prerequisites and not self.is_blocked:
+    def _check_if_should_be_blocked(self, incomplete_count: int = None):
+        """
+        Verificar si la tarea debe bloquearse por dependencias
+        
+        Args:
+            incomplete_count: Prerrequisitos sin completar, si ya se conocen
+                (por defecto se calculan con la relación ``prerequisites``)
+        """
+        if incomplete_count is None:
+            incomplete_count = len([
+                prereq for prereq in self.prerequisites 
+                if prereq.status != TaskStatus.COMPLETED and not prereq.is_deleted
+            ])
+        
+        if incomplete_count and not self.is_blocked:
             self.is_blocked = True
             self.blocked_at = datetime.now(timezone.utc)
-            self.blocked_reason = f"Bloqueada por {len(incomplete_prerequisites)} dependencia(s) incompleta(s)"
+            self.blocked_reason = f"Bloqueada por {incomplete_count} dependencia(s) incompleta(s)"
             
             if self.status == TaskStatus.IN_PROGRESS:
                 self.status = TaskStatus.BLOCKED
         
-        elif not incomplete_prerequisites and self.is_blocked:
+        elif not incomplete_count and self.is_blocked:
             # Verificar si el bloqueo es solo por dependencias
             if "dependencia" in (self.blocked_reason or "").lower():
                 self.is_blocked = False
@@ -789,10 +807,118 @@ class Task(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
                     self.status = TaskStatus.NOT_STARTED if self.progress_percentage == 0 else TaskStatus.IN_PROGRESS
     
     def _check_and_unblock_dependents(self):
-        """Verificar y desbloquear tareas dependientes cuando esta se completa"""
-        for dependent in self.dependents:
-            if not dependent.is_deleted:
-                dependent._check_if_should_be_blocked()
+        """
+        Actualizar el bloqueo de las tareas dependientes tras completar o reabrir esta
+        
+        Con el grafo del proyecto solo se cargan los dependientes directos
+        cuyo bloqueo cambia, en una consulta.
+        """
+        graph = self.dependency_graph()
+        if graph is None or self.id not in graph:
+            for dependent in self.dependents:
+                if not dependent.is_deleted:
+                    dependent._check_if_should_be_blocked()
+            return
+        
+        changes = graph.set_completed(self.id, self.status == TaskStatus.COMPLETED)
+        if not changes:
+            return
+        
+        for dependent in Task.query.filter(Task.id.in_(changes.task_ids)).all():
+            dependent._check_if_should_be_blocked(graph.incomplete_prerequisites(dependent.id))
+    
+    def dependency_graph(self):
+        """Grafo de dependencias del proyecto de la tarea (None si no tiene proyecto)"""
+        if not self.project_id:
+            return None
+        return Task.load_dependency_graph(self.project_id)
+    
+    @classmethod
+    def load_dependency_graph(cls, project_id: int):
+        """
+        Cargar el grafo de dependencias de un proyecto
+        
+        Incluye todas las tareas activas del proyecto y, como nodos externos,
+        las tareas de otros proyectos enlazadas con ellas directa o
+        transitivamente (una consulta más por salto), de modo que los ciclos
+        que pasan por otros proyectos también se detectan. La duración de
+        cada tarea son los días de trabajo que le quedan (``estimated_hours``
+        entre ``WORK_HOURS_PER_DAY``; un día si no hay estimación; cero si
+        está completada).
+        
+        Returns:
+            DependencyGraph: Grafo del proyecto
+        """
+        from sqlalchemy import or_, select
+        from sqlalchemy.orm import aliased
+        from app.utils.dependency_graph import DependencyGraph
+        
+        graph = DependencyGraph()
+        
+        def add_node(task_id, status, is_blocked, estimated_hours):
+            completed = status == TaskStatus.COMPLETED
+            duration = 0.0 if completed else (
+                estimated_hours / WORK_HOURS_PER_DAY if estimated_hours else 1.0
+            )
+            graph.add_task(task_id, duration=duration, completed=completed, blocked=bool(is_blocked))
+        
+        nodes = db.session.query(
+            cls.id, cls.status, cls.is_blocked, cls.estimated_hours
+        ).filter(
+            cls.project_id == project_id,
+            cls.is_deleted == False
+        ).all()
+        
+        for node in nodes:
+            add_node(*node)
+        
+        prerequisite = aliased(cls)
+        dependent = aliased(cls)
+        
+        def load_edges(condition) -> set:
+            """Añadir las aristas que cumplen ``condition``; devuelve los nodos nuevos"""
+            edges = db.session.execute(
+                select(
+                    task_dependencies.c.lag_days,
+                    prerequisite.id, prerequisite.status, prerequisite.is_blocked, prerequisite.estimated_hours,
+                    dependent.id, dependent.status, dependent.is_blocked, dependent.estimated_hours
+                ).join(
+                    prerequisite, prerequisite.id == task_dependencies.c.prerequisite_task_id
+                ).join(
+                    dependent, dependent.id == task_dependencies.c.dependent_task_id
+                ).where(
+                    condition,
+                    prerequisite.is_deleted == False,
+                    dependent.is_deleted == False
+                )
+            ).all()
+            
+            new_nodes = set()
+            for lag_days, *endpoints in edges:
+                for node in (endpoints[:4], endpoints[4:]):
+                    if node[0] not in graph:
+                        add_node(*node)
+                        new_nodes.add(node[0])
+                graph.add_dependency(endpoints[0], endpoints[4], lag=lag_days or 0, check_cycle=False)
+            return new_nodes
+        
+        frontier = load_edges(or_(prerequisite.project_id == project_id, dependent.project_id == project_id))
+        
+        # Seguir las cadenas que salen del proyecto hasta cerrar el componente
+        while frontier:
+            frontier = load_edges(or_(prerequisite.id.in_(frontier), dependent.id.in_(frontier)))
+        
+        return graph
+    
+    @classmethod
+    def get_project_schedule(cls, project_id: int) -> dict[str, Any]:
+        """
+        Ruta crítica y holguras del trabajo pendiente de un proyecto (en días)
+        
+        Returns:
+            dict[str, Any]: Duración, ruta crítica y fechas por tarea
+        """
+        return cls.load_dependency_graph(project_id).schedule().to_dict()
     
     def create_subtask(self, title: str, description: str = None, 
                       assignee_id: int = None, due_date: datetime = None,
@@ -979,57 +1105,9 @@ class Task(BaseModel, TimestampMixin, SoftDeleteMixin, AuditMixin):
     
     def _calculate_next_occurrence(self, current_date: datetime) -> Optional[datetime]:
         """Calcular próxima ocurrencia basada en patrón de recurrencia"""
-        if self.recurrence_pattern == RecurrencePattern.DAILY:
-            return current_date + timedelta(days=1)
+        from app.utils.recurrence import next_occurrence
         
-        elif self.recurrence_pattern == RecurrencePattern.WEEKLY:
-            return current_date + timedelta(weeks=1)
-        
-        elif self.recurrence_pattern == RecurrencePattern.BI_WEEKLY:
-            return current_date + timedelta(weeks=2)
-        
-        elif self.recurrence_pattern == RecurrencePattern.MONTHLY:
-            # Mismo día del siguiente mes
-            if current_date.month == 12:
-                next_month = current_date.replace(year=current_date.year + 1, month=1)
-            else:
-                next_month = current_date.replace(month=current_date.month + 1)
-            return next_month
-        
-        elif self.recurrence_pattern == RecurrencePattern.QUARTERLY:
-            # Mismo día del siguiente trimestre
-            months_to_add = 3
-            new_month = current_date.month + months_to_add
-            new_year = current_date.year
-            
-            if new_month > 12:
-                new_year += 1
-                new_month -= 12
-            
-            return current_date.replace(year=new_year, month=new_month)
-        
-        elif self.recurrence_pattern == RecurrencePattern.YEARLY:
-            return current_date.replace(year=current_date.year + 1)
-        
-        elif self.recurrence_pattern == RecurrencePattern.CUSTOM:
-            # Lógica personalizada basada en recurrence_settings
-            settings = self.recurrence_settings or {}
-            interval = settings.get('interval', 1)
-            unit = settings.get('unit', 'days')
-            
-            if unit == 'days':
-                return current_date + timedelta(days=interval)
-            elif unit == 'weeks':
-                return current_date + timedelta(weeks=interval)
-            elif unit == 'months':
-                new_month = current_date.month + interval
-                new_year = current_date.year
-                while new_month > 12:
-                    new_year += 1
-                    new_month -= 12
-                return current_date.replace(year=new_year, month=new_month)
-        
-        return None
+        return next_occurrence(self.recurrence_pattern.value, current_date, self.recurrence_settings)
     
     def _log_activity(self, activity_type: str, description: str, 
                      user_id: int = None, metadata: dict[str, Any] = None):
@@ -1632,126 +1710,10 @@ class TaskLabel(BaseModel, TimestampMixin):
 def get_task_statistics(organization_id: int = None, user_id: int = None,
                        project_id: int = None, date_from: date = None, 
                        date_to: date = None) -> dict[str, Any]:
-    """Obtener estadísticas de tareas"""
-    query = Task.query.filter(Task.is_deleted == False)
-    
-    if organization_id:
-        query = query.filter(Task.organization_id == organization_id)
-    
-    if user_id:
-        query = query.filter(
-            (Task.assignee_id == user_id) |
-            (Task.assignees.any(id=user_id)) |
-            (Task.creator_id == user_id)
-        )
-    
-    if project_id:
-        query = query.filter(Task.project_id == project_id)
-    
-    if date_from:
-        date_from_dt = datetime.combine(date_from, datetime.min.time())
-        query = query.filter(Task.created_at >= date_from_dt)
-    
-    if date_to:
-        date_to_dt = datetime.combine(date_to, datetime.max.time())
-        query = query.filter(Task.created_at <= date_to_dt)
+    """Obtener estadísticas de tareas (agregadas en base de datos)"""
+    from app.services.task_analytics import get_task_statistics as compute_task_statistics
     
-    tasks = query.all()
-    
-    if not tasks:
-        return {
-            'total_tasks': 0,
-            'completion_rate': 0,
-            'average_completion_time': 0,
-            'overdue_tasks': 0,
-            'blocked_tasks': 0
-        }
-    
-    # Estadísticas básicas
-    total_tasks = len(tasks)
-    completed_tasks = len([t for t in tasks if t.status == TaskStatus.COMPLETED])
-    overdue_tasks = len([t for t in tasks if t.is_overdue])
-    blocked_tasks = len([t for t in tasks if t.is_blocked])
-    
-    # Tasa de finalización
-    completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
-    
-    # Tiempo promedio de finalización
-    completed_with_times = [
-        t for t in tasks 
-        if t.status == TaskStatus.COMPLETED and t.start_date and t.completed_at
-    ]
-    
-    if completed_with_times:
-        total_completion_time = sum(
-            (t.completed_at - t.start_date).days 
-            for t in completed_with_times
-        )
-        avg_completion_time = total_completion_time / len(completed_with_times)
-    else:
-        avg_completion_time = 0
-    
-    # Distribución por estado
-    status_distribution = {}
-    for task in tasks:
-        status = task.status.value
-        status_distribution[status] = status_distribution.get(status, 0) + 1
-    
-    # Distribución por prioridad
-    priority_distribution = {}
-    for task in tasks:
-        priority = task.priority.value
-        priority_distribution[priority] = priority_distribution.get(priority, 0) + 1
-    
-    # Distribución por tipo
-    type_distribution = {}
-    for task in tasks:
-        task_type = task.task_type.value
-        type_distribution[task_type] = type_distribution.get(task_type, 0) + 1
-    
-    # Métricas de tiempo
-    total_estimated_hours = sum(t.estimated_hours or 0 for t in tasks)
-    total_actual_hours = sum(t.actual_hours or 0 for t in tasks)
-    
-    time_variance = 0
-    if total_estimated_hours > 0:
-        time_variance = ((total_actual_hours - total_estimated_hours) / total_estimated_hours) * 100
-    
-    # Análisis de colaboración
-    tasks_with_multiple_assignees = len([t for t in tasks if t.assignee_count > 1])
-    tasks_with_comments = len([t for t in tasks if t.comment_count > 0])
-    tasks_with_subtasks = len([t for t in tasks if t.has_subtasks])
-    
-    return {
-        'total_tasks': total_tasks,
-        'completion_rate': round(completion_rate, 1),
-        'average_completion_time_days': round(avg_completion_time, 1),
-        'overdue_tasks': overdue_tasks,
-        'blocked_tasks': blocked_tasks,
-        'status_distribution': status_distribution,
-        'priority_distribution': priority_distribution,
-        'type_distribution': type_distribution,
-        'time_tracking': {
-            'total_estimated_hours': total_estimated_hours,
-            'total_actual_hours': total_actual_hours,
-            'time_variance_percentage': round(time_variance, 1),
-            'tasks_with_time_tracking': len([t for t in tasks if t.estimated_hours or t.actual_hours])
-        },
-        'collaboration_metrics': {
-            'tasks_with_multiple_assignees': tasks_with_multiple_assignees,
-            'tasks_with_comments': tasks_with_comments,
-            'tasks_with_subtasks': tasks_with_subtasks,
-            'collaboration_rate': round(tasks_with_multiple_assignees / total_tasks * 100, 1) if total_tasks > 0 else 0
-        },
-        'productivity_insights': {
-            'tasks_per_day': round(total_tasks / 30, 1) if total_tasks > 0 else 0,  # Último mes
-            'average_progress': round(sum(t.progress_percentage for t in tasks) / total_tasks, 1) if total_tasks > 0 else 0,
-            'high_priority_completion_rate': round(
-                len([t for t in tasks if t.priority in [TaskPriority.HIGH, TaskPriority.HIGHEST, TaskPriority.CRITICAL] and t.is_completed]) /
-                len([t for t in tasks if t.priority in [TaskPriority.HIGH, TaskPriority.HIGHEST, TaskPriority.CRITICAL]]) * 100, 1
-            ) if any(t.priority in [TaskPriority.HIGH, TaskPriority.HIGHEST, TaskPriority.CRITICAL] for t in tasks) else 0
-        }
-    }
+    return compute_task_statistics(organization_id, user_id, project_id, date_from, date_to)
 
 
 def update_overdue_task_notifications():
@@ -1785,118 +1747,33 @@ def update_overdue_task_notifications():
 
 
 def process_recurring_tasks():
-    """Procesar tareas recurrentes y crear nuevas instancias"""
-    recurring_tasks = Task.query.filter(
-        Task.recurrence_pattern != RecurrencePattern.NONE,
-        Task.next_occurrence_date <= datetime.now(timezone.utc),
-        Task.is_deleted == False
-    ).all()
-    
-    created_instances = 0
-    
-    for task in recurring_tasks:
-        try:
-            # Crear próxima instancia
-            end_date = date.today() + timedelta(days=365)  # Un año adelante
-            instances = task.create_recurring_instances(end_date, max_instances=1)
-            created_instances += len(instances)
-            
-        except Exception as e:
-            print(f"Error creando instancia recurrente para tarea {task.id}: {e}")
+    """Procesar tareas recurrentes y crear nuevas instancias (por bloques)"""
+    from app.services.task_batch import CHUNK_SIZE, expand_recurring_tasks, list_due_recurring_task_ids
+    
+    task_ids = list_due_recurring_task_ids()
+    now = datetime.now(timezone.utc)
     
-    return created_instances
+    return sum(
+        expand_recurring_tasks(task_ids[i:i + CHUNK_SIZE], now).changed
+        for i in range(0, len(task_ids), CHUNK_SIZE)
+    )
 
 
 def auto_update_task_progress():
     """Actualizar automáticamente el progreso de tareas padre basado en subtareas"""
-    parent_tasks = Task.query.filter(
-        Task.is_parent == True,
-        Task.status.notin_([TaskStatus.COMPLETED, TaskStatus.CANCELLED, TaskStatus.ARCHIVED]),
-        Task.is_deleted == False
-    ).all()
-    
-    updated_count = 0
-    
-    for parent_task in parent_tasks:
-        try:
-            old_progress = parent_task.progress_percentage
-            parent_task._update_parent_progress()
-            
-            if old_progress != parent_task.progress_percentage:
-                updated_count += 1
-                
-        except Exception as e:
-            print(f"Error actualizando progreso de tarea padre {parent_task.id}: {e}")
+    from app.services.task_batch import CHUNK_SIZE, list_active_parent_task_ids, rollup_parent_progress
     
-    return updated_count
+    parent_ids = list_active_parent_task_ids()
+    
+    return sum(
+        rollup_parent_progress(parent_ids[i:i + CHUNK_SIZE]).changed
+        for i in range(0, len(parent_ids), CHUNK_SIZE)
+    )
 
 
 def generate_task_burndown_data(project_id: int, sprint_start: date, 
                                sprint_end: date) -> dict[str, Any]:
     """Generar datos para gráfico burndown de tareas"""
-    project_tasks = Task.query.filter(
-        Task.project_id == project_id,
-        Task.created_at <= datetime.combine(sprint_end, datetime.max.time()),
-        Task.is_deleted == False
-    ).all()
-    
-    if not project_tasks:
-        return {'error': 'No hay tareas en el proyecto'}
-    
-    # Calcular work remaining por día
-    current_date = sprint_start
-    burndown_data = []
-    
-    while current_date <= sprint_end:
-        # Tareas restantes al final del día
-        day_end = datetime.combine(current_date, datetime.max.time())
-        
-        remaining_tasks = len([
-            task for task in project_tasks
-            if (task.completed_at is None or task.completed_at > day_end) and
-               task.created_at <= day_end
-        ])
-        
-        # Story points restantes
-        remaining_points = sum(
-            task.story_points or 1 for task in project_tasks
-            if (task.completed_at is None or task.completed_at > day_end) and
-               task.created_at <= day_end
-        )
-        
-        burndown_data.append({
-            'date': current_date.isoformat(),
-            'remaining_tasks': remaining_tasks,
-            'remaining_points': remaining_points
-        })
-        
-        current_date += timedelta(days=1)
-    
-    # Línea ideal
-    total_tasks = len(project_tasks)
-    total_points = sum(task.story_points or 1 for task in project_tasks)
-    sprint_days = (sprint_end - sprint_start).days + 1
-    
-    ideal_burndown = []
-    for i, data_point in enumerate(burndown_data):
-        ideal_tasks = total_tasks - (total_tasks * i / (sprint_days - 1))
-        ideal_points = total_points - (total_points * i / (sprint_days - 1))
-        
-        ideal_burndown.append({
-            'date': data_point['date'],
-            'ideal_tasks': max(0, ideal_tasks),
-            'ideal_points': max(0, ideal_points)
-        })
-    
-    return {
-        'actual_burndown': burndown_data,
-        'ideal_burndown': ideal_burndown,
-        'sprint_summary': {
-            'start_date': sprint_start.isoformat(),
-            'end_date': sprint_end.isoformat(),
-            'total_tasks': total_tasks,
-            'total_story_points': total_points,
-            'completed_tasks': len([t for t in project_tasks if t.is_completed]),
-            'completion_rate': len([t for t in project_tasks if t.is_completed]) / total_tasks * 100 if total_tasks > 0 else 0
-        }
-    }
+    from app.services.task_analytics import generate_task_burndown_data as compute_burndown
+    
+    return compute_burndown(project_id, sprint_start, sprint_end)
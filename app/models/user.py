@@ -15,7 +15,6 @@ from sqlalchemy import Column, String, Boolean, DateTime, Integer, Text, Index,
 from sqlalchemy.orm import validates, relationship, backref
 from sqlalchemy.ext.hybrid import hybrid_property, hybrid_method
 from sqlalchemy.dialects.postgresql import JSONB
-from werkzeug.security import generate_password_hash, check_password_hash
 from enum import Enum
 
 # Añadir UserType que falta
@@ -375,7 +374,9 @@ class User(CompleteBaseModel, UserMixin, SearchableMixin, CacheableMixin,
             if not validation_result['is_valid']:
                 raise ValueError(f"Contraseña inválida: {', '.join(validation_result['errors'])}")
         
-        self.password_hash = generate_password_hash(password)
+        from app.services.password_hashing import get_password_hasher
+        
+        self.password_hash = get_password_hasher().hash(password)
         
         # Resetear intentos fallidos
         self.failed_login_attempts = 0
@@ -387,16 +388,27 @@ class User(CompleteBaseModel, UserMixin, SearchableMixin, CacheableMixin,
         """
         Verificar contraseña.
         
+        La verificación se hace en el pool de hashing; si es correcta y el
+        hash usa un método o coste anterior a la política, se recalcula (se
+        persiste con el commit del login).
+        
         Args:
             password: Contraseña a verificar
             
         Returns:
             True si la contraseña es correcta
         """
+        from app.services.password_hashing import get_password_hasher
+        
         if not self.password_hash:
             return False
         
-        return check_password_hash(self.password_hash, password)
+        is_valid, upgraded_hash = get_password_hasher().verify_and_upgrade(password, self.password_hash)
+        if upgraded_hash:
+            self.password_hash = upgraded_hash
+            user_logger.info(f"Password hash upgraded for user: {self.email}")
+        
+        return is_valid
     
     def generate_password_reset_token(self) -> str:
         """Generar token para reseteo de contraseña."""
@@ -0,0 +1,90 @@
+"""
+Bandeja de entrada de webhooks
+
+Cada evento recibido de un proveedor externo se guarda tal cual en
+``webhook_events`` con una clave de idempotencia única por proveedor antes de
+responder; el procesamiento lo hacen después los workers
+(``app.services.webhook_inbox``) por lotes y por proveedor, respetando el
+orden de llegada de los eventos de un mismo recurso.
+
+Estados:
+    pending -> processing -> processed
+                          -> failed (reintento programado) -> ... -> dead_letter
+"""
+
+import logging
+from enum import Enum
+
+from sqlalchemy import Column, String, Integer, DateTime, Text, Enum as SQLEnum, Index, UniqueConstraint
+
+from .base import BaseModel, JSONType
+from .mixins import TimestampMixin
+
+logger = logging.getLogger('ecosistema.models.webhook_event')
+
+
+class WebhookProvider(Enum):
+    """Proveedores de webhooks soportados."""
+    STRIPE = "stripe"
+    PAYPAL = "paypal"
+    GOOGLE_CALENDAR = "google_calendar"
+    SLACK = "slack"
+    MICROSOFT_TEAMS = "microsoft_teams"
+    ZOOM = "zoom"
+    GITHUB = "github"
+    MAILGUN = "mailgun"
+    TWILIO = "twilio"
+    CUSTOM = "custom"
+
+
+class WebhookStatus(Enum):
+    """Estados de un evento de la bandeja."""
+    PENDING = "pending"
+    PROCESSING = "processing"
+    PROCESSED = "processed"
+    FAILED = "failed"
+    DEAD_LETTER = "dead_letter"
+
+
+class WebhookEvent(BaseModel, TimestampMixin):
+    """
+    Evento de webhook recibido.
+
+    Attributes:
+        provider: Proveedor que envió el evento
+        event_type: Tipo de evento según el proveedor
+        event_id: Identificador del evento en el proveedor
+        idempotency_key: Huella única por proveedor (reenvíos no duplican)
+        resource_key: Recurso afectado; sus eventos se procesan en orden
+        payload: Cuerpo del evento
+        status: Estado en la bandeja
+        received_at: Momento de recepción (orden de procesamiento)
+        retry_count: Intentos fallidos
+        next_attempt_at: Próximo reintento de un evento fallido
+        locked_until: Fin de la reserva de un worker (eventos en proceso)
+    """
+
+    __tablename__ = 'webhook_events'
+    __table_args__ = (
+        UniqueConstraint('provider', 'idempotency_key', name='uq_webhook_events_idempotency'),
+        Index('ix_webhook_events_drain', 'provider', 'status', 'received_at'),
+        Index('ix_webhook_events_resource', 'provider', 'resource_key', 'received_at'),
+    )
+
+    provider = Column(SQLEnum(WebhookProvider), nullable=False)
+    event_type = Column(String(100), nullable=False)
+    event_id = Column(String(255), nullable=False)
+    idempotency_key = Column(String(64), nullable=False)
+    resource_key = Column(String(255))
+    payload = Column(JSONType, default=dict)
+
+    status = Column(SQLEnum(WebhookStatus), nullable=False, default=WebhookStatus.PENDING)
+    received_at = Column(DateTime, nullable=False)
+    processed_at = Column(DateTime)
+    retry_count = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime)
+    locked_until = Column(DateTime)
+    error_message = Column(Text)
+
+    def __repr__(self):
+        return f'<WebhookEvent {self.provider.value if self.provider else None}:{self.event_id} {self.status}>'
@@ -57,8 +57,8 @@ logger = logging.getLogger(__name__)
 # Registry global de servicios
 _service_registry: dict[str, Any] = {}
 _service_instances: WeakValueDictionary = WeakValueDictionary()
-_service_health_status: dict[str, Dict] = {}
-_service_metrics: dict[str, Dict] = {}
+_service_health_status: dict[str, dict] = {}
+_service_metrics: dict[str, dict] = {}
 
 # Configuraciones globales del módulo de servicios
 SERVICES_CONFIG = {
@@ -0,0 +1,449 @@
+"""
+Motor de sincronización de calendarios externos
+
+Sincroniza los calendarios conectados de muchos usuarios con concurrencia
+acotada. Cada usuario se descarga de forma incremental con su token de
+sincronización, en páginas grandes con solo los campos necesarios, y los
+cambios se aplican con inserciones/actualizaciones masivas de ``Meeting``
+indexadas por (organizador, id de evento remoto). Los fallos transitorios no
+bloquean el worker: se programa un reintento con backoff exponencial.
+
+La fuente de eventos es inyectable (``GoogleCalendarSource`` en producción),
+de modo que el motor se puede probar contra una API de calendario falsa.
+"""
+
+import logging
+import random
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional
+
+from flask import current_app
+from sqlalchemy import bindparam, select, insert, update
+
+from app.extensions import db
+from app.models.calendar_sync import CalendarSync
+from app.models.meeting import Meeting, MeetingStatus, MeetingType
+from app.utils.date_utils import parse_datetime
+
+logger = logging.getLogger(__name__)
+
+# Tamaño de los lotes de escritura y de búsqueda de eventos existentes
+UPSERT_CHUNK_SIZE = 500
+
+
+class SyncTokenExpired(Exception):
+    """El proveedor invalidó el token incremental (HTTP 410)."""
+
+
+class TransientSyncError(Exception):
+    """Error recuperable (cuotas, 5xx, red); la sincronización se reintenta."""
+
+
+@dataclass
+class UserSyncOutcome:
+    """Resultado de sincronizar el calendario de un usuario"""
+    user_id: Any
+    success: bool
+    events_synced: int = 0
+    events_created: int = 0
+    events_updated: int = 0
+    events_deleted: int = 0
+    full_sync: bool = False
+    retry_in_seconds: Optional[int] = None
+    errors: list[str] = field(default_factory=list)
+
+
+# ====================================
+# FUENTE DE EVENTOS
+# ====================================
+
+class GoogleCalendarSource:
+    """
+    Fuente de cambios basada en la API de Google Calendar.
+
+    Pide páginas del tamaño máximo permitido y limita la respuesta a los
+    campos que usa la sincronización.
+    """
+
+    PAGE_SIZE = 2500
+    EVENT_FIELDS = (
+        'nextPageToken,nextSyncToken,'
+        'items(id,status,summary,description,location,start,end,updated,'
+        'attendees(email,responseStatus),extendedProperties)'
+    )
+
+    def __init__(self, calendar_service):
+        self.calendar_service = calendar_service
+
+    def list_events(self, user_id, calendar_id: str, sync_token: Optional[str] = None,
+                    page_token: Optional[str] = None) -> dict[str, Any]:
+        """Obtener una página de cambios (incremental si hay token)."""
+        from googleapiclient.errors import HttpError
+
+        credentials = self.calendar_service._get_user_credentials(user_id)
+        if not credentials:
+            raise RuntimeError("Usuario no tiene Google Calendar conectado")
+
+        service = self.calendar_service._build_calendar_service(credentials)
+        params = {
+            'calendarId': calendar_id,
+            'maxResults': self.PAGE_SIZE,
+            'singleEvents': True,
+            'showDeleted': True,
+            'fields': self.EVENT_FIELDS
+        }
+        if page_token:
+            params['pageToken'] = page_token
+        if sync_token:
+            params['syncToken'] = sync_token
+        else:
+            params['timeMin'] = datetime.now(timezone.utc).isoformat()
+
+        try:
+            return service.events().list(**params).execute()
+        except HttpError as e:
+            status = getattr(e.resp, 'status', None)
+            if status == 410:
+                raise SyncTokenExpired(str(e)) from e
+            if status in (403, 429) or (status and status >= 500):
+                raise TransientSyncError(str(e)) from e
+            raise
+
+
+# ====================================
+# CONVERSIÓN DE EVENTOS
+# ====================================
+
+def _parse_event_time(value: dict[str, Any]) -> Optional[datetime]:
+    """Convertir ``start``/``end`` de Google a UTC sin zona horaria."""
+    if not value:
+        return None
+    if 'dateTime' in value:
+        parsed = parse_datetime(value['dateTime'])
+    elif 'date' in value:
+        parsed = datetime.strptime(value['date'], '%Y-%m-%d')
+    else:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def google_event_to_row(user_id, calendar_id: str, event: dict[str, Any]) -> Optional[dict[str, Any]]:
+    """
+    Convertir un evento de Google en valores de columna de ``Meeting``.
+
+    Returns:
+        Diccionario de columnas o None si el evento no tiene horario válido
+    """
+    start = _parse_event_time(event.get('start'))
+    end = _parse_event_time(event.get('end'))
+    if not start or not end:
+        return None
+
+    metadata = (event.get('extendedProperties') or {}).get('private') or {}
+    row = {
+        'organizer_id': user_id,
+        'google_event_id': event['id'],
+        'google_calendar_id': calendar_id,
+        'synced_from_google': True,
+        'title': (event.get('summary') or 'Evento de Google Calendar')[:300],
+        'description': event.get('description'),
+        'location': (event.get('location') or '')[:500] or None,
+        'scheduled_start': start,
+        'scheduled_end': end,
+        'duration_minutes': max(int((end - start).total_seconds() // 60), 0),
+        'external_updated_at': _parse_event_time({'dateTime': event['updated']}) if event.get('updated') else None,
+        'custom_fields': {'google_attendees': event.get('attendees') or [], 'google_metadata': metadata} if (event.get('attendees') or metadata) else None
+    }
+    if metadata.get('mentorship_id'):
+        row['mentorship_id'] = metadata['mentorship_id']
+    return row
+
+
+# ====================================
+# MOTOR DE SINCRONIZACIÓN
+# ====================================
+
+class CalendarSyncEngine:
+    """
+    Sincronización concurrente e incremental de calendarios.
+
+    Args:
+        source: Fuente de eventos con ``list_events(user_id, calendar_id,
+            sync_token, page_token)``
+        max_workers: Usuarios sincronizados en paralelo
+        max_attempts: Intentos antes de abandonar un usuario hasta la próxima pasada
+        base_retry_delay: Retardo base (segundos) del backoff exponencial
+        max_retry_delay: Retardo máximo (segundos)
+        retry_scheduler: ``callable(user_id, attempt, countdown)`` que programa
+            el reintento; por defecto encola ``sync_user_calendar``
+    """
+
+    def __init__(
+        self,
+        source,
+        max_workers: int = 8,
+        max_attempts: int = 5,
+        base_retry_delay: int = 60,
+        max_retry_delay: int = 3600,
+        retry_scheduler: Optional[Callable[[Any, int, int], None]] = None,
+        calendar_id: str = 'primary'
+    ):
+        self.source = source
+        self.max_workers = max_workers
+        self.max_attempts = max_attempts
+        self.base_retry_delay = base_retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.retry_scheduler = retry_scheduler or _enqueue_retry
+        self.calendar_id = calendar_id
+
+    # ----- Orquestación -----
+
+    def sync_all(self) -> dict[str, Any]:
+        """Sincronizar todos los calendarios conectados (pasada nocturna)."""
+        user_ids = [
+            row[0] for row in db.session.execute(
+                select(CalendarSync.user_id)
+                .where(CalendarSync.provider == 'google', CalendarSync.calendar_id == self.calendar_id)
+            ).all()
+        ]
+        return self.sync_users(user_ids)
+
+    def sync_users(self, user_ids: list, attempt: int = 0) -> dict[str, Any]:
+        """
+        Sincronizar varios usuarios con concurrencia acotada.
+
+        Returns:
+            Resumen con contadores, errores y reintentos programados
+        """
+        summary = {
+            'successful': 0,
+            'failed': 0,
+            'retries_scheduled': 0,
+            'events_synced': 0,
+            'errors': []
+        }
+        if not user_ids:
+            return summary
+
+        app = current_app._get_current_object()
+
+        def run(user_id) -> UserSyncOutcome:
+            with app.app_context():
+                try:
+                    return self.sync_user(user_id, attempt=attempt)
+                finally:
+                    db.session.remove()
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(user_ids))) as executor:
+            outcomes = list(executor.map(run, user_ids))
+
+        for outcome in outcomes:
+            summary['events_synced'] += outcome.events_synced
+            if outcome.success:
+                summary['successful'] += 1
+            else:
+                summary['failed'] += 1
+                summary['errors'].extend(f"Usuario {outcome.user_id}: {error}" for error in outcome.errors)
+                if outcome.retry_in_seconds is not None:
+                    summary['retries_scheduled'] += 1
+
+        return summary
+
+    def sync_user(self, user_id, attempt: int = 0) -> UserSyncOutcome:
+        """Sincronizar el calendario de un usuario de forma incremental."""
+        state = CalendarSync.get_or_create(user_id, 'google', self.calendar_id)
+
+        try:
+            events, next_sync_token, full_sync = self._pull_changes(user_id, state)
+            created, updated, deleted = self.apply_changes(user_id, events)
+
+            state.mark_success(next_sync_token, full_sync=full_sync)
+            db.session.commit()
+
+            return UserSyncOutcome(
+                user_id=user_id,
+                success=True,
+                events_synced=len(events),
+                events_created=created,
+                events_updated=updated,
+                events_deleted=deleted,
+                full_sync=full_sync
+            )
+
+        except TransientSyncError as e:
+            db.session.rollback()
+            return self._schedule_retry(user_id, attempt, str(e))
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error sincronizando calendario de usuario {user_id}: {str(e)}")
+            self._record_failure(user_id, str(e), None)
+            return UserSyncOutcome(user_id=user_id, success=False, errors=[str(e)])
+
+    # ----- Descarga -----
+
+    def _pull_changes(self, user_id, state: CalendarSync) -> tuple[list[dict[str, Any]], Optional[str], bool]:
+        """Descargar todas las páginas de cambios; vuelve a sync completo si el token expiró."""
+        sync_token = state.sync_token
+
+        try:
+            events, next_sync_token = self._pull_pages(user_id, sync_token)
+            return events, next_sync_token, sync_token is None
+        except SyncTokenExpired:
+            logger.warning(f"Sync token inválido para usuario {user_id}, haciendo sync completo")
+            state.reset_token()
+            events, next_sync_token = self._pull_pages(user_id, None)
+            return events, next_sync_token, True
+
+    def _pull_pages(self, user_id, sync_token: Optional[str]) -> tuple[list[dict[str, Any]], Optional[str]]:
+        events = []
+        page_token = None
+
+        while True:
+            page = self.source.list_events(user_id, self.calendar_id, sync_token=sync_token, page_token=page_token)
+            events.extend(page.get('items', []))
+            page_token = page.get('nextPageToken')
+            if not page_token:
+                return events, page.get('nextSyncToken')
+
+    # ----- Escritura masiva -----
+
+    def apply_changes(self, user_id, events: list[dict[str, Any]]) -> tuple[int, int, int]:
+        """
+        Aplicar cambios a ``Meeting`` con operaciones masivas.
+
+        Returns:
+            Tupla (creados, actualizados, cancelados)
+        """
+        # Quedarse con la última versión de cada evento de la descarga
+        latest: dict[str, dict[str, Any]] = {}
+        for event in events:
+            if event.get('id'):
+                latest[event['id']] = event
+
+        cancelled_ids = [event_id for event_id, event in latest.items() if event.get('status') == 'cancelled']
+        rows = [
+            row for row in (
+                google_event_to_row(user_id, self.calendar_id, event)
+                for event in latest.values() if event.get('status') != 'cancelled'
+            ) if row is not None
+        ]
+
+        # Sentencias Core sobre la tabla: el bulk ORM evalúa a nivel de clase
+        # todas las hybrid properties de Meeting y algunas no lo admiten
+        meetings = Meeting.__table__
+        created = updated = deleted = 0
+
+        for chunk_start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            chunk = rows[chunk_start:chunk_start + UPSERT_CHUNK_SIZE]
+            existing = {
+                google_event_id: (meeting_id, external_updated_at, status)
+                for meeting_id, google_event_id, external_updated_at, status in db.session.execute(
+                    select(Meeting.id, Meeting.google_event_id, Meeting.external_updated_at, Meeting.status)
+                    .where(
+                        Meeting.organizer_id == user_id,
+                        Meeting.google_event_id.in_([row['google_event_id'] for row in chunk])
+                    )
+                ).all()
+            }
+
+            to_insert = []
+            to_update = []
+            for row in chunk:
+                match = existing.get(row['google_event_id'])
+                if match is None:
+                    to_insert.append({
+                        **row,
+                        'meeting_type': MeetingType.OTHER,
+                        'status': MeetingStatus.SCHEDULED
+                    })
+                elif match[1] is None or row['external_updated_at'] is None or row['external_updated_at'] > match[1]:
+                    # Solo reescribir eventos que cambiaron en el proveedor
+                    changes = {**row, '_meeting_pk': match[0]}
+                    if match[2] == MeetingStatus.CANCELLED:
+                        # El evento se restauró en el proveedor tras cancelarse
+                        changes['status'] = MeetingStatus.SCHEDULED
+                    to_update.append(changes)
+
+            if to_insert:
+                _execute_many(insert(meetings), to_insert)
+                created += len(to_insert)
+            if to_update:
+                _execute_many(
+                    update(meetings).where(meetings.c.id == bindparam('_meeting_pk')),
+                    to_update
+                )
+                updated += len(to_update)
+
+        for chunk_start in range(0, len(cancelled_ids), UPSERT_CHUNK_SIZE):
+            chunk = cancelled_ids[chunk_start:chunk_start + UPSERT_CHUNK_SIZE]
+            result = db.session.execute(
+                update(Meeting)
+                .where(
+                    Meeting.organizer_id == user_id,
+                    Meeting.google_event_id.in_(chunk),
+                    Meeting.status != MeetingStatus.CANCELLED
+                )
+                .values(status=MeetingStatus.CANCELLED)
+                .execution_options(synchronize_session=False)
+            )
+            deleted += result.rowcount or 0
+
+        return created, updated, deleted
+
+    # ----- Reintentos -----
+
+    def retry_delay(self, attempt: int) -> int:
+        """Backoff exponencial con jitter (segundos)."""
+        delay = min(self.base_retry_delay * (2 ** attempt), self.max_retry_delay)
+        return int(delay / 2 + random.uniform(0, delay / 2))
+
+    def _schedule_retry(self, user_id, attempt: int, error: str) -> UserSyncOutcome:
+        if attempt + 1 >= self.max_attempts:
+            logger.error(f"Sincronización de usuario {user_id} abandonada tras {attempt + 1} intentos: {error}")
+            self._record_failure(user_id, error, None)
+            return UserSyncOutcome(user_id=user_id, success=False, errors=[error])
+
+        countdown = self.retry_delay(attempt)
+        self._record_failure(user_id, error, datetime.now(timezone.utc) + timedelta(seconds=countdown))
+
+        try:
+            self.retry_scheduler(user_id, attempt + 1, countdown)
+        except Exception as e:
+            logger.error(f"No se pudo programar reintento de sincronización para {user_id}: {str(e)}")
+            return UserSyncOutcome(user_id=user_id, success=False, errors=[error, str(e)])
+
+        return UserSyncOutcome(user_id=user_id, success=False, retry_in_seconds=countdown, errors=[error])
+
+    def _record_failure(self, user_id, error: str, next_retry_at: Optional[datetime]):
+        try:
+            state = CalendarSync.get_or_create(user_id, 'google', self.calendar_id)
+            state.mark_failure(error, next_retry_at)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error registrando fallo de sincronización: {str(e)}")
+
+
+def _execute_many(statement, rows: list[dict[str, Any]]):
+    """Ejecutar ``statement`` en lote, agrupando las filas con las mismas columnas."""
+    groups: dict[frozenset, list[dict[str, Any]]] = defaultdict(list)
+    for row in rows:
+        groups[frozenset(row)].append(row)
+    for group in groups.values():
+        db.session.execute(statement, group)
+
+
+def _enqueue_retry(user_id, attempt: int, countdown: int):
+    """Programar el reintento como tarea diferida (sin dormir en el worker)."""
+    from app.tasks.calendar_tasks import sync_user_calendar
+
+    sync_user_calendar.apply_async(
+        args=[str(user_id)],
+        kwargs={'attempt': attempt},
+        countdown=countdown
+    )
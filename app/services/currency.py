@@ -10,10 +10,11 @@ Date: 2025
 
 import json
 import logging
+import time
 import requests
 from decimal import Decimal, ROUND_HALF_UP
 from datetime import datetime, timedelta
-from typing import Optional, Union
+from typing import Any, Optional, Sequence, Union
 from functools import wraps
 from flask import current_app
 from requests.adapters import HTTPAdapter
@@ -22,10 +23,26 @@ from requests.packages.urllib3.util.retry import Retry
 from app.core.exceptions import CurrencyServiceError, ExternalAPIError
 from app.utils.cache_utils import CacheManager
 from app.utils.decorators import retry_on_failure
+from app.utils.rate_matrix import RateMatrix, RateMatrixError
 
 
 logger = logging.getLogger(__name__)
 
+# Tasas aproximadas de diciembre 2024 por USD (solo para emergencias y pruebas)
+FALLBACK_USD_RATES = {
+    'EUR': 0.95,
+    'GBP': 0.79,
+    'JPY': 150.0,
+    'CAD': 1.36,
+    'AUD': 1.48,
+    'COP': 4100.0,
+    'MXN': 20.5,
+    'BRL': 6.0,
+    # Agregar más tasas según necesidad
+}
+
+RATE_MATRIX_CACHE_KEY = 'currency_matrix'
+
 
 class CurrencyProvider:
     """Clase base para proveedores de tasas de cambio"""
@@ -231,6 +248,39 @@ class FreeCurrencyAPIProvider(CurrencyProvider):
         return rate
 
 
+class StaticRateProvider(CurrencyProvider):
+    """
+    Proveedor local sin llamadas HTTP.
+
+    Sirve una tabla fija de tasas por USD (por defecto las de fallback) y se
+    usa en pruebas o cuando ``CURRENCY_USE_STATIC_RATES`` está activo.
+    """
+
+    def __init__(self, usd_rates: Optional[dict[str, float]] = None):
+        self.api_key = None
+        self.session = None
+        self.matrix = RateMatrix('USD', usd_rates or FALLBACK_USD_RATES, source='static')
+
+    def get_rates(self, base_currency: str = 'USD') -> dict[str, float]:
+        """Tabla completa de tasas para la moneda base"""
+        try:
+            matrix = self.matrix.rebase(base_currency)
+        except RateMatrixError as e:
+            raise CurrencyServiceError(str(e))
+        return {
+            currency: float(rate)
+            for currency, rate in matrix.rates.items()
+            if currency != matrix.base
+        }
+
+    def get_rate(self, from_currency: str, to_currency: str) -> float:
+        """Obtiene tasa específica"""
+        try:
+            return self.matrix.rate(from_currency, to_currency)
+        except RateMatrixError as e:
+            raise CurrencyServiceError(str(e))
+
+
 class CurrencyService:
     """
     Servicio principal para manejo de monedas y conversiones.
@@ -260,11 +310,20 @@ class CurrencyService:
         self.providers = self._initialize_providers()
         self.default_currency = current_app.config.get('DEFAULT_CURRENCY', 'USD')
         self.cache_duration = current_app.config.get('CURRENCY_CACHE_DURATION', 3600)  # 1 hora
+        # La matriz se refresca en segundo plano; se conserva más tiempo que el
+        # intervalo de refresco para que un fallo puntual no la deje vacía
+        self.matrix_duration = current_app.config.get('CURRENCY_MATRIX_DURATION', 6 * 3600)
+        self._matrix: Optional[RateMatrix] = None
+        self._matrix_checked_at = 0.0
     
     def _initialize_providers(self) -> list[CurrencyProvider]:
         """Inicializa los proveedores de tasas de cambio"""
         providers = []
         
+        # Tasas locales sin HTTP (pruebas y entornos sin claves)
+        if current_app.config.get('CURRENCY_USE_STATIC_RATES'):
+            return [StaticRateProvider(current_app.config.get('CURRENCY_STATIC_RATES'))]
+        
         # Provider principal (CurrencyLayer)
         currencylayer_key = current_app.config.get('CURRENCYLAYER_API_KEY')
         if currencylayer_key:
@@ -317,6 +376,12 @@ class CurrencyService:
         if from_currency == to_currency:
             return 1.0
         
+        # Triangular con la matriz local si ya está cargada
+        if not force_refresh:
+            matrix = self.get_rate_matrix(use_fallback=False)
+            if matrix and matrix.has(from_currency) and matrix.has(to_currency):
+                return matrix.rate(from_currency, to_currency)
+        
         # Verificar cache
         cache_key = self._get_cache_key('rate', 
                                        from_currency=from_currency, 
@@ -392,6 +457,116 @@ class CurrencyService:
         
         return converted_amount
     
+    # ====================================
+    # MATRIZ DE TASAS
+    # ====================================
+    
+    def refresh_rate_matrix(self, base_currency: str = None) -> RateMatrix:
+        """
+        Descarga la tabla completa de la moneda base y la publica en el cache.
+        
+        Pensado para ejecutarse en segundo plano (``refresh_exchange_rates``):
+        una llamada por proveedor hasta que uno responda. Si todos fallan no
+        se publica nada: la matriz anterior sigue vigente hasta caducar y las
+        tasas de fallback nunca se comparten como si fueran reales.
+        
+        Args:
+            base_currency: Moneda base de la tabla (por defecto la del servicio)
+            
+        Returns:
+            RateMatrix: Matriz publicada
+            
+        Raises:
+            CurrencyServiceError: Si ningún proveedor devolvió tasas
+        """
+        base_currency = (base_currency or self.default_currency).upper()
+        self._validate_currency(base_currency)
+        
+        matrix = None
+        for provider in self.providers:
+            try:
+                rates = {
+                    currency: rate
+                    for currency, rate in provider.get_rates(base_currency).items()
+                    if currency.upper() in self.SUPPORTED_CURRENCIES and rate and rate > 0
+                }
+                if rates:
+                    matrix = RateMatrix(base_currency, rates, source=provider.__class__.__name__)
+                    break
+            except Exception as e:
+                logger.warning(f"Provider {provider.__class__.__name__} failed refreshing rate matrix: {e}")
+                continue
+        
+        if matrix is None:
+            raise CurrencyServiceError(
+                f"No provider returned rates for {base_currency}; keeping the published matrix"
+            )
+        
+        self.cache.set(RATE_MATRIX_CACHE_KEY, matrix.to_dict(), timeout=self.matrix_duration)
+        self._matrix = matrix
+        self._matrix_checked_at = time.monotonic()
+        logger.info(f"Rate matrix {base_currency} refreshed from {matrix.source} ({len(matrix.rates)} currencies)")
+        return matrix
+    
+    def get_rate_matrix(self, use_fallback: bool = True) -> Optional[RateMatrix]:
+        """
+        Matriz de tasas vigente sin llamar a proveedores externos.
+        
+        Se lee del cache compartido como máximo una vez por minuto por
+        proceso; si la entrada caducó, la copia local también se descarta.
+        Se ignoran las matrices de fallback y las más antiguas que
+        ``matrix_duration``. Si no hay ninguna vigente, se devuelve la tabla
+        de fallback (o None con ``use_fallback=False``).
+        """
+        if self._matrix is None or time.monotonic() - self._matrix_checked_at > 60:
+            self._matrix_checked_at = time.monotonic()
+            self._matrix = None
+            data = self.cache.get(RATE_MATRIX_CACHE_KEY)
+            if data:
+                try:
+                    matrix = RateMatrix.from_dict(data)
+                except (KeyError, ValueError, ArithmeticError) as e:
+                    logger.error(f"Invalid rate matrix in cache: {e}")
+                else:
+                    if matrix.source == 'fallback' or matrix.age_seconds() > self.matrix_duration:
+                        logger.warning(f"Ignoring {matrix.source} rate matrix from {matrix.fetched_at.isoformat()}")
+                    else:
+                        self._matrix = matrix
+        
+        if self._matrix is None and use_fallback:
+            return self._fallback_matrix()
+        return self._matrix
+    
+    def convert_many(self, amounts: Any, from_currency: Union[str, Sequence[str]],
+                     to_currency: str, round_result: bool = True) -> Any:
+        """
+        Convierte un lote de montos con una sola búsqueda en la matriz local.
+        
+        Nunca bloquea en una API externa: usa la matriz publicada por el
+        refresco en segundo plano (o la de fallback).
+        
+        Args:
+            amounts: Secuencia de montos (Decimal, float, str) o arreglo de numpy
+            from_currency: Moneda origen común o una por monto
+            to_currency: Moneda destino
+            round_result: Si redondear a los decimales de la moneda destino
+            
+        Returns:
+            Lista de Decimal o ``numpy.ndarray`` según el tipo de ``amounts``
+        """
+        self._validate_currency(to_currency)
+        for currency in ({from_currency} if isinstance(from_currency, str) else set(from_currency)):
+            self._validate_currency(currency)
+        
+        decimal_places = self.SUPPORTED_CURRENCIES[to_currency.upper()]['decimal_places'] if round_result else None
+        try:
+            return self.get_rate_matrix().convert_many(amounts, from_currency, to_currency, decimal_places)
+        except RateMatrixError as e:
+            raise CurrencyServiceError(str(e))
+    
+    def _fallback_matrix(self) -> RateMatrix:
+        return RateMatrix('USD', FALLBACK_USD_RATES, source='fallback')
+    
     def format_currency(self, amount: Union[float, Decimal, str], 
                        currency: str, include_symbol: bool = True,
                        locale: str = None) -> str:
@@ -514,18 +689,7 @@ class CurrencyService:
         Retorna tasas de fallback hardcodeadas para casos de emergencia.
         Estas tasas deben actualizarse periódicamente.
         """
-        # Tasas aproximadas de diciembre 2024 (solo para emergencias)
-        fallback_rates = {
-            ('USD', 'EUR'): 0.95,
-            ('USD', 'GBP'): 0.79,
-            ('USD', 'JPY'): 150.0,
-            ('USD', 'CAD'): 1.36,
-            ('USD', 'AUD'): 1.48,
-            ('USD', 'COP'): 4100.0,
-            ('USD', 'MXN'): 20.5,
-            ('USD', 'BRL'): 6.0,
-            # Agregar más tasas según necesidad
-        }
+        fallback_rates = {('USD', currency): rate for currency, rate in FALLBACK_USD_RATES.items()}
         
         # Buscar tasa directa
         rate = fallback_rates.get((from_currency, to_currency))
@@ -550,6 +714,7 @@ class CurrencyService:
     def clear_cache(self) -> None:
         """Limpia el cache de tasas de cambio"""
         self.cache.clear_pattern("currency_*")
+        self._matrix = None
         logger.info("Currency cache cleared")
     
     def get_cache_stats(self) -> dict[str, Union[int, list[str]]]:
@@ -0,0 +1,269 @@
+"""
+Retención de tablas de alto volumen: purga y archivado por lotes.
+
+Las filas antiguas se recorren por lotes acotados con paginación por clave
+``(tiempo, id)``, que usa el índice de la columna de tiempo y no vuelve a
+recorrer filas ya borradas. ``purge`` borra cada lote en su propia
+transacción; ``archive`` escribe antes las filas en el almacén de archivo
+(``app.utils.archive_store``) y solo las borra cuando el fichero y su entrada
+del manifiesto están en disco. Entre transacciones se hace una pausa para no
+acaparar bloqueos ni disparar el WAL.
+
+Las filas archivadas se consultan con ``iter_archived`` o, junto con las que
+siguen en la tabla, con ``iter_period``.
+
+Configuración (con sus valores por defecto):
+    DATA_ARCHIVE_DIR = 'archives'
+    DATA_ARCHIVE_BATCH_SIZE = 1000
+    DATA_ARCHIVE_BATCH_PAUSE = 0.1          # segundos entre transacciones
+    DATA_ARCHIVE_SEGMENT_ROWS = 50000       # filas por fichero de archivo
+    DATA_ARCHIVE_MAX_ROWS_PER_RUN = 500000
+"""
+
+import logging
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Iterator, Optional
+
+from flask import current_app, has_app_context
+from sqlalchemy import delete, select, tuple_
+
+from app.extensions import db
+from app.models.activity_log import ActivityLog
+from app.models.analytics import AnalyticsMetric
+from app.models.notification import Notification
+from app.utils.archive_store import ArchiveStore, to_archive_row
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'DATA_ARCHIVE_DIR': 'archives',
+    'DATA_ARCHIVE_BATCH_SIZE': 1000,
+    'DATA_ARCHIVE_BATCH_PAUSE': 0.1,
+    'DATA_ARCHIVE_SEGMENT_ROWS': 50000,
+    'DATA_ARCHIVE_MAX_ROWS_PER_RUN': 500000,
+}
+
+
+def _config(key: str):
+    if has_app_context():
+        return current_app.config.get(key, DEFAULTS[key])
+    return DEFAULTS[key]
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """
+    Tabla sujeta a retención.
+
+    Args:
+        name: Nombre del conjunto de archivo
+        model: Modelo de la tabla (con columna ``id``)
+        time_column: Columna de tiempo que determina la antigüedad
+        retention_days: Antigüedad por defecto a partir de la que se retira
+    """
+
+    name: str
+    model: Any
+    time_column: str
+    retention_days: int
+
+    @property
+    def table(self):
+        return self.model.__table__
+
+    def cutoff(self, now: Optional[datetime] = None) -> datetime:
+        return (now or datetime.now(timezone.utc)) - timedelta(days=self.retention_days)
+
+
+RETENTION_POLICIES: dict[str, RetentionPolicy] = {
+    policy.name: policy for policy in (
+        RetentionPolicy('activity_logs', ActivityLog, 'created_at', 365),
+        RetentionPolicy('notifications', Notification, 'created_at', 90),
+        RetentionPolicy('analytics_metrics', AnalyticsMetric, 'timestamp', 90),
+    )
+}
+
+
+@dataclass
+class ArchiveResult:
+    """Resultado de archivar una tabla."""
+
+    policy: str
+    cutoff: datetime
+    rows_archived: int = 0
+    rows_deleted: int = 0
+    files: list[str] = field(default_factory=list)
+    complete: bool = True
+
+
+class DataArchiver:
+    """
+    Purga y archivado por lotes de las tablas de ``RETENTION_POLICIES``.
+
+    Args:
+        store: Almacén de archivo (``DATA_ARCHIVE_DIR`` por defecto)
+        batch_size: Filas por lote y por transacción de borrado
+        pause: Segundos de espera entre transacciones
+        max_rows: Máximo de filas retiradas por ejecución (None sin límite)
+    """
+
+    def __init__(self, store: Optional[ArchiveStore] = None, batch_size: Optional[int] = None,
+                 pause: Optional[float] = None, max_rows: Optional[int] = None):
+        self.store = store or ArchiveStore(_config('DATA_ARCHIVE_DIR'))
+        self.batch_size = batch_size or _config('DATA_ARCHIVE_BATCH_SIZE')
+        self.pause = _config('DATA_ARCHIVE_BATCH_PAUSE') if pause is None else pause
+        self.segment_rows = max(self.batch_size, _config('DATA_ARCHIVE_SEGMENT_ROWS'))
+        self.max_rows = max_rows if max_rows is not None else _config('DATA_ARCHIVE_MAX_ROWS_PER_RUN')
+
+    # ====================================
+    # LOTES
+    # ====================================
+
+    def _batches(self, policy: RetentionPolicy, criteria: list,
+                 columns: Optional[list] = None) -> Iterator[list[dict[str, Any]]]:
+        """Lotes de filas que cumplen ``criteria`` en orden ``(tiempo, id)``."""
+        table = policy.table
+        time_column = table.c[policy.time_column]
+        columns = columns or [table.c.id, time_column]
+        last = None
+
+        while True:
+            statement = select(*columns).where(*criteria)
+            if last is not None:
+                statement = statement.where(tuple_(time_column, table.c.id) > tuple_(*last))
+            rows = db.session.execute(
+                statement.order_by(time_column, table.c.id).limit(self.batch_size)
+            ).mappings().all()
+            if not rows:
+                return
+            yield [dict(row) for row in rows]
+            last = (rows[-1][policy.time_column], rows[-1]['id'])
+
+    def _delete_ids(self, policy: RetentionPolicy, ids: list) -> int:
+        """Borrar filas por id en transacciones de ``batch_size`` con pausa entre ellas."""
+        deleted = 0
+        for offset in range(0, len(ids), self.batch_size):
+            chunk = ids[offset:offset + self.batch_size]
+            try:
+                deleted += db.session.execute(
+                    delete(policy.table).where(policy.table.c.id.in_(chunk))
+                ).rowcount or 0
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+            if self.pause:
+                time.sleep(self.pause)
+        return deleted
+
+    def _aged(self, policy: RetentionPolicy, cutoff: datetime, criteria: tuple) -> list:
+        return [policy.table.c[policy.time_column] < cutoff, *criteria]
+
+    # ====================================
+    # PURGA Y ARCHIVADO
+    # ====================================
+
+    def purge(self, policy: RetentionPolicy, cutoff: Optional[datetime] = None, *criteria) -> int:
+        """
+        Borrar por lotes, sin archivar, las filas anteriores a ``cutoff``.
+
+        Args:
+            policy: Tabla a purgar
+            cutoff: Fecha de corte (la de la política por defecto)
+            *criteria: Filtros adicionales sobre columnas de la tabla
+
+        Returns:
+            Filas borradas
+        """
+        cutoff = cutoff or policy.cutoff()
+        deleted = 0
+        for rows in self._batches(policy, self._aged(policy, cutoff, criteria)):
+            deleted += self._delete_ids(policy, [row['id'] for row in rows])
+            if self.max_rows and deleted >= self.max_rows:
+                logger.info(f"Purga de {policy.name} detenida en el límite de {self.max_rows} filas")
+                break
+        return deleted
+
+    def archive(self, policy: RetentionPolicy, cutoff: Optional[datetime] = None, *criteria) -> ArchiveResult:
+        """
+        Archivar y después borrar las filas anteriores a ``cutoff``.
+
+        Las filas se acumulan en segmentos de ``DATA_ARCHIVE_SEGMENT_ROWS``;
+        cada segmento se escribe en el almacén antes de borrar sus filas. Si
+        la ejecución se interrumpe entre ambos pasos, la siguiente vuelve a
+        archivar esas filas y la lectura descarta los duplicados.
+        """
+        result = ArchiveResult(policy.name, cutoff or policy.cutoff())
+        segment: list[dict[str, Any]] = []
+
+        batches = self._batches(
+            policy, self._aged(policy, result.cutoff, criteria), columns=list(policy.table.c)
+        )
+        for rows in batches:
+            segment.extend(rows)
+            if len(segment) >= self.segment_rows:
+                self._flush_segment(policy, segment, result)
+                segment = []
+            if self.max_rows and result.rows_archived + len(segment) >= self.max_rows:
+                result.complete = False
+                break
+
+        if segment:
+            self._flush_segment(policy, segment, result)
+
+        logger.info(
+            f"Archivado de {policy.name}: {result.rows_archived} filas en {len(result.files)} ficheros"
+            f"{'' if result.complete else ' (quedan filas pendientes)'}"
+        )
+        return result
+
+    def _flush_segment(self, policy: RetentionPolicy, rows: list[dict[str, Any]], result: ArchiveResult):
+        entries = self.store.write(policy.name, rows, time_key=policy.time_column)
+        result.files.extend(entry['file'] for entry in entries)
+        result.rows_archived += len(rows)
+        result.rows_deleted += self._delete_ids(policy, [row['id'] for row in rows])
+
+    # ====================================
+    # LECTURA
+    # ====================================
+
+    def iter_archived(self, policy: RetentionPolicy, start: Optional[datetime] = None,
+                      end: Optional[datetime] = None) -> Iterator[dict[str, Any]]:
+        """Filas archivadas de ``[start, end)``."""
+        return self.store.read(policy.name, start, end)
+
+    def iter_period(self, policy: RetentionPolicy, start: datetime, end: datetime) -> Iterator[dict[str, Any]]:
+        """
+        Filas de ``[start, end)`` tanto archivadas como en la tabla.
+
+        Las de la tabla se devuelven con los mismos tipos que las archivadas
+        (tiempos en ISO, ids como texto) para poder tratarlas igual.
+        """
+        archived_ids = set()
+        for row in self.iter_archived(policy, start, end):
+            archived_ids.add(row['id'])
+            yield row
+
+        time_column = policy.table.c[policy.time_column]
+        criteria = [time_column >= start, time_column < end]
+        for rows in self._batches(policy, criteria, columns=list(policy.table.c)):
+            for row in rows:
+                row = to_archive_row(row)
+                if row['id'] not in archived_ids:
+                    yield row
+
+    def count_period(self, policy: RetentionPolicy, start: datetime, end: datetime,
+                     key: Optional[Callable[[dict[str, Any]], Any]] = None) -> Counter:
+        """Contar las filas de un periodo (archivadas y vivas), opcionalmente agrupadas por ``key``."""
+        return Counter(key(row) if key else 'total' for row in self.iter_period(policy, start, end))
+
+
+__all__ = [
+    'RetentionPolicy',
+    'RETENTION_POLICIES',
+    'ArchiveResult',
+    'DataArchiver'
+]
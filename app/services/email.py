@@ -15,7 +15,7 @@ from typing import Optional, Any, Union
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from enum import Enum
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
@@ -180,6 +180,8 @@ class BulkEmailResult:
     queued: int
     errors: list[str]
     message_ids: list[str]
+    # Resultado de cada mensaje, en el orden de entrada
+    results: list[EmailResult] = field(default_factory=list)
 
 
 class EmailProviderInterface(ABC):
@@ -271,8 +273,11 @@ class SMTPProvider(EmailProviderInterface):
         errors = []
         message_ids = []
         
+        results = []
+        
         for message in messages:
             result = self.send(message)
+            results.append(result)
             if result.success:
                 successful += 1
                 if result.message_id:
@@ -288,7 +293,8 @@ class SMTPProvider(EmailProviderInterface):
             failed=failed,
             queued=0,
             errors=errors,
-            message_ids=message_ids
+            message_ids=message_ids,
+            results=results
         )
     
     def validate_config(self) -> bool:
@@ -438,8 +444,9 @@ class SendGridProvider(EmailProviderInterface):
         failed = 0
         errors = []
         message_ids = []
+        results = []
         
-        # Agrupar en lotes de 1000
+        # Agrupar en lotes de 1000; SendGrid acepta o rechaza cada petición entera
         batch_size = 1000
         for i in range(0, len(messages), batch_size):
             batch = messages[i:i + batch_size]
@@ -451,14 +458,23 @@ class SendGridProvider(EmailProviderInterface):
                 
                 if response.status_code in [200, 202]:
                     successful += len(batch)
-                    message_ids.append(response.headers.get('X-Message-Id', ''))
+                    batch_message_id = response.headers.get('X-Message-Id', '')
+                    message_ids.append(batch_message_id)
+                    batch_result = EmailResult(success=True, message_id=batch_message_id,
+                                               provider_used=EmailProvider.SENDGRID.value)
                 else:
                     failed += len(batch)
                     errors.append(f"Batch failed: {response.body}")
+                    batch_result = EmailResult(success=False, error_message=f"Batch failed: {response.body}",
+                                               provider_used=EmailProvider.SENDGRID.value)
                     
             except Exception as e:
                 failed += len(batch)
                 errors.append(str(e))
+                batch_result = EmailResult(success=False, error_message=str(e),
+                                           provider_used=EmailProvider.SENDGRID.value)
+            
+            results.extend(batch_result for _ in batch)
         
         return BulkEmailResult(
             total_emails=len(messages),
@@ -466,7 +482,8 @@ class SendGridProvider(EmailProviderInterface):
             failed=failed,
             queued=0,
             errors=errors,
-            message_ids=message_ids
+            message_ids=message_ids,
+            results=results
         )
     
     def validate_config(self) -> bool:
@@ -600,8 +617,11 @@ class AmazonSESProvider(EmailProviderInterface):
         errors = []
         message_ids = []
         
+        results = []
+        
         for message in messages:
             result = self.send(message)
+            results.append(result)
             if result.success:
                 successful += 1
                 if result.message_id:
@@ -617,7 +637,8 @@ class AmazonSESProvider(EmailProviderInterface):
             failed=failed,
             queued=0,
             errors=errors,
-            message_ids=message_ids
+            message_ids=message_ids,
+            results=results
         )
     
     def validate_config(self) -> bool:
@@ -973,7 +994,86 @@ class EmailService(BaseService):
                 errors=[str(e)],
                 message_ids=[]
             )
-    
+
+    def send_messages_bulk(
+        self,
+        messages: list[EmailMessage],
+        priority: str = EmailPriority.MEDIUM.value,
+        provider: Optional[str] = None,
+        batch_size: int = 100
+    ) -> BulkEmailResult:
+        """
+        Enviar mensajes ya preparados con la API masiva del proveedor
+
+        Args:
+            messages: Mensajes listos para enviar
+            priority: Prioridad (para seleccionar proveedor)
+            provider: Proveedor específico
+            batch_size: Mensajes por llamada a ``send_bulk``
+
+        Returns:
+            BulkEmailResult: Resultado agregado de los lotes
+        """
+        total_result = BulkEmailResult(
+            total_emails=len(messages),
+            successful=0,
+            failed=0,
+            queued=0,
+            errors=[],
+            message_ids=[]
+        )
+
+        results: list[Optional[EmailResult]] = [None] * len(messages)
+
+        # Filtrar suprimidos y descartar mensajes sin destinatarios
+        deliverable = []
+        for index, message in enumerate(messages):
+            message = self._filter_suppressed_recipients(message)
+            if message.to:
+                deliverable.append((index, message))
+            else:
+                total_result.failed += 1
+                results[index] = EmailResult(success=False, error_message="Destinatarios suprimidos")
+
+        selected_provider = self._select_provider(provider, priority) if deliverable else None
+        if deliverable and not selected_provider:
+            total_result.failed += len(deliverable)
+            total_result.errors.append("No hay proveedores disponibles")
+            for index, _ in deliverable:
+                results[index] = EmailResult(success=False, error_message="No hay proveedores disponibles")
+            deliverable = []
+
+        for i in range(0, len(deliverable), batch_size):
+            batch = deliverable[i:i + batch_size]
+            batch_messages = [message for _, message in batch]
+
+            try:
+                batch_result = selected_provider.send_bulk(batch_messages)
+
+                total_result.successful += batch_result.successful
+                total_result.failed += batch_result.failed
+                total_result.queued += batch_result.queued
+                total_result.errors.extend(batch_result.errors)
+                total_result.message_ids.extend(batch_result.message_ids)
+
+                if len(batch_result.results) == len(batch):
+                    batch_results = batch_result.results
+                else:
+                    # Proveedor sin detalle por mensaje: solo un lote sin fallos cuenta como enviado
+                    batch_results = [EmailResult(success=not batch_result.failed)] * len(batch)
+
+            except Exception as e:
+                total_result.failed += len(batch)
+                total_result.errors.append(f"Error en lote {i//batch_size + 1}: {str(e)}")
+                logger.error(f"Error enviando lote {i//batch_size + 1}: {str(e)}")
+                batch_results = [EmailResult(success=False, error_message=str(e))] * len(batch)
+
+            for (index, _), result in zip(batch, batch_results):
+                results[index] = result
+
+        total_result.results = results
+        return total_result
+
     def send_template_email(
         self,
         to: Union[str, EmailAddress],
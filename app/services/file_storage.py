@@ -10,7 +10,6 @@ import logging
 import os
 import hashlib
 import mimetypes
-import magic
 import uuid
 import shutil
 import asyncio
@@ -27,40 +26,34 @@ from urllib.parse import urlparse
 import json
 import base64
 
+# Dependencias pesadas u opcionales: se importan en el primer uso para no
+# cargarlas en los procesos que nunca procesan archivos
+from app.utils.lazy_imports import lazy_import, is_available
+
+magic = lazy_import('magic')
+
 # Image processing
-from PIL import Image, ImageOps, ImageDraw, ImageFont
-try:
-    import pillow_heif
-    PILLOW_HEIF_AVAILABLE = True
-except ImportError:
-    PILLOW_HEIF_AVAILABLE = False
+Image = lazy_import('PIL.Image')
+ImageOps = lazy_import('PIL.ImageOps')
+ImageDraw = lazy_import('PIL.ImageDraw')
+ImageFont = lazy_import('PIL.ImageFont')
+pillow_heif = lazy_import('pillow_heif')
+PILLOW_HEIF_AVAILABLE = is_available('pillow_heif')
 
 # Cloud storage - optional imports
-try:
-    import boto3
-    from botocore.exceptions import ClientError, NoCredentialsError
-    AWS_AVAILABLE = True
-except ImportError:
-    AWS_AVAILABLE = False
+boto3 = lazy_import('boto3')
+botocore_exceptions = lazy_import('botocore.exceptions')
+AWS_AVAILABLE = is_available('boto3')
 
-try:
-    from google.cloud import storage as gcs
-    GCP_AVAILABLE = True
-except ImportError:
-    GCP_AVAILABLE = False
+gcs = lazy_import('google.cloud.storage')
+GCP_AVAILABLE = is_available('google.cloud.storage')
 
-try:
-    from azure.storage.blob import BlobServiceClient
-    AZURE_AVAILABLE = True
-except ImportError:
-    AZURE_AVAILABLE = False
+azure_blob = lazy_import('azure.storage.blob')
+AZURE_AVAILABLE = is_available('azure.storage.blob')
 
 # Security and validation - optional
-try:
-    import clamd
-    CLAMD_AVAILABLE = True
-except ImportError:
-    CLAMD_AVAILABLE = False
+clamd = lazy_import('clamd')
+CLAMD_AVAILABLE = is_available('clamd')
 from werkzeug.utils import secure_filename
 from werkzeug.datastructures import FileStorage
 
@@ -119,6 +112,9 @@ from app.utils.crypto_utils import encrypt_file, decrypt_file, generate_hash
 
 logger = logging.getLogger(__name__)
 
+# Valor de la metadata ``encryption`` de los objetos guardados con envelope encryption
+ENCRYPTION_FORMAT = 'ECS1'
+
 
 class StorageProvider(Enum):
     """Proveedores de almacenamiento"""
@@ -259,6 +255,10 @@ class StorageProviderInterface:
     def file_exists(self, key: str) -> bool:
         """Verificar si el archivo existe"""
         raise NotImplementedError
+    
+    def get_file_metadata(self, key: str) -> dict[str, str]:
+        """Obtener la metadata guardada con el archivo"""
+        raise NotImplementedError
 
 
 class LocalStorageProvider(StorageProviderInterface):
@@ -330,6 +330,10 @@ class LocalStorageProvider(StorageProviderInterface):
             if source_path.exists():
                 dest_path.parent.mkdir(parents=True, exist_ok=True)
                 shutil.copy2(source_path, dest_path)
+                # La metadata viaja con el archivo (incluye la clave envuelta)
+                metadata_path = source_path.with_suffix('.metadata')
+                if metadata_path.exists():
+                    shutil.copy2(metadata_path, dest_path.with_suffix('.metadata'))
                 return True
             return False
         except Exception as e:
@@ -339,6 +343,14 @@ class LocalStorageProvider(StorageProviderInterface):
     def file_exists(self, key: str) -> bool:
         """Verificar si el archivo existe"""
         return (self.base_path / key).exists()
+    
+    def get_file_metadata(self, key: str) -> dict[str, str]:
+        """Leer la metadata guardada junto al archivo local"""
+        metadata_path = (self.base_path / key).with_suffix('.metadata')
+        if not metadata_path.exists():
+            return {}
+        with open(metadata_path) as f:
+            return json.load(f)
 
 
 class S3StorageProvider(StorageProviderInterface):
@@ -373,7 +385,7 @@ class S3StorageProvider(StorageProviderInterface):
             self.s3_client.upload_file(file_path, self.bucket_name, key, ExtraArgs=extra_args)
             return f"s3://{self.bucket_name}/{key}"
             
-        except ClientError as e:
+        except botocore_exceptions.ClientError as e:
             logger.error(f"Error subiendo a S3: {str(e)}")
             raise ExternalServiceError(f"Error en S3: {str(e)}")
     
@@ -385,7 +397,7 @@ class S3StorageProvider(StorageProviderInterface):
             
             self.s3_client.download_file(self.bucket_name, key, local_path)
             return True
-        except ClientError as e:
+        except botocore_exceptions.ClientError as e:
             logger.error(f"Error descargando de S3: {str(e)}")
             return False
     
@@ -397,7 +409,7 @@ class S3StorageProvider(StorageProviderInterface):
             
             self.s3_client.delete_object(Bucket=self.bucket_name, Key=key)
             return True
-        except ClientError as e:
+        except botocore_exceptions.ClientError as e:
             logger.error(f"Error eliminando de S3: {str(e)}")
             return False
     
@@ -413,7 +425,7 @@ class S3StorageProvider(StorageProviderInterface):
                 ExpiresIn=expires_in
             )
             return url
-        except ClientError as e:
+        except botocore_exceptions.ClientError as e:
             logger.error(f"Error generando URL de S3: {str(e)}")
             return ""
     
@@ -430,7 +442,7 @@ class S3StorageProvider(StorageProviderInterface):
                 Key=dest_key
             )
             return True
-        except ClientError as e:
+        except botocore_exceptions.ClientError as e:
             logger.error(f"Error copiando en S3: {str(e)}")
             return False
     
@@ -442,8 +454,18 @@ class S3StorageProvider(StorageProviderInterface):
             
             self.s3_client.head_object(Bucket=self.bucket_name, Key=key)
             return True
-        except ClientError:
+        except botocore_exceptions.ClientError:
             return False
+    
+    def get_file_metadata(self, key: str) -> dict[str, str]:
+        """Metadata de usuario del objeto en S3"""
+        if not self.s3_client:
+            raise ExternalServiceError("S3 client not initialized")
+        try:
+            return self.s3_client.head_object(Bucket=self.bucket_name, Key=key).get('Metadata', {})
+        except botocore_exceptions.ClientError as e:
+            logger.error(f"Error leyendo metadata de S3: {str(e)}")
+            raise ExternalServiceError(f"Error en S3: {str(e)}")
 
 
 class GoogleCloudStorageProvider(StorageProviderInterface):
@@ -548,6 +570,13 @@ class GoogleCloudStorageProvider(StorageProviderInterface):
             return blob.exists()
         except Exception as e:
             return False
+    
+    def get_file_metadata(self, key: str) -> dict[str, str]:
+        """Metadata personalizada del blob en GCS"""
+        if not self.bucket:
+            raise ExternalServiceError("GCS bucket not initialized")
+        blob = self.bucket.get_blob(key)
+        return dict(blob.metadata or {}) if blob is not None else {}
 
 
 class FileStorageService(BaseService):
@@ -674,9 +703,9 @@ class FileStorageService(BaseService):
             # Generar ID único para el archivo
             file_id = self._generate_file_id()
             
-            # Procesar archivo (optimización, compresión, etc.)
-            processed_file_path = self._process_file(
-                temp_file_path, file_metadata, config
+            # Procesar archivo (optimización, compresión, encriptación)
+            processed_file_path, encryption_metadata = self._process_file(
+                temp_file_path, file_metadata, config, file_id
             )
             
             # Generar clave de almacenamiento
@@ -684,17 +713,19 @@ class FileStorageService(BaseService):
                 user_id, file_id, file_metadata.filename, category
             )
             
-            # Subir a proveedor de almacenamiento
+            # Subir a proveedor de almacenamiento (la clave envuelta va en la metadata del objeto)
             provider = self.providers[config.storage_provider]
+            storage_metadata = self._prepare_storage_metadata(file_metadata, metadata)
+            storage_metadata.update(encryption_metadata)
             storage_path = provider.upload_file(
                 processed_file_path, 
                 storage_key,
-                self._prepare_storage_metadata(file_metadata, metadata)
+                storage_metadata
             )
             
-            # Generar thumbnail si es imagen
+            # Generar thumbnail si es imagen (nunca de un archivo encriptado)
             thumbnail_url = None
-            if (config.generate_thumbnails and 
+            if (config.generate_thumbnails and not encryption_metadata and
                 file_metadata.category == FileCategory.IMAGE.value):
                 thumbnail_url = self._generate_thumbnail(
                     processed_file_path, file_id, provider
@@ -755,9 +786,11 @@ class FileStorageService(BaseService):
             return result
             
         except Exception as e:
-            # Limpiar en caso de error
+            # Limpiar en caso de error (incluido el archivo ya procesado)
             if 'temp_file_path' in locals():
                 self._cleanup_temp_files([temp_file_path])
+            if 'processed_file_path' in locals():
+                self._cleanup_temp_files([processed_file_path])
             
             logger.error(f"Error subiendo archivo: {str(e)}")
             
@@ -821,6 +854,19 @@ class FileStorageService(BaseService):
             temp_file = self.temp_dir / f"download_{file_id}_{uuid.uuid4().hex}"
             
             if provider.download_file(storage_key, str(temp_file)):
+                # Desencriptar por bloques si se guardó encriptado
+                data_key = self._data_key(provider, storage_key, file_id)
+                if data_key is not None:
+                    plain_file = self.temp_dir / f"download_{file_id}_{uuid.uuid4().hex}"
+                    try:
+                        decrypt_file(str(temp_file), str(plain_file), data_key)
+                    except Exception:
+                        self._cleanup_temp_files([str(plain_file)])
+                        raise
+                    finally:
+                        self._cleanup_temp_files([str(temp_file)])
+                    temp_file = plain_file
+                
                 # Trackear descarga
                 if track_download:
                     self._track_download(file_upload, user_id)
@@ -833,6 +879,58 @@ class FileStorageService(BaseService):
             logger.error(f"Error descargando archivo {file_id}: {str(e)}")
             raise BusinessLogicError(f"Error descargando archivo: {str(e)}")
     
+    def read_range(
+        self,
+        file_id: str,
+        user_id: int,
+        offset: int,
+        length: int
+    ) -> bytes:
+        """
+        Leer un rango del contenido en claro de un archivo
+        
+        En archivos encriptados solo se desencriptan los bloques que cubren
+        el rango.
+        
+        Args:
+            file_id: ID del archivo
+            user_id: ID del usuario
+            offset: Posición inicial en el contenido en claro
+            length: Bytes a leer
+            
+        Returns:
+            bytes: Contenido del rango (más corto si llega al final)
+        """
+        from app.utils.envelope_crypto import read_range
+        
+        try:
+            file_upload = self._get_file_record(file_id)
+            
+            if not file_upload:
+                raise NotFoundError(f"Archivo {file_id} no encontrado")
+            
+            if not self._can_access_file(file_upload, user_id):
+                raise PermissionError("No tiene permisos para acceder a este archivo")
+            
+            provider = self.providers[file_upload.storage_provider]
+            temp_file = self.temp_dir / f"range_{file_id}_{uuid.uuid4().hex}"
+            if not provider.download_file(file_upload.storage_key, str(temp_file)):
+                raise ExternalServiceError("Error descargando archivo del proveedor")
+            
+            try:
+                data_key = self._data_key(provider, file_upload.storage_key, file_id)
+                with open(temp_file, 'rb') as source:
+                    if data_key is not None:
+                        return read_range(source, data_key, offset, length)
+                    source.seek(offset)
+                    return source.read(length)
+            finally:
+                self._cleanup_temp_files([str(temp_file)])
+                
+        except Exception as e:
+            logger.error(f"Error leyendo rango del archivo {file_id}: {str(e)}")
+            raise BusinessLogicError(f"Error leyendo archivo: {str(e)}")
+    
     def get_file_url(
         self,
         file_id: str,
@@ -1410,9 +1508,15 @@ class FileStorageService(BaseService):
         self, 
         file_path: str, 
         metadata: FileMetadata, 
-        config: UploadConfig
-    ) -> str:
-        """Procesar archivo (optimización, compresión, etc.)"""
+        config: UploadConfig,
+        file_id: str
+    ) -> tuple[str, dict[str, str]]:
+        """
+        Procesar archivo (optimización, compresión, watermark y encriptación)
+        
+        Returns:
+            Ruta del archivo procesado y metadata de encriptación para el objeto
+        """
         processed_path = file_path
         
         try:
@@ -1425,20 +1529,19 @@ class FileStorageService(BaseService):
             if config.compress_file:
                 processed_path = self._compress_file(processed_path, metadata)
             
-            # Encriptación
-            if config.encrypt_file:
-                processed_path = self._encrypt_file(processed_path)
-            
             # Watermark
             if (config.add_watermark and 
                 metadata.category in [FileCategory.IMAGE.value, FileCategory.DOCUMENT.value]):
                 processed_path = self._add_watermark(processed_path, metadata)
             
-            return processed_path
-            
         except Exception as e:
             logger.error(f"Error procesando archivo: {str(e)}")
-            return file_path  # Retornar archivo original si falla el procesamiento
+            processed_path = file_path  # Continuar con el archivo original si falla el procesamiento
+        
+        # Encriptación al final y sin alternativa: un fallo nunca sube el archivo en claro
+        if config.encrypt_file:
+            return self._encrypt_file(processed_path, file_id)
+        return processed_path, {}
     
     def _generate_file_id(self) -> str:
         """Generar ID único para archivo"""
@@ -1632,7 +1735,7 @@ class FileStorageService(BaseService):
         
         return FileCategory.OTHER.value
     
-    def _extract_exif_data(self, img: Image.Image) -> Optional[dict[str, Any]]:
+    def _extract_exif_data(self, img: 'Image.Image') -> Optional[dict[str, Any]]:
         """Extraer datos EXIF de imagen"""
         try:
             exif = img._getexif()
@@ -1797,27 +1900,47 @@ class FileStorageService(BaseService):
             logger.error(f"Error comprimiendo archivo: {str(e)}")
             return file_path
     
-    def _encrypt_file(self, file_path: str) -> str:
-        """Encriptar archivo"""
+    def _encrypt_file(self, file_path: str, file_id: str) -> tuple[str, dict[str, str]]:
+        """
+        Encriptar archivo por bloques con clave de datos envuelta
+        
+        La clave de datos se envuelve con la KEK ligada al ``file_id`` y se
+        devuelve como metadata del objeto, que se guarda con él.
+        
+        Raises:
+            SecurityError: Si no se puede encriptar (por ejemplo, sin
+                ``DOCUMENT_MASTER_KEYS``); no queda ningún temporal cifrado
+        """
+        from app.utils.envelope_crypto import encode_wrapped_key, file_aad, get_keyring, new_data_key
+
+        encrypted_path = self.temp_dir / f"encrypted_{uuid.uuid4().hex}"
         try:
-            encrypted_path = self.temp_dir / f"encrypted_{uuid.uuid4().hex}"
-            
-            # Generar clave de encriptación
-            encryption_key = os.urandom(32)  # 256-bit key
-            
-            # Encriptar archivo
+            # Clave de datos propia del archivo, envuelta antes de escribir nada
+            encryption_key = new_data_key()
+            key_id, wrapped_key = get_keyring().wrap(encryption_key, file_aad(file_id))
+
+            # Encriptar archivo sin cargarlo en memoria
             encrypt_file(file_path, str(encrypted_path), encryption_key)
             
-            # Guardar clave de forma segura (en implementación real, usar KMS)
-            key_path = str(encrypted_path) + '.key'
-            with open(key_path, 'wb') as f:
-                f.write(encryption_key)
-            
-            return str(encrypted_path)
-            
         except Exception as e:
-            logger.error(f"Error encriptando archivo: {str(e)}")
-            return file_path
+            self._cleanup_temp_files([str(encrypted_path)])
+            logger.error(f"Error encriptando archivo {file_id}: {str(e)}")
+            raise SecurityError(f"No se pudo encriptar el archivo: {str(e)}")
+        
+        return str(encrypted_path), {
+            'encryption': ENCRYPTION_FORMAT,
+            'wrapped_key': encode_wrapped_key(key_id, wrapped_key)
+        }
+    
+    def _data_key(self, provider: StorageProviderInterface, storage_key: str, file_id: str) -> Optional[bytes]:
+        """Clave de datos de un archivo encriptado (None si se guardó en claro)"""
+        from app.utils.envelope_crypto import decode_wrapped_key, file_aad, get_keyring
+        
+        metadata = provider.get_file_metadata(storage_key)
+        if metadata.get('encryption') != ENCRYPTION_FORMAT:
+            return None
+        key_id, wrapped_key = decode_wrapped_key(metadata['wrapped_key'])
+        return get_keyring().unwrap(wrapped_key, file_aad(file_id), key_id)
     
     def _add_watermark(self, file_path: str, metadata: FileMetadata) -> str:
         """Agregar watermark al archivo"""
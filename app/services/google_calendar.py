@@ -48,7 +48,7 @@ from app.models.user import User
 from app.models.meeting import Meeting
 from app.models.mentorship import MentorshipRelationship as Mentorship
 # from app.models.calendar_integration import CalendarIntegration  # No existe temporalmente
-# from app.models.calendar_sync import CalendarSync  # No existe temporalmente
+from app.models.calendar_sync import CalendarSync
 # from app.models.oauth_token import OAuthToken  # No existe temporalmente
 from app.services.base import BaseService
 from app.services.notification_service import NotificationService
@@ -58,10 +58,16 @@ from app.utils.formatters import format_datetime, format_duration
 from app.utils.date_utils import (
     convert_timezone, 
     get_user_timezone,
-    parse_datetime,
-    is_business_hours
+    parse_datetime
 )
 from app.utils.crypto_utils import encrypt_data, decrypt_data
+from app.utils.scheduling import (
+    Interval,
+    merge_intervals,
+    intersect_free,
+    candidate_starts,
+    window_free_intervals
+)
 
 
 logger = logging.getLogger(__name__)
@@ -181,10 +187,14 @@ class GoogleCalendarService(BaseService):
     - Integration con ecosystem de emprendimiento
     """
     
+    # Separación entre inicios sugeridos dentro de una ventana libre
+    SLOT_INCREMENT = timedelta(minutes=30)
+    
     def __init__(self):
         super().__init__()
         self.notification_service = NotificationService()
         self.executor = ThreadPoolExecutor(max_workers=5)
+        self._sync_engine = None
         self._setup_oauth_config()
         self._setup_scopes()
     
@@ -207,6 +217,28 @@ class GoogleCalendarService(BaseService):
             'https://www.googleapis.com/auth/userinfo.profile'
         ]
     
+    def _perform_initialization(self):
+        """Inicialización específica del servicio de Google Calendar."""
+        # La configuración OAuth y los scopes se cargan en __init__
+        pass
+    
+    def health_check(self) -> dict[str, Any]:
+        """
+        Verifica el estado de salud del servicio de Google Calendar.
+        
+        Returns:
+            Dict con información de estado del servicio
+        """
+        configured = all([self.client_id, self.client_secret, self.redirect_uri])
+        return {
+            'service': 'google_calendar',
+            'status': 'healthy' if configured else 'degraded',
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'configuration': {
+                'oauth_configured': configured
+            }
+        }
+    
     def get_authorization_url(self, user_id: int, state: Optional[str] = None) -> str:
         """
         Obtener URL de autorización OAuth
@@ -662,88 +694,123 @@ class GoogleCalendarService(BaseService):
             logger.error(f"Error verificando disponibilidad: {str(e)}")
             raise ExternalServiceError(f"Error verificando disponibilidad: {str(e)}")
     
+    def get_busy_intervals(
+        self,
+        user_id: int,
+        start_time: datetime,
+        end_time: datetime,
+        calendars: Optional[list[str]] = None
+    ) -> list[Interval]:
+        """
+        Obtener periodos ocupados del usuario vía FreeBusy, fusionados
+        
+        Args:
+            user_id: ID del usuario
+            start_time: Inicio de la ventana (UTC sin zona)
+            end_time: Fin de la ventana (UTC sin zona)
+            calendars: IDs de calendarios a consultar
+            
+        Returns:
+            list[Interval]: Intervalos ocupados disjuntos y ordenados
+        """
+        try:
+            credentials = self._get_user_credentials(user_id)
+            if not credentials:
+                raise AuthenticationError("Usuario no tiene Google Calendar conectado")
+            
+            service = self._build_calendar_service(credentials)
+            calendars = calendars or ['primary']
+            
+            body = {
+                'timeMin': start_time.isoformat() + 'Z',
+                'timeMax': end_time.isoformat() + 'Z',
+                'items': [{'id': cal_id} for cal_id in calendars]
+            }
+            
+            freebusy_result = service.freebusy().query(body=body).execute()
+            
+            busy = []
+            for calendar_id in calendars:
+                calendar_data = freebusy_result['calendars'].get(calendar_id, {})
+                for busy_period in calendar_data.get('busy', []):
+                    busy.append(Interval(
+                        self._to_naive_utc(parse_datetime(busy_period['start'])),
+                        self._to_naive_utc(parse_datetime(busy_period['end']))
+                    ))
+            
+            return merge_intervals(busy)
+            
+        except HttpError as e:
+            logger.error(f"Error obteniendo periodos ocupados: {str(e)}")
+            raise ExternalServiceError(f"Error verificando disponibilidad: {str(e)}")
+    
     def find_available_slots(
         self,
         user_ids: list[int],
         duration_minutes: int,
         preferred_start: datetime,
         preferred_end: datetime,
-        max_suggestions: int = 5
+        max_suggestions: int = 5,
+        local_availability: Optional[dict[int, list[Interval]]] = None
     ) -> list[dict[str, Any]]:
         """
         Encontrar slots disponibles para múltiples usuarios
         
+        La disponibilidad de todos los participantes se obtiene en paralelo,
+        se normaliza a ventanas libres y las ventanas comunes se calculan con
+        un k-way merge, por lo que el coste no depende del número de pasos de
+        la ventana.
+        
         Args:
             user_ids: IDs de usuarios participantes
             duration_minutes: Duración requerida en minutos
             preferred_start: Hora preferida de inicio
             preferred_end: Hora preferida de fin
             max_suggestions: Máximo número de sugerencias
+            local_availability: Ventanas libres ya conocidas por usuario (por
+                ejemplo, agendas locales de mentores); esos usuarios no se
+                consultan en Google Calendar
             
         Returns:
             list[dict[str, Any]]: Slots disponibles sugeridos
         """
         try:
-            suggestions = []
             duration = timedelta(minutes=duration_minutes)
+            local_availability = local_availability or {}
             
-            # Obtener disponibilidad de todos los usuarios
-            all_availability = {}
-            for user_id in user_ids:
-                try:
-                    availability = self.check_availability(
-                        user_id, preferred_start, preferred_end
-                    )
-                    all_availability[user_id] = availability
-                except Exception as e:
-                    logger.warning(f"No se pudo obtener disponibilidad de usuario {user_id}: {str(e)}")
+            free_by_user = {
+                user_id: merge_intervals(local_availability[user_id])
+                for user_id in user_ids if user_id in local_availability
+            }
+            
+            remote_ids = [user_id for user_id in user_ids if user_id not in free_by_user]
+            for user_id, busy in self._fetch_busy_concurrently(remote_ids, preferred_start, preferred_end).items():
+                if busy is None:
                     # Asumir no disponible si hay error
-                    all_availability[user_id] = [
-                        AvailabilitySlot(
-                            start_time=preferred_start,
-                            end_time=preferred_end,
-                            is_available=False
-                        )
-                    ]
+                    free_by_user[user_id] = []
+                else:
+                    free_by_user[user_id] = window_free_intervals(busy, preferred_start, preferred_end)
             
-            # Encontrar intersecciones de disponibilidad
-            current_time = preferred_start
-            slot_increment = timedelta(minutes=30)  # Verificar cada 30 minutos
+            # El horario laboral se trata como un participante más
+            free_lists = list(free_by_user.values())
+            free_lists.append(self._business_hours_intervals(preferred_start, preferred_end))
             
-            while current_time + duration <= preferred_end and len(suggestions) < max_suggestions:
-                slot_end = current_time + duration
-                
-                # Verificar si todos los usuarios están disponibles
-                all_available = True
-                
-                for user_id in user_ids:
-                    user_available = False
-                    
-                    for slot in all_availability[user_id]:
-                        if (slot.is_available and 
-                            slot.start_time <= current_time and 
-                            slot.end_time >= slot_end):
-                            user_available = True
-                            break
-                    
-                    if not user_available:
-                        all_available = False
-                        break
-                
-                if all_available:
-                    # Verificar horario de trabajo
-                    if self._is_business_hours(current_time, slot_end):
-                        suggestions.append({
-                            'start_time': current_time,
-                            'end_time': slot_end,
-                            'duration_minutes': duration_minutes,
-                            'available_users': user_ids,
-                            'confidence_score': self._calculate_confidence_score(
-                                current_time, preferred_start, preferred_end
-                            )
-                        })
-                
-                current_time += slot_increment
+            common_windows = intersect_free(free_lists)
+            
+            suggestions = [
+                {
+                    'start_time': candidate.start,
+                    'end_time': candidate.end,
+                    'duration_minutes': duration_minutes,
+                    'available_users': user_ids,
+                    'confidence_score': self._calculate_confidence_score(
+                        candidate.start, preferred_start, preferred_end
+                    )
+                }
+                for candidate in candidate_starts(
+                    common_windows, duration, self.SLOT_INCREMENT, limit=max_suggestions
+                )
+            ]
             
             # Ordenar por score de confianza
             suggestions.sort(key=lambda x: x['confidence_score'], reverse=True)
@@ -754,104 +821,86 @@ class GoogleCalendarService(BaseService):
             logger.error(f"Error encontrando slots disponibles: {str(e)}")
             raise BusinessLogicError(f"Error buscando disponibilidad: {str(e)}")
     
-    @retry_on_failure(max_retries=3, delay=60)
+    def _fetch_busy_concurrently(
+        self,
+        user_ids: list[int],
+        start_time: datetime,
+        end_time: datetime
+    ) -> dict[int, Optional[list[Interval]]]:
+        """Consultar FreeBusy de varios usuarios en paralelo (None si falla)"""
+        if not user_ids:
+            return {}
+        
+        app = current_app._get_current_object()
+        
+        def fetch(user_id: int) -> Optional[list[Interval]]:
+            with app.app_context():
+                try:
+                    return self.get_busy_intervals(user_id, start_time, end_time)
+                except Exception as e:
+                    logger.warning(f"No se pudo obtener disponibilidad de usuario {user_id}: {str(e)}")
+                    return None
+        
+        return dict(zip(user_ids, self.executor.map(fetch, user_ids)))
+    
+    def _business_hours_intervals(self, start_time: datetime, end_time: datetime) -> list[Interval]:
+        """Ventanas de horario laboral (8 AM - 6 PM, lunes a viernes) en el rango"""
+        windows = []
+        current_day = start_time.replace(hour=0, minute=0, second=0, microsecond=0)
+        
+        while current_day < end_time:
+            if current_day.weekday() < 5:
+                window = Interval(
+                    max(current_day.replace(hour=8), start_time),
+                    min(current_day.replace(hour=18), end_time)
+                )
+                if window.start < window.end:
+                    windows.append(window)
+            current_day += timedelta(days=1)
+        
+        return windows
+    
+    @staticmethod
+    def _to_naive_utc(value: datetime) -> datetime:
+        """Normalizar a UTC sin zona horaria para comparar con la ventana"""
+        if value.tzinfo is not None:
+            return value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+    
     def sync_calendars(self, user_id: int) -> CalendarSyncResult:
         """
         Sincronizar calendarios del usuario
         
+        Delega en el motor de sincronización incremental; los fallos
+        transitorios se reprograman con backoff en lugar de esperar aquí.
+        
         Args:
             user_id: ID del usuario
             
         Returns:
             CalendarSyncResult: Resultado de la sincronización
         """
-        try:
-            credentials = self._get_user_credentials(user_id)
-            if not credentials:
-                raise AuthenticationError("Usuario no tiene Google Calendar conectado")
-            
-            service = self._build_calendar_service(credentials)
-            
-            # Obtener último token de sincronización
-            last_sync = CalendarSync.query.filter_by(
-                user_id=user_id,
-                provider='google'
-            ).first()
-            
-            sync_token = last_sync.sync_token if last_sync else None
-            
-            # Obtener cambios desde la última sincronización
-            events_result = service.events().list(
-                calendarId='primary',
-                syncToken=sync_token,
-                showDeleted=True
-            ).execute() if sync_token else service.events().list(
-                calendarId='primary',
-                timeMin=datetime.now(timezone.utc).isoformat() + 'Z',
-                maxResults=1000,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            
-            events = events_result.get('items', [])
-            new_sync_token = events_result.get('nextSyncToken')
-            
-            # Procesar cambios
-            events_created = 0
-            events_updated = 0
-            events_deleted = 0
-            errors = []
-            
-            for event in events:
-                try:
-                    if event.get('status') == 'cancelled':
-                        self._delete_event_locally(user_id, event['id'])
-                        events_deleted += 1
-                    else:
-                        calendar_event = self._convert_google_to_calendar_event(event)
-                        
-                        # Verificar si existe localmente
-                        local_event = self._get_local_event(user_id, event['id'])
-                        
-                        if local_event:
-                            self._update_event_locally(user_id, calendar_event)
-                            events_updated += 1
-                        else:
-                            self._store_event_locally(user_id, calendar_event, event)
-                            events_created += 1
-                            
-                except Exception as e:
-                    errors.append(f"Error procesando evento {event.get('id', 'unknown')}: {str(e)}")
-            
-            # Actualizar token de sincronización
-            if new_sync_token:
-                self._update_sync_token(user_id, new_sync_token)
-            
-            result = CalendarSyncResult(
-                success=True,
-                events_synced=len(events),
-                events_created=events_created,
-                events_updated=events_updated,
-                events_deleted=events_deleted,
-                errors=errors,
-                last_sync_token=new_sync_token
-            )
-            
-            logger.info(f"Sincronización completada para usuario {user_id}: {result}")
-            return result
-            
-        except HttpError as e:
-            if 'Sync token is no longer valid' in str(e):
-                # Token inválido, hacer sincronización completa
-                logger.warning(f"Sync token inválido para usuario {user_id}, haciendo sync completo")
-                self._reset_sync_token(user_id)
-                return self.sync_calendars(user_id)
-            
-            logger.error(f"Error en sincronización: {str(e)}")
-            return CalendarSyncResult(
-                success=False,
-                errors=[str(e)]
-            )
+        outcome = self.sync_engine.sync_user(user_id)
+        
+        result = CalendarSyncResult(
+            success=outcome.success,
+            events_synced=outcome.events_synced,
+            events_created=outcome.events_created,
+            events_updated=outcome.events_updated,
+            events_deleted=outcome.events_deleted,
+            errors=outcome.errors
+        )
+        
+        logger.info(f"Sincronización completada para usuario {user_id}: {result}")
+        return result
+    
+    @property
+    def sync_engine(self):
+        """Motor de sincronización concurrente (creado bajo demanda)"""
+        if self._sync_engine is None:
+            from app.services.calendar_sync import CalendarSyncEngine, GoogleCalendarSource
+            self._sync_engine = CalendarSyncEngine(GoogleCalendarSource(self))
+        return self._sync_engine
     
     def schedule_mentorship_session(
         self,
@@ -1774,27 +1823,8 @@ class GoogleCalendarService(BaseService):
             return False
     
     def bulk_sync_calendars(self, user_ids: list[int]) -> dict[str, Any]:
-        """Sincronizar múltiples calendarios en lote"""
-        results = {
-            'successful': 0,
-            'failed': 0,
-            'errors': []
-        }
-        
-        for user_id in user_ids:
-            try:
-                sync_result = self.sync_calendars(user_id)
-                if sync_result.success:
-                    results['successful'] += 1
-                else:
-                    results['failed'] += 1
-                    results['errors'].extend(sync_result.errors or [])
-                    
-            except Exception as e:
-                results['failed'] += 1
-                results['errors'].append(f"Usuario {user_id}: {str(e)}")
-        
-        return results
+        """Sincronizar múltiples calendarios en lote (concurrencia acotada)"""
+        return self.sync_engine.sync_users(user_ids)
 
 
 # Instancia del servicio para uso global
@@ -1838,17 +1868,46 @@ def find_meeting_time(
     participant_ids: list[int],
     duration_minutes: int,
     preferred_date: datetime,
-    max_suggestions: int = 3
+    max_suggestions: int = 3,
+    days: int = 1,
+    mentor_ids: Optional[list[int]] = None
 ) -> list[dict[str, Any]]:
-    """Encontrar horario para reunión"""
+    """
+    Encontrar horario para reunión
+    
+    Args:
+        participant_ids: IDs de usuarios participantes
+        duration_minutes: Duración requerida
+        preferred_date: Día preferido (inicio de la búsqueda)
+        max_suggestions: Máximo número de sugerencias
+        days: Días a explorar desde la fecha preferida (7 para una semana)
+        mentor_ids: Participantes cuya agenda local de mentoría se usa en
+            lugar de Google Calendar; los que no estén en ``participant_ids``
+            se añaden como participantes
+    """
     
     start_of_day = preferred_date.replace(hour=8, minute=0, second=0, microsecond=0)
-    end_of_day = preferred_date.replace(hour=18, minute=0, second=0, microsecond=0)
+    end_of_window = (preferred_date + timedelta(days=max(days, 1) - 1)).replace(
+        hour=18, minute=0, second=0, microsecond=0
+    )
+    
+    local_availability = {}
+    if mentor_ids:
+        from app.services.mentorship_service import MentorshipService
+        mentorship_service = MentorshipService()
+        for mentor_id in mentor_ids:
+            local_availability[mentor_id] = mentorship_service.get_mentor_free_intervals(
+                mentor_id, start_of_day, end_of_window, duration_minutes
+            )
+    
+    # Un mentor siempre participa en la reunión cuya agenda aporta
+    user_ids = list(dict.fromkeys([*participant_ids, *(mentor_ids or [])]))
     
     return google_calendar_service.find_available_slots(
-        user_ids=participant_ids,
+        user_ids=user_ids,
         duration_minutes=duration_minutes,
         preferred_start=start_of_day,
-        preferred_end=end_of_day,
-        max_suggestions=max_suggestions
-    )
\ No newline at end of file
+        preferred_end=end_of_window,
+        max_suggestions=max_suggestions,
+        local_availability=local_availability
+    )
@@ -12,6 +12,7 @@ import json
 import hmac
 import hashlib
 import logging
+import math
 import asyncio
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta, timezone
@@ -40,6 +41,7 @@ from app.core.exceptions import (
 from app.utils.cache_utils import CacheManager
 from app.utils.decorators import retry_on_failure
 from app.models.user import User
+from app.services.webhook_delivery import OutboundDeliveryEngine, OutboundDestination
 
 
 logger = logging.getLogger(__name__)
@@ -571,6 +573,7 @@ class WebhookManager:
         self.cache = CacheManager()
         self.registered_handlers: dict[WebhookEvent, list[Callable]] = {}
         self.outbound_webhooks: dict[str, dict[str, Any]] = {}
+        self.delivery = OutboundDeliveryEngine()
     
     def register_handler(self, event: WebhookEvent, handler: Callable) -> None:
         """Registra handler para evento webhook"""
@@ -580,8 +583,18 @@ class WebhookManager:
         logger.info(f"Registered webhook handler for {event.value}")
     
     def register_outbound_webhook(self, name: str, url: str, events: list[WebhookEvent],
-                                secret: str = None, headers: dict[str, str] = None) -> None:
-        """Registra webhook saliente"""
+                                secret: str = None, headers: dict[str, str] = None,
+                                batch: bool = False, batch_interval: int = 5,
+                                max_concurrency: int = 4, rate_limit: int = None) -> None:
+        """
+        Registra webhook saliente
+        
+        Args:
+            batch: Agrupar los eventos de cada intervalo en un único POST
+            batch_interval: Segundos entre envíos al destino
+            max_concurrency: Peticiones simultáneas al destino
+            rate_limit: Peticiones por minuto al destino
+        """
         self.outbound_webhooks[name] = {
             'url': url,
             'events': events,
@@ -594,6 +607,17 @@ class WebhookManager:
                 'timeout': 30
             }
         }
+        self.delivery.register(OutboundDestination(
+            name=name,
+            url=url,
+            events=[event.value for event in events],
+            secret=secret,
+            headers=headers or {},
+            batch=batch,
+            batch_interval=batch_interval,
+            max_concurrency=max_concurrency,
+            rate_limit=rate_limit
+        ))
         logger.info(f"Registered outbound webhook: {name}")
     
     def handle_incoming_webhook(self, integration_name: str, payload: dict[str, Any],
@@ -690,14 +714,17 @@ class WebhookManager:
                 logger.error(f"Error in webhook handler: {e}")
     
     def _send_outbound_webhooks(self, payload: WebhookPayload) -> None:
-        """Envía webhooks a endpoints externos"""
-        for name, config in self.outbound_webhooks.items():
-            if not config['active'] or payload.event not in config['events']:
-                continue
-            
-            # Enviar de forma asíncrona
-            from app.tasks.integration_tasks import send_webhook_task
-            send_webhook_task.delay(name, asdict(payload))
+        """Encola el evento en los destinos suscritos (envío por lotes en segundo plano)"""
+        self.delivery.publish(
+            payload.event.value,
+            payload.data,
+            user_id=payload.user_id,
+            timestamp=payload.timestamp
+        )
+    
+    def get_delivery_metrics(self) -> dict[str, dict[str, Any]]:
+        """Latencias y fallos de entrega por destino"""
+        return self.delivery.metrics.snapshot()
 
 
 class IntegrationHub:
@@ -932,25 +959,44 @@ def handle_user_created(payload: WebhookPayload):
 # Rate limiting para integraciones
 
 class IntegrationRateLimiter:
-    """Rate limiter específico para integraciones"""
+    """
+    Rate limiter específico para integraciones.
+    
+    Ventana fija con un contador atómico por ventana (INCR en Redis o
+    ``add`` + ``inc`` en el cache), de modo que dos procesos concurrentes no
+    pueden leer el mismo valor y superar el límite.
+    """
     
     def __init__(self):
         self.cache = CacheManager()
     
     def is_allowed(self, integration_name: str, user_id: int, 
-                  endpoint: str = None) -> bool:
+                  endpoint: str = None, limit: int = None, window: int = 3600) -> bool:
         """Verifica si el request está permitido"""
-        # Implementar lógica de rate limiting específica
-        cache_key = f"rate_limit_{integration_name}_{user_id}_{endpoint or 'default'}"
-        
-        current_count = self.cache.get(cache_key) or 0
-        limit = self._get_rate_limit(integration_name, endpoint)
-        
-        if current_count >= limit:
-            return False
-        
-        self.cache.set(cache_key, current_count + 1, timeout=3600)  # 1 hora
-        return True
+        window_index = int(datetime.now(timezone.utc).timestamp() // window)
+        cache_key = f"rate_limit_{integration_name}_{user_id}_{endpoint or 'default'}_{window_index}"
+        limit = limit or self._get_rate_limit(integration_name, endpoint)
+        
+        return self._increment(cache_key, window) <= limit
+    
+    def seconds_until_reset(self, window: int = 3600) -> int:
+        """Segundos hasta que empieza la siguiente ventana (y el contador vuelve a cero)"""
+        now = datetime.now(timezone.utc).timestamp()
+        return max(1, math.ceil(window - now % window))
+    
+    def _increment(self, key: str, window: int) -> int:
+        """Incrementa el contador de la ventana de forma atómica"""
+        from app import extensions
+        
+        if extensions.redis_client is not None:
+            pipeline = extensions.redis_client.pipeline(transaction=True)
+            pipeline.incr(key)
+            pipeline.expire(key, window)
+            count, _ = pipeline.execute()
+            return int(count)
+        
+        extensions.cache.add(key, 0, timeout=window)
+        return int(extensions.cache.inc(key) or 0)
     
     def _get_rate_limit(self, integration_name: str, endpoint: str = None) -> int:
         """Obtiene límite de rate para integración"""
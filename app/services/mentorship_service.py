@@ -54,6 +54,7 @@ from app.services.email import EmailService
 from app.services.google_calendar import GoogleCalendarService
 from app.services.google_meet import GoogleMeetService
 from app.utils.validators import validate_session_duration, validate_future_datetime
+from app.utils.scheduling import Interval, merge_intervals
 from app.utils.formatters import format_duration, format_currency
 from app.utils.date_utils import (
     get_business_hours, 
@@ -608,6 +609,29 @@ class MentorshipService(BaseService):
             logger.error(f"Error obteniendo slots disponibles: {str(e)}")
             raise ServiceError(f"Error interno obteniendo disponibilidad: {str(e)}")
 
+    def get_mentor_free_intervals(self, mentor_id: int, start_date: datetime,
+                                  end_date: datetime, duration_minutes: int = None) -> list[Interval]:
+        """
+        Obtiene la disponibilidad local de un mentor como ventanas libres.
+        
+        Fusiona los slots de ``get_mentor_available_slots`` en intervalos
+        disjuntos, aptos para cruzarse con la agenda de otros participantes.
+        
+        Args:
+            mentor_id: ID del mentor
+            start_date: Fecha de inicio
+            end_date: Fecha de fin
+            duration_minutes: Duración deseada de la sesión
+            
+        Returns:
+            Lista de intervalos libres ordenados
+        """
+        slots = self.get_mentor_available_slots(mentor_id, start_date, end_date, duration_minutes)
+        return merge_intervals(
+            Interval(slot['datetime'], slot['datetime'] + timedelta(minutes=slot['duration_minutes']))
+            for slot in slots if slot.get('available', True)
+        )
+
     # ==================== MÉTRICAS Y ANALYTICS ====================
 
     def get_mentor_metrics(self, mentor_id: int, period_days: int = 30) -> dict[str, Any]:
@@ -1609,7 +1633,7 @@ class MentorshipService(BaseService):
             logger.error(f"Error obteniendo resumen de mentoría: {str(e)}")
             return {}
 
-    def _get_project_phases_distribution(self, projects: List) -> dict[str, int]:
+    def _get_project_phases_distribution(self, projects: list) -> dict[str, int]:
         """Obtiene distribución de fases de proyectos."""
         distribution = defaultdict(int)
         for project in projects:
@@ -1646,9 +1670,9 @@ class MentorshipService(BaseService):
             logger.error(f"Error calculando métricas de documentos: {str(e)}")
             return {}
 
-    def _calculate_overall_score(self, profile_completion: Dict, project_metrics: Dict,
-                               mentorship_metrics: Dict, task_metrics: Dict,
-                               document_metrics: Dict) -> float:
+    def _calculate_overall_score(self, profile_completion: dict, project_metrics: dict,
+                               mentorship_metrics: dict, task_metrics: dict,
+                               document_metrics: dict) -> float:
         """Calcula score general del emprendedor."""
         try:
             # Pesos para cada métrica
@@ -0,0 +1,603 @@
+"""
+Servicio de agregados de métricas por intervalo de tiempo
+
+Construye de forma incremental los agregados horarios, diarios y mensuales de
+``MetricRollup`` a partir de las tablas de origen, y ofrece la API de consulta
+que usan los dashboards en lugar de recorrer las tablas de origen. Los hechos
+se separan por organización, programa y visibilidad (``is_public``).
+
+- ``refresh`` recalcula las horas de un rango desde el origen y reconstruye
+  los días y meses que las contienen a partir de las horas.
+- ``refresh_recent`` recalcula la ventana reciente (tarea periódica).
+- ``correct_late_data`` detecta registros de origen modificados o insertados
+  tarde (por columna ``updated_at``) y recalcula solo las horas afectadas,
+  incluida la hora anterior de los registros cuyo instante cambió (ver
+  ``track_moved_facts``).
+- ``totals``/``series`` leen el menor número de filas pre-agregadas que cubre
+  el rango pedido (ver ``app.utils.time_buckets.plan_buckets``).
+
+Hechos disponibles:
+    activity.events, activity.logins
+    mentorship.sessions_completed, mentorship.minutes
+    projects.created, projects.launched
+    users.registered
+    users.active (cada usuario activo cuenta en la hora de su último acceso,
+        así que la suma de un rango son los usuarios distintos que accedieron
+        por última vez en él: la de los últimos 30 días es el MAU)
+    metric.<tipo de AnalyticsMetric>
+
+Author: Sistema de Emprendimiento
+Version: 1.0.0
+"""
+
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Iterable, Optional
+
+from sqlalchemy import and_, case, cast, delete, event, func, insert, inspect, or_, select, type_coerce, DateTime
+
+from app.extensions import db, cache
+from app.models.activity_log import ActivityLog, ActivityType
+from app.models.analytics import AnalyticsMetric
+from app.models.mentorship import MentorshipRelationship, MentorshipSession, SessionStatus
+from app.models.metric_rollup import MetricRollup
+from app.models.project import Project
+from app.models.user import User
+from app.utils.time_buckets import HOUR, DAY, MONTH, bucket_range, ceil, plan_buckets, to_naive_utc, truncate
+
+logger = logging.getLogger(__name__)
+
+# (métrica, inicio de hora, organización, programa, público, valor, registros)
+Fact = tuple[str, datetime, int, int, bool, float, int]
+
+CHECKPOINT_CACHE_KEY = 'metric_rollups:late_data_checkpoint'
+MOVED_HOURS_CACHE_KEY = 'metric_rollups:moved_hours'
+
+# Margen con el que se relee el origen en la corrección de datos tardíos:
+# cubre registros cuyo ``updated_at`` es anterior a su inserción real
+# (por ejemplo los que pasan por el buffer de escritura).
+LATE_DATA_OVERLAP = timedelta(minutes=10)
+
+
+@dataclass(frozen=True)
+class FactSource:
+    """
+    Tabla de origen de uno o varios hechos.
+
+    Args:
+        name: Métrica o prefijo de métricas que produce (``activity`` produce
+            ``activity.*``)
+        time_column: ``fn()`` con la expresión del instante del hecho
+        changed_column: ``fn()`` con la expresión de última modificación
+        collect: ``fn(desde, hasta)`` que devuelve los hechos por hora del rango
+        model: Modelo de origen
+        time_attributes: Atributos del modelo de los que sale el instante, en
+            el orden de ``time_column`` (vale el primero no nulo)
+    """
+
+    name: str
+    time_column: Callable[[], Any]
+    changed_column: Callable[[], Any]
+    collect: Callable[[datetime, datetime], Iterable[Fact]]
+    model: Any = None
+    time_attributes: tuple[str, ...] = ()
+
+    def previous_time(self, target) -> Optional[datetime]:
+        """Instante anterior del hecho si la actualización en curso de ``target`` lo cambia."""
+        state = inspect(target)
+        moved = False
+        values = []
+        for attribute in self.time_attributes:
+            history = state.attrs[attribute].history
+            if history.has_changes():
+                moved = True
+                values.append(history.deleted[0] if history.deleted else None)
+            else:
+                values.append(getattr(target, attribute))
+        if not moved:
+            return None
+        return next((value for value in values if value is not None), None)
+
+    def metric_filter(self):
+        """Filtro de las filas de ``MetricRollup`` que pertenecen a este origen."""
+        return or_(MetricRollup.metric == self.name, MetricRollup.metric.like(f'{self.name}.%'))
+
+
+def _hour(column):
+    if db.engine.dialect.name == 'sqlite':
+        # Mismo formato de texto con el que SQLite guarda las columnas DateTime
+        return type_coerce(func.strftime('%Y-%m-%d %H:00:00.000000', column), DateTime)
+    return func.date_trunc('hour', column)
+
+
+# ====================================
+# ORÍGENES
+# ====================================
+
+def _collect_activity(start: datetime, end: datetime) -> Iterable[Fact]:
+    bucket = _hour(ActivityLog.created_at).label('bucket')
+    organization = func.coalesce(ActivityLog.organization_id, 0).label('organization_id')
+    rows = db.session.execute(
+        select(
+            bucket,
+            organization,
+            func.count(ActivityLog.id),
+            func.sum(case((ActivityLog.activity_type == ActivityType.LOGIN, 1), else_=0))
+        )
+        .where(
+            ActivityLog.created_at >= start,
+            ActivityLog.created_at < end,
+            ActivityLog.is_deleted == False
+        )
+        .group_by(bucket, organization)
+    )
+    for bucket_start, organization_id, events, logins in rows:
+        yield 'activity.events', bucket_start, organization_id, 0, False, float(events), events
+        if logins:
+            yield 'activity.logins', bucket_start, organization_id, 0, False, float(logins), logins
+
+
+def _session_time():
+    return func.coalesce(MentorshipSession.actual_end_time, MentorshipSession.scheduled_datetime)
+
+
+def _collect_mentorship(start: datetime, end: datetime) -> Iterable[Fact]:
+    session_time = _session_time()
+    bucket = _hour(session_time).label('bucket')
+    organization = func.coalesce(MentorshipRelationship.organization_id, 0).label('organization_id')
+    program = func.coalesce(MentorshipRelationship.program_id, 0).label('program_id')
+    minutes = func.coalesce(MentorshipSession.actual_duration_minutes, MentorshipSession.duration_minutes, 0)
+    rows = db.session.execute(
+        select(bucket, organization, program, func.count(MentorshipSession.id), func.sum(minutes))
+        .join(MentorshipRelationship, MentorshipRelationship.id == MentorshipSession.mentorship_id)
+        .where(
+            MentorshipSession.status == SessionStatus.COMPLETED,
+            session_time >= start,
+            session_time < end
+        )
+        .group_by(bucket, organization, program)
+    )
+    for bucket_start, organization_id, program_id, sessions, total_minutes in rows:
+        yield 'mentorship.sessions_completed', bucket_start, organization_id, program_id, False, float(sessions), sessions
+        yield 'mentorship.minutes', bucket_start, organization_id, program_id, False, float(total_minutes or 0), sessions
+
+
+def _project_facts(metric: str, time_column, start: datetime, end: datetime) -> Iterable[Fact]:
+    bucket = _hour(time_column).label('bucket')
+    organization = func.coalesce(Project.supporting_organization_id, 0).label('organization_id')
+    program = func.coalesce(Project.program_id, 0).label('program_id')
+    public = func.coalesce(Project.is_public, False).label('is_public')
+    rows = db.session.execute(
+        select(bucket, organization, program, public, func.count(Project.id))
+        .where(time_column >= start, time_column < end, Project.is_deleted == False)
+        .group_by(bucket, organization, program, public)
+    )
+    for bucket_start, organization_id, program_id, is_public, projects in rows:
+        yield metric, bucket_start, organization_id, program_id, bool(is_public), float(projects), projects
+
+
+def _launch_time():
+    if db.engine.dialect.name == 'sqlite':
+        return type_coerce(func.strftime('%Y-%m-%d 00:00:00.000000', Project.launch_date), DateTime)
+    # date_trunc sobre DATE devolvería timestamptz; se convierte antes a timestamp
+    return cast(Project.launch_date, DateTime)
+
+
+def _collect_users(start: datetime, end: datetime) -> Iterable[Fact]:
+    bucket = _hour(User.created_at).label('bucket')
+    rows = db.session.execute(
+        select(bucket, func.count(User.id))
+        .where(User.created_at >= start, User.created_at < end)
+        .group_by(bucket)
+    )
+    for bucket_start, users in rows:
+        yield 'users.registered', bucket_start, 0, 0, False, float(users), users
+
+
+def _collect_active_users(start: datetime, end: datetime) -> Iterable[Fact]:
+    bucket = _hour(User.last_login_at).label('bucket')
+    rows = db.session.execute(
+        select(bucket, func.count(User.id))
+        .where(User.last_login_at >= start, User.last_login_at < end, User.is_active == True)
+        .group_by(bucket)
+    )
+    for bucket_start, users in rows:
+        yield 'users.active', bucket_start, 0, 0, False, float(users), users
+
+
+def _collect_metrics(start: datetime, end: datetime) -> Iterable[Fact]:
+    bucket = _hour(AnalyticsMetric.timestamp).label('bucket')
+    organization = func.coalesce(AnalyticsMetric.organization_id, 0).label('organization_id')
+    program = func.coalesce(AnalyticsMetric.program_id, 0).label('program_id')
+    rows = db.session.execute(
+        select(
+            AnalyticsMetric.metric_type, bucket, organization, program,
+            func.sum(AnalyticsMetric.value), func.count(AnalyticsMetric.id)
+        )
+        .where(AnalyticsMetric.timestamp >= start, AnalyticsMetric.timestamp < end)
+        .group_by(AnalyticsMetric.metric_type, bucket, organization, program)
+    )
+    for metric_type, bucket_start, organization_id, program_id, value, count in rows:
+        yield f'metric.{metric_type.value}', bucket_start, organization_id, program_id, False, float(value or 0), count
+
+
+FACT_SOURCES: dict[str, FactSource] = {
+    source.name: source for source in (
+        FactSource(
+            'activity', lambda: ActivityLog.created_at, lambda: ActivityLog.updated_at, _collect_activity,
+            ActivityLog, ('created_at',)
+        ),
+        FactSource(
+            'mentorship', _session_time, lambda: MentorshipSession.updated_at, _collect_mentorship,
+            MentorshipSession, ('actual_end_time', 'scheduled_datetime')
+        ),
+        FactSource(
+            'projects.created', lambda: Project.created_at, lambda: Project.updated_at,
+            lambda start, end: _project_facts('projects.created', Project.created_at, start, end),
+            Project, ('created_at',)
+        ),
+        FactSource(
+            'projects.launched', _launch_time, lambda: Project.updated_at,
+            lambda start, end: _project_facts('projects.launched', _launch_time(), start, end),
+            Project, ('launch_date',)
+        ),
+        FactSource(
+            'metric', lambda: AnalyticsMetric.timestamp, lambda: AnalyticsMetric.updated_at, _collect_metrics,
+            AnalyticsMetric, ('timestamp',)
+        ),
+        FactSource(
+            'users.registered', lambda: User.created_at, lambda: User.updated_at, _collect_users,
+            User, ('created_at',)
+        ),
+        FactSource(
+            'users.active', lambda: User.last_login_at, lambda: User.updated_at, _collect_active_users,
+            User, ('last_login_at',)
+        ),
+    )
+}
+
+
+# ====================================
+# SERVICIO
+# ====================================
+
+class MetricRollupService:
+    """Construcción incremental y consulta de ``MetricRollup``."""
+
+    def __init__(self, sources: Optional[dict[str, FactSource]] = None):
+        self.sources = sources or FACT_SOURCES
+
+    # ----- Construcción -----
+
+    def refresh(self, start: datetime, end: datetime, sources: Optional[Iterable[str]] = None) -> int:
+        """
+        Recalcular los agregados de ``[start, end)``.
+
+        Las horas se reemplazan con lo que hay en el origen; los días y meses
+        que contienen el rango se reconstruyen a partir de las horas, por lo
+        que basta con recalcular las horas que cambiaron.
+
+        Args:
+            start: Inicio del rango (se redondea a la hora hacia abajo)
+            end: Fin del rango (se redondea a la hora hacia arriba)
+            sources: Nombres de los orígenes a recalcular (todos por defecto)
+
+        Returns:
+            Filas horarias escritas
+        """
+        start, end = truncate(start, HOUR), ceil(end, HOUR)
+        if start >= end:
+            return 0
+
+        selected = [self.sources[name] for name in (sources or self.sources)]
+        metric_filter = or_(*[source.metric_filter() for source in selected])
+
+        try:
+            hour_rows = [
+                self._row(metric, HOUR, bucket_start, organization_id, program_id, is_public, value, count)
+                for source in selected
+                for metric, bucket_start, organization_id, program_id, is_public, value, count
+                in source.collect(start, end)
+            ]
+            self._replace(HOUR, start, end, metric_filter, hour_rows)
+
+            child, child_start, child_end = HOUR, start, end
+            for granularity in (DAY, MONTH):
+                range_start, range_end = truncate(child_start, granularity), ceil(child_end, granularity)
+                rows = self._aggregate(child, granularity, range_start, range_end, metric_filter)
+                self._replace(granularity, range_start, range_end, metric_filter, rows)
+                child, child_start, child_end = granularity, range_start, range_end
+
+            db.session.commit()
+            return len(hour_rows)
+
+        except Exception:
+            db.session.rollback()
+            raise
+
+    def refresh_recent(self, lookback: timedelta = timedelta(hours=2)) -> int:
+        """Recalcular la ventana reciente hasta la hora en curso incluida."""
+        now = to_naive_utc(datetime.now(timezone.utc))
+        return self.refresh(now - lookback, now + timedelta(hours=1))
+
+    def correct_late_data(self, since: Optional[datetime] = None) -> dict[str, int]:
+        """
+        Recalcular las horas con registros de origen modificados desde ``since``.
+
+        Sin ``since`` se usa el punto de control de la ejecución anterior
+        (guardado en cache) o, si no existe, las últimas 24 horas. También se
+        recalculan las horas que dejaron atrás los registros cuyo instante
+        cambió (anotadas por ``track_moved_facts``): su hora actual se detecta
+        por ``updated_at``, pero la anterior conservaría el hecho.
+
+        Returns:
+            Horas recalculadas por origen
+        """
+        started_at = to_naive_utc(datetime.now(timezone.utc))
+        if since is None:
+            since = cache.get(CHECKPOINT_CACHE_KEY) or started_at - timedelta(days=1)
+        since = to_naive_utc(since) - LATE_DATA_OVERLAP
+
+        moved = cache.get(MOVED_HOURS_CACHE_KEY) or {}
+        cache.delete(MOVED_HOURS_CACHE_KEY)
+
+        corrected = {}
+        for name, source in self.sources.items():
+            hours = sorted({
+                to_naive_utc(bucket_start) for (bucket_start,) in db.session.execute(
+                    select(_hour(source.time_column()).distinct())
+                    .where(source.changed_column() >= since, source.time_column().isnot(None))
+                )
+            } | set(moved.get(name, ())))
+            for range_start, range_end in _contiguous_ranges(hours, timedelta(hours=1)):
+                self.refresh(range_start, range_end, sources=[name])
+            corrected[name] = len(hours)
+
+        cache.set(CHECKPOINT_CACHE_KEY, started_at, timeout=0)
+        if any(corrected.values()):
+            logger.info(f"Agregados corregidos por datos tardíos: {corrected}")
+        return corrected
+
+    # ----- Consulta -----
+
+    def totals(self, metrics: Iterable[str], start: datetime, end: datetime,
+               organization_id: Optional[int] = None, program_id: Optional[int] = None,
+               is_public: Optional[bool] = None) -> dict[str, float]:
+        """
+        Sumar varias métricas en ``[start, end)`` con una sola consulta.
+
+        Args:
+            metrics: Nombres de las métricas
+            start: Inicio del rango (se redondea a la hora hacia abajo)
+            end: Fin del rango (se redondea a la hora hacia arriba)
+            organization_id: Filtrar por organización (todas por defecto)
+            program_id: Filtrar por programa (todos por defecto)
+            is_public: Filtrar por visibilidad (públicos y privados por defecto)
+
+        Returns:
+            Total por métrica (0.0 si no hay datos)
+        """
+        totals = dict.fromkeys(metrics, 0.0)
+        for metric, (value, _count) in self._sums(totals, start, end, organization_id, program_id, is_public).items():
+            totals[metric] = value
+        return totals
+
+    def averages(self, metrics: Iterable[str], start: datetime, end: datetime,
+                 organization_id: Optional[int] = None, program_id: Optional[int] = None,
+                 is_public: Optional[bool] = None) -> dict[str, Optional[float]]:
+        """
+        Media por registro de origen de varias métricas en ``[start, end)``.
+
+        Útil para métricas que son tasas o importes reportados (por ejemplo
+        ``metric.churn_rate``), cuya suma no tiene sentido.
+
+        Returns:
+            Media por métrica (None si no hay registros)
+        """
+        averages: dict[str, Optional[float]] = dict.fromkeys(metrics)
+        for metric, (value, count) in self._sums(averages, start, end, organization_id, program_id, is_public).items():
+            averages[metric] = value / count if count else None
+        return averages
+
+    def total(self, metric: str, start: datetime, end: datetime,
+              organization_id: Optional[int] = None, program_id: Optional[int] = None,
+              is_public: Optional[bool] = None) -> float:
+        """Sumar una métrica en ``[start, end)``."""
+        return self.totals([metric], start, end, organization_id, program_id, is_public)[metric]
+
+    def series(self, metrics: Iterable[str], start: datetime, end: datetime, granularity: str = DAY,
+               organization_id: Optional[int] = None, program_id: Optional[int] = None,
+               is_public: Optional[bool] = None) -> tuple[list[datetime], dict[str, list[float]]]:
+        """
+        Serie temporal de varias métricas, con ceros en los intervalos sin datos.
+
+        Returns:
+            ``(inicios de intervalo, {métrica: valores})``
+        """
+        metrics = list(metrics)
+        buckets = bucket_range(start, end, granularity)
+        values = {metric: [0.0] * len(buckets) for metric in metrics}
+        if not buckets or not metrics:
+            return buckets, values
+
+        positions = {bucket_start: index for index, bucket_start in enumerate(buckets)}
+        query = (
+            select(MetricRollup.metric, MetricRollup.bucket_start, func.sum(MetricRollup.value))
+            .where(
+                MetricRollup.metric.in_(metrics),
+                MetricRollup.granularity == granularity,
+                MetricRollup.bucket_start >= buckets[0],
+                MetricRollup.bucket_start <= buckets[-1],
+                *self._scope(organization_id, program_id, is_public)
+            )
+            .group_by(MetricRollup.metric, MetricRollup.bucket_start)
+        )
+        for metric, bucket_start, value in db.session.execute(query):
+            index = positions.get(to_naive_utc(bucket_start))
+            if index is not None:
+                values[metric][index] = float(value or 0)
+        return buckets, values
+
+    # ----- Auxiliares -----
+
+    def _sums(self, metrics: Iterable[str], start: datetime, end: datetime, organization_id: Optional[int],
+              program_id: Optional[int], is_public: Optional[bool]) -> dict[str, tuple[float, int]]:
+        """Suma de valores y de registros por métrica en ``[start, end)`` con una sola consulta."""
+        metrics = list(metrics)
+        plan = plan_buckets(start, end)
+        if not plan or not metrics:
+            return {}
+
+        ranges = or_(*[
+            and_(
+                MetricRollup.granularity == granularity,
+                MetricRollup.bucket_start >= range_start,
+                MetricRollup.bucket_start < range_end
+            )
+            for granularity, range_start, range_end in plan
+        ])
+        query = (
+            select(MetricRollup.metric, func.sum(MetricRollup.value), func.sum(MetricRollup.sample_count))
+            .where(MetricRollup.metric.in_(metrics), ranges, *self._scope(organization_id, program_id, is_public))
+            .group_by(MetricRollup.metric)
+        )
+        return {
+            metric: (float(value or 0), int(count or 0))
+            for metric, value, count in db.session.execute(query)
+        }
+
+    @staticmethod
+    def _scope(organization_id: Optional[int], program_id: Optional[int], is_public: Optional[bool]) -> list:
+        conditions = []
+        if organization_id is not None:
+            conditions.append(MetricRollup.organization_id == organization_id)
+        if program_id is not None:
+            conditions.append(MetricRollup.program_id == program_id)
+        if is_public is not None:
+            conditions.append(MetricRollup.is_public == is_public)
+        return conditions
+
+    @staticmethod
+    def _row(metric: str, granularity: str, bucket_start: datetime, organization_id: int, program_id: int,
+             is_public: bool, value: float, count: int) -> dict[str, Any]:
+        return {
+            'metric': metric,
+            'granularity': granularity,
+            'bucket_start': to_naive_utc(bucket_start),
+            'organization_id': organization_id or 0,
+            'program_id': program_id or 0,
+            'is_public': bool(is_public),
+            'value': value,
+            'sample_count': count
+        }
+
+    def _replace(self, granularity: str, start: datetime, end: datetime, metric_filter, rows: list[dict[str, Any]]):
+        db.session.execute(
+            delete(MetricRollup)
+            .where(
+                MetricRollup.granularity == granularity,
+                MetricRollup.bucket_start >= start,
+                MetricRollup.bucket_start < end,
+                metric_filter
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if rows:
+            db.session.execute(insert(MetricRollup), rows)
+
+    def _aggregate(self, child: str, granularity: str, start: datetime, end: datetime,
+                   metric_filter) -> list[dict[str, Any]]:
+        """Agregar las filas de ``child`` de ``[start, end)`` en intervalos de ``granularity``."""
+        totals: dict[tuple, list] = defaultdict(lambda: [0.0, 0])
+        rows = db.session.execute(
+            select(
+                MetricRollup.metric, MetricRollup.bucket_start, MetricRollup.organization_id,
+                MetricRollup.program_id, MetricRollup.is_public, MetricRollup.value, MetricRollup.sample_count
+            )
+            .where(
+                MetricRollup.granularity == child,
+                MetricRollup.bucket_start >= start,
+                MetricRollup.bucket_start < end,
+                metric_filter
+            )
+        )
+        for metric, bucket_start, organization_id, program_id, is_public, value, count in rows:
+            entry = totals[(metric, truncate(bucket_start, granularity), organization_id, program_id, is_public)]
+            entry[0] += value
+            entry[1] += count
+
+        return [
+            self._row(metric, granularity, bucket_start, organization_id, program_id, is_public, value, count)
+            for (metric, bucket_start, organization_id, program_id, is_public), (value, count) in totals.items()
+        ]
+
+
+# ====================================
+# REGISTROS QUE CAMBIAN DE HORA
+# ====================================
+
+_tracking_moved_facts = False
+
+
+def track_moved_facts():
+    """
+    Anotar la hora anterior de los registros de origen cuyo instante cambia.
+
+    Al confirmar la transacción, las horas se añaden a la lista pendiente en
+    cache que consume ``correct_late_data``. Se registra una sola vez por
+    proceso.
+    """
+    global _tracking_moved_facts
+    if _tracking_moved_facts:
+        return
+
+    sources_by_model: dict[Any, list[FactSource]] = defaultdict(list)
+    for source in FACT_SOURCES.values():
+        if source.model is not None:
+            sources_by_model[source.model].append(source)
+
+    def _remember_previous_hour(mapper, connection, target):
+        moved = [
+            (source.name, truncate(previous, HOUR))
+            for source in sources_by_model[mapper.class_]
+            for previous in (source.previous_time(target),)
+            if previous is not None
+        ]
+        if not moved:
+            return
+
+        @event.listens_for(db.session, 'after_commit', once=True)
+        def _store(session):
+            try:
+                pending = cache.get(MOVED_HOURS_CACHE_KEY) or {}
+                for name, hour in moved:
+                    pending.setdefault(name, []).append(hour)
+                cache.set(MOVED_HOURS_CACHE_KEY, pending, timeout=0)
+            except Exception as e:
+                logger.warning(f"No se pudieron anotar las horas de registros movidos {moved}: {e}")
+
+    for model in sources_by_model:
+        event.listen(model, 'before_update', _remember_previous_hour)
+
+    _tracking_moved_facts = True
+
+
+def _contiguous_ranges(buckets: list[datetime], step: timedelta) -> list[tuple[datetime, datetime]]:
+    """Agrupar inicios de intervalo ordenados en rangos ``[desde, hasta)`` contiguos."""
+    ranges: list[tuple[datetime, datetime]] = []
+    for bucket_start in buckets:
+        if ranges and ranges[-1][1] == bucket_start:
+            ranges[-1] = (ranges[-1][0], bucket_start + step)
+        elif not ranges or ranges[-1][1] < bucket_start:
+            ranges.append((bucket_start, bucket_start + step))
+    return ranges
+
+
+__all__ = [
+    'FactSource',
+    'FACT_SOURCES',
+    'MetricRollupService',
+    'track_moved_facts'
+]
@@ -10,7 +10,7 @@ import logging
 import json
 import asyncio
 from typing import Optional, Any, Union
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 from dataclasses import dataclass, asdict
 from abc import ABC, abstractmethod
@@ -38,8 +38,8 @@ from app.models.user import User
 from app.models.notification import Notification, NotificationTemplate, NotificationPreference
 from app.models.activity_log import ActivityLog
 from app.services.base import BaseService
-from app.services.email import EmailService
-from app.services.sms import SMSService
+from app.services.email import EmailService, EmailMessage, EmailContent, EmailAddress
+from app.services.sms import SMSService, SMSMessage
 from app.utils.decorators import log_activity, retry_on_failure
 from app.utils.validators import validate_email, validate_phone
 from app.utils.formatters import format_datetime, truncate_text
@@ -124,6 +124,71 @@ class NotificationType(Enum):
     PAYMENT_FAILED = "payment_failed"
 
 
+# Tipos que además de in-app se envían por email, SMS o push si el usuario lo permite
+EMAIL_NOTIFICATION_TYPES = frozenset({
+    NotificationType.PROJECT_APPROVED.value,
+    NotificationType.MENTORSHIP_SESSION_SCHEDULED.value,
+    NotificationType.PASSWORD_RESET.value
+})
+SMS_NOTIFICATION_TYPES = frozenset({
+    NotificationType.SECURITY_ALERT.value
+})
+PUSH_NOTIFICATION_TYPES = frozenset({
+    NotificationType.MEETING_REMINDER.value,
+    NotificationType.TASK_DUE_SOON.value
+})
+
+# Preferencias de los usuarios sin fila en notification_preferences
+DEFAULT_CHANNEL_PREFERENCES = {
+    'email_enabled': True,
+    'sms_enabled': False,
+    'push_enabled': True,
+    'in_app_enabled': True
+}
+
+
+def channels_for_preferences(type: str, preferences: dict[str, bool]) -> list[str]:
+    """
+    Canales de una notificación según su tipo y las preferencias del usuario
+
+    In-app se incluye siempre; el resto solo para los tipos que lo justifican.
+    """
+    channels = [NotificationChannel.IN_APP.value]
+
+    if preferences.get('email_enabled') and type in EMAIL_NOTIFICATION_TYPES:
+        channels.append(NotificationChannel.EMAIL.value)
+    if preferences.get('sms_enabled') and type in SMS_NOTIFICATION_TYPES:
+        channels.append(NotificationChannel.SMS.value)
+    if preferences.get('push_enabled') and type in PUSH_NOTIFICATION_TYPES:
+        channels.append(NotificationChannel.PUSH.value)
+
+    return channels
+
+
+def group_recipients_by_channel(
+    recipients: list[tuple[Any, Any]],
+    type: str,
+    preferences: dict[Any, dict[str, bool]]
+) -> dict[str, list[Any]]:
+    """
+    Agrupar notificaciones por canal de envío
+
+    Args:
+        recipients: Pares ``(user_id, notification_id)``
+        type: Tipo de notificación
+        preferences: Preferencias por usuario (las de por defecto si falta)
+
+    Returns:
+        dict[str, list]: IDs de notificación por canal, en el orden de entrada
+    """
+    groups: dict[str, list[Any]] = {}
+    for user_id, notification_id in recipients:
+        user_preferences = preferences.get(user_id, DEFAULT_CHANNEL_PREFERENCES)
+        for channel in channels_for_preferences(type, user_preferences):
+            groups.setdefault(channel, []).append(notification_id)
+    return groups
+
+
 @dataclass
 class NotificationData:
     """Datos de notificación"""
@@ -505,11 +570,18 @@ class NotificationService(BaseService):
         message: str,
         data: Optional[dict[str, Any]] = None,
         template_id: Optional[int] = None,
-        batch_size: int = 100
+        batch_size: int = 100,
+        dispatch_batch_size: int = 500
     ) -> BulkNotificationResult:
         """
         Enviar notificaciones masivas de forma optimizada
         
+        Las notificaciones se crean por lotes de ``batch_size``; las
+        preferencias de cada lote se leen con una sola consulta y los
+        destinatarios se agrupan por canal. Cada grupo de hasta
+        ``dispatch_batch_size`` notificaciones se encola como una única tarea
+        que usa la API masiva del proveedor del canal.
+        
         Args:
             user_ids: Lista de IDs de usuarios
             type: Tipo de notificación
@@ -518,15 +590,26 @@ class NotificationService(BaseService):
             data: Datos adicionales
             template_id: ID de plantilla
             batch_size: Tamaño del lote para procesamiento
+            dispatch_batch_size: Notificaciones por tarea de envío
             
         Returns:
             BulkNotificationResult: Resultado del envío masivo
         """
         total_sent = 0
-        successful = 0
-        failed = 0
         errors = []
         notification_ids = []
+        failed_ids = set()
+        pending: dict[str, list] = {}
+        dispatched_tasks = 0
+        
+        def dispatch(channel: str, ids: list) -> None:
+            nonlocal dispatched_tasks
+            try:
+                self._queue_notification_batch_async(channel, ids)
+                dispatched_tasks += 1
+            except Exception as e:
+                failed_ids.update(ids)
+                errors.append(f"Canal {channel} ({len(ids)} notificaciones): {str(e)}")
         
         try:
             # Procesar en lotes para evitar sobrecarga
@@ -542,33 +625,103 @@ class NotificationService(BaseService):
                     data=data,
                     template_id=template_id
                 )
+                notification_ids.extend(notification.id for notification in notifications)
                 
-                # Encolar para envío asíncrono
-                for notification in notifications:
-                    try:
-                        self._queue_notification_async(notification.id)
-                        successful += 1
-                        notification_ids.append(notification.id)
-                    except Exception as e:
-                        failed += 1
-                        errors.append(f"Usuario {notification.recipient_id}: {str(e)}")
+                # Agrupar por canal con las preferencias del lote
+                preferences = self._resolve_bulk_preferences(batch, type)
+                groups = group_recipients_by_channel(
+                    [(notification.recipient_id, notification.id) for notification in notifications],
+                    type,
+                    preferences
+                )
+                
+                # Encolar los grupos que ya completan una tarea
+                for channel, ids in groups.items():
+                    queued = pending.setdefault(channel, [])
+                    queued.extend(ids)
+                    while len(queued) >= dispatch_batch_size:
+                        dispatch(channel, queued[:dispatch_batch_size])
+                        del queued[:dispatch_batch_size]
                 
                 total_sent += len(batch)
             
-            logger.info(f"Envío masivo completado: {successful}/{total_sent} exitosos")
+            # Encolar los restos de cada canal
+            for channel, ids in pending.items():
+                if ids:
+                    dispatch(channel, ids)
+            
+            failed = len(failed_ids)
+            successful = total_sent - failed
+            
+            logger.info(
+                f"Envío masivo completado: {successful}/{total_sent} exitosos "
+                f"en {dispatched_tasks} tareas"
+            )
             
             return BulkNotificationResult(
                 total_sent=total_sent,
                 successful=successful,
                 failed=failed,
                 errors=errors,
-                notification_ids=notification_ids
+                notification_ids=[
+                    notification_id for notification_id in notification_ids
+                    if notification_id not in failed_ids
+                ]
             )
             
         except Exception as e:
             logger.error(f"Error en envío masivo: {str(e)}")
             raise BusinessLogicError(f"Error en envío masivo: {str(e)}")
     
+    def deliver_notification_batch(
+        self,
+        channel: str,
+        notification_ids: list
+    ) -> BulkNotificationResult:
+        """
+        Entregar un grupo de notificaciones por un canal
+        
+        Carga las notificaciones y sus destinatarios con una consulta, las
+        envía con la API masiva del proveedor del canal y marca como enviadas
+        las entregadas con una única actualización.
+        
+        Args:
+            channel: Canal de envío
+            notification_ids: IDs de las notificaciones del grupo
+            
+        Returns:
+            BulkNotificationResult: Resultado de la entrega
+        """
+        rows = db.session.query(Notification, User).join(
+            User, User.id == Notification.recipient_id
+        ).filter(
+            Notification.id.in_(notification_ids),
+            User.is_active == True
+        ).all()
+        
+        if channel == NotificationChannel.EMAIL.value:
+            sent_ids, errors = self._deliver_email_batch(rows)
+        elif channel == NotificationChannel.SMS.value:
+            sent_ids, errors = self._deliver_sms_batch(rows)
+        elif channel == NotificationChannel.IN_APP.value:
+            sent_ids, errors = self._deliver_websocket_batch(rows)
+        else:
+            sent_ids, errors = self._deliver_with_provider(channel, rows)
+        
+        delivered = set(sent_ids)
+        self._mark_notifications_sent(
+            sent_ids,
+            failed_ids=[notification.id for notification, _ in rows if notification.id not in delivered]
+        )
+        
+        return BulkNotificationResult(
+            total_sent=len(notification_ids),
+            successful=len(sent_ids),
+            failed=len(notification_ids) - len(sent_ids),
+            errors=errors,
+            notification_ids=sent_ids
+        )
+    
     def get_user_notifications(
         self,
         user_id: int,
@@ -915,38 +1068,32 @@ class NotificationService(BaseService):
             return [default_channel]
         
         preferences = self.get_user_preferences(user_id)
-        
-        # Lógica para determinar canales basado en:
-        # - Preferencias del usuario
-        # - Tipo de notificación
-        # - Prioridad
-        # - Horario (no molestar)
-        
-        channels = [NotificationChannel.IN_APP.value]  # Siempre incluir in-app
-        
-        # Email para notificaciones importantes
-        if preferences.email_enabled and type in [
-            NotificationType.PROJECT_APPROVED.value,
-            NotificationType.MENTORSHIP_SESSION_SCHEDULED.value,
-            NotificationType.PASSWORD_RESET.value
-        ]:
-            channels.append(NotificationChannel.EMAIL.value)
-        
-        # SMS para notificaciones críticas
-        if preferences.sms_enabled and type in [
-            NotificationType.SECURITY_ALERT.value,
-            NotificationType.EMERGENCY.value
-        ]:
-            channels.append(NotificationChannel.SMS.value)
-        
-        # Push para recordatorios
-        if preferences.push_enabled and type in [
-            NotificationType.MEETING_REMINDER.value,
-            NotificationType.TASK_DUE_SOON.value
-        ]:
-            channels.append(NotificationChannel.PUSH.value)
-        
-        return list(set(channels))  # Eliminar duplicados
+
+        return channels_for_preferences(type, self._preference_flags(preferences))
+
+    @staticmethod
+    def _preference_flags(preferences: NotificationPreference) -> dict[str, bool]:
+        """Flags de canal de una fila de preferencias"""
+        return {
+            key: bool(getattr(preferences, key, default))
+            for key, default in DEFAULT_CHANNEL_PREFERENCES.items()
+        }
+
+    def _resolve_bulk_preferences(self, user_ids: list[int], type: str) -> dict[int, dict[str, bool]]:
+        """
+        Preferencias de canal de un lote de usuarios con una sola consulta
+
+        La fila del tipo de notificación prevalece sobre las de otros tipos;
+        los usuarios sin filas usan ``DEFAULT_CHANNEL_PREFERENCES``.
+        """
+        rows = NotificationPreference.query.filter(
+            NotificationPreference.user_id.in_(user_ids)
+        ).all()
+
+        preferences = {}
+        for row in sorted(rows, key=lambda row: row.notification_type == type):
+            preferences[row.user_id] = self._preference_flags(row)
+        return preferences
     
     def _send_to_channels(
         self,
@@ -1065,6 +1212,136 @@ class NotificationService(BaseService):
         
         send_notification_task.delay(notification_id)
     
+    @retry_on_failure(max_retries=3, delay=60)
+    def _queue_notification_batch_async(self, channel: str, notification_ids: list) -> None:
+        """Encolar un grupo de notificaciones de un canal como una sola tarea"""
+        from app.tasks.notification_tasks import send_notification_batch
+        
+        send_notification_batch.delay(channel, [str(notification_id) for notification_id in notification_ids])
+    
+    def _deliver_email_batch(self, rows: list[tuple[Notification, User]]) -> tuple[list, list[str]]:
+        """Enviar un grupo por email con ``send_bulk`` del proveedor seleccionado"""
+        messages = []
+        message_ids = []
+        errors = []
+        
+        for notification, user in rows:
+            if not user.email or not validate_email(user.email):
+                errors.append(f"Usuario {user.id}: email inválido")
+                continue
+            messages.append(EmailMessage(
+                to=[EmailAddress(user.email)],
+                content=EmailContent(subject=notification.title, text_body=notification.message),
+                tags=[notification.type],
+                metadata={'notification_id': str(notification.id)}
+            ))
+            message_ids.append(notification.id)
+        
+        if not messages:
+            return [], errors
+        
+        email_service = self.providers[NotificationChannel.EMAIL.value].email_service
+        result = email_service.send_messages_bulk(messages)
+        errors.extend(result.errors)
+        
+        # Cada notificación sigue el resultado de su propio mensaje
+        return [
+            notification_id
+            for notification_id, message_result in zip(message_ids, result.results)
+            if message_result is not None and message_result.success
+        ], errors
+    
+    def _deliver_sms_batch(self, rows: list[tuple[Notification, User]]) -> tuple[list, list[str]]:
+        """Enviar un grupo por SMS dentro de la misma tarea"""
+        sms_service = self.providers[NotificationChannel.SMS.value].sms_service
+        sent_ids = []
+        errors = []
+        
+        for notification, user in rows:
+            if not user.phone or not validate_phone(user.phone):
+                errors.append(f"Usuario {user.id}: teléfono inválido")
+                continue
+            result = sms_service.send_sms(SMSMessage(
+                to=user.phone,
+                message=truncate_text(notification.message, 160),
+                user_id=user.id,
+                reference_id=str(notification.id)
+            ))
+            if result.success:
+                sent_ids.append(notification.id)
+            else:
+                errors.append(f"Usuario {user.id}: {result.error_message}")
+        
+        return sent_ids, errors
+    
+    def _deliver_websocket_batch(self, rows: list[tuple[Notification, User]]) -> tuple[list, list[str]]:
+        """Emitir un grupo por WebSocket a la sala de cada usuario"""
+        sent_ids = []
+        errors = []
+        
+        for notification, user in rows:
+            try:
+                socketio.emit(
+                    'notification',
+                    {
+                        'id': str(notification.id),
+                        'type': notification.type,
+                        'title': notification.title,
+                        'message': notification.message,
+                        'priority': notification.priority,
+                        'data': notification.data,
+                        'created_at': notification.created_at.isoformat()
+                    },
+                    room=f"user_{user.id}"
+                )
+                sent_ids.append(notification.id)
+            except Exception as e:
+                errors.append(f"Usuario {user.id}: {str(e)}")
+        
+        return sent_ids, errors
+    
+    def _deliver_with_provider(self, channel: str, rows: list[tuple[Notification, User]]) -> tuple[list, list[str]]:
+        """Enviar un grupo una a una con el proveedor de un canal sin API masiva"""
+        provider = self.providers.get(channel)
+        if provider is None:
+            return [], [f"Canal {channel} sin proveedor"]
+        
+        sent_ids = []
+        errors = []
+        for notification, user in rows:
+            result = asyncio.run(provider.send(notification))
+            if result.success:
+                sent_ids.append(notification.id)
+            else:
+                errors.append(f"Usuario {user.id}: {result.error_message}")
+        
+        return sent_ids, errors
+    
+    def _mark_notifications_sent(self, notification_ids: list, failed_ids: Optional[list] = None) -> None:
+        """
+        Registrar el resultado de cada notificación pendiente de un grupo
+        
+        Las entregadas pasan a ``sent`` y las fallidas a ``failed``, con una
+        actualización por estado.
+        """
+        updates = [
+            (notification_ids, {'status': NotificationStatus.SENT.value, 'sent_at': datetime.now(timezone.utc)}),
+            (failed_ids, {'status': NotificationStatus.FAILED.value})
+        ]
+        updated = False
+        
+        for ids, values in updates:
+            if not ids:
+                continue
+            Notification.query.filter(
+                Notification.id.in_(ids),
+                Notification.status == NotificationStatus.PENDING.value
+            ).update(values, synchronize_session=False)
+            updated = True
+        
+        if updated:
+            db.session.commit()
+    
     def _schedule_notification(
         self,
         notification: Notification,
@@ -0,0 +1,334 @@
+"""
+Servicio de hashing de contraseñas
+
+El hashing de contraseñas (scrypt/PBKDF2 con cientos de miles de
+iteraciones) es trabajo de CPU que no debe ocupar los hilos que atienden
+peticiones. Este servicio:
+
+- Ejecuta hash y verificación en un pool de procesos acotado; en el hilo de
+  la petición solo queda la espera del resultado.
+- Aplica control de admisión: como mucho ``max_workers + max_pending``
+  operaciones en curso; el resto espera ``admission_timeout`` segundos y,
+  si no hay hueco, se rechaza con ``RateLimitExceededError`` en lugar de
+  acumular cola (un pico de logins degrada con 429, no con timeouts).
+- Registra tiempos de cola y de cálculo (p50/p95/p99) y rechazos.
+- Mantiene una política de hash (``PASSWORD_HASH_METHOD``); los hashes
+  almacenados con otro método o coste se recalculan en el login correcto
+  (``verify_and_upgrade``).
+- ``calibrate`` mide en la máquina actual el coste que cabe en un
+  presupuesto de tiempo, para ajustar la política.
+
+Con ``max_workers=0`` el trabajo se hace en el hilo llamante (pruebas).
+
+Uso:
+    hasher = get_password_hasher()
+    ok, new_hash = hasher.verify_and_upgrade(password, user.password_hash)
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+from app.utils.crypto_utils import HashingError
+
+logger = logging.getLogger(__name__)
+
+# Política por defecto: la de werkzeug (mismo coste que generate_password_hash)
+DEFAULT_METHOD = 'scrypt'
+SCRYPT_DEFAULTS = (2 ** 15, 8, 1)
+TIMING_WINDOW = 1000
+
+
+def normalize_method(method: str) -> str:
+    """
+    Método completo con sus parámetros, en el formato del prefijo de los
+    hashes de werkzeug (``scrypt:32768:8:1``, ``pbkdf2:sha256:600000``).
+    """
+    name, *args = method.split(':')
+    if name == 'scrypt':
+        n, r, p = (list(map(int, args)) + list(SCRYPT_DEFAULTS)[len(args):])[:3]
+        return f'scrypt:{n}:{r}:{p}'
+    if name == 'pbkdf2':
+        digest = args[0] if args else 'sha256'
+        iterations = int(args[1]) if len(args) > 1 else DEFAULT_PBKDF2_ITERATIONS
+        return f'pbkdf2:{digest}:{iterations}'
+    raise ValueError(f"Método de hash no soportado: {method}")
+
+
+def _timed(fn: Callable, args: tuple) -> tuple[Any, float, float]:
+    """Ejecutar ``fn`` en el worker devolviendo inicio y fin (reloj de pared)."""
+    started = time.time()
+    result = fn(*args)
+    return result, started, time.time()
+
+
+# ====================================
+# MÉTRICAS
+# ====================================
+
+class HashingMetrics:
+    """Tiempos de cola y de cálculo de las operaciones de hashing (en el proceso)."""
+
+    def __init__(self, window: int = TIMING_WINDOW):
+        self._lock = threading.Lock()
+        self.queue_ms: deque = deque(maxlen=window)
+        self.run_ms: deque = deque(maxlen=window)
+        self.completed = 0
+        self.rejected = 0
+        self.in_flight = 0
+
+    def admitted(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def reject(self) -> None:
+        with self._lock:
+            self.rejected += 1
+
+    def record(self, queue_seconds: Optional[float] = None, run_seconds: Optional[float] = None) -> None:
+        """Cierra una operación admitida (sin tiempos si falló)."""
+        with self._lock:
+            self.in_flight -= 1
+            if queue_seconds is None:
+                return
+            self.completed += 1
+            self.queue_ms.append(max(0.0, queue_seconds) * 1000)
+            self.run_ms.append(run_seconds * 1000)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Operaciones, rechazos y percentiles de cola y cálculo (ms)."""
+        with self._lock:
+            return {
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'in_flight': self.in_flight,
+                'queue_ms': _percentiles(sorted(self.queue_ms)),
+                'run_ms': _percentiles(sorted(self.run_ms))
+            }
+
+
+def _percentiles(values: list[float]) -> dict[str, Optional[float]]:
+    def pick(fraction: float) -> Optional[float]:
+        if not values:
+            return None
+        return round(values[min(len(values) - 1, int(fraction * len(values)))], 1)
+
+    return {'p50': pick(0.5), 'p95': pick(0.95), 'p99': pick(0.99)}
+
+
+# ====================================
+# SERVICIO
+# ====================================
+
+class PasswordHashingService:
+    """
+    Hash y verificación de contraseñas fuera del hilo de la petición.
+
+    Args:
+        method: Política de hash (método de werkzeug)
+        max_workers: Procesos del pool (0 = en el hilo llamante)
+        max_pending: Operaciones que pueden esperar un worker libre
+        admission_timeout: Segundos de espera por un hueco antes de rechazar
+        executor_factory: Constructor del pool (recibe ``max_workers``)
+    """
+
+    def __init__(self, method: str = DEFAULT_METHOD, max_workers: Optional[int] = None,
+                 max_pending: Optional[int] = None, admission_timeout: float = 2.0,
+                 executor_factory: Optional[Callable[[int], Executor]] = None):
+        self.method = normalize_method(method)
+        self.max_workers = max(1, (os.cpu_count() or 2) // 2) if max_workers is None else max_workers
+        self.max_pending = self.max_workers * 4 if max_pending is None else max_pending
+        self.admission_timeout = admission_timeout
+        self.executor_factory = executor_factory or (lambda workers: ProcessPoolExecutor(max_workers=workers))
+        self.metrics = HashingMetrics()
+
+        self._slots = threading.BoundedSemaphore(max(1, self.max_workers + self.max_pending))
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    # ---- Pool ----
+
+    def _get_executor(self) -> Optional[Executor]:
+        if self.max_workers <= 0:
+            return None
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = self.executor_factory(self.max_workers)
+        return self._executor
+
+    def _discard_executor(self, executor: Executor) -> None:
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False)
+
+    def shutdown(self) -> None:
+        """Cerrar el pool (se vuelve a crear en el siguiente uso)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def run(self, fn: Callable, *args) -> Any:
+        """
+        Ejecutar ``fn(*args)`` en el pool con control de admisión.
+
+        ``fn`` debe ser una función de nivel de módulo (serializable).
+
+        Raises:
+            RateLimitExceededError: Si no hay hueco en ``admission_timeout``
+        """
+        if not self._slots.acquire(timeout=self.admission_timeout):
+            from app.core.exceptions import RateLimitExceededError
+
+            self.metrics.reject()
+            logger.warning("Pool de hashing de contraseñas saturado, operación rechazada")
+            raise RateLimitExceededError(
+                limit=self.max_workers + self.max_pending, window='password_hashing', retry_after=1
+            )
+
+        self.metrics.admitted()
+        timings = (None, None)
+        try:
+            submitted = time.time()
+            executor = self._get_executor()
+            if executor is None:
+                result, started, finished = _timed(fn, args)
+            else:
+                try:
+                    result, started, finished = executor.submit(_timed, fn, args).result()
+                except BrokenProcessPool as e:
+                    self._discard_executor(executor)
+                    raise HashingError("Pool de hashing de contraseñas caído") from e
+            timings = (started - submitted, finished - started)
+            return result
+        finally:
+            self.metrics.record(*timings)
+            self._slots.release()
+
+    # ---- Contraseñas ----
+
+    def hash(self, password: str) -> str:
+        """Hash con la política actual."""
+        return self.run(generate_password_hash, password, self.method)
+
+    def verify(self, password: str, stored_hash: str) -> bool:
+        """Verificar una contraseña contra un hash de werkzeug."""
+        if not password or not stored_hash:
+            return False
+        return self.run(check_password_hash, stored_hash, password)
+
+    def verify_salted(self, password: str, hashed_password: str, salt: bytes, algorithm=None) -> bool:
+        """Verificar un hash de ``crypto_utils.hash_password`` (hash y salt separados)."""
+        from app.utils.crypto_utils import verify_password
+
+        return self.run(verify_password, password, hashed_password, salt, algorithm)
+
+    def needs_rehash(self, stored_hash: str) -> bool:
+        """True si el hash almacenado no usa el método y coste de la política."""
+        try:
+            return normalize_method(stored_hash.split('$', 1)[0]) != self.method
+        except ValueError:
+            return True
+
+    def verify_and_upgrade(self, password: str, stored_hash: str) -> tuple[bool, Optional[str]]:
+        """
+        Verificar y, si es correcta y el hash está desactualizado, recalcularlo.
+
+        Returns:
+            Tupla (válida, nuevo hash o None)
+        """
+        if not self.verify(password, stored_hash):
+            return False, None
+        if not self.needs_rehash(stored_hash):
+            return True, None
+        return True, self.hash(password)
+
+
+# ====================================
+# CALIBRACIÓN
+# ====================================
+
+def calibrate(target_seconds: float = 0.25, algorithm: str = 'scrypt', samples: int = 3) -> dict[str, Any]:
+    """
+    Método de hash cuyo coste cabe en ``target_seconds`` en esta máquina.
+
+    Para scrypt se duplica ``n`` mientras el tiempo medido cabe en el
+    presupuesto; para PBKDF2 se escalan las iteraciones a partir de una
+    medida de referencia.
+
+    Returns:
+        Diccionario con ``method`` y ``seconds`` medidos
+    """
+    def measure(fn: Callable[[], Any]) -> float:
+        timings = []
+        for _ in range(samples):
+            started = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    password, salt = b'calibration-password', os.urandom(16)
+
+    if algorithm == 'scrypt':
+        _, r, p = SCRYPT_DEFAULTS
+        n = 2 ** 14
+        seconds = measure(lambda: hashlib.scrypt(password, salt=salt, n=n, r=r, p=p, maxmem=132 * n * r * p))
+        while True:
+            candidate = n * 2
+            elapsed = measure(lambda: hashlib.scrypt(
+                password, salt=salt, n=candidate, r=r, p=p, maxmem=132 * candidate * r * p
+            ))
+            if elapsed > target_seconds:
+                break
+            n, seconds = candidate, elapsed
+        return {'method': f'scrypt:{n}:{r}:{p}', 'seconds': round(seconds, 4)}
+
+    if algorithm == 'pbkdf2':
+        reference = 100_000
+        elapsed = measure(lambda: hashlib.pbkdf2_hmac('sha256', password, salt, reference))
+        iterations = max(reference, int(reference * target_seconds / elapsed) // 10_000 * 10_000)
+        seconds = measure(lambda: hashlib.pbkdf2_hmac('sha256', password, salt, iterations))
+        return {'method': f'pbkdf2:sha256:{iterations}', 'seconds': round(seconds, 4)}
+
+    raise ValueError(f"Algoritmo no soportado para calibración: {algorithm}")
+
+
+_hasher: Optional[PasswordHashingService] = None
+_hasher_lock = threading.Lock()
+
+
+def get_password_hasher() -> PasswordHashingService:
+    """Servicio compartido por el proceso, configurado desde la app."""
+    global _hasher
+    if _hasher is None:
+        from flask import current_app
+
+        config = current_app.config
+        with _hasher_lock:
+            if _hasher is None:
+                _hasher = PasswordHashingService(
+                    method=config.get('PASSWORD_HASH_METHOD', DEFAULT_METHOD),
+                    max_workers=config.get('PASSWORD_HASH_POOL_SIZE'),
+                    max_pending=config.get('PASSWORD_HASH_MAX_PENDING'),
+                    admission_timeout=config.get('PASSWORD_HASH_ADMISSION_TIMEOUT', 2.0)
+                )
+    return _hasher
+
+
+__all__ = [
+    'PasswordHashingService',
+    'HashingMetrics',
+    'normalize_method',
+    'calibrate',
+    'get_password_hasher'
+]
@@ -0,0 +1,287 @@
+"""
+Motor de estadísticas y burndown de tareas
+
+Las estadísticas se calculan en la base de datos con consultas agregadas:
+una agrupada por estado, prioridad y tipo (conteos, horas, progreso,
+vencidas, bloqueadas y tiempos de cierre) y otra con los indicadores de
+colaboración, de modo que un tablero de organización no carga miles de
+objetos ``Task``. El burndown solo lee tres columnas por tarea y se
+construye en una pasada sobre las líneas de tiempo ordenadas
+(``app.utils.burndown``).
+
+Los resultados se guardan en cache por filtros y por proyecto y sprint
+durante ``CACHE_TIMEOUT`` segundos.
+"""
+
+import logging
+from datetime import date, datetime, timezone
+from typing import Any, Optional
+
+from sqlalchemy import and_, case, cast, exists, func, or_, select, Integer
+from sqlalchemy.orm import aliased
+
+from app.extensions import db, cache
+from app.models.task import Task, TaskComment, TaskPriority, TaskStatus, task_assignees
+from app.utils.burndown import burndown_series, ideal_burndown
+
+logger = logging.getLogger(__name__)
+
+CACHE_TIMEOUT = 300
+
+HIGH_PRIORITIES = (TaskPriority.HIGH, TaskPriority.HIGHEST, TaskPriority.CRITICAL)
+CLOSED_STATUSES = (TaskStatus.COMPLETED, TaskStatus.CANCELLED, TaskStatus.ARCHIVED)
+
+
+def _cache_key(prefix: str, *parts) -> str:
+    return ':'.join([prefix, *('' if part is None else str(part) for part in parts)])
+
+
+def _count_if(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def _elapsed_seconds(end, start):
+    """Segundos entre dos columnas ``DateTime`` en PostgreSQL y en SQLite."""
+    if db.engine.dialect.name == 'sqlite':
+        return cast(func.strftime('%s', end), Integer) - cast(func.strftime('%s', start), Integer)
+    return func.extract('epoch', end - start)
+
+
+def _task_filters(organization_id: Optional[int], user_id: Optional[int], project_id: Optional[int],
+                  date_from: Optional[date], date_to: Optional[date]) -> list:
+    filters = [Task.is_deleted == False]
+
+    if organization_id:
+        filters.append(Task.organization_id == organization_id)
+
+    if user_id:
+        filters.append(or_(
+            Task.assignee_id == user_id,
+            Task.assignees.any(id=user_id),
+            Task.creator_id == user_id
+        ))
+
+    if project_id:
+        filters.append(Task.project_id == project_id)
+
+    if date_from:
+        filters.append(Task.created_at >= datetime.combine(date_from, datetime.min.time()))
+
+    if date_to:
+        filters.append(Task.created_at <= datetime.combine(date_to, datetime.max.time()))
+
+    return filters
+
+
+# ====================================
+# ESTADÍSTICAS
+# ====================================
+
+def get_task_statistics(organization_id: int = None, user_id: int = None,
+                        project_id: int = None, date_from: date = None,
+                        date_to: date = None, use_cache: bool = True) -> dict[str, Any]:
+    """
+    Obtener estadísticas de tareas con consultas agregadas
+
+    Args:
+        organization_id: Filtrar por organización
+        user_id: Tareas asignadas a o creadas por el usuario
+        project_id: Filtrar por proyecto
+        date_from: Creadas desde esta fecha
+        date_to: Creadas hasta esta fecha
+        use_cache: Reutilizar el resultado en cache si existe
+
+    Returns:
+        dict[str, Any]: Estadísticas (mismo formato que el cálculo por tarea)
+    """
+    key = _cache_key('task_stats', organization_id, user_id, project_id, date_from, date_to)
+    if use_cache:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    filters = _task_filters(organization_id, user_id, project_id, date_from, date_to)
+    stats = _compute_statistics(filters)
+    cache.set(key, stats, timeout=CACHE_TIMEOUT)
+    return stats
+
+
+def _compute_statistics(filters: list) -> dict[str, Any]:
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    overdue = and_(Task.due_date.isnot(None), Task.due_date < now, Task.status.notin_(CLOSED_STATUSES))
+    timed = and_(Task.status == TaskStatus.COMPLETED, Task.start_date.isnot(None), Task.completed_at.isnot(None))
+    # Días completos, como ``timedelta.days``
+    completion_days = func.floor(_elapsed_seconds(Task.completed_at, Task.start_date) / 86400.0)
+
+    groups = db.session.query(
+        Task.status,
+        Task.priority,
+        Task.task_type,
+        func.count(Task.id).label('tasks'),
+        _count_if(overdue).label('overdue'),
+        _count_if(Task.is_blocked == True).label('blocked'),
+        _count_if(timed).label('timed'),
+        func.coalesce(func.sum(case((timed, completion_days), else_=0)), 0).label('completion_days'),
+        func.coalesce(func.sum(Task.estimated_hours), 0).label('estimated_hours'),
+        func.coalesce(func.sum(Task.actual_hours), 0).label('actual_hours'),
+        _count_if(or_(Task.estimated_hours > 0, Task.actual_hours > 0)).label('tracked'),
+        func.coalesce(func.sum(Task.progress_percentage), 0).label('progress')
+    ).filter(*filters).group_by(Task.status, Task.priority, Task.task_type).all()
+
+    total_tasks = sum(group.tasks for group in groups)
+    if not total_tasks:
+        return {
+            'total_tasks': 0,
+            'completion_rate': 0,
+            'average_completion_time': 0,
+            'overdue_tasks': 0,
+            'blocked_tasks': 0
+        }
+
+    status_distribution: dict[str, int] = {}
+    priority_distribution: dict[str, int] = {}
+    type_distribution: dict[str, int] = {}
+    completed_tasks = high_priority = high_priority_completed = 0
+
+    for group in groups:
+        if group.status is not None:
+            status_distribution[group.status.value] = status_distribution.get(group.status.value, 0) + group.tasks
+        if group.priority is not None:
+            priority_distribution[group.priority.value] = priority_distribution.get(group.priority.value, 0) + group.tasks
+        if group.task_type is not None:
+            type_distribution[group.task_type.value] = type_distribution.get(group.task_type.value, 0) + group.tasks
+        if group.status == TaskStatus.COMPLETED:
+            completed_tasks += group.tasks
+        if group.priority in HIGH_PRIORITIES:
+            high_priority += group.tasks
+            if group.status == TaskStatus.COMPLETED:
+                high_priority_completed += group.tasks
+
+    timed_tasks = sum(group.timed for group in groups)
+    avg_completion_time = sum(group.completion_days for group in groups) / timed_tasks if timed_tasks else 0
+
+    total_estimated_hours = float(sum(group.estimated_hours for group in groups))
+    total_actual_hours = float(sum(group.actual_hours for group in groups))
+    time_variance = 0
+    if total_estimated_hours > 0:
+        time_variance = ((total_actual_hours - total_estimated_hours) / total_estimated_hours) * 100
+
+    collaboration = _collaboration_counts(filters)
+
+    return {
+        'total_tasks': total_tasks,
+        'completion_rate': round(completed_tasks / total_tasks * 100, 1),
+        'average_completion_time_days': round(float(avg_completion_time), 1),
+        'overdue_tasks': sum(group.overdue for group in groups),
+        'blocked_tasks': sum(group.blocked for group in groups),
+        'status_distribution': status_distribution,
+        'priority_distribution': priority_distribution,
+        'type_distribution': type_distribution,
+        'time_tracking': {
+            'total_estimated_hours': total_estimated_hours,
+            'total_actual_hours': total_actual_hours,
+            'time_variance_percentage': round(time_variance, 1),
+            'tasks_with_time_tracking': sum(group.tracked for group in groups)
+        },
+        'collaboration_metrics': {
+            **collaboration,
+            'collaboration_rate': round(collaboration['tasks_with_multiple_assignees'] / total_tasks * 100, 1)
+        },
+        'productivity_insights': {
+            'tasks_per_day': round(total_tasks / 30, 1),  # Último mes
+            'average_progress': round(float(sum(group.progress for group in groups)) / total_tasks, 1),
+            'high_priority_completion_rate': round(
+                high_priority_completed / high_priority * 100, 1
+            ) if high_priority else 0
+        }
+    }
+
+
+def _collaboration_counts(filters: list) -> dict[str, int]:
+    """Tareas con varios asignados, con comentarios y con subtareas (una consulta)"""
+    subtask = aliased(Task)
+    shared_tasks = select(task_assignees.c.task_id).group_by(
+        task_assignees.c.task_id
+    ).having(func.count() > 1)
+
+    row = db.session.query(
+        _count_if(Task.id.in_(shared_tasks)).label('tasks_with_multiple_assignees'),
+        _count_if(exists().where(TaskComment.task_id == Task.id)).label('tasks_with_comments'),
+        _count_if(and_(
+            Task.is_parent == True,
+            exists().where(subtask.parent_task_id == Task.id)
+        )).label('tasks_with_subtasks')
+    ).filter(*filters).one()
+
+    return {key: int(value) for key, value in row._mapping.items()}
+
+
+# ====================================
+# BURNDOWN
+# ====================================
+
+def generate_task_burndown_data(project_id: int, sprint_start: date,
+                                sprint_end: date, use_cache: bool = True) -> dict[str, Any]:
+    """
+    Generar datos para gráfico burndown de tareas
+
+    Args:
+        project_id: Proyecto
+        sprint_start: Primer día del sprint
+        sprint_end: Último día del sprint
+        use_cache: Reutilizar el resultado en cache si existe
+
+    Returns:
+        dict[str, Any]: Burndown real, ideal y resumen del sprint
+    """
+    key = _cache_key('task_burndown', project_id, sprint_start, sprint_end)
+    if use_cache:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    rows = db.session.query(
+        Task.created_at, Task.completed_at, Task.story_points, Task.status
+    ).filter(
+        Task.project_id == project_id,
+        Task.created_at <= datetime.combine(sprint_end, datetime.max.time()),
+        Task.is_deleted == False
+    ).all()
+
+    if not rows:
+        return {'error': 'No hay tareas en el proyecto'}
+
+    points = [row.story_points or 1 for row in rows]
+    actual = burndown_series(
+        [row.created_at for row in rows],
+        [row.completed_at for row in rows],
+        points,
+        sprint_start,
+        sprint_end
+    )
+
+    total_tasks = len(rows)
+    total_points = sum(points)
+    completed_tasks = sum(1 for row in rows if row.status == TaskStatus.COMPLETED)
+
+    data = {
+        'actual_burndown': actual,
+        'ideal_burndown': ideal_burndown([point['date'] for point in actual], total_tasks, total_points),
+        'sprint_summary': {
+            'start_date': sprint_start.isoformat(),
+            'end_date': sprint_end.isoformat(),
+            'total_tasks': total_tasks,
+            'total_story_points': total_points,
+            'completed_tasks': completed_tasks,
+            'completion_rate': completed_tasks / total_tasks * 100
+        }
+    }
+    cache.set(key, data, timeout=CACHE_TIMEOUT)
+    return data
+
+
+__all__ = [
+    'CACHE_TIMEOUT',
+    'get_task_statistics',
+    'generate_task_burndown_data'
+]
@@ -0,0 +1,325 @@
+"""
+Procesadores por lotes del mantenimiento de tareas
+
+Sustituyen el recorrido objeto a objeto de las tareas recurrentes y de las
+tareas padre por operaciones sobre conjuntos de ids:
+
+- Recurrencia: las plantillas vencidas de un bloque se leen con una
+  consulta (y sus asignados con otra), las ocurrencias se expanden en
+  memoria (``app.utils.recurrence``) y las instancias, sus asignados y la
+  próxima ocurrencia de cada plantilla se escriben con INSERT/UPDATE
+  multi-fila en una transacción por bloque.
+- Progreso de tareas padre: una consulta agregada sobre las subtareas del
+  bloque y un UPDATE masivo por clave primaria de los padres que cambian.
+
+Cada procesador devuelve un ``BatchStats`` con el tiempo empleado para
+poder medir el rendimiento por bloque.
+"""
+
+import logging
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from sqlalchemy import bindparam, case, func, insert, select, update
+
+from app.extensions import db
+from app.models.task import RecurrencePattern, Task, TaskStatus, task_assignees
+from app.utils.recurrence import expand_occurrences
+from app.utils.time_buckets import to_naive_utc
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 500
+MAX_INSTANCES_PER_TASK = 12
+
+# Estados en los que una tarea padre ya no se recalcula
+FINAL_STATUSES = (TaskStatus.COMPLETED, TaskStatus.CANCELLED, TaskStatus.ARCHIVED)
+
+DEFAULT_ASSIGNMENT_SETTINGS = {
+    'due_date_reminders': True,
+    'status_changes': True,
+    'comments': True
+}
+
+
+@dataclass
+class BatchStats:
+    """Resultado de procesar un bloque"""
+    items: int = 0
+    changed: int = 0
+    seconds: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+# Las escrituras masivas usan sentencias Core sobre la tabla: el bulk ORM
+# evalúa a nivel de clase todas las hybrid properties de Task y algunas no
+# lo admiten.
+_tasks_table = Task.__table__
+
+
+def _update_by_id(rows: list[dict[str, Any]]):
+    """UPDATE por clave primaria de filas con las mismas columnas (``id`` incluido)."""
+    db.session.execute(
+        update(_tasks_table).where(_tasks_table.c.id == bindparam('_task_pk')),
+        [{'_task_pk': row['id'], **{key: value for key, value in row.items() if key != 'id'}} for row in rows]
+    )
+
+
+# ====================================
+# TAREAS RECURRENTES
+# ====================================
+
+def list_due_recurring_task_ids(now: Optional[datetime] = None) -> list[int]:
+    """IDs de las tareas recurrentes cuya próxima ocurrencia ya llegó"""
+    now = to_naive_utc(now) if now else _utcnow()
+    return list(db.session.execute(
+        select(Task.id).where(
+            Task.recurrence_pattern != RecurrencePattern.NONE,
+            Task.next_occurrence_date <= now,
+            Task.is_deleted == False
+        ).order_by(Task.id)
+    ).scalars())
+
+
+def expand_recurring_tasks(task_ids: list[int], now: Optional[datetime] = None,
+                           max_instances: int = MAX_INSTANCES_PER_TASK) -> BatchStats:
+    """
+    Crear las instancias pendientes de un bloque de tareas recurrentes
+
+    Solo se procesan las tareas que siguen vencidas, de modo que repetir un
+    bloque ya confirmado no duplica instancias.
+
+    Args:
+        task_ids: IDs de las tareas recurrentes (plantillas)
+        now: Instante hasta el que se generan instancias
+        max_instances: Máximo de instancias por tarea
+
+    Returns:
+        BatchStats: ``changed`` es el número de instancias creadas
+    """
+    started = time.perf_counter()
+    now = to_naive_utc(now) if now else _utcnow()
+
+    templates = db.session.execute(
+        select(
+            Task.id, Task.title, Task.description, Task.task_type, Task.category,
+            Task.priority, Task.creator_id, Task.assignee_id, Task.estimated_hours,
+            Task.story_points, Task.project_id, Task.program_id, Task.organization_id,
+            Task.recurrence_pattern, Task.recurrence_settings, Task.next_occurrence_date
+        ).where(
+            Task.id.in_(task_ids),
+            Task.recurrence_pattern != RecurrencePattern.NONE,
+            Task.next_occurrence_date <= now,
+            Task.is_deleted == False
+        )
+    ).all()
+
+    assignees: dict[int, list[int]] = {}
+    for task_id, user_id in db.session.execute(
+        select(task_assignees.c.task_id, task_assignees.c.user_id).where(
+            task_assignees.c.task_id.in_([template.id for template in templates]),
+            task_assignees.c.is_active == True
+        )
+    ):
+        assignees.setdefault(task_id, []).append(user_id)
+
+    instance_rows = []
+    instance_templates = []
+    next_occurrences = []
+
+    for template in templates:
+        due_dates, following = expand_occurrences(
+            template.recurrence_pattern.value,
+            to_naive_utc(template.next_occurrence_date),
+            now,
+            template.recurrence_settings,
+            max_instances
+        )
+        next_occurrences.append({'id': template.id, 'next_occurrence_date': following})
+
+        for due_date in due_dates:
+            instance_rows.append({
+                'title': template.title,
+                'description': template.description,
+                'task_type': template.task_type,
+                'category': template.category,
+                'priority': template.priority,
+                'creator_id': template.creator_id,
+                'assignee_id': template.assignee_id,
+                'due_date': due_date,
+                'start_date': now,
+                'estimated_hours': template.estimated_hours,
+                'story_points': template.story_points,
+                'parent_recurring_task_id': template.id,
+                'project_id': template.project_id,
+                'program_id': template.program_id,
+                'organization_id': template.organization_id,
+                'completion_criteria': [],
+                'acceptance_criteria': []
+            })
+            instance_templates.append(template)
+
+    try:
+        if instance_rows:
+            instance_ids = db.session.execute(
+                insert(_tasks_table).returning(_tasks_table.c.id, sort_by_parameter_order=True),
+                instance_rows
+            ).scalars().all()
+
+            assignment_rows = [
+                {
+                    'task_id': instance_id,
+                    'user_id': user_id,
+                    'role': 'assignee',
+                    'assigned_by_id': template.creator_id,
+                    'notification_settings': DEFAULT_ASSIGNMENT_SETTINGS
+                }
+                for instance_id, template in zip(instance_ids, instance_templates)
+                for user_id in assignees.get(template.id, [])
+            ]
+            if assignment_rows:
+                db.session.execute(task_assignees.insert(), assignment_rows)
+
+        if next_occurrences:
+            _update_by_id(next_occurrences)
+
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    return BatchStats(
+        items=len(templates),
+        changed=len(instance_rows),
+        seconds=time.perf_counter() - started
+    )
+
+
+# ====================================
+# PROGRESO DE TAREAS PADRE
+# ====================================
+
+def list_active_parent_task_ids() -> list[int]:
+    """IDs de las tareas padre que aún pueden cambiar de progreso"""
+    return list(db.session.execute(
+        select(Task.id).where(
+            Task.is_parent == True,
+            Task.status.notin_(FINAL_STATUSES),
+            Task.is_deleted == False
+        ).order_by(Task.id)
+    ).scalars())
+
+
+def rollup_parent_state(status: TaskStatus, progress: Optional[float], start_date: Optional[datetime],
+                        subtasks: int, average_progress: float, completed: int, in_progress: int,
+                        now: datetime) -> Optional[dict[str, Any]]:
+    """
+    Nuevo estado de una tarea padre a partir del agregado de sus subtareas
+
+    Misma regla que ``Task._update_parent_progress``: el progreso es la media
+    de las subtareas activas; con todas completadas el padre se completa y
+    con alguna completada o en curso pasa de no iniciada a en progreso.
+
+    Returns:
+        Valores a actualizar o None si no cambia nada
+    """
+    if not subtasks:
+        return None
+
+    values: dict[str, Any] = {}
+    new_progress = round(float(average_progress or 0), 1)
+    if new_progress != progress:
+        values['progress_percentage'] = new_progress
+
+    if completed == subtasks:
+        if status != TaskStatus.COMPLETED:
+            values['status'] = TaskStatus.COMPLETED
+            values['completed_at'] = now
+    elif (completed or in_progress) and status == TaskStatus.NOT_STARTED:
+        values['status'] = TaskStatus.IN_PROGRESS
+        if not start_date:
+            values['start_date'] = now
+
+    return values or None
+
+
+def rollup_parent_progress(parent_ids: list[int], now: Optional[datetime] = None) -> BatchStats:
+    """
+    Recalcular el progreso de un bloque de tareas padre
+
+    Returns:
+        BatchStats: ``changed`` es el número de padres actualizados
+    """
+    started = time.perf_counter()
+    now = to_naive_utc(now) if now else _utcnow()
+
+    aggregates = {
+        row.parent_task_id: row
+        for row in db.session.execute(
+            select(
+                Task.parent_task_id,
+                func.count(Task.id).label('subtasks'),
+                func.avg(func.coalesce(Task.progress_percentage, 0)).label('average_progress'),
+                func.sum(case((Task.status == TaskStatus.COMPLETED, 1), else_=0)).label('completed'),
+                func.sum(case((Task.status == TaskStatus.IN_PROGRESS, 1), else_=0)).label('in_progress')
+            ).where(
+                Task.parent_task_id.in_(parent_ids),
+                Task.is_deleted == False
+            ).group_by(Task.parent_task_id)
+        )
+    }
+
+    parents = db.session.execute(
+        select(Task.id, Task.status, Task.progress_percentage, Task.start_date).where(
+            Task.id.in_(list(aggregates))
+        )
+    ).all()
+
+    updates = []
+    for parent in parents:
+        aggregate = aggregates[parent.id]
+        values = rollup_parent_state(
+            parent.status, parent.progress_percentage, parent.start_date,
+            aggregate.subtasks, aggregate.average_progress,
+            aggregate.completed, aggregate.in_progress, now
+        )
+        if values:
+            updates.append({'id': parent.id, **values})
+
+    try:
+        # Agrupar por columnas para que cada grupo sea un único executemany
+        by_columns: dict[tuple, list[dict[str, Any]]] = {}
+        for values in updates:
+            by_columns.setdefault(tuple(sorted(values)), []).append(values)
+        for rows in by_columns.values():
+            _update_by_id(rows)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    return BatchStats(
+        items=len(parent_ids),
+        changed=len(updates),
+        seconds=time.perf_counter() - started
+    )
+
+
+__all__ = [
+    'CHUNK_SIZE',
+    'MAX_INSTANCES_PER_TASK',
+    'BatchStats',
+    'list_due_recurring_task_ids',
+    'expand_recurring_tasks',
+    'list_active_parent_task_ids',
+    'rollup_parent_state',
+    'rollup_parent_progress'
+]
@@ -33,6 +33,7 @@ from app.core.exceptions import (
     DuplicateUserError,
     AuthenticationError,
     PermissionError,
+    RateLimitExceededError,
     ServiceError
 )
 from app.core.constants import (
@@ -212,7 +213,8 @@ class UserService(BaseService):
             logger.info(f"Login exitoso: {user.email}")
             return user, session_token
             
-        except AuthenticationError:
+        except (AuthenticationError, RateLimitExceededError):
+            # La saturación del pool de hashing debe llegar al cliente como 429
             raise
         except Exception as e:
             logger.error(f"Error en autenticación: {str(e)}")
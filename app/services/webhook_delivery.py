@@ -0,0 +1,684 @@
+"""
+Motor de entrega de webhooks salientes
+
+Sustituye la tarea de Celery por evento y por suscriptor por colas por
+destino:
+
+- ``publish`` añade el evento a la cola de cada destino suscrito (una
+  lista en Redis compartida por los workers) y programa como mucho un vaciado
+  por destino e intervalo, de modo que los eventos frecuentes (usuario o
+  proyecto actualizado) no generan un mensaje en el broker por suscriptor.
+- ``flush`` vacía la cola de un destino: con ``batch`` todos los eventos
+  van en un único POST (``{"events": [...]}``); sin él se envían en
+  paralelo con un máximo de ``max_concurrency`` peticiones simultáneas. Si
+  queda cola, el propio vaciado programa el siguiente sin deduplicar.
+- Los eventos reservados por un vaciado pasan a una lista de
+  procesamiento hasta que se confirma su entrega; si el worker muere, el
+  barrido periódico (``sweep``) los devuelve a la cola al vencer su plazo y
+  programa el vaciado de toda cola que siga con eventos.
+- Cada destino tiene su propia sesión HTTP con un pool de conexiones
+  keep-alive del tamaño de su concurrencia (sin un handshake TLS por envío).
+- El límite de envíos por destino se comprueba con un contador atómico
+  (``IntegrationRateLimiter``); los envíos que lo superan se aplazan hasta
+  que se reinicia la ventana del límite.
+- Los fallos recuperables (red, 429, 5xx) se reintentan con backoff
+  exponencial con jitter hasta ``max_attempts``; el resto se descartan.
+- Las peticiones, latencias y resultados por destino se exportan a
+  Prometheus (``app.utils.monitoring``); ``DeliveryMetrics`` guarda además
+  la vista local del worker que devuelven las tareas.
+
+La cola, el limitador y el programador de vaciados son inyectables, de modo
+que el motor se puede probar contra un servidor HTTP local.
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.utils.monitoring import (
+    outbound_webhook_events_total,
+    outbound_webhook_request_duration_seconds,
+    outbound_webhook_requests_total
+)
+
+logger = logging.getLogger(__name__)
+
+QUEUE_KEY_PREFIX = 'webhook_outbound'
+LATENCY_WINDOW = 500
+RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+RATE_LIMIT_WINDOW = 60
+# Segundos que un lote reservado puede estar sin confirmar antes de volver a la cola
+PROCESSING_TIMEOUT = 300
+
+
+@dataclass
+class OutboundDestination:
+    """
+    Destino de webhooks salientes.
+
+    Attributes:
+        name: Nombre único del destino
+        url: URL a la que se envían los eventos
+        events: Tipos de evento suscritos (valores de ``WebhookEvent``)
+        secret: Secreto para firmar el cuerpo (HMAC-SHA256)
+        headers: Cabeceras adicionales
+        batch: Agrupar los eventos de un intervalo en un único POST
+        batch_interval: Segundos entre vaciados de la cola
+        max_batch_size: Eventos por POST (o por vaciado sin ``batch``)
+        max_concurrency: Peticiones simultáneas y tamaño del pool
+        rate_limit: Peticiones por minuto (None sin límite)
+        timeout: Timeout de cada petición (segundos)
+        max_attempts: Intentos antes de descartar un evento
+    """
+    name: str
+    url: str
+    events: list[str] = field(default_factory=list)
+    secret: Optional[str] = None
+    headers: dict[str, str] = field(default_factory=dict)
+    batch: bool = False
+    batch_interval: int = 5
+    max_batch_size: int = 100
+    max_concurrency: int = 4
+    rate_limit: Optional[int] = None
+    timeout: int = 10
+    max_attempts: int = 5
+    active: bool = True
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class DeliveryResult:
+    """Resultado de entregar un lote de eventos a un destino"""
+    destination: str
+    delivered: int = 0
+    failed: int = 0
+    deferred: int = 0
+    dropped: int = 0
+    requests: int = 0
+    retry_items: list[dict[str, Any]] = field(default_factory=list)
+    retry_in_seconds: Optional[int] = None
+
+    def to_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data['retry_items'] = len(self.retry_items)
+        return data
+
+
+# ====================================
+# MÉTRICAS
+# ====================================
+
+class DeliveryMetrics:
+    """
+    Latencias y fallos de entrega por destino.
+
+    Cada petición se exporta a Prometheus, que agrega todos los workers;
+    ``snapshot`` solo refleja las peticiones de este proceso.
+    """
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.window = window
+        self._lock = threading.Lock()
+        self._stats: dict[str, dict[str, Any]] = {}
+
+    def record(self, destination: str, latency_ms: float, success: bool, events: int = 1,
+               status_code: Optional[int] = None) -> None:
+        outbound_webhook_requests_total.labels(
+            destination=destination, status=str(status_code) if status_code else 'network_error'
+        ).inc()
+        outbound_webhook_request_duration_seconds.labels(destination=destination).observe(latency_ms / 1000)
+
+        with self._lock:
+            stats = self._stats.setdefault(destination, {
+                'requests': 0, 'failures': 0, 'events': 0,
+                'last_status': None, 'latencies': deque(maxlen=self.window)
+            })
+            stats['requests'] += 1
+            stats['events'] += events
+            stats['last_status'] = status_code
+            stats['latencies'].append(latency_ms)
+            if not success:
+                stats['failures'] += 1
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Peticiones, fallos y percentiles de latencia (ms) por destino en este proceso."""
+        with self._lock:
+            result = {}
+            for destination, stats in self._stats.items():
+                latencies = sorted(stats['latencies'])
+                result[destination] = {
+                    'requests': stats['requests'],
+                    'events': stats['events'],
+                    'failures': stats['failures'],
+                    'failure_rate': round(stats['failures'] / stats['requests'], 4),
+                    'last_status': stats['last_status'],
+                    'latency_ms': {
+                        'p50': _percentile(latencies, 0.5),
+                        'p95': _percentile(latencies, 0.95),
+                        'max': round(latencies[-1], 1) if latencies else None
+                    }
+                }
+            return result
+
+
+def _percentile(values: list[float], fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    return round(values[min(len(values) - 1, int(fraction * len(values)))], 1)
+
+
+# ====================================
+# COLAS POR DESTINO
+# ====================================
+
+class MemoryOutboundQueue:
+    """
+    Colas y destinos en memoria, solo para pruebas.
+
+    Los eventos no se comparten entre procesos ni sobreviven a un reinicio.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queues: dict[str, deque] = {}
+        self._processing: dict[str, dict[str, tuple[float, list[dict[str, Any]]]]] = {}
+        self._destinations: dict[str, dict[str, Any]] = {}
+
+    def push(self, name: str, items: list[dict[str, Any]]) -> None:
+        with self._lock:
+            self._queues.setdefault(name, deque()).extend(items)
+
+    def claim(self, name: str, limit: int, timeout: int = PROCESSING_TIMEOUT) -> tuple[Optional[str], list[dict[str, Any]]]:
+        with self._lock:
+            queue = self._queues.get(name) or deque()
+            items = [queue.popleft() for _ in range(min(limit, len(queue)))]
+            if not items:
+                return None, []
+            token = uuid.uuid4().hex
+            self._processing.setdefault(name, {})[token] = (time.time() + timeout, items)
+            return token, items
+
+    def ack(self, name: str, token: Optional[str]) -> None:
+        with self._lock:
+            self._processing.get(name, {}).pop(token, None)
+
+    def requeue_expired(self, name: str, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        with self._lock:
+            batches = self._processing.get(name, {})
+            expired = sorted(
+                (token for token, (deadline, _) in batches.items() if deadline <= now),
+                key=lambda token: batches[token][0], reverse=True
+            )
+            queue = self._queues.setdefault(name, deque())
+            requeued = 0
+            for token in expired:
+                _, items = batches.pop(token)
+                queue.extendleft(reversed(items))
+                requeued += len(items)
+            return requeued
+
+    def size(self, name: str) -> int:
+        return len(self._queues.get(name) or ())
+
+    def pending_destinations(self) -> list[str]:
+        with self._lock:
+            names = {name for name, queue in self._queues.items() if queue}
+            names.update(name for name, batches in self._processing.items() if batches)
+            return sorted(names)
+
+    def save_destination(self, destination: OutboundDestination) -> None:
+        self._destinations[destination.name] = destination.to_dict()
+
+    def load_destination(self, name: str) -> Optional[OutboundDestination]:
+        data = self._destinations.get(name)
+        return OutboundDestination(**data) if data else None
+
+
+# Mover un lote de la cola a su lista de procesamiento en un solo paso
+_CLAIM_SCRIPT = """
+local items = redis.call('LRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1)
+if #items == 0 then
+    return items
+end
+redis.call('LTRIM', KEYS[1], #items, -1)
+redis.call('RPUSH', KEYS[2], unpack(items))
+redis.call('ZADD', KEYS[3], ARGV[2], ARGV[3])
+return items
+"""
+
+# Devolver un lote sin confirmar al principio de la cola, en su orden
+_REQUEUE_SCRIPT = """
+local items = redis.call('LRANGE', KEYS[2], 0, -1)
+for index = #items, 1, -1 do
+    redis.call('LPUSH', KEYS[1], items[index])
+end
+redis.call('DEL', KEYS[2])
+redis.call('ZREM', KEYS[3], ARGV[1])
+return #items
+"""
+
+
+class RedisOutboundQueue:
+    """
+    Colas por destino en listas de Redis compartidas por los workers.
+
+    Un lote reservado se mueve a ``{prefix}:processing:{destino}:{token}`` y
+    su plazo se anota en ``{prefix}:inflight:{destino}``; ``ack`` lo borra al
+    terminar la entrega y ``requeue_expired`` devuelve a la cola los lotes
+    de workers que murieron antes de confirmarlos.
+    """
+
+    def __init__(self, client, prefix: str = QUEUE_KEY_PREFIX):
+        self.client = client
+        self.prefix = prefix
+        self._claim = client.register_script(_CLAIM_SCRIPT)
+        self._requeue = client.register_script(_REQUEUE_SCRIPT)
+
+    def _key(self, name: str) -> str:
+        return f'{self.prefix}:queue:{name}'
+
+    def _processing_key(self, name: str, token: str) -> str:
+        return f'{self.prefix}:processing:{name}:{token}'
+
+    def _inflight_key(self, name: str) -> str:
+        return f'{self.prefix}:inflight:{name}'
+
+    def push(self, name: str, items: list[dict[str, Any]]) -> None:
+        if items:
+            self.client.rpush(self._key(name), *(json.dumps(item, default=str) for item in items))
+
+    def claim(self, name: str, limit: int, timeout: int = PROCESSING_TIMEOUT) -> tuple[Optional[str], list[dict[str, Any]]]:
+        token = uuid.uuid4().hex
+        raw_items = self._claim(
+            keys=[self._key(name), self._processing_key(name, token), self._inflight_key(name)],
+            args=[limit, time.time() + timeout, token]
+        )
+        if not raw_items:
+            return None, []
+        return token, [json.loads(raw) for raw in raw_items]
+
+    def ack(self, name: str, token: Optional[str]) -> None:
+        if token is None:
+            return
+        pipeline = self.client.pipeline(transaction=True)
+        pipeline.delete(self._processing_key(name, token))
+        pipeline.zrem(self._inflight_key(name), token)
+        pipeline.execute()
+
+    def requeue_expired(self, name: str, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        # Del más reciente al más antiguo: el más antiguo queda al principio
+        tokens = self.client.zrevrangebyscore(self._inflight_key(name), now, '-inf')
+        return sum(
+            int(self._requeue(
+                keys=[self._key(name), self._processing_key(name, token), self._inflight_key(name)],
+                args=[token]
+            ))
+            for token in tokens
+        )
+
+    def size(self, name: str) -> int:
+        return int(self.client.llen(self._key(name)))
+
+    def pending_destinations(self) -> list[str]:
+        # Redis borra las listas vacías: toda clave de cola tiene eventos
+        names = set()
+        for kind in ('queue', 'inflight'):
+            prefix = f'{self.prefix}:{kind}:'
+            names.update(
+                key[len(prefix):] for key in self.client.scan_iter(match=f'{prefix}*', count=500)
+            )
+        return sorted(names)
+
+    def save_destination(self, destination: OutboundDestination) -> None:
+        self.client.hset(f'{self.prefix}:destinations', destination.name, json.dumps(destination.to_dict()))
+
+    def load_destination(self, name: str) -> Optional[OutboundDestination]:
+        raw = self.client.hget(f'{self.prefix}:destinations', name)
+        return OutboundDestination(**json.loads(raw)) if raw else None
+
+
+def _default_queue():
+    """
+    Colas en Redis; en memoria solo con la aplicación en modo testing.
+
+    Raises:
+        RuntimeError: Si Redis no está disponible fuera de las pruebas: con
+            colas en memoria el worker que vacía la cola no vería los
+            eventos encolados por la web y se perderían sin aviso.
+    """
+    from flask import current_app, has_app_context
+    from app import extensions
+
+    if extensions.redis_client is not None:
+        return RedisOutboundQueue(extensions.redis_client)
+    if has_app_context() and current_app.testing:
+        return MemoryOutboundQueue()
+    raise RuntimeError("Redis no disponible: los webhooks salientes requieren Redis para sus colas")
+
+
+def _schedule_flush(name: str, countdown: int, dedupe: bool = True) -> bool:
+    """
+    Programar un vaciado del destino.
+
+    Args:
+        dedupe: Como mucho un vaciado por intervalo (publicaciones). El
+            vaciado que deja cola se reprograma sin deduplicar: su clave
+            puede seguir viva y la cola quedaría parada.
+    """
+    from app.extensions import cache
+    from app.tasks.integration_tasks import flush_outbound_webhooks
+
+    if dedupe and not cache.add(f'{QUEUE_KEY_PREFIX}:flush:{name}', 1, timeout=max(countdown, 1)):
+        return False
+    flush_outbound_webhooks.apply_async(args=[name], countdown=countdown)
+    return True
+
+
+# ====================================
+# MOTOR DE ENTREGA
+# ====================================
+
+class OutboundDeliveryEngine:
+    """
+    Entrega de webhooks salientes por destino.
+
+    Args:
+        queue: Colas por destino (Redis por defecto)
+        rate_limiter: Objeto con ``is_allowed(name, user_id, endpoint)`` y
+            ``seconds_until_reset(window)`` (``IntegrationRateLimiter`` por
+            defecto)
+        flush_scheduler: ``callable(name, countdown, dedupe=True)`` que
+            programa el vaciado
+        metrics: Registro de latencias y fallos
+        base_retry_delay: Retardo base (segundos) del backoff exponencial
+        max_retry_delay: Retardo máximo (segundos)
+    """
+
+    def __init__(
+        self,
+        queue=None,
+        rate_limiter=None,
+        flush_scheduler: Optional[Callable[..., Any]] = None,
+        metrics: Optional[DeliveryMetrics] = None,
+        base_retry_delay: int = 2,
+        max_retry_delay: int = 600
+    ):
+        self._queue = queue
+        self._rate_limiter = rate_limiter
+        self.flush_scheduler = flush_scheduler or _schedule_flush
+        self.metrics = metrics or DeliveryMetrics()
+        self.base_retry_delay = base_retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.destinations: dict[str, OutboundDestination] = {}
+        self._sessions: dict[str, requests.Session] = {}
+        self._sessions_lock = threading.Lock()
+
+    @property
+    def queue(self):
+        if self._queue is None:
+            self._queue = _default_queue()
+        return self._queue
+
+    @property
+    def rate_limiter(self):
+        if self._rate_limiter is None:
+            from app.services.integration_hub import rate_limiter
+            self._rate_limiter = rate_limiter
+        return self._rate_limiter
+
+    # ----- Destinos -----
+
+    def register(self, destination: OutboundDestination) -> None:
+        """Registrar un destino y compartir su configuración con los workers."""
+        self.destinations[destination.name] = destination
+        self.queue.save_destination(destination)
+
+    def get_destination(self, name: str) -> Optional[OutboundDestination]:
+        destination = self.destinations.get(name)
+        if destination is None:
+            destination = self.queue.load_destination(name)
+            if destination is not None:
+                self.destinations[name] = destination
+        return destination
+
+    def _session(self, destination: OutboundDestination) -> requests.Session:
+        """Sesión keep-alive por destino con un pool del tamaño de su concurrencia."""
+        with self._sessions_lock:
+            session = self._sessions.get(destination.name)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=destination.max_concurrency,
+                    max_retries=0
+                )
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._sessions[destination.name] = session
+            return session
+
+    def close(self) -> None:
+        with self._sessions_lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+    # ----- Publicación -----
+
+    def publish(self, event: str, data: dict[str, Any], user_id: Optional[int] = None,
+                timestamp: Optional[datetime] = None) -> int:
+        """
+        Encolar un evento para todos los destinos suscritos.
+
+        Returns:
+            int: Número de destinos a los que se encoló
+        """
+        item = {
+            'event': event,
+            'data': data,
+            'user_id': user_id,
+            'timestamp': (timestamp or datetime.now(timezone.utc)).isoformat(),
+            'attempt': 0
+        }
+
+        queued = 0
+        for destination in self.destinations.values():
+            if not destination.active or event not in destination.events:
+                continue
+            self.queue.push(destination.name, [item])
+            self.flush_scheduler(destination.name, destination.batch_interval if destination.batch else 0)
+            queued += 1
+        return queued
+
+    def flush(self, name: str,
+              on_result: Optional[Callable[[OutboundDestination, DeliveryResult], Any]] = None) -> DeliveryResult:
+        """
+        Vaciar la cola de un destino y entregar sus eventos.
+
+        Args:
+            name: Destino
+            on_result: ``callable(destination, result)`` que se ejecuta antes
+                de confirmar el lote (programar reintentos): si el worker
+                muere antes, el lote vuelve a la cola
+        """
+        destination = self.get_destination(name)
+        if destination is None:
+            logger.warning(f"Destino de webhook desconocido: {name}")
+            return DeliveryResult(destination=name)
+
+        limit = destination.max_batch_size
+        if not destination.batch:
+            limit = max(limit, destination.max_concurrency)
+        token, items = self.queue.claim(name, limit)
+        result = self.deliver(destination, items)
+        if on_result is not None:
+            on_result(destination, result)
+        self.queue.ack(name, token)
+
+        if self.queue.size(name):
+            self.flush_scheduler(name, destination.batch_interval if destination.batch else 0, dedupe=False)
+        return result
+
+    def sweep(self, now: Optional[float] = None) -> list[str]:
+        """
+        Recuperar lotes sin confirmar y programar el vaciado de las colas con eventos.
+
+        Returns:
+            Destinos con un vaciado programado
+        """
+        scheduled = []
+        for name in self.queue.pending_destinations():
+            requeued = self.queue.requeue_expired(name, now)
+            if requeued:
+                logger.warning(f"Webhooks a {name}: {requeued} eventos sin confirmar devueltos a la cola")
+            destination = self.get_destination(name)
+            if destination is None or not self.queue.size(name):
+                continue
+            if self.flush_scheduler(name, 0):
+                scheduled.append(name)
+        return scheduled
+
+    # ----- Entrega -----
+
+    def retry_delay(self, attempt: int) -> int:
+        """Backoff exponencial con jitter (segundos)."""
+        delay = min(self.base_retry_delay * (2 ** attempt), self.max_retry_delay)
+        return int(delay / 2 + random.uniform(0, delay / 2))
+
+    def deliver(self, destination: OutboundDestination, items: list[dict[str, Any]]) -> DeliveryResult:
+        """
+        Entregar eventos a un destino.
+
+        Los eventos que fallan de forma recuperable vuelven en
+        ``retry_items`` con el intento incrementado; los aplazados por el
+        límite vuelven sin incrementarlo. ``retry_in_seconds`` cubre el
+        backoff de los fallos y, si hay aplazados, el reinicio de la ventana
+        del límite.
+        """
+        result = DeliveryResult(destination=destination.name)
+        if not items:
+            return result
+
+        if destination.batch:
+            groups = [items[start:start + destination.max_batch_size]
+                      for start in range(0, len(items), destination.max_batch_size)]
+        else:
+            groups = [[item] for item in items]
+
+        allowed = []
+        for group in groups:
+            if destination.rate_limit and not self.rate_limiter.is_allowed(
+                destination.name, 0, 'outbound', limit=destination.rate_limit, window=RATE_LIMIT_WINDOW
+            ):
+                result.deferred += len(group)
+                result.retry_items.extend(group)
+            else:
+                allowed.append(group)
+
+        workers = max(1, min(destination.max_concurrency, len(allowed)))
+        if workers == 1:
+            outcomes = [self._post(destination, group) for group in allowed]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                outcomes = list(executor.map(lambda group: self._post(destination, group), allowed))
+
+        failed_attempt = None
+        for group, (success, retryable) in zip(allowed, outcomes):
+            result.requests += 1
+            if success:
+                result.delivered += len(group)
+                continue
+
+            result.failed += len(group)
+            for item in group:
+                attempt = item.get('attempt', 0) + 1
+                if retryable and attempt < destination.max_attempts:
+                    result.retry_items.append({**item, 'attempt': attempt})
+                    failed_attempt = max(failed_attempt or 0, attempt)
+                else:
+                    result.dropped += 1
+
+        for outcome in ('delivered', 'failed', 'deferred', 'dropped'):
+            count = getattr(result, outcome)
+            if count:
+                outbound_webhook_events_total.labels(destination=destination.name, outcome=outcome).inc(count)
+
+        if result.dropped:
+            logger.error(f"Webhook {destination.name}: {result.dropped} eventos descartados")
+
+        retry_delays = []
+        if failed_attempt is not None:
+            retry_delays.append(self.retry_delay(failed_attempt))
+        if result.deferred:
+            # Reintentar antes del reinicio de la ventana solo volvería a aplazarlos
+            retry_delays.append(self.rate_limiter.seconds_until_reset(RATE_LIMIT_WINDOW))
+        if retry_delays:
+            result.retry_in_seconds = max(retry_delays)
+        return result
+
+    def _body(self, destination: OutboundDestination, group: list[dict[str, Any]]) -> dict[str, Any]:
+        strip = lambda item: {key: value for key, value in item.items() if key != 'attempt'}
+        if destination.batch:
+            return {'events': [strip(item) for item in group], 'count': len(group)}
+        return strip(group[0])
+
+    def _post(self, destination: OutboundDestination, group: list[dict[str, Any]]) -> tuple[bool, bool]:
+        """Enviar un POST; devuelve (éxito, reintentable)."""
+        body = json.dumps(self._body(destination, group), default=str, separators=(',', ':')).encode('utf-8')
+        timestamp = str(int(time.time()))
+        headers = {
+            'Content-Type': 'application/json',
+            'X-Webhook-Timestamp': timestamp,
+            **destination.headers
+        }
+        if destination.secret:
+            signature = hmac.new(
+                destination.secret.encode('utf-8'), timestamp.encode('utf-8') + b'.' + body, hashlib.sha256
+            ).hexdigest()
+            headers['X-Webhook-Signature'] = f'sha256={signature}'
+
+        started = time.perf_counter()
+        status_code = None
+        try:
+            response = self._session(destination).post(
+                destination.url, data=body, headers=headers, timeout=destination.timeout
+            )
+            status_code = response.status_code
+            success = 200 <= status_code < 300
+            retryable = status_code in RETRYABLE_STATUSES
+        except requests.RequestException as e:
+            logger.warning(f"Error enviando webhook a {destination.name}: {e}")
+            success, retryable = False, True
+
+        self.metrics.record(
+            destination.name, (time.perf_counter() - started) * 1000, success,
+            events=len(group), status_code=status_code
+        )
+        return success, retryable
+
+
+__all__ = [
+    'OutboundDestination',
+    'DeliveryResult',
+    'DeliveryMetrics',
+    'MemoryOutboundQueue',
+    'RedisOutboundQueue',
+    'OutboundDeliveryEngine'
+]
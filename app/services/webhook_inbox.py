@@ -0,0 +1,501 @@
+"""
+Bandeja de entrada de webhooks con procesamiento asíncrono
+
+Los endpoints de webhooks solo verifican la firma, guardan el evento crudo
+con ``append_event`` (un único INSERT ... ON CONFLICT DO NOTHING sobre la
+clave de idempotencia, de modo que los reenvíos del proveedor no se
+duplican) y responden de inmediato. ``request_drain`` agrupa las llegadas
+de una ráfaga en una sola tarea de vaciado por proveedor.
+
+``WebhookInbox`` vacía la bandeja de un proveedor por lotes:
+
+- Reserva los eventos pendientes (o con reintento vencido) en orden de
+  llegada con ``FOR UPDATE SKIP LOCKED`` y un plazo de reserva, de modo que
+  varios workers no procesan el mismo evento y una reserva abandonada se
+  recupera sola.
+- Los eventos de un mismo recurso se procesan en orden: un lote reserva
+  los eventos consecutivos de un recurso desde el primero sin terminar y
+  los procesa uno tras otro; un evento reservado por otro worker o
+  esperando reintento retiene los siguientes del recurso hasta que termine.
+- Un único vaciado por proveedor a la vez: ``drain_lease`` toma una reserva
+  en la caché (``cache.add`` con caducidad) que la tarea de vaciado mantiene
+  mientras procesa lotes.
+- Los fallos se reintentan con backoff exponencial y, tras
+  ``max_attempts``, pasan a ``dead_letter``; ``replay_events`` los devuelve
+  a la bandeja.
+
+El manejador de eventos es inyectable (``dispatch_webhook_event`` en
+producción), de modo que el vaciado se puede probar con uno falso.
+"""
+
+import hashlib
+import logging
+import random
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from sqlalchemy import and_, exists, func, or_, select, update
+from sqlalchemy.orm import aliased
+
+from app.extensions import db, cache
+from app.models.webhook_event import WebhookEvent, WebhookProvider, WebhookStatus
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 200
+MAX_ATTEMPTS = 5
+LEASE_SECONDS = 300
+DRAIN_DEBOUNCE_SECONDS = 2
+
+# Estados que un evento anterior del mismo recurso debe haber dejado atrás
+# para que los siguientes se puedan reservar
+RESOURCE_BLOCKING_STATUSES = (WebhookStatus.PENDING, WebhookStatus.PROCESSING, WebhookStatus.FAILED)
+
+# Manejador: (proveedor, tipo de evento, payload) -> procesado correctamente
+WebhookHandler = Callable[[str, str, dict[str, Any]], bool]
+
+
+@dataclass
+class DrainResult:
+    """Resultado de vaciar un lote de la bandeja"""
+    claimed: int = 0
+    processed: int = 0
+    failed: int = 0
+    dead_lettered: int = 0
+    deferred: int = 0
+    seconds: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _provider(provider) -> WebhookProvider:
+    return provider if isinstance(provider, WebhookProvider) else WebhookProvider(provider)
+
+
+# ====================================
+# RECEPCIÓN
+# ====================================
+
+def idempotency_key(provider, event_id: Optional[str] = None, body: bytes = b'') -> str:
+    """
+    Huella del evento para detectar reenvíos.
+
+    Se usa el identificador del proveedor cuando existe y, si no, el cuerpo
+    crudo de la petición.
+    """
+    provider = _provider(provider).value
+    if event_id:
+        material = f'{provider}:id:{event_id}'.encode('utf-8')
+    else:
+        material = f'{provider}:body:'.encode('utf-8') + hashlib.sha256(body or b'').digest()
+    return hashlib.sha256(material).hexdigest()
+
+
+def _insert_statement():
+    if db.engine.dialect.name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+    return insert(WebhookEvent)
+
+
+def append_event(provider, event_type: str, event_id: Optional[str], payload: dict[str, Any],
+                 resource_key: Optional[str] = None, body: bytes = b'') -> Optional[Any]:
+    """
+    Guardar un evento recibido en la bandeja.
+
+    Un único INSERT con ``ON CONFLICT DO NOTHING`` sobre (proveedor, clave de
+    idempotencia): no hay consulta previa de duplicados.
+
+    Args:
+        provider: Proveedor del webhook
+        event_type: Tipo de evento
+        event_id: Identificador del evento en el proveedor (si lo envía)
+        payload: Cuerpo del evento
+        resource_key: Recurso afectado, para procesar sus eventos en orden
+        body: Cuerpo crudo (clave de idempotencia cuando no hay ``event_id``)
+
+    Returns:
+        ID del evento guardado o None si ya estaba en la bandeja
+    """
+    provider = _provider(provider)
+    key = idempotency_key(provider, event_id, body)
+
+    statement = _insert_statement().values(
+        provider=provider,
+        event_type=event_type,
+        event_id=event_id or key,
+        idempotency_key=key,
+        resource_key=resource_key,
+        payload=payload,
+        status=WebhookStatus.PENDING,
+        received_at=_utcnow(),
+        retry_count=0
+    ).on_conflict_do_nothing(
+        index_elements=['provider', 'idempotency_key']
+    ).returning(WebhookEvent.id)
+
+    try:
+        webhook_id = db.session.execute(statement).scalar()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    return webhook_id
+
+
+def request_drain(provider) -> bool:
+    """
+    Programar el vaciado de la bandeja de un proveedor.
+
+    Las llegadas de una ráfaga dentro de ``DRAIN_DEBOUNCE_SECONDS`` comparten
+    una sola tarea de vaciado.
+
+    Returns:
+        bool: True si se encoló una tarea nueva
+    """
+    provider = _provider(provider)
+    if not cache.add(f'webhook_inbox:drain:{provider.value}', 1, timeout=DRAIN_DEBOUNCE_SECONDS):
+        return False
+
+    from app.tasks.webhook_tasks import drain_webhook_inbox
+
+    drain_webhook_inbox.apply_async(args=[provider.value], countdown=DRAIN_DEBOUNCE_SECONDS)
+    return True
+
+
+@contextmanager
+def drain_lease(provider, seconds: int = LEASE_SECONDS) -> Iterator[bool]:
+    """
+    Reserva exclusiva del vaciado de un proveedor.
+
+    ``cache.add`` solo escribe la clave si no existe, de modo que un segundo
+    vaciado concurrente del mismo proveedor no obtiene la reserva. La
+    caducidad libera la reserva si el worker muere; al salir solo se borra si
+    sigue siendo la propia.
+
+    Yields:
+        bool: True si se obtuvo la reserva
+    """
+    key = f'webhook_inbox:lease:{_provider(provider).value}'
+    token = uuid.uuid4().hex
+    acquired = bool(cache.add(key, token, timeout=seconds))
+    try:
+        yield acquired
+    finally:
+        if acquired and cache.get(key) == token:
+            cache.delete(key)
+
+
+# ====================================
+# REPROCESO
+# ====================================
+
+def replay_events(event_ids: Iterable[Any] = (), provider=None,
+                  statuses: tuple = (WebhookStatus.DEAD_LETTER,)) -> int:
+    """
+    Devolver eventos fallidos o en dead letter a la bandeja.
+
+    Args:
+        event_ids: Eventos concretos (si se omite se usan los filtros)
+        provider: Limitar a un proveedor
+        statuses: Estados reprocesables
+
+    Returns:
+        int: Número de eventos devueltos a la bandeja
+    """
+    filters = [WebhookEvent.status.in_(statuses)]
+    event_ids = list(event_ids)
+    if event_ids:
+        filters.append(WebhookEvent.id.in_(event_ids))
+    if provider is not None:
+        filters.append(WebhookEvent.provider == _provider(provider))
+
+    try:
+        providers = list(db.session.execute(
+            select(WebhookEvent.provider).where(*filters).distinct()
+        ).scalars())
+        replayed = db.session.execute(
+            update(WebhookEvent).where(*filters).values(
+                status=WebhookStatus.PENDING,
+                retry_count=0,
+                next_attempt_at=None,
+                locked_until=None,
+                error_message=None
+            ).execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    for replay_provider in providers:
+        request_drain(replay_provider)
+
+    logger.info(f"Eventos de webhook devueltos a la bandeja: {replayed}")
+    return replayed
+
+
+def providers_with_due_events(now: Optional[datetime] = None) -> list[str]:
+    """Proveedores con eventos listos para procesar."""
+    now = now or _utcnow()
+    return [
+        provider.value for provider in db.session.execute(
+            select(WebhookEvent.provider).where(_due_condition(now)).distinct()
+        ).scalars()
+    ]
+
+
+def _due_condition(now: datetime, model=WebhookEvent):
+    return or_(
+        model.status == WebhookStatus.PENDING,
+        and_(model.status == WebhookStatus.FAILED, model.next_attempt_at <= now),
+        and_(model.status == WebhookStatus.PROCESSING, model.locked_until < now)
+    )
+
+
+# ====================================
+# VACIADO POR LOTES
+# ====================================
+
+class WebhookInbox:
+    """
+    Vaciado por lotes de la bandeja de un proveedor.
+
+    Args:
+        handler: ``callable(provider, event_type, payload) -> bool``
+        batch_size: Eventos reservados por lote
+        max_attempts: Intentos antes de pasar un evento a dead letter
+        base_retry_delay: Retardo base (segundos) del backoff exponencial
+        max_retry_delay: Retardo máximo (segundos)
+        lease_seconds: Duración de la reserva de un lote
+    """
+
+    def __init__(
+        self,
+        handler: WebhookHandler,
+        batch_size: int = BATCH_SIZE,
+        max_attempts: int = MAX_ATTEMPTS,
+        base_retry_delay: int = 30,
+        max_retry_delay: int = 3600,
+        lease_seconds: int = LEASE_SECONDS
+    ):
+        self.handler = handler
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.base_retry_delay = base_retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.lease_seconds = lease_seconds
+
+    def retry_delay(self, attempt: int) -> int:
+        """Backoff exponencial con jitter (segundos)."""
+        delay = min(self.base_retry_delay * (2 ** attempt), self.max_retry_delay)
+        return int(delay / 2 + random.uniform(0, delay / 2))
+
+    def claim_batch(self, provider, now: Optional[datetime] = None) -> list[WebhookEvent]:
+        """
+        Reservar el siguiente lote de eventos de un proveedor.
+
+        Un lote reserva los eventos consecutivos de cada recurso desde el
+        primero sin terminar, en orden de llegada. Se omiten los eventos con
+        un anterior del mismo recurso reservado por otro worker o esperando
+        reintento, y también los que quedarían detrás de un hueco (un
+        anterior listo que no entró en el lote, por el límite o por estar
+        bloqueado por otra transacción): así dos vaciados concurrentes no
+        pueden adelantar un evento a su predecesor. Un predecesor con la
+        reserva caducada o el reintento vencido vuelve a estar listo y se
+        reserva antes que los siguientes.
+        """
+        provider = _provider(provider)
+        now = now or _utcnow()
+
+        def predecessors(earlier):
+            return and_(
+                earlier.provider == WebhookEvent.provider,
+                earlier.resource_key == WebhookEvent.resource_key,
+                or_(
+                    earlier.received_at < WebhookEvent.received_at,
+                    and_(earlier.received_at == WebhookEvent.received_at, earlier.id < WebhookEvent.id)
+                ),
+                earlier.status.in_(RESOURCE_BLOCKING_STATUSES)
+            )
+
+        waiting, unfinished = aliased(WebhookEvent), aliased(WebhookEvent)
+        waiting_predecessor = exists().where(predecessors(waiting), ~_due_condition(now, waiting))
+        unfinished_predecessors = (
+            select(func.count()).select_from(unfinished).where(predecessors(unfinished))
+            .correlate(WebhookEvent).scalar_subquery()
+        )
+
+        try:
+            rows = db.session.execute(
+                select(WebhookEvent, unfinished_predecessors.label('unfinished')).where(
+                    WebhookEvent.provider == provider,
+                    _due_condition(now),
+                    or_(WebhookEvent.resource_key.is_(None), ~waiting_predecessor)
+                ).order_by(
+                    WebhookEvent.received_at, WebhookEvent.id
+                ).limit(self.batch_size).with_for_update(of=WebhookEvent, skip_locked=True)
+            ).all()
+
+            # Cada evento de un recurso entra solo si todos sus anteriores sin
+            # terminar están antes que él en este mismo lote
+            events = []
+            taken: dict[str, int] = {}
+            for event, unfinished_count in rows:
+                key = event.resource_key
+                if key is not None:
+                    if unfinished_count != taken.get(key, 0):
+                        # Hueco: el resto del recurso espera al siguiente lote
+                        taken[key] = -1
+                        continue
+                    taken[key] = unfinished_count + 1
+                events.append(event)
+
+            if events:
+                db.session.execute(
+                    update(WebhookEvent).where(
+                        WebhookEvent.id.in_([event.id for event in events])
+                    ).values(
+                        status=WebhookStatus.PROCESSING,
+                        locked_until=now + timedelta(seconds=self.lease_seconds)
+                    ).execution_options(synchronize_session='fetch')
+                )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        return events
+
+    def drain_batch(self, provider) -> DrainResult:
+        """
+        Procesar un lote de la bandeja.
+
+        Returns:
+            DrainResult: ``claimed == 0`` indica que no queda nada listo
+        """
+        started = time.perf_counter()
+        provider = _provider(provider)
+        events = self.claim_batch(provider)
+        result = DrainResult(claimed=len(events))
+        blocked_resources: set[str] = set()
+
+        for event in events:
+            if event.resource_key and event.resource_key in blocked_resources:
+                self._release(event)
+                result.deferred += 1
+                continue
+
+            error = None
+            try:
+                success = bool(self.handler(provider.value, event.event_type, event.payload or {}))
+            except Exception as e:
+                db.session.rollback()
+                success = False
+                error = str(e)
+                logger.error(f"Error procesando webhook {provider.value}:{event.event_id}: {error}")
+
+            if success:
+                self._mark_processed(event)
+                result.processed += 1
+                continue
+
+            if event.resource_key:
+                blocked_resources.add(event.resource_key)
+            if self._mark_failed(event, error or 'Error procesando evento'):
+                result.dead_lettered += 1
+            else:
+                result.failed += 1
+
+        result.seconds = time.perf_counter() - started
+        return result
+
+    def drain(self, provider, time_budget: float) -> tuple[dict[str, Any], bool]:
+        """
+        Procesar lotes hasta que no quede nada listo o se agote el tiempo.
+
+        Un lote corto no significa que la bandeja esté vacía: los eventos
+        siguientes de un recurso pueden quedar fuera del lote por el límite.
+
+        Args:
+            provider: Proveedor a vaciar
+            time_budget: Segundos máximos antes de ceder el worker
+
+        Returns:
+            Totales de los lotes y si quedan eventos por procesar
+        """
+        totals = {'batches': 0, **DrainResult().to_dict()}
+        deadline = time.monotonic() + time_budget
+
+        while True:
+            result = self.drain_batch(provider)
+            totals['batches'] += 1
+            for key, value in result.to_dict().items():
+                totals[key] += value
+            if not result.claimed:
+                return totals, False
+            if time.monotonic() >= deadline:
+                return totals, True
+
+    def _finish(self, event: WebhookEvent, **values):
+        try:
+            db.session.execute(
+                update(WebhookEvent).where(WebhookEvent.id == event.id).values(
+                    locked_until=None, **values
+                ).execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+    def _mark_processed(self, event: WebhookEvent):
+        self._finish(event, status=WebhookStatus.PROCESSED, processed_at=_utcnow(), error_message=None)
+
+    def _mark_failed(self, event: WebhookEvent, error: str) -> bool:
+        """Programar el reintento o pasar a dead letter; True si es dead letter."""
+        attempts = (event.retry_count or 0) + 1
+        if attempts >= self.max_attempts:
+            logger.error(f"Webhook {event.event_id} enviado a dead letter tras {attempts} intentos: {error}")
+            self._finish(
+                event, status=WebhookStatus.DEAD_LETTER, retry_count=attempts,
+                next_attempt_at=None, error_message=error[:2000]
+            )
+            return True
+
+        self._finish(
+            event, status=WebhookStatus.FAILED, retry_count=attempts,
+            next_attempt_at=_utcnow() + timedelta(seconds=self.retry_delay(attempts - 1)),
+            error_message=error[:2000]
+        )
+        return False
+
+    def _release(self, event: WebhookEvent):
+        """Devolver a la bandeja un evento bloqueado por el fallo de uno anterior."""
+        status = WebhookStatus.FAILED if event.retry_count else WebhookStatus.PENDING
+        self._finish(event, status=status, next_attempt_at=_utcnow() if event.retry_count else None)
+
+
+__all__ = [
+    'BATCH_SIZE',
+    'MAX_ATTEMPTS',
+    'DrainResult',
+    'WebhookInbox',
+    'idempotency_key',
+    'append_event',
+    'request_drain',
+    'drain_lease',
+    'replay_events',
+    'providers_with_due_events'
+]
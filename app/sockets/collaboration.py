@@ -0,0 +1,378 @@
+"""
+Motor de Colaboración en Tiempo Real - Ecosistema de Emprendimiento
+===================================================================
+
+Edición concurrente de documentos de texto mediante transformación
+operacional (``app.utils.text_ot``) con un servidor central por documento:
+
+- Cada operación llega con la revisión sobre la que se escribió; se
+  transforma contra las operaciones concurrentes del log y se aplica.
+- El log se compacta periódicamente en instantáneas que se persisten en
+  ``Document.content``/``Document.content_revision``.
+- Quien se une tarde recibe la última instantánea más la cola del log.
+- Las operaciones aplicadas se difunden en lotes, una vez por tick.
+
+En modo cluster cada worker mantiene su propia sesión del documento, pero
+el orden de las operaciones lo decide el log compartido del almacén de
+estado (``SocketStateStore``): una operación solo se aplica si se añade al
+log con compare-and-set sobre la revisión, y en cada tick (y antes de cada
+operación o unión) la sesión se pone al día con lo que escribieron los demás
+workers. Cada worker difunde el log completo, en orden, solo a sus propias
+conexiones. Las instantáneas solo avanzan ``content_revision``.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from app.utils.text_ot import OperationError, TextOperation
+
+logger = logging.getLogger(__name__)
+
+
+class StaleRevisionError(OperationError):
+    """La revisión del cliente ya no está en el log; debe resincronizarse."""
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """Contenido de un documento en una revisión."""
+
+    content: str
+    revision: int
+
+
+# ====================================
+# SESIÓN DE DOCUMENTO
+# ====================================
+
+class DocumentSession:
+    """
+    Estado de colaboración de un documento abierto.
+
+    Args:
+        document_id: ID del documento
+        content: Contenido persistido
+        revision: Revisión del contenido persistido
+        max_log: Operaciones que se conservan tras una instantánea para
+            clientes rezagados
+    """
+
+    def __init__(self, document_id, content: str = '', revision: int = 0, max_log: int = 1000):
+        self.document_id = document_id
+        self.content = content
+        self.revision = revision
+        self.max_log = max_log
+        self.snapshot = Snapshot(content, revision)
+        self.persisted_revision = revision
+        self.last_snapshot_at = time.monotonic()
+
+        self._lock = threading.Lock()
+        self._log: list[TextOperation] = []
+        self._log_base = revision  # revisión sobre la que se aplica _log[0]
+        self._outbox: list[dict[str, Any]] = []
+
+    @property
+    def ops_since_snapshot(self) -> int:
+        """Operaciones aplicadas desde la última instantánea."""
+        return self.revision - self.snapshot.revision
+
+    def receive(self, revision: int, operation: TextOperation, author: Optional[str] = None,
+                commit: Optional[Callable[[int, TextOperation], bool]] = None) -> Optional[tuple[TextOperation, int]]:
+        """
+        Transformar y aplicar una operación de un cliente.
+
+        Args:
+            revision: Revisión sobre la que el cliente escribió la operación
+            operation: Operación del cliente
+            author: Identificador de la conexión autora (se devuelve en la difusión)
+            commit: ``fn(nueva_revisión, operación_transformada)`` que la
+                registra en el log compartido; si devuelve False no se aplica
+
+        Returns:
+            Operación transformada y nueva revisión, o None si ``commit`` la rechazó
+
+        Raises:
+            StaleRevisionError: Si la revisión es anterior al log conservado
+            OperationError: Si la operación no encaja con el documento
+        """
+        with self._lock:
+            if revision < self._log_base or revision > self.revision:
+                raise StaleRevisionError(
+                    f"Revisión {revision} fuera del log ({self._log_base}-{self.revision})"
+                )
+
+            for concurrent in self._log[revision - self._log_base:]:
+                operation = TextOperation.transform(operation, concurrent)[0]
+
+            if commit is not None and not commit(self.revision + 1, operation):
+                return None
+
+            self.content = operation.apply(self.content)
+            self._log.append(operation)
+            self.revision += 1
+            self._outbox.append({'revision': self.revision, 'operation': operation.ops, 'author': author})
+            return operation, self.revision
+
+    def apply_remote(self, since: int, entries: list[dict[str, Any]]):
+        """
+        Aplicar operaciones ya ordenadas por otro worker.
+
+        Args:
+            since: Revisión tras la que empiezan ``entries``
+            entries: ``{'operation', 'author'}`` en orden de revisión
+        """
+        with self._lock:
+            for entry in entries[self.revision - since:]:
+                operation = TextOperation.from_json(entry['operation'])
+                self.content = operation.apply(self.content)
+                self._log.append(operation)
+                self.revision += 1
+                self._outbox.append({'revision': self.revision, 'operation': operation.ops,
+                                     'author': entry.get('author')})
+
+    def reset(self, content: str, revision: int):
+        """Descartar el estado local y partir de una instantánea persistida."""
+        with self._lock:
+            self.content = content
+            self.revision = revision
+            self.snapshot = Snapshot(content, revision)
+            self.persisted_revision = revision
+            self.last_snapshot_at = time.monotonic()
+            self._log = []
+            self._log_base = revision
+            self._outbox = []
+
+    def take_snapshot(self) -> Snapshot:
+        """Compactar el log en una instantánea de la revisión actual."""
+        with self._lock:
+            self.snapshot = Snapshot(self.content, self.revision)
+            self.last_snapshot_at = time.monotonic()
+            if len(self._log) > self.max_log:
+                trimmed = len(self._log) - self.max_log
+                del self._log[:trimmed]
+                self._log_base += trimmed
+            return self.snapshot
+
+    def join_state(self) -> dict[str, Any]:
+        """Instantánea más la cola del log para un cliente que se une."""
+        with self._lock:
+            snapshot = self.snapshot
+            if snapshot.revision < self._log_base:
+                # La instantánea es anterior al log conservado: enviar el estado actual
+                snapshot = Snapshot(self.content, self.revision)
+            tail = self._log[snapshot.revision - self._log_base:]
+            return {
+                'snapshot': {'content': snapshot.content, 'revision': snapshot.revision},
+                'operations': [operation.ops for operation in tail],
+                'revision': self.revision
+            }
+
+    def drain_outbox(self) -> list[dict[str, Any]]:
+        """Obtener y vaciar las operaciones pendientes de difundir."""
+        with self._lock:
+            outbox, self._outbox = self._outbox, []
+            return outbox
+
+
+# ====================================
+# MOTOR
+# ====================================
+
+class CollaborationEngine:
+    """
+    Gestiona las sesiones de documento, la difusión por ticks y las instantáneas.
+
+    Args:
+        broadcast: ``fn(document_id, operations)`` que difunde un lote a las
+            conexiones de este worker
+        persist: ``fn(document_id, content, revision)`` que guarda una instantánea
+        tick: Segundos entre difusiones
+        snapshot_every: Operaciones entre instantáneas
+        snapshot_interval: Segundos máximos entre instantáneas con cambios
+        max_log: Operaciones conservadas para clientes rezagados
+        state: Almacén compartido con el log de operaciones (modo cluster);
+            sin él el documento solo puede servirse desde este proceso
+        max_retries: Intentos de añadir una operación al log compartido
+    """
+
+    def __init__(self, broadcast: Callable[[Any, list[dict[str, Any]]], None],
+                 persist: Callable[[Any, str, int], None],
+                 tick: float = 0.05, snapshot_every: int = 500,
+                 snapshot_interval: float = 30.0, max_log: int = 1000,
+                 state=None, max_retries: int = 20):
+        self.broadcast = broadcast
+        self.persist = persist
+        self.tick = tick
+        self.snapshot_every = snapshot_every
+        self.snapshot_interval = snapshot_interval
+        self.max_log = max_log
+        self.state = state
+        self.max_retries = max_retries
+
+        self._sessions: dict[Any, DocumentSession] = {}
+        self._loaders: dict[Any, Callable[[], tuple[str, int]]] = {}
+        self._lock = threading.Lock()
+        self._running = False
+
+    def open(self, document_id, load: Callable[[], tuple[str, int]]) -> DocumentSession:
+        """
+        Obtener la sesión de un documento, cargándolo si no está abierto.
+
+        Args:
+            document_id: ID del documento
+            load: Función que devuelve ``(contenido, revisión)`` persistidos
+        """
+        with self._lock:
+            session = self._sessions.get(document_id)
+            if session is None:
+                content, revision = load()
+                session = DocumentSession(document_id, content or '', revision or 0, max_log=self.max_log)
+                self._sessions[document_id] = session
+            self._loaders[document_id] = load
+        self._sync(session)
+        return session
+
+    def get(self, document_id) -> Optional[DocumentSession]:
+        """Obtener la sesión de un documento abierto."""
+        return self._sessions.get(document_id)
+
+    def submit(self, document_id, revision: int, operation: list, author: Optional[str] = None) -> int:
+        """
+        Recibir una operación de un cliente.
+
+        Returns:
+            Revisión asignada a la operación
+
+        Raises:
+            KeyError: Si el documento no está abierto
+            OperationError: Si la operación no es válida o la revisión está obsoleta
+        """
+        session = self._sessions[document_id]
+        operation = TextOperation.from_json(operation)
+
+        if self.state is None:
+            _, new_revision = session.receive(revision, operation, author)
+        else:
+            room = self._room(document_id)
+
+            def commit(next_revision: int, transformed: TextOperation) -> bool:
+                entry = {'operation': transformed.ops, 'author': author}
+                return self.state.append_room_operation(room, next_revision, entry, self.max_log)
+
+            for _ in range(self.max_retries):
+                # Otro worker pudo escribir desde la última sincronización
+                self._sync(session)
+                result = session.receive(revision, operation, author, commit=commit)
+                if result is not None:
+                    break
+            else:
+                raise OperationError(f"Conflicto persistente en el log del documento {document_id}")
+            _, new_revision = result
+
+        if session.ops_since_snapshot >= self.snapshot_every:
+            self._snapshot(session)
+        return new_revision
+
+    def close(self, document_id):
+        """Cerrar un documento: difundir lo pendiente y guardar la instantánea final."""
+        with self._lock:
+            session = self._sessions.pop(document_id, None)
+            self._loaders.pop(document_id, None)
+        if session is not None:
+            self._flush(session)
+            try:
+                self._sync(session)
+            except OperationError as e:
+                logger.error(f"No se pudo sincronizar el documento {document_id} al cerrarlo: {str(e)}")
+            if session.revision != session.persisted_revision:
+                self._snapshot(session)
+
+    # ----- Ticks -----
+
+    def flush(self):
+        """Difundir los lotes pendientes y guardar instantáneas vencidas."""
+        now = time.monotonic()
+        for session in list(self._sessions.values()):
+            try:
+                self._sync(session)
+            except OperationError as e:
+                logger.error(f"No se pudo sincronizar el documento {session.document_id}: {str(e)}")
+            self._flush(session)
+            if (session.revision != session.persisted_revision and
+                    now - session.last_snapshot_at >= self.snapshot_interval):
+                self._snapshot(session)
+
+    def run(self, sleep: Callable[[float], None] = time.sleep):
+        """Bucle de ticks (ejecutar como tarea de fondo)."""
+        self._running = True
+        while self._running:
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error en tick de colaboración: {str(e)}")
+            sleep(self.tick)
+
+    def stop(self):
+        """Detener el bucle de ticks."""
+        self._running = False
+
+    @staticmethod
+    def _room(document_id) -> str:
+        return f'document_{document_id}'
+
+    def _sync(self, session: DocumentSession):
+        """
+        Aplicar las operaciones que otros workers añadieron al log compartido.
+
+        Si el log ya no cubre la revisión local (se recortó o se recreó), la
+        sesión se recarga desde la última instantánea persistida.
+
+        Raises:
+            StaleRevisionError: Si tampoco la instantánea persistida está en el log
+        """
+        if self.state is None:
+            return
+
+        room = self._room(session.document_id)
+        since = session.revision
+        operations = self.state.room_operations(room, since)
+        if operations is None:
+            if self.state.init_room_log(room, since) != since:
+                load = self._loaders.get(session.document_id)
+                if load is None:
+                    raise StaleRevisionError(f"Documento {session.document_id} sin instantánea para recargar")
+                content, revision = load()
+                session.reset(content or '', revision or 0)
+                self.state.init_room_log(room, session.revision)
+                logger.warning(f"Sesión del documento {session.document_id} recargada desde la instantánea")
+            since = session.revision
+            operations = self.state.room_operations(room, since)
+            if operations is None:
+                raise StaleRevisionError(
+                    f"El log del documento {session.document_id} no cubre la revisión {since}"
+                )
+        session.apply_remote(since, operations)
+
+    def _flush(self, session: DocumentSession):
+        batch = session.drain_outbox()
+        if batch:
+            self.broadcast(session.document_id, batch)
+
+    def _snapshot(self, session: DocumentSession):
+        snapshot = session.take_snapshot()
+        try:
+            self.persist(session.document_id, snapshot.content, snapshot.revision)
+            session.persisted_revision = snapshot.revision
+        except Exception as e:
+            logger.error(f"Error guardando instantánea del documento {session.document_id}: {str(e)}")
+
+
+__all__ = [
+    'CollaborationEngine',
+    'DocumentSession',
+    'Snapshot',
+    'StaleRevisionError'
+]
@@ -67,6 +67,8 @@ from app.utils.cache_utils import cache_get, cache_set, cache_delete
 from app.utils.validators import validate_event_data, validate_user_input
 from app.utils.formatters import format_datetime, format_user_info
 from app.utils.string_utils import sanitize_input, generate_session_key
+from app.sockets.registry import session_registry
+from app.sockets.state import get_state_store
 
 logger = logging.getLogger(__name__)
 
@@ -120,32 +122,33 @@ class RateLimitStrategy(Enum):
 
 def socket_auth_required(
     allow_guest: bool = False,
-    check_active: bool = True,
-    cache_duration: int = 300
+    check_active: bool = True
 ):
     """
     Decorador de autenticación para eventos WebSocket
     
+    El usuario se resuelve desde el registro de sesiones con una búsqueda por
+    sid; solo la primera vez que se ve un sid se valida el JWT y se consulta la
+    base de datos. Los manejadores reciben un ``SocketPrincipal`` en
+    ``current_user`` (``current_user.load_user()`` devuelve el modelo).
+    
     Args:
         allow_guest: Permitir usuarios invitados
         check_active: Verificar que el usuario esté activo
-        cache_duration: Duración del cache de autenticación en segundos
     """
     def decorator(f: Callable) -> Callable:
         @wraps(f)
         def decorated_function(*args, **kwargs):
             try:
+                namespace = request.namespace or '/'
                 session_id = request.sid
                 
-                # Verificar cache de autenticación
-                cache_key = f"auth_{session_id}"
-                cached_user = cache_get(cache_key)
-                
-                if cached_user:
-                    user = User.query.get(cached_user['user_id'])
-                    if user and (not check_active or user.is_active):
-                        kwargs['current_user'] = user
-                        return f(*args, **kwargs)
+                # Principal en caché del registro de sesiones
+                principal = session_registry.principal_for(namespace, session_id)
+                if principal and (not check_active or principal.is_active):
+                    session_registry.touch(namespace, session_id)
+                    kwargs['current_user'] = principal
+                    return f(*args, **kwargs)
                 
                 # Verificar JWT
                 try:
@@ -193,17 +196,10 @@ def socket_auth_required(
                     disconnect()
                     return
                 
-                # Cachear información de autenticación
-                cache_set(cache_key, {
-                    'user_id': user.id,
-                    'username': user.username,
-                    'role': user.role.value
-                }, timeout=cache_duration)
+                # Registrar el sid para que los siguientes eventos no consulten la BD
+                session_registry.register(namespace, session_id, user)
                 
-                # Actualizar última actividad
-                user.last_activity = datetime.now(timezone.utc)
-                
-                kwargs['current_user'] = user
+                kwargs['current_user'] = session_registry.principal_for(namespace, session_id)
                 return f(*args, **kwargs)
                 
             except Exception as e:
@@ -337,9 +333,9 @@ def socket_rate_limit(
                 
                 # Crear clave de rate limiting
                 if per_user and current_user:
-                    limit_key = f"rate_limit_{current_user.id}_{event_name}"
+                    limit_key = f"{current_user.id}:{event_name}"
                 else:
-                    limit_key = f"rate_limit_global_{event_name}"
+                    limit_key = f"global:{event_name}"
                 
                 # Verificar rate limit según estrategia
                 if not _check_rate_limit(limit_key, effective_rate, window, strategy, burst_allowance):
@@ -934,23 +930,8 @@ def _check_rate_limit(
 
 
 def _check_sliding_window_rate_limit(key: str, rate: int, window: int, now: datetime) -> bool:
-    """Implementa rate limiting con ventana deslizante"""
-    cutoff = now - timedelta(seconds=window)
-    
-    # Obtener timestamps de eventos recientes
-    recent_events = rate_limit_cache[key]['events']
-    
-    # Limpiar eventos antiguos
-    while recent_events and recent_events[0] < cutoff:
-        recent_events.popleft()
-    
-    # Verificar si excede el límite
-    if len(recent_events) >= rate:
-        return False
-    
-    # Añadir evento actual
-    recent_events.append(now)
-    return True
+    """Implementa rate limiting con ventana deslizante (compartida entre workers)"""
+    return get_state_store().hit_rate_limit(key, rate, window)
 
 
 def _check_fixed_window_rate_limit(key: str, rate: int, window: int, now: datetime) -> bool:
@@ -1028,23 +1009,18 @@ def _remove_sensitive_fields(data: dict, sensitive_fields: list[str]) -> dict:
 
 
 def _log_user_activity(user: User, activity_type: ActivityType, description: str, metadata: dict):
-    """Registra actividad del usuario en la base de datos"""
+    """Registra actividad del usuario (encolada en el buffer de auditoría)"""
     try:
-        from app import db
-        
-        activity = ActivityLog(
-            user_id=user.id,
+        ActivityLog.log_activity(
             activity_type=activity_type,
             description=description,
+            user_id=user.id,
             metadata=metadata,
             ip_address=request.environ.get('REMOTE_ADDR'),
             user_agent=request.environ.get('HTTP_USER_AGENT'),
             session_id=request.sid
         )
         
-        db.session.add(activity)
-        db.session.commit()
-        
     except SQLAlchemyError as e:
         logger.error(f"Error registrando actividad en BD: {str(e)}")
 
@@ -1095,7 +1071,7 @@ def _check_project_access(user: User, project: Project, allowed_roles: Optional[
         return False
     
     # Verificar si es mentor asignado al proyecto
-    if user.role == UserRole.ALLY and user in project.mentors:
+    if user.role == UserRole.ALLY and any(mentor.id == user.id for mentor in project.mentors):
         return True
     
     # Verificar si es cliente con acceso al proyecto
@@ -54,6 +54,7 @@ from app.utils.decorators import rate_limit, log_activity
 from app.utils.validators import validate_event_data
 from app.utils.formatters import format_datetime, format_user_info
 from app.utils.cache_utils import cache_get, cache_set, cache_delete
+from app.sockets.state import get_state_store
 
 logger = logging.getLogger(__name__)
 
@@ -66,9 +67,6 @@ error_stats = defaultdict(list)
 # Cola de eventos para procesamiento batch
 event_queue = deque(maxlen=10000)
 
-# Rate limiting por usuario
-user_rate_limits = defaultdict(lambda: defaultdict(list))
-
 # Sistema de health checks
 health_checks = {
     'database': True,
@@ -231,22 +229,8 @@ def check_rate_limit(event_name: str, user_id: str,
         if rate is None:
             rate = RATE_LIMIT_DEFAULTS.get(event_name, 60)
         
-        now = datetime.now(timezone.utc)
-        cutoff = now - timedelta(seconds=window)
-        
-        # Limpiar eventos antiguos
-        user_rate_limits[user_id][event_name] = [
-            timestamp for timestamp in user_rate_limits[user_id][event_name]
-            if timestamp > cutoff
-        ]
-        
-        # Verificar límite
-        if len(user_rate_limits[user_id][event_name]) >= rate:
-            return False
-        
-        # Añadir nuevo evento
-        user_rate_limits[user_id][event_name].append(now)
-        return True
+        # Contadores compartidos por todos los workers en modo cluster
+        return get_state_store().hit_rate_limit(f'{user_id}:{event_name}', rate, window)
         
     except Exception as e:
         logger.error(f"Error verificando rate limit: {str(e)}")
@@ -887,7 +871,7 @@ def _get_error_metrics(time_range: str) -> dict[str, Any]:
     }
 
 
-def _update_user_activity(user: User, activity_type: str, metadata: Dict = None):
+def _update_user_activity(user: User, activity_type: str, metadata: dict = None):
     """Actualiza la actividad del usuario"""
     try:
         # Actualizar timestamp de última actividad
@@ -984,22 +968,17 @@ def _send_broadcast(target_type: str, targets: list[str], data: dict[str, Any])
 
 
 def _log_user_activity(user: User, activity_type: ActivityType, description: str):
-    """Registra actividad del usuario en la base de datos"""
+    """Registra actividad del usuario (encolada en el buffer de auditoría)"""
     try:
-        from app import db
-        
-        activity = ActivityLog(
-            user_id=user.id,
+        ActivityLog.log_activity(
             activity_type=activity_type,
             description=description,
+            user_id=user.id,
             ip_address=request.environ.get('REMOTE_ADDR'),
             user_agent=request.environ.get('HTTP_USER_AGENT'),
             session_id=request.sid
         )
         
-        db.session.add(activity)
-        db.session.commit()
-        
     except SQLAlchemyError as e:
         logger.error(f"Error registrando actividad en BD: {str(e)}")
     except Exception as e:
@@ -1036,8 +1015,7 @@ def _cleanup_user_session(user: User, session_id: str):
         cache_delete(f'session_{session_id}')
         
         # Limpiar rate limits del usuario
-        if str(user.id) in user_rate_limits:
-            del user_rate_limits[str(user.id)]
+        get_state_store().reset_rate_limits(str(user.id))
         
     except Exception as e:
         logger.error(f"Error limpiando sesión de usuario: {str(e)}")
@@ -1121,7 +1099,7 @@ def _is_user_connected(user_id: str) -> bool:
     return user_id in active_users
 
 
-def _group_errors_by_type(errors: list[Dict]) -> dict[str, int]:
+def _group_errors_by_type(errors: list[dict]) -> dict[str, int]:
     """Agrupa errores por tipo"""
     error_counts = defaultdict(int)
     for error in errors:
@@ -140,7 +140,12 @@ class SocketManager:
         logger.debug(f"Usuario {user_id} (SID: {session_id}) salió de sala '{room_name}'")
 
     def emit_to_user(self, user_id: str, event: str, data: Any, namespace: Optional[str] = None) -> bool:
-        """Emite un evento a un usuario específico si está conectado."""
+        """Emite un evento a todas las sesiones (pestañas) de un usuario conectado."""
+        from app.sockets.state import get_state_store
+        if get_state_store().connection_count(user_id, namespace):
+            # La sala personal existe en todos los workers vía la cola de mensajes
+            self.sio.emit(event, data, room=f'user_{user_id}', namespace=namespace)
+            return True
         if user_id in self.active_connections:
             sid = self.active_connections[user_id]['session_id']
             self.sio.emit(event, data, room=sid, namespace=namespace)
@@ -151,6 +156,11 @@ class SocketManager:
         """Emite un evento a todos los usuarios en una sala."""
         self.sio.emit(event, data, room=room_name, namespace=namespace, include_self=include_self)
 
+    def is_user_online(self, user_id: str) -> bool:
+        """Verifica si el usuario tiene alguna sesión abierta en el cluster."""
+        from app.sockets.state import get_state_store
+        return get_state_store().connection_count(user_id) > 0 or user_id in self.active_connections
+
     def get_user_by_sid(self, sid: str) -> Optional[dict[str, Any]]:
         """Obtiene la información del usuario conectado con un SID específico."""
         for user_id, conn_data in self.active_connections.items():
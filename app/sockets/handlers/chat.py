@@ -334,7 +334,7 @@ class ChatNamespace(BaseNamespace):
                         type='DIRECT',
                         creator_id=current_user.id
                     )
-                    thread.participants.append(current_user)
+                    thread.participants.append(current_user.load_user())
                     thread.participants.append(other_user)
                     db.session.add(thread)
                     db.session.commit()
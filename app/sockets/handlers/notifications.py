@@ -46,7 +46,7 @@ class NotificationNamespace(BaseNamespace):
         """
         return user.is_active
 
-    def on_connect(self, auth_data: Optional[Dict] = None):
+    def on_connect(self, auth_data: Optional[dict] = None):
         """
         Manejador para cuando un cliente se conecta al namespace de notificaciones.
         Llama al on_connect de BaseNamespace que maneja la autenticación.
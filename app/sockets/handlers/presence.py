@@ -7,7 +7,7 @@ permitiendo saber quién está online, away, busy, etc.
 
 Funcionalidades:
 - Actualización de estado de presencia (online, away, busy, offline)
-- Difusión de cambios de estado a usuarios relevantes
+- Difusión de cambios de estado a los suscriptores (coalescida por tick)
 - Consulta de estado de presencia de otros usuarios
 - Integración con el estado de conexión/desconexión global
 """
@@ -23,6 +23,7 @@ from app.models.user import User
 from app.sockets import socket_manager # Usar la instancia global del __init__.py
 from app.sockets.decorators import socket_auth_required, socket_log_activity, socket_validate_data
 from app.sockets.namespaces import BaseNamespace # Heredar de BaseNamespace
+from app.sockets.presence import get_presence_hub
 from app.core.exceptions import SocketValidationError
 from app.utils.formatters import format_datetime, format_user_info
 
@@ -44,7 +45,7 @@ class PresenceNamespace(BaseNamespace):
         """
         return user.is_active
 
-    def on_connect(self, auth_data: Optional[Dict] = None):
+    def on_connect(self, auth_data: Optional[dict] = None):
         """
         Manejador para cuando un cliente se conecta al namespace de presencia.
         Llama al on_connect de BaseNamespace que maneja la autenticación.
@@ -138,11 +139,10 @@ class PresenceNamespace(BaseNamespace):
             # Emitir a la sala personal del usuario (para sus otras sesiones/dispositivos)
             emit('my_presence_status_updated', payload, room=f"user_presence_{user_id_str}")
 
-            # Difundir el cambio de estado a otros usuarios relevantes
-            # Esto podría ser a salas de proyectos, organización, o globalmente
-            # Por ahora, un broadcast general (excluyendo al propio usuario)
-            # En una app real, esto se segmentaría (ej. amigos, colegas)
-            self.emit('user_presence_changed', payload, broadcast=True, include_self=False)
+            # Solo los suscritos a este usuario reciben el cambio, en el siguiente frame
+            get_presence_hub().heartbeat(
+                user_id_str, current_user.username, status=new_status, custom_message=custom_message
+            )
             
             logger.info(f"Usuario {current_user.username} actualizó estado a '{new_status}'.")
 
@@ -207,20 +207,8 @@ def broadcast_user_presence_update(user_id: str, status: str, custom_message: st
         logger.warning(f"Usuario {user_id} no encontrado para difundir presencia.")
         return
 
-    payload = {
-        'user_id': user_id,
-        'username': user.username,
-        'status': status,
-        'custom_message': custom_message,
-        'timestamp': format_datetime(datetime.now(timezone.utc))
-    }
-    
-    # Emitir al namespace de presencia
-    socket_manager.emit_to_room(
-        room=None, # Broadcast
-        event='user_presence_changed',
-        data=payload,
-        namespace='/presence',
-        include_self=False # Asumiendo que el cambio se originó en el propio usuario
-    )
-    logger.info(f"Presencia de usuario {user_id} difundida: {status}")
\ No newline at end of file
+    hub = get_presence_hub()
+    if status == 'offline':
+        hub.set_offline(user_id)
+    else:
+        hub.heartbeat(user_id, user.username, status=status, custom_message=custom_message)
@@ -8,6 +8,7 @@ enfocado en manejo de errores global, gestión de conexiones y logging.
 
 import logging
 from functools import wraps
+from typing import Any, Optional
 from flask import request, g, current_app
 from flask_socketio import emit, disconnect
 from flask_jwt_extended import get_jwt_identity
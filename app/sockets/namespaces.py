@@ -17,6 +17,7 @@ Namespaces implementados:
 """
 
 import logging
+import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Any
 from flask import request, current_app
@@ -30,7 +31,7 @@ from app.core.exceptions import (
 )
 from app.core.permissions import has_permission, UserRole
 from app.models.user import User
-from app.models.message import Message, MessageType
+from app.models.message import Message, MessageType, Conversation
 from app.models.notification import Notification
 from app.models.project import Project
 from app.models.mentorship import MentorshipSession
@@ -43,6 +44,12 @@ from app.services.mentorship_service import MentorshipService
 from app.utils.decorators import rate_limit
 from app.utils.validators import validate_message_content, validate_room_name
 from app.utils.formatters import format_datetime, format_user_info
+from app.utils.pagination import InvalidCursorError
+from app.sockets.registry import SocketPrincipal, session_registry, watch_user_changes
+from app.sockets.state import SocketStateStore, get_state_store
+from app.sockets.presence import PresenceHub, get_presence_hub
+from app.sockets.collaboration import CollaborationEngine, StaleRevisionError
+from app.utils.text_ot import OperationError
 
 logger = logging.getLogger(__name__)
 
@@ -58,7 +65,17 @@ class BaseNamespace(Namespace):
     def __init__(self, namespace: str):
         super().__init__(namespace)
         self.user_service = UserService()
-        self.connected_users: dict[str, dict[str, Any]] = {}
+        self.sessions = session_registry
+    
+    @property
+    def state(self) -> SocketStateStore:
+        """Estado compartido entre workers (presencia, salas, rate limits)"""
+        return get_state_store()
+    
+    @property
+    def presence(self) -> PresenceHub:
+        """Hub de presencia y typing coalescidos por tick"""
+        return get_presence_hub()
     
     def on_connect(self, auth):
         """Maneja conexiones al namespace"""
@@ -96,12 +113,12 @@ class BaseNamespace(Namespace):
     def on_disconnect(self):
         """Maneja desconexiones del namespace"""
         try:
-            user_id = self._get_current_user_id()
-            if user_id and user_id in self.connected_users:
-                user_info = self.connected_users[user_id]
-                del self.connected_users[user_id]
-                
-                logger.info(f"Usuario {user_info.get('username')} desconectado de namespace {self.namespace}")
+            principal = self._get_current_user()
+            session = self.sessions.unregister(self.namespace, request.sid)
+            if session:
+                self.state.remove_connection(session.user_id, self.namespace, request.sid)
+            if session and principal:
+                logger.info(f"Usuario {principal.username} desconectado de namespace {self.namespace}")
                 
         except Exception as e:
             logger.error(f"Error en desconexión de namespace {self.namespace}: {str(e)}")
@@ -133,28 +150,26 @@ class BaseNamespace(Namespace):
         return True
     
     def _register_user_connection(self, user: User):
-        """Registra la conexión del usuario"""
-        self.connected_users[str(user.id)] = {
-            'user_id': str(user.id),
-            'username': user.username,
-            'role': user.role.value,
-            'session_id': request.sid,
-            'connected_at': datetime.now(timezone.utc),
-            'last_activity': datetime.now(timezone.utc)
-        }
+        """Registra la conexión del usuario (una entrada por pestaña/sid)"""
+        self.sessions.register(self.namespace, request.sid, user)
+        self.state.add_connection(str(user.id), self.namespace, request.sid)
+        
+        # Sala personal: permite emitir al usuario desde cualquier worker
+        join_room(f'user_{user.id}')
     
     def _get_current_user_id(self) -> Optional[str]:
         """Obtiene el ID del usuario actual por session_id"""
-        session_id = request.sid
-        for user_id, info in self.connected_users.items():
-            if info['session_id'] == session_id:
-                return user_id
-        return None
+        session = self.sessions.get(self.namespace, request.sid)
+        return session.user_id if session else None
     
-    def _get_current_user(self) -> Optional[User]:
-        """Obtiene el usuario actual"""
-        user_id = self._get_current_user_id()
-        return User.query.get(user_id) if user_id else None
+    def _get_current_user(self) -> Optional[SocketPrincipal]:
+        """
+        Obtiene el principal en caché del usuario actual
+        
+        No consulta la base de datos; usar ``load_user()`` sobre el
+        resultado cuando se necesite el modelo ``User``.
+        """
+        return self.sessions.principal_for(self.namespace, request.sid)
     
     def _emit_error(self, message: str, code: str = "ERROR"):
         """Emite un error al cliente"""
@@ -165,9 +180,10 @@ class BaseNamespace(Namespace):
         })
     
     def _update_user_activity(self, user_id: str):
-        """Actualiza la última actividad del usuario"""
-        if user_id in self.connected_users:
-            self.connected_users[user_id]['last_activity'] = datetime.now(timezone.utc)
+        """Actualiza la última actividad de la sesión actual del usuario"""
+        session = self.sessions.get(self.namespace, request.sid)
+        if session and session.user_id == user_id:
+            self.sessions.touch(self.namespace, request.sid)
 
 
 class ChatNamespace(BaseNamespace):
@@ -183,7 +199,6 @@ class ChatNamespace(BaseNamespace):
     def __init__(self):
         super().__init__('/chat')
         self.active_rooms: dict[str, set[str]] = {}
-        self.typing_users: dict[str, dict[str, datetime]] = {}
     
     def _authorize_namespace_access(self, user: User) -> bool:
         """Solo usuarios activos pueden acceder al chat"""
@@ -194,6 +209,11 @@ class ChatNamespace(BaseNamespace):
             UserRole.CLIENT
         ]
     
+    def on_disconnect(self):
+        """Cancela las suscripciones de typing de la conexión"""
+        self.presence.unsubscribe(self.namespace, request.sid)
+        super().on_disconnect()
+    
     @rate_limit(rate=30, per=60)  # 30 mensajes por minuto
     def on_send_message(self, data):
         """Envía un mensaje en el chat"""
@@ -279,8 +299,9 @@ class ChatNamespace(BaseNamespace):
                 self._emit_error("Access denied to room")
                 return
             
-            # Unirse a la sala
+            # Unirse a la sala y recibir su typing en los frames de presencia
             join_room(room)
+            self.presence.subscribe(self.namespace, request.sid, rooms=[room])
             
             # Registrar en salas activas
             if room not in self.active_rooms:
@@ -320,6 +341,8 @@ class ChatNamespace(BaseNamespace):
             
             # Dejar la sala
             leave_room(room)
+            self.presence.unsubscribe(self.namespace, request.sid, rooms=[room])
+            self.presence.typing(room, user.id, False)
             
             # Actualizar salas activas
             if room in self.active_rooms:
@@ -351,17 +374,8 @@ class ChatNamespace(BaseNamespace):
             if not room or not self._can_access_room(user, room):
                 return
             
-            # Registrar usuario escribiendo
-            if room not in self.typing_users:
-                self.typing_users[room] = {}
-            self.typing_users[room][str(user.id)] = datetime.now(timezone.utc)
-            
-            # Notificar a otros en la sala
-            self.emit('user_typing', {
-                'user': format_user_info(user),
-                'room': room,
-                'timestamp': format_datetime(datetime.now(timezone.utc))
-            }, room=room, include_self=False)
+            # Solo el cambio de estado se difunde, en el siguiente frame de la sala
+            self.presence.typing(room, user.id, True)
             
         except Exception as e:
             logger.error(f"Error en typing start: {str(e)}")
@@ -377,22 +391,62 @@ class ChatNamespace(BaseNamespace):
             if not room:
                 return
             
-            # Remover usuario de typing
-            if room in self.typing_users and str(user.id) in self.typing_users[room]:
-                del self.typing_users[room][str(user.id)]
-                if not self.typing_users[room]:
-                    del self.typing_users[room]
-            
-            # Notificar a otros en la sala
-            self.emit('user_stopped_typing', {
-                'user': format_user_info(user),
-                'room': room,
-                'timestamp': format_datetime(datetime.now(timezone.utc))
-            }, room=room, include_self=False)
+            self.presence.typing(room, user.id, False)
             
         except Exception as e:
             logger.error(f"Error en typing stop: {str(e)}")
     
+    @rate_limit(rate=60, per=60)  # 60 páginas de historial por minuto
+    def on_get_history(self, data):
+        """
+        Envía una página del historial de una conversación
+        
+        data: {'conversation_id', 'cursor'?, 'direction'?, 'around'?, 'limit'?, 'request_id'?}
+        Responde con 'history_page' sobre la conexión existente; el cliente
+        sigue pidiendo páginas con los cursores 'before'/'after' recibidos.
+        """
+        try:
+            user = self._get_current_user()
+            if not user:
+                self._emit_error("User not authenticated")
+                return
+            
+            conversation_id = data.get('conversation_id')
+            if not conversation_id:
+                self._emit_error("conversation_id is required")
+                return
+            
+            if not Conversation.is_participant(conversation_id, user.id):
+                self._emit_error("Access denied to conversation")
+                return
+            
+            if data.get('around'):
+                history = Message.get_history_around(
+                    conversation_id, data['around'], limit=data.get('limit')
+                )
+            else:
+                history = Message.get_history(
+                    conversation_id,
+                    cursor=data.get('cursor'),
+                    direction=data.get('direction', 'older'),
+                    limit=data.get('limit')
+                )
+            
+            history['conversation_id'] = conversation_id
+            history['request_id'] = data.get('request_id')
+            emit('history_page', history)
+            
+            self._update_user_activity(str(user.id))
+            
+        except (InvalidCursorError, ValidationError) as e:
+            self._emit_error(str(e), "INVALID_HISTORY_REQUEST")
+        except SQLAlchemyError as e:
+            logger.error(f"Error de base de datos al obtener historial: {str(e)}")
+            self._emit_error("Database error")
+        except Exception as e:
+            logger.error(f"Error obteniendo historial: {str(e)}")
+            self._emit_error("Failed to load history")
+    
     def _can_access_room(self, user: User, room: str) -> bool:
         """Verifica si el usuario puede acceder a una sala específica"""
         try:
@@ -434,7 +488,7 @@ class ChatNamespace(BaseNamespace):
         return (
             project.entrepreneur_id == user.id or
             user.role == UserRole.ADMIN or
-            (user.role == UserRole.ALLY and user in project.mentors)
+            (user.role == UserRole.ALLY and any(mentor.id == user.id for mentor in project.mentors))
         )
 
 
@@ -566,7 +620,7 @@ class NotificationNamespace(BaseNamespace):
         return (
             project.entrepreneur_id == user.id or
             user.role == UserRole.ADMIN or
-            (user.role == UserRole.ALLY and user in project.mentors)
+            (user.role == UserRole.ALLY and any(mentor.id == user.id for mentor in project.mentors))
         )
 
 
@@ -575,14 +629,18 @@ class PresenceNamespace(BaseNamespace):
     Namespace para tracking de presencia de usuarios
     
     Maneja el estado de presencia y actividad de usuarios:
-    - Estado online/offline
+    - Estado online/offline con TTL renovado por heartbeat
     - Última actividad
     - Ubicación actual en la aplicación
+    
+    Cada conexión se suscribe a los usuarios que le interesan y recibe sus
+    cambios agrupados en un ``presence_frame`` por tick.
     """
     
+    MAX_SUBSCRIPTIONS = 500
+    
     def __init__(self):
         super().__init__('/presence')
-        self.user_presence: dict[str, dict[str, Any]] = {}
     
     def on_connect(self, auth):
         """Maneja conexión y establece presencia"""
@@ -595,10 +653,19 @@ class PresenceNamespace(BaseNamespace):
     def on_disconnect(self):
         """Maneja desconexión y actualiza presencia"""
         user = self._get_current_user()
-        if user:
-            self._update_presence(user, 'offline')
-        
+        self.presence.unsubscribe(self.namespace, request.sid)
         super().on_disconnect()
+        
+        # Con varias pestañas (en cualquier worker), solo se pasa a offline al cerrar la última
+        if user and not self.state.connection_count(user.user_id, self.namespace):
+            self.presence.set_offline(user.user_id)
+    
+    def on_heartbeat(self, data=None):
+        """Renueva el TTL de la presencia sin cambiar el estado"""
+        user = self._get_current_user()
+        if user:
+            self.presence.heartbeat(user.user_id, user.username)
+            self._update_user_activity(user.user_id)
     
     def on_update_status(self, data):
         """Actualiza el estado del usuario"""
@@ -630,8 +697,8 @@ class PresenceNamespace(BaseNamespace):
             logger.error(f"Error actualizando estado: {str(e)}")
             self._emit_error("Failed to update status")
     
-    def on_get_presence(self, data):
-        """Obtiene información de presencia de usuarios"""
+    def on_subscribe_presence(self, data):
+        """Suscribe la conexión a la presencia de una lista de usuarios"""
         try:
             user = self._get_current_user()
             if not user:
@@ -639,79 +706,104 @@ class PresenceNamespace(BaseNamespace):
                 return
             
             user_ids = data.get('user_ids', [])
-            if not user_ids:
+            if not isinstance(user_ids, list) or not user_ids:
                 self._emit_error("User IDs required")
                 return
             
-            presence_data = {}
-            for user_id in user_ids:
-                if user_id in self.user_presence:
-                    # Solo compartir información básica
-                    presence_data[user_id] = {
-                        'status': self.user_presence[user_id]['status'],
-                        'last_seen': format_datetime(
-                            self.user_presence[user_id]['last_activity']
-                        )
-                    }
+            if len(user_ids) > self.MAX_SUBSCRIPTIONS:
+                self._emit_error(f"Too many user IDs (max {self.MAX_SUBSCRIPTIONS})")
+                return
+            
+            allowed_ids = self._visible_user_ids(user, user_ids)
             
+            # Estado inicial; los cambios posteriores llegan en presence_frame
             emit('presence_data', {
-                'presence': presence_data,
+                'presence': self.presence.subscribe(self.namespace, request.sid, user_ids=allowed_ids),
+                'denied_user_ids': [user_id for user_id in map(str, user_ids) if user_id not in allowed_ids],
                 'timestamp': format_datetime(datetime.now(timezone.utc))
             })
             
         except Exception as e:
-            logger.error(f"Error obteniendo presencia: {str(e)}")
-            self._emit_error("Failed to get presence data")
+            logger.error(f"Error suscribiendo a presencia: {str(e)}")
+            self._emit_error("Failed to subscribe to presence")
+    
+    def on_unsubscribe_presence(self, data):
+        """Cancela la suscripción a la presencia de una lista de usuarios"""
+        user_ids = data.get('user_ids') if isinstance(data, dict) else None
+        self.presence.unsubscribe(self.namespace, request.sid, user_ids=user_ids or [])
     
-    def _update_presence(self, user: User, status: str, location: str = ''):
-        """Actualiza la información de presencia del usuario"""
+    def on_get_presence(self, data):
+        """Obtiene información de presencia de usuarios"""
         try:
-            user_id = str(user.id)
-            now = datetime.now(timezone.utc)
+            user = self._get_current_user()
+            if not user:
+                self._emit_error("User not authenticated")
+                return
             
-            # Actualizar datos de presencia
-            self.user_presence[user_id] = {
-                'user_id': user_id,
-                'username': user.username,
-                'status': status,
-                'location': location,
-                'last_activity': now,
-                'session_id': request.sid
-            }
+            user_ids = data.get('user_ids', [])
+            if not isinstance(user_ids, list) or not user_ids:
+                self._emit_error("User IDs required")
+                return
             
-            # Emitir cambio de presencia a usuarios relevantes
-            self._broadcast_presence_change(user, status, location, now)
+            # Solo compartir información básica de usuarios visibles
+            presence_data = {
+                user_id: {
+                    'status': presence['status'],
+                    'last_seen': presence['last_activity']
+                }
+                for user_id, presence in self.presence.get(
+                    self._visible_user_ids(user, user_ids[:self.MAX_SUBSCRIPTIONS])
+                ).items()
+            }
             
-            logger.info(f"Presencia actualizada para {user.username}: {status}")
+            emit('presence_data', {
+                'presence': presence_data,
+                'timestamp': format_datetime(datetime.now(timezone.utc))
+            })
             
         except Exception as e:
-            logger.error(f"Error actualizando presencia: {str(e)}")
+            logger.error(f"Error obteniendo presencia: {str(e)}")
+            self._emit_error("Failed to get presence data")
     
-    def _broadcast_presence_change(self, user: User, status: str, location: str, timestamp: datetime):
-        """Difunde cambio de presencia a usuarios relevantes"""
+    def _visible_user_ids(self, user: SocketPrincipal, user_ids: list) -> list[str]:
+        """
+        Filtra los ids cuya presencia puede ver el usuario.
+        
+        Son visibles el propio usuario y sus contactos: quienes comparten con
+        él alguna conversación (directa o de grupo). Los administradores ven
+        a todos. El resto de ids se descarta.
+        """
+        requested = list(dict.fromkeys(str(user_id) for user_id in user_ids))
+        if user.role == UserRole.ADMIN:
+            return requested
+        
+        allowed = {user.user_id}
+        others = [user_id for user_id in requested if user_id not in allowed]
+        if others:
+            from sqlalchemy import select
+            from app.extensions import db
+            from app.models.message import conversation_participants as participants
+            
+            shared_conversations = select(participants.c.conversation_id).where(
+                participants.c.user_id == user.id
+            )
+            allowed.update(str(row[0]) for row in db.session.execute(
+                select(participants.c.user_id).distinct().where(
+                    participants.c.conversation_id.in_(shared_conversations),
+                    participants.c.user_id.in_(others)
+                )
+            ))
+        
+        return [user_id for user_id in requested if user_id in allowed]
+    
+    def _update_presence(self, user: SocketPrincipal, status: str, location: str = ''):
+        """Actualiza la presencia; el cambio se difunde en el siguiente tick a los suscriptores"""
         try:
-            presence_data = {
-                'user': format_user_info(user),
-                'status': status,
-                'location': location,
-                'timestamp': format_datetime(timestamp)
-            }
-            
-            # Emitir a usuarios del mismo rol
-            self.emit('presence_changed', presence_data, room=f'role_{user.role.value}')
-            
-            # Si es emprendedor, emitir a sus mentores
-            if user.role == UserRole.ENTREPRENEUR:
-                # Aquí implementarías la lógica para obtener mentores del emprendedor
-                pass
-            
-            # Si es mentor, emitir a sus emprendedores
-            if user.role == UserRole.ALLY:
-                # Aquí implementarías la lógica para obtener emprendedores del mentor
-                pass
+            self.presence.heartbeat(user.user_id, user.username, status=status, location=location)
+            logger.info(f"Presencia actualizada para {user.username}: {status}")
             
         except Exception as e:
-            logger.error(f"Error difundiendo cambio de presencia: {str(e)}")
+            logger.error(f"Error actualizando presencia: {str(e)}")
 
 
 class CollaborationNamespace(BaseNamespace):
@@ -726,8 +818,38 @@ class CollaborationNamespace(BaseNamespace):
     
     def __init__(self):
         super().__init__('/collaboration')
-        self.active_documents: dict[str, dict[str, Any]] = {}
-        self.document_cursors: dict[str, dict[str, Any]] = {}
+        self.engine: Optional[CollaborationEngine] = None
+        self._sid_documents: dict[str, set[str]] = {}
+        # Sala propia de este worker: cada worker difunde el log a sus conexiones
+        self.worker_id = uuid.uuid4().hex
+    
+    def _get_engine(self) -> CollaborationEngine:
+        """Crea el motor de colaboración y arranca su bucle de ticks"""
+        if self.engine is None:
+            # El log compartido ordena las operaciones entre workers
+            self.engine = CollaborationEngine(
+                broadcast=self._broadcast_operations,
+                persist=_persist_document_snapshot,
+                state=self.state
+            )
+            app = current_app._get_current_object()
+            self.socketio.start_background_task(self._run_engine, app)
+        return self.engine
+    
+    def _run_engine(self, app):
+        """Bucle de ticks con contexto de aplicación (instantáneas en BD)"""
+        with app.app_context():
+            self.engine.run(sleep=self.socketio.sleep)
+    
+    def _worker_room(self, document_id) -> str:
+        return f'document_{document_id}@{self.worker_id}'
+    
+    def _broadcast_operations(self, document_id, operations: list[dict[str, Any]]):
+        """Difunde en un solo mensaje, y en orden, las operaciones del tick"""
+        self.emit('document_operations', {
+            'document_id': document_id,
+            'operations': operations
+        }, room=self._worker_room(document_id))
     
     def on_join_document(self, data):
         """Une usuario a sesión de colaboración en documento"""
@@ -737,7 +859,7 @@ class CollaborationNamespace(BaseNamespace):
                 self._emit_error("User not authenticated")
                 return
             
-            document_id = data.get('document_id')
+            document_id = str(data.get('document_id') or '')
             if not document_id:
                 self._emit_error("Document ID required")
                 return
@@ -748,29 +870,29 @@ class CollaborationNamespace(BaseNamespace):
                 self._emit_error("Access denied to document")
                 return
             
+            # Abrir la sesión de edición desde la última instantánea persistida
+            session = self._get_engine().open(
+                document_id, lambda: _load_document_snapshot(document_id)
+            )
+            
             # Unirse a la sala del documento
             room = f'document_{document_id}'
             join_room(room)
-            
-            # Registrar documento activo
-            if document_id not in self.active_documents:
-                self.active_documents[document_id] = {
-                    'users': {},
-                    'content': document.content or '',
-                    'version': 1
-                }
-            
-            self.active_documents[document_id]['users'][str(user.id)] = {
+            join_room(self._worker_room(document_id))
+            self._sid_documents.setdefault(request.sid, set()).add(document_id)
+            # Un miembro por conexión: el documento sigue abierto mientras quede una pestaña
+            self.state.join_room(room, request.sid, {
+                'user_id': user.user_id,
                 'user': format_user_info(user),
                 'joined_at': format_datetime(datetime.now(timezone.utc))
-            }
+            })
+            editors = {member['user_id']: member for member in self.state.room_members(room).values()}
             
-            # Emitir confirmación y estado actual
+            # Instantánea más la cola del log desde esa instantánea
             emit('document_joined', {
                 'document_id': document_id,
-                'content': self.active_documents[document_id]['content'],
-                'version': self.active_documents[document_id]['version'],
-                'users': list(self.active_documents[document_id]['users'].values()),
+                **session.join_state(),
+                'users': list(editors.values()),
                 'timestamp': format_datetime(datetime.now(timezone.utc))
             })
             
@@ -788,53 +910,79 @@ class CollaborationNamespace(BaseNamespace):
             self._emit_error("Failed to join document")
     
     def on_document_change(self, data):
-        """Maneja cambios en el documento"""
+        """
+        Recibe una operación de edición
+        
+        ``data``: ``{'document_id', 'revision', 'operation'}`` donde
+        ``operation`` es la lista de componentes retain/insert/delete escrita
+        sobre ``revision``. Se confirma con ``document_ack`` y se difunde en el
+        siguiente tick como parte de ``document_operations``.
+        """
         try:
-            user = self._get_current_user()
-            if not user:
-                self._emit_error("User not authenticated")
-                return
-            
-            document_id = data.get('document_id')
-            changes = data.get('changes', [])
-            version = data.get('version', 1)
+            document_id = str(data.get('document_id') or '')
+            operation = data.get('operation')
+            revision = data.get('revision')
             
-            if not document_id or not changes:
-                self._emit_error("Document ID and changes required")
+            if not document_id or operation is None or not isinstance(revision, int):
+                self._emit_error("Document ID, revision and operation required")
                 return
             
-            # Verificar que el usuario esté en el documento
-            if (document_id not in self.active_documents or 
-                str(user.id) not in self.active_documents[document_id]['users']):
+            # Verificar que la conexión esté en el documento (sin consultas)
+            if document_id not in self._sid_documents.get(request.sid, ()):
                 self._emit_error("User not in document session")
                 return
             
-            # Aplicar cambios y actualizar versión
-            current_version = self.active_documents[document_id]['version']
-            if version != current_version:
-                self._emit_error("Version conflict")
-                return
-            
-            # Aquí implementarías la lógica de operational transformation
-            # Por simplicidad, asumimos que los cambios son válidos
-            self.active_documents[document_id]['version'] += 1
-            
-            # Emitir cambios a otros usuarios
-            change_data = {
-                'document_id': document_id,
-                'changes': changes,
-                'version': self.active_documents[document_id]['version'],
-                'author': format_user_info(user),
-                'timestamp': format_datetime(datetime.now(timezone.utc))
-            }
-            
-            self.emit('document_changed', change_data, 
-                     room=f'document_{document_id}', include_self=False)
+            new_revision = self.engine.submit(document_id, revision, operation, author=request.sid)
+            emit('document_ack', {'document_id': document_id, 'revision': new_revision})
             
+        except StaleRevisionError:
+            # El cliente quedó demasiado atrás: reenviar instantánea y cola
+            session = self.engine.get(document_id)
+            if session:
+                emit('document_resync', {'document_id': document_id, **session.join_state()})
+        except OperationError as e:
+            self._emit_error(str(e), "INVALID_OPERATION")
         except Exception as e:
             logger.error(f"Error en cambio de documento: {str(e)}")
             self._emit_error("Failed to process document change")
     
+    def on_leave_document(self, data):
+        """Sale de la sesión de colaboración de un documento"""
+        user = self._get_current_user()
+        document_id = str((data or {}).get('document_id') or '')
+        if user and document_id in self._sid_documents.get(request.sid, ()):
+            self._leave_document(user, document_id)
+    
+    def on_disconnect(self):
+        """Sale de todos los documentos de la conexión"""
+        user = self._get_current_user()
+        if user:
+            for document_id in list(self._sid_documents.get(request.sid, ())):
+                self._leave_document(user, document_id)
+        self._sid_documents.pop(request.sid, None)
+        super().on_disconnect()
+    
+    def _leave_document(self, user: User, document_id: str):
+        """Abandona la sala y cierra la sesión local si era el último editor del worker"""
+        room = f'document_{document_id}'
+        leave_room(room)
+        leave_room(self._worker_room(document_id))
+        self._sid_documents.get(request.sid, set()).discard(document_id)
+        self.state.leave_room(room, request.sid)
+        
+        # La sesión es local al worker: se cierra cuando no le quedan conexiones
+        # en el documento aunque otros workers sigan editándolo
+        still_open = any(document_id in documents for documents in self._sid_documents.values())
+        if not still_open and self.engine:
+            # Difundir lo pendiente y guardar instantánea final
+            self.engine.close(document_id)
+        
+        self.emit('user_left_document', {
+            'user': format_user_info(user),
+            'document_id': document_id,
+            'timestamp': format_datetime(datetime.now(timezone.utc))
+        }, room=room)
+    
     def _can_access_document(self, user: User, document: Document) -> bool:
         """Verifica si el usuario puede acceder al documento"""
         return (
@@ -1111,6 +1259,44 @@ class MentorshipNamespace(BaseNamespace):
         )
 
 
+def _load_document_snapshot(document_id) -> tuple[str, int]:
+    """Lee la última instantánea persistida del documento"""
+    from sqlalchemy import select
+    from app.extensions import db
+    
+    row = db.session.execute(
+        select(Document.content, Document.content_revision).where(Document.id == document_id)
+    ).first()
+    if row is None:
+        return '', 0
+    return row.content or '', row.content_revision or 0
+
+
+def _persist_document_snapshot(document_id, content: str, revision: int):
+    """
+    Guarda la instantánea de colaboración en el documento
+    
+    Solo avanza ``content_revision``: varios workers pueden guardar la misma
+    revisión y una instantánea atrasada nunca pisa una más reciente.
+    """
+    from sqlalchemy import or_, update
+    from app.extensions import db
+    
+    try:
+        db.session.execute(
+            update(Document)
+            .where(
+                Document.id == document_id,
+                or_(Document.content_revision.is_(None), Document.content_revision < revision)
+            )
+            .values(content=content, content_revision=revision, word_count=len(content.split()))
+        )
+        db.session.commit()
+    except SQLAlchemyError:
+        db.session.rollback()
+        raise
+
+
 # Registro de todos los namespaces disponibles
 AVAILABLE_NAMESPACES = {
     '/chat': ChatNamespace,
@@ -1131,6 +1317,8 @@ def register_all_namespaces(socketio):
         socketio: Instancia de SocketIO
     """
     try:
+        watch_user_changes()
+        
         for namespace_path, namespace_class in AVAILABLE_NAMESPACES.items():
             namespace_instance = namespace_class()
             socketio.on_namespace(namespace_instance)
@@ -0,0 +1,396 @@
+"""
+Presencia Coalescida - Ecosistema de Emprendimiento
+===================================================
+
+Subsistema de presencia y "escribiendo..." pensado para miles de usuarios
+conectados:
+
+- Presencia con TTL: cada heartbeat renueva la entrada en el almacén de
+  estado; si un worker cae, sus usuarios caducan solos.
+- Suscripciones por interés: cada conexión solo recibe la presencia de los
+  usuarios que sigue (``user:{id}``) y el typing de sus salas (``room:{sala}``).
+- Coalescencia por tick: los cambios se acumulan y, una vez por intervalo,
+  cada suscriptor recibe un único ``presence_frame`` con todos sus deltas.
+
+Los deltas de cada worker se publican en el canal ``presence`` del almacén,
+de modo que en modo cluster todos los workers entregan los cambios a sus
+propios suscriptores.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable, Optional
+
+from app.sockets.state import SocketStateStore
+
+logger = logging.getLogger(__name__)
+
+PRESENCE_CHANNEL = 'presence'
+
+# Campos cuyo cambio genera un delta (last_activity se renueva en cada heartbeat)
+_SIGNIFICANT_FIELDS = ('status', 'location', 'custom_message')
+
+Subscriber = tuple[str, str]  # (namespace, sid)
+
+
+def user_topic(user_id) -> str:
+    """Tópico de presencia de un usuario."""
+    return f'user:{user_id}'
+
+
+def room_topic(room: str) -> str:
+    """Tópico de typing de una sala."""
+    return f'room:{room}'
+
+
+# ====================================
+# ÍNDICE DE SUSCRIPCIONES
+# ====================================
+
+class SubscriptionIndex:
+    """Índice bidireccional suscriptor <-> tópicos."""
+
+    def __init__(self, max_topics: int = 500):
+        self.max_topics = max_topics
+        self._lock = threading.Lock()
+        self._by_topic: dict[str, set[Subscriber]] = defaultdict(set)
+        self._by_subscriber: dict[Subscriber, set[str]] = defaultdict(set)
+
+    def add(self, subscriber: Subscriber, topics: Iterable[str]) -> list[str]:
+        """
+        Suscribir a varios tópicos respetando el máximo por conexión.
+
+        Returns:
+            Tópicos efectivamente añadidos
+        """
+        added = []
+        with self._lock:
+            current = self._by_subscriber[subscriber]
+            for topic in topics:
+                if topic in current:
+                    continue
+                if len(current) >= self.max_topics:
+                    break
+                current.add(topic)
+                self._by_topic[topic].add(subscriber)
+                added.append(topic)
+        return added
+
+    def remove(self, subscriber: Subscriber, topics: Optional[Iterable[str]] = None):
+        """Cancelar tópicos concretos o todas las suscripciones de una conexión."""
+        with self._lock:
+            current = self._by_subscriber.get(subscriber)
+            if not current:
+                return
+            for topic in list(current if topics is None else topics):
+                current.discard(topic)
+                subscribers = self._by_topic.get(topic)
+                if subscribers is not None:
+                    subscribers.discard(subscriber)
+                    if not subscribers:
+                        del self._by_topic[topic]
+            if not current:
+                del self._by_subscriber[subscriber]
+
+    def subscribers(self, topic: str) -> set[Subscriber]:
+        """Conexiones suscritas a un tópico."""
+        with self._lock:
+            return set(self._by_topic.get(topic, ()))
+
+    def topics(self, subscriber: Subscriber) -> set[str]:
+        """Tópicos de una conexión."""
+        with self._lock:
+            return set(self._by_subscriber.get(subscriber, ()))
+
+    def watched_users(self) -> list[str]:
+        """IDs de usuario con al menos un suscriptor local."""
+        with self._lock:
+            return [topic[5:] for topic in self._by_topic if topic.startswith('user:')]
+
+
+# ====================================
+# HUB DE PRESENCIA
+# ====================================
+
+class PresenceHub:
+    """
+    Acumula deltas de presencia/typing y los entrega coalescidos por tick.
+
+    Args:
+        store: Almacén de estado compartido (presencia con TTL y pub/sub)
+        deliver: ``fn(namespace, sid, frame)`` que envía un frame a una conexión
+        ttl: Segundos de validez de la presencia sin heartbeat
+        typing_ttl: Segundos tras los que un "escribiendo" caduca solo
+        tick: Segundos entre entregas
+        max_topics: Máximo de tópicos por conexión
+    """
+
+    def __init__(self, store: SocketStateStore, deliver: Callable[[str, str, dict[str, Any]], None],
+                 ttl: int = 90, typing_ttl: float = 6.0, tick: float = 0.25, max_topics: int = 500):
+        self.store = store
+        self.deliver = deliver
+        self.ttl = ttl
+        self.typing_ttl = typing_ttl
+        self.tick = tick
+        self.index = SubscriptionIndex(max_topics)
+        self.node_id = uuid.uuid4().hex
+
+        self._lock = threading.Lock()
+        self._outbound = self._empty_batch()
+        self._inbound = self._empty_batch()
+        self._typing: dict[str, dict[str, float]] = defaultdict(dict)
+        self._known_status: dict[str, str] = {}
+        self._last_sweep = time.monotonic()
+        self._running = False
+
+        store.subscribe(PRESENCE_CHANNEL, self._receive)
+
+    @staticmethod
+    def _empty_batch() -> dict[str, dict]:
+        return {'presence': {}, 'typing': defaultdict(dict)}
+
+    # ----- Presencia -----
+
+    def heartbeat(self, user_id, username: Optional[str] = None, status: Optional[str] = None,
+                  location: Optional[str] = None, custom_message: Optional[str] = None) -> dict[str, Any]:
+        """
+        Renovar la presencia de un usuario.
+
+        Los campos omitidos conservan su valor actual. Solo se genera un delta
+        si cambia el estado, la ubicación o el mensaje personalizado.
+
+        Returns:
+            Presencia guardada
+        """
+        user_id = str(user_id)
+        current = self.store.get_presence([user_id]).get(user_id, {})
+        presence = {
+            'user_id': user_id,
+            'username': username or current.get('username'),
+            'status': status or current.get('status') or 'online',
+            'location': current.get('location', '') if location is None else location,
+            'custom_message': current.get('custom_message', '') if custom_message is None else custom_message,
+            'last_activity': _now_iso()
+        }
+        self.store.set_presence(user_id, presence, ttl=self.ttl)
+
+        if any(presence[name] != current.get(name) for name in _SIGNIFICANT_FIELDS):
+            with self._lock:
+                self._outbound['presence'][user_id] = _public(presence)
+        return presence
+
+    def set_offline(self, user_id):
+        """Eliminar la presencia de un usuario y notificar a sus suscriptores."""
+        user_id = str(user_id)
+        self.store.clear_presence(user_id)
+        with self._lock:
+            self._outbound['presence'][user_id] = {'status': 'offline', 'last_activity': _now_iso()}
+            for room, typists in self._typing.items():
+                if typists.pop(user_id, None) is not None:
+                    self._outbound['typing'][room][user_id] = False
+
+    def get(self, user_ids: Iterable) -> dict[str, dict[str, Any]]:
+        """Presencia vigente (pública) de varios usuarios."""
+        presence = self.store.get_presence([str(user_id) for user_id in user_ids])
+        return {user_id: _public(data) for user_id, data in presence.items()}
+
+    # ----- Typing -----
+
+    def typing(self, room: str, user_id, is_typing: bool = True):
+        """Registrar que un usuario empieza o deja de escribir en una sala."""
+        user_id = str(user_id)
+        with self._lock:
+            typists = self._typing[room]
+            was_typing = user_id in typists
+            if is_typing:
+                typists[user_id] = time.monotonic() + self.typing_ttl
+            else:
+                typists.pop(user_id, None)
+                if not typists:
+                    del self._typing[room]
+            if was_typing != is_typing:
+                self._outbound['typing'][room][user_id] = is_typing
+
+    # ----- Suscripciones -----
+
+    def subscribe(self, namespace: str, sid: str, user_ids: Iterable = (), rooms: Iterable[str] = ()) -> dict[str, dict[str, Any]]:
+        """
+        Suscribir una conexión a usuarios y salas.
+
+        Returns:
+            Presencia actual de los usuarios efectivamente suscritos
+        """
+        topics = [user_topic(user_id) for user_id in user_ids] + [room_topic(room) for room in rooms]
+        added = self.index.add((namespace, sid), topics)
+        snapshot = self.get(topic[5:] for topic in added if topic.startswith('user:'))
+        for user_id, presence in snapshot.items():
+            self._known_status[user_id] = presence['status']
+        return snapshot
+
+    def unsubscribe(self, namespace: str, sid: str, user_ids: Optional[Iterable] = None,
+                    rooms: Optional[Iterable[str]] = None):
+        """Cancelar suscripciones concretas o, sin argumentos, todas las de la conexión."""
+        if user_ids is None and rooms is None:
+            self.index.remove((namespace, sid))
+            return
+        topics = [user_topic(user_id) for user_id in user_ids or ()] + [room_topic(room) for room in rooms or ()]
+        self.index.remove((namespace, sid), topics)
+
+    # ----- Ticks -----
+
+    def flush(self):
+        """Publicar los deltas locales y entregar los frames pendientes."""
+        now = time.monotonic()
+        with self._lock:
+            self._expire_typing(now)
+            outbound, self._outbound = self._outbound, self._empty_batch()
+
+        if outbound['presence'] or outbound['typing']:
+            self.store.publish(PRESENCE_CHANNEL, {
+                'origin': self.node_id,
+                'presence': outbound['presence'],
+                'typing': dict(outbound['typing'])
+            })
+
+        if now - self._last_sweep >= self.ttl / 3:
+            self._last_sweep = now
+            self._sweep_expired()
+
+        with self._lock:
+            inbound, self._inbound = self._inbound, self._empty_batch()
+        if inbound['presence'] or inbound['typing']:
+            self._deliver(inbound)
+
+    def run(self, sleep: Callable[[float], None] = time.sleep):
+        """Bucle de ticks (ejecutar como tarea de fondo)."""
+        self._running = True
+        while self._running:
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error en tick de presencia: {str(e)}")
+            sleep(self.tick)
+
+    def stop(self):
+        """Detener el bucle de ticks."""
+        self._running = False
+
+    def _receive(self, message: dict[str, Any]):
+        """Fusionar un lote publicado por cualquier worker (el último valor gana)."""
+        with self._lock:
+            self._inbound['presence'].update(message.get('presence') or {})
+            for room, changes in (message.get('typing') or {}).items():
+                self._inbound['typing'][room].update(changes)
+
+    def _expire_typing(self, now: float):
+        for room in list(self._typing):
+            typists = self._typing[room]
+            for user_id, expires_at in list(typists.items()):
+                if expires_at <= now:
+                    del typists[user_id]
+                    self._outbound['typing'][room][user_id] = False
+            if not typists:
+                del self._typing[room]
+
+    def _sweep_expired(self):
+        """Notificar como offline a los usuarios seguidos cuya presencia caducó."""
+        watched_users = set(self.index.watched_users())
+        for user_id in list(self._known_status):
+            if user_id not in watched_users:
+                del self._known_status[user_id]
+
+        watched = [user_id for user_id in watched_users
+                   if self._known_status.get(user_id, 'offline') != 'offline']
+        if not watched:
+            return
+        alive = self.store.get_presence(watched)
+        with self._lock:
+            for user_id in watched:
+                if user_id not in alive and user_id not in self._inbound['presence']:
+                    self._inbound['presence'][user_id] = {'status': 'offline', 'last_activity': None}
+
+    def _deliver(self, batch: dict[str, dict]):
+        frames: dict[Subscriber, dict[str, dict]] = defaultdict(lambda: {'presence': {}, 'typing': {}})
+
+        for user_id, presence in batch['presence'].items():
+            self._known_status[user_id] = presence.get('status', 'offline')
+            for subscriber in self.index.subscribers(user_topic(user_id)):
+                frames[subscriber]['presence'][user_id] = presence
+
+        for room, changes in batch['typing'].items():
+            for subscriber in self.index.subscribers(room_topic(room)):
+                frames[subscriber]['typing'][room] = changes
+
+        timestamp = _now_iso()
+        for (namespace, sid), frame in frames.items():
+            frame['timestamp'] = timestamp
+            try:
+                self.deliver(namespace, sid, frame)
+            except Exception as e:
+                logger.warning(f"No se pudo entregar presencia a {sid}: {str(e)}")
+
+
+def _public(presence: dict[str, Any]) -> dict[str, Any]:
+    """Campos de presencia que se comparten con otros usuarios."""
+    return {
+        'status': presence.get('status'),
+        'location': presence.get('location', ''),
+        'custom_message': presence.get('custom_message', ''),
+        'last_activity': presence.get('last_activity')
+    }
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+# ====================================
+# INSTANCIA GLOBAL
+# ====================================
+
+_presence_hub: Optional[PresenceHub] = None
+_hub_lock = threading.Lock()
+
+
+def get_presence_hub() -> PresenceHub:
+    """
+    Obtener el hub de presencia del proceso, arrancando su bucle de ticks.
+
+    Debe llamarse dentro del contexto de la aplicación.
+    """
+    global _presence_hub
+    if _presence_hub is not None:
+        return _presence_hub
+
+    from flask import current_app
+    from app.extensions import socketio
+    from app.sockets.state import get_state_store
+
+    with _hub_lock:
+        if _presence_hub is None:
+            def deliver(namespace, sid, frame):
+                socketio.emit('presence_frame', frame, room=sid, namespace=namespace)
+
+            hub = PresenceHub(
+                get_state_store(),
+                deliver,
+                ttl=current_app.config.get('SOCKETIO_PRESENCE_TTL', 90),
+                tick=current_app.config.get('SOCKETIO_PRESENCE_TICK', 0.25)
+            )
+            socketio.start_background_task(hub.run, socketio.sleep)
+            _presence_hub = hub
+    return _presence_hub
+
+
+__all__ = [
+    'PresenceHub',
+    'SubscriptionIndex',
+    'PRESENCE_CHANNEL',
+    'get_presence_hub',
+    'room_topic',
+    'user_topic'
+]
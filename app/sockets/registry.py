@@ -0,0 +1,334 @@
+"""
+Registro de Sesiones WebSocket - Ecosistema de Emprendimiento
+=============================================================
+
+Registro en memoria de las conexiones activas de todos los namespaces:
+
+- ``(namespace, sid) -> sesión``: resolución del usuario actual en O(1)
+- ``user_id -> {(namespace, sid)}``: varias pestañas/dispositivos por usuario
+- ``user_id -> SocketPrincipal``: instantánea ligera del usuario compartida por
+  todas sus sesiones, de modo que los eventos no consultan la base de datos
+
+La instantánea se invalida explícitamente cuando el usuario se desactiva o
+cambian sus datos (ver ``watch_user_changes``).
+"""
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# ====================================
+# PRINCIPAL
+# ====================================
+
+@dataclass(frozen=True)
+class SocketPrincipal:
+    """
+    Instantánea inmutable del usuario autenticado en un socket.
+
+    Expone los atributos que usan los manejadores (``id``, ``username``,
+    ``role``, nombre) sin mantener una instancia ORM ligada a una sesión de
+    base de datos. Para operaciones que necesitan el modelo usar ``load_user``.
+    """
+
+    id: Any
+    username: str
+    email: Optional[str]
+    first_name: str
+    last_name: str
+    role: Any
+    is_active: bool = True
+
+    @classmethod
+    def from_user(cls, user) -> 'SocketPrincipal':
+        """Crear la instantánea a partir de un ``User``."""
+        return cls(
+            id=user.id,
+            username=getattr(user, 'username', None) or user.email,
+            email=user.email,
+            first_name=user.first_name or '',
+            last_name=user.last_name or '',
+            role=user.role,
+            is_active=bool(user.is_active)
+        )
+
+    @property
+    def user_id(self) -> str:
+        """ID del usuario como cadena (clave del registro)."""
+        return str(self.id)
+
+    @property
+    def role_name(self) -> str:
+        """Nombre del rol, tanto si es enum como cadena."""
+        return getattr(self.role, 'value', self.role)
+
+    @property
+    def is_admin(self) -> bool:
+        """Verificar si el usuario es administrador."""
+        return self.role_name == 'admin'
+
+    @property
+    def full_name(self) -> str:
+        """Nombre completo del usuario."""
+        return f"{self.first_name} {self.last_name}".strip()
+
+    def load_user(self):
+        """Cargar el ``User`` ORM (solo cuando se va a modificar o relacionar)."""
+        from app.models.user import User
+        return User.query.get(self.id)
+
+
+@dataclass
+class SocketSession:
+    """Conexión de un usuario a un namespace."""
+
+    sid: str
+    namespace: str
+    user_id: str
+    connected_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    last_activity: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    info: dict[str, Any] = field(default_factory=dict)
+
+
+# ====================================
+# REGISTRO
+# ====================================
+
+class SessionRegistry:
+    """
+    Registro de sesiones indexado por sid y por usuario.
+
+    Todas las operaciones son O(1) (salvo las que devuelven colecciones) y
+    están protegidas por un lock, ya que los eventos pueden atenderse desde
+    varios hilos o greenlets.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._sessions: dict[tuple[str, str], SocketSession] = {}
+        self._user_sessions: dict[str, set[tuple[str, str]]] = {}
+        self._principals: dict[str, SocketPrincipal] = {}
+
+    # ----- Registro de conexiones -----
+
+    def register(self, namespace: str, sid: str, user, **info) -> SocketSession:
+        """
+        Registrar una conexión autenticada.
+
+        Args:
+            namespace: Namespace de la conexión
+            sid: ID de sesión de Socket.IO
+            user: ``User`` o ``SocketPrincipal``
+            **info: Datos adicionales de la conexión
+
+        Returns:
+            Sesión registrada
+        """
+        principal = user if isinstance(user, SocketPrincipal) else SocketPrincipal.from_user(user)
+        key = (namespace, sid)
+
+        with self._lock:
+            self._principals[principal.user_id] = principal
+            session = SocketSession(sid=sid, namespace=namespace, user_id=principal.user_id, info=info)
+            self._sessions[key] = session
+            self._user_sessions.setdefault(principal.user_id, set()).add(key)
+            return session
+
+    def unregister(self, namespace: str, sid: str) -> Optional[SocketSession]:
+        """
+        Eliminar una conexión.
+
+        El principal del usuario se descarta cuando se cierra su última sesión.
+
+        Returns:
+            Sesión eliminada o None si no estaba registrada
+        """
+        key = (namespace, sid)
+        with self._lock:
+            session = self._sessions.pop(key, None)
+            if session is None:
+                return None
+
+            keys = self._user_sessions.get(session.user_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._user_sessions[session.user_id]
+                    self._principals.pop(session.user_id, None)
+            return session
+
+    # ----- Consultas -----
+
+    def get(self, namespace: str, sid: str) -> Optional[SocketSession]:
+        """Obtener la sesión de un sid."""
+        return self._sessions.get((namespace, sid))
+
+    def principal_for(self, namespace: str, sid: str) -> Optional[SocketPrincipal]:
+        """Obtener el principal de un sid (una búsqueda en diccionario)."""
+        session = self._sessions.get((namespace, sid))
+        return self._principals.get(session.user_id) if session else None
+
+    def principal(self, user_id) -> Optional[SocketPrincipal]:
+        """Obtener el principal en caché de un usuario conectado."""
+        return self._principals.get(str(user_id))
+
+    def sessions_for_user(self, user_id, namespace: Optional[str] = None) -> list[SocketSession]:
+        """Obtener las sesiones abiertas de un usuario."""
+        with self._lock:
+            keys = list(self._user_sessions.get(str(user_id), ()))
+        sessions = [self._sessions[key] for key in keys if key in self._sessions]
+        if namespace is not None:
+            sessions = [session for session in sessions if session.namespace == namespace]
+        return sessions
+
+    def sids_for_user(self, user_id, namespace: Optional[str] = None) -> list[str]:
+        """Obtener los sids abiertos de un usuario."""
+        return [session.sid for session in self.sessions_for_user(user_id, namespace)]
+
+    def is_connected(self, user_id, namespace: Optional[str] = None) -> bool:
+        """Verificar si el usuario tiene al menos una sesión abierta."""
+        if namespace is None:
+            return str(user_id) in self._user_sessions
+        return bool(self.sessions_for_user(user_id, namespace))
+
+    def connected_user_ids(self, namespace: Optional[str] = None) -> set[str]:
+        """IDs de los usuarios conectados (opcionalmente a un namespace)."""
+        with self._lock:
+            if namespace is None:
+                return set(self._user_sessions)
+            return {session.user_id for (ns, _), session in self._sessions.items() if ns == namespace}
+
+    def count(self, namespace: Optional[str] = None) -> int:
+        """Número de sesiones abiertas."""
+        if namespace is None:
+            return len(self._sessions)
+        return sum(1 for ns, _ in list(self._sessions) if ns == namespace)
+
+    def touch(self, namespace: str, sid: str):
+        """Actualizar la última actividad de una sesión."""
+        session = self._sessions.get((namespace, sid))
+        if session is not None:
+            session.last_activity = datetime.now(timezone.utc)
+
+    # ----- Invalidación -----
+
+    def refresh_principal(self, user) -> bool:
+        """
+        Reemplazar la instantánea de un usuario conectado.
+
+        Args:
+            user: ``User`` o ``SocketPrincipal`` actualizado
+
+        Returns:
+            True si el usuario tenía sesiones abiertas
+        """
+        principal = user if isinstance(user, SocketPrincipal) else SocketPrincipal.from_user(user)
+        with self._lock:
+            if principal.user_id not in self._user_sessions:
+                return False
+            self._principals[principal.user_id] = principal
+            return True
+
+    def invalidate_user(self, user_id) -> list[SocketSession]:
+        """
+        Expulsar a un usuario del registro (por ejemplo, al desactivarlo).
+
+        Returns:
+            Sesiones eliminadas, para que el llamador las desconecte
+        """
+        user_id = str(user_id)
+        with self._lock:
+            keys = self._user_sessions.pop(user_id, set())
+            self._principals.pop(user_id, None)
+            return [self._sessions.pop(key) for key in keys if key in self._sessions]
+
+    def clear(self):
+        """Vaciar el registro."""
+        with self._lock:
+            self._sessions.clear()
+            self._user_sessions.clear()
+            self._principals.clear()
+
+
+# Registro global compartido por todos los namespaces
+session_registry = SessionRegistry()
+
+
+def disconnect_user(user_id, registry: Optional[SessionRegistry] = None) -> int:
+    """
+    Invalidar y desconectar todas las sesiones de un usuario.
+
+    Returns:
+        Número de sesiones desconectadas
+    """
+    from app.extensions import socketio
+
+    sessions = (registry or session_registry).invalidate_user(user_id)
+    for session in sessions:
+        try:
+            socketio.server.disconnect(session.sid, namespace=session.namespace)
+        except Exception as e:
+            logger.warning(f"No se pudo desconectar la sesión {session.sid}: {str(e)}")
+    return len(sessions)
+
+
+# ====================================
+# INVALIDACIÓN POR CAMBIOS DEL USUARIO
+# ====================================
+
+_PRINCIPAL_FIELDS = ('email', 'first_name', 'last_name', 'role')
+_watching_user_changes = False
+
+
+def watch_user_changes():
+    """
+    Mantener el registro sincronizado con la tabla de usuarios.
+
+    Tras el commit, desconecta a los usuarios desactivados y refresca la
+    instantánea de los que cambian de rol o de datos visibles.
+    """
+    global _watching_user_changes
+    if _watching_user_changes:
+        return
+
+    from sqlalchemy import event, inspect
+    from app.extensions import db
+    from app.models.user import User
+
+    @event.listens_for(User, 'after_update')
+    def _invalidate_socket_principal(mapper, connection, target):
+        user_id = str(target.id)
+        if not session_registry.is_connected(user_id):
+            return
+
+        state = inspect(target)
+        deactivated = state.attrs.is_active.history.has_changes() and not target.is_active
+        changed = any(state.attrs[name].history.has_changes() for name in _PRINCIPAL_FIELDS)
+        if not deactivated and not changed:
+            return
+
+        snapshot = None if deactivated else SocketPrincipal.from_user(target)
+
+        @event.listens_for(db.session, 'after_commit', once=True)
+        def _apply(session):
+            if snapshot is None:
+                disconnect_user(user_id)
+            else:
+                session_registry.refresh_principal(snapshot)
+
+    _watching_user_changes = True
+
+
+__all__ = [
+    'SocketPrincipal',
+    'SocketSession',
+    'SessionRegistry',
+    'session_registry',
+    'disconnect_user',
+    'watch_user_changes'
+]
@@ -0,0 +1,598 @@
+"""
+Estado Compartido de WebSockets - Ecosistema de Emprendimiento
+==============================================================
+
+Almacén del estado de tiempo real que debe verse igual desde todos los
+workers de Socket.IO cuando se ejecuta en modo cluster:
+
+- Conexiones por usuario (varias pestañas, varios workers)
+- Presencia con TTL (estado, ubicación, última actividad)
+- Miembros y estado de salas (por ejemplo, documentos en colaboración)
+- Log de operaciones por sala, con escritura compare-and-set (edición
+  colaborativa servida por varios workers)
+- Rate limiting por usuario y evento (ventana deslizante)
+
+``InMemoryStateStore`` sirve para un único proceso (desarrollo y tests);
+``RedisStateStore`` comparte el estado entre N procesos. La difusión de
+eventos a clientes la hace la cola de mensajes de Socket.IO
+(``SOCKETIO_MESSAGE_QUEUE``); ``publish``/``subscribe`` solo reparten
+mensajes internos entre workers (por ejemplo, lotes de presencia).
+"""
+
+import json
+import logging
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# ====================================
+# INTERFAZ
+# ====================================
+
+class SocketStateStore(ABC):
+    """Interfaz del almacén de estado de WebSockets."""
+
+    # ----- Conexiones -----
+
+    @abstractmethod
+    def add_connection(self, user_id: str, namespace: str, sid: str) -> int:
+        """Registrar una conexión; devuelve las conexiones del usuario en el namespace."""
+
+    @abstractmethod
+    def remove_connection(self, user_id: str, namespace: str, sid: str) -> int:
+        """Eliminar una conexión; devuelve las que le quedan al usuario en el namespace."""
+
+    @abstractmethod
+    def connection_count(self, user_id: str, namespace: Optional[str] = None) -> int:
+        """Número de conexiones abiertas del usuario en todo el cluster."""
+
+    # ----- Presencia -----
+
+    @abstractmethod
+    def set_presence(self, user_id: str, data: dict[str, Any], ttl: Optional[int] = None):
+        """Guardar la presencia de un usuario; caduca tras ``ttl`` segundos sin renovarse."""
+
+    @abstractmethod
+    def get_presence(self, user_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """Obtener la presencia vigente de varios usuarios (omite los desconocidos)."""
+
+    @abstractmethod
+    def clear_presence(self, user_id: str):
+        """Eliminar la presencia de un usuario."""
+
+    # ----- Difusión entre workers -----
+
+    @abstractmethod
+    def publish(self, channel: str, message: dict[str, Any]):
+        """Publicar un mensaje para todos los workers (incluido este)."""
+
+    @abstractmethod
+    def subscribe(self, channel: str, handler):
+        """Registrar ``handler(message)`` para los mensajes de un canal."""
+
+    # ----- Salas -----
+
+    @abstractmethod
+    def join_room(self, room: str, member_id: str, info: dict[str, Any]):
+        """Añadir un miembro a una sala."""
+
+    @abstractmethod
+    def leave_room(self, room: str, member_id: str) -> int:
+        """Quitar un miembro de una sala; devuelve los miembros restantes."""
+
+    @abstractmethod
+    def room_members(self, room: str) -> dict[str, dict[str, Any]]:
+        """Miembros de una sala con su información."""
+
+    @abstractmethod
+    def init_room_state(self, room: str, state: dict[str, Any]) -> dict[str, Any]:
+        """Inicializar el estado de una sala si no existe; devuelve el estado actual."""
+
+    @abstractmethod
+    def get_room_state(self, room: str) -> dict[str, Any]:
+        """Estado de una sala (incluye ``version``)."""
+
+    @abstractmethod
+    def bump_room_version(self, room: str, expected_version: int) -> Optional[int]:
+        """
+        Incrementar la versión de una sala si coincide con la esperada.
+
+        Returns:
+            Nueva versión, o None si hubo conflicto
+        """
+
+    @abstractmethod
+    def clear_room(self, room: str):
+        """Eliminar miembros y estado de una sala."""
+
+    # ----- Log de operaciones -----
+
+    @abstractmethod
+    def init_room_log(self, room: str, revision: int) -> int:
+        """Crear el log de una sala en ``revision`` si no existe; devuelve su revisión actual."""
+
+    @abstractmethod
+    def append_room_operation(self, room: str, revision: int, operation: Any, max_length: int) -> bool:
+        """
+        Añadir la operación que lleva la sala a ``revision``.
+
+        Solo se añade si el log existe y su revisión actual es ``revision - 1``;
+        se conservan las ``max_length`` operaciones más recientes.
+
+        Returns:
+            True si se añadió, False si otro worker escribió antes
+        """
+
+    @abstractmethod
+    def room_operations(self, room: str, since: int) -> Optional[list[Any]]:
+        """
+        Operaciones posteriores a la revisión ``since``.
+
+        Returns:
+            Lista de operaciones, o None si el log no existe o ya no las conserva
+        """
+
+    # ----- Rate limiting -----
+
+    @abstractmethod
+    def hit_rate_limit(self, key: str, limit: int, window: int) -> bool:
+        """
+        Registrar un evento en una ventana deslizante.
+
+        Returns:
+            True si el evento está dentro del límite
+        """
+
+    @abstractmethod
+    def reset_rate_limits(self, user_id: str):
+        """Eliminar los contadores de un usuario."""
+
+
+# ====================================
+# IMPLEMENTACIÓN EN MEMORIA
+# ====================================
+
+class InMemoryStateStore(SocketStateStore):
+    """Almacén local a un proceso, protegido por un lock."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._connections: dict[str, set[tuple[str, str]]] = defaultdict(set)
+        self._presence: dict[str, tuple[Optional[float], dict[str, Any]]] = {}
+        self._listeners: dict[str, list] = defaultdict(list)
+        self._rooms: dict[str, dict[str, dict[str, Any]]] = defaultdict(dict)
+        self._room_state: dict[str, dict[str, Any]] = {}
+        self._room_logs: dict[str, tuple[int, deque]] = {}
+        self._rate_limits: dict[str, deque] = defaultdict(deque)
+
+    def add_connection(self, user_id: str, namespace: str, sid: str) -> int:
+        with self._lock:
+            self._connections[user_id].add((namespace, sid))
+            return self._count(user_id, namespace)
+
+    def remove_connection(self, user_id: str, namespace: str, sid: str) -> int:
+        with self._lock:
+            self._connections[user_id].discard((namespace, sid))
+            remaining = self._count(user_id, namespace)
+            if not self._connections[user_id]:
+                del self._connections[user_id]
+            return remaining
+
+    def connection_count(self, user_id: str, namespace: Optional[str] = None) -> int:
+        with self._lock:
+            return self._count(user_id, namespace)
+
+    def _count(self, user_id: str, namespace: Optional[str]) -> int:
+        connections = self._connections.get(user_id, ())
+        if namespace is None:
+            return len(connections)
+        return sum(1 for ns, _ in connections if ns == namespace)
+
+    def set_presence(self, user_id: str, data: dict[str, Any], ttl: Optional[int] = None):
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._presence[user_id] = (expires_at, dict(data))
+
+    def get_presence(self, user_ids: list[str]) -> dict[str, dict[str, Any]]:
+        now = time.monotonic()
+        result = {}
+        with self._lock:
+            for user_id in user_ids:
+                entry = self._presence.get(user_id)
+                if entry is None:
+                    continue
+                expires_at, data = entry
+                if expires_at is not None and expires_at <= now:
+                    del self._presence[user_id]
+                    continue
+                result[user_id] = dict(data)
+        return result
+
+    def clear_presence(self, user_id: str):
+        with self._lock:
+            self._presence.pop(user_id, None)
+
+    def publish(self, channel: str, message: dict[str, Any]):
+        for handler in list(self._listeners.get(channel, ())):
+            handler(message)
+
+    def subscribe(self, channel: str, handler):
+        self._listeners[channel].append(handler)
+
+    def join_room(self, room: str, member_id: str, info: dict[str, Any]):
+        with self._lock:
+            self._rooms[room][member_id] = dict(info)
+
+    def leave_room(self, room: str, member_id: str) -> int:
+        with self._lock:
+            members = self._rooms.get(room, {})
+            members.pop(member_id, None)
+            if not members:
+                self._rooms.pop(room, None)
+            return len(members)
+
+    def room_members(self, room: str) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            return {member_id: dict(info) for member_id, info in self._rooms.get(room, {}).items()}
+
+    def init_room_state(self, room: str, state: dict[str, Any]) -> dict[str, Any]:
+        with self._lock:
+            if room not in self._room_state:
+                self._room_state[room] = {**state, 'version': int(state.get('version', 1))}
+            return dict(self._room_state[room])
+
+    def get_room_state(self, room: str) -> dict[str, Any]:
+        with self._lock:
+            return dict(self._room_state.get(room, {}))
+
+    def bump_room_version(self, room: str, expected_version: int) -> Optional[int]:
+        with self._lock:
+            state = self._room_state.get(room)
+            if state is None or state['version'] != expected_version:
+                return None
+            state['version'] += 1
+            return state['version']
+
+    def clear_room(self, room: str):
+        with self._lock:
+            self._rooms.pop(room, None)
+            self._room_state.pop(room, None)
+
+    def init_room_log(self, room: str, revision: int) -> int:
+        with self._lock:
+            if room not in self._room_logs:
+                self._room_logs[room] = (revision, deque())
+            return self._room_logs[room][0]
+
+    def append_room_operation(self, room: str, revision: int, operation: Any, max_length: int) -> bool:
+        with self._lock:
+            entry = self._room_logs.get(room)
+            if entry is None or entry[0] != revision - 1:
+                return False
+            operations = entry[1]
+            operations.append(operation)
+            while len(operations) > max_length:
+                operations.popleft()
+            self._room_logs[room] = (revision, operations)
+            return True
+
+    def room_operations(self, room: str, since: int) -> Optional[list[Any]]:
+        with self._lock:
+            entry = self._room_logs.get(room)
+            if entry is None:
+                return None
+            head, operations = entry
+            base = head - len(operations)
+            if since < base or since > head:
+                return None
+            return list(operations)[since - base:]
+
+    def hit_rate_limit(self, key: str, limit: int, window: int) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            events = self._rate_limits[key]
+            while events and events[0] <= now - window:
+                events.popleft()
+            if len(events) >= limit:
+                return False
+            events.append(now)
+            return True
+
+    def reset_rate_limits(self, user_id: str):
+        prefix = f'{user_id}:'
+        with self._lock:
+            for key in [key for key in self._rate_limits if key.startswith(prefix)]:
+                del self._rate_limits[key]
+
+
+# ====================================
+# IMPLEMENTACIÓN REDIS
+# ====================================
+
+# Ventana deslizante atómica sobre un ZSET
+_RATE_LIMIT_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[3]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], now, ARGV[4])
+redis.call('EXPIRE', KEYS[1], math.ceil(window))
+return 1
+"""
+
+# Compare-and-increment de la versión de una sala
+_BUMP_VERSION_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+if not current or tonumber(current) ~= tonumber(ARGV[1]) then
+    return -1
+end
+return redis.call('INCR', KEYS[1])
+"""
+
+# Compare-and-append en el log de operaciones de una sala
+_APPEND_OPERATION_SCRIPT = """
+local head = redis.call('GET', KEYS[2])
+if not head or tonumber(head) ~= tonumber(ARGV[1]) - 1 then
+    return 0
+end
+redis.call('RPUSH', KEYS[1], ARGV[2])
+redis.call('LTRIM', KEYS[1], -tonumber(ARGV[3]), -1)
+redis.call('SET', KEYS[2], ARGV[1], 'EX', ARGV[4])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return 1
+"""
+
+# Cola del log desde una revisión (-1 si ya no se conserva)
+_READ_OPERATIONS_SCRIPT = """
+local head = redis.call('GET', KEYS[2])
+if not head then
+    return -1
+end
+local length = redis.call('LLEN', KEYS[1])
+local since = tonumber(ARGV[1]) - (tonumber(head) - length)
+if since < 0 or since > length then
+    return -1
+end
+return redis.call('LRANGE', KEYS[1], since, -1)
+"""
+
+
+class RedisStateStore(SocketStateStore):
+    """
+    Almacén compartido entre workers sobre Redis.
+
+    Args:
+        client: Cliente Redis (``decode_responses=True``)
+        prefix: Prefijo de las claves
+        presence_ttl: Segundos que se conserva la presencia sin actualizar
+        connection_ttl: Segundos que se conservan las conexiones de un usuario
+            sin actividad (limpia las de workers caídos)
+        log_ttl: Segundos que se conserva el log de operaciones de una sala
+            sin escrituras
+    """
+
+    def __init__(self, client, prefix: str = 'socket:', presence_ttl: int = 3600,
+                 connection_ttl: int = 86400, log_ttl: int = 86400):
+        self.client = client
+        self.prefix = prefix
+        self.presence_ttl = presence_ttl
+        self.connection_ttl = connection_ttl
+        self.log_ttl = log_ttl
+        self._rate_limit = client.register_script(_RATE_LIMIT_SCRIPT)
+        self._bump_version = client.register_script(_BUMP_VERSION_SCRIPT)
+        self._append_operation = client.register_script(_APPEND_OPERATION_SCRIPT)
+        self._read_operations = client.register_script(_READ_OPERATIONS_SCRIPT)
+        self._pubsub = None
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> 'RedisStateStore':
+        """Crear el almacén a partir de una URL de Redis."""
+        import redis
+        return cls(redis.from_url(url, decode_responses=True), **kwargs)
+
+    def _key(self, *parts: str) -> str:
+        return self.prefix + ':'.join(str(part) for part in parts)
+
+    # ----- Conexiones -----
+
+    def add_connection(self, user_id: str, namespace: str, sid: str) -> int:
+        key = self._key('conn', user_id)
+        pipe = self.client.pipeline()
+        pipe.sadd(key, f'{namespace}|{sid}')
+        pipe.expire(key, self.connection_ttl)
+        pipe.execute()
+        return self.connection_count(user_id, namespace)
+
+    def remove_connection(self, user_id: str, namespace: str, sid: str) -> int:
+        self.client.srem(self._key('conn', user_id), f'{namespace}|{sid}')
+        return self.connection_count(user_id, namespace)
+
+    def connection_count(self, user_id: str, namespace: Optional[str] = None) -> int:
+        key = self._key('conn', user_id)
+        if namespace is None:
+            return self.client.scard(key)
+        return sum(1 for member in self.client.smembers(key) if member.split('|', 1)[0] == namespace)
+
+    # ----- Presencia -----
+
+    def set_presence(self, user_id: str, data: dict[str, Any], ttl: Optional[int] = None):
+        self.client.set(self._key('presence', user_id), json.dumps(data, default=str), ex=ttl or self.presence_ttl)
+
+    def get_presence(self, user_ids: list[str]) -> dict[str, dict[str, Any]]:
+        if not user_ids:
+            return {}
+        values = self.client.mget([self._key('presence', user_id) for user_id in user_ids])
+        return {user_id: json.loads(value) for user_id, value in zip(user_ids, values) if value}
+
+    def clear_presence(self, user_id: str):
+        self.client.delete(self._key('presence', user_id))
+
+    # ----- Difusión entre workers -----
+
+    def publish(self, channel: str, message: dict[str, Any]):
+        self.client.publish(self._key('channel', channel), json.dumps(message, default=str))
+
+    def subscribe(self, channel: str, handler):
+        def dispatch(raw):
+            try:
+                handler(json.loads(raw['data']))
+            except Exception as e:
+                logger.error(f"Error procesando mensaje del canal {channel}: {str(e)}")
+
+        if self._pubsub is None:
+            self._pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            self._pubsub.subscribe(**{self._key('channel', channel): dispatch})
+            self._pubsub.run_in_thread(sleep_time=0.01, daemon=True)
+        else:
+            self._pubsub.subscribe(**{self._key('channel', channel): dispatch})
+
+    # ----- Salas -----
+
+    def join_room(self, room: str, member_id: str, info: dict[str, Any]):
+        self.client.hset(self._key('room', room, 'members'), member_id, json.dumps(info, default=str))
+
+    def leave_room(self, room: str, member_id: str) -> int:
+        key = self._key('room', room, 'members')
+        pipe = self.client.pipeline()
+        pipe.hdel(key, member_id)
+        pipe.hlen(key)
+        return pipe.execute()[1]
+
+    def room_members(self, room: str) -> dict[str, dict[str, Any]]:
+        members = self.client.hgetall(self._key('room', room, 'members'))
+        return {member_id: json.loads(info) for member_id, info in members.items()}
+
+    def init_room_state(self, room: str, state: dict[str, Any]) -> dict[str, Any]:
+        fields = {name: json.dumps(value, default=str) for name, value in state.items() if name != 'version'}
+        pipe = self.client.pipeline()
+        for name, value in fields.items():
+            pipe.hsetnx(self._key('room', room, 'state'), name, value)
+        pipe.set(self._key('room', room, 'version'), int(state.get('version', 1)), nx=True)
+        pipe.execute()
+        return self.get_room_state(room)
+
+    def get_room_state(self, room: str) -> dict[str, Any]:
+        pipe = self.client.pipeline()
+        pipe.hgetall(self._key('room', room, 'state'))
+        pipe.get(self._key('room', room, 'version'))
+        fields, version = pipe.execute()
+        if not fields and version is None:
+            return {}
+        state = {name: json.loads(value) for name, value in fields.items()}
+        state['version'] = int(version or 1)
+        return state
+
+    def bump_room_version(self, room: str, expected_version: int) -> Optional[int]:
+        result = self._bump_version(keys=[self._key('room', room, 'version')], args=[expected_version])
+        return None if int(result) < 0 else int(result)
+
+    def clear_room(self, room: str):
+        self.client.delete(
+            self._key('room', room, 'members'),
+            self._key('room', room, 'state'),
+            self._key('room', room, 'version')
+        )
+
+    # ----- Log de operaciones -----
+
+    def init_room_log(self, room: str, revision: int) -> int:
+        key = self._key('room', room, 'log_head')
+        pipe = self.client.pipeline()
+        pipe.set(key, int(revision), nx=True, ex=self.log_ttl)
+        pipe.get(key)
+        return int(pipe.execute()[1])
+
+    def append_room_operation(self, room: str, revision: int, operation: Any, max_length: int) -> bool:
+        appended = self._append_operation(
+            keys=[self._key('room', room, 'log'), self._key('room', room, 'log_head')],
+            args=[int(revision), json.dumps(operation), int(max_length), self.log_ttl]
+        )
+        return bool(int(appended))
+
+    def room_operations(self, room: str, since: int) -> Optional[list[Any]]:
+        operations = self._read_operations(
+            keys=[self._key('room', room, 'log'), self._key('room', room, 'log_head')],
+            args=[int(since)]
+        )
+        if not isinstance(operations, list):
+            return None
+        return [json.loads(operation) for operation in operations]
+
+    # ----- Rate limiting -----
+
+    def hit_rate_limit(self, key: str, limit: int, window: int) -> bool:
+        # Hora del servidor Redis: todos los workers comparten el mismo reloj
+        seconds, microseconds = self.client.time()
+        now = seconds + microseconds / 1_000_000
+        allowed = self._rate_limit(
+            keys=[self._key('rl', key)],
+            args=[now, window, limit, f'{now}-{uuid.uuid4().hex[:8]}']
+        )
+        return bool(int(allowed))
+
+    def reset_rate_limits(self, user_id: str):
+        keys = list(self.client.scan_iter(match=self._key('rl', f'{user_id}:*'), count=500))
+        if keys:
+            self.client.delete(*keys)
+
+
+# ====================================
+# INSTANCIA GLOBAL
+# ====================================
+
+_state_store: Optional[SocketStateStore] = None
+
+
+def init_state_store(app) -> SocketStateStore:
+    """
+    Configurar el almacén según ``SOCKETIO_STATE_BACKEND`` (``memory`` o ``redis``).
+
+    Raises:
+        RuntimeError: Si se pidió Redis (modo cluster) y no está disponible:
+            con el almacén en memoria cada worker vería solo sus conexiones,
+            límites y logs de sala, y divergirían sin aviso.
+    """
+    global _state_store
+
+    backend = app.config.get('SOCKETIO_STATE_BACKEND', 'memory')
+    if backend == 'redis':
+        try:
+            store = RedisStateStore.from_url(
+                app.config.get('SOCKETIO_REDIS_URL') or app.config['REDIS_URL'],
+                prefix=app.config.get('SOCKETIO_STATE_PREFIX', 'socket:')
+            )
+            store.client.ping()
+        except Exception as e:
+            raise RuntimeError(f"Redis no disponible: el estado de WebSockets en modo cluster requiere Redis ({e})")
+
+        _state_store = store
+        app.logger.info("Estado de WebSockets compartido en Redis")
+        return _state_store
+
+    _state_store = InMemoryStateStore()
+    return _state_store
+
+
+def get_state_store() -> SocketStateStore:
+    """Obtener el almacén configurado (en memoria si no se inicializó)."""
+    global _state_store
+    if _state_store is None:
+        _state_store = InMemoryStateStore()
+    return _state_store
+
+
+__all__ = [
+    'SocketStateStore',
+    'InMemoryStateStore',
+    'RedisStateStore',
+    'init_state_store',
+    'get_state_store'
+]
@@ -23,8 +23,6 @@ Funcionalidades principales:
 import logging
 import json
 import uuid
-import pandas as pd
-import numpy as np
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Any, Union
 from dataclasses import dataclass, asdict
@@ -34,21 +32,9 @@ import io
 import base64
 
 from celery import group, chain, chord
-from sqlalchemy import func, and_, or_, text
+from sqlalchemy import func, and_, or_, text, case, select
 from sqlalchemy.orm import sessionmaker
 import requests
-from google.analytics.data_v1beta import BetaAnalyticsDataClient
-from google.analytics.data_v1beta.types import (
-    RunReportRequest,
-    Dimension,
-    Metric,
-    DateRange
-)
-import mixpanel
-from amplitude import Amplitude
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
 
 from app.tasks.celery_app import celery_app
 from app.core.exceptions import AnalyticsError, DataProcessingError, ReportGenerationError
@@ -65,7 +51,7 @@ from app.models.ally import Ally
 from app.models.client import Client
 from app.models.project import Project
 from app.models.meeting import Meeting
-from app.models.mentorship import MentorshipSession
+from app.models.mentorship import MentorshipSession, MentorshipRelationship, MentorshipStatus, SessionStatus
 from app.models.activity_log import ActivityLog, ActivityType
 from app.models.analytics import (
     AnalyticsEvent,
@@ -77,6 +63,7 @@ from app.models.analytics import (
 )
 from app.models.notification import Notification
 from app.services.analytics_service import AnalyticsService
+from app.services.metric_rollups import MetricRollupService
 from app.services.user_service import UserService
 from app.services.email import EmailService
 from app.utils.formatters import (
@@ -90,6 +77,17 @@ from app.utils.cache_utils import cache_get, cache_set, cache_delete
 from app.utils.file_utils import ensure_directory_exists, save_file_to_storage
 from app.utils.export_utils import export_to_excel, export_to_pdf, export_to_csv
 from app.utils.ml_utils import predict_churn, calculate_clv, segment_users
+from app.utils.lazy_imports import lazy_import
+from app.utils.time_buckets import to_naive_utc
+from app.tasks.report_fanout import ReportJob, register_report_job, start_report_fanout
+
+# Dependencias pesadas: se importan en el primer uso, no al arrancar el worker
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
+go = lazy_import('plotly.graph_objects')
+px = lazy_import('plotly.express')
+mixpanel = lazy_import('mixpanel')
+amplitude = lazy_import('amplitude')
 
 logger = logging.getLogger(__name__)
 
@@ -98,22 +96,27 @@ GOOGLE_ANALYTICS_PROPERTY_ID = 'config/GA_PROPERTY_ID'
 MIXPANEL_PROJECT_TOKEN = 'config/MIXPANEL_PROJECT_TOKEN'
 AMPLITUDE_API_KEY = 'config/AMPLITUDE_API_KEY'
 
-# Inicialización de clientes
-try:
-    # Google Analytics
-    ga_client = BetaAnalyticsDataClient()
-    
-    # Mixpanel
-    mp = mixpanel.Mixpanel(MIXPANEL_PROJECT_TOKEN)
-    
-    # Amplitude
-    amplitude_client = Amplitude(AMPLITUDE_API_KEY)
-    
-except Exception as e:
-    logger.warning(f"Error inicializando clientes de analytics: {str(e)}")
-    ga_client = None
-    mp = None
-    amplitude_client = None
+# Clientes de servicios externos (se crean en el primer uso)
+_external_clients: dict[str, Any] = {}
+
+
+def _get_external_client(name: str, factory):
+    """Obtener un cliente externo, creándolo una sola vez (None si falla)."""
+    if name not in _external_clients:
+        try:
+            _external_clients[name] = factory()
+        except Exception as e:
+            logger.warning(f"Error inicializando cliente de analytics {name}: {str(e)}")
+            _external_clients[name] = None
+    return _external_clients[name]
+
+
+def _get_mixpanel():
+    return _get_external_client('mixpanel', lambda: mixpanel.Mixpanel(MIXPANEL_PROJECT_TOKEN))
+
+
+def _get_amplitude():
+    return _get_external_client('amplitude', lambda: amplitude.Amplitude(AMPLITUDE_API_KEY))
 
 
 class AnalyticsTimeframe(Enum):
@@ -221,11 +224,8 @@ def update_realtime_metrics(self):
         _save_realtime_metrics(realtime_data)
         
         # Enviar a servicios externos si están configurados
-        if mp:
-            _send_metrics_to_mixpanel(realtime_data)
-        
-        if amplitude_client:
-            _send_metrics_to_amplitude(realtime_data)
+        _send_metrics_to_mixpanel(realtime_data)
+        _send_metrics_to_amplitude(realtime_data)
         
         logger.info(f"Métricas en tiempo real actualizadas: {online_users} usuarios online")
         
@@ -287,6 +287,7 @@ def track_user_engagement(self, user_id: int, event_type: str, event_data: dict[
         _update_user_engagement_metrics(user_id, event_type, event_data)
         
         # Enviar a servicios externos
+        mp = _get_mixpanel()
         if mp:
             mp.track(str(user_id), event_type, {
                 **event_data,
@@ -402,87 +403,29 @@ def generate_daily_analytics(self):
     queue='analytics',
     priority=6
 )
-def generate_weekly_entrepreneur_report(self):
+def generate_weekly_entrepreneur_report(self, week_start: Optional[str] = None, restart: bool = False):
     """
     Genera reporte semanal específico para emprendedores
     
-    Se ejecuta los lunes a las 8:00 AM
+    Se ejecuta los lunes a las 8:00 AM. Los emprendedores se reparten en
+    bloques que se procesan en paralelo (ver ``app.tasks.report_fanout``);
+    relanzarla para la misma semana solo procesa los bloques pendientes.
+    
+    Args:
+        week_start: Inicio de la semana (ISO); por defecto la semana anterior
+        restart: Regenerar todos los reportes aunque la semana ya se procesara
     """
     try:
         logger.info("Generando reporte semanal de emprendedores")
         
-        # Rango de fechas (semana anterior)
-        end_date = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
-        start_date = end_date - timedelta(days=7)
-        
-        # Obtener todos los emprendedores activos
-        entrepreneurs = Entrepreneur.query.filter(
-            Entrepreneur.is_active == True
-        ).all()
-        
-        reports_generated = 0
-        
-        for entrepreneur in entrepreneurs:
-            try:
-                # Datos específicos del emprendedor
-                entrepreneur_data = _get_entrepreneur_weekly_data(
-                    entrepreneur.id, start_date, end_date
-                )
-                
-                # Métricas del emprendedor
-                entrepreneur_metrics = _calculate_entrepreneur_metrics(entrepreneur_data)
-                
-                # Insights personalizados
-                insights = _generate_entrepreneur_insights(entrepreneur, entrepreneur_metrics)
-                
-                # Gráficos de progreso
-                charts = _generate_entrepreneur_charts(entrepreneur_data)
-                
-                # Recomendaciones personalizadas
-                recommendations = _generate_entrepreneur_recommendations(
-                    entrepreneur, entrepreneur_metrics
-                )
-                
-                # Crear reporte personalizado
-                report = AnalyticsReport(
-                    title=f"Tu Reporte Semanal - {entrepreneur.get_full_name()}",
-                    timeframe=AnalyticsTimeframe.WEEKLY,
-                    generated_at=datetime.now(timezone.utc),
-                    data=entrepreneur_data,
-                    metrics=entrepreneur_metrics,
-                    charts=charts,
-                    insights=insights,
-                    recommendations=recommendations,
-                    metadata={
-                        'entrepreneur_id': entrepreneur.id,
-                        'start_date': start_date.isoformat(),
-                        'end_date': end_date.isoformat(),
-                        'report_type': 'entrepreneur_weekly'
-                    }
-                )
-                
-                # Guardar reporte
-                report_id = _save_analytics_report(report)
-                
-                # Enviar por email usando el sistema de email tasks
-                from app.tasks.email_tasks import send_weekly_entrepreneur_report
-                send_weekly_entrepreneur_report.apply_async(
-                    args=[entrepreneur.id],
-                    countdown=60
-                )
-                
-                reports_generated += 1
-                
-            except Exception as e:
-                logger.error(f"Error generando reporte para emprendedor {entrepreneur.id}: {str(e)}")
-                continue
-        
-        logger.info(f"Reportes semanales generados: {reports_generated}")
+        start_date, end_date = _weekly_period(week_start)
+        fanout = start_report_fanout(
+            WEEKLY_ENTREPRENEUR_REPORT.name, start_date, end_date, restart=restart
+        )
         
         return {
             'success': True,
-            'reports_generated': reports_generated,
-            'total_entrepreneurs': len(entrepreneurs),
+            **fanout,
             'week': end_date.isocalendar()[1]
         }
         
@@ -500,77 +443,28 @@ def generate_weekly_entrepreneur_report(self):
     queue='analytics',
     priority=6
 )
-def generate_weekly_mentor_summary(self):
+def generate_weekly_mentor_summary(self, week_start: Optional[str] = None, restart: bool = False):
     """
     Genera resumen semanal para mentores/aliados
     
-    Se ejecuta los lunes a las 9:00 AM
+    Se ejecuta los lunes a las 9:00 AM, repartiendo los mentores en bloques
+    paralelos como el reporte de emprendedores.
+    
+    Args:
+        week_start: Inicio de la semana (ISO); por defecto la semana anterior
+        restart: Regenerar todos los resúmenes aunque la semana ya se procesara
     """
     try:
         logger.info("Generando resumen semanal de mentores")
         
-        # Rango de fechas
-        end_date = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
-        start_date = end_date - timedelta(days=7)
-        
-        # Obtener mentores activos
-        mentors = Ally.query.filter(Ally.is_active == True).all()
-        
-        summaries_generated = 0
-        
-        for mentor in mentors:
-            try:
-                # Datos del mentor para la semana
-                mentor_data = _get_mentor_weekly_data(mentor.id, start_date, end_date)
-                
-                # Skip si no hay actividad
-                if not _has_mentor_activity(mentor_data):
-                    continue
-                
-                # Métricas del mentor
-                mentor_metrics = _calculate_mentor_metrics(mentor_data)
-                
-                # Insights sobre mentorías
-                insights = _generate_mentor_insights(mentor, mentor_metrics)
-                
-                # Progreso de emprendedores asignados
-                mentees_progress = _get_mentees_progress_summary(mentor.id, start_date, end_date)
-                
-                # Crear resumen
-                summary_data = {
-                    **mentor_data,
-                    'mentees_progress': mentees_progress,
-                    'impact_metrics': mentor_metrics,
-                    'week_highlights': insights
-                }
-                
-                # Guardar resumen
-                summary_id = _save_mentor_summary(mentor.id, summary_data)
-                
-                # Notificar al mentor
-                from app.tasks.notification_tasks import send_in_app_notification
-                send_in_app_notification.apply_async(
-                    args=[mentor.id, {
-                        'title': 'Tu resumen semanal está listo',
-                        'message': f'Revisa el progreso de tus {len(mentees_progress)} emprendedores',
-                        'type': 'summary',
-                        'action_url': f'/mentors/summary/{summary_id}'
-                    }],
-                    countdown=30
-                )
-                
-                summaries_generated += 1
-                
-            except Exception as e:
-                logger.error(f"Error generando resumen para mentor {mentor.id}: {str(e)}")
-                continue
-        
-        logger.info(f"Resúmenes semanales generados: {summaries_generated}")
+        start_date, end_date = _weekly_period(week_start)
+        fanout = start_report_fanout(
+            WEEKLY_MENTOR_SUMMARY.name, start_date, end_date, restart=restart
+        )
         
         return {
             'success': True,
-            'summaries_generated': summaries_generated,
-            'total_mentors': len(mentors),
+            **fanout,
             'week': end_date.isocalendar()[1]
         }
         
@@ -1190,6 +1084,57 @@ def generate_user_engagement_report(self):
         return {'success': False, 'error': str(exc)}
 
 
+@celery_app.task(
+    bind=True,
+    max_retries=2,
+    default_retry_delay=60,
+    queue='analytics',
+    priority=4
+)
+def refresh_metric_rollups(self, lookback_hours: int = 2):
+    """
+    Recalcula los agregados de métricas de las últimas horas
+    
+    Se ejecuta cada 5 minutos; los dashboards leen de estos agregados
+    
+    Args:
+        lookback_hours: Horas hacia atrás que se recalculan
+    """
+    try:
+        rows = MetricRollupService().refresh_recent(timedelta(hours=lookback_hours))
+        return {'success': True, 'hour_rows': rows}
+        
+    except Exception as exc:
+        logger.error(f"Error recalculando agregados de métricas: {str(exc)}")
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=exc)
+        return {'success': False, 'error': str(exc)}
+
+
+@celery_app.task(
+    bind=True,
+    max_retries=2,
+    default_retry_delay=300,
+    queue='analytics',
+    priority=3
+)
+def correct_late_metric_rollups(self):
+    """
+    Corrige los agregados afectados por datos tardíos o modificados
+    
+    Se ejecuta cada hora desde el punto de control de la ejecución anterior
+    """
+    try:
+        corrected = MetricRollupService().correct_late_data()
+        return {'success': True, 'corrected_hours': corrected}
+        
+    except Exception as exc:
+        logger.error(f"Error corrigiendo agregados de métricas: {str(exc)}")
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=exc)
+        return {'success': False, 'error': str(exc)}
+
+
 # === FUNCIONES AUXILIARES PRIVADAS ===
 
 def _get_online_users_count() -> int:
@@ -1322,6 +1267,7 @@ def _save_realtime_metrics(metrics_data: dict[str, Any]):
 def _send_metrics_to_mixpanel(metrics_data: dict[str, Any]):
     """Envía métricas a Mixpanel"""
     try:
+        mp = _get_mixpanel()
         if mp:
             mp.track('system', 'realtime_metrics', metrics_data)
     except Exception as e:
@@ -1331,6 +1277,7 @@ def _send_metrics_to_mixpanel(metrics_data: dict[str, Any]):
 def _send_metrics_to_amplitude(metrics_data: dict[str, Any]):
     """Envía métricas a Amplitude"""
     try:
+        amplitude_client = _get_amplitude()
         if amplitude_client:
             amplitude_client.track('system', 'realtime_metrics', metrics_data)
     except Exception as e:
@@ -1497,31 +1444,39 @@ def _generate_daily_recommendations(metrics: dict[str, float], insights: list[st
 def _save_analytics_report(report: AnalyticsReport) -> str:
     """Guarda reporte de analytics en la base de datos"""
     try:
-        from app.models.analytics_report import AnalyticsReportModel
-        from app import db
-        
-        report_model = AnalyticsReportModel(
-            title=report.title,
-            timeframe=report.timeframe.value,
-            data=report.data,
-            metrics=report.metrics,
-            charts=report.charts,
-            insights=report.insights,
-            recommendations=report.recommendations,
-            metadata=report.metadata,
-            generated_at=report.generated_at
-        )
-        
-        db.session.add(report_model)
-        db.session.commit()
-        
-        return str(report_model.id)
+        return _save_analytics_reports([report])[0]
         
     except Exception as e:
         logger.error(f"Error guardando reporte: {str(e)}")
         return str(uuid.uuid4())
 
 
+def _save_analytics_reports(reports: list[AnalyticsReport]) -> list[str]:
+    """Guarda varios reportes en una sola transacción y devuelve sus ids"""
+    from app import db
+    from app.models.analytics import AnalyticsReport as AnalyticsReportRecord
+    
+    records = [
+        AnalyticsReportRecord(
+            title=report.title,
+            report_type=report.metadata.get('report_type', report.timeframe.value),
+            content={**report.to_dict(), 'timeframe': report.timeframe.value},
+            parameters=report.metadata,
+            status='completed'
+        )
+        for report in reports
+    ]
+    
+    try:
+        db.session.add_all(records)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    
+    return [str(record.id) for record in records]
+
+
 # Funciones auxiliares adicionales (implementación parcial para brevedad)
 def _export_daily_report(report: AnalyticsReport) -> dict[str, str]:
     """Exporta reporte diario en múltiples formatos"""
@@ -1538,14 +1493,108 @@ def _update_comparative_metrics(metrics: dict[str, float], timeframe: str):
     pass
 
 
-def _get_entrepreneur_weekly_data(entrepreneur_id: int, start_date: datetime, end_date: datetime) -> dict[str, Any]:
-    """Obtiene datos semanales del emprendedor"""
-    return {}
+# === REPORTES SEMANALES POR USUARIO ===
+
+def _weekly_period(week_start: Optional[str] = None) -> tuple[datetime, datetime]:
+    """Semana a reportar: la indicada o los 7 días anteriores a hoy"""
+    if week_start:
+        start_date = to_naive_utc(datetime.fromisoformat(week_start))
+    else:
+        today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        start_date = to_naive_utc(today) - timedelta(days=7)
+    return start_date, start_date + timedelta(days=7)
+
+
+def _completed_sessions_filter(start_date: datetime, end_date: datetime):
+    """Sesiones de mentoría completadas en el periodo"""
+    session_time = func.coalesce(MentorshipSession.actual_end_time, MentorshipSession.scheduled_datetime)
+    return and_(
+        MentorshipSession.status == SessionStatus.COMPLETED,
+        session_time >= start_date,
+        session_time < end_date
+    )
+
+
+def _session_minutes():
+    return func.coalesce(MentorshipSession.actual_duration_minutes, MentorshipSession.duration_minutes, 0)
+
+
+def _list_active_entrepreneur_ids(start_date: datetime, end_date: datetime) -> list:
+    from app import db
+    return db.session.scalars(
+        select(Entrepreneur.id).where(Entrepreneur.is_active == True).order_by(Entrepreneur.id)
+    ).all()
+
+
+def _get_entrepreneurs_weekly_data(entrepreneur_ids: list[str], start_date: datetime,
+                                   end_date: datetime) -> dict[str, dict[str, Any]]:
+    """Obtiene los datos semanales de un bloque de emprendedores (una consulta por fuente)"""
+    from app import db
+    
+    data = {
+        str(entrepreneur_id): {
+            'activity': {'events': 0, 'active_days': 0},
+            'projects': {'total': 0, 'created': 0, 'avg_progress': 0.0},
+            'mentorship': {'sessions': 0, 'minutes': 0}
+        }
+        for entrepreneur_id in entrepreneur_ids
+    }
+    
+    activity = db.session.execute(
+        select(
+            ActivityLog.user_id,
+            func.count(ActivityLog.id),
+            func.count(func.distinct(func.date(ActivityLog.created_at)))
+        )
+        .where(
+            ActivityLog.user_id.in_(entrepreneur_ids),
+            ActivityLog.created_at >= start_date,
+            ActivityLog.created_at < end_date
+        )
+        .group_by(ActivityLog.user_id)
+    )
+    for user_id, events, active_days in activity:
+        data[str(user_id)]['activity'] = {'events': events, 'active_days': active_days}
+    
+    projects = db.session.execute(
+        select(
+            Project.entrepreneur_id,
+            func.count(Project.id),
+            func.sum(case((and_(Project.created_at >= start_date, Project.created_at < end_date), 1), else_=0)),
+            func.avg(Project.progress_percentage)
+        )
+        .where(Project.entrepreneur_id.in_(entrepreneur_ids), Project.is_deleted == False)
+        .group_by(Project.entrepreneur_id)
+    )
+    for entrepreneur_id, total, created, avg_progress in projects:
+        data[str(entrepreneur_id)]['projects'] = {
+            'total': total,
+            'created': int(created or 0),
+            'avg_progress': round(float(avg_progress or 0), 1)
+        }
+    
+    sessions = db.session.execute(
+        select(MentorshipRelationship.mentee_id, func.count(MentorshipSession.id), func.sum(_session_minutes()))
+        .join(MentorshipRelationship, MentorshipRelationship.id == MentorshipSession.mentorship_id)
+        .where(MentorshipRelationship.mentee_id.in_(entrepreneur_ids), _completed_sessions_filter(start_date, end_date))
+        .group_by(MentorshipRelationship.mentee_id)
+    )
+    for mentee_id, session_count, minutes in sessions:
+        data[str(mentee_id)]['mentorship'] = {'sessions': session_count, 'minutes': int(minutes or 0)}
+    
+    return data
 
 
 def _calculate_entrepreneur_metrics(data: dict[str, Any]) -> dict[str, float]:
     """Calcula métricas del emprendedor"""
-    return {}
+    return {
+        'active_days': data['activity']['active_days'],
+        'activity_events': data['activity']['events'],
+        'projects_created': data['projects']['created'],
+        'avg_project_progress': data['projects']['avg_progress'],
+        'mentorship_sessions': data['mentorship']['sessions'],
+        'mentorship_hours': round(data['mentorship']['minutes'] / 60, 1)
+    }
 
 
 def _generate_entrepreneur_insights(entrepreneur: Entrepreneur, metrics: dict[str, float]) -> list[str]:
@@ -1563,6 +1612,239 @@ def _generate_entrepreneur_recommendations(entrepreneur: Entrepreneur, metrics:
     return []
 
 
+def _process_entrepreneur_report_chunk(entrepreneur_ids: list[str], start_date: datetime,
+                                       end_date: datetime) -> dict[str, int]:
+    """Genera, guarda y envía los reportes semanales de un bloque de emprendedores"""
+    entrepreneurs = Entrepreneur.query.filter(Entrepreneur.id.in_(entrepreneur_ids)).all()
+    Entrepreneur.load_batch_stats(entrepreneurs)
+    weekly_data = _get_entrepreneurs_weekly_data(entrepreneur_ids, start_date, end_date)
+    
+    reports = []
+    recipients = []
+    failed = 0
+    
+    for entrepreneur in entrepreneurs:
+        try:
+            entrepreneur_data = {
+                **weekly_data[str(entrepreneur.id)],
+                'active_projects': entrepreneur.active_projects_count,
+                'mentorships': entrepreneur.mentorships_count
+            }
+            entrepreneur_metrics = _calculate_entrepreneur_metrics(entrepreneur_data)
+            
+            reports.append(AnalyticsReport(
+                title=f"Tu Reporte Semanal - {entrepreneur.get_full_name()}",
+                timeframe=AnalyticsTimeframe.WEEKLY,
+                generated_at=datetime.now(timezone.utc),
+                data=entrepreneur_data,
+                metrics=entrepreneur_metrics,
+                charts=_generate_entrepreneur_charts(entrepreneur_data),
+                insights=_generate_entrepreneur_insights(entrepreneur, entrepreneur_metrics),
+                recommendations=_generate_entrepreneur_recommendations(entrepreneur, entrepreneur_metrics),
+                metadata={
+                    'entrepreneur_id': str(entrepreneur.id),
+                    'start_date': start_date.isoformat(),
+                    'end_date': end_date.isoformat(),
+                    'report_type': 'entrepreneur_weekly'
+                }
+            ))
+            recipients.append(str(entrepreneur.id))
+            
+        except Exception as e:
+            logger.error(f"Error generando reporte para emprendedor {entrepreneur.id}: {str(e)}")
+            failed += 1
+    
+    if reports:
+        _save_analytics_reports(reports)
+        
+        # Enviar por email usando el sistema de email tasks (una publicación por bloque)
+        from app.tasks.email_tasks import send_weekly_entrepreneur_report
+        group(send_weekly_entrepreneur_report.s(entrepreneur_id) for entrepreneur_id in recipients).apply_async(
+            countdown=60
+        )
+    
+    return {
+        'generated': len(reports),
+        'skipped': len(entrepreneur_ids) - len(entrepreneurs),
+        'failed': failed
+    }
+
+
+def _list_active_mentor_ids(start_date: datetime, end_date: datetime) -> list:
+    from app import db
+    return db.session.scalars(
+        select(Ally.id).where(Ally.is_active == True).order_by(Ally.id)
+    ).all()
+
+
+def _get_mentors_weekly_data(mentor_ids: list[str], start_date: datetime,
+                             end_date: datetime) -> dict[str, dict[str, Any]]:
+    """Obtiene la actividad semanal y los mentees activos de un bloque de mentores"""
+    from app import db
+    
+    data = {
+        str(mentor_id): {'sessions': 0, 'minutes': 0, 'rating_sum': 0.0, 'ratings': 0, 'mentees': []}
+        for mentor_id in mentor_ids
+    }
+    
+    # Sesiones completadas de la semana por mentoría
+    weekly_sessions = {}
+    rows = db.session.execute(
+        select(
+            MentorshipRelationship.mentor_id,
+            MentorshipRelationship.id,
+            func.count(MentorshipSession.id),
+            func.sum(_session_minutes()),
+            func.sum(MentorshipSession.session_rating),
+            func.count(MentorshipSession.session_rating)
+        )
+        .join(MentorshipRelationship, MentorshipRelationship.id == MentorshipSession.mentorship_id)
+        .where(MentorshipRelationship.mentor_id.in_(mentor_ids), _completed_sessions_filter(start_date, end_date))
+        .group_by(MentorshipRelationship.mentor_id, MentorshipRelationship.id)
+    )
+    for mentor_id, mentorship_id, session_count, minutes, rating_sum, ratings in rows:
+        mentor_data = data[str(mentor_id)]
+        mentor_data['sessions'] += session_count
+        mentor_data['minutes'] += int(minutes or 0)
+        mentor_data['rating_sum'] += float(rating_sum or 0)
+        mentor_data['ratings'] += ratings
+        weekly_sessions[mentorship_id] = session_count
+    
+    relationships = db.session.execute(
+        select(
+            MentorshipRelationship.id,
+            MentorshipRelationship.mentor_id,
+            MentorshipRelationship.mentee_id,
+            MentorshipRelationship.total_sessions_completed,
+            MentorshipRelationship.total_hours_completed,
+            MentorshipRelationship.goals_achieved
+        )
+        .where(
+            MentorshipRelationship.mentor_id.in_(mentor_ids),
+            MentorshipRelationship.status == MentorshipStatus.ACTIVE,
+            MentorshipRelationship.is_deleted == False
+        )
+    )
+    for mentorship_id, mentor_id, mentee_id, total_sessions, total_hours, goals_achieved in relationships:
+        data[str(mentor_id)]['mentees'].append({
+            'mentorship_id': str(mentorship_id),
+            'mentee_id': str(mentee_id),
+            'sessions_this_week': weekly_sessions.get(mentorship_id, 0),
+            'total_sessions': total_sessions or 0,
+            'total_hours': float(total_hours or 0),
+            'goals_achieved': goals_achieved or 0
+        })
+    
+    return data
+
+
+def _has_mentor_activity(mentor_data: dict[str, Any]) -> bool:
+    """Verifica si el mentor tuvo sesiones en la semana"""
+    return mentor_data['sessions'] > 0
+
+
+def _calculate_mentor_metrics(mentor_data: dict[str, Any]) -> dict[str, float]:
+    """Calcula métricas semanales del mentor"""
+    ratings = mentor_data['ratings']
+    return {
+        'sessions': mentor_data['sessions'],
+        'hours': round(mentor_data['minutes'] / 60, 1),
+        'avg_rating': round(mentor_data['rating_sum'] / ratings, 2) if ratings else 0.0,
+        'active_mentees': len(mentor_data['mentees']),
+        'mentees_met': sum(1 for mentee in mentor_data['mentees'] if mentee['sessions_this_week'])
+    }
+
+
+def _generate_mentor_insights(mentor: Ally, metrics: dict[str, float]) -> list[str]:
+    """Genera insights sobre las mentorías de la semana"""
+    insights = [f"Completaste {metrics['sessions']} sesiones ({metrics['hours']} horas) esta semana"]
+    
+    pending = metrics['active_mentees'] - metrics['mentees_met']
+    if pending > 0:
+        insights.append(f"{pending} de tus emprendedores no tuvieron sesión esta semana")
+    if metrics['avg_rating'] >= 4.5:
+        insights.append(f"Excelente valoración media de tus sesiones: {metrics['avg_rating']}")
+    
+    return insights
+
+
+def _process_mentor_summary_chunk(mentor_ids: list[str], start_date: datetime,
+                                  end_date: datetime) -> dict[str, int]:
+    """Genera, guarda y notifica los resúmenes semanales de un bloque de mentores"""
+    mentors = Ally.query.filter(Ally.id.in_(mentor_ids)).all()
+    weekly_data = _get_mentors_weekly_data(mentor_ids, start_date, end_date)
+    
+    summaries = []
+    failed = 0
+    
+    for mentor in mentors:
+        try:
+            mentor_data = weekly_data[str(mentor.id)]
+            
+            # Skip si no hay actividad
+            if not _has_mentor_activity(mentor_data):
+                continue
+            
+            mentor_metrics = _calculate_mentor_metrics(mentor_data)
+            summaries.append((mentor, AnalyticsReport(
+                title=f"Resumen Semanal de Mentoría - {mentor.get_full_name()}",
+                timeframe=AnalyticsTimeframe.WEEKLY,
+                generated_at=datetime.now(timezone.utc),
+                data={
+                    **mentor_data,
+                    'mentees_progress': mentor_data['mentees']
+                },
+                metrics=mentor_metrics,
+                charts=[],
+                insights=_generate_mentor_insights(mentor, mentor_metrics),
+                recommendations=[],
+                metadata={
+                    'mentor_id': str(mentor.id),
+                    'start_date': start_date.isoformat(),
+                    'end_date': end_date.isoformat(),
+                    'report_type': 'mentor_weekly'
+                }
+            )))
+            
+        except Exception as e:
+            logger.error(f"Error generando resumen para mentor {mentor.id}: {str(e)}")
+            failed += 1
+    
+    if summaries:
+        summary_ids = _save_analytics_reports([summary for _, summary in summaries])
+        
+        # Notificar a los mentores (una publicación por bloque)
+        from app.tasks.notification_tasks import send_in_app_notification
+        group(
+            send_in_app_notification.s(str(mentor.id), {
+                'title': 'Tu resumen semanal está listo',
+                'message': f"Revisa el progreso de tus {len(summary.data['mentees_progress'])} emprendedores",
+                'type': 'summary',
+                'action_url': f'/mentors/summary/{summary_id}'
+            })
+            for (mentor, summary), summary_id in zip(summaries, summary_ids)
+        ).apply_async(countdown=30)
+    
+    return {
+        'generated': len(summaries),
+        'skipped': len(mentor_ids) - len(summaries) - failed,
+        'failed': failed
+    }
+
+
+WEEKLY_ENTREPRENEUR_REPORT = register_report_job(ReportJob(
+    name='weekly_entrepreneur_report',
+    list_ids=_list_active_entrepreneur_ids,
+    process_chunk=_process_entrepreneur_report_chunk
+))
+
+WEEKLY_MENTOR_SUMMARY = register_report_job(ReportJob(
+    name='weekly_mentor_summary',
+    list_ids=_list_active_mentor_ids,
+    process_chunk=_process_mentor_summary_chunk
+))
+
+
 # Más funciones auxiliares según necesidades específicas...
 
 
@@ -1580,6 +1862,8 @@ __all__ = [
     'export_analytics_data',
     'train_ml_models',
     'generate_user_engagement_report',
+    'refresh_metric_rollups',
+    'correct_late_metric_rollups',
     'AnalyticsTimeframe',
     'MetricType',
     'AnalyticsReport',
@@ -0,0 +1,82 @@
+"""
+Tareas de Sincronización de Calendarios - Ecosistema de Emprendimiento
+=====================================================================
+
+Tareas asíncronas que ejecutan el motor de sincronización de calendarios:
+
+- Sincronización de un usuario (webhooks, conexión inicial y reintentos)
+- Pasada nocturna de todos los calendarios conectados
+
+Los reintentos no se hacen con ``self.retry``: el motor decide el backoff y
+reprograma ``sync_user_calendar`` con el intento siguiente.
+"""
+
+import logging
+from typing import Any
+
+from app.tasks.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+def _build_engine():
+    """Construir el motor con la fuente de Google Calendar."""
+    from app.services.calendar_sync import CalendarSyncEngine, GoogleCalendarSource
+    from app.services.google_calendar import google_calendar_service
+
+    return CalendarSyncEngine(GoogleCalendarSource(google_calendar_service))
+
+
+@celery_app.task(
+    bind=True,
+    queue='normal',
+    priority=5,
+    acks_late=True
+)
+def sync_user_calendar(self, user_id: str, attempt: int = 0) -> dict[str, Any]:
+    """
+    Sincroniza el calendario de un usuario
+
+    Args:
+        user_id: ID del usuario
+        attempt: Número de intento (los reintentos los programa el motor)
+    """
+    outcome = _build_engine().sync_user(user_id, attempt=attempt)
+
+    if outcome.success:
+        logger.info(f"Calendario de usuario {user_id} sincronizado: {outcome.events_synced} cambios")
+    elif outcome.retry_in_seconds is not None:
+        logger.warning(f"Reintento de sincronización para {user_id} en {outcome.retry_in_seconds}s")
+
+    return {
+        'success': outcome.success,
+        'events_synced': outcome.events_synced,
+        'events_created': outcome.events_created,
+        'events_updated': outcome.events_updated,
+        'events_deleted': outcome.events_deleted,
+        'full_sync': outcome.full_sync,
+        'retry_in_seconds': outcome.retry_in_seconds,
+        'errors': outcome.errors
+    }
+
+
+@celery_app.task(
+    bind=True,
+    queue='normal',
+    priority=4,
+    time_limit=3600,
+    soft_time_limit=3300
+)
+def sync_all_calendars(self) -> dict[str, Any]:
+    """
+    Sincroniza todos los calendarios conectados
+
+    Se ejecuta diariamente a la 1:30 AM
+    """
+    logger.info("Iniciando sincronización nocturna de calendarios")
+    summary = _build_engine().sync_all()
+    logger.info(
+        f"Sincronización nocturna completada: {summary['successful']} correctas, "
+        f"{summary['failed']} fallidas, {summary['retries_scheduled']} reintentos programados"
+    )
+    return summary
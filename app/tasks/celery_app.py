@@ -252,6 +252,18 @@ class CeleryConfig:
             '*': {
                 'rate_limit': '100/m',
             },
+            # Vaciado de la bandeja de webhooks: ráfagas de miles de eventos
+            'app.tasks.webhook_tasks.*': {
+                'rate_limit': '600/m',
+                'time_limit': 600,
+                'soft_time_limit': 540,
+            },
+            # Vaciado de colas de webhooks salientes (límites por destino en el motor)
+            'app.tasks.integration_tasks.*': {
+                'rate_limit': '600/m',
+                'time_limit': 300,
+                'soft_time_limit': 270,
+            },
             'app.tasks.email_tasks.*': {
                 'rate_limit': '50/m',
                 'time_limit': 120,
@@ -262,6 +274,12 @@ class CeleryConfig:
                 'time_limit': 600,
                 'soft_time_limit': 540,
             },
+            # Bloques de reportes por usuario: muchos y cortos, en paralelo
+            'app.tasks.report_fanout.*': {
+                'rate_limit': '600/m',
+                'time_limit': 600,
+                'soft_time_limit': 540,
+            },
             'app.tasks.backup_tasks.*': {
                 'rate_limit': '5/m',
                 'time_limit': 1800,
@@ -296,9 +314,15 @@ class CeleryConfig:
         self.imports = [
             'app.tasks.email_tasks',
             'app.tasks.notification_tasks',
+            'app.tasks.webhook_tasks',
+            'app.tasks.integration_tasks',
             'app.tasks.analytics_tasks',
+            'app.tasks.report_fanout',
             'app.tasks.backup_tasks',
-            'app.tasks.maintenance_tasks'
+            'app.tasks.maintenance_tasks',
+            'app.tasks.task_maintenance',
+            'app.tasks.calendar_tasks',
+            'app.tasks.currency_tasks'
         ]
     
     def _get_broker_url(self) -> str:
@@ -619,11 +643,21 @@ def _setup_queues_and_routing(celery_app: EcosistemaEmprendimientoCelery):
             'routing_key': 'notifications.send',
             'priority': 6
         },
+        'app.tasks.webhook_tasks.*': {
+            'queue': 'notifications',
+            'routing_key': 'notifications.send',
+            'priority': 7
+        },
         'app.tasks.analytics_tasks.*': {
             'queue': 'analytics',
             'routing_key': 'analytics.process',
             'priority': 4
         },
+        'app.tasks.report_fanout.*': {
+            'queue': 'analytics',
+            'routing_key': 'analytics.process',
+            'priority': 6
+        },
         'app.tasks.backup_tasks.*': {
             'queue': 'backups',
             'routing_key': 'backups.create',
@@ -634,6 +668,26 @@ def _setup_queues_and_routing(celery_app: EcosistemaEmprendimientoCelery):
             'routing_key': 'maintenance.run',
             'priority': 5
         },
+        'app.tasks.task_maintenance.*': {
+            'queue': 'maintenance',
+            'routing_key': 'maintenance.run',
+            'priority': 5
+        },
+        'app.tasks.calendar_tasks.*': {
+            'queue': 'normal',
+            'routing_key': 'normal',
+            'priority': 5
+        },
+        'app.tasks.integration_tasks.*': {
+            'queue': 'normal',
+            'routing_key': 'normal',
+            'priority': 5
+        },
+        'app.tasks.currency_tasks.*': {
+            'queue': 'normal',
+            'routing_key': 'normal',
+            'priority': 5
+        },
         
         # Routing por prioridad
         'app.tasks.*.urgent_*': {
@@ -668,6 +722,26 @@ def _setup_beat_schedule(celery_app: EcosistemaEmprendimientoCelery):
             }
         },
         
+        'webhook-inbox-sweep': {
+            'task': 'app.tasks.webhook_tasks.sweep_webhook_inboxes',
+            'schedule': crontab(minute='*'),  # Cada minuto
+            'options': {
+                'queue': 'notifications',
+                'priority': 5,
+                'expires': 55
+            }
+        },
+        
+        'outbound-webhook-sweep': {
+            'task': 'app.tasks.integration_tasks.sweep_outbound_webhooks',
+            'schedule': crontab(minute='*'),  # Cada minuto
+            'options': {
+                'queue': 'normal',
+                'priority': 5,
+                'expires': 55
+            }
+        },
+        
         'database-backup-hourly': {
             'task': 'app.tasks.backup_tasks.incremental_backup',
             'schedule': crontab(minute=30),  # Cada hora a los 30 minutos
@@ -678,6 +752,16 @@ def _setup_beat_schedule(celery_app: EcosistemaEmprendimientoCelery):
             }
         },
         
+        'hourly-exchange-rates': {
+            'task': 'app.tasks.currency_tasks.refresh_exchange_rates',
+            'schedule': crontab(minute=5),  # Cada hora a los 5 minutos
+            'options': {
+                'queue': 'normal',
+                'priority': 5,
+                'expires': 3000
+            }
+        },
+        
         # === TAREAS DIARIAS ===
         'daily-full-backup': {
             'task': 'app.tasks.backup_tasks.full_database_backup',
@@ -697,6 +781,15 @@ def _setup_beat_schedule(celery_app: EcosistemaEmprendimientoCelery):
             }
         },
         
+        'nightly-calendar-sync': {
+            'task': 'app.tasks.calendar_tasks.sync_all_calendars',
+            'schedule': crontab(hour=1, minute=30),  # 1:30 AM
+            'options': {
+                'queue': 'normal',
+                'priority': 4
+            }
+        },
+        
         'daily-cleanup': {
             'task': 'app.tasks.maintenance_tasks.daily_cleanup',
             'schedule': crontab(hour=3, minute=0),  # 3:00 AM
@@ -706,6 +799,15 @@ def _setup_beat_schedule(celery_app: EcosistemaEmprendimientoCelery):
             }
         },
         
+        'nightly-task-maintenance': {
+            'task': 'app.tasks.task_maintenance.run_task_maintenance',
+            'schedule': crontab(hour=2, minute=30),  # 2:30 AM
+            'options': {
+                'queue': 'maintenance',
+                'priority': 5
+            }
+        },
+        
         'daily-user-engagement-report': {
             'task': 'app.tasks.analytics_tasks.generate_user_engagement_report',
             'schedule': crontab(hour=7, minute=0),  # 7:00 AM
@@ -793,6 +895,26 @@ def _setup_beat_schedule(celery_app: EcosistemaEmprendimientoCelery):
             }
         },
         
+        'refresh-metric-rollups': {
+            'task': 'app.tasks.analytics_tasks.refresh_metric_rollups',
+            'schedule': crontab(minute='*/5'),  # Cada 5 minutos
+            'options': {
+                'queue': 'analytics',
+                'priority': 4,
+                'expires': 240
+            }
+        },
+        
+        'correct-late-metric-rollups': {
+            'task': 'app.tasks.analytics_tasks.correct_late_metric_rollups',
+            'schedule': crontab(minute=15),  # Cada hora a los 15 minutos
+            'options': {
+                'queue': 'analytics',
+                'priority': 3,
+                'expires': 3300  # 55 minutos
+            }
+        },
+        
         # === TAREAS DE NOTIFICACIONES ===
         'send-daily-digest': {
             'task': 'app.tasks.notification_tasks.send_daily_digest',
@@ -0,0 +1,53 @@
+"""
+Tareas de Tasas de Cambio - Ecosistema de Emprendimiento
+========================================================
+
+Refresco en segundo plano de la matriz de tasas de cambio: se descarga la
+tabla completa de la moneda base y se publica en el cache compartido, de
+donde ``CurrencyService`` la lee sin llamar a proveedores externos en el
+camino de las peticiones ni de los reportes.
+"""
+
+import logging
+from typing import Any, Optional
+
+from app.tasks.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(
+    bind=True,
+    max_retries=3,
+    default_retry_delay=120,
+    queue='normal',
+    priority=5
+)
+def refresh_exchange_rates(self, base_currency: Optional[str] = None) -> dict[str, Any]:
+    """
+    Refresca la matriz de tasas de cambio
+
+    Se ejecuta cada hora a los 5 minutos
+    """
+    from app.services.currency import get_currency_service
+
+    try:
+        matrix = get_currency_service().refresh_rate_matrix(base_currency)
+        return {
+            'success': True,
+            'base': matrix.base,
+            'currencies': len(matrix.rates),
+            'source': matrix.source,
+            'fetched_at': matrix.fetched_at.isoformat()
+        }
+
+    except Exception as exc:
+        logger.error(f"Error refrescando tasas de cambio: {str(exc)}")
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=exc)
+        return {'success': False, 'error': str(exc)}
+
+
+__all__ = [
+    'refresh_exchange_rates'
+]
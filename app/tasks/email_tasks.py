@@ -895,7 +895,7 @@ def send_bulk_campaign(self, campaign_id: int):
     queue='emails',
     priority=EmailPriority.NORMAL.value
 )
-def send_campaign_batch(self, campaign_id: int, recipients: list[Dict], batch_idx: int):
+def send_campaign_batch(self, campaign_id: int, recipients: list[dict], batch_idx: int):
     """
     Envía un lote de una campaña de email
     
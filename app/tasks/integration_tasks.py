@@ -0,0 +1,111 @@
+"""
+Tareas de Integraciones - Ecosistema de Emprendimiento
+======================================================
+
+Entrega en segundo plano de los webhooks salientes
+(``app.services.webhook_delivery``):
+
+- ``flush_outbound_webhooks``: vacía la cola de un destino (como mucho una
+  tarea por destino e intervalo, sin importar cuántos eventos lleguen)
+- ``retry_outbound_webhooks``: reentrega los eventos que fallaron, con el
+  retardo del backoff exponencial ya aplicado como ``countdown``
+- ``sweep_outbound_webhooks``: barrido periódico que devuelve a la cola los
+  lotes de workers caídos y programa el vaciado de las colas con eventos
+"""
+
+import logging
+from typing import Any
+
+from app.tasks.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+def _engine():
+    from app.services.integration_hub import get_integration_hub
+
+    return get_integration_hub().webhook_manager.delivery
+
+
+def _schedule_retries(destination, result) -> None:
+    if result.retry_items:
+        retry_outbound_webhooks.apply_async(
+            args=[destination.name, result.retry_items],
+            countdown=result.retry_in_seconds
+        )
+
+
+@celery_app.task(
+    bind=True,
+    queue='normal',
+    priority=5,
+    acks_late=True
+)
+def flush_outbound_webhooks(self, destination_name: str) -> dict[str, Any]:
+    """
+    Entrega los eventos encolados para un destino
+
+    Args:
+        destination_name: Nombre del destino registrado
+    """
+    engine = _engine()
+    # Los reintentos se encolan antes de confirmar el lote
+    result = engine.flush(destination_name, on_result=_schedule_retries)
+
+    if result.failed or result.deferred:
+        logger.warning(
+            f"Webhooks a {destination_name}: {result.delivered} entregados, {result.failed} fallidos, "
+            f"{result.deferred} aplazados, reintento en {result.retry_in_seconds}s"
+        )
+    return {
+        'success': not result.failed,
+        **result.to_dict(),
+        'metrics': engine.metrics.snapshot().get(destination_name)
+    }
+
+
+@celery_app.task(
+    bind=True,
+    queue='normal',
+    priority=4,
+    acks_late=True
+)
+def retry_outbound_webhooks(self, destination_name: str, items: list[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Reentrega eventos fallidos o aplazados de un destino
+
+    Args:
+        destination_name: Nombre del destino registrado
+        items: Eventos con su número de intento
+    """
+    engine = _engine()
+    destination = engine.get_destination(destination_name)
+    if destination is None:
+        logger.warning(f"Destino de webhook desconocido: {destination_name}")
+        return {'success': False, 'error': 'unknown destination'}
+
+    result = engine.deliver(destination, items)
+    _schedule_retries(destination, result)
+    return {'success': not result.failed, **result.to_dict()}
+
+
+@celery_app.task(
+    bind=True,
+    queue='normal',
+    priority=5
+)
+def sweep_outbound_webhooks(self) -> dict[str, Any]:
+    """
+    Recupera lotes sin confirmar y reprograma las colas con eventos
+
+    Se ejecuta cada minuto
+    """
+    scheduled = _engine().sweep()
+    return {'success': True, 'scheduled': scheduled}
+
+
+__all__ = [
+    'flush_outbound_webhooks',
+    'retry_outbound_webhooks',
+    'sweep_outbound_webhooks'
+]
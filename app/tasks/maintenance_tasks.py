@@ -70,6 +70,7 @@ from app.models.maintenance_log import MaintenanceLog, MaintenanceType, Maintena
 from app.services.notification_service import NotificationService
 from app.services.analytics_service import AnalyticsService
 from app.services.email import EmailService
+from app.services.data_archive import DataArchiver, RETENTION_POLICIES
 from app.utils.formatters import format_datetime, format_file_size, format_percentage
 from app.utils.string_utils import generate_maintenance_id
 from app.utils.cache_utils import cache_get, cache_set, cache_delete, clear_cache_pattern
@@ -1306,29 +1307,18 @@ def _cleanup_old_notifications() -> MaintenanceResult:
     start_time = datetime.now(timezone.utc)
     
     try:
-        from app import db
+        archiver = DataArchiver()
+        policy = RETENTION_POLICIES['notifications']
         
-        # Eliminar notificaciones leídas más antiguas de 30 días
+        # Eliminar notificaciones leídas más antiguas de 30 días (por lotes)
         cutoff_date = datetime.now(timezone.utc) - timedelta(days=30)
-        
-        old_notifications = Notification.query.filter(
-            Notification.status == NotificationStatus.READ,
-            Notification.created_at < cutoff_date
+        items_processed = archiver.purge(
+            policy, cutoff_date, Notification.status == NotificationStatus.READ
         )
         
-        items_processed = old_notifications.count()
-        old_notifications.delete(synchronize_session=False)
-        
-        # Eliminar notificaciones no leídas más antiguas de 90 días
+        # Archivar y eliminar el resto de notificaciones más antiguas de 90 días
         very_old_cutoff = datetime.now(timezone.utc) - timedelta(days=90)
-        very_old_notifications = Notification.query.filter(
-            Notification.created_at < very_old_cutoff
-        )
-        
-        very_old_count = very_old_notifications.count()
-        very_old_notifications.delete(synchronize_session=False)
-        
-        db.session.commit()
+        very_old_result = archiver.archive(policy, very_old_cutoff)
         
         duration = (datetime.now(timezone.utc) - start_time).total_seconds()
         
@@ -1336,10 +1326,10 @@ def _cleanup_old_notifications() -> MaintenanceResult:
             operation=MaintenanceOperation.CLEANUP,
             success=True,
             duration=duration,
-            items_processed=items_processed + very_old_count,
+            items_processed=items_processed + very_old_result.rows_deleted,
             details={
                 'read_notifications_deleted': items_processed,
-                'very_old_notifications_deleted': very_old_count
+                'very_old_notifications_archived': very_old_result.rows_archived
             }
         )
         
@@ -1349,6 +1339,7 @@ def _cleanup_old_notifications() -> MaintenanceResult:
             operation=MaintenanceOperation.CLEANUP,
             success=False,
             duration=duration,
+            details={},
             error_message=str(e)
         )
 
@@ -1407,23 +1398,13 @@ def _cleanup_invalid_device_tokens() -> MaintenanceResult:
 
 
 def _cleanup_old_analytics_events() -> MaintenanceResult:
-    """Limpia eventos de analytics antiguos"""
+    """Archiva y elimina métricas de analytics antiguas"""
     start_time = datetime.now(timezone.utc)
     
     try:
-        from app import db
-        
-        # Mantener solo eventos de los últimos 90 días
-        cutoff_date = datetime.now(timezone.utc) - timedelta(days=90)
-        
-        old_events = AnalyticsEvent.query.filter(
-            AnalyticsEvent.timestamp < cutoff_date
-        )
-        
-        items_processed = old_events.count()
-        old_events.delete(synchronize_session=False)
-        
-        db.session.commit()
+        # Mantener en la tabla solo los últimos 90 días; el resto pasa al archivo
+        policy = RETENTION_POLICIES['analytics_metrics']
+        result = DataArchiver().archive(policy)
         
         duration = (datetime.now(timezone.utc) - start_time).total_seconds()
         
@@ -1431,10 +1412,10 @@ def _cleanup_old_analytics_events() -> MaintenanceResult:
             operation=MaintenanceOperation.CLEANUP,
             success=True,
             duration=duration,
-            items_processed=items_processed,
+            items_processed=result.rows_archived,
             details={
-                'analytics_events_deleted': items_processed,
-                'retention_days': 90
+                'analytics_metrics_archived': result.rows_archived,
+                'retention_days': policy.retention_days
             }
         )
         
@@ -1444,6 +1425,7 @@ def _cleanup_old_analytics_events() -> MaintenanceResult:
             operation=MaintenanceOperation.CLEANUP,
             success=False,
             duration=duration,
+            details={},
             error_message=str(e)
         )
 
@@ -1729,26 +1711,12 @@ def _cleanup_obsolete_backups() -> MaintenanceResult:
 
 
 # Funciones auxiliares para archivado mensual
-def _archive_old_activity_logs(cutoff_date: datetime) -> MaintenanceResult:
-    """Archiva logs de actividad antiguos"""
+def _archive_table(policy_name: str, cutoff_date: datetime) -> MaintenanceResult:
+    """Archiva en ficheros y elimina por lotes las filas anteriores a la fecha de corte"""
     start_time = datetime.now(timezone.utc)
     
     try:
-        from app import db
-        
-        # Contar registros a archivar
-        old_logs = ActivityLog.query.filter(
-            ActivityLog.created_at < cutoff_date
-        )
-        
-        items_to_archive = old_logs.count()
-        
-        # En una implementación real, aquí exportarías a archivo
-        # y luego eliminarías de la tabla principal
-        
-        # Por ahora solo marcamos como archivados (añadir campo si es necesario)
-        # old_logs.delete(synchronize_session=False)
-        # db.session.commit()
+        result = DataArchiver().archive(RETENTION_POLICIES[policy_name], cutoff_date)
         
         duration = (datetime.now(timezone.utc) - start_time).total_seconds()
         
@@ -1756,8 +1724,16 @@ def _archive_old_activity_logs(cutoff_date: datetime) -> MaintenanceResult:
             operation=MaintenanceOperation.CLEANUP,
             success=True,
             duration=duration,
-            items_processed=items_to_archive,
-            details={'activity_logs_ready_for_archive': items_to_archive}
+            items_processed=result.rows_archived,
+            details={
+                f'{policy_name}_archived': result.rows_archived,
+                'rows_deleted': result.rows_deleted,
+                'archive_files': len(result.files),
+                'complete': result.complete
+            },
+            recommendations=[] if result.complete else [
+                f"Quedan filas de {policy_name} por archivar; continuarán en la próxima ejecución"
+            ]
         )
         
     except Exception as e:
@@ -1766,67 +1742,24 @@ def _archive_old_activity_logs(cutoff_date: datetime) -> MaintenanceResult:
             operation=MaintenanceOperation.CLEANUP,
             success=False,
             duration=duration,
+            details={},
             error_message=str(e)
         )
 
 
+def _archive_old_activity_logs(cutoff_date: datetime) -> MaintenanceResult:
+    """Archiva logs de actividad antiguos"""
+    return _archive_table('activity_logs', cutoff_date)
+
+
 def _archive_old_analytics_events(cutoff_date: datetime) -> MaintenanceResult:
-    """Archiva eventos de analytics antiguos"""
-    start_time = datetime.now(timezone.utc)
-    
-    try:
-        # Similar a activity logs
-        items_to_archive = AnalyticsEvent.query.filter(
-            AnalyticsEvent.timestamp < cutoff_date
-        ).count()
-        
-        duration = (datetime.now(timezone.utc) - start_time).total_seconds()
-        
-        return MaintenanceResult(
-            operation=MaintenanceOperation.CLEANUP,
-            success=True,
-            duration=duration,
-            items_processed=items_to_archive,
-            details={'analytics_events_ready_for_archive': items_to_archive}
-        )
-        
-    except Exception as e:
-        duration = (datetime.now(timezone.utc) - start_time).total_seconds()
-        return MaintenanceResult(
-            operation=MaintenanceOperation.CLEANUP,
-            success=False,
-            duration=duration,
-            error_message=str(e)
-        )
+    """Archiva métricas de analytics antiguas"""
+    return _archive_table('analytics_metrics', cutoff_date)
 
 
 def _archive_old_notifications(cutoff_date: datetime) -> MaintenanceResult:
     """Archiva notificaciones antiguas"""
-    start_time = datetime.now(timezone.utc)
-    
-    try:
-        items_to_archive = Notification.query.filter(
-            Notification.created_at < cutoff_date
-        ).count()
-        
-        duration = (datetime.now(timezone.utc) - start_time).total_seconds()
-        
-        return MaintenanceResult(
-            operation=MaintenanceOperation.CLEANUP,
-            success=True,
-            duration=duration,
-            items_processed=items_to_archive,
-            details={'notifications_ready_for_archive': items_to_archive}
-        )
-        
-    except Exception as e:
-        duration = (datetime.now(timezone.utc) - start_time).total_seconds()
-        return MaintenanceResult(
-            operation=MaintenanceOperation.CLEANUP,
-            success=False,
-            duration=duration,
-            error_message=str(e)
-        )
+    return _archive_table('notifications', cutoff_date)
 
 
 def _archive_old_system_metrics(cutoff_date: datetime) -> MaintenanceResult:
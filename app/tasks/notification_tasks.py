@@ -65,7 +65,7 @@ from app.models.notification import (
 from app.models.notification_preference import NotificationPreference
 from app.models.device_token import DeviceToken
 from app.models.activity_log import ActivityLog, ActivityType
-from app.services.notification_service import NotificationService
+from app.services.notification_service import NotificationService, get_notification_service
 from app.services.user_service import UserService
 from app.services.analytics_service import AnalyticsService
 from app.utils.formatters import format_datetime, format_user_name, truncate_text
@@ -510,6 +510,49 @@ def send_in_app_notification(self, user_id: int, notification_data: dict[str, An
         return {'success': False, 'error': str(exc)}
 
 
+@celery_app.task(
+    bind=True,
+    max_retries=2,
+    default_retry_delay=60,
+    queue='notifications',
+    priority=NotificationPriority.MEDIUM.value
+)
+def send_notification_batch(self, channel: str, notification_ids: list[str]):
+    """
+    Entrega un grupo de notificaciones masivas por un canal
+    
+    Un grupo sustituye a una tarea por destinatario: la entrega usa la API
+    masiva del proveedor del canal y actualiza los estados de una vez.
+    
+    Args:
+        channel: Canal de envío (email, sms, in_app, push)
+        notification_ids: IDs de las notificaciones del grupo
+    """
+    try:
+        logger.info(f"Entregando {len(notification_ids)} notificaciones por {channel}")
+        
+        result = get_notification_service().deliver_notification_batch(channel, notification_ids)
+        
+        if result.errors:
+            logger.warning(
+                f"Grupo {channel}: {result.failed} fallidas, primer error: {result.errors[0]}"
+            )
+        
+        return {
+            'success': result.failed == 0,
+            'channel': channel,
+            'total': result.total_sent,
+            'sent': result.successful,
+            'failed': result.failed
+        }
+        
+    except Exception as exc:
+        logger.error(f"Error entregando grupo de notificaciones por {channel}: {str(exc)}")
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=exc, countdown=60 * (2 ** self.request.retries))
+        return {'success': False, 'channel': channel, 'error': str(exc)}
+
+
 # === TAREAS DE NOTIFICACIONES ESPECÍFICAS DEL ECOSISTEMA ===
 
 @celery_app.task(
@@ -1242,7 +1285,7 @@ def cleanup_old_notifications(self):
     queue='notifications',
     priority=NotificationPriority.NORMAL.value
 )
-def send_slack_notification(self, channel: str, message: str, attachments: list[Dict] = None):
+def send_slack_notification(self, channel: str, message: str, attachments: list[dict] = None):
     """
     Envía notificación a Slack
     
@@ -1585,6 +1628,7 @@ __all__ = [
     'send_websocket_notification',
     'send_sms_notification',
     'send_in_app_notification',
+    'send_notification_batch',
     'send_meeting_notification',
     'send_mentorship_notification',
     'send_project_notification',
@@ -0,0 +1,222 @@
+"""
+Reportes por usuario repartidos en bloques paralelos.
+
+Un ``ReportJob`` describe un reporte periódico por usuario: cómo obtener los
+ids del periodo y cómo procesar un bloque de ids (precargando los datos de
+todo el bloque en pocas consultas, guardando los reportes en una sola
+transacción y encolando los envíos). ``start_report_fanout`` divide los ids
+en bloques y lanza un ``chord``: un ``process_report_chunk`` por bloque y
+``finalize_report_fanout`` para agregar los resultados.
+
+El plan y el resultado de cada bloque se guardan en cache
+(``app.utils.fanout.FanoutTracker``) con un ``run_id`` por tarea y periodo.
+Relanzar la misma tarea para el mismo periodo solo procesa los bloques que
+no terminaron; una ejecución ya completada no se repite salvo con
+``restart=True``.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+from celery import chord
+
+from app.extensions import cache
+from app.tasks.celery_app import celery_app
+from app.utils.fanout import FanoutTracker, chunked
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 200
+
+
+@dataclass(frozen=True)
+class ReportJob:
+    """
+    Reporte periódico por usuario que se procesa en bloques.
+
+    Args:
+        name: Nombre estable del reporte (forma parte del ``run_id``)
+        list_ids: ``fn(desde, hasta)`` con los ids de usuario del periodo
+        process_chunk: ``fn(ids, desde, hasta)`` que procesa un bloque y
+            devuelve sus contadores (``generated``, ``skipped``, ``failed``)
+        chunk_size: Usuarios por bloque
+    """
+
+    name: str
+    list_ids: Callable[[datetime, datetime], list]
+    process_chunk: Callable[[list[str], datetime, datetime], dict[str, Any]]
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+
+
+REPORT_JOBS: dict[str, ReportJob] = {}
+
+
+def register_report_job(job: ReportJob) -> ReportJob:
+    """Registrar un reporte para que los workers puedan procesar sus bloques."""
+    REPORT_JOBS[job.name] = job
+    return job
+
+
+def get_report_job(name: str) -> ReportJob:
+    try:
+        return REPORT_JOBS[name]
+    except KeyError:
+        raise ValueError(f"Reporte en bloques no registrado: {name}")
+
+
+def report_run_id(job_name: str, period_start: datetime) -> str:
+    """Identificador de la ejecución de un reporte para un periodo."""
+    return f'{job_name}:{period_start.date().isoformat()}'
+
+
+def get_report_tracker(run_id: str) -> FanoutTracker:
+    return FanoutTracker(cache, run_id)
+
+
+def get_report_fanout_progress(job_name: str, period_start: datetime) -> dict[str, Any]:
+    """Progreso (o resumen final) de la ejecución de un reporte."""
+    tracker = get_report_tracker(report_run_id(job_name, period_start))
+    return tracker.result() or tracker.progress()
+
+
+def start_report_fanout(job_name: str, start_date: datetime, end_date: datetime,
+                        chunk_size: Optional[int] = None, restart: bool = False) -> dict[str, Any]:
+    """
+    Planificar y lanzar los bloques pendientes de un reporte.
+
+    Args:
+        job_name: Reporte registrado con ``register_report_job``
+        start_date: Inicio del periodo
+        end_date: Fin del periodo (exclusivo)
+        chunk_size: Usuarios por bloque (el del reporte por defecto)
+        restart: Descartar el progreso guardado y procesar todo de nuevo
+
+    Returns:
+        Resumen de la planificación (o el resultado si ya estaba completada)
+    """
+    job = get_report_job(job_name)
+    tracker = get_report_tracker(report_run_id(job_name, start_date))
+
+    if restart:
+        tracker.reset()
+    else:
+        result = tracker.result()
+        if result is not None:
+            logger.info(f"Reporte {tracker.run_id} ya completado, no se relanza")
+            return {**result, 'dispatched_chunks': 0}
+
+    plan = tracker.plan()
+    resumed = plan is not None
+    if plan is None:
+        ids = [str(user_id) for user_id in job.list_ids(start_date, end_date)]
+        plan = tracker.start(chunked(ids, chunk_size or job.chunk_size))
+
+    pending = tracker.pending_chunks()
+    period = (start_date.isoformat(), end_date.isoformat())
+    callback = finalize_report_fanout.s(job_name, tracker.run_id)
+
+    if pending:
+        chord(
+            process_report_chunk.s(job_name, tracker.run_id, index, plan['chunks'][index], *period)
+            for index in pending
+        )(callback)
+    else:
+        callback.delay([])
+
+    logger.info(
+        f"Reporte {tracker.run_id}: {len(pending)}/{len(plan['chunks'])} bloques lanzados"
+        f"{' (reanudado)' if resumed else ''}"
+    )
+    return {
+        'run_id': tracker.run_id,
+        'total_items': sum(len(chunk) for chunk in plan['chunks']),
+        'total_chunks': len(plan['chunks']),
+        'dispatched_chunks': len(pending),
+        'resumed': resumed
+    }
+
+
+@celery_app.task(
+    bind=True,
+    max_retries=3,
+    default_retry_delay=60,
+    queue='analytics',
+    priority=6
+)
+def process_report_chunk(self, job_name: str, run_id: str, index: int, user_ids: list[str],
+                         start_iso: str, end_iso: str):
+    """
+    Procesa un bloque de usuarios de un reporte
+
+    Un bloque ya registrado como terminado no se vuelve a procesar (entregas
+    duplicadas o reanudaciones). Si agota los reintentos devuelve el bloque
+    como fallido sin marcarlo, para que la siguiente ejecución lo retome.
+    """
+    tracker = get_report_tracker(run_id)
+    done = tracker.chunk_result(index)
+    if done is not None:
+        return done
+
+    try:
+        job = get_report_job(job_name)
+        result = {
+            'processed': len(user_ids),
+            **job.process_chunk(user_ids, datetime.fromisoformat(start_iso), datetime.fromisoformat(end_iso))
+        }
+        tracker.mark_chunk_done(index, result)
+        return result
+
+    except Exception as exc:
+        logger.error(f"Error procesando bloque {index} de {run_id}: {str(exc)}")
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=exc, countdown=60 * (2 ** self.request.retries))
+        return {'processed': 0, 'failed': len(user_ids), 'error': str(exc)}
+
+
+@celery_app.task(
+    bind=True,
+    max_retries=2,
+    default_retry_delay=60,
+    queue='analytics',
+    priority=6
+)
+def finalize_report_fanout(self, chunk_results: list[dict[str, Any]], job_name: str, run_id: str):
+    """
+    Agrega los resultados de los bloques de un reporte
+
+    Args:
+        chunk_results: Resultados de los bloques lanzados en esta ejecución
+            (los terminados en ejecuciones anteriores se leen de cache)
+    """
+    try:
+        tracker = get_report_tracker(run_id)
+        failed_chunks = sum(1 for result in chunk_results if result and result.get('error'))
+        summary = tracker.finish({'job': job_name, 'failed_chunks': failed_chunks})
+
+        logger.info(
+            f"Reporte {run_id} {summary['status']}: {summary.get('generated', 0)} generados, "
+            f"{summary.get('skipped', 0)} omitidos, {failed_chunks} bloques fallidos"
+        )
+        return {'success': summary['status'] == 'completed', **summary}
+
+    except Exception as exc:
+        logger.error(f"Error agregando resultados de {run_id}: {str(exc)}")
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=exc)
+        return {'success': False, 'error': str(exc)}
+
+
+__all__ = [
+    'DEFAULT_CHUNK_SIZE',
+    'ReportJob',
+    'REPORT_JOBS',
+    'register_report_job',
+    'get_report_job',
+    'report_run_id',
+    'get_report_fanout_progress',
+    'start_report_fanout',
+    'process_report_chunk',
+    'finalize_report_fanout'
+]
@@ -0,0 +1,181 @@
+"""
+Mantenimiento nocturno de tareas por bloques
+============================================
+
+``run_task_maintenance`` lista los ids de las tareas recurrentes vencidas y
+de las tareas padre activas, los divide en bloques y lanza un ``chord``: un
+``expand_recurring_chunk`` o ``rollup_parent_chunk`` por bloque y
+``summarize_task_maintenance`` para agregar los contadores y el rendimiento
+(elementos por segundo de trabajo y por segundo de reloj).
+
+Los procesadores están en ``app.services.task_batch``.
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from celery import chord
+
+from app.tasks.celery_app import celery_app
+from app.utils.fanout import chunked
+
+logger = logging.getLogger(__name__)
+
+RECURRING = 'recurring_tasks'
+PARENT_PROGRESS = 'parent_progress'
+
+
+@celery_app.task(
+    bind=True,
+    max_retries=2,
+    default_retry_delay=300,
+    queue='maintenance',
+    priority=5
+)
+def run_task_maintenance(self, chunk_size: Optional[int] = None):
+    """
+    Planifica y lanza los bloques del mantenimiento de tareas
+
+    Se ejecuta diariamente a las 2:30 AM
+    """
+    from app.services.task_batch import CHUNK_SIZE, list_active_parent_task_ids, list_due_recurring_task_ids
+
+    try:
+        started_at = datetime.now(timezone.utc)
+        size = chunk_size or CHUNK_SIZE
+
+        recurring_ids = list_due_recurring_task_ids(started_at)
+        parent_ids = list_active_parent_task_ids()
+
+        jobs = [
+            expand_recurring_chunk.s(chunk, started_at.isoformat())
+            for chunk in chunked(recurring_ids, size)
+        ] + [
+            rollup_parent_chunk.s(chunk)
+            for chunk in chunked(parent_ids, size)
+        ]
+
+        if jobs:
+            chord(jobs)(summarize_task_maintenance.s(started_at.isoformat()))
+
+        logger.info(
+            f"Mantenimiento de tareas: {len(recurring_ids)} recurrentes y "
+            f"{len(parent_ids)} padres en {len(jobs)} bloques"
+        )
+        return {
+            'success': True,
+            RECURRING: len(recurring_ids),
+            PARENT_PROGRESS: len(parent_ids),
+            'chunks': len(jobs)
+        }
+
+    except Exception as exc:
+        logger.error(f"Error planificando mantenimiento de tareas: {str(exc)}")
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=exc)
+        return {'success': False, 'error': str(exc)}
+
+
+@celery_app.task(
+    bind=True,
+    max_retries=3,
+    default_retry_delay=60,
+    queue='maintenance',
+    priority=5
+)
+def expand_recurring_chunk(self, task_ids: list[int], now_iso: str):
+    """Crea las instancias pendientes de un bloque de tareas recurrentes"""
+    from app.services.task_batch import expand_recurring_tasks
+
+    try:
+        stats = expand_recurring_tasks(task_ids, datetime.fromisoformat(now_iso))
+        return {'job': RECURRING, **stats.to_dict()}
+
+    except Exception as exc:
+        logger.error(f"Error expandiendo bloque de tareas recurrentes: {str(exc)}")
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=exc, countdown=60 * (2 ** self.request.retries))
+        return {'job': RECURRING, 'items': 0, 'failed': len(task_ids), 'error': str(exc)}
+
+
+@celery_app.task(
+    bind=True,
+    max_retries=3,
+    default_retry_delay=60,
+    queue='maintenance',
+    priority=5
+)
+def rollup_parent_chunk(self, parent_ids: list[int]):
+    """Recalcula el progreso de un bloque de tareas padre"""
+    from app.services.task_batch import rollup_parent_progress
+
+    try:
+        stats = rollup_parent_progress(parent_ids)
+        return {'job': PARENT_PROGRESS, **stats.to_dict()}
+
+    except Exception as exc:
+        logger.error(f"Error recalculando bloque de tareas padre: {str(exc)}")
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=exc, countdown=60 * (2 ** self.request.retries))
+        return {'job': PARENT_PROGRESS, 'items': 0, 'failed': len(parent_ids), 'error': str(exc)}
+
+
+def summarize_chunk_results(results: list[dict[str, Any]], wall_seconds: float) -> dict[str, Any]:
+    """Agregar contadores y rendimiento por tipo de bloque"""
+    summary: dict[str, Any] = {}
+
+    for result in results:
+        if not result:
+            continue
+        job = summary.setdefault(result['job'], {
+            'chunks': 0, 'items': 0, 'changed': 0, 'failed': 0, 'seconds': 0.0
+        })
+        job['chunks'] += 1
+        job['items'] += result.get('items', 0)
+        job['changed'] += result.get('changed', 0)
+        job['failed'] += result.get('failed', 0)
+        job['seconds'] += result.get('seconds', 0.0)
+
+    for job in summary.values():
+        job['seconds'] = round(job['seconds'], 3)
+        job['items_per_second'] = round(job['items'] / job['seconds'], 1) if job['seconds'] else None
+
+    total_items = sum(job['items'] for job in summary.values())
+    return {
+        'jobs': summary,
+        'wall_seconds': round(wall_seconds, 3),
+        'items_per_wall_second': round(total_items / wall_seconds, 1) if wall_seconds > 0 else None
+    }
+
+
+@celery_app.task(
+    bind=True,
+    queue='maintenance',
+    priority=5
+)
+def summarize_task_maintenance(self, results: list[dict[str, Any]], started_iso: str):
+    """Agrega los resultados de los bloques del mantenimiento de tareas"""
+    wall_seconds = (datetime.now(timezone.utc) - datetime.fromisoformat(started_iso)).total_seconds()
+    summary = summarize_chunk_results(results, wall_seconds)
+
+    for name, job in summary['jobs'].items():
+        logger.info(
+            f"Mantenimiento {name}: {job['items']} procesados, {job['changed']} cambios, "
+            f"{job['failed']} fallidos, {job['items_per_second']} por segundo"
+        )
+    logger.info(f"Mantenimiento de tareas completado en {summary['wall_seconds']}s")
+
+    return {
+        'success': not any(job['failed'] for job in summary['jobs'].values()),
+        **summary
+    }
+
+
+__all__ = [
+    'run_task_maintenance',
+    'expand_recurring_chunk',
+    'rollup_parent_chunk',
+    'summarize_chunk_results',
+    'summarize_task_maintenance'
+]
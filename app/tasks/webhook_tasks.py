@@ -0,0 +1,124 @@
+"""
+Tareas de Webhooks - Ecosistema de Emprendimiento
+=================================================
+
+Vaciado asíncrono de la bandeja de webhooks (``app.services.webhook_inbox``):
+
+- ``drain_webhook_inbox``: procesa por lotes los eventos de un proveedor
+  hasta que no quede nada listo o se agote el presupuesto de tiempo, con
+  una sola tarea activa por proveedor
+- ``sweep_webhook_inboxes``: barrido periódico que recoge reintentos
+  vencidos y reservas abandonadas
+- ``retry_failed_webhook``: devuelve un evento fallido a la bandeja
+"""
+
+import logging
+from typing import Any
+
+from app.tasks.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+# Segundos de vaciado por ejecución antes de ceder el worker y reencolar
+# (muy por debajo de la reserva del proveedor, ``LEASE_SECONDS``)
+DRAIN_TIME_BUDGET_SECONDS = 60
+
+
+def _build_inbox():
+    """Construir la bandeja con el despachador de los endpoints."""
+    from app.api.v1.webhooks import dispatch_webhook_event
+    from app.services.webhook_inbox import WebhookInbox
+
+    return WebhookInbox(dispatch_webhook_event)
+
+
+@celery_app.task(
+    bind=True,
+    max_retries=3,
+    default_retry_delay=30,
+    queue='notifications',
+    priority=7,
+    acks_late=True
+)
+def drain_webhook_inbox(self, provider: str) -> dict[str, Any]:
+    """
+    Procesa los eventos pendientes de un proveedor
+
+    Solo un vaciado por proveedor a la vez (``drain_lease``); una tarea que
+    no obtiene la reserva termina sin procesar nada.
+
+    Args:
+        provider: Valor de ``WebhookProvider``
+    """
+    from app.services.webhook_inbox import drain_lease
+
+    try:
+        with drain_lease(provider) as acquired:
+            if not acquired:
+                # Otro worker vacía ya este proveedor; el barrido periódico
+                # recoge lo que llegue después de su último lote
+                return {'success': True, 'provider': provider, 'skipped': True}
+
+            # Quedan eventos al agotar el tiempo: ceder el worker y continuar
+            # en otra tarea, encolada después de liberar la reserva
+            totals, requeue = _build_inbox().drain(provider, DRAIN_TIME_BUDGET_SECONDS)
+
+        if requeue:
+            drain_webhook_inbox.apply_async(args=[provider])
+
+        if totals['claimed']:
+            logger.info(
+                f"Bandeja {provider}: {totals['processed']} procesados, {totals['failed']} fallidos, "
+                f"{totals['dead_lettered']} a dead letter en {totals['seconds']:.2f}s"
+            )
+        return {'success': True, 'provider': provider, **totals}
+
+    except Exception as exc:
+        logger.error(f"Error vaciando bandeja de webhooks {provider}: {str(exc)}")
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=exc)
+        return {'success': False, 'provider': provider, 'error': str(exc)}
+
+
+@celery_app.task(
+    bind=True,
+    queue='notifications',
+    priority=5
+)
+def sweep_webhook_inboxes(self) -> dict[str, Any]:
+    """
+    Encola el vaciado de los proveedores con eventos listos
+
+    Se ejecuta cada minuto
+    """
+    from app.services.webhook_inbox import providers_with_due_events, request_drain
+
+    providers = providers_with_due_events()
+    scheduled = [provider for provider in providers if request_drain(provider)]
+    return {'success': True, 'providers': providers, 'scheduled': scheduled}
+
+
+@celery_app.task(
+    bind=True,
+    queue='notifications',
+    priority=6
+)
+def retry_failed_webhook(self, webhook_id: str) -> dict[str, Any]:
+    """
+    Devuelve un evento fallido o en dead letter a la bandeja
+
+    Args:
+        webhook_id: ID del evento en ``webhook_events``
+    """
+    from app.models.webhook_event import WebhookStatus
+    from app.services.webhook_inbox import replay_events
+
+    replayed = replay_events([webhook_id], statuses=(WebhookStatus.FAILED, WebhookStatus.DEAD_LETTER))
+    return {'success': bool(replayed), 'webhook_id': webhook_id}
+
+
+__all__ = [
+    'drain_webhook_inbox',
+    'sweep_webhook_inboxes',
+    'retry_failed_webhook'
+]
@@ -472,57 +472,28 @@ if False:  # try:  # Commented out due to application context issues
 # IMPORTACIONES OPCIONALES (Con manejo de errores)
 # ==============================================================================
 
-# Utilidades de exportación (PDF, Excel, etc.)
-try:
-    from .export_utils import (
-        export_to_pdf,
-        export_to_excel,
-        export_to_csv,
-        export_to_json,
-        generate_report,
-        ExportManager,
-    )
-    
-    from .pdf import (
-        PDFGenerator,
-        create_pdf_report,
-        merge_pdfs,
-        split_pdf,
-    )
-    
-    from .excel import (
-        ExcelProcessor,
-        read_excel_file,
-        write_excel_file,
-        format_excel_sheet,
-    )
-    
-    EXPORT_AVAILABLE = True
-    logger.debug("Utilidades de exportación importadas exitosamente")
-    
-except ImportError as e:
-    logger.info(f"Utilidades de exportación no disponibles: {e}")
-    EXPORT_AVAILABLE = False
-    export_to_pdf = export_to_excel = export_to_csv = lambda *args: None
-    export_to_json = generate_report = lambda *args: None
+# Utilidades de exportación e importación (PDF, Excel, CSV). Dependen de
+# pandas, reportlab y openpyxl, así que no se importan al cargar el paquete:
+# se resuelven en el primer acceso (ver ``__getattr__`` al final del módulo).
+from .lazy_imports import is_available
+
+_LAZY_ATTRIBUTES = {
+    'export_to_pdf': '.export_utils',
+    'export_to_excel': '.export_utils',
+    'export_to_csv': '.export_utils',
+    'export_to_json': '.export_utils',
+    'PDFGenerator': '.pdf',
+    'merge_pdfs': '.pdf',
+    'split_pdf': '.pdf',
+    'import_from_csv': '.import_utils',
+    'import_from_excel': '.import_utils',
+    'import_from_json': '.import_utils',
+    'validate_import_data': '.import_utils',
+    'ImportManager': '.import_utils',
+}
 
-# Utilidades de importación
-try:
-    from .import_utils import (
-        import_from_csv,
-        import_from_excel,
-        import_from_json,
-        validate_import_data,
-        ImportManager,
-    )
-    
-    IMPORT_AVAILABLE = True
-    logger.debug("Utilidades de importación importadas exitosamente")
-    
-except ImportError as e:
-    logger.info(f"Utilidades de importación no disponibles: {e}")
-    IMPORT_AVAILABLE = False
-    import_from_csv = import_from_excel = import_from_json = lambda *args: None
+EXPORT_AVAILABLE = is_available('pandas') and is_available('reportlab')
+IMPORT_AVAILABLE = is_available('pandas')
 
 # Utilidades de notificaciones
 try:
@@ -783,9 +754,7 @@ if EXPORT_AVAILABLE:
         'export_to_pdf',
         'export_to_excel',
         'export_to_csv',
-        'generate_report',
         'PDFGenerator',
-        'ExcelProcessor',
     ])
 
 if IMPORT_AVAILABLE:
@@ -803,6 +772,24 @@ if NOTIFICATIONS_AVAILABLE:
         'NotificationManager',
     ])
 
+
+
+def __getattr__(name: str):
+    """Resolver en el primer acceso las utilidades de exportación e importación."""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    import importlib
+    try:
+        value = getattr(importlib.import_module(module_name, __name__), name)
+    except ImportError as e:
+        logger.info(f"Utilidad {name} no disponible: {e}")
+        value = lambda *args, **kwargs: None
+    globals()[name] = value
+    return value
+
+
 # ==============================================================================
 # INICIALIZACIÓN
 # ==============================================================================
@@ -0,0 +1,205 @@
+"""
+Almacén de ficheros de archivo para filas retiradas de la base de datos.
+
+Cada conjunto de datos (``activity_logs``, ``notifications``...) se guarda
+en ficheros JSONL comprimidos con gzip, particionados por mes según la
+columna de tiempo de la fila::
+
+    <raíz>/<conjunto>/<AAAA>/<MM>/<conjunto>-<marca>.jsonl.gz
+    <raíz>/<conjunto>/manifest.jsonl
+
+El manifiesto tiene una línea por fichero (filas, rango de tiempo, sha256) y
+se escribe después de que el fichero esté completo en disco, así que un
+fichero sin entrada en el manifiesto se ignora. La lectura solo abre los
+ficheros cuyo rango se solapa con el periodo pedido.
+
+Uso:
+    store = ArchiveStore('archives')
+    store.write('activity_logs', rows, time_key='created_at')
+    for row in store.read('activity_logs', desde, hasta):
+        ...
+"""
+
+import base64
+import gzip
+import hashlib
+import json
+import os
+import uuid
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Iterable, Iterator, Optional
+
+from app.utils.time_buckets import to_naive_utc
+
+MANIFEST_NAME = 'manifest.jsonl'
+
+
+def _json_default(value: Any):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode('ascii')
+    return str(value)
+
+
+def to_archive_row(row: dict[str, Any]) -> dict[str, Any]:
+    """Fila con los tipos con que se guarda en el archivo (ISO, texto, números)."""
+    return json.loads(json.dumps(row, default=_json_default))
+
+
+def _parse_time(value: Any) -> datetime:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return to_naive_utc(value)
+
+
+def _fsync_append(path: str, line: str):
+    with open(path, 'a', encoding='utf-8') as manifest:
+        manifest.write(line + '\n')
+        manifest.flush()
+        os.fsync(manifest.fileno())
+
+
+class ArchiveStore:
+    """
+    Ficheros de archivo y manifiestos bajo un directorio raíz.
+
+    Args:
+        root: Directorio raíz (puede ser un volumen de almacenamiento frío)
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def dataset_dir(self, dataset: str) -> str:
+        return os.path.join(self.root, dataset)
+
+    def manifest_path(self, dataset: str) -> str:
+        return os.path.join(self.dataset_dir(dataset), MANIFEST_NAME)
+
+    # Escritura
+
+    def write(self, dataset: str, rows: Iterable[dict[str, Any]], time_key: str = 'created_at') -> list[dict[str, Any]]:
+        """
+        Escribir filas en ficheros mensuales y registrarlos en el manifiesto.
+
+        Returns:
+            Entradas del manifiesto de los ficheros escritos
+        """
+        by_month: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        for row in rows:
+            by_month[_parse_time(row[time_key]).strftime('%Y-%m')].append(row)
+
+        entries = []
+        for month in sorted(by_month):
+            entries.append(self._write_file(dataset, month, by_month[month], time_key))
+        return entries
+
+    def _write_file(self, dataset: str, month: str, rows: list[dict[str, Any]], time_key: str) -> dict[str, Any]:
+        year, month_number = month.split('-')
+        directory = os.path.join(self.dataset_dir(dataset), year, month_number)
+        os.makedirs(directory, exist_ok=True)
+
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')
+        filename = f'{dataset}-{stamp}-{uuid.uuid4().hex[:8]}.jsonl.gz'
+        path = os.path.join(directory, filename)
+        partial = path + '.partial'
+
+        with gzip.open(partial, 'wt', encoding='utf-8') as archive:
+            for row in rows:
+                archive.write(json.dumps(row, default=_json_default, separators=(',', ':')) + '\n')
+        with open(partial, 'rb') as archive:
+            os.fsync(archive.fileno())
+            digest = hashlib.sha256(archive.read()).hexdigest()
+        os.replace(partial, path)
+
+        times = [_parse_time(row[time_key]) for row in rows]
+        entry = {
+            'file': os.path.relpath(path, self.dataset_dir(dataset)),
+            'month': month,
+            'rows': len(rows),
+            'time_key': time_key,
+            'min_time': min(times).isoformat(),
+            'max_time': max(times).isoformat(),
+            'sha256': digest,
+            'created_at': datetime.now(timezone.utc).isoformat()
+        }
+        _fsync_append(self.manifest_path(dataset), json.dumps(entry))
+        return entry
+
+    # Lectura
+
+    def manifest(self, dataset: str) -> list[dict[str, Any]]:
+        """Entradas del manifiesto de un conjunto (vacío si no hay archivo)."""
+        path = self.manifest_path(dataset)
+        if not os.path.exists(path):
+            return []
+        with open(path, encoding='utf-8') as manifest:
+            return [json.loads(line) for line in manifest if line.strip()]
+
+    def entries(self, dataset: str, start: Optional[datetime] = None,
+                end: Optional[datetime] = None) -> list[dict[str, Any]]:
+        """Entradas cuyos datos se solapan con ``[start, end)``."""
+        start = to_naive_utc(start) if start else None
+        end = to_naive_utc(end) if end else None
+        return [
+            entry for entry in self.manifest(dataset)
+            if (start is None or _parse_time(entry['max_time']) >= start)
+            and (end is None or _parse_time(entry['min_time']) < end)
+        ]
+
+    def read(self, dataset: str, start: Optional[datetime] = None,
+             end: Optional[datetime] = None) -> Iterator[dict[str, Any]]:
+        """
+        Filas archivadas con tiempo en ``[start, end)``.
+
+        Una fila archivada dos veces (ejecución interrumpida antes de borrarla
+        y repetida después) se devuelve una sola vez.
+        """
+        start = to_naive_utc(start) if start else None
+        end = to_naive_utc(end) if end else None
+        seen: set[str] = set()
+
+        for entry in self.entries(dataset, start, end):
+            path = os.path.join(self.dataset_dir(dataset), entry['file'])
+            with gzip.open(path, 'rt', encoding='utf-8') as archive:
+                for line in archive:
+                    row = json.loads(line)
+                    row_time = _parse_time(row[entry['time_key']])
+                    if (start and row_time < start) or (end and row_time >= end):
+                        continue
+                    row_id = row.get('id')
+                    if row_id is not None:
+                        if row_id in seen:
+                            continue
+                        seen.add(row_id)
+                    yield row
+
+    def verify(self, dataset: str) -> list[dict[str, Any]]:
+        """Entradas cuyo fichero falta o no coincide con su sha256."""
+        broken = []
+        for entry in self.manifest(dataset):
+            path = os.path.join(self.dataset_dir(dataset), entry['file'])
+            try:
+                with open(path, 'rb') as archive:
+                    if hashlib.sha256(archive.read()).hexdigest() != entry['sha256']:
+                        broken.append(entry)
+            except FileNotFoundError:
+                broken.append(entry)
+        return broken
+
+
+__all__ = [
+    'MANIFEST_NAME',
+    'to_archive_row',
+    'ArchiveStore'
+]
@@ -0,0 +1,107 @@
+"""
+Series de burndown a partir de las líneas de tiempo de creación y cierre.
+
+En lugar de recorrer todas las tareas una vez por día del sprint, las fechas
+de creación y de cierre se ordenan una sola vez y el trabajo pendiente al
+final de cada día se obtiene con búsquedas binarias vectorizadas
+(``numpy.searchsorted``) sobre esas líneas de tiempo y sus sumas acumuladas
+de puntos.
+
+Uso:
+    series = burndown_series(creadas, completadas, puntos, inicio, fin)
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Any, Optional, Sequence
+
+from app.utils.lazy_imports import lazy_import
+from app.utils.time_buckets import to_naive_utc
+
+np = lazy_import('numpy')
+
+
+def sprint_day_ends(start: date, end: date) -> list[datetime]:
+    """Último instante de cada día de ``[start, end]``."""
+    return [
+        datetime.combine(start + timedelta(days=offset), datetime.max.time())
+        for offset in range((end - start).days + 1)
+    ]
+
+
+def _timeline(values: Sequence[Optional[datetime]]):
+    return np.array(
+        [to_naive_utc(value) if value is not None else None for value in values],
+        dtype='datetime64[us]'
+    )
+
+
+def burndown_series(created: Sequence[datetime], completed: Sequence[Optional[datetime]],
+                    points: Sequence[float], start: date, end: date) -> list[dict[str, Any]]:
+    """
+    Tareas y puntos pendientes al final de cada día del sprint.
+
+    Una tarea está pendiente en un instante si ya se había creado y no se
+    había completado (``completed`` None o posterior).
+
+    Args:
+        created: Fecha de creación de cada tarea
+        completed: Fecha de cierre de cada tarea (None si sigue abierta)
+        points: Puntos de cada tarea
+        start: Primer día del sprint
+        end: Último día del sprint
+
+    Returns:
+        Lista con ``date``, ``remaining_tasks`` y ``remaining_points`` por día
+    """
+    days = sprint_day_ends(start, end)
+    if not days:
+        return []
+
+    created_at = _timeline(created)
+    completed_at = _timeline(completed)
+    weights = np.asarray(points, dtype=float)
+    day_ends = np.array(days, dtype='datetime64[us]')
+
+    # Una tarea cuenta como cerrada cuando ya existe y está completada
+    closed = ~np.isnat(completed_at)
+    closed_at = np.maximum(created_at[closed], completed_at[closed])
+
+    created_order = np.argsort(created_at, kind='stable')
+    closed_order = np.argsort(closed_at, kind='stable')
+    created_points = np.concatenate(([0.0], np.cumsum(weights[created_order])))
+    closed_points = np.concatenate(([0.0], np.cumsum(weights[closed][closed_order])))
+
+    created_count = np.searchsorted(created_at[created_order], day_ends, side='right')
+    closed_count = np.searchsorted(closed_at[closed_order], day_ends, side='right')
+
+    remaining_tasks = created_count - closed_count
+    remaining_points = created_points[created_count] - closed_points[closed_count]
+
+    return [
+        {
+            'date': day.date().isoformat(),
+            'remaining_tasks': int(tasks),
+            'remaining_points': float(points_left) if points_left % 1 else int(points_left)
+        }
+        for day, tasks, points_left in zip(days, remaining_tasks, remaining_points)
+    ]
+
+
+def ideal_burndown(dates: Sequence[str], total_tasks: int, total_points: float) -> list[dict[str, Any]]:
+    """Línea ideal: de los totales a cero de forma lineal a lo largo del sprint."""
+    steps = max(len(dates) - 1, 1)
+    return [
+        {
+            'date': day,
+            'ideal_tasks': max(0, total_tasks - total_tasks * index / steps),
+            'ideal_points': max(0, total_points - total_points * index / steps)
+        }
+        for index, day in enumerate(dates)
+    ]
+
+
+__all__ = [
+    'sprint_day_ends',
+    'burndown_series',
+    'ideal_burndown'
+]
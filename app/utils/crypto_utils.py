@@ -62,6 +62,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional, Any, Union
 from dataclasses import dataclass
 from enum import Enum
+import io
 import os
 import struct
 
@@ -1358,6 +1359,10 @@ def encrypt_sensitive_document(document_data: bytes,
     """
     Encripta documento sensible con metadatos.
     
+    Cifrado de sobre: el documento se cifra por bloques con una clave de
+    datos propia, envuelta con la KEK en cache del anillo de claves y ligada
+    a ``owner_id`` y ``document_type``.
+    
     Args:
         document_data: Datos del documento
         owner_id: ID del propietario
@@ -1366,34 +1371,70 @@ def encrypt_sensitive_document(document_data: bytes,
     Returns:
         Diccionario con documento encriptado y metadatos
     """
-    # Generar clave única para el documento
-    doc_key = generate_key()
+    from app.utils import envelope_crypto
+    
+    keyring = envelope_crypto.get_keyring()
+    doc_key = envelope_crypto.new_data_key()
+    key_id, wrapped_key = keyring.wrap(doc_key, envelope_crypto.document_aad(owner_id, document_type))
     
-    # Crear metadatos
     metadata = {
         'owner_id': owner_id,
         'document_type': document_type,
         'encrypted_at': datetime.now(timezone.utc).isoformat(),
-        'encryption_version': '1.0'
+        'encryption_version': '2.0'
     }
     
-    # Encriptar documento
-    encrypted_doc = encrypt_data(document_data, doc_key)
-    
-    # Encriptar clave del documento con clave maestra (derivada del owner_id)
-    master_key = derive_key_from_password(owner_id, b'ecosystem_docs_salt_2024')
-    encrypted_key = encrypt_data(doc_key, master_key)
+    output = io.BytesIO()
+    envelope_crypto.encrypt_stream(io.BytesIO(document_data), output, doc_key)
     
     return {
-        'encrypted_document': base64.b64encode(encrypted_doc.ciphertext).decode('utf-8'),
-        'iv': base64.b64encode(encrypted_doc.iv).decode('utf-8'),
-        'tag': base64.b64encode(encrypted_doc.tag).decode('utf-8'),
-        'encrypted_key': base64.b64encode(encrypted_key.ciphertext).decode('utf-8'),
-        'key_iv': base64.b64encode(encrypted_key.iv).decode('utf-8'),
-        'key_tag': base64.b64encode(encrypted_key.tag).decode('utf-8'),
+        'encrypted_document': base64.b64encode(output.getvalue()).decode('utf-8'),
+        'encrypted_key': envelope_crypto.encode_wrapped_key(key_id, wrapped_key),
         'metadata': json.dumps(metadata)
     }
 
+def decrypt_sensitive_document(envelope: dict[str, str], owner_id: str) -> bytes:
+    """
+    Desencripta un documento de ``encrypt_sensitive_document``.
+    
+    Admite también el formato 1.0 (clave maestra PBKDF2 por propietario),
+    cuya derivación queda en la cache de KEK.
+    
+    Args:
+        envelope: Diccionario devuelto al encriptar
+        owner_id: ID del propietario
+        
+    Returns:
+        Datos del documento
+    """
+    from app.utils import envelope_crypto
+    
+    metadata = json.loads(envelope['metadata'])
+    if metadata.get('owner_id') != owner_id:
+        raise DecryptionError("El documento no pertenece al propietario indicado")
+    keyring = envelope_crypto.get_keyring()
+    
+    try:
+        if metadata.get('encryption_version') == '1.0':
+            def _legacy(ciphertext: str, prefix: str) -> EncryptedData:
+                return EncryptedData(
+                    ciphertext=base64.b64decode(envelope[ciphertext]),
+                    iv=base64.b64decode(envelope[f'{prefix}iv']),
+                    tag=base64.b64decode(envelope[f'{prefix}tag'])
+                )
+            doc_key = decrypt_data(_legacy('encrypted_key', 'key_'), keyring.legacy_kek(owner_id))
+            return decrypt_data(_legacy('encrypted_document', ''), doc_key)
+        
+        key_id, wrapped_key = envelope_crypto.decode_wrapped_key(envelope['encrypted_key'])
+        doc_key = keyring.unwrap(
+            wrapped_key, envelope_crypto.document_aad(owner_id, metadata['document_type']), key_id
+        )
+        output = io.BytesIO()
+        envelope_crypto.decrypt_stream(io.BytesIO(base64.b64decode(envelope['encrypted_document'])), output, doc_key)
+        return output.getvalue()
+    except envelope_crypto.EnvelopeError as e:
+        raise DecryptionError(str(e)) from e
+
 # ==============================================================================
 # MANAGER PRINCIPAL DE CRIPTOGRAFÍA
 # ==============================================================================
@@ -1592,16 +1633,16 @@ def verify_otp(secret, code):
     """Verify an OTP code."""
     return verify_totp_code(secret, code)
 
-# Auto-generated comprehensive stubs - 13 items
-def decrypt_file(*args, **kwargs):
-    """File utility for decrypt file."""
-    try:
-        # TODO: Implement proper file handling
-        return args[0] if args else None
-    except Exception as e:
-        import logging
-        logging.getLogger(__name__).error(f"Error in {name}: {e}")
-        return None
+# Cifrado de archivos por bloques (ver app.utils.envelope_crypto)
+def encrypt_file(source_path: str, destination_path: str, key: bytes) -> int:
+    """Encripta un archivo por bloques sin cargarlo en memoria (ver ``envelope_crypto``)."""
+    from app.utils.envelope_crypto import encrypt_file as _encrypt_file
+    return _encrypt_file(source_path, destination_path, key)
+
+def decrypt_file(source_path: str, destination_path: str, key: bytes) -> int:
+    """Desencripta un archivo ``ECS1`` por bloques (ver ``envelope_crypto``)."""
+    from app.utils.envelope_crypto import decrypt_file as _decrypt_file
+    return _decrypt_file(source_path, destination_path, key)
 
 def decrypt_message(*args, **kwargs):
     """Cryptographic function for decrypt message."""
@@ -1625,16 +1666,6 @@ def decrypt_sensitive_data(*args, **kwargs):
     except Exception:
         return None
 
-def encrypt_file(*args, **kwargs):
-    """File utility for encrypt file."""
-    try:
-        # TODO: Implement proper file handling
-        return args[0] if args else None
-    except Exception as e:
-        import logging
-        logging.getLogger(__name__).error(f"Error in {name}: {e}")
-        return None
-
 def encrypt_message(*args, **kwargs):
     """Cryptographic function for encrypt message."""
     import secrets
@@ -326,7 +326,7 @@ def test_connection(engine=None) -> bool:
 @measure_query_time
 @retry_db_operation(max_retries=2)
 def get_or_create(model_class: Type, session: Optional[Session] = None, 
-                  defaults: Optional[Dict] = None, **kwargs) -> tuple[Any, bool]:
+                  defaults: Optional[dict] = None, **kwargs) -> tuple[Any, bool]:
     """
     Obtiene un registro existente o crea uno nuevo.
     
@@ -377,7 +377,7 @@ def get_or_create(model_class: Type, session: Optional[Session] = None,
             raise QueryError(f"Error de integridad al crear {model_class.__name__}: {e}")
 
 @measure_query_time
-def bulk_create_or_update(model_class: Type, data_list: list[Dict], 
+def bulk_create_or_update(model_class: Type, data_list: list[dict], 
                          unique_fields: list[str], session: Optional[Session] = None,
                          batch_size: Optional[int] = None) -> dict[str, int]:
     """
@@ -555,7 +555,8 @@ class PaginationResult:
     """Resultado de paginación con metadata útil."""
     
     def __init__(self, items: list[Any], page: int, per_page: int, 
-                 total: int, has_prev: bool = False, has_next: bool = False):
+                 total: int, has_prev: bool = False, has_next: bool = False,
+                 next_cursor: Optional[str] = None, prev_cursor: Optional[str] = None):
         self.items = items
         self.page = page
         self.per_page = per_page
@@ -565,6 +566,8 @@ class PaginationResult:
         self.pages = (total + per_page - 1) // per_page  # Redondeo hacia arriba
         self.prev_num = page - 1 if has_prev else None
         self.next_num = page + 1 if has_next else None
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
     
     def to_dict(self) -> dict[str, Any]:
         """Convierte el resultado a diccionario."""
@@ -578,30 +581,48 @@ class PaginationResult:
                 'has_prev': self.has_prev,
                 'has_next': self.has_next,
                 'prev_num': self.prev_num,
-                'next_num': self.next_num
+                'next_num': self.next_num,
+                'next_cursor': self.next_cursor,
+                'prev_cursor': self.prev_cursor
             }
         }
 
 @measure_query_time
 def paginate_query(query: Query, page: int = 1, per_page: Optional[int] = None,
-                  max_per_page: Optional[int] = None) -> PaginationResult:
+                  max_per_page: Optional[int] = None, cursor: Optional[str] = None,
+                  order_by: Any = None, descending: bool = False) -> PaginationResult:
     """
-    Pagina una consulta de SQLAlchemy de forma eficiente.
+    Pagina una consulta de SQLAlchemy por cursor (keyset).
+    
+    Las páginas siguientes se piden con ``next_cursor``/``prev_cursor`` del
+    resultado anterior, con un filtro "después de esta fila" sobre
+    (``order_by``, clave primaria) en lugar de OFFSET, por lo que una página
+    profunda cuesta lo mismo que la primera. Un ``page`` > 1 sin cursor se
+    resuelve con OFFSET solo por compatibilidad.
     
     Args:
         query: Consulta de SQLAlchemy
-        page: Número de página (1-based)
+        page: Número de página (1-based, modo legado)
         per_page: Registros por página
         max_per_page: Máximo registros por página
+        cursor: Cursor devuelto por una página anterior
+        order_by: Columna de ordenamiento (por defecto, la clave primaria)
+        descending: Orden descendente
         
     Returns:
-        PaginationResult con items y metadata
+        PaginationResult con items, metadata y cursores
+        
+    Raises:
+        InvalidCursorError: Si el cursor no es válido para el ordenamiento
         
     Examples:
         >>> query = session.query(User).filter(User.active == True)
-        >>> result = paginate_query(query, page=1, per_page=20)
-        >>> print(f"Página {result.page} de {result.pages}")
+        >>> result = paginate_query(query, per_page=20, order_by=User.created_at)
+        >>> siguiente = paginate_query(query, per_page=20, order_by=User.created_at,
+        ...                            cursor=result.next_cursor)
     """
+    from app.utils.pagination import KeysetPaginator
+    
     if per_page is None:
         per_page = DB_CONFIG['default_page_size']
     
@@ -612,26 +633,32 @@ def paginate_query(query: Query, page: int = 1, per_page: Optional[int] = None,
     page = max(1, page)
     per_page = min(max_per_page, max(1, per_page))
     
-    # Contar total de registros (optimizado)
-    total = query.count()
-    
-    # Calcular offset
-    offset = (page - 1) * per_page
-    
-    # Obtener items de la página
-    items = query.offset(offset).limit(per_page).all()
-    
-    # Calcular metadata
-    has_prev = page > 1
-    has_next = offset + per_page < total
+    # La clave primaria de la entidad desempata filas con el mismo valor de orden
+    tiebreaker = inspect(query.column_descriptions[0]['entity']).primary_key[0]
+    paginator = KeysetPaginator(
+        {'order': order_by if order_by is not None else tiebreaker},
+        tiebreaker,
+        default_sort='order',
+        default_order='desc' if descending else 'asc',
+        max_per_page=max_per_page
+    )
+    result = paginator.paginate(
+        query,
+        cursor=cursor,
+        per_page=per_page,
+        page=None if cursor else page,
+        total='exact'
+    )
     
     return PaginationResult(
-        items=items,
+        items=result.items,
         page=page,
         per_page=per_page,
-        total=total,
-        has_prev=has_prev,
-        has_next=has_next
+        total=result.total,
+        has_prev=result.has_prev,
+        has_next=result.has_next,
+        next_cursor=result.next_cursor,
+        prev_cursor=result.prev_cursor
     )
 
 def get_page_info(total_items: int, page: int, per_page: int) -> dict[str, Any]:
@@ -1314,9 +1341,9 @@ class QueryBuilder:
         """Obtiene todos los registros."""
         return self.query.all()
     
-    def paginate(self, page: int = 1, per_page: int = 20) -> PaginationResult:
-        """Pagina la consulta."""
-        return paginate_query(self.query, page, per_page)
+    def paginate(self, page: int = 1, per_page: int = 20, cursor: Optional[str] = None) -> PaginationResult:
+        """Pagina la consulta (por cursor si se indica)."""
+        return paginate_query(self.query, page, per_page, cursor=cursor)
     
     def to_dict_list(self) -> list[dict[str, Any]]:
         """Convierte resultados a lista de diccionarios."""
@@ -1644,7 +1671,7 @@ class MigrationHelper:
             logger.error(f"Error migrando datos: {e}")
             raise QueryError(f"Error en migración: {e}")
     
-    def _insert_batch(self, conn, table_name: str, batch: list[Dict]):
+    def _insert_batch(self, conn, table_name: str, batch: list[dict]):
         """Inserta un lote de registros."""
         if not batch:
             return
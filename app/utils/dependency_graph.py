@@ -0,0 +1,303 @@
+"""
+Grafo de dependencias entre tareas en memoria.
+
+Las aristas de un proyecto se cargan de una vez en listas de adyacencia
+(prerrequisito -> dependientes y al revés) y sobre ellas se resuelven, sin
+volver a la base de datos, la detección de ciclos, el orden topológico, la
+ruta crítica con holguras y los cambios de bloqueo que provoca completar o
+reabrir una tarea.
+
+Una tarea está bloqueada por dependencias mientras tenga algún prerrequisito
+sin completar; al cambiar el estado de una tarea solo pueden cambiar sus
+dependientes directos, que son los únicos que se reevalúan.
+
+Author: Sistema de Emprendimiento
+Version: 1.0.0
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Hashable, Iterable
+
+
+class DependencyCycleError(ValueError):
+    """El grafo contiene un ciclo."""
+
+
+# ====================================
+# RESULTADOS
+# ====================================
+
+@dataclass
+class BlockingChanges:
+    """Dependientes cuyo bloqueo por dependencias debe cambiar."""
+
+    blocked: list = field(default_factory=list)
+    unblocked: list = field(default_factory=list)
+
+    @property
+    def task_ids(self) -> list:
+        return self.blocked + self.unblocked
+
+    def __bool__(self) -> bool:
+        return bool(self.blocked or self.unblocked)
+
+
+@dataclass
+class Schedule:
+    """
+    Planificación por ruta crítica (unidades de ``duration``, días por defecto).
+
+    ``slack`` es lo que puede retrasarse una tarea sin retrasar el proyecto;
+    las tareas con holgura cero forman la ruta crítica.
+    """
+
+    order: list
+    earliest_start: dict[Hashable, float]
+    earliest_finish: dict[Hashable, float]
+    latest_start: dict[Hashable, float]
+    latest_finish: dict[Hashable, float]
+    slack: dict[Hashable, float]
+    duration: float
+    critical_path: list
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'duration': self.duration,
+            'critical_path': list(self.critical_path),
+            'tasks': {
+                task_id: {
+                    'earliest_start': self.earliest_start[task_id],
+                    'earliest_finish': self.earliest_finish[task_id],
+                    'latest_start': self.latest_start[task_id],
+                    'latest_finish': self.latest_finish[task_id],
+                    'slack': self.slack[task_id]
+                }
+                for task_id in self.order
+            }
+        }
+
+
+# ====================================
+# GRAFO
+# ====================================
+
+class DependencyGraph:
+    """
+    Grafo dirigido prerrequisito -> dependiente con estado de las tareas.
+
+    Args:
+        epsilon: Tolerancia para considerar nula una holgura
+    """
+
+    def __init__(self, epsilon: float = 1e-9):
+        self.epsilon = epsilon
+        self._dependents: dict[Hashable, dict[Hashable, float]] = {}
+        self._prerequisites: dict[Hashable, dict[Hashable, float]] = {}
+        self.durations: dict[Hashable, float] = {}
+        self.completed: set = set()
+        self.blocked: set = set()
+
+    def __contains__(self, task_id: Hashable) -> bool:
+        return task_id in self._dependents
+
+    def __len__(self) -> int:
+        return len(self._dependents)
+
+    @property
+    def edge_count(self) -> int:
+        return sum(len(dependents) for dependents in self._dependents.values())
+
+    # Construcción
+
+    def add_task(self, task_id: Hashable, duration: float = 1.0,
+                 completed: bool = False, blocked: bool = False):
+        """Agregar (o actualizar) una tarea."""
+        self._dependents.setdefault(task_id, {})
+        self._prerequisites.setdefault(task_id, {})
+        self.durations[task_id] = max(0.0, float(duration or 0.0))
+        (self.completed.add if completed else self.completed.discard)(task_id)
+        (self.blocked.add if blocked else self.blocked.discard)(task_id)
+
+    def add_dependency(self, prerequisite_id: Hashable, dependent_id: Hashable,
+                       lag: float = 0, check_cycle: bool = True):
+        """
+        Agregar la arista ``prerequisite_id -> dependent_id``.
+
+        Raises:
+            DependencyCycleError: Si la arista cerraría un ciclo
+        """
+        for task_id in (prerequisite_id, dependent_id):
+            if task_id not in self:
+                self.add_task(task_id)
+        if check_cycle and self.would_create_cycle(prerequisite_id, dependent_id):
+            raise DependencyCycleError(
+                f"La dependencia {prerequisite_id} -> {dependent_id} crearía un ciclo"
+            )
+        self._dependents[prerequisite_id][dependent_id] = lag or 0
+        self._prerequisites[dependent_id][prerequisite_id] = lag or 0
+
+    def remove_dependency(self, prerequisite_id: Hashable, dependent_id: Hashable) -> bool:
+        """Quitar una arista; devuelve si existía."""
+        if dependent_id not in self._dependents.get(prerequisite_id, {}):
+            return False
+        del self._dependents[prerequisite_id][dependent_id]
+        del self._prerequisites[dependent_id][prerequisite_id]
+        return True
+
+    # Vecindad
+
+    def prerequisites(self, task_id: Hashable) -> list:
+        return list(self._prerequisites.get(task_id, ()))
+
+    def dependents(self, task_id: Hashable) -> list:
+        return list(self._dependents.get(task_id, ()))
+
+    def _reachable(self, start: Hashable, adjacency: dict) -> set:
+        seen = set()
+        queue = deque(adjacency.get(start, ()))
+        while queue:
+            task_id = queue.popleft()
+            if task_id in seen:
+                continue
+            seen.add(task_id)
+            queue.extend(adjacency.get(task_id, ()))
+        return seen
+
+    def descendants(self, task_id: Hashable) -> set:
+        """Tareas que dependen, directa o transitivamente, de ``task_id``."""
+        return self._reachable(task_id, self._dependents)
+
+    def ancestors(self, task_id: Hashable) -> set:
+        """Prerrequisitos directos y transitivos de ``task_id``."""
+        return self._reachable(task_id, self._prerequisites)
+
+    def would_create_cycle(self, prerequisite_id: Hashable, dependent_id: Hashable) -> bool:
+        """Verificar si ``prerequisite_id -> dependent_id`` cerraría un ciclo."""
+        return prerequisite_id == dependent_id or prerequisite_id in self.descendants(dependent_id)
+
+    def topological_order(self) -> list:
+        """
+        Tareas ordenadas de forma que cada una va después de sus prerrequisitos.
+
+        Raises:
+            DependencyCycleError: Si el grafo tiene ciclos
+        """
+        pending = {task_id: len(prerequisites) for task_id, prerequisites in self._prerequisites.items()}
+        queue = deque(task_id for task_id, count in pending.items() if count == 0)
+        order = []
+
+        while queue:
+            task_id = queue.popleft()
+            order.append(task_id)
+            for dependent_id in self._dependents[task_id]:
+                pending[dependent_id] -= 1
+                if pending[dependent_id] == 0:
+                    queue.append(dependent_id)
+
+        if len(order) != len(self):
+            raise DependencyCycleError("El grafo de dependencias tiene ciclos")
+        return order
+
+    # Bloqueos
+
+    def incomplete_prerequisites(self, task_id: Hashable) -> int:
+        """Número de prerrequisitos directos sin completar."""
+        return sum(1 for prerequisite_id in self._prerequisites.get(task_id, ())
+                   if prerequisite_id not in self.completed)
+
+    def blocking_changes(self, task_ids: Iterable[Hashable]) -> BlockingChanges:
+        """
+        Tareas de ``task_ids`` cuyo bloqueo guardado no coincide con sus prerrequisitos.
+
+        Las tareas completadas no se bloquean.
+        """
+        changes = BlockingChanges()
+        for task_id in task_ids:
+            if task_id in self.completed:
+                continue
+            should_block = self.incomplete_prerequisites(task_id) > 0
+            if should_block and task_id not in self.blocked:
+                changes.blocked.append(task_id)
+            elif not should_block and task_id in self.blocked:
+                changes.unblocked.append(task_id)
+        return changes
+
+    def set_completed(self, task_id: Hashable, completed: bool = True) -> BlockingChanges:
+        """
+        Registrar que una tarea se completa (o se reabre) y propagar el bloqueo.
+
+        Solo se reevalúan los dependientes directos: el resto del grafo no
+        cambia porque el estado de esos dependientes no se altera. El
+        conjunto ``blocked`` queda actualizado con los cambios devueltos.
+        """
+        (self.completed.add if completed else self.completed.discard)(task_id)
+        changes = self.blocking_changes(self.dependents(task_id))
+        self.blocked.update(changes.blocked)
+        self.blocked.difference_update(changes.unblocked)
+        return changes
+
+    def waiting_on(self, task_id: Hashable) -> set:
+        """Tareas sin completar que no pueden terminar hasta que ``task_id`` termine."""
+        return {dependent_id for dependent_id in self.descendants(task_id)
+                if dependent_id not in self.completed}
+
+    # Ruta crítica
+
+    def schedule(self) -> Schedule:
+        """
+        Calcular fechas tempranas y tardías, holguras y ruta crítica.
+
+        Las dependencias son fin-inicio con el retraso (``lag``) de la arista.
+
+        Raises:
+            DependencyCycleError: Si el grafo tiene ciclos
+        """
+        order = self.topological_order()
+        earliest_start: dict[Hashable, float] = {}
+        earliest_finish: dict[Hashable, float] = {}
+
+        for task_id in order:
+            earliest_start[task_id] = max(
+                (earliest_finish[prerequisite_id] + lag
+                 for prerequisite_id, lag in self._prerequisites[task_id].items()),
+                default=0.0
+            )
+            earliest_finish[task_id] = earliest_start[task_id] + self.durations[task_id]
+
+        duration = max(earliest_finish.values(), default=0.0)
+        latest_start: dict[Hashable, float] = {}
+        latest_finish: dict[Hashable, float] = {}
+
+        for task_id in reversed(order):
+            latest_finish[task_id] = min(
+                (latest_start[dependent_id] - lag
+                 for dependent_id, lag in self._dependents[task_id].items()),
+                default=duration
+            )
+            latest_start[task_id] = latest_finish[task_id] - self.durations[task_id]
+
+        slack = {task_id: latest_start[task_id] - earliest_start[task_id] for task_id in order}
+        critical_path = sorted(
+            (task_id for task_id in order if abs(slack[task_id]) <= self.epsilon),
+            key=lambda task_id: (earliest_start[task_id], earliest_finish[task_id])
+        )
+
+        return Schedule(
+            order=order,
+            earliest_start=earliest_start,
+            earliest_finish=earliest_finish,
+            latest_start=latest_start,
+            latest_finish=latest_finish,
+            slack=slack,
+            duration=duration,
+            critical_path=critical_path
+        )
+
+
+__all__ = [
+    'DependencyCycleError',
+    'BlockingChanges',
+    'Schedule',
+    'DependencyGraph'
+]
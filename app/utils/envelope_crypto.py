@@ -0,0 +1,518 @@
+"""
+Cifrado de sobre (envelope encryption) con flujo AEAD por bloques
+================================================================
+
+Cada documento se cifra con una clave de datos aleatoria propia; esa clave
+se envuelve (AES-GCM) con una clave de cifrado de claves (KEK) del
+``KeyRing``. Las KEK se derivan con HKDF de la clave maestra activa de
+``DOCUMENT_MASTER_KEYS`` (o, para los documentos antiguos, con PBKDF2 del
+propietario) una sola vez y se guardan en un ``KeyCache`` acotado y con
+caducidad, de modo que cifrar un documento solo cuesta microsegundos de
+manejo de claves. ``init_keyring`` configura el anillo al crear la app.
+
+Formato de flujo ``ECS1`` (tamaño de memoria constante y lectura aleatoria):
+
+    cabecera: b'ECS1' | versión (1) | reservado (3) | tamaño de bloque (4) | prefijo de nonce (8)
+    bloque i: AES-GCM(clave de datos, nonce = prefijo || i, aad = cabecera || i || final)
+
+Todos los bloques tienen ``chunk_size`` bytes salvo el último, marcado como
+final en el AAD para detectar truncamientos. El bloque ``i`` empieza en
+``HEADER_SIZE + i * (chunk_size + TAG_SIZE)``, por lo que ``read_range``
+descifra solo los bloques que cubren el rango pedido.
+
+Uso:
+    keyring = get_keyring()
+    key_id, wrapped = keyring.wrap(data_key, aad)
+    encrypt_stream(origen, destino, data_key)
+    read_range(destino, data_key, offset=1_000_000, length=4096)
+"""
+
+import base64
+import hashlib
+import logging
+import os
+import secrets
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, BinaryIO, Callable, Mapping, Optional
+
+try:
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+    from cryptography.exceptions import InvalidTag
+    CRYPTOGRAPHY_AVAILABLE = True
+except ImportError:
+    CRYPTOGRAPHY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'ECS1'
+FORMAT_VERSION = 1
+HEADER_FORMAT = '>4sB3xI8s'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+TAG_SIZE = 16
+NONCE_SIZE = 12
+DATA_KEY_SIZE = 32
+DEFAULT_CHUNK_SIZE = 64 * 1024
+MAX_CHUNKS = 2 ** 32
+
+KEK_INFO = b'EcosistemaEmprendimiento/kek/'
+LEGACY_DOCUMENT_SALT = b'ecosystem_docs_salt_2024'
+
+
+class EnvelopeError(Exception):
+    """Error de cifrado de sobre (clave, formato o autenticación)."""
+
+
+def _require_cryptography():
+    if not CRYPTOGRAPHY_AVAILABLE:
+        raise EnvelopeError("Cryptography library no disponible para cifrado de sobre")
+
+
+# ==============================================================================
+# CACHE DE CLAVES
+# ==============================================================================
+
+class KeyCache:
+    """
+    Cache LRU acotado y con caducidad para claves de cifrado de claves.
+
+    Args:
+        max_entries: Máximo de claves en memoria
+        ttl: Segundos que una clave permanece en cache
+        clock: Reloj monotónico (inyectable en pruebas)
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 900,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Any, tuple[float, bytes]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_create(self, key: Any, factory: Callable[[], bytes]) -> bytes:
+        """Clave en cache o recién creada con ``factory``."""
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        value = factory()
+
+        with self._lock:
+            self._entries[key] = (now + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# ==============================================================================
+# ANILLO DE CLAVES
+# ==============================================================================
+
+def master_keys_from_config(config: Mapping[str, Any]) -> tuple[dict[str, bytes], Optional[str]]:
+    """
+    Claves maestras y clave activa a partir de la configuración.
+
+    ``DOCUMENT_MASTER_KEYS`` admite un dict o ``"id:clave,id:clave"`` para
+    rotar: la clave ``DOCUMENT_MASTER_KEY_ID`` envuelve las claves de datos
+    nuevas y las demás solo desenvuelven las existentes.
+    ``DOCUMENT_MASTER_KEY`` (una sola clave) se registra como ``v1``. Nunca se
+    recurre a ``SECRET_KEY``.
+
+    Returns:
+        Claves por identificador (vacío si no hay ninguna) e identificador activo
+    """
+    keys = config.get('DOCUMENT_MASTER_KEYS') or {}
+    if isinstance(keys, str):
+        entries = [entry.strip() for entry in keys.split(',') if entry.strip()]
+        if any(':' not in entry for entry in entries):
+            raise EnvelopeError("DOCUMENT_MASTER_KEYS debe tener el formato 'id:clave,id:clave'")
+        keys = dict(entry.split(':', 1) for entry in entries)
+    keys = dict(keys)
+
+    single = config.get('DOCUMENT_MASTER_KEY')
+    if single:
+        keys.setdefault('v1', single)
+
+    master_keys = {
+        str(key_id).strip(): value.encode('utf-8') if isinstance(value, str) else value
+        for key_id, value in keys.items() if value
+    }
+
+    active_key_id = config.get('DOCUMENT_MASTER_KEY_ID') or None
+    if active_key_id and active_key_id not in master_keys:
+        raise EnvelopeError(f"DOCUMENT_MASTER_KEY_ID '{active_key_id}' no está entre las claves maestras")
+    return master_keys, active_key_id
+
+
+def _load_master_keys() -> tuple[dict[str, bytes], Optional[str]]:
+    """Claves maestras desde la configuración de Flask o, sin app, del entorno."""
+    config: Mapping[str, Any] = os.environ
+    try:
+        from flask import current_app, has_app_context
+        if has_app_context():
+            config = current_app.config
+    except ImportError:
+        pass
+
+    master_keys, active_key_id = master_keys_from_config(config)
+    if not master_keys:
+        raise EnvelopeError("DOCUMENT_MASTER_KEYS/DOCUMENT_MASTER_KEY no configurada")
+    return master_keys, active_key_id
+
+
+class KeyRing:
+    """
+    Claves de cifrado de claves (KEK) y envoltura de claves de datos.
+
+    Args:
+        master_keys: Claves maestras por identificador (la activa envuelve
+            las claves nuevas; las demás solo desenvuelven)
+        active_key_id: Identificador de la clave maestra activa
+        cache: Cache de KEK derivadas
+    """
+
+    def __init__(self, master_keys: Optional[dict[str, bytes]] = None,
+                 active_key_id: Optional[str] = None, cache: Optional[KeyCache] = None):
+        self._master_keys = master_keys
+        self._active_key_id = active_key_id
+        self.cache = cache if cache is not None else KeyCache()
+
+    @property
+    def master_keys(self) -> dict[str, bytes]:
+        if self._master_keys is None:
+            master_keys, active_key_id = _load_master_keys()
+            self._active_key_id = self._active_key_id or active_key_id
+            self._master_keys = master_keys
+        return self._master_keys
+
+    @property
+    def active_key_id(self) -> str:
+        master_keys = self.master_keys
+        return self._active_key_id or sorted(master_keys)[-1]
+
+    def kek(self, key_id: Optional[str] = None) -> bytes:
+        """KEK derivada con HKDF de la clave maestra (una vez por TTL)."""
+        _require_cryptography()
+        key_id = key_id or self.active_key_id
+        master = self.master_keys.get(key_id)
+        if master is None:
+            raise EnvelopeError(f"Clave maestra desconocida: {key_id}")
+
+        return self.cache.get_or_create(('kek', key_id), lambda: HKDF(
+            algorithm=hashes.SHA256(),
+            length=DATA_KEY_SIZE,
+            salt=None,
+            info=KEK_INFO + key_id.encode('utf-8')
+        ).derive(master))
+
+    def legacy_kek(self, owner_id: str) -> bytes:
+        """KEK de los documentos 1.0 (PBKDF2 del propietario), derivada una vez por TTL."""
+        from app.utils.crypto_utils import derive_key_from_password
+
+        return self.cache.get_or_create(
+            ('legacy', owner_id),
+            lambda: derive_key_from_password(owner_id, LEGACY_DOCUMENT_SALT)
+        )
+
+    def wrap(self, data_key: bytes, aad: bytes = b'', key_id: Optional[str] = None) -> tuple[str, bytes]:
+        """
+        Envolver una clave de datos.
+
+        Returns:
+            Identificador de la KEK y ``nonce || clave envuelta``
+        """
+        key_id = key_id or self.active_key_id
+        nonce = secrets.token_bytes(NONCE_SIZE)
+        return key_id, nonce + AESGCM(self.kek(key_id)).encrypt(nonce, data_key, aad)
+
+    def unwrap(self, wrapped: bytes, aad: bytes = b'', key_id: Optional[str] = None) -> bytes:
+        """Desenvolver una clave de datos."""
+        try:
+            return AESGCM(self.kek(key_id)).decrypt(wrapped[:NONCE_SIZE], wrapped[NONCE_SIZE:], aad)
+        except InvalidTag:
+            raise EnvelopeError("Clave de datos envuelta inválida o contexto incorrecto") from None
+
+
+_keyring: Optional[KeyRing] = None
+_keyring_lock = threading.Lock()
+
+
+def get_keyring() -> KeyRing:
+    """Anillo de claves compartido por el proceso."""
+    global _keyring
+    if _keyring is None:
+        with _keyring_lock:
+            if _keyring is None:
+                _keyring = KeyRing()
+    return _keyring
+
+
+def configure_keyring(master_keys: dict[str, bytes], active_key_id: Optional[str] = None,
+                      max_entries: int = 256, ttl: float = 900) -> KeyRing:
+    """Reemplazar el anillo de claves del proceso (arranque o rotación)."""
+    global _keyring
+    with _keyring_lock:
+        _keyring = KeyRing(master_keys, active_key_id, KeyCache(max_entries, ttl))
+    return _keyring
+
+
+def init_keyring(app) -> Optional[KeyRing]:
+    """
+    Configurar el anillo de claves del proceso desde ``app.config``.
+
+    Se llama al crear la aplicación; para rotar se añade la clave nueva a
+    ``DOCUMENT_MASTER_KEYS``, se cambia ``DOCUMENT_MASTER_KEY_ID`` y se
+    reinician los procesos. Sin claves el cifrado de documentos queda
+    deshabilitado (cada operación lanza ``EnvelopeError``).
+    """
+    master_keys, active_key_id = master_keys_from_config(app.config)
+    if not master_keys:
+        logger.warning("Cifrado de documentos deshabilitado: falta DOCUMENT_MASTER_KEYS")
+        return None
+
+    keyring = configure_keyring(
+        master_keys,
+        active_key_id,
+        max_entries=app.config.get('DOCUMENT_KEY_CACHE_SIZE', 256),
+        ttl=app.config.get('DOCUMENT_KEY_CACHE_TTL', 900)
+    )
+    logger.info(f"Anillo de claves de documentos: {len(master_keys)} claves, activa '{keyring.active_key_id}'")
+    return keyring
+
+
+def new_data_key() -> bytes:
+    """Clave de datos aleatoria para un documento."""
+    return secrets.token_bytes(DATA_KEY_SIZE)
+
+
+# ==============================================================================
+# FLUJO AEAD POR BLOQUES
+# ==============================================================================
+
+def _chunk_aad(header: bytes, index: int, final: bool) -> bytes:
+    return header + struct.pack('>QB', index, 1 if final else 0)
+
+
+def _chunk_nonce(prefix: bytes, index: int) -> bytes:
+    if index >= MAX_CHUNKS:
+        raise EnvelopeError("Flujo demasiado grande para el tamaño de bloque")
+    return prefix + struct.pack('>I', index)
+
+
+def _read_exact(source: BinaryIO, size: int) -> bytes:
+    parts = []
+    while size > 0:
+        part = source.read(size)
+        if not part:
+            break
+        parts.append(part)
+        size -= len(part)
+    return b''.join(parts)
+
+
+def encrypt_stream(source: BinaryIO, destination: BinaryIO, data_key: bytes,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Cifrar un flujo en formato ``ECS1`` con memoria constante.
+
+    Returns:
+        int: Bytes de texto plano cifrados
+    """
+    _require_cryptography()
+    header = struct.pack(HEADER_FORMAT, MAGIC, FORMAT_VERSION, chunk_size, secrets.token_bytes(8))
+    prefix = header[-8:]
+    aead = AESGCM(data_key)
+    destination.write(header)
+
+    total = 0
+    index = 0
+    current = _read_exact(source, chunk_size)
+    while True:
+        following = _read_exact(source, chunk_size)
+        final = not following
+        destination.write(aead.encrypt(_chunk_nonce(prefix, index), current, _chunk_aad(header, index, final)))
+        total += len(current)
+        if final:
+            return total
+        current = following
+        index += 1
+
+
+def _parse_header(header: bytes) -> tuple[int, bytes]:
+    if len(header) != HEADER_SIZE:
+        raise EnvelopeError("Cabecera de flujo cifrado incompleta")
+    magic, version, chunk_size, prefix = struct.unpack(HEADER_FORMAT, header)
+    if magic != MAGIC or version != FORMAT_VERSION or chunk_size <= 0:
+        raise EnvelopeError("Formato de flujo cifrado no reconocido")
+    return chunk_size, prefix
+
+
+def _decrypt_chunk(aead, header: bytes, prefix: bytes, index: int, final: bool, ciphertext: bytes) -> bytes:
+    try:
+        return aead.decrypt(_chunk_nonce(prefix, index), ciphertext, _chunk_aad(header, index, final))
+    except InvalidTag:
+        raise EnvelopeError(f"Bloque {index} alterado, truncado o con clave incorrecta") from None
+
+
+def decrypt_stream(source: BinaryIO, destination: BinaryIO, data_key: bytes) -> int:
+    """
+    Descifrar un flujo ``ECS1`` con memoria constante.
+
+    Returns:
+        int: Bytes de texto plano escritos
+    """
+    _require_cryptography()
+    header = _read_exact(source, HEADER_SIZE)
+    chunk_size, prefix = _parse_header(header)
+    aead = AESGCM(data_key)
+    sealed_size = chunk_size + TAG_SIZE
+
+    total = 0
+    index = 0
+    current = _read_exact(source, sealed_size)
+    while True:
+        if len(current) < TAG_SIZE:
+            raise EnvelopeError("Flujo cifrado truncado")
+        following = _read_exact(source, sealed_size)
+        plaintext = _decrypt_chunk(aead, header, prefix, index, not following, current)
+        destination.write(plaintext)
+        total += len(plaintext)
+        if not following:
+            return total
+        current = following
+        index += 1
+
+
+def _stream_layout(source: BinaryIO) -> tuple[bytes, int, bytes, int, int]:
+    """Cabecera, tamaño de bloque, prefijo, número de bloques y tamaño en claro."""
+    source.seek(0)
+    header = _read_exact(source, HEADER_SIZE)
+    chunk_size, prefix = _parse_header(header)
+    body_size = source.seek(0, os.SEEK_END) - HEADER_SIZE
+    sealed_size = chunk_size + TAG_SIZE
+
+    chunks = max(1, -(-body_size // sealed_size))
+    plaintext_size = body_size - chunks * TAG_SIZE
+    if plaintext_size < 0:
+        raise EnvelopeError("Flujo cifrado truncado")
+    return header, chunk_size, prefix, chunks, plaintext_size
+
+
+def stream_plaintext_size(source: BinaryIO) -> int:
+    """Tamaño en claro de un flujo ``ECS1`` (sin descifrar)."""
+    return _stream_layout(source)[4]
+
+
+def read_range(source: BinaryIO, data_key: bytes, offset: int, length: int) -> bytes:
+    """
+    Leer ``length`` bytes en claro desde ``offset`` descifrando solo los
+    bloques necesarios. ``source`` debe admitir ``seek``.
+    """
+    _require_cryptography()
+    header, chunk_size, prefix, chunks, plaintext_size = _stream_layout(source)
+    if offset < 0 or length < 0:
+        raise ValueError("offset y length deben ser positivos")
+    end = min(offset + length, plaintext_size)
+    if offset >= end:
+        return b''
+
+    aead = AESGCM(data_key)
+    sealed_size = chunk_size + TAG_SIZE
+    first, last = offset // chunk_size, (end - 1) // chunk_size
+
+    parts = []
+    source.seek(HEADER_SIZE + first * sealed_size)
+    for index in range(first, last + 1):
+        sealed = _read_exact(source, sealed_size)
+        parts.append(_decrypt_chunk(aead, header, prefix, index, index == chunks - 1, sealed))
+
+    data = b''.join(parts)
+    start = offset - first * chunk_size
+    return data[start:start + (end - offset)]
+
+
+# ==============================================================================
+# ARCHIVOS Y DOCUMENTOS
+# ==============================================================================
+
+def encrypt_file(source_path: str, destination_path: str, data_key: bytes,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Cifrar un archivo en formato ``ECS1`` sin cargarlo en memoria."""
+    with open(source_path, 'rb') as source, open(destination_path, 'wb') as destination:
+        return encrypt_stream(source, destination, data_key, chunk_size)
+
+
+def decrypt_file(source_path: str, destination_path: str, data_key: bytes) -> int:
+    """Descifrar un archivo ``ECS1`` sin cargarlo en memoria."""
+    with open(source_path, 'rb') as source, open(destination_path, 'wb') as destination:
+        return decrypt_stream(source, destination, data_key)
+
+
+def document_aad(owner_id: str, document_type: str) -> bytes:
+    """Contexto que liga una clave envuelta a su propietario y tipo de documento."""
+    return f'{owner_id}|{document_type}'.encode('utf-8')
+
+
+def file_aad(file_id: str) -> bytes:
+    """Contexto que liga la clave envuelta de un archivo almacenado a su ID."""
+    return f'file|{file_id}'.encode('utf-8')
+
+
+def encode_wrapped_key(key_id: str, wrapped: bytes) -> str:
+    """Representación textual ``key_id:base64`` de una clave envuelta."""
+    return f"{key_id}:{base64.b64encode(wrapped).decode('ascii')}"
+
+
+def decode_wrapped_key(value: str) -> tuple[str, bytes]:
+    key_id, _, encoded = value.partition(':')
+    if not encoded:
+        raise EnvelopeError("Clave envuelta sin identificador de KEK")
+    return key_id, base64.b64decode(encoded)
+
+
+def fingerprint(data_key: bytes) -> str:
+    """Huella corta no reversible de una clave (para logs y auditoría)."""
+    return hashlib.sha256(b'fingerprint:' + data_key).hexdigest()[:16]
+
+
+__all__ = [
+    'EnvelopeError',
+    'KeyCache',
+    'KeyRing',
+    'master_keys_from_config',
+    'get_keyring',
+    'configure_keyring',
+    'init_keyring',
+    'new_data_key',
+    'encrypt_stream',
+    'decrypt_stream',
+    'stream_plaintext_size',
+    'read_range',
+    'encrypt_file',
+    'decrypt_file',
+    'document_aad',
+    'file_aad',
+    'encode_wrapped_key',
+    'decode_wrapped_key',
+    'fingerprint'
+]
@@ -0,0 +1,175 @@
+"""
+Seguimiento de ejecuciones repartidas en bloques (fan-out).
+
+Una ejecución divide un conjunto de ids en bloques que se procesan en
+paralelo. ``FanoutTracker`` guarda en cache el plan de bloques y el resultado
+de cada bloque terminado, con una clave por bloque para que los workers no
+se pisen al actualizar el progreso. Si la ejecución se relanza con el mismo
+``run_id`` se reutiliza el plan guardado y solo se procesan los bloques
+pendientes.
+
+Uso:
+    tracker = FanoutTracker(cache, 'weekly_entrepreneur:2024-05-06')
+    plan = tracker.start(chunked(user_ids, 200))
+    for index in tracker.pending_chunks():
+        ...
+        tracker.mark_chunk_done(index, {'generated': 180, 'skipped': 20})
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Iterable, Optional
+
+# Contadores que se suman al agregar los resultados de los bloques
+COUNTERS = ('processed', 'generated', 'skipped', 'failed')
+
+DEFAULT_TIMEOUT = 7 * 24 * 3600  # una semana: permite reanudar hasta la siguiente ejecución
+
+
+def chunked(items: Iterable[Any], size: int) -> list[list[Any]]:
+    """Dividir ``items`` en listas de como mucho ``size`` elementos."""
+    if size < 1:
+        raise ValueError("El tamaño de bloque debe ser mayor que cero")
+    items = list(items)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def aggregate_results(results: Iterable[Optional[dict[str, Any]]]) -> dict[str, int]:
+    """Sumar los contadores de los resultados de bloque."""
+    totals = dict.fromkeys(COUNTERS, 0)
+    for result in results:
+        for counter in COUNTERS:
+            totals[counter] += int((result or {}).get(counter, 0))
+    return totals
+
+
+class FanoutTracker:
+    """
+    Plan, progreso y resultado de una ejecución en bloques.
+
+    Args:
+        cache: Backend con ``get``, ``set``, ``get_many`` y ``delete_many``
+            (la instancia de Flask-Caching de la aplicación)
+        run_id: Identificador estable de la ejecución (tarea y periodo)
+        timeout: Segundos que se conservan el plan y los resultados
+    """
+
+    def __init__(self, cache, run_id: str, timeout: int = DEFAULT_TIMEOUT):
+        self.cache = cache
+        self.run_id = run_id
+        self.timeout = timeout
+
+    # Claves
+
+    @property
+    def plan_key(self) -> str:
+        return f'fanout:{self.run_id}:plan'
+
+    @property
+    def result_key(self) -> str:
+        return f'fanout:{self.run_id}:result'
+
+    def chunk_key(self, index: int) -> str:
+        return f'fanout:{self.run_id}:chunk:{index}'
+
+    # Estado
+
+    def plan(self) -> Optional[dict[str, Any]]:
+        """Plan guardado (``chunks`` y ``started_at``) o None."""
+        return self.cache.get(self.plan_key)
+
+    def start(self, chunks: list[list[Any]]) -> dict[str, Any]:
+        """
+        Guardar el plan de bloques si la ejecución es nueva.
+
+        Si ya existe un plan para ``run_id`` se devuelve ese (reanudación),
+        aunque el conjunto de ids haya cambiado desde entonces.
+        """
+        plan = self.plan()
+        if plan is not None:
+            return plan
+
+        plan = {
+            'chunks': [list(chunk) for chunk in chunks],
+            'started_at': datetime.now(timezone.utc).isoformat()
+        }
+        self.cache.set(self.plan_key, plan, timeout=self.timeout)
+        return plan
+
+    def chunk_results(self) -> list[Optional[dict[str, Any]]]:
+        """Resultado de cada bloque del plan (None si está pendiente)."""
+        plan = self.plan()
+        if not plan or not plan['chunks']:
+            return []
+        keys = [self.chunk_key(index) for index in range(len(plan['chunks']))]
+        return list(self.cache.get_many(*keys))
+
+    def chunk_result(self, index: int) -> Optional[dict[str, Any]]:
+        """Resultado de un bloque (None si está pendiente)."""
+        return self.cache.get(self.chunk_key(index))
+
+    def pending_chunks(self) -> list[int]:
+        """Índices de los bloques sin terminar."""
+        return [index for index, result in enumerate(self.chunk_results()) if result is None]
+
+    def mark_chunk_done(self, index: int, result: dict[str, Any]):
+        """Registrar el resultado de un bloque terminado."""
+        self.cache.set(self.chunk_key(index), dict(result), timeout=self.timeout)
+
+    def finish(self, extra: Optional[dict[str, Any]] = None) -> dict[str, Any]:
+        """
+        Agregar los resultados de los bloques.
+
+        El resumen solo se guarda como resultado final si todos los bloques
+        terminaron; si no, queda con estado ``incomplete`` y la ejecución se
+        puede reanudar.
+        """
+        summary = {
+            **self.progress(),
+            **(extra or {}),
+            'finished_at': datetime.now(timezone.utc).isoformat()
+        }
+        if summary['status'] == 'completed':
+            self.cache.set(self.result_key, summary, timeout=self.timeout)
+        else:
+            summary['status'] = 'incomplete'
+        return summary
+
+    def result(self) -> Optional[dict[str, Any]]:
+        """Resumen final si la ejecución terminó."""
+        return self.cache.get(self.result_key)
+
+    def progress(self) -> dict[str, Any]:
+        """Progreso actual: bloques terminados y contadores agregados."""
+        plan = self.plan()
+        if plan is None:
+            return {'run_id': self.run_id, 'status': 'unknown'}
+
+        results = self.chunk_results()
+        completed = [result for result in results if result is not None]
+        total_chunks = len(plan['chunks'])
+        return {
+            'run_id': self.run_id,
+            'status': 'completed' if len(completed) == total_chunks else 'running',
+            'started_at': plan['started_at'],
+            'total_items': sum(len(chunk) for chunk in plan['chunks']),
+            'total_chunks': total_chunks,
+            'completed_chunks': len(completed),
+            'percent': round(100.0 * len(completed) / total_chunks, 1) if total_chunks else 100.0,
+            **aggregate_results(completed)
+        }
+
+    def reset(self):
+        """Borrar plan, resultados y resumen para empezar de cero."""
+        plan = self.plan()
+        keys = [self.plan_key, self.result_key]
+        if plan:
+            keys += [self.chunk_key(index) for index in range(len(plan['chunks']))]
+        self.cache.delete_many(*keys)
+
+
+__all__ = [
+    'COUNTERS',
+    'chunked',
+    'aggregate_results',
+    'FanoutTracker'
+]
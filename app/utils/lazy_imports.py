@@ -0,0 +1,107 @@
+"""
+Importación diferida de dependencias pesadas u opcionales.
+
+``lazy_import`` devuelve un módulo sustituto que importa el real en el primer
+acceso a un atributo, de modo que pandas, plotly, PIL, matplotlib o los SDK de
+terceros no se cargan al arrancar la aplicación, los workers de Celery o los
+comandos CLI que nunca los usan. ``is_available`` comprueba si una
+dependencia opcional está instalada sin importarla.
+
+Uso:
+    from app.utils.lazy_imports import lazy_import, is_available
+
+    go = lazy_import('plotly.graph_objects')
+    PLOTLY_AVAILABLE = is_available('plotly')
+
+    fig = go.Figure()  # plotly se importa aquí
+"""
+
+import importlib
+import importlib.util
+import logging
+import threading
+import types
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LazyModule(types.ModuleType):
+    """
+    Módulo que se importa en el primer acceso a uno de sus atributos.
+
+    Args:
+        name: Nombre completo del módulo
+        on_load: ``fn(modulo)`` que se ejecuta una vez tras importarlo
+            (por ejemplo ``matplotlib.use('Agg')``)
+    """
+
+    def __init__(self, name: str, on_load: Optional[Callable[[types.ModuleType], None]] = None):
+        super().__init__(name)
+        self.__dict__['_lazy_on_load'] = on_load
+        self.__dict__['_lazy_module'] = None
+        self.__dict__['_lazy_lock'] = threading.Lock()
+
+    # Los métodos propios llevan prefijo para no ocultar atributos del
+    # módulo real (``yaml.load``, ``json.loads``...)
+
+    def _lazy_load(self) -> types.ModuleType:
+        """Importar el módulo real (una sola vez)."""
+        module = self.__dict__['_lazy_module']
+        if module is not None:
+            return module
+
+        with self.__dict__['_lazy_lock']:
+            module = self.__dict__['_lazy_module']
+            if module is None:
+                module = importlib.import_module(self.__name__)
+                on_load = self.__dict__['_lazy_on_load']
+                if on_load is not None:
+                    on_load(module)
+                self.__dict__['_lazy_module'] = module
+                logger.debug(f"Módulo importado bajo demanda: {self.__name__}")
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._lazy_load(), attr)
+
+    def __dir__(self):
+        return dir(self._lazy_load())
+
+    def __repr__(self):
+        state = 'cargado' if is_loaded(self) else 'diferido'
+        return f'<LazyModule {self.__name__} ({state})>'
+
+
+def lazy_import(name: str, on_load: Optional[Callable[[types.ModuleType], None]] = None) -> LazyModule:
+    """
+    Obtener un sustituto de ``name`` que se importa en su primer uso.
+
+    Si la dependencia no está instalada, el ``ImportError`` se produce en el
+    primer acceso, no al importar el módulo que la declara.
+    """
+    return LazyModule(name, on_load)
+
+
+def is_loaded(module: types.ModuleType) -> bool:
+    """Verificar si un módulo (diferido o no) ya está importado."""
+    if isinstance(module, LazyModule):
+        return module.__dict__['_lazy_module'] is not None
+    return True
+
+
+def is_available(name: str) -> bool:
+    """Verificar si un módulo está instalado sin importarlo."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        # find_spec importa los paquetes padre; si alguno falla, no está disponible
+        return False
+
+
+__all__ = [
+    'LazyModule',
+    'lazy_import',
+    'is_loaded',
+    'is_available'
+]
@@ -417,7 +417,7 @@ def get_logger(name: str = 'app') -> logging.Logger:
 
 # Funciones de conveniencia para diferentes tipos de logs
 def log_request(method: str, url: str, status_code: int, duration: float, 
-               user_id: Optional[int] = None, extra: Optional[Dict] = None):
+               user_id: Optional[int] = None, extra: Optional[dict] = None):
     """Log estructurado de requests."""
     logger = get_logger('request')
     logger.info(f"{method} {url} - {status_code} ({duration:.3f}s)", extra={
@@ -431,7 +431,7 @@ def log_request(method: str, url: str, status_code: int, duration: float,
 
 
 def log_user_action(action: str, user_id: int, resource_type: Optional[str] = None,
-                   resource_id: Optional[int] = None, extra: Optional[Dict] = None):
+                   resource_id: Optional[int] = None, extra: Optional[dict] = None):
     """Log estructurado de acciones de usuario."""
     logger = get_logger('app')
     logger.info(f"User action: {action}", extra={
@@ -445,7 +445,7 @@ def log_user_action(action: str, user_id: int, resource_type: Optional[str] = No
 
 
 def log_integration_call(service: str, operation: str, success: bool, 
-                        duration: float, extra: Optional[Dict] = None):
+                        duration: float, extra: Optional[dict] = None):
     """Log estructurado de llamadas a servicios externos."""
     logger = get_logger('ecosistema.integrations')
     level = logging.INFO if success else logging.WARNING
@@ -462,7 +462,7 @@ def log_integration_call(service: str, operation: str, success: bool,
 
 
 def log_business_event(event_type: str, description: str, user_id: Optional[int] = None,
-                      extra: Optional[Dict] = None):
+                      extra: Optional[dict] = None):
     """Log estructurado de eventos de negocio."""
     logger = get_logger('app')
     logger.info(f"Business event: {event_type} - {description}", extra={
@@ -476,7 +476,7 @@ def log_business_event(event_type: str, description: str, user_id: Optional[int]
 
 def log_security_event(event_type: str, description: str, severity: str = 'medium',
                       ip_address: Optional[str] = None, user_id: Optional[int] = None,
-                      extra: Optional[Dict] = None):
+                      extra: Optional[dict] = None):
     """Log estructurado de eventos de seguridad."""
     logger = get_logger('app')
     
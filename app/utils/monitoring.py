@@ -100,6 +100,45 @@ integration_request_duration_seconds = Histogram(
     buckets=[0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0]
 )
 
+# Métricas de escritura diferida (auditoría y analytics)
+write_buffer_queue_depth = Gauge(
+    'write_buffer_queue_depth',
+    'Records waiting in a write buffer',
+    ['buffer']
+)
+
+write_buffer_written_total = Counter(
+    'write_buffer_written_total',
+    'Total records written by a write buffer',
+    ['buffer']
+)
+
+write_buffer_dropped_total = Counter(
+    'write_buffer_dropped_total',
+    'Total records dropped by a write buffer',
+    ['buffer']
+)
+
+# Métricas de webhooks salientes
+outbound_webhook_requests_total = Counter(
+    'outbound_webhook_requests_total',
+    'Total outbound webhook requests',
+    ['destination', 'status']
+)
+
+outbound_webhook_request_duration_seconds = Histogram(
+    'outbound_webhook_request_duration_seconds',
+    'Outbound webhook request duration in seconds',
+    ['destination'],
+    buckets=[0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+)
+
+outbound_webhook_events_total = Counter(
+    'outbound_webhook_events_total',
+    'Total outbound webhook events by delivery outcome',
+    ['destination', 'outcome']
+)
+
 
 # ====================================
 # DECORADORES PARA MÉTRICAS
@@ -525,6 +564,7 @@ def get_metrics_summary() -> dict[str, Any]:
         from app.models.project import Project
         from app.models.meeting import Meeting
         from app.extensions import db
+        from app.utils.write_buffer import write_buffer_stats
         from datetime import datetime, timedelta
         
         now = datetime.now(timezone.utc)
@@ -569,6 +609,7 @@ def get_metrics_summary() -> dict[str, Any]:
                 'cpu_usage': cpu_usage,
                 'memory_usage': memory_usage
             },
+            'write_buffers': write_buffer_stats(),
             'timestamp': now.isoformat()
         }
         
@@ -596,7 +637,7 @@ class AlertManager:
         }
         self.alert_handlers = []
     
-    def add_alert_handler(self, handler: Callable[[str, Dict], None]):
+    def add_alert_handler(self, handler: Callable[[str, dict], None]):
         """Agregar handler para alertas."""
         self.alert_handlers.append(handler)
     
@@ -0,0 +1,527 @@
+"""
+Utilidades de Paginación por Cursor - Ecosistema de Emprendimiento
+==================================================================
+
+Este módulo implementa paginación keyset (por cursor) sobre columnas de
+ordenamiento. A diferencia de OFFSET, el costo de leer una página no crece
+con la profundidad: cada página se obtiene con un filtro "después de esta
+fila" que aprovecha el índice de ordenamiento.
+
+Características principales:
+- Cursores opacos que codifican la posición y el ordenamiento
+- Ordenamiento por cualquier campo permitido con desempate por ID
+- Soporte de columnas nulas (siempre al final)
+- Navegación hacia adelante y hacia atrás
+- Totales opcionales: exactos, en caché o estimados por el planificador
+- Compatibilidad con paginación por número de página
+
+Uso básico:
+-----------
+    from app.utils.pagination import KeysetPaginator
+
+    paginator = KeysetPaginator(
+        sort_fields={'created_at': User.created_at, 'company_name': Entrepreneur.company_name},
+        tiebreaker=Entrepreneur.id
+    )
+    page = paginator.paginate_request(query, request.args)
+    items = page.items
+    metadata = page.to_dict()
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Optional, Union
+
+from sqlalchemy import and_, or_, nullsfirst, nullslast
+
+logger = logging.getLogger(__name__)
+
+# Configuración por defecto
+PAGINATION_CONFIG = {
+    'default_per_page': 20,
+    'max_per_page': 100,
+    'total_cache_timeout': 60,
+    # Los listados incluyen total y páginas salvo que se pida total=none
+    'default_total_mode': 'cached',
+}
+
+# Modos de cálculo del total
+TOTAL_MODES = ('none', 'exact', 'cached', 'estimate')
+
+
+class InvalidCursorError(ValueError):
+    """Cursor de paginación mal formado o manipulado."""
+    pass
+
+
+# ==============================================================================
+# CODIFICACIÓN DE CURSORES
+# ==============================================================================
+
+def _encode_cursor_value(value: Any) -> Any:
+    """Serializa un valor de cursor preservando su tipo."""
+    if isinstance(value, datetime):
+        return {'__dt__': value.isoformat()}
+    if isinstance(value, date):
+        return {'__d__': value.isoformat()}
+    if isinstance(value, uuid.UUID):
+        return {'__uuid__': str(value)}
+    if isinstance(value, Decimal):
+        return {'__dec__': str(value)}
+    if isinstance(value, Enum):
+        # SQLEnum guarda y compara el nombre del miembro, no su valor
+        return {'__enum__': value.name}
+    return value
+
+
+def _decode_cursor_value(value: Any) -> Any:
+    """Restaura un valor serializado con _encode_cursor_value."""
+    if isinstance(value, dict):
+        if '__dt__' in value:
+            return datetime.fromisoformat(value['__dt__'])
+        if '__d__' in value:
+            return date.fromisoformat(value['__d__'])
+        if '__uuid__' in value:
+            return uuid.UUID(value['__uuid__'])
+        if '__dec__' in value:
+            return Decimal(value['__dec__'])
+        if '__enum__' in value:
+            # El miembro se resuelve con la columna (ver KeysetPaginator._sort_value)
+            return value['__enum__']
+    return value
+
+
+def encode_cursor(values: dict[str, Any]) -> str:
+    """
+    Codifica la posición de una fila como cursor opaco.
+
+    Args:
+        values: Valores de las columnas de ordenamiento de la fila límite
+
+    Returns:
+        Cursor en base64 url-safe
+    """
+    payload = {key: _encode_cursor_value(value) for key, value in values.items()}
+    raw = json.dumps(payload, separators=(',', ':'), sort_keys=True).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, fields: Optional[dict[str, type]] = None) -> dict[str, Any]:
+    """
+    Decodifica un cursor generado por encode_cursor.
+
+    Args:
+        cursor: Cursor recibido del cliente
+        fields: Campos obligatorios y el tipo que debe tener cada uno
+
+    Raises:
+        InvalidCursorError: Si el cursor no es válido o le falta algún campo
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if not isinstance(payload, dict):
+            raise ValueError('el contenido no es un objeto')
+        position = {key: _decode_cursor_value(value) for key, value in payload.items()}
+    except (ValueError, TypeError, UnicodeError) as e:
+        raise InvalidCursorError(f"Cursor inválido: {e}")
+
+    for name, expected_type in (fields or {}).items():
+        if not isinstance(position.get(name), expected_type):
+            raise InvalidCursorError(f"Cursor inválido: falta el campo '{name}'")
+    return position
+
+
+# ==============================================================================
+# CONDICIONES KEYSET
+# ==============================================================================
+
+def keyset_condition(columns: list[Any], values: list[Any],
+                     descending: Union[bool, list[bool]]):
+    """
+    Construye la condición "después de esta fila" para paginación keyset.
+
+    Expande la comparación de tuplas para admitir direcciones mixtas:
+    (c1 > v1) OR (c1 = v1 AND c2 > v2) OR ...
+    Las columnas deben ser no nulas y la última debe ser única (p. ej. id).
+
+    Args:
+        columns: Columnas de ordenamiento en orden
+        values: Valores de la fila límite
+        descending: Dirección global o por columna
+
+    Returns:
+        Expresión SQLAlchemy para filtrar
+    """
+    if isinstance(descending, bool):
+        descending = [descending] * len(columns)
+
+    clauses = []
+    for position, column in enumerate(columns):
+        equal_prefix = [columns[i] == values[i] for i in range(position)]
+        if descending[position]:
+            step = column < values[position]
+        else:
+            step = column > values[position]
+        clauses.append(and_(*equal_prefix, step) if equal_prefix else step)
+
+    return or_(*clauses)
+
+
+def keyset_condition_nullable(column: Any, value: Any, tiebreaker: Any,
+                              tiebreaker_value: Any, descending: bool,
+                              nulls_last: bool = True):
+    """
+    Condición keyset para una columna que admite nulos.
+
+    Las filas con valor nulo forman un bloque al final (``nulls_last``) o
+    al principio del recorrido y, dentro del bloque, se ordenan por el
+    desempate.
+    """
+    tiebreaker_step = tiebreaker < tiebreaker_value if descending else tiebreaker > tiebreaker_value
+
+    if value is None:
+        null_block = and_(column.is_(None), tiebreaker_step)
+        return null_block if nulls_last else or_(null_block, column.isnot(None))
+
+    column_step = column < value if descending else column > value
+    value_block = or_(column_step, and_(column == value, tiebreaker_step))
+    return or_(value_block, column.is_(None)) if nulls_last else value_block
+
+
+# ==============================================================================
+# PAGINADOR KEYSET
+# ==============================================================================
+
+@dataclass
+class KeysetPage:
+    """Página de resultados con cursores de continuación."""
+
+    items: list[Any]
+    per_page: int
+    sort_by: str
+    sort_order: str
+    has_next: bool = False
+    has_prev: bool = False
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    total: Optional[int] = None
+    total_mode: str = 'none'
+    page: Optional[int] = None
+    extra: dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Metadata de paginación para respuestas de API."""
+        data = {
+            'per_page': self.per_page,
+            'sort_by': self.sort_by,
+            'sort_order': self.sort_order,
+            'has_next': self.has_next,
+            'has_prev': self.has_prev,
+            'next_cursor': self.next_cursor,
+            'prev_cursor': self.prev_cursor,
+            'total': self.total,
+            'total_mode': self.total_mode,
+        }
+        if self.total is not None:
+            data['pages'] = (self.total + self.per_page - 1) // self.per_page
+        if self.page is not None:
+            data['page'] = self.page
+            data['prev_page'] = self.page - 1 if self.has_prev else None
+            data['next_page'] = self.page + 1 if self.has_next else None
+        data.update(self.extra)
+        return data
+
+
+class KeysetPaginator:
+    """
+    Motor de paginación keyset compartido por los endpoints de listado.
+
+    Cada endpoint declara los campos de ordenamiento permitidos (nombre
+    público -> columna) y una columna de desempate única. El paginador
+    añade las columnas de ordenamiento a la consulta para construir los
+    cursores sin depender de la forma del modelo.
+    """
+
+    def __init__(self, sort_fields: dict[str, Any], tiebreaker: Any,
+                 default_sort: str = 'created_at', default_order: str = 'desc',
+                 nullable_fields: Optional[set[str]] = None,
+                 max_per_page: Optional[int] = None):
+        """
+        Args:
+            sort_fields: Campos de ordenamiento permitidos
+            tiebreaker: Columna única para desempatar (normalmente el ID)
+            default_sort: Campo por defecto
+            default_order: Dirección por defecto ('asc' o 'desc')
+            nullable_fields: Campos que admiten nulos (se ordenan al final)
+            max_per_page: Máximo de elementos por página
+        """
+        self.sort_fields = sort_fields
+        self.tiebreaker = tiebreaker
+        self.default_sort = default_sort if default_sort in sort_fields else next(iter(sort_fields))
+        self.default_order = default_order
+        self.nullable_fields = nullable_fields or set()
+        self.max_per_page = max_per_page or PAGINATION_CONFIG['max_per_page']
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
+
+    def paginate_request(self, query: Any, args: Any, total: Optional[str] = None) -> KeysetPage:
+        """
+        Paginar a partir de los parámetros de una petición.
+
+        Parámetros reconocidos: cursor, per_page, sort_by, sort_order,
+        page (modo legado con OFFSET) y total (none|exact|cached|estimate,
+        por defecto ``PAGINATION_CONFIG['default_total_mode']``).
+        """
+        per_page = args.get('per_page', PAGINATION_CONFIG['default_per_page'], type=int)
+        page = args.get('page', type=int)
+
+        return self.paginate(
+            query,
+            sort_by=args.get('sort_by'),
+            sort_order=args.get('sort_order'),
+            cursor=args.get('cursor') or None,
+            per_page=per_page,
+            page=page,
+            total=total or args.get('total')
+        )
+
+    def paginate(self, query: Any, sort_by: Optional[str] = None,
+                 sort_order: Optional[str] = None, cursor: Optional[str] = None,
+                 per_page: int = None, page: Optional[int] = None,
+                 total: Optional[str] = None) -> KeysetPage:
+        """
+        Obtener una página de resultados.
+
+        Con ``cursor`` se usa keyset; sin cursor y con ``page`` > 1 se usa
+        OFFSET por compatibilidad, devolviendo igualmente ``next_cursor``
+        para que el cliente pueda continuar con keyset.
+
+        Raises:
+            InvalidCursorError: Si el cursor no corresponde al ordenamiento
+        """
+        per_page = min(max(1, per_page or PAGINATION_CONFIG['default_per_page']), self.max_per_page)
+        sort_by = sort_by if sort_by in self.sort_fields else self.default_sort
+        sort_order = (sort_order or self.default_order).lower()
+        if sort_order not in ('asc', 'desc'):
+            sort_order = self.default_order
+        descending = sort_order == 'desc'
+
+        total_mode = total if total in TOTAL_MODES else PAGINATION_CONFIG['default_total_mode']
+        total_value = self._count(query, total_mode)
+
+        column = self.sort_fields[sort_by]
+        nullable = sort_by in self.nullable_fields
+
+        position = None
+        backwards = False
+        if cursor:
+            position = decode_cursor(cursor)
+            if position.get('s') != sort_by or position.get('o') != sort_order:
+                raise InvalidCursorError("El cursor no corresponde al ordenamiento solicitado")
+            backwards = position.get('d') == 'prev'
+            position['k'] = self._sort_value(column, position.get('k'))
+
+        # Al retroceder se invierte el orden y luego la página
+        scan_descending = descending != backwards
+        keyed = query.add_columns(column.label('_sort_key'), self.tiebreaker.label('_sort_id'))
+
+        # Los nulos quedan al final del orden solicitado, al principio al retroceder
+        nulls_last = not backwards
+        if position:
+            keyed = keyed.filter(self._after(column, nullable, position, scan_descending, nulls_last))
+
+        keyed = keyed.order_by(None).order_by(
+            self._order(column, scan_descending, nullable, nulls_last),
+            self.tiebreaker.desc() if scan_descending else self.tiebreaker.asc()
+        )
+
+        offset = 0
+        if not cursor and page and page > 1:
+            offset = (page - 1) * per_page
+            keyed = keyed.offset(offset)
+
+        rows = keyed.limit(per_page + 1).all()
+        has_more = len(rows) > per_page
+        rows = rows[:per_page]
+        if backwards:
+            rows.reverse()
+
+        items = [row[0] if len(row) == 3 else tuple(row[:-2]) for row in rows]
+
+        if backwards:
+            has_next, has_prev = True, has_more
+        else:
+            has_next, has_prev = has_more, bool(position) or offset > 0
+
+        def make_cursor(row, direction):
+            return encode_cursor({
+                's': sort_by, 'o': sort_order, 'd': direction,
+                'k': row._sort_key, 'i': row._sort_id
+            })
+
+        return KeysetPage(
+            items=items,
+            per_page=per_page,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            has_next=has_next,
+            has_prev=has_prev,
+            next_cursor=make_cursor(rows[-1], 'next') if rows and has_next else None,
+            prev_cursor=make_cursor(rows[0], 'prev') if rows and has_prev else None,
+            total=total_value,
+            total_mode=total_mode,
+            page=None if cursor else (page or 1)
+        )
+
+    # ------------------------------------------------------------------
+    # Construcción de la consulta
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _sort_value(column: Any, value: Any) -> Any:
+        """Restaurar el miembro de enum de una columna SQLEnum a partir de su nombre."""
+        enum_class = getattr(getattr(column, 'type', None), 'enum_class', None)
+        if enum_class is None or value is None or isinstance(value, enum_class):
+            return value
+        try:
+            return enum_class[value]
+        except KeyError:
+            raise InvalidCursorError(f"Valor de enum inválido en el cursor: {value}")
+
+    def _after(self, column: Any, nullable: bool, position: dict[str, Any],
+               descending: bool, nulls_last: bool):
+        """Condición "después de la fila del cursor" en el sentido de recorrido."""
+        if nullable:
+            return keyset_condition_nullable(
+                column, position.get('k'), self.tiebreaker, position.get('i'),
+                descending, nulls_last
+            )
+        return keyset_condition(
+            [column, self.tiebreaker], [position.get('k'), position.get('i')], descending
+        )
+
+    @staticmethod
+    def _order(column: Any, descending: bool, nullable: bool, nulls_last: bool):
+        """Expresión ORDER BY para la columna principal."""
+        ordered = column.desc() if descending else column.asc()
+        if not nullable:
+            return ordered
+        return nullslast(ordered) if nulls_last else nullsfirst(ordered)
+
+    # ------------------------------------------------------------------
+    # Totales
+    # ------------------------------------------------------------------
+
+    def _count(self, query: Any, mode: str) -> Optional[int]:
+        """Calcular el total según el modo solicitado."""
+        if mode == 'none':
+            return None
+        if mode == 'estimate':
+            estimate = self._estimate_count(query)
+            if estimate is not None:
+                return estimate
+            mode = 'cached'
+        if mode == 'cached':
+            return self._cached_count(query)
+        return self._exact_count(query)
+
+    @staticmethod
+    def _exact_count(query: Any) -> int:
+        """COUNT exacto sin ordenamiento ni carga de relaciones."""
+        return query.order_by(None).count()
+
+    def _cached_count(self, query: Any) -> int:
+        """COUNT exacto memorizado brevemente por consulta y parámetros."""
+        try:
+            from app.extensions import cache
+
+            compiled = query.statement.compile()
+            fingerprint = hashlib.sha1(
+                (str(compiled) + repr(sorted(compiled.params.items(), key=lambda item: item[0]))).encode('utf-8')
+            ).hexdigest()
+            cache_key = f"pagination_total:{fingerprint}"
+
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            value = self._exact_count(query)
+            cache.set(cache_key, value, timeout=PAGINATION_CONFIG['total_cache_timeout'])
+            return value
+        except Exception as e:
+            logger.warning(f"No se pudo usar el total en caché: {e}")
+            return self._exact_count(query)
+
+    @staticmethod
+    def _estimate_count(query: Any) -> Optional[int]:
+        """Estimación del planificador de PostgreSQL (sin recorrer filas)."""
+        try:
+            session = query.session
+            bind = session.get_bind()
+            if bind.dialect.name != 'postgresql':
+                return None
+
+            compiled = query.order_by(None).statement.compile(dialect=bind.dialect)
+            result = session.connection().exec_driver_sql(
+                f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+            ).scalar()
+            plan = result[0] if isinstance(result, list) else json.loads(result)[0]
+            return int(plan['Plan']['Plan Rows'])
+        except Exception as e:
+            logger.debug(f"Estimación de total no disponible: {e}")
+            return None
+
+
+# ==============================================================================
+# PARÁMETROS DE PETICIÓN
+# ==============================================================================
+
+def get_pagination_params(request: Any, default_per_page: int = None,
+                          max_per_page: int = None) -> tuple[int, int]:
+    """
+    Obtener (page, per_page) validados de una petición.
+
+    Args:
+        request: Petición de Flask
+        default_per_page: Elementos por página por defecto
+        max_per_page: Máximo de elementos por página
+
+    Returns:
+        Tupla (page, per_page)
+    """
+    default_per_page = default_per_page or PAGINATION_CONFIG['default_per_page']
+    max_per_page = max_per_page or PAGINATION_CONFIG['max_per_page']
+
+    page = request.args.get('page', 1, type=int) or 1
+    per_page = request.args.get('per_page', default_per_page, type=int) or default_per_page
+
+    return max(1, page), min(max(1, per_page), max_per_page)
+
+
+def create_pagination_object(pagination: Any) -> dict[str, Any]:
+    """
+    Convertir un objeto de paginación (Flask-SQLAlchemy o KeysetPage) a diccionario.
+    """
+    if isinstance(pagination, KeysetPage):
+        return pagination.to_dict()
+
+    return {
+        'page': pagination.page,
+        'per_page': pagination.per_page,
+        'total': pagination.total,
+        'pages': pagination.pages,
+        'has_prev': pagination.has_prev,
+        'has_next': pagination.has_next,
+        'prev_page': pagination.prev_num if pagination.has_prev else None,
+        'next_page': pagination.next_num if pagination.has_next else None,
+    }
@@ -85,26 +85,23 @@ except ImportError:
     REPORTLAB_AVAILABLE = False
     logging.warning("ReportLab no disponible. Funcionalidad PDF limitada.")
 
-# Imports opcionales
-try:
-    import matplotlib.pyplot as plt
+# Imports opcionales (diferidos: se importan en el primer uso)
+from app.utils.lazy_imports import lazy_import, is_available
+
+
+def _use_agg_backend(pyplot):
     import matplotlib
     matplotlib.use('Agg')  # Backend sin GUI
-    MATPLOTLIB_AVAILABLE = True
-except ImportError:
-    MATPLOTLIB_AVAILABLE = False
 
-try:
-    from PIL import Image as PILImage
-    PIL_AVAILABLE = True
-except ImportError:
-    PIL_AVAILABLE = False
 
-try:
-    import qrcode
-    QRCODE_AVAILABLE = True
-except ImportError:
-    QRCODE_AVAILABLE = False
+plt = lazy_import('matplotlib.pyplot', on_load=_use_agg_backend)
+MATPLOTLIB_AVAILABLE = is_available('matplotlib')
+
+PILImage = lazy_import('PIL.Image')
+PIL_AVAILABLE = is_available('PIL')
+
+qrcode = lazy_import('qrcode')
+QRCODE_AVAILABLE = is_available('qrcode')
 
 # Configurar logger
 logger = logging.getLogger(__name__)
@@ -0,0 +1,77 @@
+"""
+Contador de consultas SQL para detectar patrones N+1.
+
+Uso típico en tests::
+
+    with assert_max_queries(3):
+        Entrepreneur.serialize_batch(page.items, include_stats=True)
+
+El límite debe depender del número de estadísticas, no del tamaño de la
+página: si una propiedad vuelve a consultar por fila, el test falla.
+"""
+
+import logging
+from contextlib import contextmanager
+from typing import Any, Optional
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+
+class QueryCounter:
+    """Context manager que registra las sentencias ejecutadas sobre un engine."""
+
+    def __init__(self, engine: Optional[Any] = None):
+        self._engine = engine
+        self.statements: list[str] = []
+
+    @property
+    def engine(self):
+        """Engine observado (por defecto, el de Flask-SQLAlchemy)."""
+        if self._engine is None:
+            from app.extensions import db
+            self._engine = db.engine
+        return self._engine
+
+    @property
+    def count(self) -> int:
+        """Número de sentencias ejecutadas."""
+        return len(self.statements)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self) -> 'QueryCounter':
+        event.listen(self.engine, 'before_cursor_execute', self._before_cursor_execute)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        event.remove(self.engine, 'before_cursor_execute', self._before_cursor_execute)
+        return False
+
+
+@contextmanager
+def assert_max_queries(max_queries: int, engine: Optional[Any] = None):
+    """
+    Fallar si el bloque ejecuta más de ``max_queries`` sentencias SQL.
+
+    Args:
+        max_queries: Número máximo de sentencias permitidas
+        engine: Engine a observar (por defecto, el de la aplicación)
+
+    Raises:
+        AssertionError: Si se supera el límite, con las sentencias ejecutadas
+    """
+    with QueryCounter(engine) as counter:
+        yield counter
+
+    if counter.count > max_queries:
+        executed = '\n'.join(f"  {i + 1}. {sql}" for i, sql in enumerate(counter.statements))
+        raise AssertionError(
+            f"Se esperaban como máximo {max_queries} consultas y se ejecutaron "
+            f"{counter.count}:\n{executed}"
+        )
+
+
+__all__ = ['QueryCounter', 'assert_max_queries']
@@ -0,0 +1,170 @@
+"""
+Matriz local de tasas de cambio.
+
+Una ``RateMatrix`` guarda la tabla completa de tasas de una moneda base
+(``1 base = rates[moneda]``) tal como la devuelve un proveedor en una sola
+llamada. Cualquier tasa cruzada se triangula localmente a través de la base
+(``rate(a, b) = rates[b] / rates[a]``), de modo que convertir entre monedas
+no requiere más consultas al proveedor ni al cache.
+
+``convert_many`` convierte un lote de montos con una sola búsqueda en la
+matriz: listas de ``Decimal`` (con redondeo por moneda) o arreglos de numpy
+(multiplicación vectorizada). La moneda origen puede ser única o una por
+monto.
+
+Uso:
+    matrix = RateMatrix('USD', {'EUR': 0.95, 'COP': 4100.0})
+    matrix.rate('EUR', 'COP')
+    matrix.convert_many([Decimal('10'), Decimal('20')], 'EUR', 'USD')
+"""
+
+from datetime import datetime, timezone
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Any, Optional, Sequence, Union
+
+from app.utils.lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+
+
+class RateMatrixError(ValueError):
+    """Moneda ausente o tabla de tasas inválida"""
+
+
+class RateMatrix:
+    """Tabla de tasas de una moneda base con triangulación local"""
+
+    def __init__(self, base: str, rates: dict[str, Any],
+                 fetched_at: Optional[datetime] = None, source: Optional[str] = None):
+        self.base = base.upper()
+        self.rates: dict[str, Decimal] = {self.base: Decimal(1)}
+        for currency, rate in rates.items():
+            value = Decimal(str(rate))
+            if value <= 0:
+                raise RateMatrixError(f"Invalid rate for {currency}: {rate}")
+            self.rates[currency.upper()] = value
+        self.fetched_at = fetched_at or datetime.now(timezone.utc)
+        self.source = source
+        self._index = {currency: position for position, currency in enumerate(sorted(self.rates))}
+        self._vector = None
+
+    @property
+    def currencies(self) -> list[str]:
+        return list(self._index)
+
+    def has(self, currency: str) -> bool:
+        return currency.upper() in self.rates
+
+    def age_seconds(self, now: Optional[datetime] = None) -> float:
+        now = now or datetime.now(timezone.utc)
+        return (now - self.fetched_at).total_seconds()
+
+    def _base_rate(self, currency: str) -> Decimal:
+        try:
+            return self.rates[currency.upper()]
+        except KeyError:
+            raise RateMatrixError(f"Currency '{currency}' not in rate matrix ({self.base})") from None
+
+    def rate_decimal(self, from_currency: str, to_currency: str) -> Decimal:
+        """Tasa exacta ``from -> to`` triangulada a través de la base."""
+        if from_currency.upper() == to_currency.upper():
+            return Decimal(1)
+        return self._base_rate(to_currency) / self._base_rate(from_currency)
+
+    def rate(self, from_currency: str, to_currency: str) -> float:
+        return float(self.rate_decimal(from_currency, to_currency))
+
+    def rebase(self, base: str) -> 'RateMatrix':
+        """Misma matriz expresada con otra moneda base."""
+        divisor = self._base_rate(base)
+        return RateMatrix(
+            base,
+            {currency: rate / divisor for currency, rate in self.rates.items()},
+            fetched_at=self.fetched_at,
+            source=self.source
+        )
+
+    def cross_rates(self, currencies: Optional[Sequence[str]] = None) -> dict[str, dict[str, float]]:
+        """Tabla completa ``{origen: {destino: tasa}}`` de las monedas indicadas."""
+        currencies = [currency.upper() for currency in currencies] if currencies else self.currencies
+        return {
+            source: {target: self.rate(source, target) for target in currencies}
+            for source in currencies
+        }
+
+    def _rate_vector(self):
+        if self._vector is None:
+            self._vector = np.array([float(self.rates[currency]) for currency in self._index])
+        return self._vector
+
+    def _indices(self, currencies: Union[str, Sequence[str]], size: int):
+        if isinstance(currencies, str):
+            self._base_rate(currencies)
+            return np.full(size, self._index[currencies.upper()])
+        try:
+            return np.array([self._index[currency.upper()] for currency in currencies], dtype=int)
+        except KeyError as missing:
+            raise RateMatrixError(f"Currency {missing} not in rate matrix ({self.base})") from None
+
+    def convert_many(self, amounts, from_currency: Union[str, Sequence[str]], to_currency: str,
+                     decimal_places: Optional[int] = None):
+        """
+        Convertir un lote de montos con una sola búsqueda en la matriz.
+
+        Args:
+            amounts: Arreglo de numpy o secuencia de montos (``Decimal``,
+                ``int``, ``float`` o ``str``)
+            from_currency: Moneda origen común o una por monto
+            to_currency: Moneda destino
+            decimal_places: Redondeo de los resultados (None para no redondear)
+
+        Returns:
+            ``numpy.ndarray`` de floats si ``amounts`` es un arreglo de numpy;
+            si no, lista de ``Decimal``
+        """
+        if not isinstance(from_currency, str) and len(from_currency) != len(amounts):
+            raise RateMatrixError("from_currency must have one currency per amount")
+
+        if isinstance(amounts, np.ndarray):
+            rates = self._rate_vector()
+            target = float(self._base_rate(to_currency))
+            converted = amounts.astype(float) * (target / rates[self._indices(from_currency, len(amounts))])
+            return np.round(converted, decimal_places) if decimal_places is not None else converted
+
+        target = self._base_rate(to_currency)
+        quantum = Decimal(1).scaleb(-decimal_places) if decimal_places is not None else None
+
+        if isinstance(from_currency, str):
+            factors = [target / self._base_rate(from_currency)] * len(amounts)
+        else:
+            factors = [target / self._base_rate(currency) for currency in from_currency]
+
+        results = []
+        for amount, factor in zip(amounts, factors):
+            value = (amount if isinstance(amount, Decimal) else Decimal(str(amount))) * factor
+            results.append(value.quantize(quantum, rounding=ROUND_HALF_UP) if quantum is not None else value)
+        return results
+
+    def to_dict(self) -> dict[str, Any]:
+        """Forma serializable para el almacén compartido."""
+        return {
+            'base': self.base,
+            'rates': {currency: str(rate) for currency, rate in self.rates.items() if currency != self.base},
+            'fetched_at': self.fetched_at.isoformat(),
+            'source': self.source
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> 'RateMatrix':
+        return cls(
+            data['base'],
+            data['rates'],
+            fetched_at=datetime.fromisoformat(data['fetched_at']),
+            source=data.get('source')
+        )
+
+
+__all__ = [
+    'RateMatrixError',
+    'RateMatrix'
+]
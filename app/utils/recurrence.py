@@ -0,0 +1,102 @@
+"""
+Cálculo de ocurrencias de tareas recurrentes.
+
+Funciones puras (sin base de datos) que usan tanto ``Task`` como el
+procesador por lotes de tareas recurrentes: la siguiente ocurrencia según el
+patrón (``daily``, ``weekly``, ``bi_weekly``, ``monthly``, ``quarterly``,
+``yearly`` o ``custom`` con ``interval``/``unit``) y la expansión de todas
+las ocurrencias pendientes hasta un instante.
+
+Al sumar meses el día se ajusta al último del mes de destino (31 de enero +
+1 mes = 29 de febrero en año bisiesto).
+"""
+
+import calendar
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    """Sumar meses conservando el día cuando existe en el mes de destino."""
+    month_index = value.month - 1 + months
+    year = value.year + month_index // 12
+    month = month_index % 12 + 1
+    day = min(value.day, calendar.monthrange(year, month)[1])
+    return value.replace(year=year, month=month, day=day)
+
+
+def next_occurrence(pattern: str, current: datetime,
+                    settings: Optional[dict[str, Any]] = None) -> Optional[datetime]:
+    """
+    Ocurrencia siguiente a ``current``.
+
+    Args:
+        pattern: Valor de ``RecurrencePattern``
+        current: Ocurrencia actual
+        settings: ``recurrence_settings`` (solo para ``custom``)
+
+    Returns:
+        Siguiente ocurrencia o None si el patrón no recurre
+    """
+    if pattern == 'daily':
+        return current + timedelta(days=1)
+    if pattern == 'weekly':
+        return current + timedelta(weeks=1)
+    if pattern == 'bi_weekly':
+        return current + timedelta(weeks=2)
+    if pattern == 'monthly':
+        return add_months(current, 1)
+    if pattern == 'quarterly':
+        return add_months(current, 3)
+    if pattern == 'yearly':
+        return add_months(current, 12)
+    if pattern == 'custom':
+        settings = settings or {}
+        interval = settings.get('interval', 1)
+        unit = settings.get('unit', 'days')
+        if unit == 'days':
+            return current + timedelta(days=interval)
+        if unit == 'weeks':
+            return current + timedelta(weeks=interval)
+        if unit == 'months':
+            return add_months(current, interval)
+    return None
+
+
+def expand_occurrences(pattern: str, start: datetime, until: datetime,
+                       settings: Optional[dict[str, Any]] = None,
+                       max_instances: int = 12) -> tuple[list[datetime], Optional[datetime]]:
+    """
+    Instancias pendientes de una tarea recurrente.
+
+    Mientras la ocurrencia actual no supere ``until`` se crea una instancia
+    con vencimiento en la ocurrencia siguiente, que pasa a ser la actual.
+
+    Args:
+        pattern: Valor de ``RecurrencePattern``
+        start: Próxima ocurrencia guardada de la tarea
+        until: Instante hasta el que se generan instancias (normalmente ahora)
+        settings: ``recurrence_settings``
+        max_instances: Máximo de instancias por tarea y ejecución
+
+    Returns:
+        Vencimientos de las instancias y nueva próxima ocurrencia
+    """
+    due_dates: list[datetime] = []
+    current = start
+
+    while current <= until and len(due_dates) < max_instances:
+        following = next_occurrence(pattern, current, settings)
+        if following is None or following <= current:
+            return due_dates, None
+        due_dates.append(following)
+        current = following
+
+    return due_dates, current
+
+
+__all__ = [
+    'add_months',
+    'next_occurrence',
+    'expand_occurrences'
+]
@@ -0,0 +1,308 @@
+"""
+Núcleo de agendamiento basado en intervalos ordenados.
+
+Este módulo proporciona estructuras y algoritmos puros (sin acceso a base de
+datos) para trabajar con intervalos de tiempo: detección de conflictos por
+barrido (sweep-line), índice ordenado para consultas de solapamiento,
+fusión de intervalos ocupados y búsqueda de huecos libres por sustracción.
+
+Todos los intervalos son semiabiertos ``[start, end)``: un evento que termina
+a las 10:00 no entra en conflicto con otro que empieza a las 10:00.
+
+Author: Sistema de Emprendimiento
+Version: 1.0.0
+"""
+
+import heapq
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Iterable, Iterator, Optional
+
+
+# ====================================
+# INTERVALOS
+# ====================================
+
+@dataclass(frozen=True)
+class Interval:
+    """Intervalo de tiempo semiabierto ``[start, end)`` con datos asociados."""
+
+    start: datetime
+    end: datetime
+    data: Any = field(default=None, compare=False, hash=False)
+
+    @property
+    def duration(self) -> timedelta:
+        """Duración del intervalo."""
+        return self.end - self.start
+
+    def overlaps(self, start: datetime, end: datetime) -> bool:
+        """Verificar si se solapa con ``[start, end)``."""
+        return self.start < end and start < self.end
+
+    def overlap_with(self, other: 'Interval') -> timedelta:
+        """Duración del solapamiento con otro intervalo."""
+        return max(timedelta(0), min(self.end, other.end) - max(self.start, other.start))
+
+
+def _valid(intervals: Iterable[Interval]) -> list[Interval]:
+    """Descartar intervalos vacíos o invertidos."""
+    return [interval for interval in intervals if interval.start < interval.end]
+
+
+# ====================================
+# DETECCIÓN DE CONFLICTOS
+# ====================================
+
+def find_overlaps(intervals: Iterable[Interval]) -> Iterator[tuple[Interval, Interval]]:
+    """
+    Encontrar todos los pares de intervalos que se solapan (sweep-line).
+
+    Ordena por inicio y mantiene un heap de intervalos activos por fin, de
+    modo que el coste es O(n log n + k), con k el número de conflictos.
+
+    Args:
+        intervals: Intervalos a analizar
+
+    Yields:
+        Pares ``(anterior, posterior)`` ordenados por inicio
+    """
+    ordered = sorted(_valid(intervals), key=lambda interval: (interval.start, interval.end))
+    active: list[tuple[datetime, int, Interval]] = []
+
+    for index, current in enumerate(ordered):
+        # Retirar los intervalos que terminaron antes de que empiece el actual
+        while active and active[0][0] <= current.start:
+            heapq.heappop(active)
+
+        for _, _, previous in sorted(active, key=lambda item: item[1]):
+            yield previous, current
+
+        heapq.heappush(active, (current.end, index, current))
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> list[Interval]:
+    """
+    Fusionar intervalos solapados o contiguos.
+
+    Args:
+        intervals: Intervalos en cualquier orden
+
+    Returns:
+        Intervalos disjuntos ordenados (sin datos asociados)
+    """
+    merged: list[Interval] = []
+    for interval in sorted(_valid(intervals), key=lambda i: i.start):
+        if merged and interval.start <= merged[-1].end:
+            if interval.end > merged[-1].end:
+                merged[-1] = Interval(merged[-1].start, interval.end)
+        else:
+            merged.append(Interval(interval.start, interval.end))
+    return merged
+
+
+def subtract_intervals(base: Iterable[Interval], busy: Iterable[Interval]) -> list[Interval]:
+    """
+    Restar intervalos ocupados a intervalos base (por ejemplo, disponibilidad).
+
+    Args:
+        base: Intervalos de los que restar; conservan sus datos
+        busy: Intervalos ocupados
+
+    Returns:
+        Fragmentos libres ordenados por inicio
+    """
+    busy_merged = merge_intervals(busy)
+    busy_starts = [interval.start for interval in busy_merged]
+    free: list[Interval] = []
+
+    for interval in sorted(_valid(base), key=lambda i: i.start):
+        cursor = interval.start
+        # Primer ocupado que podría solaparse: el anterior al primer inicio >= cursor
+        position = max(bisect_left(busy_starts, cursor) - 1, 0)
+
+        while position < len(busy_merged) and busy_merged[position].start < interval.end:
+            blocked = busy_merged[position]
+            if blocked.end > cursor:
+                if blocked.start > cursor:
+                    free.append(Interval(cursor, blocked.start, interval.data))
+                cursor = max(cursor, blocked.end)
+            position += 1
+
+        if cursor < interval.end:
+            free.append(Interval(cursor, interval.end, interval.data))
+
+    return free
+
+
+def find_free_slots(available: Iterable[Interval], busy: Iterable[Interval],
+                    duration: timedelta, not_before: Optional[datetime] = None,
+                    limit: Optional[int] = None) -> list[Interval]:
+    """
+    Buscar huecos libres de al menos ``duration`` dentro de la disponibilidad.
+
+    Args:
+        available: Intervalos de disponibilidad
+        busy: Intervalos ocupados
+        duration: Duración mínima requerida
+        not_before: Descartar huecos que empiecen antes de este momento
+        limit: Número máximo de huecos a devolver
+
+    Returns:
+        Huecos ``[inicio, inicio + duration)`` con los datos del intervalo base
+    """
+    slots: list[Interval] = []
+    for window in subtract_intervals(available, busy):
+        start = window.start if not_before is None else max(window.start, not_before)
+        if window.end - start >= duration:
+            slots.append(Interval(start, start + duration, window.data))
+            if limit is not None and len(slots) >= limit:
+                break
+    return slots
+
+
+def intersect_free(free_lists: list[list[Interval]]) -> list[Interval]:
+    """
+    Calcular las ventanas libres comunes a varios participantes.
+
+    Hace un k-way merge de los bordes de las listas (cada una disjunta y
+    ordenada, por ejemplo la salida de ``subtract_intervals``) y emite los
+    tramos en los que todos los participantes están libres. Coste
+    O(N log k), con N el total de intervalos y k el número de listas.
+
+    Args:
+        free_lists: Ventanas libres por participante
+
+    Returns:
+        Ventanas libres comunes, disjuntas y ordenadas
+    """
+    if not free_lists:
+        return []
+
+    participants = len(free_lists)
+    # En un mismo instante, los cierres (-1) se procesan antes que las aperturas (+1)
+    edges = heapq.merge(*[
+        [edge for interval in merge_intervals(free) for edge in ((interval.start, 1), (interval.end, -1))]
+        for free in free_lists
+    ], key=lambda edge: (edge[0], edge[1]))
+
+    common: list[Interval] = []
+    depth = 0
+    opened_at: Optional[datetime] = None
+
+    for moment, delta in edges:
+        if depth == participants and delta < 0 and opened_at < moment:
+            common.append(Interval(opened_at, moment))
+        depth += delta
+        if depth == participants:
+            opened_at = moment
+
+    return merge_intervals(common)
+
+
+def candidate_starts(windows: Iterable[Interval], duration: timedelta, step: timedelta,
+                     limit: Optional[int] = None) -> list[Interval]:
+    """
+    Proponer inicios cada ``step`` dentro de ventanas libres.
+
+    Args:
+        windows: Ventanas libres ordenadas
+        duration: Duración requerida
+        step: Separación entre inicios dentro de una ventana
+        limit: Número máximo de propuestas
+
+    Returns:
+        Intervalos ``[inicio, inicio + duration)`` contenidos en las ventanas
+    """
+    candidates: list[Interval] = []
+    for window in windows:
+        start = window.start
+        while start + duration <= window.end:
+            candidates.append(Interval(start, start + duration, window.data))
+            if limit is not None and len(candidates) >= limit:
+                return candidates
+            start += step
+    return candidates
+
+
+def window_free_intervals(busy: Iterable[Interval], window_start: datetime,
+                          window_end: datetime) -> list[Interval]:
+    """Ventanas libres de un participante dentro de ``[window_start, window_end)``."""
+    return subtract_intervals([Interval(window_start, window_end)], busy)
+
+
+# ====================================
+# ÍNDICE DE INTERVALOS
+# ====================================
+
+class IntervalIndex:
+    """
+    Índice estático de intervalos sobre un arreglo ordenado.
+
+    Guarda los intervalos ordenados por inicio junto con el máximo fin
+    acumulado, lo que permite responder consultas de solapamiento con una
+    búsqueda binaria más un recorrido acotado por los resultados.
+    """
+
+    def __init__(self, intervals: Iterable[Interval] = ()):
+        self._intervals = sorted(_valid(intervals), key=lambda i: (i.start, i.end))
+        self._starts = [interval.start for interval in self._intervals]
+        self._max_end: list[datetime] = []
+        for interval in self._intervals:
+            self._max_end.append(
+                interval.end if not self._max_end else max(self._max_end[-1], interval.end)
+            )
+
+    def __len__(self) -> int:
+        return len(self._intervals)
+
+    def __iter__(self) -> Iterator[Interval]:
+        return iter(self._intervals)
+
+    def overlapping(self, start: datetime, end: datetime) -> list[Interval]:
+        """
+        Obtener intervalos que se solapan con ``[start, end)``.
+
+        Args:
+            start: Inicio de la consulta
+            end: Fin de la consulta
+
+        Returns:
+            Intervalos solapados, ordenados por inicio
+        """
+        # Solo pueden solaparse intervalos que empiezan antes de ``end``
+        upper = bisect_left(self._starts, end)
+        result = []
+
+        position = upper - 1
+        while position >= 0 and self._max_end[position] > start:
+            interval = self._intervals[position]
+            if interval.end > start:
+                result.append(interval)
+            position -= 1
+
+        result.reverse()
+        return result
+
+    def is_free(self, start: datetime, end: datetime) -> bool:
+        """Verificar si ``[start, end)`` no se solapa con ningún intervalo."""
+        return not self.overlapping(start, end)
+
+    def containing(self, moment: datetime) -> Optional[Interval]:
+        """Obtener el primer intervalo que contiene ``moment``."""
+        matches = self.overlapping(moment, moment + timedelta(microseconds=1))
+        return matches[0] if matches else None
+
+
+__all__ = [
+    'Interval',
+    'IntervalIndex',
+    'find_overlaps',
+    'merge_intervals',
+    'subtract_intervals',
+    'find_free_slots',
+    'intersect_free',
+    'candidate_starts',
+    'window_free_intervals'
+]
@@ -0,0 +1,183 @@
+"""
+Perfil de tiempo de importación y memoria del arranque.
+
+Ejecuta el arranque (``create_app``, la aplicación Celery o un módulo) en un
+proceso nuevo con ``python -X importtime``, y devuelve el tiempo total, la
+memoria residente máxima, los módulos más costosos y los paquetes pesados
+cargados. Lo usan el comando ``flask dev import-profile`` y el test de
+regresión de arranque.
+
+Uso:
+    python -m app.utils.startup_profile --target app --limit 25
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Optional
+
+# Código de arranque de cada objetivo
+TARGETS = {
+    'app': "from app import create_app; create_app(os.environ.get('STARTUP_PROFILE_CONFIG', 'testing'))",
+    # Como un worker al arrancar: carga también los módulos de tareas
+    'celery': "from app.tasks.celery_app import celery_app; celery_app.loader.import_default_modules()",
+}
+
+# Paquetes que no deberían cargarse en el arranque (se importan bajo demanda)
+HEAVY_PACKAGES = (
+    'pandas', 'numpy', 'plotly', 'matplotlib', 'reportlab', 'openpyxl',
+    'PIL', 'magic', 'mixpanel', 'amplitude', 'boto3', 'sklearn'
+)
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$')
+_RESULT_MARKER = '__startup_profile__'
+
+_CHILD_TEMPLATE = '''
+import os, sys, time, resource
+_start = time.perf_counter()
+{code}
+_elapsed = time.perf_counter() - _start
+_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+_rss_mb = _rss / (1024 * 1024) if sys.platform == 'darwin' else _rss / 1024
+_heavy = sorted(name for name in {heavy!r} if name in sys.modules)
+print({marker!r}, _elapsed, _rss_mb, ','.join(_heavy))
+'''
+
+
+@dataclass
+class ImportRecord:
+    """Línea de ``-X importtime`` (tiempos en microsegundos)."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class StartupProfile:
+    """Resultado de perfilar un arranque."""
+
+    target: str
+    returncode: int
+    seconds: float = 0.0
+    max_rss_mb: float = 0.0
+    heavy_modules: list[str] = field(default_factory=list)
+    imports: list[ImportRecord] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0 and self.error is None
+
+    def slowest(self, limit: int = 20) -> list[ImportRecord]:
+        """Módulos con mayor tiempo acumulado."""
+        return sorted(self.imports, key=lambda record: record.cumulative_us, reverse=True)[:limit]
+
+    def by_package(self, limit: int = 20) -> list[tuple[str, int]]:
+        """Tiempo propio agregado por paquete de primer nivel (microsegundos)."""
+        totals: dict[str, int] = defaultdict(int)
+        for record in self.imports:
+            totals[record.module.split('.', 1)[0]] += record.self_us
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+
+def parse_importtime(output: str) -> list[ImportRecord]:
+    """Extraer los registros de ``-X importtime`` de la salida de error."""
+    records = []
+    for line in output.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            records.append(ImportRecord(module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return records
+
+
+def profile_startup(target: str = 'app', code: Optional[str] = None, env: Optional[dict[str, str]] = None,
+                    timeout: float = 120.0, cwd: Optional[str] = None) -> StartupProfile:
+    """
+    Perfilar el arranque en un proceso nuevo.
+
+    Args:
+        target: Objetivo de ``TARGETS`` (o nombre descriptivo si se pasa ``code``)
+        code: Código de arranque alternativo
+        env: Variables de entorno adicionales
+        timeout: Segundos máximos de espera
+        cwd: Directorio de trabajo (raíz del proyecto por defecto)
+    """
+    code = code or TARGETS[target]
+    script = _CHILD_TEMPLATE.format(code=code, heavy=HEAVY_PACKAGES, marker=_RESULT_MARKER)
+    cwd = cwd or os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    try:
+        completed = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', script],
+            capture_output=True, text=True, timeout=timeout, cwd=cwd,
+            env={**os.environ, **(env or {})}
+        )
+    except subprocess.TimeoutExpired:
+        return StartupProfile(target, returncode=-1, error=f'Tiempo de espera agotado ({timeout}s)')
+
+    profile = StartupProfile(target, returncode=completed.returncode, imports=parse_importtime(completed.stderr))
+    for line in completed.stdout.splitlines():
+        if line.startswith(_RESULT_MARKER):
+            _, seconds, rss_mb, heavy = line.split(' ', 3)
+            profile.seconds = float(seconds)
+            profile.max_rss_mb = float(rss_mb)
+            profile.heavy_modules = [name for name in heavy.split(',') if name]
+            break
+    else:
+        errors = [line for line in completed.stderr.splitlines() if not line.startswith('import time:')]
+        profile.error = '\n'.join(errors[-20:]) or 'El proceso no devolvió resultados'
+    return profile
+
+
+def format_profile(profile: StartupProfile, limit: int = 20) -> str:
+    """Informe de texto de un perfil de arranque."""
+    if not profile.ok:
+        return f"Error perfilando '{profile.target}' (código {profile.returncode}):\n{profile.error}"
+
+    lines = [
+        f"Arranque '{profile.target}': {profile.seconds:.2f}s, memoria máxima {profile.max_rss_mb:.0f} MB",
+        f"Paquetes pesados cargados: {', '.join(profile.heavy_modules) or 'ninguno'}",
+        '',
+        f"{'acumulado (ms)':>15} {'propio (ms)':>12}  módulo",
+    ]
+    for record in profile.slowest(limit):
+        lines.append(f"{record.cumulative_us / 1000:>15.1f} {record.self_us / 1000:>12.1f}  {record.module}")
+
+    lines += ['', f"{'propio (ms)':>15}  paquete"]
+    for package, self_us in profile.by_package(limit):
+        lines.append(f"{self_us / 1000:>15.1f}  {package}")
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Perfil de importación y memoria del arranque')
+    parser.add_argument('--target', choices=sorted(TARGETS), default='app')
+    parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    profile = profile_startup(args.target)
+    print(format_profile(profile, args.limit))
+    return 0 if profile.ok else 1
+
+
+__all__ = [
+    'TARGETS',
+    'HEAVY_PACKAGES',
+    'ImportRecord',
+    'StartupProfile',
+    'parse_importtime',
+    'profile_startup',
+    'format_profile'
+]
+
+
+if __name__ == '__main__':
+    sys.exit(main())
+
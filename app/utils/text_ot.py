@@ -0,0 +1,275 @@
+"""
+Transformación operacional (OT) para texto plano.
+
+Una operación recorre el documento completo como una secuencia de
+componentes:
+
+- ``int > 0``: conservar (retain) n caracteres
+- ``int < 0``: borrar n caracteres
+- ``str``: insertar el texto
+
+``transform(a, b)`` devuelve ``(a', b')`` tales que
+``apply(apply(s, a), b') == apply(apply(s, b), a')``; es la base del motor
+de colaboración en tiempo real. Ante inserciones en la misma posición, la
+operación ``a`` queda primero.
+
+Author: Sistema de Emprendimiento
+Version: 1.0.0
+"""
+
+from typing import Union
+
+Component = Union[int, str]
+
+
+class OperationError(ValueError):
+    """Operación mal formada o incompatible con el documento."""
+
+
+class TextOperation:
+    """Operación de texto compuesta por retain/insert/delete."""
+
+    __slots__ = ('ops', 'base_length', 'target_length')
+
+    def __init__(self):
+        self.ops: list[Component] = []
+        self.base_length = 0
+        self.target_length = 0
+
+    # ====================================
+    # CONSTRUCCIÓN
+    # ====================================
+
+    def retain(self, n: int) -> 'TextOperation':
+        """Conservar ``n`` caracteres."""
+        if n <= 0:
+            return self
+        self.base_length += n
+        self.target_length += n
+        if self.ops and isinstance(self.ops[-1], int) and self.ops[-1] > 0:
+            self.ops[-1] += n
+        else:
+            self.ops.append(n)
+        return self
+
+    def insert(self, text: str) -> 'TextOperation':
+        """Insertar ``text`` en la posición actual."""
+        if not text:
+            return self
+        self.target_length += len(text)
+        ops = self.ops
+        if ops and isinstance(ops[-1], str):
+            ops[-1] += text
+        elif ops and isinstance(ops[-1], int) and ops[-1] < 0:
+            # Normalizar: la inserción siempre antes del borrado
+            if len(ops) > 1 and isinstance(ops[-2], str):
+                ops[-2] += text
+            else:
+                ops.insert(len(ops) - 1, text)
+        else:
+            ops.append(text)
+        return self
+
+    def delete(self, n: int) -> 'TextOperation':
+        """Borrar ``n`` caracteres."""
+        if n <= 0:
+            return self
+        self.base_length += n
+        if self.ops and isinstance(self.ops[-1], int) and self.ops[-1] < 0:
+            self.ops[-1] -= n
+        else:
+            self.ops.append(-n)
+        return self
+
+    @classmethod
+    def from_json(cls, components: list) -> 'TextOperation':
+        """
+        Construir una operación desde su representación JSON.
+
+        Raises:
+            OperationError: Si algún componente no es válido
+        """
+        if not isinstance(components, list):
+            raise OperationError("La operación debe ser una lista")
+
+        operation = cls()
+        for component in components:
+            if isinstance(component, bool):
+                raise OperationError(f"Componente inválido: {component!r}")
+            if isinstance(component, int):
+                if component > 0:
+                    operation.retain(component)
+                elif component < 0:
+                    operation.delete(-component)
+            elif isinstance(component, str):
+                operation.insert(component)
+            else:
+                raise OperationError(f"Componente inválido: {component!r}")
+        return operation
+
+    def to_json(self) -> list[Component]:
+        """Representación JSON (lista de componentes)."""
+        return list(self.ops)
+
+    def is_noop(self) -> bool:
+        """Verificar si la operación no cambia el documento."""
+        return not self.ops or (len(self.ops) == 1 and isinstance(self.ops[0], int) and self.ops[0] > 0)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, TextOperation) and self.ops == other.ops
+
+    def __repr__(self) -> str:
+        return f'TextOperation({self.ops!r})'
+
+    # ====================================
+    # APLICACIÓN
+    # ====================================
+
+    def apply(self, text: str) -> str:
+        """
+        Aplicar la operación a un texto.
+
+        Raises:
+            OperationError: Si la longitud base no coincide con el texto
+        """
+        if len(text) != self.base_length:
+            raise OperationError(
+                f"La operación espera un texto de {self.base_length} caracteres, recibió {len(text)}"
+            )
+
+        parts = []
+        position = 0
+        for component in self.ops:
+            if isinstance(component, str):
+                parts.append(component)
+            elif component > 0:
+                parts.append(text[position:position + component])
+                position += component
+            else:
+                position -= component
+        return ''.join(parts)
+
+    # ====================================
+    # COMPOSICIÓN Y TRANSFORMACIÓN
+    # ====================================
+
+    def compose(self, other: 'TextOperation') -> 'TextOperation':
+        """
+        Componer dos operaciones consecutivas en una sola.
+
+        ``apply(s, a.compose(b)) == apply(apply(s, a), b)``
+        """
+        if self.target_length != other.base_length:
+            raise OperationError("La longitud base de la segunda operación no coincide")
+
+        result = TextOperation()
+        ops1, ops2 = self.ops, other.ops
+        i1 = i2 = 0
+        op1 = ops1[0] if ops1 else None
+        op2 = ops2[0] if ops2 else None
+
+        while op1 is not None or op2 is not None:
+            if isinstance(op1, int) and op1 < 0:
+                result.delete(-op1)
+                i1 += 1
+                op1 = ops1[i1] if i1 < len(ops1) else None
+                continue
+            if isinstance(op2, str):
+                result.insert(op2)
+                i2 += 1
+                op2 = ops2[i2] if i2 < len(ops2) else None
+                continue
+            if op1 is None or op2 is None:
+                raise OperationError("Las operaciones no se pueden componer")
+
+            if isinstance(op1, int) and isinstance(op2, int) and op2 > 0:
+                # retain / retain
+                step = min(op1, op2)
+                result.retain(step)
+                op1, op2 = op1 - step, op2 - step
+            elif isinstance(op1, str) and op2 < 0:
+                # insert / delete: se anulan
+                step = min(len(op1), -op2)
+                op1, op2 = op1[step:], op2 + step
+            elif isinstance(op1, str):
+                # insert / retain
+                step = min(len(op1), op2)
+                result.insert(op1[:step])
+                op1, op2 = op1[step:], op2 - step
+            else:
+                # retain / delete
+                step = min(op1, -op2)
+                result.delete(step)
+                op1, op2 = op1 - step, op2 + step
+
+            if op1 == 0 or op1 == '':
+                i1 += 1
+                op1 = ops1[i1] if i1 < len(ops1) else None
+            if op2 == 0 or op2 == '':
+                i2 += 1
+                op2 = ops2[i2] if i2 < len(ops2) else None
+
+        return result
+
+    @staticmethod
+    def transform(a: 'TextOperation', b: 'TextOperation') -> tuple['TextOperation', 'TextOperation']:
+        """
+        Transformar dos operaciones concurrentes sobre el mismo texto.
+
+        Returns:
+            ``(a', b')`` con ``b ∘ a' == a ∘ b'``
+        """
+        if a.base_length != b.base_length:
+            raise OperationError("Las operaciones concurrentes deben partir del mismo texto")
+
+        a_prime, b_prime = TextOperation(), TextOperation()
+        ops1, ops2 = a.ops, b.ops
+        i1 = i2 = 0
+        op1 = ops1[0] if ops1 else None
+        op2 = ops2[0] if ops2 else None
+
+        while op1 is not None or op2 is not None:
+            if isinstance(op1, str):
+                a_prime.insert(op1)
+                b_prime.retain(len(op1))
+                i1 += 1
+                op1 = ops1[i1] if i1 < len(ops1) else None
+                continue
+            if isinstance(op2, str):
+                a_prime.retain(len(op2))
+                b_prime.insert(op2)
+                i2 += 1
+                op2 = ops2[i2] if i2 < len(ops2) else None
+                continue
+            if op1 is None or op2 is None:
+                raise OperationError("Las operaciones no se pueden transformar")
+
+            if op1 > 0 and op2 > 0:
+                step = min(op1, op2)
+                a_prime.retain(step)
+                b_prime.retain(step)
+                op1, op2 = op1 - step, op2 - step
+            elif op1 < 0 and op2 < 0:
+                # Ambas borran lo mismo: nada que transformar
+                step = min(-op1, -op2)
+                op1, op2 = op1 + step, op2 + step
+            elif op1 < 0:
+                step = min(-op1, op2)
+                a_prime.delete(step)
+                op1, op2 = op1 + step, op2 - step
+            else:
+                step = min(op1, -op2)
+                b_prime.delete(step)
+                op1, op2 = op1 - step, op2 + step
+
+            if op1 == 0:
+                i1 += 1
+                op1 = ops1[i1] if i1 < len(ops1) else None
+            if op2 == 0:
+                i2 += 1
+                op2 = ops2[i2] if i2 < len(ops2) else None
+
+        return a_prime, b_prime
+
+
+__all__ = ['TextOperation', 'OperationError']
@@ -0,0 +1,130 @@
+"""
+Aritmética de intervalos horarios, diarios y mensuales.
+
+Los intervalos se expresan en UTC sin zona horaria, como las columnas
+``DateTime`` de los modelos. ``plan_buckets`` descompone un rango en el menor
+número de tramos de meses, días y horas completos, de modo que un total sobre
+el rango se resuelve leyendo pocas filas pre-agregadas.
+
+Uso:
+    from app.utils.time_buckets import plan_buckets
+    for granularity, start, end in plan_buckets(desde, hasta):
+        ...
+"""
+
+from datetime import datetime, time, timedelta, timezone
+
+HOUR = 'hour'
+DAY = 'day'
+MONTH = 'month'
+
+GRANULARITIES = (HOUR, DAY, MONTH)
+
+
+def to_naive_utc(ts: datetime) -> datetime:
+    """
+    Convertir a UTC sin zona horaria (las fechas sin zona se asumen UTC).
+
+    Un ``date`` se interpreta como el inicio de ese día.
+    """
+    if not isinstance(ts, datetime):
+        return datetime.combine(ts, time.min)
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+def truncate(ts: datetime, granularity: str) -> datetime:
+    """Inicio del intervalo que contiene ``ts``."""
+    ts = to_naive_utc(ts)
+    if granularity == HOUR:
+        return ts.replace(minute=0, second=0, microsecond=0)
+    if granularity == DAY:
+        return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularity == MONTH:
+        return ts.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    raise ValueError(f"Granularidad no soportada: {granularity}")
+
+
+def next_bucket(bucket_start: datetime, granularity: str) -> datetime:
+    """Inicio del intervalo siguiente."""
+    if granularity == HOUR:
+        return bucket_start + timedelta(hours=1)
+    if granularity == DAY:
+        return bucket_start + timedelta(days=1)
+    if granularity == MONTH:
+        if bucket_start.month == 12:
+            return bucket_start.replace(year=bucket_start.year + 1, month=1)
+        return bucket_start.replace(month=bucket_start.month + 1)
+    raise ValueError(f"Granularidad no soportada: {granularity}")
+
+
+def previous_bucket(bucket_start: datetime, granularity: str) -> datetime:
+    """Inicio del intervalo anterior."""
+    if granularity == MONTH:
+        return truncate(bucket_start - timedelta(days=1), MONTH)
+    return bucket_start - (next_bucket(bucket_start, granularity) - bucket_start)
+
+
+def ceil(ts: datetime, granularity: str) -> datetime:
+    """Primer inicio de intervalo mayor o igual que ``ts``."""
+    start = truncate(ts, granularity)
+    return start if start == to_naive_utc(ts) else next_bucket(start, granularity)
+
+
+def bucket_range(start: datetime, end: datetime, granularity: str) -> list[datetime]:
+    """Inicios de los intervalos que cubren ``[start, end)``."""
+    buckets = []
+    current = truncate(start, granularity)
+    end = to_naive_utc(end)
+    while current < end:
+        buckets.append(current)
+        current = next_bucket(current, granularity)
+    return buckets
+
+
+def plan_buckets(start: datetime, end: datetime) -> list[tuple[str, datetime, datetime]]:
+    """
+    Descomponer ``[start, end)`` en tramos de meses, días y horas completos.
+
+    Los extremos se redondean a la hora (el inicio hacia abajo y el fin hacia
+    arriba). Los tramos contiguos de la misma granularidad se fusionan, así que
+    el resultado tiene como mucho cinco tramos: horas, días, meses, días, horas.
+
+    Returns:
+        Lista de ``(granularidad, desde, hasta)`` en orden cronológico
+    """
+    current = truncate(start, HOUR)
+    end = ceil(end, HOUR)
+    plan: list[tuple[str, datetime, datetime]] = []
+
+    while current < end:
+        for granularity in (MONTH, DAY, HOUR):
+            if truncate(current, granularity) != current:
+                continue
+            following = next_bucket(current, granularity)
+            if following <= end:
+                break
+
+        if plan and plan[-1][0] == granularity and plan[-1][2] == current:
+            plan[-1] = (granularity, plan[-1][1], following)
+        else:
+            plan.append((granularity, current, following))
+        current = following
+
+    return plan
+
+
+__all__ = [
+    'HOUR',
+    'DAY',
+    'MONTH',
+    'GRANULARITIES',
+    'to_naive_utc',
+    'truncate',
+    'next_bucket',
+    'previous_bucket',
+    'ceil',
+    'bucket_range',
+    'plan_buckets'
+]
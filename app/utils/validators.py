@@ -457,7 +457,7 @@ def is_valid_passport(passport: str) -> bool:
 # VALIDADORES DE CONTRASEÑAS
 # ==============================================================================
 
-def validate_password_strength(password: str, config: Optional[Dict] = None) -> dict[str, Any]:
+def validate_password_strength(password: str, config: Optional[dict] = None) -> dict[str, Any]:
     """
     Valida la fortaleza de una contraseña según políticas configurables.
     
@@ -804,7 +804,7 @@ def validate_budget_amount(amount: Union[int, float], currency: str = 'COP') ->
 # VALIDADORES DE FORMULARIOS
 # ==============================================================================
 
-def validate_form_data(data: dict[str, Any], rules: dict[str, Dict]) -> dict[str, Any]:
+def validate_form_data(data: dict[str, Any], rules: dict[str, dict]) -> dict[str, Any]:
     """
     Valida datos de formulario según reglas especificadas.
     
@@ -1090,7 +1090,7 @@ class DocumentValidator:
 class PasswordValidator:
     """Validador avanzado de contraseñas."""
     
-    def __init__(self, config: Optional[Dict] = None):
+    def __init__(self, config: Optional[dict] = None):
         self.config = config or PASSWORD_CONFIG.copy()
     
     def validate(self, password: str) -> dict[str, Any]:
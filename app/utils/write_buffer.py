@@ -0,0 +1,272 @@
+"""
+Escritura diferida por lotes para registros de auditoría y métricas.
+
+Los registros se encolan en un buffer acotado por proceso y un hilo de fondo
+los inserta en lotes (``INSERT`` multi-fila en su propia transacción), de
+modo que registrar una actividad no añade un commit a la petición que la
+origina. Si el buffer se llena, los registros nuevos se descartan y se
+cuentan en ``dropped``.
+
+Uso:
+    from app.utils.write_buffer import activity_log_buffer
+    activity_log_buffer.start(app)
+    activity_log_buffer.append({...})
+
+Author: Sistema de Emprendimiento
+Version: 1.0.0
+"""
+
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Optional
+
+from app.utils.monitoring import (
+    write_buffer_dropped_total,
+    write_buffer_queue_depth,
+    write_buffer_written_total
+)
+
+logger = logging.getLogger(__name__)
+
+Row = dict[str, Any]
+
+
+class WriteBuffer:
+    """
+    Buffer acotado con vaciado periódico por lotes.
+
+    Args:
+        name: Nombre del buffer (etiqueta de las métricas)
+        write_batch: ``fn(rows)`` que persiste un lote en una transacción
+        max_size: Registros máximos en cola
+        batch_size: Registros por ``INSERT``
+        flush_interval: Segundos máximos que un registro espera en cola
+        max_retries: Reintentos de un lote fallido antes de descartarlo
+    """
+
+    def __init__(self, name: str, write_batch: Callable[[list[Row]], None], max_size: int = 10000,
+                 batch_size: int = 500, flush_interval: float = 1.0, max_retries: int = 3):
+        self.name = name
+        self.write_batch = write_batch
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.enabled = False
+
+        self.written = 0
+        self.dropped = 0
+        self.failed_batches = 0
+        self.last_flush_at: Optional[float] = None
+
+        self._queue: deque = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._atexit_registered = False
+
+    @property
+    def running(self) -> bool:
+        """Verificar si el hilo de escritura está activo."""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def queue_depth(self) -> int:
+        """Registros pendientes de escribir."""
+        return len(self._queue)
+
+    # ====================================
+    # ENCOLADO
+    # ====================================
+
+    def append(self, row: Row) -> bool:
+        """
+        Encolar un registro.
+
+        Returns:
+            False si el buffer estaba lleno y el registro se descartó
+        """
+        with self._lock:
+            if len(self._queue) >= self.max_size:
+                self.dropped += 1
+                write_buffer_dropped_total.labels(buffer=self.name).inc()
+                return False
+            self._queue.append(row)
+            depth = len(self._queue)
+
+        write_buffer_queue_depth.labels(buffer=self.name).set(depth)
+        if depth >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def write_now(self, rows: list[Row]):
+        """Escribir registros de forma síncrona (severidades que deben ser durables)."""
+        self.write_batch(rows)
+        self.written += len(rows)
+        write_buffer_written_total.labels(buffer=self.name).inc(len(rows))
+
+    # ====================================
+    # VACIADO
+    # ====================================
+
+    def flush(self) -> int:
+        """
+        Escribir todo lo encolado en lotes de ``batch_size``.
+
+        Returns:
+            Registros escritos
+        """
+        written = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+                if not batch:
+                    break
+                if not self._write_with_retries(batch):
+                    break
+                written += len(batch)
+
+            self.last_flush_at = time.time()
+            write_buffer_queue_depth.labels(buffer=self.name).set(len(self._queue))
+        return written
+
+    def _write_with_retries(self, batch: list[Row]) -> bool:
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.write_batch(batch)
+                self.written += len(batch)
+                write_buffer_written_total.labels(buffer=self.name).inc(len(batch))
+                return True
+            except Exception as e:
+                logger.warning(f"Error escribiendo lote de {self.name} (intento {attempt + 1}): {str(e)}")
+                if not self._stopping.is_set():
+                    time.sleep(min(0.1 * 2 ** attempt, 2.0))
+
+        self.failed_batches += 1
+        self.dropped += len(batch)
+        write_buffer_dropped_total.labels(buffer=self.name).inc(len(batch))
+        logger.error(f"Se descartaron {len(batch)} registros de {self.name} tras {self.max_retries} reintentos")
+        return False
+
+    # ====================================
+    # HILO DE FONDO
+    # ====================================
+
+    def start(self, app=None):
+        """
+        Arrancar el hilo de escritura (no hace nada si ya está activo).
+
+        Se llama en el primer ``append`` de cada proceso, de modo que los
+        workers creados por fork arrancan su propio hilo.
+
+        Args:
+            app: Aplicación Flask cuyo contexto se activa al escribir
+        """
+        if self.running:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, args=(app,), name=f'write-buffer-{self.name}', daemon=True)
+        self._thread.start()
+        if not self._atexit_registered:
+            atexit.register(self.stop)
+            self._atexit_registered = True
+
+    def stop(self, timeout: float = 5.0):
+        """Detener el hilo y escribir lo pendiente."""
+        if not self.running:
+            return
+        self._stopping.set()
+        self._wakeup.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self, app):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                if app is not None:
+                    with app.app_context():
+                        self.flush()
+                else:
+                    self.flush()
+            except Exception as e:
+                logger.error(f"Error en el hilo de escritura de {self.name}: {str(e)}")
+            if self._stopping.is_set():
+                break
+
+    def stats(self) -> dict[str, Any]:
+        """Estado del buffer para health checks y dashboards."""
+        return {
+            'name': self.name,
+            'running': self.running,
+            'queue_depth': self.queue_depth,
+            'max_size': self.max_size,
+            'written': self.written,
+            'dropped': self.dropped,
+            'failed_batches': self.failed_batches,
+            'last_flush_at': self.last_flush_at
+        }
+
+
+def insert_rows(model, rows: list[Row]):
+    """
+    Insertar filas de un modelo en su propia transacción (``INSERT`` multi-fila).
+
+    Usa una conexión independiente de ``db.session`` para no confirmar el
+    trabajo pendiente de la petición en curso.
+    """
+    from app.extensions import db
+
+    with db.engine.begin() as connection:
+        connection.execute(model.__table__.insert(), rows)
+
+
+def _insert_activity_logs(rows: list[Row]):
+    from app.models.activity_log import ActivityLog
+    insert_rows(ActivityLog, rows)
+
+
+def _insert_metrics(rows: list[Row]):
+    from app.models.analytics import AnalyticsMetric
+    insert_rows(AnalyticsMetric, rows)
+
+
+# Buffers del proceso (configurados en init_write_buffers)
+activity_log_buffer = WriteBuffer('activity_logs', _insert_activity_logs)
+metric_buffer = WriteBuffer('analytics_metrics', _insert_metrics)
+
+
+def init_write_buffers(app):
+    """
+    Configurar los buffers de auditoría y métricas.
+
+    Con ``WRITE_BUFFER_ENABLED`` desactivado (tests) los registros se
+    escriben de forma síncrona en la sesión de la petición, como antes.
+    """
+    for buffer in (activity_log_buffer, metric_buffer):
+        buffer.enabled = app.config.get('WRITE_BUFFER_ENABLED', True)
+        buffer.max_size = app.config.get('WRITE_BUFFER_MAX_SIZE', buffer.max_size)
+        buffer.batch_size = app.config.get('WRITE_BUFFER_BATCH_SIZE', buffer.batch_size)
+        buffer.flush_interval = app.config.get('WRITE_BUFFER_FLUSH_INTERVAL', buffer.flush_interval)
+
+
+def write_buffer_stats() -> list[dict[str, Any]]:
+    """Estado de los buffers de escritura del proceso."""
+    return [activity_log_buffer.stats(), metric_buffer.stats()]
+
+
+__all__ = [
+    'WriteBuffer',
+    'activity_log_buffer',
+    'metric_buffer',
+    'insert_rows',
+    'init_write_buffers',
+    'write_buffer_stats'
+]
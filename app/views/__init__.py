@@ -576,12 +576,12 @@ class ViewsManager:
             self.analytics_service = AnalyticsService()
         return self.analytics_service
     
-    def _get_user_notifications(self, user: User) -> list[Dict]:
+    def _get_user_notifications(self, user: User) -> list[dict]:
         """Obtiene notificaciones del usuario."""
         # Implementar lógica para obtener notificaciones
         return []
     
-    def _get_user_stats(self, user: User) -> Dict:
+    def _get_user_stats(self, user: User) -> dict:
         """Obtiene estadísticas del usuario."""
         stats = {
             'projects_count': 0,
@@ -596,7 +596,7 @@ class ViewsManager:
         
         return stats
     
-    def _get_main_navigation(self) -> list[Dict]:
+    def _get_main_navigation(self) -> list[dict]:
         """Genera navegación principal."""
         nav_items = [
             {
@@ -651,7 +651,7 @@ class ViewsManager:
         
         return nav_items
     
-    def _get_user_navigation(self) -> list[Dict]:
+    def _get_user_navigation(self) -> list[dict]:
         """Genera navegación del usuario."""
         if not hasattr(g, 'current_user') or not g.current_user:
             return []
@@ -674,7 +674,7 @@ class ViewsManager:
             }
         ]
     
-    def _get_breadcrumbs(self) -> list[Dict]:
+    def _get_breadcrumbs(self) -> list[dict]:
         """Genera breadcrumbs automáticos."""
         breadcrumbs = []
         
@@ -749,7 +749,7 @@ class ViewsManager:
         """Genera URL canónica."""
         return request.url
     
-    def _get_open_graph_data(self) -> Dict:
+    def _get_open_graph_data(self) -> dict:
         """Genera datos Open Graph para redes sociales."""
         return {
             'title': self._get_page_title(),
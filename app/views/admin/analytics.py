@@ -41,6 +41,7 @@ from app.models import (
 
 # Importaciones de servicios
 from app.services.analytics_service import AnalyticsService
+from app.services.metric_rollups import MetricRollupService
 from app.services.prediction_service import PredictionService
 from app.services.benchmark_service import BenchmarkService
 from app.services.report_service import ReportService
@@ -889,12 +890,12 @@ def api_export_analytics_data():
 
 def _get_ecosystem_kpis(start_date, end_date):
     """Obtiene los KPIs principales del ecosistema."""
+    activity = _get_rollup_activity_totals(start_date, end_date)
+    
     return {
         # Métricas de Usuarios
         'total_active_users': User.query.filter_by(is_active=True).count(),
-        'new_users_period': User.query.filter(
-            and_(User.created_at >= start_date, User.created_at <= end_date)
-        ).count(),
+        'new_users_period': int(activity['users.registered']),
         'monthly_active_users': _calculate_monthly_active_users(),
         'user_retention_rate': _calculate_user_retention_rate(),
         
@@ -920,21 +921,32 @@ def _get_ecosystem_kpis(start_date, end_date):
         'jobs_created': _estimate_jobs_created(),
         'companies_launched': _count_companies_launched(),
         'patents_filed': _count_patents_filed(),
-        'social_impact_score': _calculate_social_impact_score()
+        'social_impact_score': _calculate_social_impact_score(),
+        
+        # Actividad del período (agregados de métricas)
+        'platform_events_period': int(activity['activity.events']),
+        'logins_period': int(activity['activity.logins']),
+        'mentorship_sessions_period': int(activity['mentorship.sessions_completed']),
+        'mentorship_hours_period': round(activity['mentorship.minutes'] / 60, 1),
+        'projects_created_period': int(activity['projects.created'])
     }
 
+def _get_rollup_activity_totals(start_date, end_date):
+    """Totales de actividad del período en una sola lectura de agregados."""
+    return MetricRollupService().totals(
+        ['activity.events', 'activity.logins', 'mentorship.sessions_completed',
+         'mentorship.minutes', 'projects.created', 'users.registered'],
+        start_date, end_date
+    )
+
 def _get_growth_metrics(start_date, end_date):
     """Obtiene métricas de crecimiento."""
     previous_period_start = start_date - (end_date - start_date)
     previous_period_end = start_date
     
-    current_users = User.query.filter(
-        and_(User.created_at >= start_date, User.created_at <= end_date)
-    ).count()
-    
-    previous_users = User.query.filter(
-        and_(User.created_at >= previous_period_start, User.created_at <= previous_period_end)
-    ).count()
+    rollups = MetricRollupService()
+    current_users = rollups.total('users.registered', start_date, end_date)
+    previous_users = rollups.total('users.registered', previous_period_start, previous_period_end)
     
     user_growth_rate = ((current_users - previous_users) / previous_users * 100) if previous_users > 0 else 0
     
@@ -969,10 +981,27 @@ def _get_financial_overview(start_date, end_date):
 
 def _calculate_ecosystem_health_score():
     """Calcula un score compuesto de salud del ecosistema."""
+    now = datetime.now(timezone.utc)
+    thirty_days_ago = now - timedelta(days=30)
+    
+    # Indicadores financieros reportados (media de los últimos 30 días)
+    financials = MetricRollupService().averages([
+        'metric.entrepreneur_revenue_growth',
+        'metric.lifetime_value',
+        'metric.customer_acquisition_cost'
+    ], thirty_days_ago, now)
+    revenue_growth_rate = financials['metric.entrepreneur_revenue_growth'] or 0
+    lifetime_value = financials['metric.lifetime_value']
+    acquisition_cost = financials['metric.customer_acquisition_cost'] or 0
+    # Margen por cliente: lo que queda del valor de vida tras el coste de adquisición
+    net_profit_margin = (
+        (lifetime_value - acquisition_cost) / lifetime_value * 100
+    ) if lifetime_value else 0
+    
     # Factores de salud (0-100 cada uno)
     user_health = min(100, (_calculate_monthly_active_users() / 1000) * 100)
-    financial_health = min(100, (_calculate_net_profit_margin() + 50) * 2)
-    growth_health = min(100, (_calculate_revenue_growth_rate() + 10) * 5)
+    financial_health = max(0, min(100, (net_profit_margin + 50) * 2))
+    growth_health = max(0, min(100, (revenue_growth_rate + 10) * 5))
     success_health = _calculate_entrepreneur_success_rate()
     retention_health = _calculate_user_retention_rate()
     
@@ -1126,14 +1155,9 @@ def _get_realtime_metrics():
 # ============================================================================
 
 def _calculate_monthly_active_users():
-    """Calcula usuarios activos mensuales."""
-    thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
-    return User.query.filter(
-        and_(
-            User.is_active == True,
-            User.last_login >= thirty_days_ago
-        )
-    ).count()
+    """Calcula usuarios activos mensuales (agregado ``users.active``)."""
+    now = datetime.now(timezone.utc)
+    return int(MetricRollupService().total('users.active', now - timedelta(days=30), now))
 
 def _calculate_user_retention_rate():
     """Calcula tasa de retención de usuarios."""
@@ -1152,7 +1176,7 @@ def _calculate_user_retention_rate():
         and_(
             User.created_at >= sixty_days_ago,
             User.created_at < thirty_days_ago,
-            User.last_login >= thirty_days_ago
+            User.last_login_at >= thirty_days_ago
         )
     ).count()
     
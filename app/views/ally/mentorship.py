@@ -2033,7 +2033,7 @@ def _get_upcoming_sessions_calendar(ally: Ally) -> list[dict[str, Any]]:
 
 # Funciones de notificación y logging
 
-def _send_session_notifications(session: MentorshipSession, event_type: str, extra_data: Optional[Dict] = None) -> None:
+def _send_session_notifications(session: MentorshipSession, event_type: str, extra_data: Optional[dict] = None) -> None:
     """Envía notificaciones relacionadas con la sesión."""
     notification_service = NotificationService()
     
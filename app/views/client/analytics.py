@@ -50,13 +50,14 @@ from app.models.project import Project
 from app.models.organization import Organization
 from app.models.program import Program
 from app.models.meeting import Meeting
-from app.models.analytics import AnalyticsEvent
 from app.core.exceptions import ValidationError, AnalyticsError
 from app.utils.decorators import cache_response, log_activity, rate_limit, websocket_auth
 from app.utils.formatters import format_currency, format_percentage, format_number
 from app.utils.date_utils import get_date_range_for_period, get_quarter_dates
 from app.utils.math_utils import calculate_correlation, detect_anomalies, forecast_time_series
+from app.utils.time_buckets import HOUR, DAY, MONTH, bucket_range
 from app.services.analytics_service import AnalyticsService
+from app.services.metric_rollups import MetricRollupService
 from app.services.ml_service import MLService
 from app.services.notification_service import NotificationService
 
@@ -191,6 +192,19 @@ ANALYTICS_WIDGETS = {
     }
 }
 
+# Métricas de cliente servidas desde los agregados de métricas:
+# nombre -> (métrica agregada, divisor, solo registros públicos)
+ROLLUP_METRICS = {
+    'projects_created': ('projects.created', 1, True),
+    'projects_launched': ('projects.launched', 1, True),
+    'mentorship_sessions': ('mentorship.sessions_completed', 1, False),
+    'training_sessions': ('mentorship.sessions_completed', 1, False),
+    'mentorship_hours': ('mentorship.minutes', 60, False),
+    'platform_activity': ('activity.events', 1, False)
+}
+
+QUERY_GRANULARITIES = {'hourly': HOUR, 'daily': DAY, 'monthly': MONTH}
+
 
 @dataclass
 class AnalyticsQuery:
@@ -1102,27 +1116,26 @@ def _generate_cohort_analysis(cohort_type, metric, period, permissions):
 
 
 def _generate_correlation_matrix(permissions):
-    """Genera matriz de correlación para variables clave."""
-    # Variables base disponibles para todos
+    """Genera matriz de correlación de las series diarias de los últimos 90 días."""
     variables = [
-        'projects_completed', 'jobs_created', 'entrepreneurs_active',
-        'mentorship_hours', 'training_sessions'
+        'projects_created', 'projects_launched', 'mentorship_sessions',
+        'mentorship_hours', 'platform_activity'
     ]
     
-    # Variables adicionales según permisos
-    if permissions.get('can_view_financial_metrics'):
-        variables.extend(['revenue_generated', 'investment_attracted'])
+    end_date = datetime.now(timezone.utc)
+    _, series = _rollup_series(variables, end_date - timedelta(days=90), end_date)
     
-    # Simular matriz de correlación
     correlation_matrix = {}
-    for i, var1 in enumerate(variables):
+    for var1 in variables:
         correlation_matrix[var1] = {}
-        for j, var2 in enumerate(variables):
-            if i == j:
+        for var2 in variables:
+            if var1 == var2:
                 correlation_matrix[var1][var2] = 1.0
+            elif np.std(series[var1]) == 0 or np.std(series[var2]) == 0:
+                # Sin variación no hay correlación definida
+                correlation_matrix[var1][var2] = 0.0
             else:
-                # Simular correlación (en producción se calcularía con datos reales)
-                correlation_matrix[var1][var2] = np.random.uniform(-1, 1)
+                correlation_matrix[var1][var2] = float(np.corrcoef(series[var1], series[var2])[0, 1])
     
     return correlation_matrix
 
@@ -1157,13 +1170,19 @@ def _execute_analytics_query(query, permissions):
     """Ejecuta consulta de analytics y retorna resultados."""
     start_time = datetime.now(timezone.utc)
     
-    # Simular ejecución de consulta
-    # En producción, esto ejecutaría la consulta real contra la base de datos
+    granularity = QUERY_GRANULARITIES.get(query.granularity, DAY)
+    buckets, series = _rollup_series(
+        query.metrics, *query.date_range, granularity=granularity,
+        organization_id=query.filters.get('organization_id'),
+        program_id=query.filters.get('program_id')
+    )
+    
+    # Las métricas sin agregado no tienen datos (None)
     data = []
-    for i in range(30):  # 30 días de datos simulados
-        row = {'date': (datetime.now(timezone.utc) - timedelta(days=i)).date().isoformat()}
+    for index, bucket_start in enumerate(buckets):
+        row = {'date': bucket_start.isoformat() if granularity == HOUR else bucket_start.date().isoformat()}
         for metric in query.metrics:
-            row[metric] = np.random.randint(1, 100)
+            row[metric] = series[metric][index] if metric in series else None
         data.append(row)
     
     execution_time = (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
@@ -1234,7 +1253,8 @@ def _get_available_metrics(client_type, permissions):
     """Obtiene métricas disponibles según tipo de cliente."""
     base_metrics = [
         'projects_completed', 'entrepreneurs_active', 'jobs_created',
-        'mentorship_hours', 'training_sessions', 'direct_beneficiaries'
+        'mentorship_hours', 'training_sessions', 'direct_beneficiaries',
+        'projects_created', 'projects_launched', 'mentorship_sessions', 'platform_activity'
     ]
     
     if permissions.get('can_view_financial_metrics'):
@@ -1290,14 +1310,10 @@ def _count_online_entrepreneurs():
 
 
 def _count_recent_activities():
-    """Cuenta actividades recientes del ecosistema."""
+    """Cuenta actividades recientes del ecosistema (agregados horarios)."""
     # Actividades en las últimas 6 horas
-    cutoff = datetime.now(timezone.utc) - timedelta(hours=6)
-    return (
-        AnalyticsEvent.query
-        .filter(AnalyticsEvent.created_at >= cutoff)
-        .count()
-    )
+    now = datetime.now(timezone.utc)
+    return int(MetricRollupService().total('activity.events', now - timedelta(hours=6), now))
 
 
 def _get_revenue_today():
@@ -1316,9 +1332,45 @@ def _get_revenue_today():
 # Funciones placeholder para ML y análisis avanzado
 
 def _get_historical_data_for_prediction(metric, permissions):
-    """Obtiene datos históricos para entrenar modelo predictivo."""
-    # Implementación simplificada
-    return [{'value': np.random.randint(10, 100), 'date': datetime.now(timezone.utc) - timedelta(days=i)} for i in range(90)]
+    """Obtiene la serie diaria de los últimos 90 días para entrenar el modelo predictivo."""
+    if metric not in ROLLUP_METRICS:
+        return []
+    
+    end_date = datetime.now(timezone.utc)
+    days, series = _rollup_series([metric], end_date - timedelta(days=ANALYTICS_CONFIG['ML_PREDICTION_DAYS']), end_date)
+    return [{'value': value, 'date': day} for day, value in zip(days, series[metric])]
+
+
+def _rollup_series(metrics, start_date, end_date, granularity=DAY, organization_id=None, program_id=None):
+    """
+    Series de métricas de cliente leídas de los agregados de métricas.
+    
+    Las métricas de proyectos solo cuentan registros públicos; se hace como
+    mucho una lectura por visibilidad.
+    
+    Returns:
+        ``(inicios de intervalo, {métrica: valores})``; las métricas sin
+        agregado no aparecen en el diccionario
+    """
+    rollups = MetricRollupService()
+    buckets = bucket_range(start_date, end_date, granularity)
+    series = {}
+    
+    for public_only in (True, False):
+        names = [name for name in metrics if name in ROLLUP_METRICS and ROLLUP_METRICS[name][2] == public_only]
+        if not names:
+            continue
+        
+        _, values = rollups.series(
+            {ROLLUP_METRICS[name][0] for name in names}, start_date, end_date, granularity,
+            organization_id=organization_id, program_id=program_id,
+            is_public=True if public_only else None
+        )
+        for name in names:
+            metric, divisor, _ = ROLLUP_METRICS[name]
+            series[name] = [value / divisor for value in values[metric]]
+    
+    return buckets, series
 
 
 def _prepare_ml_data(historical_data):
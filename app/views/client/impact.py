@@ -36,15 +36,15 @@ from app.models.entrepreneur import Entrepreneur
 from app.models.project import Project
 from app.models.organization import Organization
 from app.models.program import Program
-from app.models.meeting import Meeting
-from app.models.mentorship import MentorshipSession
 from app.models.analytics import AnalyticsEvent
 from app.core.exceptions import ValidationError, PermissionError
 from app.utils.decorators import cache_response, log_activity, rate_limit
 from app.utils.formatters import format_currency, format_percentage, format_number
 from app.utils.date_utils import get_date_range_for_period, get_quarter_dates, get_year_range
+from app.utils.time_buckets import MONTH, previous_bucket, truncate
 from app.utils.export_utils import generate_impact_report_pdf, generate_impact_report_excel
 from app.services.analytics_service import AnalyticsService
+from app.services.metric_rollups import MetricRollupService
 
 # Importar funciones del módulo principal
 from . import (
@@ -872,67 +872,30 @@ def _get_categorized_impact(start_date, end_date, permissions):
 
 
 def _get_historical_trends(start_date, end_date, permissions):
-    """Obtiene tendencias históricas de métricas clave."""
-    # Calcular períodos históricos (últimos 12 meses)
-    periods = []
-    current_date = end_date
+    """Obtiene tendencias históricas de métricas clave (últimos 12 meses completos)."""
+    periods_end = truncate(end_date, MONTH)
+    periods_start = periods_end
+    for _ in range(12):
+        periods_start = previous_bucket(periods_start, MONTH)
     
-    for i in range(12):
-        period_end = current_date.replace(day=1) - timedelta(days=1)
-        period_start = period_end.replace(day=1)
-        periods.append((period_start, period_end))
-        current_date = period_start
-    
-    periods.reverse()  # Orden cronológico
+    rollups = MetricRollupService()
+    # Solo proyectos públicos, como el resto de vistas de clientes
+    periods, values = rollups.series(
+        ['projects.created', 'projects.launched'], periods_start, periods_end,
+        granularity=MONTH, is_public=True
+    )
+    values.update(rollups.series(
+        ['mentorship.sessions_completed', 'mentorship.minutes'], periods_start, periods_end,
+        granularity=MONTH
+    )[1])
     
-    trends = {
-        'periods': [p[1].strftime('%Y-%m') for p in periods],
-        'jobs_created': [],
-        'revenue_generated': [],
-        'projects_completed': []
+    return {
+        'periods': [period.strftime('%Y-%m') for period in periods],
+        'projects_created': [int(value) for value in values['projects.created']],
+        'projects_launched': [int(value) for value in values['projects.launched']],
+        'mentorship_sessions': [int(value) for value in values['mentorship.sessions_completed']],
+        'mentorship_hours': [round(value / 60, 1) for value in values['mentorship.minutes']]
     }
-    
-    for period_start, period_end in periods:
-        # Empleos creados en el período
-        jobs = (
-            db.session.query(func.sum(Project.jobs_created))
-            .filter(
-                Project.is_public == True,
-                Project.status == 'completed',
-                Project.completed_at >= period_start,
-                Project.completed_at <= period_end
-            )
-            .scalar() or 0
-        )
-        trends['jobs_created'].append(int(jobs))
-        
-        # Ingresos generados
-        revenue = (
-            db.session.query(func.sum(Project.revenue_generated))
-            .filter(
-                Project.is_public == True,
-                Project.status == 'completed',
-                Project.completed_at >= period_start,
-                Project.completed_at <= period_end
-            )
-            .scalar() or 0
-        )
-        trends['revenue_generated'].append(float(revenue))
-        
-        # Proyectos completados
-        projects = (
-            Project.query
-            .filter(
-                Project.is_public == True,
-                Project.status == 'completed',
-                Project.completed_at >= period_start,
-                Project.completed_at <= period_end
-            )
-            .count()
-        )
-        trends['projects_completed'].append(projects)
-    
-    return trends
 
 
 def _get_program_impact(start_date, end_date, permissions):
@@ -1229,31 +1192,14 @@ def _get_revenue_generated(start_date, end_date):
 
 
 def _get_training_sessions_count(start_date, end_date):
-    """Cuenta sesiones de capacitación."""
-    # En un sistema real, esto vendría de una tabla de capacitaciones
-    return (
-        MentorshipSession.query
-        .filter(
-            MentorshipSession.session_date >= start_date,
-            MentorshipSession.session_date <= end_date,
-            MentorshipSession.status == 'completed'
-        )
-        .count()
-    )
+    """Cuenta sesiones de mentoría completadas (agregados de métricas)."""
+    return int(MetricRollupService().total('mentorship.sessions_completed', start_date, end_date))
 
 
 def _get_mentorship_hours_count(start_date, end_date):
-    """Cuenta horas de mentoría."""
-    return (
-        db.session.query(func.sum(Meeting.duration_hours))
-        .filter(
-            Meeting.completed == True,
-            Meeting.date >= start_date,
-            Meeting.date <= end_date,
-            Meeting.activity_type == 'mentoring'
-        )
-        .scalar() or 0
-    )
+    """Cuenta horas de mentoría completadas (agregados de métricas)."""
+    minutes = MetricRollupService().total('mentorship.minutes', start_date, end_date)
+    return round(minutes / 60, 1)
 
 
 def _get_communities_reached_count(start_date, end_date):
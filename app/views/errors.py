@@ -245,7 +245,7 @@ class ErrorTracker:
         return self.notification_service
     
     def log_error(self, error_code: int, error: Exception = None, 
-                  additional_context: Dict = None) -> ErrorLog:
+                  additional_context: dict = None) -> ErrorLog:
         """Registra un error en la base de datos."""
         try:
             # Determinar severidad basada en el código
@@ -327,7 +327,7 @@ class ErrorTracker:
             return ErrorCategory.APPLICATION
     
     def _build_error_context(self, error: Exception = None, 
-                           additional_context: Dict = None) -> Dict:
+                           additional_context: dict = None) -> dict:
         """Construye contexto completo del error."""
         context = {
             'timestamp': datetime.now(timezone.utc).isoformat(),
@@ -381,7 +381,7 @@ class ErrorTracker:
         
         return context
     
-    def _sanitize_context(self, context: Dict) -> Dict:
+    def _sanitize_context(self, context: dict) -> dict:
         """Sanitiza datos sensibles del contexto."""
         sensitive_keys = [
             'password', 'token', 'secret', 'key', 'authorization',
@@ -88,6 +88,20 @@ class BaseConfig:
         'pool_size': int(os.environ.get('DB_POOL_SIZE', '5')),
     }
     
+    # Escritura diferida de auditoría y métricas (ActivityLog, AnalyticsMetric)
+    WRITE_BUFFER_ENABLED = os.environ.get('WRITE_BUFFER_ENABLED', 'True').lower() == 'true'
+    WRITE_BUFFER_MAX_SIZE = int(os.environ.get('WRITE_BUFFER_MAX_SIZE', '10000'))
+    WRITE_BUFFER_BATCH_SIZE = int(os.environ.get('WRITE_BUFFER_BATCH_SIZE', '500'))
+    WRITE_BUFFER_FLUSH_INTERVAL = float(os.environ.get('WRITE_BUFFER_FLUSH_INTERVAL', '1.0'))
+    
+    # Blueprints de áreas poco usadas: se importan al llegar la primera petición
+    # HTTP, de modo que Celery y los comandos CLI nunca los cargan
+    DEFERRED_BLUEPRINTS = [
+        name.strip() for name in
+        os.environ.get('DEFERRED_BLUEPRINTS', 'admin,ally,client').split(',')
+        if name.strip()
+    ]
+    
     # ========================================
     # CONFIGURACIÓN DE REDIS Y CACHE
     # ========================================
@@ -200,6 +214,11 @@ class BaseConfig:
     PASSWORD_REQUIRE_SYMBOLS = os.environ.get('PASSWORD_REQUIRE_SYMBOLS', 'True').lower() == 'true'
     PASSWORD_BLACKLIST_COMMON = os.environ.get('PASSWORD_BLACKLIST_COMMON', 'True').lower() == 'true'
     PASSWORD_CHECK_BREACHED = os.environ.get('PASSWORD_CHECK_BREACHED', 'False').lower() == 'true'
+    # Hashing de contraseñas en pool de procesos (ver app.services.password_hashing)
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt')
+    PASSWORD_HASH_POOL_SIZE = int(os.environ['PASSWORD_HASH_POOL_SIZE']) if os.environ.get('PASSWORD_HASH_POOL_SIZE') else None
+    PASSWORD_HASH_MAX_PENDING = int(os.environ['PASSWORD_HASH_MAX_PENDING']) if os.environ.get('PASSWORD_HASH_MAX_PENDING') else None
+    PASSWORD_HASH_ADMISSION_TIMEOUT = float(os.environ.get('PASSWORD_HASH_ADMISSION_TIMEOUT', '2.0'))
     
     # Configuración SSL/HTTPS
     SSL_REDIRECT = os.environ.get('SSL_REDIRECT', 'False').lower() == 'true'
@@ -358,6 +377,17 @@ class BaseConfig:
     SOCKETIO_REDIS_URL = REDIS_URL
     SOCKETIO_CORS_ALLOWED_ORIGINS = CORS_ORIGINS
     
+    # Modo cluster: varios workers comparten cola de mensajes y estado en Redis
+    SOCKETIO_CLUSTER_MODE = os.environ.get('SOCKETIO_CLUSTER_MODE', 'False').lower() == 'true'
+    SOCKETIO_MESSAGE_QUEUE = SOCKETIO_REDIS_URL if SOCKETIO_CLUSTER_MODE else None
+    SOCKETIO_CHANNEL = os.environ.get('SOCKETIO_CHANNEL', 'ecosistema-socketio')
+    SOCKETIO_STATE_BACKEND = 'redis' if SOCKETIO_CLUSTER_MODE else 'memory'
+    SOCKETIO_STATE_PREFIX = 'socket:'
+    
+    # Presencia: TTL renovado por heartbeat y coalescencia de deltas por tick
+    SOCKETIO_PRESENCE_TTL = int(os.environ.get('SOCKETIO_PRESENCE_TTL', 90))
+    SOCKETIO_PRESENCE_TICK = float(os.environ.get('SOCKETIO_PRESENCE_TICK', 0.25))
+    
     # ========================================
     # CONFIGURACIÓN DE LOGGING
     # ========================================
@@ -382,6 +412,13 @@ class BaseConfig:
     METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'True').lower() == 'true'
     METRICS_RETENTION_DAYS = int(os.environ.get('METRICS_RETENTION_DAYS', '90'))
     
+    # Archivado de tablas de alto volumen (ver app.services.data_archive)
+    DATA_ARCHIVE_DIR = os.environ.get('DATA_ARCHIVE_DIR', 'archives')
+    DATA_ARCHIVE_BATCH_SIZE = int(os.environ.get('DATA_ARCHIVE_BATCH_SIZE', '1000'))
+    DATA_ARCHIVE_BATCH_PAUSE = float(os.environ.get('DATA_ARCHIVE_BATCH_PAUSE', '0.1'))
+    DATA_ARCHIVE_SEGMENT_ROWS = int(os.environ.get('DATA_ARCHIVE_SEGMENT_ROWS', '50000'))
+    DATA_ARCHIVE_MAX_ROWS_PER_RUN = int(os.environ.get('DATA_ARCHIVE_MAX_ROWS_PER_RUN', '500000'))
+    
     # Health checks
     HEALTH_CHECK_ENABLED = os.environ.get('HEALTH_CHECK_ENABLED', 'True').lower() == 'true'
     
@@ -414,6 +451,14 @@ class BaseConfig:
     
     # Configuración de documentos
     DOCUMENT_RETENTION_YEARS = int(os.environ.get('DOCUMENT_RETENTION_YEARS', '7'))
+    # Claves maestras de las KEK de documentos ("id:clave,id:clave"); la de
+    # DOCUMENT_MASTER_KEY_ID envuelve las claves nuevas y las demás siguen
+    # descifrando. DOCUMENT_MASTER_KEY (una sola clave) equivale a "v1:clave".
+    DOCUMENT_MASTER_KEYS = os.environ.get('DOCUMENT_MASTER_KEYS')
+    DOCUMENT_MASTER_KEY = os.environ.get('DOCUMENT_MASTER_KEY')
+    DOCUMENT_MASTER_KEY_ID = os.environ.get('DOCUMENT_MASTER_KEY_ID')
+    DOCUMENT_KEY_CACHE_SIZE = int(os.environ.get('DOCUMENT_KEY_CACHE_SIZE', '256'))
+    DOCUMENT_KEY_CACHE_TTL = float(os.environ.get('DOCUMENT_KEY_CACHE_TTL', '900'))
     AUTO_BACKUP_ENABLED = os.environ.get('AUTO_BACKUP_ENABLED', 'True').lower() == 'true'
     
     # Configuración de reportes
@@ -437,6 +482,8 @@ class BaseConfig:
     # API de conversión de monedas
     CURRENCY_API_KEY = os.environ.get('CURRENCY_API_KEY')
     CURRENCY_API_PROVIDER = os.environ.get('CURRENCY_API_PROVIDER', 'fixer')
+    CURRENCY_USE_STATIC_RATES = os.environ.get('CURRENCY_USE_STATIC_RATES', 'false').lower() == 'true'
+    CURRENCY_MATRIX_DURATION = int(os.environ.get('CURRENCY_MATRIX_DURATION', str(6 * 3600)))
     
     # ========================================
     # CONFIGURACIÓN DE MANTENIMIENTO
@@ -310,6 +310,9 @@ class DockerConfig(BaseConfig):
     SOCKETIO_REDIS_URL = REDIS_URL
     SOCKETIO_CORS_ALLOWED_ORIGINS = CORS_ORIGINS
     SOCKETIO_LOGGER = os.environ.get('SOCKETIO_LOGGER', 'False').lower() == 'true'
+    SOCKETIO_CLUSTER_MODE = os.environ.get('SOCKETIO_CLUSTER_MODE', 'True').lower() == 'true'
+    SOCKETIO_MESSAGE_QUEUE = SOCKETIO_REDIS_URL if SOCKETIO_CLUSTER_MODE else None
+    SOCKETIO_STATE_BACKEND = 'redis' if SOCKETIO_CLUSTER_MODE else 'memory'
     SOCKETIO_ENGINEIO_LOGGER = os.environ.get('SOCKETIO_ENGINEIO_LOGGER', 'False').lower() == 'true'
     
     # Configuración específica para containers
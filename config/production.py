@@ -335,6 +335,11 @@ class ProductionConfig(BaseConfig):
     SOCKETIO_REDIS_URL = REDIS_URL
     SOCKETIO_CORS_ALLOWED_ORIGINS = CORS_ORIGINS
     SOCKETIO_LOGGER = False  # Sin logging verboso en producción
+    
+    # Varios workers de WebSockets detrás del balanceador
+    SOCKETIO_CLUSTER_MODE = os.environ.get('SOCKETIO_CLUSTER_MODE', 'True').lower() == 'true'
+    SOCKETIO_MESSAGE_QUEUE = SOCKETIO_REDIS_URL if SOCKETIO_CLUSTER_MODE else None
+    SOCKETIO_STATE_BACKEND = 'redis' if SOCKETIO_CLUSTER_MODE else 'memory'
     SOCKETIO_ENGINEIO_LOGGER = False
     
     # Configuración avanzada de WebSockets
@@ -581,6 +586,9 @@ class ProductionConfig(BaseConfig):
         if missing_vars:
             raise ValueError(f"Variables críticas faltantes en producción: {', '.join(missing_vars)}")
         
+        if not (cls.DOCUMENT_MASTER_KEYS or cls.DOCUMENT_MASTER_KEY):
+            raise ValueError("DOCUMENT_MASTER_KEYS es requerida en producción")
+        
         # Validaciones adicionales
         if len(cls.SECRET_KEY) < 32:
             raise ValueError("SECRET_KEY debe tener al menos 32 caracteres en producción")
@@ -56,6 +56,7 @@ class TestingConfig(BaseConfig):
     
     # Configuración de aplicación para testing
     SECRET_KEY = 'testing-secret-key-not-for-production-use-12345678'
+    DOCUMENT_MASTER_KEYS = 'test:testing-document-master-key-not-for-production'
     SERVER_NAME = 'localhost.localdomain'
     PREFERRED_URL_SCHEME = 'http'  # HTTP para simplicidad en testing
     
@@ -93,6 +94,12 @@ class TestingConfig(BaseConfig):
         'strategy': 'mock' if DATABASE_URL.startswith('sqlite:///:memory:') else 'plain',
     }
     
+    # Auditoría y métricas síncronas: los tests consultan lo que acaban de registrar
+    WRITE_BUFFER_ENABLED = False
+    
+    # Todas las rutas registradas desde el inicio (url_for antes de la primera petición)
+    DEFERRED_BLUEPRINTS = []
+    
     # ========================================
     # CONFIGURACIÓN DE REDIS Y CACHE TESTING
     # ========================================
@@ -176,6 +183,7 @@ class TestingConfig(BaseConfig):
     PASSWORD_REQUIRE_LOWERCASE = False
     PASSWORD_REQUIRE_NUMBERS = False
     PASSWORD_REQUIRE_SYMBOLS = False
+    PASSWORD_HASH_POOL_SIZE = 0  # Hashing en el hilo del test, sin procesos
     
     # ========================================
     # CONFIGURACIÓN DE EMAIL TESTING
@@ -198,6 +206,13 @@ class TestingConfig(BaseConfig):
     # Email verification deshabilitada para testing
     EMAIL_VERIFICATION_REQUIRED = False
     
+    # ========================================
+    # CONFIGURACIÓN DE MONEDAS TESTING
+    # ========================================
+    
+    # Tasas locales fijas, sin llamadas a APIs externas
+    CURRENCY_USE_STATIC_RATES = True
+    
     # ========================================
     # CONFIGURACIÓN DE SMS TESTING
     # ========================================
@@ -232,6 +247,9 @@ class TestingConfig(BaseConfig):
     SOCKETIO_ENABLED = True
     SOCKETIO_ASYNC_MODE = 'threading'  # Threading para testing
     SOCKETIO_REDIS_URL = None  # Sin Redis para WebSockets en testing
+    SOCKETIO_CLUSTER_MODE = False
+    SOCKETIO_MESSAGE_QUEUE = None
+    SOCKETIO_STATE_BACKEND = 'memory'
     SOCKETIO_LOGGER = False
     SOCKETIO_ENGINEIO_LOGGER = False
     
@@ -0,0 +1,154 @@
+"""
+Claves foráneas GUID hacia tablas con clave primaria GUID
+
+Ecosistema de Emprendimiento - Database Migration
+================================================
+
+Revision ID: 3f2a9c1d7b64
+Revises:
+Create Date: 2026-10-18 23:45:00
+Migration Type: Manual
+Author: Sistema Automático
+Environment: development
+
+Description:
+Las claves primarias de ``BaseModel`` son GUID (UUID en PostgreSQL), pero
+varias claves foráneas se declaraban como Integer. Esta migración las pasa a
+UUID para que las uniones y las restricciones de integridad funcionen.
+
+Schema Changes Summary:
+- Tables: documents, meetings, mentorship_relationships, projects, tasks,
+  task_assignees, task_dependencies
+- Columns: ver ``GUID_FOREIGN_KEYS``
+- Indexes: sin cambios
+- Constraints: claves foráneas de las columnas convertidas
+
+Migration Safety Level: MEDIUM
+
+Prerequisites:
+- Database backup completed: Yes
+- Downtime required: No
+- Data migration needed: No
+
+Rollback Instructions:
+- Un valor entero nunca pudo referenciar una clave primaria UUID: las
+  columnas opcionales con valor se vacían y la migración se detiene si una
+  columna obligatoria tiene filas (hay que revisarlas antes a mano).
+- El rollback vuelve a Integer y vacía las columnas opcionales.
+"""
+
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect, text
+from sqlalchemy.dialects import postgresql
+
+# ============================================================================
+# CONFIGURACIÓN DE LOGGING
+# ============================================================================
+
+logger = logging.getLogger('alembic.migration.3f2a9c1d7b64')
+
+# ============================================================================
+# METADATA DE LA MIGRACIÓN
+# ============================================================================
+
+# revision identifiers, used by Alembic.
+revision = '3f2a9c1d7b64'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# (tabla, columna, tabla referenciada, obligatoria)
+GUID_FOREIGN_KEYS = [
+    ('documents', 'project_id', 'projects', False),
+    ('meetings', 'organizer_id', 'users', True),
+    ('meetings', 'project_id', 'projects', False),
+    ('mentorship_relationships', 'mentor_id', 'allies', True),
+    ('mentorship_relationships', 'mentee_id', 'entrepreneurs', True),
+    ('projects', 'entrepreneur_id', 'entrepreneurs', True),
+    ('tasks', 'parent_task_id', 'tasks', False),
+    ('tasks', 'parent_recurring_task_id', 'tasks', False),
+    ('tasks', 'project_id', 'projects', False),
+    ('task_assignees', 'task_id', 'tasks', True),
+    ('task_assignees', 'user_id', 'users', True),
+    ('task_dependencies', 'dependent_task_id', 'tasks', True),
+    ('task_dependencies', 'prerequisite_task_id', 'tasks', True),
+]
+
+
+# ============================================================================
+# UTILIDADES DE MIGRACIÓN
+# ============================================================================
+
+def _drop_foreign_keys(inspector, table: str, column: str) -> None:
+    """Eliminar las claves foráneas existentes sobre la columna."""
+    for foreign_key in inspector.get_foreign_keys(table):
+        if foreign_key['constrained_columns'] == [column] and foreign_key.get('name'):
+            op.drop_constraint(foreign_key['name'], table, type_='foreignkey')
+
+
+def _ensure_convertible(table: str, column: str, required: bool) -> None:
+    """Una columna obligatoria con filas no se puede convertir sin revisar los datos."""
+    if not required:
+        return
+    rows = op.get_bind().execute(text(f'SELECT COUNT(*) FROM {table}')).scalar()
+    if rows:
+        raise RuntimeError(
+            f"{table}.{column} es obligatoria y tiene {rows} filas con enteros que no "
+            f"referencian ninguna clave UUID; revísalas antes de migrar"
+        )
+
+
+def _existing(inspector, table: str, column: str) -> bool:
+    return table in inspector.get_table_names() and any(
+        existing['name'] == column for existing in inspector.get_columns(table)
+    )
+
+
+# ============================================================================
+# FUNCIÓN DE UPGRADE
+# ============================================================================
+
+def upgrade() -> None:
+    """Convertir las claves foráneas Integer a UUID y recrear sus restricciones."""
+    inspector = inspect(op.get_bind())
+
+    for table, column, referenced, required in GUID_FOREIGN_KEYS:
+        if not _existing(inspector, table, column):
+            continue
+        _ensure_convertible(table, column, required)
+        _drop_foreign_keys(inspector, table, column)
+        op.alter_column(
+            table, column,
+            type_=postgresql.UUID(),
+            existing_type=sa.Integer(),
+            existing_nullable=not required,
+            postgresql_using='NULL::uuid'
+        )
+        op.create_foreign_key(f'fk_{table}_{column}', table, referenced, [column], ['id'])
+        logger.info(f"✓ {table}.{column} convertida a UUID")
+
+
+# ============================================================================
+# FUNCIÓN DE DOWNGRADE
+# ============================================================================
+
+def downgrade() -> None:
+    """Volver a Integer (sin restricción: las claves primarias siguen siendo UUID)."""
+    inspector = inspect(op.get_bind())
+
+    for table, column, _referenced, required in reversed(GUID_FOREIGN_KEYS):
+        if not _existing(inspector, table, column):
+            continue
+        _ensure_convertible(table, column, required)
+        _drop_foreign_keys(inspector, table, column)
+        op.alter_column(
+            table, column,
+            type_=sa.Integer(),
+            existing_type=postgresql.UUID(),
+            existing_nullable=not required,
+            postgresql_using='NULL::integer'
+        )
+        logger.info(f"✓ {table}.{column} devuelta a Integer")
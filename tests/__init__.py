@@ -139,6 +139,14 @@ try:
     from app.extensions import db, mail, socketio
     from app.core.exceptions import ValidationError, AuthenticationError
     from app.utils.decorators import admin_required, entrepreneur_required
+    from app.models.user import User
+    from app.models.admin import Admin
+    from app.models.entrepreneur import Entrepreneur
+    from app.models.ally import Ally
+    from app.models.client import Client
+    from app.models.project import Project
+    from app.models.meeting import Meeting
+    from app.models.message import Message
     
     logger.info("✓ Imports principales completados")
     
@@ -238,7 +246,6 @@ class UserFactory(BaseFactory):
     """Factory para crear usuarios de prueba."""
     
     class Meta:
-        from app.models.user import User
         model = User
     
     id = factory.Sequence(lambda n: n)
@@ -264,7 +271,6 @@ class AdminUserFactory(UserFactory):
     """Factory para usuarios administradores."""
     
     class Meta:
-        from app.models.admin import Admin
         model = Admin
     
     role_type = 'admin'
@@ -277,7 +283,6 @@ class EntrepreneurFactory(BaseFactory):
     """Factory para emprendedores."""
     
     class Meta:
-        from app.models.entrepreneur import Entrepreneur
         model = Entrepreneur
     
     user = factory.SubFactory(UserFactory, role_type='entrepreneur')
@@ -294,7 +299,6 @@ class AllyFactory(BaseFactory):
     """Factory para aliados/mentores."""
     
     class Meta:
-        from app.models.ally import Ally
         model = Ally
     
     user = factory.SubFactory(UserFactory, role_type='ally')
@@ -310,7 +314,6 @@ class ClientFactory(BaseFactory):
     """Factory para clientes/stakeholders."""
     
     class Meta:
-        from app.models.client import Client
         model = Client
     
     user = factory.SubFactory(UserFactory, role_type='client')
@@ -328,7 +331,6 @@ class ProjectFactory(BaseFactory):
     """Factory para proyectos."""
     
     class Meta:
-        from app.models.project import Project
         model = Project
     
     entrepreneur = factory.SubFactory(EntrepreneurFactory)
@@ -346,7 +348,6 @@ class MeetingFactory(BaseFactory):
     """Factory para reuniones."""
     
     class Meta:
-        from app.models.meeting import Meeting
         model = Meeting
     
     title = factory.LazyAttribute(lambda obj: fake.sentence(nb_words=4))
@@ -366,7 +367,6 @@ class MessageFactory(BaseFactory):
     """Factory para mensajes."""
     
     class Meta:
-        from app.models.message import Message
         model = Message
     
     content = factory.LazyAttribute(lambda obj: fake.text(max_nb_chars=500))
@@ -0,0 +1,198 @@
+"""
+Integration tests for the shared socket state across several workers.
+
+Each worker is a separate process with its own RedisStateStore pointed at a
+throwaway local redis-server, as several Socket.IO workers would be. The
+server tests start one Socket.IO server per worker on the same Redis message
+queue and check that emits and state cross worker boundaries.
+"""
+
+import multiprocessing
+import queue
+import shutil
+import socket
+import subprocess
+import time
+
+import pytest
+
+pytestmark = [pytest.mark.integration, pytest.mark.slow]
+
+WORKERS = 4
+SERVER_WORKERS = 3
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_port(port, timeout=15):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise TimeoutError(f'worker on port {port} did not start')
+
+
+@pytest.fixture(scope='module')
+def redis_url():
+    """Start a throwaway redis-server for the module."""
+    if not shutil.which('redis-server'):
+        pytest.skip('redis-server not available')
+
+    port = _free_port()
+    process = subprocess.Popen(
+        ['redis-server', '--port', str(port), '--save', '', '--appendonly', 'no'],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    url = f'redis://127.0.0.1:{port}/0'
+
+    import redis
+    client = redis.from_url(url)
+    for _ in range(50):
+        try:
+            client.ping()
+            break
+        except redis.ConnectionError:
+            time.sleep(0.1)
+
+    yield url
+
+    process.terminate()
+    process.wait(timeout=5)
+
+
+def _worker(url, worker_id, barrier, results):
+    from app.sockets.state import RedisStateStore
+
+    store = RedisStateStore.from_url(url, prefix='test:')
+    barrier.wait()
+
+    # Every worker opens a tab for the same user
+    store.add_connection('42', '/chat', f'sid-{worker_id}')
+
+    # All of them compete for the same limit of 10 events
+    allowed = sum(store.hit_rate_limit('42:send_message', 10, 60) for _ in range(10))
+
+    # And for the same document version
+    store.init_room_state('document_7', {'content': '', 'version': 1})
+    won = store.bump_room_version('document_7', 1) is not None
+
+    results.put((worker_id, allowed, won))
+
+
+def _serve(url, port):
+    """One Socket.IO worker: its own server, sharing the message queue and the state store."""
+    from flask import Flask, request
+    from flask_socketio import SocketIO, join_room
+    from app.sockets.state import RedisStateStore
+
+    app = Flask(__name__)
+    socketio = SocketIO(app, message_queue=url, channel='test-socketio', async_mode='threading')
+    store = RedisStateStore.from_url(url, prefix='test-server:')
+
+    @socketio.on('connect')
+    def on_connect(auth):
+        store.add_connection(auth['user_id'], '/', request.sid)
+
+    @socketio.on('join')
+    def on_join(data):
+        join_room(data['room'])
+        return port
+
+    @socketio.on('shout')
+    def on_shout(data):
+        # Delivered through the message queue to the room's clients on every worker
+        socketio.emit('news', {'text': data['text'], 'from_port': port}, room=data['room'])
+
+    @socketio.on('connections')
+    def on_connections(data):
+        return store.connection_count(data['user_id'])
+
+    socketio.run(app, host='127.0.0.1', port=port, allow_unsafe_werkzeug=True)
+
+
+@pytest.fixture(scope='module')
+def server_ports(redis_url):
+    """Start one Socket.IO server process per worker."""
+    ctx = multiprocessing.get_context('spawn')
+    ports = [_free_port() for _ in range(SERVER_WORKERS)]
+    processes = [ctx.Process(target=_serve, args=(redis_url, port), daemon=True) for port in ports]
+    for process in processes:
+        process.start()
+
+    try:
+        for port in ports:
+            _wait_for_port(port)
+        yield ports
+    finally:
+        for process in processes:
+            process.terminate()
+            process.join(timeout=5)
+
+
+@pytest.fixture(scope='module')
+def clients(server_ports):
+    """One client per worker, all joined to the same room, collecting 'news' events."""
+    import socketio
+
+    connected = []
+    for port in server_ports:
+        client = socketio.Client(reconnection=False)
+        client.received = queue.Queue()
+        client.on('news', client.received.put)
+        client.connect(f'http://127.0.0.1:{port}', auth={'user_id': '42'},
+                       transports=['polling'], wait_timeout=10)
+        assert client.call('join', {'room': 'document_7'}, timeout=10) == port
+        connected.append(client)
+
+    yield connected
+
+    for client in connected:
+        client.disconnect()
+
+
+class TestSocketCluster:
+    """Test cluster-wide socket state with several worker processes."""
+
+    def test_state_is_shared_across_workers(self, redis_url):
+        """Test that limits, connections and versions are enforced cluster-wide."""
+        from app.sockets.state import RedisStateStore
+
+        ctx = multiprocessing.get_context('spawn')
+        barrier = ctx.Barrier(WORKERS)
+        results = ctx.Queue()
+        processes = [ctx.Process(target=_worker, args=(redis_url, i, barrier, results)) for i in range(WORKERS)]
+        for process in processes:
+            process.start()
+        outcomes = [results.get(timeout=30) for _ in processes]
+        for process in processes:
+            process.join(timeout=10)
+
+        store = RedisStateStore.from_url(redis_url, prefix='test:')
+
+        assert sum(allowed for _, allowed, _ in outcomes) == 10
+        assert sum(won for _, _, won in outcomes) == 1
+        assert store.connection_count('42', '/chat') == WORKERS
+        assert store.get_room_state('document_7')['version'] == 2
+
+        store.remove_connection('42', '/chat', 'sid-0')
+        assert store.connection_count('42') == WORKERS - 1
+
+    def test_emit_reaches_clients_on_every_worker(self, clients, server_ports):
+        """Test a room emit on one worker is delivered to the room's clients on all workers."""
+        clients[0].emit('shout', {'room': 'document_7', 'text': 'hello'})
+
+        for client in clients:
+            event = client.received.get(timeout=10)
+            assert event == {'text': 'hello', 'from_port': server_ports[0]}
+
+    def test_connections_are_counted_across_workers(self, clients):
+        """Test every worker sees the connections registered by the others."""
+        for client in clients:
+            assert client.call('connections', {'user_id': '42'}, timeout=10) == SERVER_WORKERS
@@ -0,0 +1,76 @@
+"""
+Startup regression tests: cold-start time, resident memory and heavy imports.
+
+Each check runs the startup in a fresh interpreter (see
+app.utils.startup_profile). Budgets can be tuned per environment with
+STARTUP_MAX_SECONDS and STARTUP_MAX_RSS_MB.
+"""
+
+import os
+import re
+
+import pytest
+
+from app.utils.startup_profile import profile_startup
+
+pytestmark = [pytest.mark.integration, pytest.mark.slow]
+
+MAX_SECONDS = float(os.environ.get('STARTUP_MAX_SECONDS', '6.0'))
+MAX_RSS_MB = float(os.environ.get('STARTUP_MAX_RSS_MB', '350'))
+
+# Dependencias que solo se usan en informes, gráficos y exportaciones
+MUST_STAY_LAZY = {'plotly', 'matplotlib', 'mixpanel', 'amplitude', 'magic'}
+
+# A missing module from these packages is a bug, not an optional dependency
+FIRST_PARTY = {'app', 'config'}
+MISSING_MODULE = re.compile(r"ModuleNotFoundError: No module named '([\w.]+)'")
+
+
+def _profile_or_skip(target, **kwargs):
+    """
+    Profile a startup target, skipping only when an optional dependency is missing.
+
+    A third-party package that is not installed here says nothing about the
+    budgets, so the checks are skipped with the missing module as reason.
+    Any other crash while booting, a missing module inside the app itself
+    and a timeout all fail.
+    """
+    profile = profile_startup(target, **kwargs)
+    if not profile.ok:
+        missing = MISSING_MODULE.search(profile.error or '')
+        if missing and missing.group(1).split('.')[0] not in FIRST_PARTY:
+            pytest.skip(f"'{target}' needs '{missing.group(1)}', which is not installed here")
+    assert profile.ok, profile.error
+    return profile
+
+
+@pytest.fixture(scope='module')
+def app_profile():
+    """Profile create_app with the production blueprint deferral."""
+    return _profile_or_skip('app', env={'DEFERRED_BLUEPRINTS': 'admin,ally,client'})
+
+
+def test_create_app_cold_start_within_budget(app_profile):
+    """Test that create_app stays within the cold-start time budget."""
+    assert app_profile.seconds <= MAX_SECONDS, (
+        f'create_app took {app_profile.seconds:.2f}s (budget {MAX_SECONDS}s); '
+        f'slowest imports: {[record.module for record in app_profile.slowest(10)]}'
+    )
+
+
+def test_create_app_memory_within_budget(app_profile):
+    """Test that create_app stays within the resident memory budget."""
+    assert app_profile.max_rss_mb <= MAX_RSS_MB, (
+        f'create_app peaked at {app_profile.max_rss_mb:.0f} MB (budget {MAX_RSS_MB} MB)'
+    )
+
+
+def test_create_app_does_not_import_report_dependencies(app_profile):
+    """Test that reporting and export dependencies are imported on first use only."""
+    assert not MUST_STAY_LAZY & set(app_profile.heavy_modules)
+
+
+def test_celery_app_does_not_import_report_dependencies():
+    """Test that loading the Celery app does not pull in reporting dependencies."""
+    profile = _profile_or_skip('celery')
+    assert not MUST_STAY_LAZY & set(profile.heavy_modules)
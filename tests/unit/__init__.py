@@ -66,7 +66,7 @@ from faker import Faker
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker, scoped_session
 from sqlalchemy.pool import StaticPool
-from sqlalchemy.exc import IntegrityError, ValidationError
+from sqlalchemy.exc import IntegrityError
 
 # Framework base imports
 from tests import (
@@ -0,0 +1,31 @@
+"""
+Fixtures for unit tests that need the real models on a database.
+
+The session-wide ``app``/``db`` fixtures in tests/conftest.py are mocks;
+``model_db`` binds the real ``db`` extension to an in-memory SQLite
+database with every model table created, without booting create_app.
+"""
+
+import pytest
+
+
+@pytest.fixture
+def model_db():
+    """Real models on a fresh in-memory SQLite database."""
+    from flask import Flask
+    from app.extensions import db
+    import app.models  # noqa: F401 - registers every table
+
+    flask_app = Flask(__name__)
+    flask_app.config.update(
+        SQLALCHEMY_DATABASE_URI='sqlite://',
+        SQLALCHEMY_TRACK_MODIFICATIONS=False,
+        TESTING=True
+    )
+    db.init_app(flask_app)
+
+    with flask_app.app_context():
+        db.create_all()
+        yield db
+        db.session.remove()
+        db.drop_all()
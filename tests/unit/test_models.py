@@ -75,4 +75,383 @@ class TestProjectModel:
         ]
         
         for status in valid_statuses:
-            assert status in valid_statuses
\ No newline at end of file
+            assert status in valid_statuses
+
+class TestBatchStats:
+    """serialize_batch(include_stats=True) runs one query per stat, not per row."""
+    
+    def _seed(self, db):
+        """Three entrepreneurs with projects, two allies with mentorships."""
+        import uuid
+        from datetime import timedelta
+        from app.models.user import User
+        from app.models.entrepreneur import Entrepreneur
+        from app.models.ally import Ally
+        from app.models.project import Project, ProjectStatus, ProjectType
+        from app.models.task import Task, TaskStatus
+        from app.models.document import Document, DocumentType
+        from app.models.meeting import Meeting, MeetingType
+        from app.models.mentorship import MentorshipRelationship, MentorshipStatus
+        
+        def insert(model, rows):
+            db.session.execute(model.__table__.insert(), rows)
+        
+        ids = {key: uuid.UUID(int=key) for key in range(1, 9)}
+        
+        insert(User, [
+            {'id': ids[user_id], 'email': f'user{user_id}@test.com', 'password_hash': 'x',
+             'first_name': 'Test', 'last_name': str(user_id), 'role': role}
+            for user_id, role in [(1, 'entrepreneur'), (2, 'entrepreneur'), (3, 'entrepreneur'),
+                                  (4, 'ally'), (5, 'ally')]
+        ])
+        insert(Entrepreneur, [{'id': ids[key], 'joined_ecosystem_at': None} for key in (1, 2, 3)])
+        insert(Ally, [{'id': ids[key], 'joined_as_ally_at': None} for key in (4, 5)])
+        
+        statuses = {6: ProjectStatus.DEVELOPMENT, 7: ProjectStatus.IDEA, 8: ProjectStatus.LAUNCH}
+        insert(Project, [
+            {'id': ids[project_id], 'name': f'Project {project_id}', 'slug': f'project-{project_id}',
+             'project_type': ProjectType.STARTUP, 'entrepreneur_id': ids[owner],
+             'status': statuses[project_id], 'is_deleted': False}
+            for project_id, owner in [(6, 1), (7, 1), (8, 2)]
+        ])
+        insert(Task, [
+            {'title': title, 'creator_id': 1, 'project_id': ids[project_id],
+             'status': status, 'is_deleted': deleted}
+            for title, project_id, status, deleted in [
+                ('Done', 6, TaskStatus.COMPLETED, False),
+                ('Open', 6, TaskStatus.NOT_STARTED, False),
+                ('Gone', 6, TaskStatus.COMPLETED, True),
+                ('Other', 8, TaskStatus.NOT_STARTED, False)
+            ]
+        ])
+        insert(Document, [
+            {'title': 'Plan', 'document_type': DocumentType.BUSINESS_PLAN, 'owner_id': 1,
+             'filename': 'plan.pdf', 'project_id': ids[7], 'is_deleted': False}
+        ])
+        start = datetime(2026, 1, 5, 10)
+        insert(Meeting, [
+            {'title': 'Kickoff', 'meeting_type': MeetingType.TEAM, 'organizer_id': ids[4], 'project_id': ids[6],
+             'scheduled_start': start, 'scheduled_end': start + timedelta(hours=1), 'is_deleted': False}
+        ])
+        insert(MentorshipRelationship, [
+            {'mentor_id': ids[mentor], 'mentee_id': ids[mentee], 'status': status}
+            for mentor, mentee, status in [
+                (4, 1, MentorshipStatus.ACTIVE),
+                (4, 2, MentorshipStatus.COMPLETED),
+                (5, 1, MentorshipStatus.ACTIVE)
+            ]
+        ])
+        db.session.commit()
+    
+    def _serialize(self, model, db):
+        import uuid
+        from app.utils.query_counter import assert_max_queries
+        
+        instances = model.query.order_by(model.id).all()
+        with assert_max_queries(len(model.batch_stat_queries())):
+            data = model.serialize_batch(instances, include_stats=True)
+        
+        per_row = []
+        for instance in instances:
+            db.session.expire(instance)
+            per_row.append(instance.to_dict(include_stats=True)['stats'])
+        assert [item['stats'] for item in data] == per_row
+        return {uuid.UUID(str(item['id'])).int: item['stats'] for item in data}
+    
+    def test_entrepreneur_page(self, model_db):
+        """Entrepreneur stats batch-load and match the per-row values."""
+        from app.models.entrepreneur import Entrepreneur
+        self._seed(model_db)
+        
+        stats = self._serialize(Entrepreneur, model_db)
+        assert stats[1]['active_projects_count'] == 1
+        assert stats[1]['total_projects_count'] == 2
+        assert stats[1]['mentorships_count'] == 2
+        assert stats[2]['active_projects_count'] == 1
+        assert stats[3]['total_projects_count'] == 0
+    
+    def test_ally_page(self, model_db):
+        """Ally mentorship stats batch-load and match the per-row values."""
+        from app.models.ally import Ally
+        self._seed(model_db)
+        
+        stats = self._serialize(Ally, model_db)
+        assert stats[4] == {'active_mentorships_count': 1, 'total_mentorships_count': 2}
+        assert stats[5] == {'active_mentorships_count': 1, 'total_mentorships_count': 1}
+    
+    def test_project_page(self, model_db):
+        """Project stats skip soft-deleted rows and match the per-row values."""
+        from app.models.project import Project
+        self._seed(model_db)
+        
+        stats = self._serialize(Project, model_db)
+        assert stats[6] == {'tasks_count': 2, 'completed_tasks_count': 1,
+                            'documents_count': 0, 'meetings_count': 1}
+        assert stats[7]['documents_count'] == 1
+        assert stats[8]['tasks_count'] == 1
+
+
+class TestTaskDependencyGraph:
+    """Dependency checks see chains that leave the task's project."""
+    
+    def test_cycle_through_another_project_is_rejected(self, model_db):
+        """self(P) -> X(Q) -> Y(Q): adding Y -> self closes a cycle."""
+        import uuid
+        from app.core.exceptions import ValidationError
+        from app.models.task import Task, task_dependencies
+        
+        project_p, project_q = uuid.uuid4(), uuid.uuid4()
+        ids = {name: uuid.uuid4() for name in ('self', 'x', 'y')}
+        model_db.session.execute(Task.__table__.insert(), [
+            {'id': ids[name], 'title': name, 'creator_id': 1, 'project_id': project}
+            for name, project in [('self', project_p), ('x', project_q), ('y', project_q)]
+        ])
+        model_db.session.execute(task_dependencies.insert(), [
+            {'prerequisite_task_id': ids['self'], 'dependent_task_id': ids['x']},
+            {'prerequisite_task_id': ids['x'], 'dependent_task_id': ids['y']}
+        ])
+        model_db.session.commit()
+        
+        assert Task.load_dependency_graph(project_p).descendants(ids['self']) == {ids['x'], ids['y']}
+        
+        task = model_db.session.get(Task, ids['self'])
+        with pytest.raises(ValidationError):
+            task.add_dependency(model_db.session.get(Task, ids['y']))
+
+
+class TestInboxIndex:
+    """The inbox index keeps unread counters current and renders an inbox in one query."""
+    
+    READER = 'reader'
+    SENDER = 'sender'
+    
+    def _ids(self):
+        import uuid
+        return {self.READER: uuid.UUID(int=1), self.SENDER: uuid.UUID(int=2)}
+    
+    def _seed_conversations(self, db, count):
+        """``count`` direct conversations between the reader and the sender."""
+        import uuid
+        from app.models.message import Conversation, ConversationType, conversation_participants
+        
+        users = self._ids()
+        conversation_ids = [uuid.UUID(int=1000 + index) for index in range(count)]
+        db.session.execute(Conversation.__table__.insert(), [
+            {'id': conversation_id, 'title': f'Chat {index}', 'conversation_type': ConversationType.DIRECT,
+             'creator_id': str(users[self.SENDER]), 'is_archived': False, 'is_deleted': False,
+             'last_activity_at': datetime(2026, 3, 1, 9, index % 60)}
+            for index, conversation_id in enumerate(conversation_ids)
+        ])
+        db.session.execute(conversation_participants.insert(), [
+            {'conversation_id': str(conversation_id), 'user_id': str(user_id), 'is_active': True}
+            for conversation_id in conversation_ids for user_id in users.values()
+        ])
+        return conversation_ids
+    
+    def _send(self, db, conversation_id, sender, created_at, number):
+        """Insert a message and record it in the index like the after_insert hook does."""
+        import uuid
+        from types import SimpleNamespace
+        from app.models.inbox import InboxIndex
+        from app.models.message import Message, MessageStatus, MessageType
+        
+        row = {'id': uuid.UUID(int=10_000 + number), 'conversation_id': str(conversation_id),
+               'sender_id': str(self._ids()[sender]), 'content': f'message {number}',
+               'message_type': MessageType.TEXT, 'status': MessageStatus.SENT,
+               'created_at': created_at, 'is_deleted': False}
+        db.session.execute(Message.__table__.insert(), [row])
+        InboxIndex.record_message(SimpleNamespace(**{**row, 'sender_id': self._ids()[sender]}))
+        return row['id']
+    
+    def test_two_hundred_conversation_inbox_is_one_query(self, model_db):
+        """get_user_conversations with summaries and get_unread_inbox each issue a single query."""
+        from app.models.inbox import InboxIndex
+        from app.models.message import Conversation
+        from app.utils.query_counter import assert_max_queries
+        
+        conversation_ids = self._seed_conversations(model_db, 200)
+        for number, conversation_id in enumerate(conversation_ids):
+            self._send(model_db, conversation_id, self.SENDER, datetime(2026, 3, 1, 10, number % 60), number)
+        assert InboxIndex.rebuild() == 400
+        model_db.session.commit()
+        # The participant table still keys users by Integer columns, so SQLite matches the text form
+        reader = str(self._ids()[self.READER])
+        
+        with assert_max_queries(1):
+            summaries = [conversation.get_conversation_summary(reader)
+                         for conversation in Conversation.get_user_conversations(reader)]
+        assert len(summaries) == 200
+        assert {summary['unread_count'] for summary in summaries} == {1}
+        assert summaries[0]['participant_count'] == 2
+        
+        with assert_max_queries(1):
+            inbox = InboxIndex.get_unread_inbox(reader, limit=200)
+        assert len(inbox) == 200
+        assert inbox[0]['total_unread'] == 200 and inbox[0]['threads_with_unread'] == 200
+        assert inbox[0]['last_message_preview'].startswith('message')
+    
+    def test_message_read_state_moves_the_counters(self, model_db):
+        """Per-message read and unread, deletion and mark-read keep the counter consistent."""
+        from datetime import timezone
+        from app.models.inbox import InboxIndex
+        from app.models.message import Message
+        
+        conversation_id, = self._seed_conversations(model_db, 1)
+        reader = self._ids()[self.READER]
+        for user_id in self._ids().values():
+            InboxIndex.add_participant(conversation_id, user_id)
+        InboxIndex.mark_read(conversation_id, reader, datetime(2026, 3, 1, tzinfo=timezone.utc))
+        
+        first, second, third = (
+            self._send(model_db, conversation_id, self.SENDER, datetime(2026, 3, 1, 10, minute), minute)
+            for minute in (1, 2, 3)
+        )
+        self._send(model_db, conversation_id, self.READER, datetime(2026, 3, 1, 10, 4), 4)
+        assert InboxIndex.get_unread_count(conversation_id, reader) == 3
+        
+        message = model_db.session.get(Message, second)
+        message.mark_as_read(reader)
+        assert InboxIndex.get_unread_count(conversation_id, reader) == 1
+        assert model_db.session.get(Message, first).is_read_by_user(reader)
+        assert not model_db.session.get(Message, third).is_read_by_user(reader)
+        
+        # Reading an older message never moves the read position back
+        model_db.session.get(Message, first).mark_as_read(reader)
+        assert InboxIndex.get_unread_count(conversation_id, reader) == 1
+        
+        model_db.session.get(Message, first).mark_as_unread(reader)
+        assert InboxIndex.get_unread_count(conversation_id, reader) == 3
+        
+        deleted = model_db.session.get(Message, third)
+        model_db.session.execute(Message.__table__.update().where(Message.__table__.c.id == third)
+                                 .values(is_deleted=True))
+        InboxIndex.record_deletion(deleted)
+        assert InboxIndex.get_unread_count(conversation_id, reader) == 2
+        assert InboxIndex.get_total_unread(reader) == 2
+        
+        InboxIndex.mark_read(conversation_id, reader)
+        assert InboxIndex.get_total_unread(reader) == 0
+        assert InboxIndex.get_unread_inbox(reader) == []
+
+
+class TestMessageHistory:
+    """Cursor paging over a conversation's history."""
+    
+    def _seed(self, db, count):
+        """``count`` messages, two per timestamp so pages split ties on created_at."""
+        import uuid
+        from app.models.message import Message, MessageStatus, MessageType
+        
+        conversation_id = uuid.UUID(int=500)
+        db.session.execute(Message.__table__.insert(), [
+            {'id': uuid.UUID(int=number), 'conversation_id': str(conversation_id), 'sender_id': None,
+             'content': f'message {number}', 'message_type': MessageType.TEXT, 'status': MessageStatus.SENT,
+             'created_at': datetime(2026, 3, 1, 10, number // 2), 'is_deleted': False, 'is_scheduled': False}
+            for number in range(1, count + 1)
+        ])
+        return str(conversation_id)
+    
+    def _contents(self, page):
+        return [int(message['content'].split()[1]) for message in page['messages']]
+    
+    def test_pages_backwards_and_forwards_without_gaps(self, model_db):
+        """Walking older then newer visits every message once, in chronological order."""
+        from app.models.message import Message
+        
+        conversation_id = self._seed(model_db, 11)
+        
+        page = Message.get_history(conversation_id, limit=4)
+        assert self._contents(page) == [8, 9, 10, 11] and page['has_older'] and not page['has_newer']
+        
+        seen = self._contents(page)
+        while page['before']:
+            page = Message.get_history(conversation_id, cursor=page['before'], limit=4)
+            seen = self._contents(page) + seen
+        assert seen == list(range(1, 12))
+        assert not page['has_older'] and page['has_newer']
+        
+        forward = []
+        while page['has_newer']:
+            page = Message.get_history(conversation_id, cursor=page['after'], direction='newer', limit=4)
+            forward.extend(self._contents(page))
+        assert forward == list(range(4, 12))
+        
+        # Past the newest message the cursor is kept so clients can poll for new ones
+        last = Message.get_history(conversation_id, cursor=page['after'], direction='newer', limit=4)
+        assert last['messages'] == [] and last['after'] == page['after']
+    
+    def test_malformed_cursor_is_rejected(self, model_db):
+        """A cursor without the (created_at, id) position raises InvalidCursorError, not KeyError."""
+        from app.models.message import Message
+        from app.utils.pagination import InvalidCursorError, encode_cursor
+        
+        conversation_id = self._seed(model_db, 3)
+        
+        for cursor in (encode_cursor({'id': 'x'}), encode_cursor({'created_at': 1}), 'garbage'):
+            with pytest.raises(InvalidCursorError):
+                Message.get_history(conversation_id, cursor=cursor)
+            with pytest.raises(InvalidCursorError):
+                Message.search_messages(conversation_id, cursor=cursor)
+
+
+class TestMeetingConflicts:
+    """Meeting.find_conflicts backs the availability checks of the meetings API."""
+    
+    ORGANIZER = 'organizer'
+    GUEST = 'guest'
+    FREE = 'free'
+    
+    def _ids(self):
+        import uuid
+        return {self.ORGANIZER: uuid.UUID(int=1), self.GUEST: uuid.UUID(int=2), self.FREE: uuid.UUID(int=3)}
+    
+    def _seed(self, db):
+        """The organizer runs three meetings; the guest attends two of them."""
+        import uuid
+        from app.models.meeting import Meeting, MeetingStatus, MeetingType, meeting_participants
+        from app.models.user import User
+        
+        users = self._ids()
+        db.session.execute(User.__table__.insert(), [
+            {'id': user_id, 'email': f'{name}@example.com', 'password_hash': 'x',
+             'first_name': name, 'last_name': 'Test', 'role': 'entrepreneur'}
+            for name, user_id in users.items()
+        ])
+        
+        def meeting(number, start_hour, end_hour, status=MeetingStatus.SCHEDULED):
+            return {'id': uuid.UUID(int=100 + number), 'title': f'Meeting {number}',
+                    'meeting_type': MeetingType.MENTORSHIP, 'status': status,
+                    'organizer_id': users[self.ORGANIZER], 'is_deleted': False,
+                    'scheduled_start': datetime(2026, 3, 2, start_hour),
+                    'scheduled_end': datetime(2026, 3, 2, end_hour)}
+        
+        meetings = [meeting(1, 9, 10), meeting(2, 11, 12), meeting(3, 10, 11, MeetingStatus.CANCELLED)]
+        db.session.execute(Meeting.__table__.insert(), meetings)
+        db.session.execute(meeting_participants.insert(), [
+            {'meeting_id': str(row['id']), 'user_id': str(users[self.GUEST])} for row in meetings[1:]
+        ])
+        db.session.commit()
+        return [row['id'] for row in meetings]
+    
+    def test_conflicts_for_organizers_and_participants(self, model_db):
+        """Only active meetings overlapping the window count, for organizers and participants alike."""
+        from app.models.meeting import Meeting
+        from app.utils.query_counter import assert_max_queries
+        
+        first, second, _cancelled = self._seed(model_db)
+        users = self._ids()
+        
+        with assert_max_queries(1):
+            conflicts = Meeting.find_conflicts(list(users.values()), datetime(2026, 3, 2, 9, 30),
+                                               datetime(2026, 3, 2, 11, 30))
+        
+        assert {user_id: [i.data['meeting_id'] for i in busy] for user_id, busy in conflicts.items()} == {
+            users[self.ORGANIZER]: [first, second],
+            users[self.GUEST]: [second]
+        }
+        
+        # Back-to-back meetings do not clash, and a meeting never clashes with itself
+        assert Meeting.find_conflicts([users[self.ORGANIZER]], datetime(2026, 3, 2, 10),
+                                      datetime(2026, 3, 2, 11)) == {}
+        assert Meeting.find_conflicts([users[self.GUEST]], datetime(2026, 3, 2, 11),
+                                      datetime(2026, 3, 2, 12), exclude_meeting_id=second) == {}
@@ -0,0 +1,1403 @@
+"""
+Unit tests for service helpers.
+"""
+
+from datetime import datetime
+
+import pytest
+
+
+class FakeCalendarSource:
+    """Fake calendar API returning canned pages keyed by sync token."""
+
+    def __init__(self, pages, expired_tokens=()):
+        self.pages = pages
+        self.expired_tokens = set(expired_tokens)
+        self.calls = []
+
+    def list_events(self, user_id, calendar_id, sync_token=None, page_token=None):
+        from app.services.calendar_sync import SyncTokenExpired
+
+        self.calls.append((sync_token, page_token))
+        if sync_token in self.expired_tokens:
+            raise SyncTokenExpired('410 Gone')
+        return self.pages[(sync_token, page_token)]
+
+
+class FakeSyncState:
+    """Minimal stand-in for the CalendarSync row."""
+
+    def __init__(self, sync_token=None):
+        self.sync_token = sync_token
+
+    def reset_token(self):
+        self.sync_token = None
+
+
+class TestCalendarSyncEngine:
+    """Test the calendar sync engine against a fake calendar API."""
+
+    def _engine(self, source):
+        from app.services.calendar_sync import CalendarSyncEngine
+        return CalendarSyncEngine(source, retry_scheduler=lambda *args: None)
+
+    def test_incremental_pull_follows_pages(self):
+        """Test that every page is fetched with the stored sync token."""
+        source = FakeCalendarSource({
+            ('token-1', None): {'items': [{'id': 'a'}], 'nextPageToken': 'p2'},
+            ('token-1', 'p2'): {'items': [{'id': 'b'}], 'nextSyncToken': 'token-2'}
+        })
+
+        events, next_token, full_sync = self._engine(source)._pull_changes(1, FakeSyncState('token-1'))
+
+        assert [e['id'] for e in events] == ['a', 'b']
+        assert next_token == 'token-2'
+        assert full_sync is False
+
+    def test_expired_token_falls_back_to_full_sync(self):
+        """Test that an invalidated token triggers a full pull."""
+        source = FakeCalendarSource(
+            {(None, None): {'items': [{'id': 'a'}], 'nextSyncToken': 'fresh'}},
+            expired_tokens=['stale']
+        )
+        state = FakeSyncState('stale')
+
+        events, next_token, full_sync = self._engine(source)._pull_changes(1, state)
+
+        assert full_sync is True
+        assert next_token == 'fresh'
+        assert state.sync_token is None
+
+    def test_retry_delay_backoff_is_bounded(self):
+        """Test exponential backoff grows and respects the cap."""
+        engine = self._engine(FakeCalendarSource({}))
+
+        assert 30 <= engine.retry_delay(0) <= 60
+        assert 120 <= engine.retry_delay(2) <= 240
+        assert engine.retry_delay(20) <= engine.max_retry_delay
+
+    def test_google_event_to_row(self):
+        """Test conversion of a Google event to meeting columns."""
+        from app.services.calendar_sync import google_event_to_row
+
+        row = google_event_to_row(7, 'primary', {
+            'id': 'evt',
+            'summary': 'Demo day',
+            'start': {'dateTime': '2025-01-15T10:00:00Z'},
+            'end': {'dateTime': '2025-01-15T11:30:00Z'},
+            'updated': '2025-01-10T08:00:00Z'
+        })
+
+        assert row['google_event_id'] == 'evt'
+        assert row['organizer_id'] == 7
+        assert row['duration_minutes'] == 90
+        assert row['scheduled_start'].tzinfo is None
+
+    def test_apply_changes_writes_to_the_database(self, model_db):
+        """Test inserts, updates and cancellations, and that re-applying a change set is a no-op."""
+        import uuid
+        from sqlalchemy import select
+        from app.models.meeting import Meeting, MeetingStatus
+
+        def event(event_id, updated, summary=None, status='confirmed'):
+            return {
+                'id': event_id,
+                'status': status,
+                'summary': summary or event_id,
+                'start': {'dateTime': '2025-01-15T10:00:00Z'},
+                'end': {'dateTime': '2025-01-15T11:00:00Z'},
+                'updated': updated
+            }
+
+        user_id = uuid.UUID(int=1)
+        engine = self._engine(FakeCalendarSource({}))
+
+        assert engine.apply_changes(user_id, [
+            event('a', '2025-01-10T08:00:00Z'),
+            event('b', '2025-01-10T08:00:00Z')
+        ]) == (2, 0, 0)
+        model_db.session.commit()
+
+        changes = [
+            event('a', '2025-01-11T08:00:00Z', summary='Renamed'),
+            event('b', '2025-01-11T08:00:00Z', status='cancelled'),
+            event('c', '2025-01-11T08:00:00Z')
+        ]
+        assert engine.apply_changes(user_id, changes) == (1, 1, 1)
+        model_db.session.commit()
+        assert engine.apply_changes(user_id, changes) == (0, 0, 0)
+        model_db.session.commit()
+
+        meetings = {
+            meeting.google_event_id: meeting
+            for meeting in model_db.session.execute(
+                select(Meeting).where(Meeting.organizer_id == user_id)
+            ).scalars()
+        }
+        assert sorted(meetings) == ['a', 'b', 'c']
+        assert meetings['a'].title == 'Renamed'
+        assert meetings['b'].status == MeetingStatus.CANCELLED
+        assert meetings['c'].status == MeetingStatus.SCHEDULED
+
+        # Restoring the event in Google brings the meeting back
+        assert engine.apply_changes(user_id, [event('b', '2025-01-12T08:00:00Z', summary='Restored')]) == (0, 1, 0)
+        model_db.session.commit()
+        restored = model_db.session.execute(
+            select(Meeting).where(Meeting.organizer_id == user_id, Meeting.google_event_id == 'b')
+        ).scalar_one()
+        model_db.session.refresh(restored)
+        assert restored.status == MeetingStatus.SCHEDULED
+        assert restored.title == 'Restored'
+
+
+class TestBulkNotificationGrouping:
+    """Test channel grouping for bulk notification dispatch."""
+
+    def test_groups_by_channel_with_preferences_and_defaults(self):
+        """Test recipients are grouped per channel using batch preferences."""
+        from app.services.notification_service import group_recipients_by_channel
+
+        preferences = {
+            1: {'email_enabled': False, 'sms_enabled': False, 'push_enabled': True},
+            2: {'email_enabled': True, 'sms_enabled': True, 'push_enabled': True},
+        }
+        groups = group_recipients_by_channel(
+            [(1, 'n1'), (2, 'n2'), (3, 'n3')], 'password_reset', preferences
+        )
+
+        assert groups == {'in_app': ['n1', 'n2', 'n3'], 'email': ['n2', 'n3']}
+
+    def test_sms_only_for_critical_types(self):
+        """Test SMS is only used for security alerts when enabled."""
+        from app.services.notification_service import channels_for_preferences
+
+        enabled = {'email_enabled': True, 'sms_enabled': True, 'push_enabled': True}
+
+        assert channels_for_preferences('security_alert', enabled) == ['in_app', 'sms']
+        assert channels_for_preferences('feature_announcement', enabled) == ['in_app']
+
+    def test_email_batch_marks_each_message_by_its_own_result(self):
+        """Test a partially failed email batch only reports the delivered notifications."""
+        from types import SimpleNamespace
+        from app.services.email import EmailResult, EmailService, SMTPProvider
+        from app.services.notification_service import NotificationService
+
+        class FlakySMTP(SMTPProvider):
+            def __init__(self):
+                self.sent = []
+
+            def send(self, message):
+                address = message.to[0].email
+                if address.startswith('bounce'):
+                    return EmailResult(success=False, error_message=f'{address}: rejected')
+                self.sent.append(address)
+                return EmailResult(success=True, message_id=f'id-{address}')
+
+        smtp = FlakySMTP()
+        email_service = EmailService.__new__(EmailService)
+        email_service._providers = {'smtp': smtp}
+        email_service._suppressed_emails = {'suppressed@test.com'}
+
+        service = NotificationService.__new__(NotificationService)
+        service._providers = {'email': SimpleNamespace(email_service=email_service)}
+
+        addresses = ['a@test.com', 'bounce@test.com', 'suppressed@test.com', 'b@test.com']
+        rows = [
+            (SimpleNamespace(id=f'n{index}', title='Hola', message='Mensaje', type='system'),
+             SimpleNamespace(id=index, email=address))
+            for index, address in enumerate(addresses)
+        ]
+
+        sent_ids, errors = service._deliver_email_batch(rows)
+
+        assert sent_ids == ['n0', 'n3']
+        assert smtp.sent == ['a@test.com', 'b@test.com']
+        assert errors == ['bounce@test.com: rejected']
+
+
+class TestMetricRollupService:
+    """Test metric rollups against a real database."""
+
+    # (created_at, is_public); the first and last rows fall outside the totals range
+    PROJECTS = [
+        ('2025-01-30 22:59', True),
+        ('2025-01-30 23:15', True),
+        ('2025-01-31 23:30', True),
+        ('2025-02-01 00:10', False),
+        ('2025-02-01 00:40', True),
+        ('2025-02-15 12:00', True),
+        ('2025-03-01 00:20', True),
+        ('2025-03-01 01:00', True)
+    ]
+
+    def _seed_projects(self, db, projects, updated_at=None):
+        import uuid
+        from datetime import datetime
+        from app.models.project import Project, ProjectType
+
+        rows = []
+        for created_at, is_public in projects:
+            created_at = datetime.strptime(created_at, '%Y-%m-%d %H:%M')
+            rows.append({
+                'id': uuid.uuid4(),
+                'name': 'Proyecto',
+                'slug': f'proyecto-{uuid.uuid4().hex}',
+                'project_type': ProjectType.STARTUP,
+                'entrepreneur_id': uuid.UUID(int=1),
+                'is_public': is_public,
+                'created_at': created_at,
+                'updated_at': updated_at or created_at
+            })
+        db.session.execute(Project.__table__.insert(), rows)
+        db.session.commit()
+
+    def _refresh(self, model_db):
+        from datetime import datetime
+        from app.services.metric_rollups import MetricRollupService
+
+        self._seed_projects(model_db, self.PROJECTS)
+        service = MetricRollupService()
+        service.refresh(datetime(2025, 1, 1), datetime(2025, 4, 1))
+        return service
+
+    def test_refresh_builds_hour_day_and_month_buckets(self, model_db):
+        """Test hours come from the source and days/months from the hours, split by visibility."""
+        from datetime import datetime
+        from sqlalchemy import select
+        from app.models.metric_rollup import MetricRollup
+
+        self._refresh(model_db)
+
+        rows = {
+            (row.granularity, row.bucket_start, row.is_public): row.value
+            for row in model_db.session.execute(
+                select(MetricRollup).where(MetricRollup.metric == 'projects.created')
+            ).scalars()
+        }
+        assert rows[('hour', datetime(2025, 2, 1, 0), True)] == 1
+        assert rows[('hour', datetime(2025, 2, 1, 0), False)] == 1
+        assert rows[('day', datetime(2025, 1, 30), True)] == 2
+        assert rows[('month', datetime(2025, 2, 1), True)] == 2
+        assert rows[('month', datetime(2025, 2, 1), False)] == 1
+        assert sum(value for (granularity, _, _), value in rows.items() if granularity == 'hour') == len(self.PROJECTS)
+
+    def test_totals_combine_hour_day_and_month_buckets(self, model_db):
+        """Test a range read as hour, day and month tiles matches the source rows."""
+        from datetime import datetime
+        from app.utils.time_buckets import plan_buckets
+
+        service = self._refresh(model_db)
+        start, end = datetime(2025, 1, 30, 23), datetime(2025, 3, 1, 1)
+
+        assert [granularity for granularity, _, _ in plan_buckets(start, end)] == ['hour', 'day', 'month', 'hour']
+        assert service.total('projects.created', start, end) == 6
+        assert service.total('projects.created', start, end, is_public=True) == 5
+        assert service.total('projects.created', start, end, is_public=False) == 1
+
+    def test_correct_late_data_recomputes_changed_hours(self, model_db):
+        """Test rows written late are folded into their hours, days and months."""
+        from datetime import datetime
+        from flask import current_app
+        from app.extensions import cache
+
+        cache.init_app(current_app, config={'CACHE_TYPE': 'SimpleCache'})
+        service = self._refresh(model_db)
+        self._seed_projects(model_db, [('2025-02-10 09:30', True)], updated_at=datetime(2026, 1, 1, 12))
+
+        corrected = service.correct_late_data(since=datetime(2026, 1, 1))
+
+        assert corrected['projects.created'] == 1
+        assert service.total('projects.created', datetime(2025, 2, 1), datetime(2025, 3, 1)) == 4
+        assert service.total('projects.created', datetime(2025, 2, 10, 9), datetime(2025, 2, 10, 10)) == 1
+        # The next run starts from the stored checkpoint and finds nothing new
+        assert not any(service.correct_late_data().values())
+
+    def test_correct_late_data_clears_the_hour_a_row_moved_out_of(self, model_db):
+        """Test a row whose time changes leaves no stale fact behind in its previous hour."""
+        import uuid
+        from datetime import datetime
+        from flask import current_app
+        from app.extensions import cache
+        from app.models.user import User
+        from app.services.metric_rollups import MetricRollupService, track_moved_facts
+
+        cache.init_app(current_app, config={'CACHE_TYPE': 'SimpleCache'})
+        track_moved_facts()
+        user_id = uuid.UUID(int=1)
+        model_db.session.execute(User.__table__.insert(), [{
+            'id': user_id, 'email': 'active@example.com', 'password_hash': 'x', 'first_name': 'Active',
+            'last_name': 'User', 'role': 'entrepreneur', 'is_active': True,
+            'last_login_at': datetime(2025, 2, 10, 9, 30), 'updated_at': datetime(2025, 2, 10, 9, 30)
+        }])
+        model_db.session.commit()
+
+        service = MetricRollupService()
+        service.refresh(datetime(2025, 2, 1), datetime(2025, 3, 1))
+        assert service.total('users.active', datetime(2025, 2, 10, 9), datetime(2025, 2, 10, 10)) == 1
+
+        # A new login moves the user's fact to another hour
+        model_db.session.get(User, user_id).last_login_at = datetime(2025, 2, 20, 15, 5)
+        model_db.session.commit()
+        service.correct_late_data(since=datetime(2025, 2, 28))
+
+        assert service.total('users.active', datetime(2025, 2, 10, 9), datetime(2025, 2, 10, 10)) == 0
+        assert service.total('users.active', datetime(2025, 2, 20, 15), datetime(2025, 2, 20, 16)) == 1
+        assert service.total('users.active', datetime(2025, 2, 1), datetime(2025, 3, 1)) == 1
+
+    def test_averages_divide_by_source_records(self, model_db):
+        """Test averages use the source record counts kept in the rollups."""
+        import uuid
+        from datetime import datetime
+        from app.models.analytics import AnalyticsMetric, MetricCategory, MetricType
+        from app.services.metric_rollups import MetricRollupService
+
+        model_db.session.execute(AnalyticsMetric.__table__.insert(), [
+            {'id': uuid.uuid4(), 'name': 'ltv', 'metric_type': MetricType.LIFETIME_VALUE,
+             'category': MetricCategory.BUSINESS_GROWTH, 'value': value, 'timestamp': datetime(2025, 2, day, 12)}
+            for day, value in ((3, 100.0), (3, 300.0), (17, 200.0))
+        ])
+        model_db.session.commit()
+
+        service = MetricRollupService()
+        service.refresh(datetime(2025, 2, 1), datetime(2025, 3, 1))
+
+        assert service.averages(['metric.lifetime_value', 'metric.churn_rate'],
+                                datetime(2025, 2, 1), datetime(2025, 3, 1)) == {
+            'metric.lifetime_value': 200.0,
+            'metric.churn_rate': None
+        }
+
+
+def _python_task_statistics(tasks, now):
+    """Per-task statistics as computed before the SQL aggregation (collaboration excluded)."""
+    from app.models.task import TaskPriority, TaskStatus
+
+    high = [TaskPriority.HIGH, TaskPriority.HIGHEST, TaskPriority.CRITICAL]
+    closed = [TaskStatus.COMPLETED, TaskStatus.CANCELLED, TaskStatus.ARCHIVED]
+    total = len(tasks)
+    completed = [t for t in tasks if t.status == TaskStatus.COMPLETED]
+    timed = [t for t in completed if t.start_date and t.completed_at]
+    estimated = sum(t.estimated_hours or 0 for t in tasks)
+    actual = sum(t.actual_hours or 0 for t in tasks)
+
+    def distribution(attribute):
+        counts = {}
+        for task in tasks:
+            value = getattr(task, attribute).value
+            counts[value] = counts.get(value, 0) + 1
+        return counts
+
+    return {
+        'total_tasks': total,
+        'completion_rate': round(len(completed) / total * 100, 1),
+        'average_completion_time_days': round(
+            sum((t.completed_at - t.start_date).days for t in timed) / len(timed), 1
+        ) if timed else 0,
+        'overdue_tasks': len([t for t in tasks if t.due_date and t.due_date < now and t.status not in closed]),
+        'blocked_tasks': len([t for t in tasks if t.is_blocked]),
+        'status_distribution': distribution('status'),
+        'priority_distribution': distribution('priority'),
+        'type_distribution': distribution('task_type'),
+        'time_tracking': {
+            'total_estimated_hours': estimated,
+            'total_actual_hours': actual,
+            'time_variance_percentage': round((actual - estimated) / estimated * 100, 1) if estimated else 0,
+            'tasks_with_time_tracking': len([t for t in tasks if t.estimated_hours or t.actual_hours])
+        },
+        'productivity_insights': {
+            'tasks_per_day': round(total / 30, 1),
+            'average_progress': round(sum(t.progress_percentage for t in tasks) / total, 1),
+            'high_priority_completion_rate': round(
+                len([t for t in tasks if t.priority in high and t.status == TaskStatus.COMPLETED]) /
+                len([t for t in tasks if t.priority in high]) * 100, 1
+            ) if any(t.priority in high for t in tasks) else 0
+        }
+    }
+
+
+class TestTaskStatistics:
+    """Test the SQL task statistics against the per-task computation they replace."""
+
+    def test_sql_statistics_match_python_computation(self, model_db):
+        """Test every aggregate matches on SQLite, including negative and fractional durations."""
+        import uuid
+        from datetime import datetime, timedelta, timezone
+        from flask import current_app
+        from sqlalchemy import select
+        from app.extensions import cache
+        from app.models.task import Task, TaskPriority, TaskStatus, TaskType
+        from app.services.task_analytics import get_task_statistics
+
+        cache.init_app(current_app, config={'CACHE_TYPE': 'SimpleCache'})
+        now = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+        start = datetime(2025, 3, 1, 9)
+
+        def task(status, priority, task_type, completed_in=None, completed_at=None, due_date=None,
+                 estimated_hours=None, actual_hours=0.0, progress_percentage=0.0, is_blocked=False):
+            return {
+                'id': uuid.uuid4(),
+                'title': 'Tarea',
+                'creator_id': 1,
+                'status': status,
+                'priority': priority,
+                'task_type': task_type,
+                'start_date': start if completed_in is not None else None,
+                'completed_at': start + completed_in if completed_in is not None else completed_at,
+                'due_date': due_date,
+                'estimated_hours': estimated_hours,
+                'actual_hours': actual_hours,
+                'progress_percentage': progress_percentage,
+                'is_blocked': is_blocked
+            }
+
+        rows = [
+            task(TaskStatus.COMPLETED, TaskPriority.HIGH, TaskType.GENERAL, timedelta(days=2, hours=12),
+                 estimated_hours=8.0, actual_hours=10.5, progress_percentage=100.0),
+            task(TaskStatus.COMPLETED, TaskPriority.CRITICAL, TaskType.REVIEW, timedelta(days=3),
+                 estimated_hours=4.0, actual_hours=3.0, progress_percentage=100.0),
+            task(TaskStatus.COMPLETED, TaskPriority.LOW, TaskType.GENERAL, timedelta(hours=22)),
+            task(TaskStatus.COMPLETED, TaskPriority.MEDIUM, TaskType.RESEARCH, -timedelta(hours=12)),
+            task(TaskStatus.COMPLETED, TaskPriority.MEDIUM, TaskType.RESEARCH, completed_at=start),
+            task(TaskStatus.IN_PROGRESS, TaskPriority.HIGH, TaskType.DEVELOPMENT,
+                 due_date=now - timedelta(days=1), estimated_hours=5.0, progress_percentage=40.0),
+            task(TaskStatus.IN_PROGRESS, TaskPriority.HIGHEST, TaskType.DEVELOPMENT,
+                 due_date=now + timedelta(days=1), is_blocked=True, progress_percentage=10.0),
+            task(TaskStatus.CANCELLED, TaskPriority.LOW, TaskType.GENERAL, due_date=now - timedelta(days=3)),
+            task(TaskStatus.NOT_STARTED, TaskPriority.MEDIUM, TaskType.GENERAL, is_blocked=True)
+        ]
+        model_db.session.execute(Task.__table__.insert(), rows)
+        model_db.session.commit()
+
+        stats = get_task_statistics(use_cache=False)
+        tasks = model_db.session.execute(select(Task.__table__)).all()
+
+        assert {key: value for key, value in stats.items() if key != 'collaboration_metrics'} == \
+            _python_task_statistics(tasks, now)
+        assert stats['collaboration_metrics'] == {
+            'tasks_with_multiple_assignees': 0,
+            'tasks_with_comments': 0,
+            'tasks_with_subtasks': 0,
+            'collaboration_rate': 0.0
+        }
+
+
+class TestParentProgressRollup:
+    """Test the parent task state computed from subtask aggregates."""
+
+    def test_rollup_rules(self):
+        """Test progress averaging and status transitions match the per-object rule."""
+        from datetime import datetime
+        from app.models.task import TaskStatus
+        from app.services.task_batch import rollup_parent_state
+
+        now = datetime(2024, 5, 1)
+
+        assert rollup_parent_state(TaskStatus.NOT_STARTED, 0.0, None, 4, 37.5, 1, 0, now) == {
+            'progress_percentage': 37.5,
+            'status': TaskStatus.IN_PROGRESS,
+            'start_date': now
+        }
+        assert rollup_parent_state(TaskStatus.IN_PROGRESS, 90.0, now, 2, 100.0, 2, 0, now) == {
+            'progress_percentage': 100.0,
+            'status': TaskStatus.COMPLETED,
+            'completed_at': now
+        }
+        assert rollup_parent_state(TaskStatus.IN_PROGRESS, 50.0, now, 2, 50.0, 0, 2, now) is None
+        assert rollup_parent_state(TaskStatus.NOT_STARTED, 0.0, None, 0, 0, 0, 0, now) is None
+
+
+class TestTaskBatchProcessors:
+    """Test the set-based task processors against the per-row code they replace."""
+
+    def _task(self, **values):
+        import uuid
+        from app.models.task import RecurrencePattern, TaskPriority, TaskStatus, TaskType
+
+        row = {
+            'id': uuid.uuid4(),
+            'title': 'Tarea',
+            'creator_id': 1,
+            'status': TaskStatus.NOT_STARTED,
+            'priority': TaskPriority.MEDIUM,
+            'task_type': TaskType.GENERAL,
+            'progress_percentage': 0.0,
+            'start_date': None,
+            'completed_at': None,
+            'is_parent': False,
+            'parent_task_id': None,
+            'recurrence_pattern': RecurrencePattern.NONE,
+            'recurrence_settings': None,
+            'next_occurrence_date': None,
+            'is_deleted': False
+        }
+        row.update(values)
+        return row
+
+    def test_expand_recurring_tasks_matches_per_row_expansion(self, model_db):
+        """Test instances, copied assignees and next occurrences, and that a rerun is a no-op."""
+        import uuid
+        from datetime import datetime, timedelta
+        from sqlalchemy import select
+        from app.models.task import RecurrencePattern, Task, task_assignees
+        from app.services.task_batch import expand_recurring_tasks, list_due_recurring_task_ids
+        from app.utils.recurrence import next_occurrence
+
+        now = datetime(2025, 4, 10, 12)
+        daily = self._task(title='Diaria', recurrence_pattern=RecurrencePattern.DAILY,
+                           next_occurrence_date=now - timedelta(days=2, hours=1))
+        monthly = self._task(title='Mensual', recurrence_pattern=RecurrencePattern.MONTHLY,
+                             next_occurrence_date=datetime(2025, 1, 31, 9))
+        future = self._task(title='Futura', recurrence_pattern=RecurrencePattern.WEEKLY,
+                            next_occurrence_date=now + timedelta(days=1))
+        templates = [daily, monthly, future]
+        model_db.session.execute(Task.__table__.insert(), templates)
+        model_db.session.execute(task_assignees.insert(), [
+            {'task_id': daily['id'], 'user_id': uuid.UUID(int=1), 'is_active': True},
+            {'task_id': daily['id'], 'user_id': uuid.UUID(int=2), 'is_active': True},
+            {'task_id': daily['id'], 'user_id': uuid.UUID(int=3), 'is_active': False}
+        ])
+        model_db.session.commit()
+
+        # Per-row expansion: follow each template's pattern until it passes now
+        expected = {}
+        for template in templates:
+            current, due_dates = template['next_occurrence_date'], []
+            while current <= now:
+                current = next_occurrence(template['recurrence_pattern'].value, current)
+                due_dates.append(current)
+            expected[template['id']] = (due_dates, current)
+
+        task_ids = list_due_recurring_task_ids(now)
+        stats = expand_recurring_tasks(task_ids, now)
+
+        assert sorted(task_ids) == sorted([daily['id'], monthly['id']])
+        assert stats.changed == sum(len(due_dates) for due_dates, _ in expected.values())
+
+        instances = model_db.session.execute(
+            select(Task.__table__).where(Task.parent_recurring_task_id.isnot(None))
+        ).all()
+        for template in templates:
+            due_dates, following = expected[template['id']]
+            created = [row for row in instances if row.parent_recurring_task_id == template['id']]
+            assert sorted(row.due_date for row in created) == due_dates
+            assert {row.title for row in created} <= {template['title']}
+            assert model_db.session.execute(
+                select(Task.next_occurrence_date).where(Task.id == template['id'])
+            ).scalar() == following
+
+        copied = model_db.session.execute(
+            select(task_assignees.c.task_id, task_assignees.c.user_id)
+            .where(task_assignees.c.task_id.in_([row.id for row in instances]))
+        ).all()
+        daily_instances = [row.id for row in instances if row.parent_recurring_task_id == daily['id']]
+        assert sorted(copied) == sorted(
+            (instance_id, uuid.UUID(int=user)) for instance_id in daily_instances for user in (1, 2)
+        )
+
+        assert expand_recurring_tasks(task_ids, now).changed == 0
+
+    def test_rollup_parent_progress_matches_per_object_update(self, model_db):
+        """Test parents end in the state Task._update_parent_progress would give them."""
+        from datetime import datetime
+        from sqlalchemy import select
+        from app.models.task import Task, TaskStatus
+        from app.services.task_batch import list_active_parent_task_ids, rollup_parent_progress
+
+        now = datetime(2025, 4, 10, 12)
+        started = datetime(2025, 4, 1)
+        parents = [
+            self._task(is_parent=True),
+            self._task(is_parent=True, status=TaskStatus.IN_PROGRESS, progress_percentage=80.0, start_date=started),
+            self._task(is_parent=True, status=TaskStatus.IN_PROGRESS, progress_percentage=25.0, start_date=started),
+            self._task(is_parent=True)
+        ]
+        first, second, third, _ = parents
+        subtasks = [
+            self._task(parent_task_id=first['id'], status=TaskStatus.COMPLETED, progress_percentage=100.0),
+            self._task(parent_task_id=first['id'], status=TaskStatus.IN_PROGRESS, progress_percentage=50.0),
+            self._task(parent_task_id=first['id'], progress_percentage=0.0),
+            self._task(parent_task_id=first['id'], progress_percentage=100.0, is_deleted=True),
+            self._task(parent_task_id=second['id'], status=TaskStatus.COMPLETED, progress_percentage=100.0),
+            self._task(parent_task_id=second['id'], status=TaskStatus.COMPLETED, progress_percentage=100.0),
+            self._task(parent_task_id=third['id'], progress_percentage=25.0),
+            self._task(parent_task_id=third['id'], progress_percentage=25.0)
+        ]
+        model_db.session.execute(Task.__table__.insert(), parents + subtasks)
+        model_db.session.commit()
+
+        def per_object_update(parent):
+            state = {key: parent[key] for key in ('status', 'progress_percentage', 'start_date', 'completed_at')}
+            active = [row for row in subtasks if row['parent_task_id'] == parent['id'] and not row['is_deleted']]
+            if not active:
+                return state
+            state['progress_percentage'] = round(sum(row['progress_percentage'] for row in active) / len(active), 1)
+            completed = [row for row in active if row['status'] == TaskStatus.COMPLETED]
+            if len(completed) == len(active):
+                if state['status'] != TaskStatus.COMPLETED:
+                    state['status'] = TaskStatus.COMPLETED
+                    state['completed_at'] = now
+            elif completed or any(row['status'] == TaskStatus.IN_PROGRESS for row in active):
+                if state['status'] == TaskStatus.NOT_STARTED:
+                    state['status'] = TaskStatus.IN_PROGRESS
+                    state['start_date'] = state['start_date'] or now
+            return state
+
+        expected = {parent['id']: per_object_update(parent) for parent in parents}
+        stats = rollup_parent_progress(list_active_parent_task_ids(), now)
+
+        assert stats.items == len(parents)
+        assert stats.changed == 2
+        for row in model_db.session.execute(
+            select(Task.id, Task.status, Task.progress_percentage, Task.start_date, Task.completed_at)
+            .where(Task.is_parent == True)
+        ):
+            assert dict(row._mapping, id=None) == dict(expected[row.id], id=None)
+
+
+class FakeInboxEvent:
+    """Minimal stand-in for a claimed WebhookEvent row."""
+
+    def __init__(self, event_id, resource_key=None, retry_count=0):
+        self.id = event_id
+        self.event_id = event_id
+        self.event_type = 'test.event'
+        self.resource_key = resource_key
+        self.retry_count = retry_count
+        self.payload = {'id': event_id}
+
+
+class TestWebhookInbox:
+    """Test webhook inbox idempotency keys and per-resource ordering."""
+
+    def _inbox(self, events, failing, max_attempts=5):
+        from app.services.webhook_inbox import WebhookInbox
+
+        handled = []
+
+        def handler(provider, event_type, payload):
+            handled.append(payload['id'])
+            return payload['id'] not in failing
+
+        inbox = WebhookInbox(handler, max_attempts=max_attempts)
+        inbox.finished = {}
+        inbox.claim_batch = lambda provider, now=None: events
+        inbox._finish = lambda event, **values: inbox.finished.__setitem__(event.id, values)
+        return inbox, handled
+
+    def test_idempotency_key_is_stable(self):
+        """Test redeliveries map to the same key and providers do not collide."""
+        from app.services.webhook_inbox import idempotency_key
+
+        assert idempotency_key('stripe', 'evt_1') == idempotency_key('stripe', 'evt_1')
+        assert idempotency_key('stripe', 'evt_1') != idempotency_key('paypal', 'evt_1')
+        assert idempotency_key('github', None, b'{"a": 1}') == idempotency_key('github', None, b'{"a": 1}')
+        assert len(idempotency_key('slack', 'E1')) == 64
+
+    def test_failure_defers_later_events_of_same_resource(self):
+        """Test a failed event holds back later events of its resource only."""
+        from app.models.webhook_event import WebhookStatus
+
+        events = [
+            FakeInboxEvent('a1', 'res-a'),
+            FakeInboxEvent('b1', 'res-b'),
+            FakeInboxEvent('a2', 'res-a'),
+            FakeInboxEvent('n1')
+        ]
+        inbox, handled = self._inbox(events, failing={'a1'})
+
+        result = inbox.drain_batch('stripe')
+
+        assert handled == ['a1', 'b1', 'n1']
+        assert (result.claimed, result.processed, result.failed, result.deferred) == (4, 2, 1, 1)
+        assert inbox.finished['a1']['status'] == WebhookStatus.FAILED
+        assert inbox.finished['a1']['retry_count'] == 1
+        assert inbox.finished['a2']['status'] == WebhookStatus.PENDING
+        assert inbox.finished['b1']['status'] == WebhookStatus.PROCESSED
+
+    def test_exhausted_retries_go_to_dead_letter(self):
+        """Test the last allowed attempt moves the event to dead letter."""
+        from app.models.webhook_event import WebhookStatus
+
+        inbox, _ = self._inbox([FakeInboxEvent('x', retry_count=2)], failing={'x'}, max_attempts=3)
+
+        result = inbox.drain_batch('github')
+
+        assert result.dead_lettered == 1
+        assert inbox.finished['x']['status'] == WebhookStatus.DEAD_LETTER
+
+    def _seed_events(self, db, *events):
+        """Insert (event_id, resource_key, minute) rows as pending stripe events."""
+        import uuid
+        from datetime import datetime, timedelta
+        from app.models.webhook_event import WebhookEvent, WebhookProvider, WebhookStatus
+
+        start = datetime(2026, 3, 1, 12)
+        db.session.execute(WebhookEvent.__table__.insert(), [
+            {'id': uuid.uuid4(), 'provider': WebhookProvider.STRIPE, 'event_type': 'test.event',
+             'event_id': event_id, 'idempotency_key': event_id, 'resource_key': resource_key,
+             'payload': {'id': event_id}, 'status': WebhookStatus.PENDING,
+             'received_at': start + timedelta(minutes=minute), 'retry_count': 0}
+            for event_id, resource_key, minute in events
+        ])
+        db.session.commit()
+        return start
+
+    def test_append_event_ignores_redeliveries(self, model_db):
+        """Test the ON CONFLICT insert stores a redelivered event only once."""
+        from app.models.webhook_event import WebhookEvent, WebhookProvider
+        from app.services.webhook_inbox import append_event
+
+        first = append_event('stripe', 'invoice.paid', 'evt_1', {'id': 'evt_1'}, resource_key='in_1')
+        again = append_event('stripe', 'invoice.paid', 'evt_1', {'id': 'evt_1'}, resource_key='in_1')
+        other = append_event('paypal', 'invoice.paid', 'evt_1', {'id': 'evt_1'})
+
+        assert first is not None and other is not None
+        assert again is None
+        events = WebhookEvent.query.all()
+        assert len(events) == 2
+        assert {event.provider for event in events} == {WebhookProvider.STRIPE, WebhookProvider.PAYPAL}
+
+    def test_claim_batch_keeps_resource_order_across_drains(self, model_db):
+        """Test a claim takes a resource's consecutive events and a concurrent claim cannot overtake them."""
+        from datetime import timedelta
+        from app.models.webhook_event import WebhookEvent, WebhookStatus
+        from app.services.webhook_inbox import WebhookInbox
+
+        start = self._seed_events(
+            model_db, ('a1', 'res-a', 0), ('a2', 'res-a', 1), ('b1', 'res-b', 2),
+            ('n1', None, 3), ('n2', None, 4)
+        )
+        inbox = WebhookInbox(lambda *args: True)
+        now = start + timedelta(hours=1)
+
+        first = [event.event_id for event in inbox.claim_batch('stripe', now=now)]
+        concurrent = inbox.claim_batch('stripe', now=now)
+
+        assert first == ['a1', 'a2', 'b1', 'n1', 'n2']
+        assert concurrent == []
+
+        # An expired lease is reclaimed in the same order
+        expired = now + timedelta(seconds=inbox.lease_seconds + 1)
+        assert [event.event_id for event in inbox.claim_batch('stripe', now=expired)] == ['a1', 'a2', 'b1', 'n1', 'n2']
+
+        # A scheduled retry holds back the released next event even before it is due
+        a1 = WebhookEvent.query.filter_by(event_id='a1').one()
+        inbox._finish(a1, status=WebhookStatus.FAILED, retry_count=1,
+                      next_attempt_at=expired + timedelta(minutes=5))
+        inbox._release(WebhookEvent.query.filter_by(event_id='a2').one())
+        assert inbox.claim_batch('stripe', now=expired) == []
+
+        inbox._mark_processed(a1)
+        assert [event.event_id for event in inbox.claim_batch('stripe', now=expired)] == ['a2']
+
+    def test_claim_batch_stops_a_resource_at_the_batch_limit(self, model_db):
+        """Test events past the limit wait for the next claim instead of skipping ahead."""
+        from datetime import timedelta
+        from app.services.webhook_inbox import WebhookInbox
+
+        start = self._seed_events(model_db, *[(f'a{i}', 'res-a', i) for i in range(5)])
+        inbox = WebhookInbox(lambda *args: True, batch_size=3)
+        now = start + timedelta(hours=1)
+
+        assert [event.event_id for event in inbox.claim_batch('stripe', now=now)] == ['a0', 'a1', 'a2']
+        assert inbox.claim_batch('stripe', now=now) == []
+
+    def test_drain_empties_a_single_resource_in_one_run(self, model_db):
+        """Test one drain run empties a burst on one resource, in order, across several batches."""
+        from app.models.webhook_event import WebhookEvent, WebhookStatus
+        from app.services.webhook_inbox import WebhookInbox
+
+        self._seed_events(model_db, *[(f'a{i:03d}', 'res-a', i) for i in range(120)])
+        handled = []
+
+        def handler(provider, event_type, payload):
+            handled.append(payload['id'])
+            return True
+
+        totals, remaining = WebhookInbox(handler, batch_size=50).drain('stripe', time_budget=60)
+
+        assert remaining is False
+        assert (totals['processed'], totals['batches']) == (120, 4)
+        assert handled == [f'a{i:03d}' for i in range(120)]
+        assert WebhookEvent.query.filter(WebhookEvent.status != WebhookStatus.PROCESSED).count() == 0
+
+    def test_drain_lease_is_exclusive_per_provider(self, model_db):
+        """Test a second drain of the same provider does not get the lease."""
+        from flask import current_app
+        from app.extensions import cache
+        from app.services.webhook_inbox import drain_lease
+
+        cache.init_app(current_app, config={'CACHE_TYPE': 'SimpleCache'})
+
+        with drain_lease('stripe') as first:
+            with drain_lease('stripe') as second, drain_lease('github') as other:
+                assert (first, second, other) == (True, False, True)
+        with drain_lease('stripe') as again:
+            assert again is True
+
+
+class LocalWebhookStub:
+    """Local HTTP server recording webhook POSTs and replying with scripted statuses."""
+
+    def __init__(self, statuses=()):
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        stub = self
+        self.requests = []
+        self.connections = set()
+        self.statuses = list(statuses)
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                import json
+                body = self.rfile.read(int(self.headers['Content-Length']))
+                stub.requests.append((dict(self.headers), json.loads(body)))
+                stub.connections.add(self.client_address)
+                status = stub.statuses.pop(0) if stub.statuses else 200
+                self.send_response(status)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_port}/hook'
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class AllowAll:
+    """Rate limiter stand-in that allows a fixed number of requests."""
+
+    def __init__(self, allowed=10 ** 6, reset_in=42):
+        self.allowed = allowed
+        self.reset_in = reset_in
+
+    def is_allowed(self, *args, **kwargs):
+        self.allowed -= 1
+        return self.allowed >= 0
+
+    def seconds_until_reset(self, window):
+        return self.reset_in
+
+
+class FakeRedisPipeline:
+    """Transactional pipeline stand-in supporting INCR and EXPIRE."""
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def incr(self, key):
+        self.commands.append(('incr', key))
+
+    def expire(self, key, seconds):
+        self.commands.append(('expire', key, seconds))
+
+    def execute(self):
+        results = []
+        for command in self.commands:
+            if command[0] == 'incr':
+                self.client.counters[command[1]] = self.client.counters.get(command[1], 0) + 1
+                results.append(self.client.counters[command[1]])
+            else:
+                self.client.expirations[command[1]] = command[2]
+                results.append(True)
+        return results
+
+
+class FakeRedis:
+    """Redis client stand-in recording counters and their expirations."""
+
+    def __init__(self):
+        self.counters = {}
+        self.expirations = {}
+        self.transactions = []
+
+    def pipeline(self, transaction=False):
+        self.transactions.append(transaction)
+        return FakeRedisPipeline(self)
+
+
+class TestOutboundDeliveryEngine:
+    """Test outbound webhook delivery against a local HTTP stub."""
+
+    def _engine(self, rate_limiter=None):
+        from app.services.webhook_delivery import MemoryOutboundQueue, OutboundDeliveryEngine
+
+        scheduled = []
+        engine = OutboundDeliveryEngine(
+            queue=MemoryOutboundQueue(),
+            rate_limiter=rate_limiter or AllowAll(),
+            flush_scheduler=lambda name, countdown, dedupe=True: scheduled.append((name, countdown)) or True
+        )
+        return engine, scheduled
+
+    def test_batched_destination_gets_one_signed_post(self):
+        """Test a burst of events becomes a single signed POST over a pooled connection."""
+        import hashlib
+        import hmac
+        from prometheus_client import REGISTRY
+        from app.services.webhook_delivery import OutboundDestination
+
+        exported = lambda: REGISTRY.get_sample_value(
+            'outbound_webhook_events_total', {'destination': 'crm', 'outcome': 'delivered'}
+        ) or 0
+        before = exported()
+
+        stub = LocalWebhookStub()
+        try:
+            engine, scheduled = self._engine()
+            engine.register(OutboundDestination(
+                name='crm', url=stub.url, events=['user.updated'], secret='s3cret', batch=True
+            ))
+
+            for user_id in range(25):
+                assert engine.publish('user.updated', {'id': user_id}) == 1
+            assert engine.publish('project.created', {'id': 1}) == 0
+
+            result = engine.flush('crm')
+        finally:
+            stub.close()
+
+        assert (result.delivered, result.requests, result.failed) == (25, 1, 0)
+        headers, body = stub.requests[0]
+        assert body['count'] == 25 and [event['data']['id'] for event in body['events']] == list(range(25))
+        assert set(scheduled) == {('crm', 5)}
+
+        import json
+        raw = json.dumps(body, separators=(',', ':')).encode()
+        expected = hmac.new(b's3cret', headers['X-Webhook-Timestamp'].encode() + b'.' + raw, hashlib.sha256).hexdigest()
+        assert headers['X-Webhook-Signature'] == f'sha256={expected}'
+        assert engine.metrics.snapshot()['crm']['requests'] == 1
+        assert exported() - before == 25
+
+    def test_retryable_failures_and_rate_limit_are_retried(self):
+        """Test 5xx responses and rate-limited sends come back for retry, 4xx are dropped."""
+        from app.services.webhook_delivery import OutboundDestination
+
+        stub = LocalWebhookStub(statuses=[503, 400, 200])
+        try:
+            engine, _ = self._engine(rate_limiter=AllowAll(3))
+            destination = OutboundDestination(
+                name='erp', url=stub.url, events=['project.updated'], max_concurrency=1, rate_limit=3
+            )
+            items = [{'event': 'project.updated', 'data': {'id': n}, 'attempt': 0} for n in range(4)]
+
+            result = engine.deliver(destination, items)
+        finally:
+            stub.close()
+
+        assert (result.requests, result.delivered, result.failed, result.dropped, result.deferred) == (3, 1, 2, 1, 1)
+        assert sorted(item['data']['id'] for item in result.retry_items) == [0, 3]
+        assert {item['data']['id']: item['attempt'] for item in result.retry_items} == {0: 1, 3: 0}
+        assert result.retry_in_seconds == 42
+        assert len(stub.connections) == 1
+        assert engine.metrics.snapshot()['erp']['failures'] == 2
+
+    def test_rate_limited_events_wait_for_window_reset(self):
+        """Test deferred events are retried when the limit window resets, without spending attempts."""
+        from app.services.webhook_delivery import OutboundDestination
+
+        engine, _ = self._engine(rate_limiter=AllowAll(0, reset_in=37))
+        destination = OutboundDestination(name='bi', url='http://127.0.0.1:9/', events=['x'], rate_limit=1)
+
+        result = engine.deliver(destination, [{'event': 'x', 'data': {}, 'attempt': 2}])
+
+        assert (result.requests, result.deferred) == (0, 1)
+        assert result.retry_items[0]['attempt'] == 2
+        assert result.retry_in_seconds == 37
+
+    def test_unbatched_burst_is_fully_flushed(self):
+        """Test a flush that leaves a backlog reschedules itself even while the publish dedupe key is live."""
+        from app.services.webhook_delivery import (
+            MemoryOutboundQueue, OutboundDeliveryEngine, OutboundDestination
+        )
+
+        pending, live_keys = [], set()
+
+        def scheduler(name, countdown, dedupe=True):
+            # Same contract as _schedule_flush; the key never expires within the test
+            if dedupe:
+                if name in live_keys:
+                    return False
+                live_keys.add(name)
+            pending.append(name)
+            return True
+
+        stub = LocalWebhookStub()
+        try:
+            engine = OutboundDeliveryEngine(queue=MemoryOutboundQueue(), rate_limiter=AllowAll(),
+                                            flush_scheduler=scheduler)
+            engine.register(OutboundDestination(name='hooks', url=stub.url, events=['user.updated'],
+                                                max_concurrency=8))
+            for user_id in range(250):
+                engine.publish('user.updated', {'id': user_id})
+
+            delivered = 0
+            while pending:
+                delivered += engine.flush(pending.pop(0)).delivered
+        finally:
+            stub.close()
+
+        assert delivered == 250
+        assert engine.queue.size('hooks') == 0
+
+    def test_unacknowledged_batch_returns_to_queue(self):
+        """Test a batch claimed by a worker that died is requeued in order by the sweep."""
+        import time
+        from app.services.webhook_delivery import OutboundDestination, PROCESSING_TIMEOUT
+
+        engine, scheduled = self._engine()
+        engine.register(OutboundDestination(name='crm', url='http://127.0.0.1:9/', events=['x'], batch=True))
+        for n in range(5):
+            engine.publish('x', {'id': n})
+        scheduled.clear()
+
+        token, items = engine.queue.claim('crm', 3)
+        assert [item['data']['id'] for item in items] == [0, 1, 2]
+        assert engine.sweep() == ['crm'] and engine.queue.size('crm') == 2
+
+        assert engine.sweep(now=time.time() + PROCESSING_TIMEOUT + 1) == ['crm']
+        assert [item['data']['id'] for item in engine.queue.claim('crm', 10)[1]] == [0, 1, 2, 3, 4]
+        assert scheduled == [('crm', 0), ('crm', 0)]
+
+    def test_memory_queue_is_limited_to_tests(self, monkeypatch):
+        """Test the engine refuses in-memory queues without Redis outside testing."""
+        from flask import Flask
+        from app import extensions
+        from app.services.webhook_delivery import MemoryOutboundQueue, OutboundDeliveryEngine
+
+        monkeypatch.setattr(extensions, 'redis_client', None)
+        flask_app = Flask(__name__)
+
+        with flask_app.app_context():
+            with pytest.raises(RuntimeError):
+                OutboundDeliveryEngine().queue
+            flask_app.testing = True
+            assert isinstance(OutboundDeliveryEngine().queue, MemoryOutboundQueue)
+
+
+class TestIntegrationRateLimiter:
+    """Test the fixed-window integration rate limiter."""
+
+    def test_redis_counter_is_incremented_atomically(self, monkeypatch):
+        """Test the Redis path counts with INCR + EXPIRE in one transaction per window."""
+        from flask import Flask
+        from app import extensions
+
+        client = FakeRedis()
+        monkeypatch.setattr(extensions, 'redis_client', client)
+
+        # integration_hub builds its hub at import time and needs an application
+        with Flask(__name__).app_context():
+            from app.services.integration_hub import IntegrationRateLimiter
+
+            limiter = IntegrationRateLimiter()
+            allowed = [limiter.is_allowed('crm', 0, 'outbound', limit=2, window=60) for _ in range(3)]
+
+        assert allowed == [True, True, False]
+        assert client.transactions == [True, True, True]
+        (key, count), = client.counters.items()
+        assert count == 3 and key.startswith('rate_limit_crm_0_outbound_')
+        assert client.expirations == {key: 60}
+        assert 1 <= limiter.seconds_until_reset(60) <= 60
+
+
+class FailingRateProvider:
+    """Currency provider whose API is down."""
+
+    def get_rates(self, base_currency='USD'):
+        raise ConnectionError('provider down')
+
+    def get_rate(self, from_currency, to_currency):
+        raise ConnectionError('provider down')
+
+
+class TestCurrencyService:
+    """Test the shared rate matrix published by the currency service."""
+
+    @pytest.fixture
+    def service(self):
+        from flask import Flask
+        from app.extensions import cache
+
+        flask_app = Flask(__name__)
+        flask_app.config.update(
+            TESTING=True,
+            CURRENCY_USE_STATIC_RATES=True,
+            CURRENCY_STATIC_RATES={'EUR': 0.9, 'COP': 4000.0}
+        )
+        cache.init_app(flask_app, config={'CACHE_TYPE': 'SimpleCache'})
+        with flask_app.app_context():
+            # app.services.currency builds its service at import time and needs an application
+            from app.services.currency import CurrencyService
+
+            cache.clear()
+            yield CurrencyService()
+
+    def _reload(self, service):
+        """Force the next get_rate_matrix to read the shared cache."""
+        service._matrix_checked_at = 0.0
+
+    def test_static_provider_matrix_is_published_and_used(self, service):
+        """Test a refresh publishes the provider's rates and conversions use them."""
+        from decimal import Decimal
+
+        matrix = service.refresh_rate_matrix('USD')
+
+        assert matrix.source == 'StaticRateProvider'
+        assert service.get_exchange_rate('USD', 'EUR') == pytest.approx(0.9)
+        assert service.get_exchange_rate('EUR', 'COP') == pytest.approx(4000 / 0.9)
+        assert service.convert_many(['10', '20'], 'USD', 'EUR') == [Decimal('9.00'), Decimal('18.00')]
+
+    def test_failed_refresh_never_publishes_fallback_rates(self, service):
+        """Test that when every provider fails the published matrix stays untouched."""
+        from app.core.exceptions import CurrencyServiceError
+        from app.services.currency import RATE_MATRIX_CACHE_KEY
+
+        service.refresh_rate_matrix('USD')
+        published = service.cache.get(RATE_MATRIX_CACHE_KEY)
+        service.providers = [FailingRateProvider()]
+
+        with pytest.raises(CurrencyServiceError):
+            service.refresh_rate_matrix('USD')
+
+        assert service.cache.get(RATE_MATRIX_CACHE_KEY) == published
+        self._reload(service)
+        assert service.get_rate_matrix(use_fallback=False).source == 'StaticRateProvider'
+
+    def test_expired_cache_entry_drops_local_matrix(self, service):
+        """Test the process copy is discarded once the shared entry expires."""
+        from app.services.currency import RATE_MATRIX_CACHE_KEY
+
+        service.refresh_rate_matrix('USD')
+        service.cache.delete(RATE_MATRIX_CACHE_KEY)
+        self._reload(service)
+
+        assert service.get_rate_matrix(use_fallback=False) is None
+        assert service.get_rate_matrix().source == 'fallback'
+
+    def test_fallback_and_stale_matrices_in_cache_are_ignored(self, service):
+        """Test matrices published by fallback or older than the matrix duration are not served."""
+        from datetime import datetime, timedelta, timezone
+        from app.services.currency import FALLBACK_USD_RATES, RATE_MATRIX_CACHE_KEY
+        from app.utils.rate_matrix import RateMatrix
+
+        service.cache.set(RATE_MATRIX_CACHE_KEY, RateMatrix('USD', FALLBACK_USD_RATES, source='fallback').to_dict())
+        self._reload(service)
+        assert service.get_rate_matrix(use_fallback=False) is None
+
+        stale = datetime.now(timezone.utc) - timedelta(seconds=service.matrix_duration + 60)
+        service.cache.set(RATE_MATRIX_CACHE_KEY, RateMatrix('USD', {'EUR': 0.9}, fetched_at=stale,
+                                                             source='StaticRateProvider').to_dict())
+        self._reload(service)
+        assert service.get_rate_matrix(use_fallback=False) is None
+
+
+class TestPasswordHashingService:
+    """Test pooled password hashing with admission control and rehash policy."""
+
+    def _service(self, **kwargs):
+        from concurrent.futures import ThreadPoolExecutor
+        from app.services.password_hashing import PasswordHashingService
+
+        kwargs.setdefault('method', 'pbkdf2:sha256:1000')
+        return PasswordHashingService(executor_factory=lambda workers: ThreadPoolExecutor(workers), **kwargs)
+
+    def test_outdated_hash_is_upgraded_on_login(self):
+        """Test a correct password against an outdated hash returns the policy hash."""
+        from werkzeug.security import generate_password_hash
+
+        service = self._service(max_workers=2)
+        stored = generate_password_hash('s3cret', 'pbkdf2:sha256:500')
+
+        assert service.verify_and_upgrade('wrong', stored) == (False, None)
+        is_valid, upgraded = service.verify_and_upgrade('s3cret', stored)
+        assert is_valid and upgraded.startswith('pbkdf2:sha256:1000$')
+        assert service.verify_and_upgrade('s3cret', upgraded) == (True, None)
+        assert service.needs_rehash('scrypt:32768:8:1$salt$hash')
+
+        snapshot = service.metrics.snapshot()
+        assert snapshot['completed'] == 4
+        assert snapshot['in_flight'] == 0
+        assert snapshot['queue_ms']['p99'] is not None
+        service.shutdown()
+
+    def test_saturated_pool_rejects_instead_of_queueing(self):
+        """Test operations beyond workers plus pending slots are rejected."""
+        import threading
+        from app.core.exceptions import RateLimitExceededError
+
+        service = self._service(max_workers=1, max_pending=0, admission_timeout=0.01)
+        release = threading.Event()
+        holder = threading.Thread(target=service.run, args=(release.wait, 5))
+        holder.start()
+        while service.metrics.snapshot()['in_flight'] == 0:
+            pass
+
+        with pytest.raises(RateLimitExceededError):
+            service.hash('s3cret')
+        release.set()
+        holder.join()
+
+        assert service.metrics.snapshot()['rejected'] == 1
+        assert service.verify('s3cret', service.hash('s3cret'))
+        service.shutdown()
+
+
+class TestFileStorageEncryption:
+    """Test envelope encryption of stored files and the decrypting read paths."""
+
+    @pytest.fixture
+    def storage(self, tmp_path):
+        from types import SimpleNamespace
+        from flask import Flask
+        from app.utils import envelope_crypto
+
+        flask_app = Flask(__name__)
+        flask_app.config.update(TESTING=True, UPLOAD_FOLDER=str(tmp_path / 'uploads'))
+        with flask_app.app_context():
+            # app.services.file_storage builds its service at import time and needs an application
+            from app.services.file_storage import FileStorageService, LocalStorageProvider
+
+            service = object.__new__(FileStorageService)
+            service.providers = {'local': LocalStorageProvider()}
+            service.temp_dir = tmp_path / 'temp'
+            service.temp_dir.mkdir()
+            service._get_file_record = lambda file_id: SimpleNamespace(
+                storage_provider='local', storage_key=f'files/{file_id}', original_filename='plan.pdf'
+            )
+            service._can_access_file = lambda file_upload, user_id: True
+            try:
+                yield service
+            finally:
+                envelope_crypto._keyring = None
+
+    def _store(self, service, tmp_path, file_id, content):
+        source = tmp_path / 'plan.pdf'
+        source.write_bytes(content)
+        encrypted_path, metadata = service._encrypt_file(str(source), file_id)
+        service.providers['local'].upload_file(encrypted_path, f'files/{file_id}', {'category': 'document', **metadata})
+        return encrypted_path, metadata
+
+    def test_encrypted_upload_round_trips_through_download_and_range_reads(self, storage, tmp_path):
+        """Test the wrapped key travels in the object metadata and both read paths decrypt."""
+        from app.utils.envelope_crypto import configure_keyring
+
+        configure_keyring({'v1': b'\x01' * 32}, 'v1')
+        content = bytes(range(256)) * 1024
+        encrypted_path, metadata = self._store(storage, tmp_path, 'file-1', content)
+
+        assert metadata['encryption'] == 'ECS1'
+        assert not list(storage.temp_dir.glob('*.key'))
+        assert storage.providers['local'].get_file_metadata('files/file-1')['wrapped_key'] == metadata['wrapped_key']
+        with open(encrypted_path, 'rb') as f:
+            assert content[:64] not in f.read()
+
+        plain_path, filename = storage.download_file('file-1', user_id=1, track_download=False)
+        with open(plain_path, 'rb') as f:
+            assert f.read() == content
+        assert filename == 'plan.pdf'
+        assert storage.read_range('file-1', 1, 100_000, 300) == content[100_000:100_300]
+
+    def test_wrapped_key_is_bound_to_the_file_id(self, storage, tmp_path):
+        """Test an object copied under another file id cannot be decrypted."""
+        from app.core.exceptions import BusinessLogicError
+        from app.utils.envelope_crypto import configure_keyring
+
+        configure_keyring({'v1': b'\x01' * 32}, 'v1')
+        self._store(storage, tmp_path, 'file-1', b'secret plan')
+        storage.providers['local'].copy_file('files/file-1', 'files/file-2')
+
+        with pytest.raises(BusinessLogicError):
+            storage.read_range('file-2', 1, 0, 6)
+
+    def test_encryption_without_master_keys_fails_loudly(self, storage, tmp_path):
+        """Test a missing keyring raises instead of storing plaintext, leaving no ciphertext behind."""
+        from app.core.exceptions import SecurityError
+
+        source = tmp_path / 'plan.pdf'
+        source.write_bytes(b'secret plan')
+
+        with pytest.raises(SecurityError):
+            storage._encrypt_file(str(source), 'file-1')
+        assert not list(storage.temp_dir.iterdir())
+
+
+class FakeMentorshipService:
+    """Mentorship service whose mentors publish fixed local availability."""
+
+    free = {}
+
+    def get_mentor_free_intervals(self, mentor_id, start_date, end_date, duration_minutes=None):
+        return self.free.get(mentor_id, [])
+
+
+class TestMeetingTimeFinder:
+    """Test common-slot search over stubbed Google and mentorship availability."""
+
+    DAY = datetime(2026, 3, 2)  # A Monday
+
+    @pytest.fixture
+    def calendar(self, monkeypatch):
+        import sys
+        from types import SimpleNamespace
+        from flask import Flask
+        from app.utils.scheduling import Interval
+
+        def at(hour):
+            return self.DAY.replace(hour=hour)
+
+        busy = {1: [Interval(at(9), at(11))], 2: [Interval(at(12), at(13))]}
+
+        def get_busy_intervals(user_id, start_time, end_time):
+            if user_id not in busy:
+                raise ConnectionError('calendar not connected')
+            return busy[user_id]
+
+        FakeMentorshipService.free = {7: [Interval(at(10), at(14))]}
+        monkeypatch.setitem(sys.modules, 'app.services.mentorship_service',
+                            SimpleNamespace(MentorshipService=FakeMentorshipService))
+
+        flask_app = Flask(__name__)
+        flask_app.config['TESTING'] = True
+        with flask_app.app_context():
+            # app.services.google_calendar builds its service at import time and needs an application
+            from app.services import google_calendar
+
+            monkeypatch.setattr(google_calendar.google_calendar_service, 'get_busy_intervals', get_busy_intervals)
+            yield google_calendar
+
+    def _starts(self, suggestions):
+        return sorted(suggestion['start_time'].strftime('%H:%M') for suggestion in suggestions)
+
+    def test_slots_fit_every_participant_and_business_hours(self, calendar):
+        """Test suggestions avoid every participant's busy time."""
+        suggestions = calendar.google_calendar_service.find_available_slots(
+            [1, 2], 60, self.DAY.replace(hour=8), self.DAY.replace(hour=18), max_suggestions=20
+        )
+
+        starts = self._starts(suggestions)
+        assert starts[:2] == ['08:00', '11:00']
+        assert not {'09:00', '10:00', '11:30', '12:00', '12:30'} & set(starts)
+        assert starts[-1] == '17:00'
+
+    def test_mentor_outside_participants_is_included(self, calendar):
+        """Test a mentor passed only in mentor_ids still constrains the meeting."""
+        suggestions = calendar.find_meeting_time([1, 2], 60, self.DAY, max_suggestions=10, mentor_ids=[7])
+
+        assert self._starts(suggestions) == ['11:00', '13:00']
+        assert suggestions[0]['available_users'] == [1, 2, 7]
+
+    def test_participant_without_availability_blocks_every_slot(self, calendar):
+        """Test a participant whose calendar cannot be read is treated as busy."""
+        assert calendar.find_meeting_time([1, 3], 60, self.DAY) == []
@@ -81,4 +81,1211 @@ class TestStringUtils:
         chars = string.ascii_letters + string.digits
         random_string = ''.join(random.choice(chars) for _ in range(length))
         
-        assert len(random_string) == length
\ No newline at end of file
+        assert len(random_string) == length
+
+class TestQueryCounter:
+    """Test the N+1 query guard."""
+    
+    def test_counts_statements(self):
+        """Test that executed statements are recorded."""
+        from sqlalchemy import create_engine, text
+        from app.utils.query_counter import QueryCounter
+        
+        engine = create_engine('sqlite://')
+        with QueryCounter(engine) as counter:
+            with engine.connect() as conn:
+                conn.execute(text('SELECT 1'))
+                conn.execute(text('SELECT 2'))
+        
+        assert counter.count == 2
+    
+    def test_assert_max_queries_fails_on_n_plus_one(self):
+        """Test that per-row queries exceed the limit."""
+        from sqlalchemy import create_engine, text
+        from app.utils.query_counter import assert_max_queries
+        
+        engine = create_engine('sqlite://')
+        with pytest.raises(AssertionError):
+            with assert_max_queries(1, engine=engine):
+                with engine.connect() as conn:
+                    for i in range(5):
+                        conn.execute(text(f'SELECT {i}'))
+
+
+class TestScheduling:
+    """Test interval-based scheduling helpers."""
+    
+    def _interval(self, start_hour, end_hour, data=None):
+        from app.utils.scheduling import Interval
+        base = datetime(2025, 1, 15)
+        return Interval(base + timedelta(hours=start_hour), base + timedelta(hours=end_hour), data)
+    
+    def test_find_overlaps_sweep_line(self):
+        """Test that only overlapping pairs are reported."""
+        from app.utils.scheduling import find_overlaps
+        
+        intervals = [
+            self._interval(9, 11, 'a'),
+            self._interval(10, 12, 'b'),
+            self._interval(12, 13, 'c'),  # contiguo a 'b', sin conflicto
+            self._interval(9, 10, 'd')
+        ]
+        pairs = {tuple(sorted((x.data, y.data))) for x, y in find_overlaps(intervals)}
+        
+        assert pairs == {('a', 'b'), ('a', 'd')}
+    
+    def test_free_slots_by_subtraction(self):
+        """Test free slot search as availability minus busy intervals."""
+        from app.utils.scheduling import find_free_slots
+        
+        available = [self._interval(9, 13, 'slot')]
+        busy = [self._interval(9, 10), self._interval(11, 12)]
+        
+        slots = find_free_slots(available, busy, timedelta(minutes=60))
+        
+        assert [slot.start.hour for slot in slots] == [10, 12]
+        assert all(slot.data == 'slot' for slot in slots)
+    
+    def test_interval_index_overlapping(self):
+        """Test overlap queries against the sorted index."""
+        from app.utils.scheduling import IntervalIndex
+        
+        index = IntervalIndex([self._interval(8, 18, 'long'), self._interval(9, 10, 'short')])
+        base = datetime(2025, 1, 15)
+        
+        assert [i.data for i in index.overlapping(base + timedelta(hours=11), base + timedelta(hours=12))] == ['long']
+        assert index.is_free(base + timedelta(hours=18), base + timedelta(hours=19))
+    
+    def test_intersect_free_common_windows(self):
+        """Test common free windows across participants (k-way merge)."""
+        from app.utils.scheduling import intersect_free, candidate_starts
+        
+        mentor = [self._interval(9, 12), self._interval(14, 17)]
+        entrepreneur = [self._interval(10, 15)]
+        business_hours = [self._interval(8, 18)]
+        
+        common = intersect_free([mentor, entrepreneur, business_hours])
+        
+        assert [(w.start.hour, w.end.hour) for w in common] == [(10, 12), (14, 15)]
+        starts = candidate_starts(common, timedelta(minutes=60), timedelta(minutes=30))
+        assert [(s.start.hour, s.start.minute) for s in starts] == [(10, 0), (10, 30), (11, 0), (14, 0)]
+
+
+class TestSessionRegistry:
+    """Test the socket session registry."""
+    
+    def _principal(self, user_id=1, role='entrepreneur'):
+        from app.sockets.registry import SocketPrincipal
+        return SocketPrincipal(id=user_id, username='ana', email='ana@example.com',
+                               first_name='Ana', last_name='Ruiz', role=role)
+    
+    def test_multiple_tabs_per_user(self):
+        """Test that each tab keeps its own session until the last one closes."""
+        from app.sockets.registry import SessionRegistry
+        
+        registry = SessionRegistry()
+        registry.register('/chat', 'sid-1', self._principal())
+        registry.register('/chat', 'sid-2', self._principal())
+        
+        assert registry.principal_for('/chat', 'sid-2').user_id == '1'
+        assert sorted(registry.sids_for_user(1)) == ['sid-1', 'sid-2']
+        
+        registry.unregister('/chat', 'sid-1')
+        assert registry.is_connected(1)
+        assert registry.principal(1) is not None
+        
+        registry.unregister('/chat', 'sid-2')
+        assert not registry.is_connected(1)
+        assert registry.principal(1) is None
+    
+    def test_invalidate_user_drops_all_sessions(self):
+        """Test explicit invalidation on deactivation."""
+        from app.sockets.registry import SessionRegistry
+        
+        registry = SessionRegistry()
+        registry.register('/chat', 'sid-1', self._principal())
+        registry.register('/presence', 'sid-2', self._principal())
+        
+        removed = registry.invalidate_user('1')
+        
+        assert {s.namespace for s in removed} == {'/chat', '/presence'}
+        assert registry.principal_for('/chat', 'sid-1') is None
+        assert registry.count() == 0
+    
+    def test_refresh_principal_updates_snapshot(self):
+        """Test that role changes replace the cached snapshot."""
+        from app.sockets.registry import SessionRegistry
+        
+        registry = SessionRegistry()
+        registry.register('/chat', 'sid-1', self._principal())
+        
+        assert registry.refresh_principal(self._principal(role='admin'))
+        assert registry.principal_for('/chat', 'sid-1').is_admin
+        assert not registry.refresh_principal(self._principal(user_id=2))
+
+
+class TestSocketStateStore:
+    """Test the in-memory socket state store."""
+    
+    def test_connections_are_counted_per_namespace(self):
+        """Test multi-tab connection counting."""
+        from app.sockets.state import InMemoryStateStore
+        
+        store = InMemoryStateStore()
+        assert store.add_connection('1', '/chat', 'a') == 1
+        assert store.add_connection('1', '/chat', 'b') == 2
+        store.add_connection('1', '/presence', 'c')
+        
+        assert store.remove_connection('1', '/chat', 'a') == 1
+        assert store.connection_count('1') == 2
+    
+    def test_room_version_compare_and_increment(self):
+        """Test that stale versions are rejected."""
+        from app.sockets.state import InMemoryStateStore
+        
+        store = InMemoryStateStore()
+        store.init_room_state('document_1', {'content': 'hola', 'version': 1})
+        
+        assert store.bump_room_version('document_1', 1) == 2
+        assert store.bump_room_version('document_1', 1) is None
+        assert store.get_room_state('document_1')['version'] == 2
+    
+    def test_room_log_compare_and_append(self):
+        """Test that only the writer at the current revision can append."""
+        from app.sockets.state import InMemoryStateStore
+        
+        store = InMemoryStateStore()
+        assert not store.append_room_operation('document_1', 1, 'a', max_length=2)
+        assert store.init_room_log('document_1', 0) == 0
+        assert store.init_room_log('document_1', 5) == 0
+        
+        assert store.append_room_operation('document_1', 1, 'a', max_length=2)
+        assert not store.append_room_operation('document_1', 1, 'b', max_length=2)
+        assert store.append_room_operation('document_1', 2, 'b', max_length=2)
+        assert store.append_room_operation('document_1', 3, 'c', max_length=2)
+        
+        assert store.room_operations('document_1', 1) == ['b', 'c']
+        assert store.room_operations('document_1', 3) == []
+        assert store.room_operations('document_1', 0) is None
+        assert store.room_operations('document_2', 0) is None
+    
+    def test_sliding_window_rate_limit(self):
+        """Test per-user event rate limiting."""
+        from app.sockets.state import InMemoryStateStore
+        
+        store = InMemoryStateStore()
+        assert all(store.hit_rate_limit('1:send_message', 3, 60) for _ in range(3))
+        assert not store.hit_rate_limit('1:send_message', 3, 60)
+        
+        store.reset_rate_limits('1')
+        assert store.hit_rate_limit('1:send_message', 3, 60)
+    
+    def test_cluster_mode_without_redis_fails_at_startup(self):
+        """Test the redis backend never falls back to a per-process store."""
+        from flask import Flask
+        from app.sockets import state
+        
+        flask_app = Flask(__name__)
+        flask_app.config.update(SOCKETIO_STATE_BACKEND='redis', SOCKETIO_REDIS_URL='redis://127.0.0.1:1/0')
+        previous = state._state_store
+        try:
+            with pytest.raises(RuntimeError):
+                state.init_state_store(flask_app)
+            assert state._state_store is previous
+            
+            flask_app.config['SOCKETIO_STATE_BACKEND'] = 'memory'
+            assert isinstance(state.init_state_store(flask_app), state.InMemoryStateStore)
+        finally:
+            state._state_store = previous
+
+
+class _EditorClient:
+    """Minimal OT client: one outstanding operation plus a local buffer."""
+    
+    def __init__(self, name, content, revision):
+        self.name = name
+        self.content = content
+        self.revision = revision
+        self.outstanding = None
+        self.buffer = None
+        self.outbox = []
+        self.inbox = []
+    
+    def edit(self, rng):
+        from app.utils.text_ot import TextOperation
+        
+        position = rng.randint(0, len(self.content))
+        operation = TextOperation().retain(position)
+        if self.content[position:] and rng.random() < 0.3:
+            removed = rng.randint(1, min(3, len(self.content) - position))
+            operation.delete(removed).retain(len(self.content) - position - removed)
+        else:
+            operation.insert(rng.choice(['a', 'bc', 'xyz'])).retain(len(self.content) - position)
+        
+        self.content = operation.apply(self.content)
+        if self.outstanding is None:
+            self.outstanding = operation
+            self.outbox.append((self.revision, operation.to_json()))
+        else:
+            self.buffer = self.buffer.compose(operation) if self.buffer else operation
+    
+    def receive(self, entry):
+        from app.utils.text_ot import TextOperation
+        
+        self.revision = entry['revision']
+        if entry['author'] == self.name:
+            self.outstanding, self.buffer = self.buffer, None
+            if self.outstanding is not None:
+                self.outbox.append((self.revision, self.outstanding.to_json()))
+            return
+        
+        operation = TextOperation.from_json(entry['operation'])
+        if self.outstanding is not None:
+            self.outstanding, operation = TextOperation.transform(self.outstanding, operation)
+        if self.buffer is not None:
+            self.buffer, operation = TextOperation.transform(self.buffer, operation)
+        self.content = operation.apply(self.content)
+
+
+class TestCollaborationEngine:
+    """Test OT-based collaborative editing."""
+    
+    def _simulate(self, clients_count, edits, seed=7, snapshot_every=50, engines_count=1):
+        import random
+        from app.sockets.collaboration import CollaborationEngine
+        from app.sockets.state import InMemoryStateStore
+        
+        rng = random.Random(seed)
+        persisted = {}
+        clients = [_EditorClient(f'c{i}', 'hola', 0) for i in range(clients_count)]
+        
+        def broadcaster(index):
+            # Each worker delivers the whole ordered log to its own connections
+            def broadcast(document_id, batch):
+                for client in clients:
+                    if int(client.name[1:]) % engines_count == index:
+                        client.inbox.extend(batch)
+            return broadcast
+        
+        def persist(document_id, content, revision):
+            # Same compare-and-set as the real snapshot write: only move forward
+            if revision > persisted.get(document_id, ('', -1))[1]:
+                persisted[document_id] = (content, revision)
+        
+        # One engine per worker, all sharing the cluster state store
+        state = InMemoryStateStore() if engines_count > 1 else None
+        engines = [
+            CollaborationEngine(broadcast=broadcaster(index), persist=persist,
+                                snapshot_every=snapshot_every, state=state)
+            for index in range(engines_count)
+        ]
+        for engine in engines:
+            engine.open('doc', lambda: ('hola', 0))
+        
+        def engine_for(client):
+            return engines[int(client.name[1:]) % engines_count]
+        
+        for _ in range(edits):
+            client = rng.choice(clients)
+            action = rng.random()
+            if action < 0.5:
+                client.edit(rng)
+            elif action < 0.8 and client.outbox:
+                revision, operation = client.outbox.pop(0)
+                engine_for(client).submit('doc', revision, operation, author=client.name)
+            elif client.inbox:
+                for entry in client.inbox[:rng.randint(1, len(client.inbox))]:
+                    client.receive(entry)
+                    client.inbox.pop(0)
+            if rng.random() < 0.1:
+                rng.choice(engines).flush()
+        
+        # Drain the queues until every operation is acknowledged
+        while any(c.outbox or c.inbox or c.outstanding for c in clients):
+            for client in clients:
+                while client.outbox:
+                    revision, operation = client.outbox.pop(0)
+                    engine_for(client).submit('doc', revision, operation, author=client.name)
+            for engine in engines:
+                engine.flush()
+            for client in clients:
+                while client.inbox:
+                    client.receive(client.inbox.pop(0))
+        
+        if engines_count > 1:
+            return engines, clients, persisted
+        return engines[0], clients, persisted
+    
+    def test_concurrent_editors_converge(self):
+        """Test that every client converges to the server content."""
+        engine, clients, persisted = self._simulate(clients_count=8, edits=1000)
+        
+        content = engine.get('doc').content
+        assert all(client.content == content for client in clients)
+        assert persisted['doc'][1] > 0
+    
+    def test_two_workers_sharing_a_store_converge(self):
+        """Test that engines on different workers order operations through the shared log."""
+        engines, clients, persisted = self._simulate(clients_count=6, edits=800, engines_count=2)
+        
+        revisions = {engine.open('doc', lambda: ('hola', 0)).revision for engine in engines}
+        for engine in engines:
+            engine.close('doc')
+        
+        content = clients[0].content
+        assert all(client.content == content for client in clients)
+        assert len(revisions) == 1
+        assert persisted['doc'] == (content, revisions.pop())
+    
+    def test_idle_worker_session_catches_up_on_join(self):
+        """Test that a session left open on another worker is not reused stale."""
+        from app.sockets.collaboration import CollaborationEngine
+        from app.sockets.state import InMemoryStateStore
+        
+        state = InMemoryStateStore()
+        worker_a = CollaborationEngine(broadcast=lambda *a: None, persist=lambda *a: None, state=state)
+        worker_b = CollaborationEngine(broadcast=lambda *a: None, persist=lambda *a: None, state=state)
+        worker_a.open('doc', lambda: ('', 0))
+        worker_b.open('doc', lambda: ('', 0))
+        
+        worker_a.submit('doc', 0, ['hola'], author='a')
+        worker_a.submit('doc', 1, [4, ' mundo'], author='a')
+        # B writes on top of a revision it has not seen yet: it is transformed, not lost
+        revision = worker_b.submit('doc', 0, ['¡'], author='b')
+        
+        state_b = worker_b.open('doc', lambda: ('', 0)).join_state()
+        assert revision == 3
+        assert state_b['revision'] == 3
+        assert worker_b.get('doc').content == '¡hola mundo'
+        assert worker_a.open('doc', lambda: ('', 0)).content == '¡hola mundo'
+    
+    def test_worker_reloads_when_log_no_longer_covers_it(self):
+        """Test that a session behind the trimmed shared log reloads the persisted snapshot."""
+        from app.sockets.collaboration import CollaborationEngine
+        from app.sockets.state import InMemoryStateStore
+        
+        state = InMemoryStateStore()
+        persisted = {'doc': ('', 0)}
+        
+        def persist(document_id, content, revision):
+            persisted[document_id] = (content, revision)
+        
+        worker_a = CollaborationEngine(broadcast=lambda *a: None, persist=persist, state=state,
+                                       snapshot_every=2, max_log=2)
+        worker_b = CollaborationEngine(broadcast=lambda *a: None, persist=persist, state=state,
+                                       max_log=2)
+        worker_a.open('doc', lambda: persisted['doc'])
+        worker_b.open('doc', lambda: persisted['doc'])
+        for revision in range(6):
+            worker_a.submit('doc', revision, [revision, 'x'] if revision else ['x'], author='a')
+        
+        session = worker_b.open('doc', lambda: persisted['doc'])
+        assert session.content == 'xxxxxx'
+        assert session.revision == 6
+    
+    def test_late_joiner_gets_snapshot_plus_tail(self):
+        """Test that snapshot + tail reproduces the current content."""
+        from app.utils.text_ot import TextOperation
+        
+        engine, _, _ = self._simulate(clients_count=3, edits=300, snapshot_every=40)
+        state = engine.get('doc').join_state()
+        
+        content = state['snapshot']['content']
+        for operation in state['operations']:
+            content = TextOperation.from_json(operation).apply(content)
+        
+        assert content == engine.get('doc').content
+        assert state['revision'] == state['snapshot']['revision'] + len(state['operations'])
+    
+    def test_stale_revision_requires_resync(self):
+        """Test that revisions older than the kept log are rejected."""
+        from app.sockets.collaboration import CollaborationEngine, StaleRevisionError
+        
+        engine = CollaborationEngine(broadcast=lambda *a: None, persist=lambda *a: None,
+                                     snapshot_every=5, max_log=2)
+        engine.open('doc', lambda: ('', 0))
+        for revision in range(10):
+            engine.submit('doc', revision, [revision, 'x'] if revision else ['x'], author='a')
+        
+        with pytest.raises(StaleRevisionError):
+            engine.submit('doc', 0, ['y'], author='b')
+    
+    @pytest.mark.performance
+    def test_throughput_many_clients(self):
+        """Benchmark: server ops/sec for one document with 50 editors per tick."""
+        import random
+        import time
+        from app.sockets.collaboration import CollaborationEngine
+        
+        rng = random.Random(3)
+        clients = [_EditorClient(f'c{i}', 'hola', 0) for i in range(50)]
+        
+        def broadcast(document_id, batch):
+            for client in clients:
+                client.inbox.extend(batch)
+        
+        engine = CollaborationEngine(broadcast=broadcast, persist=lambda *a: None)
+        engine.open('doc', lambda: ('hola', 0))
+        server_time = 0.0
+        
+        for _ in range(200):
+            for client in clients:
+                client.edit(rng)
+            
+            start = time.perf_counter()
+            for client in clients:
+                while client.outbox:
+                    revision, operation = client.outbox.pop(0)
+                    engine.submit('doc', revision, operation, author=client.name)
+            engine.flush()
+            server_time += time.perf_counter() - start
+            
+            for client in clients:
+                while client.inbox:
+                    client.receive(client.inbox.pop(0))
+        
+        session = engine.get('doc')
+        assert all(client.content == session.content for client in clients)
+        assert session.revision / server_time > 1000
+
+
+class TestPresenceHub:
+    """Test coalesced presence and typing delivery."""
+    
+    def _hub(self, **kwargs):
+        from app.sockets.presence import PresenceHub
+        from app.sockets.state import InMemoryStateStore
+        
+        frames = []
+        hub = PresenceHub(InMemoryStateStore(), lambda ns, sid, frame: frames.append((sid, frame)), **kwargs)
+        return hub, frames
+    
+    def test_deltas_are_coalesced_into_one_frame(self):
+        """Test that many changes in a tick produce a single frame per subscriber."""
+        hub, frames = self._hub()
+        hub.subscribe('/presence', 'watcher', user_ids=['1', '2'])
+        hub.subscribe('/chat', 'reader', rooms=['general'])
+        
+        hub.heartbeat('1', 'ana', status='online')
+        hub.heartbeat('1', 'ana', status='busy')
+        hub.heartbeat('2', 'luis')
+        for _ in range(20):
+            hub.typing('general', '1', True)
+        hub.flush()
+        
+        assert [sid for sid, _ in frames].count('watcher') == 1
+        watcher_frame = dict(frames)['watcher']
+        assert watcher_frame['presence']['1']['status'] == 'busy'
+        assert set(watcher_frame['presence']) == {'1', '2'}
+        assert dict(frames)['reader']['typing'] == {'general': {'1': True}}
+    
+    def test_heartbeat_without_changes_is_silent(self):
+        """Test that TTL refreshes do not produce deltas."""
+        hub, frames = self._hub()
+        hub.subscribe('/presence', 'watcher', user_ids=['1'])
+        hub.heartbeat('1', 'ana', status='online')
+        hub.flush()
+        frames.clear()
+        
+        hub.heartbeat('1')
+        hub.flush()
+        
+        assert frames == []
+        assert hub.get(['1'])['1']['status'] == 'online'
+    
+    def test_only_interested_subscribers_receive_frames(self):
+        """Test interest-based filtering."""
+        hub, frames = self._hub()
+        hub.subscribe('/presence', 'a', user_ids=['1'])
+        hub.subscribe('/presence', 'b', user_ids=['2'])
+        hub.unsubscribe('/presence', 'b')
+        
+        hub.heartbeat('1', status='away')
+        hub.heartbeat('2', status='away')
+        hub.flush()
+        
+        assert [sid for sid, _ in frames] == ['a']
+        assert set(frames[0][1]['presence']) == {'1'}
+    
+    def test_expired_presence_and_typing_are_reported(self):
+        """Test TTL expiry of presence entries and typing indicators."""
+        import time
+        
+        hub, frames = self._hub(ttl=1, typing_ttl=0)
+        hub.subscribe('/chat', 'reader', rooms=['general'])
+        hub.heartbeat('1', status='online')
+        hub.subscribe('/presence', 'watcher', user_ids=['1'])
+        hub.typing('general', '1', True)
+        hub.flush()
+        
+        time.sleep(1.05)
+        hub.flush()
+        
+        assert hub.get(['1']) == {}
+        delivered = dict(frames)
+        assert delivered['watcher']['presence']['1']['status'] == 'offline'
+        assert delivered['reader']['typing'] == {'general': {'1': False}}
+
+
+class TestWriteBuffer:
+    """Test the batched audit/metric write buffer."""
+    
+    def test_flush_writes_in_batches(self):
+        """Test that queued rows are written in multi-row batches."""
+        from app.utils.write_buffer import WriteBuffer
+        
+        batches = []
+        buffer = WriteBuffer('test_batches', batches.append, batch_size=4)
+        for i in range(10):
+            buffer.append({'n': i})
+        
+        assert buffer.flush() == 10
+        assert [len(batch) for batch in batches] == [4, 4, 2]
+        assert buffer.queue_depth == 0
+    
+    def test_full_buffer_drops_and_counts(self):
+        """Test the queue bound and the dropped counter."""
+        from app.utils.write_buffer import WriteBuffer
+        
+        buffer = WriteBuffer('test_bound', lambda rows: None, max_size=3)
+        accepted = [buffer.append({'n': i}) for i in range(5)]
+        
+        assert accepted == [True, True, True, False, False]
+        assert buffer.stats()['dropped'] == 2
+        assert buffer.stats()['queue_depth'] == 3
+    
+    def test_failed_batch_is_retried_then_dropped(self):
+        """Test that a persistently failing batch is dropped after retries."""
+        from app.utils.write_buffer import WriteBuffer
+        
+        calls = []
+        
+        def failing(rows):
+            calls.append(len(rows))
+            raise RuntimeError('db down')
+        
+        buffer = WriteBuffer('test_failing', failing, max_retries=1)
+        buffer._stopping.set()  # sin esperas entre reintentos
+        buffer.append({'n': 1})
+        
+        assert buffer.flush() == 0
+        assert calls == [1, 1]
+        assert buffer.failed_batches == 1 and buffer.dropped == 1
+    
+    def test_background_thread_flushes(self):
+        """Test that the writer thread drains the queue on its own."""
+        import time
+        from app.utils.write_buffer import WriteBuffer
+        
+        written = []
+        buffer = WriteBuffer('test_thread', written.extend, flush_interval=0.01)
+        buffer.start()
+        try:
+            buffer.append({'n': 1})
+            deadline = time.time() + 2
+            while not written and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            buffer.stop()
+        
+        assert written == [{'n': 1}]
+        assert not buffer.running
+
+
+class TestTimeBuckets:
+    """Test the hour/day/month bucket arithmetic used by metric rollups."""
+    
+    def test_truncate_and_next_bucket(self):
+        """Test truncation, month rollover and timezone normalisation."""
+        from datetime import timezone
+        from app.utils.time_buckets import HOUR, MONTH, truncate, next_bucket, previous_bucket
+        
+        ts = datetime(2024, 12, 31, 23, 45, tzinfo=timezone(timedelta(hours=-5)))
+        
+        assert truncate(ts, HOUR) == datetime(2025, 1, 1, 4)
+        assert next_bucket(datetime(2024, 12, 1), MONTH) == datetime(2025, 1, 1)
+        assert previous_bucket(datetime(2025, 1, 1), MONTH) == datetime(2024, 12, 1)
+        assert previous_bucket(datetime(2025, 1, 1), HOUR) == datetime(2024, 12, 31, 23)
+    
+    def test_plan_buckets_uses_coarsest_tiles(self):
+        """Test that a range is covered by merged hour, day and month tiles."""
+        from app.utils.time_buckets import HOUR, DAY, MONTH, plan_buckets
+        
+        plan = plan_buckets(datetime(2024, 1, 30, 22, 15), datetime(2024, 4, 2, 1, 30))
+        
+        assert plan == [
+            (HOUR, datetime(2024, 1, 30, 22), datetime(2024, 1, 31)),
+            (DAY, datetime(2024, 1, 31), datetime(2024, 2, 1)),
+            (MONTH, datetime(2024, 2, 1), datetime(2024, 4, 1)),
+            (DAY, datetime(2024, 4, 1), datetime(2024, 4, 2)),
+            (HOUR, datetime(2024, 4, 2), datetime(2024, 4, 2, 2)),
+        ]
+    
+    def test_plan_buckets_tiles_are_contiguous(self):
+        """Test that the plan covers the range exactly, without gaps."""
+        from app.utils.time_buckets import plan_buckets
+        
+        plan = plan_buckets(datetime(2023, 11, 5, 7), datetime(2024, 3, 9, 13))
+        
+        assert plan[0][1] == datetime(2023, 11, 5, 7)
+        assert plan[-1][2] == datetime(2024, 3, 9, 13)
+        assert all(prev[2] == nxt[1] for prev, nxt in zip(plan, plan[1:]))
+        assert plan_buckets(datetime(2024, 1, 1), datetime(2024, 1, 1)) == []
+
+
+class TestLazyImports:
+    """Test deferred imports and the startup import profiler parser."""
+    
+    def test_lazy_module_imports_on_first_attribute(self):
+        """Test that the real module is imported on first attribute access only."""
+        import sys
+        from app.utils.lazy_imports import lazy_import, is_loaded
+        
+        sys.modules.pop('colorsys', None)
+        loaded = []
+        colorsys = lazy_import('colorsys', on_load=loaded.append)
+        
+        assert 'colorsys' not in sys.modules
+        assert not is_loaded(colorsys)
+        assert colorsys.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+        assert is_loaded(colorsys)
+        assert [module.__name__ for module in loaded] == ['colorsys']
+    
+    def test_is_available_does_not_import(self):
+        """Test availability checks for installed and missing modules."""
+        from app.utils.lazy_imports import is_available
+        
+        assert is_available('json')
+        assert not is_available('definitely_not_installed_module')
+        assert not is_available('definitely_not_installed_module.sub')
+    
+    def test_parse_importtime(self):
+        """Test parsing of python -X importtime output."""
+        from app.utils.startup_profile import parse_importtime
+        
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   encodings.utf_8\n"
+            "import time:      3000 |       4500 | app.extensions\n"
+            "unrelated line\n"
+        )
+        records = parse_importtime(output)
+        
+        assert [(r.module, r.self_us, r.cumulative_us, r.depth) for r in records] == [
+            ('encodings.utf_8', 120, 120, 1),
+            ('app.extensions', 3000, 4500, 0),
+        ]
+
+
+class _DictCache:
+    """Minimal stand-in for the Flask-Caching backend."""
+    
+    def __init__(self):
+        self.data = {}
+    
+    def get(self, key):
+        return self.data.get(key)
+    
+    def set(self, key, value, timeout=None):
+        self.data[key] = value
+    
+    def get_many(self, *keys):
+        return [self.data.get(key) for key in keys]
+    
+    def delete_many(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+class TestFanoutTracker:
+    """Test chunk planning, progress and resumption of fan-out runs."""
+    
+    def test_chunked(self):
+        """Test splitting ids into bounded chunks."""
+        from app.utils.fanout import chunked
+        
+        assert chunked(range(5), 2) == [[0, 1], [2, 3], [4]]
+        assert chunked([], 3) == []
+        with pytest.raises(ValueError):
+            chunked([1], 0)
+    
+    def test_progress_aggregates_completed_chunks(self):
+        """Test that progress sums the counters of finished chunks only."""
+        from app.utils.fanout import FanoutTracker, chunked
+        
+        tracker = FanoutTracker(_DictCache(), 'weekly:2024-05-06')
+        tracker.start(chunked(['a', 'b', 'c', 'd', 'e'], 2))
+        tracker.mark_chunk_done(0, {'processed': 2, 'generated': 1, 'skipped': 1})
+        tracker.mark_chunk_done(2, {'processed': 1, 'generated': 1})
+        
+        progress = tracker.progress()
+        assert tracker.pending_chunks() == [1]
+        assert progress['status'] == 'running'
+        assert progress['total_items'] == 5
+        assert progress['completed_chunks'] == 2
+        assert (progress['processed'], progress['generated'], progress['skipped']) == (3, 2, 1)
+    
+    def test_restart_resumes_saved_plan(self):
+        """Test that a second start keeps the saved plan and finished chunks."""
+        from app.utils.fanout import FanoutTracker
+        
+        cache = _DictCache()
+        first = FanoutTracker(cache, 'run')
+        first.start([[1, 2], [3]])
+        first.mark_chunk_done(0, {'generated': 2})
+        
+        assert first.finish()['status'] == 'incomplete'
+        assert first.result() is None
+        
+        second = FanoutTracker(cache, 'run')
+        assert second.start([[9]])['chunks'] == [[1, 2], [3]]
+        assert second.pending_chunks() == [1]
+        
+        second.mark_chunk_done(1, {'generated': 1})
+        summary = second.finish({'job': 'weekly'})
+        assert summary['status'] == 'completed' and summary['generated'] == 3
+        assert second.result()['job'] == 'weekly'
+        
+        second.reset()
+        assert cache.data == {}
+
+
+class TestArchiveStore:
+    """Test monthly archive files, manifests and the archived read path."""
+    
+    def _rows(self):
+        import uuid
+        from datetime import timezone
+        
+        return [
+            {'id': uuid.UUID(int=i), 'created_at': datetime(2024, 1, 31, 22, tzinfo=timezone.utc) + timedelta(hours=i),
+             'activity_type': 'login'}
+            for i in range(4)
+        ]
+    
+    def test_write_partitions_by_month(self, tmp_path):
+        """Test that rows are split into one file per month with manifest entries."""
+        from app.utils.archive_store import ArchiveStore
+        
+        store = ArchiveStore(str(tmp_path))
+        entries = store.write('activity_logs', self._rows())
+        
+        assert [(entry['month'], entry['rows']) for entry in entries] == [('2024-01', 2), ('2024-02', 2)]
+        assert store.manifest('activity_logs') == entries
+        assert store.verify('activity_logs') == []
+    
+    def test_read_period_skips_other_files_and_duplicates(self, tmp_path):
+        """Test period filtering and that rows archived twice are returned once."""
+        from app.utils.archive_store import ArchiveStore
+        
+        store = ArchiveStore(str(tmp_path))
+        store.write('activity_logs', self._rows())
+        store.write('activity_logs', self._rows()[2:])  # re-archivado tras una interrupción
+        
+        february = list(store.read('activity_logs', datetime(2024, 2, 1), datetime(2024, 3, 1)))
+        assert [row['id'][-1] for row in february] == ['2', '3']
+        assert len(store.entries('activity_logs', datetime(2024, 1, 1), datetime(2024, 2, 1))) == 1
+    
+    def test_verify_detects_corrupted_file(self, tmp_path):
+        """Test that a modified archive file fails verification."""
+        import os
+        from app.utils.archive_store import ArchiveStore
+        
+        store = ArchiveStore(str(tmp_path))
+        entry = store.write('notifications', self._rows()[:1])[0]
+        with open(os.path.join(store.dataset_dir('notifications'), entry['file']), 'ab') as archive:
+            archive.write(b'garbage')
+        
+        assert store.verify('notifications') == [entry]
+
+
+class TestDependencyGraph:
+    """Test the in-memory task dependency graph."""
+
+    def _graph(self):
+        from app.utils.dependency_graph import DependencyGraph
+
+        graph = DependencyGraph()
+        for task_id, duration in {'a': 2, 'b': 3, 'c': 1, 'd': 2}.items():
+            graph.add_task(task_id, duration=duration)
+        graph.add_dependency('a', 'b')
+        graph.add_dependency('a', 'c')
+        graph.add_dependency('b', 'd')
+        graph.add_dependency('c', 'd', lag=1)
+        return graph
+
+    def test_cycles_and_topological_order(self):
+        """Test cycle detection and ordering respect prerequisites."""
+        from app.utils.dependency_graph import DependencyCycleError
+
+        graph = self._graph()
+        order = graph.topological_order()
+
+        assert order.index('a') < order.index('b') < order.index('d')
+        assert graph.would_create_cycle('d', 'a') is True
+        assert graph.would_create_cycle('c', 'b') is False
+        with pytest.raises(DependencyCycleError):
+            graph.add_dependency('d', 'a')
+        assert graph.descendants('a') == {'b', 'c', 'd'}
+
+    def test_critical_path_and_slack(self):
+        """Test forward/backward passes with lag produce slack and the critical path."""
+        schedule = self._graph().schedule()
+
+        assert schedule.duration == 7
+        assert schedule.critical_path == ['a', 'b', 'd']
+        assert schedule.slack['c'] == 1
+        assert schedule.earliest_start['d'] == 5
+
+    def test_completion_only_updates_direct_dependents(self):
+        """Test completing and reopening a task flips blocking on its frontier."""
+        graph = self._graph()
+        graph.blocked.update({'b', 'c', 'd'})
+
+        changes = graph.set_completed('a')
+        assert sorted(changes.unblocked) == ['b', 'c']
+        assert changes.blocked == []
+        assert 'd' in graph.blocked
+
+        changes = graph.set_completed('a', False)
+        assert sorted(changes.blocked) == ['b', 'c']
+
+
+class TestBurndownSeries:
+    """Test the sorted-timeline burndown computation."""
+
+    def test_matches_per_day_scan(self):
+        """Test remaining tasks and points match a naive per-day rescan."""
+        from datetime import date, datetime, timezone
+        from app.utils.burndown import burndown_series, sprint_day_ends
+
+        created = [datetime(2024, 3, 1, 9), datetime(2024, 3, 1, 12), datetime(2024, 3, 2, 8),
+                   datetime(2024, 3, 4, 10)]
+        completed = [datetime(2024, 3, 2, 17), None, datetime(2024, 3, 4, 9, tzinfo=timezone.utc),
+                     datetime(2024, 3, 4, 11)]
+        points = [3, 1, 5, 2]
+
+        series = burndown_series(created, completed, points, date(2024, 3, 1), date(2024, 3, 5))
+
+        expected = []
+        for day_end in sprint_day_ends(date(2024, 3, 1), date(2024, 3, 5)):
+            open_tasks = [
+                i for i in range(4)
+                if created[i] <= day_end
+                and (completed[i] is None or completed[i].replace(tzinfo=None) > day_end)
+            ]
+            expected.append((len(open_tasks), sum(points[i] for i in open_tasks)))
+
+        assert [(p['remaining_tasks'], p['remaining_points']) for p in series] == expected
+        assert series[0]['date'] == '2024-03-01'
+
+    def test_ideal_line_handles_single_day(self):
+        """Test the ideal line does not divide by zero on one-day sprints."""
+        from app.utils.burndown import ideal_burndown
+
+        assert ideal_burndown(['2024-03-01'], 4, 10) == [
+            {'date': '2024-03-01', 'ideal_tasks': 4, 'ideal_points': 10}
+        ]
+
+
+class TestRecurrence:
+    """Test recurring task occurrence expansion."""
+
+    def test_month_end_is_clamped(self):
+        """Test adding months keeps the day or clamps to the month end."""
+        from datetime import datetime
+        from app.utils.recurrence import next_occurrence
+
+        assert next_occurrence('monthly', datetime(2024, 1, 31)) == datetime(2024, 2, 29)
+        assert next_occurrence('quarterly', datetime(2024, 11, 30)) == datetime(2025, 2, 28)
+        assert next_occurrence('custom', datetime(2024, 1, 1), {'interval': 3, 'unit': 'weeks'}) == datetime(2024, 1, 22)
+        assert next_occurrence('none', datetime(2024, 1, 1)) is None
+
+    def test_expansion_catches_up_and_respects_limit(self):
+        """Test due occurrences are expanded up to now and capped per task."""
+        from datetime import datetime
+        from app.utils.recurrence import expand_occurrences
+
+        due_dates, following = expand_occurrences(
+            'weekly', datetime(2024, 1, 1), datetime(2024, 1, 16)
+        )
+        assert due_dates == [datetime(2024, 1, 8), datetime(2024, 1, 15), datetime(2024, 1, 22)]
+        assert following == datetime(2024, 1, 22)
+
+        due_dates, following = expand_occurrences(
+            'daily', datetime(2024, 1, 1), datetime(2024, 3, 1), max_instances=5
+        )
+        assert len(due_dates) == 5
+        assert following == datetime(2024, 1, 6)
+
+
+class TestRateMatrix:
+    """Test local exchange-rate matrix and batch conversion."""
+
+    def test_cross_rates_are_triangulated(self):
+        """Test cross rates go through the base currency."""
+        from decimal import Decimal
+        from app.utils.rate_matrix import RateMatrix
+
+        matrix = RateMatrix('USD', {'EUR': '0.8', 'COP': '4000'})
+
+        assert matrix.rate_decimal('EUR', 'COP') == Decimal('5000')
+        assert matrix.rate('COP', 'USD') == 0.00025
+        assert matrix.rate('EUR', 'EUR') == 1.0
+        assert matrix.rebase('EUR').rate('USD', 'COP') == 4000.0
+        assert matrix.cross_rates(['USD', 'EUR'])['EUR']['USD'] == 1.25
+
+    def test_convert_many_decimal_and_numpy(self):
+        """Test batch conversion for Decimal lists, numpy arrays and mixed sources."""
+        import numpy as np
+        import pytest
+        from decimal import Decimal
+        from app.utils.rate_matrix import RateMatrix, RateMatrixError
+
+        matrix = RateMatrix('USD', {'EUR': '0.8', 'COP': '4000'})
+
+        assert matrix.convert_many([Decimal('10'), '2.5'], 'EUR', 'USD', decimal_places=2) == [
+            Decimal('12.50'), Decimal('3.13')
+        ]
+        assert matrix.convert_many([Decimal('1'), Decimal('4000')], ['USD', 'COP'], 'EUR') == [
+            Decimal('0.8'), Decimal('0.8')
+        ]
+
+        converted = matrix.convert_many(np.array([1.0, 2.0]), ['EUR', 'USD'], 'COP')
+        assert np.allclose(converted, [5000.0, 8000.0])
+
+        with pytest.raises(RateMatrixError):
+            matrix.convert_many([Decimal('1')], 'GBP', 'USD')
+
+    def test_round_trip_through_store(self):
+        """Test the serialized matrix restores the same rates."""
+        from app.utils.rate_matrix import RateMatrix
+
+        matrix = RateMatrix('USD', {'EUR': 0.95}, source='static')
+        restored = RateMatrix.from_dict(matrix.to_dict())
+
+        assert restored.rates == matrix.rates
+        assert restored.fetched_at == matrix.fetched_at
+        assert restored.source == 'static'
+
+
+class TestEnvelopeCrypto:
+    """Test envelope encryption with cached KEKs and chunked streaming AEAD."""
+
+    def test_stream_roundtrip_and_random_access(self):
+        """Test chunked streams decrypt fully, by range, and reject tampering."""
+        import io
+        import os
+        from app.utils.envelope_crypto import (
+            EnvelopeError, decrypt_stream, encrypt_stream, new_data_key, read_range, stream_plaintext_size
+        )
+
+        key = new_data_key()
+        for size in (0, 100, 4096, 10_000):
+            plaintext = os.urandom(size)
+            sealed = io.BytesIO()
+            encrypt_stream(io.BytesIO(plaintext), sealed, key, chunk_size=1024)
+
+            output = io.BytesIO()
+            assert decrypt_stream(io.BytesIO(sealed.getvalue()), output, key) == size
+            assert output.getvalue() == plaintext
+            assert stream_plaintext_size(sealed) == size
+            assert read_range(sealed, key, 1000, 2100) == plaintext[1000:3100]
+            assert read_range(sealed, key, size, 10) == b''
+
+        tampered = bytearray(sealed.getvalue())
+        tampered[-1] ^= 1
+        with pytest.raises(EnvelopeError):
+            read_range(io.BytesIO(bytes(tampered)), key, 9500, 10)
+
+        truncated = sealed.getvalue()[:-(1024 + 16)]
+        with pytest.raises(EnvelopeError):
+            decrypt_stream(io.BytesIO(truncated), io.BytesIO(), key)
+
+    def test_keyring_caches_kek_and_binds_context(self):
+        """Test the KEK is derived once and wrapped keys are bound to their context."""
+        from app.utils.envelope_crypto import EnvelopeError, KeyCache, KeyRing, new_data_key
+
+        now = [0.0]
+        keyring = KeyRing({'v1': b'master-one', 'v2': b'master-two'},
+                          cache=KeyCache(max_entries=4, ttl=60, clock=lambda: now[0]))
+        data_key = new_data_key()
+
+        key_id, wrapped = keyring.wrap(data_key, b'owner-1|contract')
+        for _ in range(10):
+            assert keyring.unwrap(wrapped, b'owner-1|contract', key_id) == data_key
+        assert key_id == 'v2'
+        assert keyring.cache.misses == 1
+
+        with pytest.raises(EnvelopeError):
+            keyring.unwrap(wrapped, b'owner-2|contract', key_id)
+        with pytest.raises(EnvelopeError):
+            keyring.unwrap(wrapped, b'owner-1|contract', 'v1')
+
+        now[0] = 61
+        keyring.kek('v2')
+        assert keyring.cache.misses == 3
+
+    def test_master_keys_come_from_dedicated_config(self):
+        """Test master keys never fall back to SECRET_KEY and rotate through config."""
+        from flask import Flask
+        from app.utils import envelope_crypto
+        from app.utils.envelope_crypto import EnvelopeError, KeyRing, init_keyring, new_data_key
+
+        flask_app = Flask(__name__)
+        flask_app.config['SECRET_KEY'] = 'not-a-document-key'
+        with flask_app.app_context():
+            with pytest.raises(EnvelopeError):
+                KeyRing().kek()
+        assert init_keyring(flask_app) is None
+
+        flask_app.config.update(DOCUMENT_MASTER_KEYS='v1:old-master', DOCUMENT_MASTER_KEY_ID='v1')
+        try:
+            data_key = new_data_key()
+            old_id, wrapped = init_keyring(flask_app).wrap(data_key, b'ctx')
+            assert old_id == 'v1'
+
+            flask_app.config.update(DOCUMENT_MASTER_KEYS='v1:old-master,v2:new-master', DOCUMENT_MASTER_KEY_ID='v2')
+            rotated = init_keyring(flask_app)
+            assert rotated is envelope_crypto.get_keyring()
+            assert rotated.wrap(data_key, b'ctx')[0] == 'v2'
+            assert rotated.unwrap(wrapped, b'ctx', old_id) == data_key
+
+            flask_app.config['DOCUMENT_MASTER_KEY_ID'] = 'v3'
+            with pytest.raises(EnvelopeError):
+                init_keyring(flask_app)
+        finally:
+            envelope_crypto._keyring = None
+
+
+class TestKeysetPaginator:
+    """Test keyset pagination cursors."""
+
+    def test_cursor_round_trip_keeps_types_and_checks_fields(self):
+        """Test decode_cursor restores typed values and rejects cursors missing required fields."""
+        import uuid
+        from datetime import datetime, timezone
+        from app.utils.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+        position = {'created_at': datetime(2026, 3, 1, 10, tzinfo=timezone.utc), 'id': uuid.UUID(int=7)}
+        fields = {'created_at': datetime, 'id': uuid.UUID}
+        assert decode_cursor(encode_cursor(position), fields=fields) == position
+
+        for broken in (encode_cursor({'id': uuid.UUID(int=7)}),
+                       encode_cursor({'created_at': 'yesterday', 'id': uuid.UUID(int=7)}),
+                       encode_cursor({'created_at': position['created_at'], 'id': 7}),
+                       'not-a-cursor', encode_cursor({}) + '!!'):
+            with pytest.raises(InvalidCursorError):
+                decode_cursor(broken, fields=fields)
+
+    def test_enum_sort_key_cursor_round_trip(self):
+        """Test page 1 -> cursor -> page 2 on a SQLEnum-sorted query."""
+        import enum
+        from sqlalchemy import Column, Enum as SQLEnum, Integer, create_engine
+        from sqlalchemy.orm import Session, declarative_base
+        from app.utils.pagination import KeysetPaginator
+
+        class Stage(enum.Enum):
+            # Names and values sort differently, as in the real models
+            IDEA = 'z_idea'
+            GROWTH = 'a_growth'
+            MVP = 'm_mvp'
+
+        Base = declarative_base()
+
+        class Venture(Base):
+            __tablename__ = 'ventures'
+            id = Column(Integer, primary_key=True)
+            stage = Column(SQLEnum(Stage), nullable=False)
+
+        engine = create_engine('sqlite://')
+        Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            stages = [Stage.IDEA, Stage.GROWTH, Stage.MVP]
+            session.add_all(Venture(id=i, stage=stages[i % 3]) for i in range(1, 10))
+            session.commit()
+
+            paginator = KeysetPaginator({'stage': Venture.stage}, Venture.id, default_sort='stage')
+            expected = [v.id for v in session.query(Venture).order_by(Venture.stage.asc(), Venture.id.asc())]
+
+            seen = []
+            page = paginator.paginate(session.query(Venture), sort_order='asc', per_page=4)
+            seen.extend(v.id for v in page.items)
+            while page.next_cursor:
+                page = paginator.paginate(session.query(Venture), sort_order='asc',
+                                          cursor=page.next_cursor, per_page=4)
+                seen.extend(v.id for v in page.items)
+
+            assert seen == expected
+
+            back = paginator.paginate(session.query(Venture), sort_order='asc',
+                                      cursor=page.prev_cursor, per_page=4)
+            assert [v.id for v in back.items] == expected[4:8]
+
+    def test_paginate_query_walks_ties_forward_and_backward(self):
+        """Test paginate_query cursors cover every row once in both directions when sort keys tie."""
+        from flask import Flask
+        from sqlalchemy import Column, Integer, create_engine
+        from sqlalchemy.orm import Session, declarative_base
+
+        Base = declarative_base()
+
+        class Venture(Base):
+            __tablename__ = 'ventures'
+            id = Column(Integer, primary_key=True)
+            score = Column(Integer, nullable=False)
+
+        engine = create_engine('sqlite://')
+        Base.metadata.create_all(engine)
+        with Flask(__name__).app_context(), Session(engine) as session:
+            from app.utils.db_utils import paginate_query
+
+            # Only three distinct scores, so every page boundary falls inside a tie
+            session.add_all(Venture(id=i, score=i % 3) for i in range(1, 12))
+            session.commit()
+            query = session.query(Venture)
+            expected = [v.id for v in query.order_by(Venture.score.desc(), Venture.id.desc())]
+
+            pages = [paginate_query(query, per_page=4, order_by=Venture.score, descending=True)]
+            while pages[-1].next_cursor:
+                pages.append(paginate_query(query, per_page=4, order_by=Venture.score,
+                                            descending=True, cursor=pages[-1].next_cursor))
+
+            assert [v.id for page in pages for v in page.items] == expected
+            assert [len(page.items) for page in pages] == [4, 4, 3]
+            assert pages[0].total == 11 and pages[0].pages == 3
+            assert not pages[-1].has_next
+
+            back = paginate_query(query, per_page=4, order_by=Venture.score,
+                                  descending=True, cursor=pages[-1].prev_cursor)
+            assert [v.id for v in back.items] == expected[4:8]
+            first = paginate_query(query, per_page=4, order_by=Venture.score,
+                                   descending=True, cursor=back.prev_cursor)
+            assert [v.id for v in first.items] == expected[:4]
+            assert not first.has_prev
+
+    def test_totals_are_returned_by_default(self):
+        """Test list responses keep total and pages unless total=none is requested."""
+        from sqlalchemy import Column, Integer, create_engine
+        from sqlalchemy.orm import Session, declarative_base
+        from werkzeug.datastructures import MultiDict
+        from app.utils.pagination import KeysetPaginator
+
+        Base = declarative_base()
+
+        class Venture(Base):
+            __tablename__ = 'ventures'
+            id = Column(Integer, primary_key=True)
+
+        engine = create_engine('sqlite://')
+        Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            session.add_all(Venture(id=i) for i in range(1, 8))
+            session.commit()
+
+            paginator = KeysetPaginator({'id': Venture.id}, Venture.id, default_sort='id')
+            data = paginator.paginate_request(session.query(Venture), MultiDict({'per_page': '3'})).to_dict()
+            assert data['total'] == 7 and data['pages'] == 3
+
+            data = paginator.paginate_request(session.query(Venture), MultiDict({'per_page': '3', 'total': 'none'})).to_dict()
+            assert data.get('total') is None and 'pages' not in data